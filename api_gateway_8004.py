@@ -16,6 +16,9 @@ from datetime import datetime
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+from vigoleonrocks.services.rate_limiter import api_key_or_address, create_rate_limiter, install_rate_limiting
+from vigoleonrocks.services.traffic_capture import install_traffic_capture
+
 # Configuración del Gateway
 GATEWAY_PORT = int(os.getenv('GATEWAY_PORT', '8004'))
 VIGOLEONROCKS_BACKEND = os.getenv('VIGOLEONROCKS_BACKEND', 'http://localhost:5000')
@@ -89,6 +92,23 @@ class VIGOLEONROCKSGateway:
         self.failed_requests = 0
         self.entropy_system = SystemMetricsEntropy()
         
+        # Captura muestreada de tráfico para replay (TRAFFIC_CAPTURE_ENABLED)
+        install_traffic_capture(self.app, name='gateway-8004')
+        
+        # Rate limiting por API key (o IP), compartido entre workers con RATE_LIMIT_BACKEND=shared|redis
+        self.rate_limiter = install_rate_limiting(
+            self.app,
+            create_rate_limiter(
+                'gateway-8004',
+                default_policy=os.environ.get('GATEWAY_RATE_LIMIT', '120/minute'),
+                route_policies={
+                    '/api/openrouter-proxy': os.environ.get('GATEWAY_CHAT_RATE_LIMIT', '60/minute burst 20'),
+                },
+            ),
+            key_func=api_key_or_address,
+            exempt=('/health',),
+        )
+        
         # Configurar rutas
         self._setup_routes()
         
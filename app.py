@@ -14,14 +14,22 @@ import hashlib
 import mimetypes
 from datetime import datetime
 from werkzeug.utils import secure_filename
-from flask import Flask, request, jsonify, render_template_string, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template_string, send_from_directory, stream_with_context
 from flask_cors import CORS
-import threading
 import base64
 import io
 from PIL import Image
 import magic
 
+from vigoleonrocks.services.cpu_offload import OffloadTimeout, get_cpu_offload, offload
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
+from vigoleonrocks.services.file_fanout import FileTask, get_file_fanout
+from vigoleonrocks.services.language_identifier import DEFAULT_MIN_CONFIDENCE, LANGUAGE_NAMES, get_language_identifier
+from vigoleonrocks.services.static_pages import get_static_pages, serve_page
+from vigoleonrocks.services.system_sampler import get_system_sampler
+from vigoleonrocks.services.tracing import install_tracing
+from vigoleonrocks.services.upload_ingest import UploadIngest, install_upload_ingest, upload_info
+
 # Import del servicio de IA unificado
 try:
     from vigoleonrocks.services.unified_ai_service import get_unified_service
@@ -42,6 +50,15 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Trazas por petición (TRACING_ENABLED): span raíz, X-Trace-Id y /debug/traces
+install_tracing(app)
+
+# Entropía por petición (ENTROPY_SEED = respuestas reproducibles en pruebas de carga)
+install_entropy(app)
+
+# Páginas del frontend en memoria, precomprimidas y con ETag (STATIC_PAGES_WATCH_INTERVAL recarga en desarrollo)
+get_static_pages().preload(['vigoleonrocks_multimodal_interface.html'])
+
 # Configuración de uploads
 UPLOAD_FOLDER = '/tmp/vigoleonrocks_uploads'
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
@@ -55,6 +72,14 @@ ALLOWED_EXTENSIONS = {
 # Crear directorio de uploads si no existe
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Subidas en streaming a spool (memoria/disco): tipo por bytes mágicos y MAX_FILE_SIZE a mitad de transmisión
+_UPLOAD_KINDS = ['image', 'audio', 'document', 'text']
+install_upload_ingest(app, ingest=UploadIngest(
+    {'/api/process': _UPLOAD_KINDS, '/api/upload/single': _UPLOAD_KINDS},
+    limits={kind: MAX_FILE_SIZE for kind in _UPLOAD_KINDS},
+    multi_file_routes=['/api/process'],
+))
+
 # Inicializar servicio de IA unificado
 unified_service = None
 if UNIFIED_AI_AVAILABLE:
@@ -89,41 +114,14 @@ base_metrics = {
 }
 
 def get_system_entropy():
-    """Generar entropía basada en métricas del sistema (sin Math.random)"""
-    try:
-        # Usar timestamp, PID y métricas del sistema para generar entropía
-        current_time = time.time_ns()
-        pid = os.getpid()
-        memory_info = sys.getsizeof(sys.modules)
-        
-        # Combinar métricas para crear entropía
-        entropy_source = (
-            current_time + 
-            pid + 
-            memory_info +
-            len(sys.modules) +
-            int(time.monotonic() * 1000000)
-        )
-        
-        # Aplicar transformación para obtener valor pseudoaleatorio
-        return abs(entropy_source % 100) / 100.0
-    except Exception:
-        # Fallback usando solo timestamp y PID
-        return abs((time.time_ns() + os.getpid()) % 100) / 100.0
+    """Entropía en [0, 1) (servicio compartido, reproducible con ENTROPY_SEED)"""
+    return get_entropy().uniform()
 
-def update_system_metrics():
-    """Actualizar métricas del sistema en tiempo real"""
-    try:
-        import psutil
-        base_metrics['system_load'] = psutil.cpu_percent(interval=0.1)
-        base_metrics['memory_usage'] = psutil.virtual_memory().percent
-    except ImportError:
-        # Fallback si psutil no está disponible
-        entropy = get_system_entropy()
-        base_metrics['system_load'] = entropy * 100
-        base_metrics['memory_usage'] = entropy * 80 + 20
-    
-    base_metrics['last_update'] = time.time()
+def update_system_metrics(snapshot):
+    """Actualizar métricas del sistema en tiempo real (desde el muestreador compartido)"""
+    base_metrics['system_load'] = snapshot.system_cpu_percent
+    base_metrics['memory_usage'] = snapshot.memory_percent
+    base_metrics['last_update'] = snapshot.timestamp
     
     # Simulación de coherencia cuántica con variación basada en sistema
     base_coherence = 94.7
@@ -140,21 +138,9 @@ def update_system_metrics():
     if total_requests > 0:
         base_metrics['success_rate'] = ((total_requests - base_metrics['errors_count']) / total_requests) * 100
 
-def metrics_thread():
-    """Hilo en segundo plano para actualizar métricas"""
-    logger.info("🔄 Iniciando hilo de métricas en segundo plano")
-    while True:
-        try:
-            update_system_metrics()
-            time.sleep(5)
-        except Exception as e:
-            logger.error(f"Error en hilo de métricas: {e}")
-            time.sleep(10)
-
-# Iniciar hilo de métricas en segundo plano
+# Métricas en segundo plano: un único muestreador por proceso
 if os.environ.get('BACKGROUND_EXECUTION', 'true').lower() == 'true':
-    metrics_thread_daemon = threading.Thread(target=metrics_thread, daemon=True)
-    metrics_thread_daemon.start()
+    get_system_sampler().subscribe(update_system_metrics, every=5)
 
 def allowed_file(filename, file_type=None):
     """Verificar si el archivo tiene una extensión permitida"""
@@ -219,6 +205,14 @@ def process_image(image_data, filename):
         logger.error(f"Error procesando imagen {filename}: {e}")
         return {'error': str(e), 'filename': filename}
 
+def analyze_image_offloaded(image_data, filename):
+    """process_image en el pool de procesos: no retiene el GIL de los hilos de petición"""
+    try:
+        return offload(process_image, image_data, filename)
+    except OffloadTimeout as e:
+        logger.error(f"Timeout procesando imagen {filename}: {e}")
+        return {'error': str(e), 'filename': filename}
+
 def process_text_file(file_data, filename):
     """Procesar archivo de texto"""
     try:
@@ -251,26 +245,9 @@ def process_text_file(file_data, filename):
         return {'error': str(e), 'filename': filename}
 
 def detect_language_fallback(text):
-    """Detectar pistas del idioma en el texto (fallback)"""
-    text_lower = text.lower()
-    
-    # Marcadores básicos de idiomas
-    spanish_markers = ['de', 'la', 'el', 'en', 'a', 'es', 'se', 'no', 'te', 'lo', 'le', 'da', 'su', 'por', 'son', 'con', 'para', 'todo', 'pero', 'más']
-    english_markers = ['the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at']
-    
-    # Contar coincidencias
-    spanish_count = sum(1 for marker in spanish_markers if marker in text_lower)
-    english_count = sum(1 for marker in english_markers if marker in text_lower)
-    
-    # Detectar características especiales del español
-    spanish_chars = len([c for c in text_lower if c in 'áéíóúñü¿¡'])
-    
-    scores = {
-        'es': spanish_count + (spanish_chars * 2),
-        'en': english_count
-    }
-    
-    return max(scores, key=scores.get) if max(scores.values()) > 0 else 'unknown'
+    """Detectar idioma del texto (fallback sin UnifiedAIService)"""
+    return get_language_identifier().detect(text, default='unknown', min_confidence=DEFAULT_MIN_CONFIDENCE,
+                                            allowed=LANGUAGE_NAMES)
 
 def process_audio_file(file_data, filename):
     """Procesar archivo de audio (información básica)"""
@@ -345,8 +322,7 @@ def after_request(response):
 def home():
     """Ruta principal que sirve la interfaz multimodal"""
     try:
-        with open('vigoleonrocks_multimodal_interface.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_multimodal_interface.html')
     except FileNotFoundError:
         return jsonify({
             'message': '🚀 VIGOLEONROCKS v4.0.0 - Motor Híbrido Activado',
@@ -504,9 +480,100 @@ def chat_endpoint():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+def analyze_file_task(task):
+    """Análisis de un archivo de /api/process según su categoría (en el pool de fan-out)"""
+    file_data, filename, category = task.data, task.filename, task.category
+    if category == 'image':
+        return analyze_image_offloaded(file_data, filename)
+    elif category == 'document' or filename.endswith('.txt'):
+        return process_text_file(file_data, filename)
+    elif category == 'audio':
+        return process_audio_file(file_data, filename)
+    elif category == 'code':
+        return process_code_file(file_data, filename)
+    return {'error': 'Unsupported file type', 'filename': filename}
+
+def collect_file_tasks(files):
+    """Lee los archivos válidos de la petición (en el hilo de la petición) como FileTask"""
+    tasks = []
+    for file in files:
+        if file.filename and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            rejected = (upload_info(file) or {}).get('error')
+            if rejected:
+                # Tipo o tamaño rechazado en la ingesta: error propio, el resto se procesa
+                tasks.append(FileTask(len(tasks), filename, get_file_category(filename), b'', error=rejected))
+                continue
+            file_data = file.read()
+            
+            # Verificar tamaño del archivo
+            if len(file_data) > MAX_FILE_SIZE:
+                continue
+            
+            tasks.append(FileTask(len(tasks), filename, get_file_category(filename), file_data))
+    return tasks
+
+def wants_ndjson_stream():
+    """``?stream=1``, campo ``stream`` o ``Accept: application/x-ndjson``"""
+    flag = request.args.get('stream', request.form.get('stream', ''))
+    return flag.lower() in ('1', 'true', 'yes') or 'application/x-ndjson' in request.headers.get('Accept', '')
+
+def record_file_result(response_data, result):
+    """Añade el resultado de un archivo a la respuesta y actualiza métricas"""
+    response_data['files_processed'].append(result.as_dict())
+    
+    base_metrics['files_processed'] += 1
+    filename = result.task.filename
+    file_ext = filename.split('.')[-1].lower() if '.' in filename else 'unknown'
+    base_metrics['file_types_processed'][file_ext] = base_metrics['file_types_processed'].get(file_ext, 0) + 1
+
+def finish_hybrid_response(response_data, text_input, format_type, start_time):
+    """Texto con IA híbrida, respuesta integrada y tiempo total"""
+    # Procesar texto con IA si está disponible
+    if text_input and unified_service:
+        try:
+            ai_result = unified_service.process_query(text_input, 'hybrid')
+            response_data['ai_response'] = ai_result['response']
+            response_data['detected_language'] = ai_result.get('language', 'es')
+            
+            # Actualizar métricas de contexto
+            base_metrics['context_tokens_active'] = min(len(text_input) * 10, 500000)
+            
+            # Métricas cuánticas del servicio unificado
+            response_data['quantum_metrics'] = {
+                'coherence_level': ai_result.get('coherence_level', 95.0),
+                'states_synchronized': ai_result.get('quantum_states', 26),
+                'processing_method': ai_result.get('method', 'hybrid_quantum_human'),
+                'confidence_score': ai_result.get('supremacy_score', 0.998) * 100,
+                'context_utilization': round((base_metrics['context_tokens_active'] / 500000) * 100, 1)
+            }
+        except Exception as e:
+            logger.error(f"Error en procesamiento de IA: {e}")
+            response_data['ai_response'] = "Error en el procesamiento de IA híbrida"
+    
+    # Generar respuesta multimodal integrada
+    final_response = generate_hybrid_multimodal_response(
+        text_input, 
+        response_data['files_processed'], 
+        format_type,
+        response_data.get('ai_response', '')
+    )
+    response_data['integrated_response'] = final_response
+    
+    # Calcular tiempo de respuesta
+    processing_time = (time.time() - start_time) * 1000
+    response_data['processing_time_ms'] = round(processing_time, 1)
+    return response_data
+
 @app.route('/api/process', methods=['POST'])
 def process_multimodal():
-    """Procesar entrada multimodal (texto + archivos) con IA híbrida"""
+    """Procesar entrada multimodal (texto + archivos) con IA híbrida
+
+    Los archivos se analizan en paralelo (FANOUT_CONCURRENCY por petición, plazo
+    FANOUT_FILE_DEADLINE por archivo). Con ``?stream=1`` la respuesta es NDJSON:
+    una línea ``file`` por archivo según termina y una línea ``result`` final con
+    la respuesta agregada de siempre.
+    """
     start_time = time.time()
     
     try:
@@ -535,76 +602,34 @@ def process_multimodal():
             'hybrid_processing': UNIFIED_AI_AVAILABLE
         }
         
-        # Procesar archivos si los hay
-        if files:
-            for file in files:
-                if file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    file_data = file.read()
-                    
-                    # Verificar tamaño del archivo
-                    if len(file_data) > MAX_FILE_SIZE:
-                        continue
-                    
-                    category = get_file_category(filename)
-                    file_info = {'filename': filename, 'category': category, 'size': len(file_data)}
-                    
-                    # Procesar según el tipo de archivo
-                    if category == 'image':
-                        analysis = process_image(file_data, filename)
-                    elif category == 'document' or filename.endswith('.txt'):
-                        analysis = process_text_file(file_data, filename)
-                    elif category == 'audio':
-                        analysis = process_audio_file(file_data, filename)
-                    elif category == 'code':
-                        analysis = process_code_file(file_data, filename)
-                    else:
-                        analysis = {'error': 'Unsupported file type', 'filename': filename}
-                    
-                    file_info['analysis'] = analysis
-                    response_data['files_processed'].append(file_info)
-                    
-                    # Actualizar métricas
-                    base_metrics['files_processed'] += 1
-                    file_ext = filename.split('.')[-1].lower() if '.' in filename else 'unknown'
-                    base_metrics['file_types_processed'][file_ext] = base_metrics['file_types_processed'].get(file_ext, 0) + 1
+        tasks = collect_file_tasks(files)
+        fanout = get_file_fanout()
         
-        # Procesar texto con IA si está disponible
-        if text_input and unified_service:
-            try:
-                ai_result = unified_service.process_query(text_input, 'hybrid')
-                response_data['ai_response'] = ai_result['response']
-                response_data['detected_language'] = ai_result.get('language', 'es')
-                
-                # Actualizar métricas de contexto
-                base_metrics['context_tokens_active'] = min(len(text_input) * 10, 500000)
-                
-                # Métricas cuánticas del servicio unificado
-                response_data['quantum_metrics'] = {
-                    'coherence_level': ai_result.get('coherence_level', 95.0),
-                    'states_synchronized': ai_result.get('quantum_states', 26),
-                    'processing_method': ai_result.get('method', 'hybrid_quantum_human'),
-                    'confidence_score': ai_result.get('supremacy_score', 0.998) * 100,
-                    'context_utilization': round((base_metrics['context_tokens_active'] / 500000) * 100, 1)
-                }
-            except Exception as e:
-                logger.error(f"Error en procesamiento de IA: {e}")
-                response_data['ai_response'] = "Error en el procesamiento de IA híbrida"
+        if wants_ndjson_stream():
+            def generate():
+                try:
+                    results = []
+                    for result in fanout.iter_completed(tasks, analyze_file_task):
+                        results.append(result)
+                        yield json.dumps({'type': 'file', 'index': result.task.index,
+                                          'elapsed_ms': round(result.elapsed_ms, 1),
+                                          **result.as_dict()}, ensure_ascii=False, default=str) + '\n'
+                    for result in sorted(results, key=lambda r: r.task.index):
+                        record_file_result(response_data, result)
+                    finish_hybrid_response(response_data, text_input, format_type, start_time)
+                    yield json.dumps({'type': 'result', **response_data}, ensure_ascii=False, default=str) + '\n'
+                except Exception as e:
+                    base_metrics['errors_count'] += 1
+                    logger.error(f"Error en procesamiento multimodal (stream): {e}")
+                    yield json.dumps({'type': 'error', 'error': 'Multimodal processing failed',
+                                      'message': str(e)}) + '\n'
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
         
-        # Generar respuesta multimodal integrada
-        final_response = generate_hybrid_multimodal_response(
-            text_input, 
-            response_data['files_processed'], 
-            format_type,
-            response_data.get('ai_response', '')
-        )
-        response_data['integrated_response'] = final_response
+        # Procesar archivos si los hay (en paralelo; la respuesta conserva el orden de entrada)
+        for result in fanout.process_all(tasks, analyze_file_task):
+            record_file_result(response_data, result)
         
-        # Calcular tiempo de respuesta
-        processing_time = (time.time() - start_time) * 1000
-        response_data['processing_time_ms'] = round(processing_time, 1)
-        
-        return jsonify(response_data)
+        return jsonify(finish_hybrid_response(response_data, text_input, format_type, start_time))
         
     except Exception as e:
         base_metrics['errors_count'] += 1
@@ -956,7 +981,7 @@ def upload_single_file():
         
         # Procesar archivo según su tipo
         if category == 'image':
-            analysis = process_image(file_data, filename)
+            analysis = analyze_image_offloaded(file_data, filename)
         elif category == 'document' or filename.endswith('.txt'):
             analysis = process_text_file(file_data, filename)
         elif category == 'audio':
@@ -1029,4 +1054,5 @@ if __name__ == '__main__':
     logger.info("   • GET  /api/metrics/live  - Métricas en tiempo real")
     logger.info("=" * 60)
     
+    get_cpu_offload().start()  # precalienta los workers de imagen antes de aceptar tráfico
     app.run(host=HOST, port=PORT, debug=DEBUG, threaded=True)
@@ -8,7 +8,6 @@ import os
 import sys
 import time
 import logging
-import threading
 from typing import Optional, Dict, Any
 from pathlib import Path
 
@@ -17,6 +16,7 @@ from flask_cors import CORS
 
 # Importar configuración
 from config import get_config, print_config_summary, system_entropy
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
 
 # Configurar logging
 logging.basicConfig(
@@ -60,6 +60,17 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     app.config.from_object(config)
     app.config['CONFIG_OBJECT'] = config
     
+    # === TRAZAS ===
+    setup_tracing(app, config)
+    
+    # === ENTROPÍA ===
+    # Antes que el resto de hooks: con ENTROPY_SEED cada petición (y su
+    # request_id) es reproducible
+    install_entropy(app)
+    
+    # === CAPTURA DE TRÁFICO ===
+    setup_traffic_capture(app, config)
+    
     # === EXTENSIONES ===
     setup_extensions(app, config)
     
@@ -79,6 +90,9 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     # === HANDLERS DE ERROR ===
     setup_error_handlers(app, config)
     
+    # === PROBES DE SALUD Y WARMUP ===
+    setup_health_probes(app, config)
+    
     # Mostrar resumen de configuración
     with app.app_context():
         print_config_summary(config)
@@ -87,6 +101,37 @@ def create_app(config_name: Optional[str] = None) -> Flask:
     return app
 
 
+def setup_tracing(app: Flask, config) -> None:
+    """Span raíz por petición y /debug/traces (primero, para que la traza cubra el resto de hooks)"""
+    from vigoleonrocks.services.tracing import Tracer, install_tracing, set_tracer
+    
+    tracer = Tracer(
+        enabled=config.TRACING_ENABLED,
+        sample_rate=config.TRACING_SAMPLE,
+        ring_size=config.TRACING_RING_SIZE,
+        slowest=config.TRACING_SLOWEST,
+        file_path=config.TRACING_FILE or None,
+    )
+    set_tracer(tracer)  # los spans del pipeline cuántico usan el tracer global
+    install_tracing(app, tracer)
+    if tracer.enabled:
+        logger.info(f"✅ Trazas activas ({tracer.sample_rate:.1%} de las peticiones, /debug/traces)")
+
+
+def setup_traffic_capture(app: Flask, config) -> None:
+    """Captura muestreada de tráfico para replay (antes que rate limiting y admisión, para capturar también sus rechazos)"""
+    from vigoleonrocks.services.traffic_capture import TrafficCapture, install_traffic_capture
+    
+    capture = install_traffic_capture(app, TrafficCapture(
+        directory=config.TRAFFIC_CAPTURE_DIR,
+        name='app',
+        sample_rate=config.TRAFFIC_CAPTURE_SAMPLE,
+        enabled=config.TRAFFIC_CAPTURE_ENABLED,
+    ))
+    if capture.enabled:
+        logger.info(f"✅ Captura de tráfico activa ({capture.sample_rate:.1%} en {capture.directory})")
+
+
 def setup_extensions(app: Flask, config) -> None:
     """Configurar extensiones Flask"""
     
@@ -100,19 +145,19 @@ def setup_extensions(app: Flask, config) -> None:
     
     # === RATE LIMITING ===
     if config.RATE_LIMITING_ENABLED:
-        try:
-            from flask_limiter import Limiter
-            from flask_limiter.util import get_remote_address
-            
-            limiter = Limiter(
-                key_func=get_remote_address,
-                default_limits=[f"{config.MAX_REQUESTS_PER_MINUTE} per minute"]
-            )
-            limiter.init_app(app)
-            app.config['LIMITER'] = limiter
-            logger.info("✅ Rate limiting configurado")
-        except ImportError:
-            logger.warning("⚠️ Flask-Limiter no instalado, rate limiting deshabilitado")
+        from vigoleonrocks.services.rate_limiter import (
+            create_backend, create_rate_limiter, install_rate_limiting
+        )
+        
+        limiter = create_rate_limiter(
+            'app',
+            default_policy=f"{config.MAX_REQUESTS_PER_MINUTE}/minute",
+            route_policies=config.RATE_LIMIT_ROUTES,
+            backend=create_backend(config.RATE_LIMIT_BACKEND),
+        )
+        install_rate_limiting(app, limiter, exempt=('/health', '/livez', '/readyz', '/startupz', '/metrics', '/static/'))
+        app.config['LIMITER'] = limiter
+        logger.info(f"✅ Rate limiting configurado ({limiter.stats()['backend']})")
     
     # === CACHE ===
     if config.CACHE_ENABLED:
@@ -177,16 +222,20 @@ def register_blueprints(app: Flask, config) -> None:
 def setup_middleware(app: Flask, config) -> None:
     """Configurar middleware personalizado"""
     
+    # === CONTROL DE ADMISIÓN ===
+    # Siempre instalado: aunque esté deshabilitado mantiene el contador atómico
+    # de peticiones en curso, que se libera en teardown (también si la vista falla)
+    from vigoleonrocks.services.admission_control import (
+        create_admission_controller, install_admission_control
+    )
+    install_admission_control(app, create_admission_controller(config))
+    logger.info(f"✅ Control de admisión configurado ({'activo' if config.ADMISSION_CONTROL_ENABLED else 'solo conteo'})")
+    
     @app.before_request
     def before_request():
         """Middleware ejecutado antes de cada request"""
         g.start_time = time.time()
-        g.request_id = f"req_{system_entropy():.6f}_{int(time.time() * 1000000) % 1000000}"
-        
-        # Incrementar métricas
-        if hasattr(app, 'metrics'):
-            app.metrics['requests_total'] = app.metrics.get('requests_total', 0) + 1
-            app.metrics['active_connections'] = app.metrics.get('active_connections', 0) + 1
+        g.request_id = get_entropy().request_id('req')
     
     @app.after_request
     def after_request(response):
@@ -196,9 +245,6 @@ def setup_middleware(app: Flask, config) -> None:
             
             # Actualizar métricas
             if hasattr(app, 'metrics'):
-                app.metrics['active_connections'] = max(0, 
-                    app.metrics.get('active_connections', 1) - 1)
-                
                 if 'response_times' not in app.metrics:
                     app.metrics['response_times'] = []
                 
@@ -219,33 +265,24 @@ def setup_middleware(app: Flask, config) -> None:
 def setup_background_tasks(app: Flask, config) -> None:
     """Configurar tareas en background"""
     import time
-    
-    def metrics_updater():
-        """Thread para actualizar métricas del sistema"""
-        while True:
-            try:
-                with app.app_context():
-                    # Actualizar métricas del sistema
-                    if not hasattr(app, 'metrics'):
-                        app.metrics = {}
-                    
-                    app.metrics['uptime_seconds'] = time.time() - app.metrics.get('start_time', time.time())
-                    app.metrics['system_entropy'] = system_entropy()
-                    app.metrics['last_update'] = time.time()
-                    
-                    # Métricas de memoria si psutil está disponible
-                    try:
-                        import psutil
-                        app.metrics['system_cpu'] = psutil.cpu_percent(interval=0.1)
-                        app.metrics['system_memory'] = psutil.virtual_memory().percent
-                    except ImportError:
-                        app.metrics['system_cpu'] = system_entropy() * 100
-                        app.metrics['system_memory'] = system_entropy() * 80 + 20
-                
-            except Exception as e:
-                logger.error(f"Error en metrics_updater: {e}")
-            
-            time.sleep(config.METRICS_UPDATE_INTERVAL)
+    from vigoleonrocks.services.event_loop_bridge import install_event_loop_bridge
+    from vigoleonrocks.services.system_sampler import get_system_sampler
+    
+    def metrics_updater(snapshot):
+        """Actualiza app.metrics desde el muestreador compartido (sin hilo propio)"""
+        app.metrics['uptime_seconds'] = time.time() - app.metrics.get('start_time', time.time())
+        app.metrics['system_entropy'] = system_entropy()
+        app.metrics['last_update'] = snapshot.timestamp
+        app.metrics['system_cpu'] = snapshot.system_cpu_percent
+        app.metrics['system_memory'] = snapshot.memory_percent
+        app.metrics['process'] = snapshot.as_dict()
+        
+        admission = app.extensions.get('vigoleonrocks_admission')
+        if admission is not None:
+            app.metrics['requests_total'] = admission.in_flight.total
+            app.metrics['active_connections'] = admission.in_flight.value
+            app.metrics['admission'] = admission.stats()
+        app.metrics['event_loop'] = bridge.stats()
     
     # Inicializar métricas
     app.metrics = {
@@ -255,13 +292,9 @@ def setup_background_tasks(app: Flask, config) -> None:
         'response_times': []
     }
     
-    # Iniciar thread daemon
-    metrics_thread = threading.Thread(
-        target=metrics_updater,
-        daemon=True,
-        name="MetricsUpdater"
-    )
-    metrics_thread.start()
+    # Bucles asyncio persistentes para las corrutinas del manager multimodal (en vez de asyncio.run)
+    bridge = install_event_loop_bridge(app)
+    get_system_sampler().subscribe(metrics_updater, every=config.METRICS_UPDATE_INTERVAL)
     logger.info("✅ Background tasks iniciadas")
 
 
@@ -348,6 +381,109 @@ def setup_error_handlers(app: Flask, config) -> None:
 
 # === UTILIDADES ===
 
+# Consultas representativas para el warmup: saludo, explicación larga y cálculo
+WARMUP_QUERIES = ('Hola, ¿cómo estás?', 'Explain quantum entanglement simply',
+                  'Calcula 17 * 23 y explica el resultado')
+
+def setup_health_probes(app: Flask, config) -> None:
+    """Registrar /livez, /readyz, /startupz y lanzar el warmup de los motores"""
+    from vigoleonrocks.services.health_probes import (
+        HealthRegistry, cache_round_trip_check, coherence_round_trip_check,
+        event_loop_lag_check, install_health_probes, model_manager_check, thread_pool_check
+    )
+    
+    registry = HealthRegistry()
+    ttl, timeout = config.HEALTH_CHECK_TTL, config.HEALTH_CHECK_TIMEOUT
+    admission = app.extensions.get('vigoleonrocks_admission')
+    
+    def multimodal_executors():
+        manager = getattr(sys.modules.get('multimodal_ai_manager'), 'multimodal_manager', None)
+        return {'multimodal_executor': manager.executor} if manager is not None else {}
+    
+    # Latencia y lag sólo en readyz: bajo carga sacan la instancia del balanceo,
+    # pero no deben hacer que el orquestador la reinicie
+    registry.register('coherence_engine', coherence_round_trip_check(), ttl=ttl, timeout=timeout)
+    registry.register('event_loop', event_loop_lag_check(
+                          lambda: getattr(app.extensions.get('vigoleonrocks_event_loop'), 'loops', None),
+                          config.HEALTH_MAX_LOOP_LAG),
+                      ttl=ttl, timeout=timeout)
+    registry.register('cache', cache_round_trip_check(lambda: app.config.get('CACHE')),
+                      ttl=ttl * 2, timeout=timeout)
+    registry.register('model_manager', model_manager_check(),
+                      critical=config.MULTIMODAL_ENABLED, ttl=ttl * 2, timeout=timeout)
+    registry.register('thread_pool', thread_pool_check(
+                          lambda: admission.in_flight.value if admission else 1,
+                          config.WORKERS, config.HEALTH_MAX_SATURATION, multimodal_executors),
+                      ttl=min(ttl, 1.0), timeout=timeout)
+    
+    if config.HEALTH_WARMUP_ENABLED:
+        def warm_coherence():
+            from vigoleonrocks.core.quantum_coherence_engine import get_quantum_coherence_engine
+            engine = get_quantum_coherence_engine()
+            for dimensions in ([1], [1, 2, 3], list(range(1, 14)), list(range(1, 27))):
+                engine.calculate_quantum_coherence(dimensions, 0.7, 7, 2048)
+        
+        def warm_unified_service():
+            from vigoleonrocks.services.unified_ai_service import get_unified_service
+            service = get_unified_service()
+            for query in WARMUP_QUERIES:
+                service.process_query(query)
+        
+        def warm_dimension_activator():
+            from vigoleonrocks.core.quantum_dimension_activator import get_quantum_dimension_activator
+            activator = get_quantum_dimension_activator()
+            for query in WARMUP_QUERIES:
+                activator.activate_dimensions(query)
+        
+        def warm_parallel_processor():
+            # Por el puente de event loop, como las peticiones: calienta también sus hilos
+            from vigoleonrocks.core.quantum_dimension_activator import get_quantum_dimension_activator
+            from vigoleonrocks.core.quantum_parallel_processor import get_quantum_parallel_processor
+            from vigoleonrocks.services.event_loop_bridge import run_coroutine
+            processor = get_quantum_parallel_processor()
+            for query in WARMUP_QUERIES[:2]:
+                dimensions = get_quantum_dimension_activator().activate_dimensions(query)['activated_dimensions']
+                run_coroutine(processor.process_multidimensional_query(query, dimensions), timeout=30)
+        
+        # Motores de enhancements/: opcionales (math y few-shot dependen de numpy) y fuera de la
+        # ruta crítica de las peticiones, así que su fallo no bloquea /readyz
+        def warm_cot_engine():
+            from enhancements.quantum_cot_engine import QuantumChainOfThoughtEngine
+            QuantumChainOfThoughtEngine().process_query('Why does ice float on water? Explain step by step')
+        
+        def warm_math_engine():
+            from enhancements.quantum_math_engine import QuantumMathematicalReasoningEngine
+            engine = QuantumMathematicalReasoningEngine()
+            for problem in ('Solve 2x + 3 = 11', 'Solve x^2 - 5x + 6 = 0'):
+                engine.solve_mathematical_problem(problem)
+        
+        def warm_few_shot_engine():
+            from enhancements.quantum_few_shot_engine import QuantumFewShotLearningEngine
+            QuantumFewShotLearningEngine().enhance_query_with_examples('What is the capital of France?')
+        
+        def warm_code_engine():
+            from enhancements.quantum_code_engine import QuantumCodeGenerationEngine
+            QuantumCodeGenerationEngine().generate_code_solution('Write a function that reverses a string')
+        
+        registry.add_warmup('coherence_engine', warm_coherence)
+        registry.add_warmup('unified_ai_service', warm_unified_service)
+        registry.add_warmup('dimension_activator', warm_dimension_activator)
+        registry.add_warmup('parallel_processor', warm_parallel_processor)
+        registry.add_warmup('cot_engine', warm_cot_engine, critical=False)
+        registry.add_warmup('math_engine', warm_math_engine, critical=False)
+        registry.add_warmup('few_shot_engine', warm_few_shot_engine, critical=False)
+        registry.add_warmup('code_engine', warm_code_engine, critical=False)
+        if config.MULTIMODAL_ENABLED:
+            def warm_multimodal():
+                from multimodal_ai_manager import get_multimodal_manager
+                get_multimodal_manager()
+            registry.add_warmup('multimodal_manager', warm_multimodal, critical=False)
+    
+    install_health_probes(app, registry)
+    registry.start_warmup()
+    logger.info("✅ Probes /livez, /readyz, /startupz configurados")
+
+
 def get_app_info(app: Flask) -> Dict[str, Any]:
     """Obtener información de la aplicación"""
     config = app.config.get('CONFIG_OBJECT')
@@ -366,7 +502,13 @@ def get_app_info(app: Flask) -> Dict[str, Any]:
 
 
 def health_check(app: Flask) -> Dict[str, Any]:
-    """Health check de la aplicación"""
+    """
+    Health check de la aplicación
+    
+    Además de la configuración y los directorios incluye las comprobaciones de
+    readiness (motor de coherencia, cache, modelos, saturación, bucle de eventos)
+    y el estado del warmup.
+    """
     try:
         config = app.config.get('CONFIG_OBJECT')
         
@@ -379,19 +521,18 @@ def health_check(app: Flask) -> Dict[str, Any]:
             'static_dir': config.STATIC_DIR.exists() if config else False
         }
         
-        # Verificar multimodal (si está habilitado)
-        if config and config.MULTIMODAL_ENABLED:
-            try:
-                from multimodal_ai_manager import get_multimodal_manager
-                manager = get_multimodal_manager()
-                checks['multimodal_manager'] = True
-            except Exception:
-                checks['multimodal_manager'] = False
+        ready = True
+        registry = app.extensions.get('vigoleonrocks_health')
+        if registry is not None:
+            ready, report = registry.probe('readyz')
+            checks.update({name: result['ok'] for name, result in report['checks'].items()})
+            checks['warmup'] = report['warmup']['complete'] and report['warmup']['succeeded']
         
-        all_healthy = all(checks.values())
+        all_healthy = ready and all(checks.values())
         
         return {
             'status': 'healthy' if all_healthy else 'degraded',
+            'ready': ready,
             'checks': checks,
             'timestamp': time.time()
         }
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Admission Control Load Test
+
+Open-loop load from 0.5x to 3x the service capacity against a server model
+that behaves like waitress: a large worker thread pool with an unbounded
+task queue in front of a resource that can only do ``capacity`` requests at
+once. Clients give up after ``--client-timeout``; a response is goodput only
+if it arrives before that.
+
+Without admission control every request is eventually served, so past
+saturation the queue grows, latency passes the client timeout and goodput
+collapses to zero. With the AdmissionController the excess gets a fast 503
+(queue bound, CoDel, expired deadline) and goodput stays at capacity.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.admission_control import (
+    AdmissionController, ConcurrencyLimit, Overloaded
+)
+
+
+class ServerModel:
+    """Pool de hilos tipo waitress delante de un recurso con ``capacity`` plazas"""
+
+    def __init__(self, capacity: int, service_time: float, threads: int,
+                 controller: AdmissionController = None):
+        self.resource = threading.BoundedSemaphore(capacity)
+        self.service_time = service_time
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='server')
+        self.controller = controller
+        self.results = []
+        self._lock = threading.Lock()
+
+    def _work(self):
+        with self.resource:
+            time.sleep(self.service_time)
+
+    def _handle(self, arrived: float, deadline: float):
+        status = 200
+        if self.controller is None:
+            self._work()
+        else:
+            try:
+                ticket = self.controller.admit('/api/chat', deadline=deadline, enqueued_at=arrived)
+            except Overloaded:
+                status = 503
+            else:
+                try:
+                    self._work()
+                finally:
+                    ticket.release()
+        latency = time.monotonic() - arrived
+        with self._lock:
+            self.results.append((status, latency))
+
+    def submit(self, arrived: float, deadline: float):
+        self.pool.submit(self._handle, arrived, deadline)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_level(rate: float, args, admission: bool, seed: int) -> dict:
+    controller = None
+    if admission:
+        controller = AdmissionController(
+            default_limit=ConcurrencyLimit(args.capacity, args.queue),
+            codel_target=args.codel_target,
+            codel_interval=args.codel_interval,
+            queue_timeout=args.client_timeout,
+        )
+    server = ServerModel(args.capacity, args.service_time, args.threads, controller)
+    rng = random.Random(seed)
+    start = time.monotonic()
+    next_arrival = start
+    sent = 0
+    while next_arrival < start + args.duration:
+        now = time.monotonic()
+        if next_arrival > now:
+            time.sleep(next_arrival - now)
+        # llegada abierta: se envía a su hora aunque el servidor vaya atrasado
+        server.submit(next_arrival, next_arrival + args.client_timeout)
+        sent += 1
+        next_arrival += rng.expovariate(rate)
+    server.close()
+
+    ok = [lat for status, lat in server.results if status == 200]
+    good = [lat for lat in ok if lat <= args.client_timeout]
+    shed = [lat for status, lat in server.results if status == 503]
+    return {
+        'offered_rps': round(sent / args.duration, 1),
+        'goodput_rps': round(len(good) / args.duration, 1),
+        'served_late': len(ok) - len(good),
+        'shed_503': len(shed),
+        'p50_ms': round((_percentile(ok, 0.5) or 0) * 1000, 1),
+        'p99_ms': round((_percentile(ok, 0.99) or 0) * 1000, 1),
+        'shed_p99_ms': round((_percentile(shed, 0.99) or 0) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Goodput past saturation with/without admission control')
+    parser.add_argument('--capacity', type=int, default=8, help='Concurrent requests the resource can serve')
+    parser.add_argument('--service-time', type=float, default=0.02, help='Seconds per request')
+    parser.add_argument('--threads', type=int, default=64, help='Server worker threads')
+    parser.add_argument('--queue', type=int, default=16, help='Admission wait queue size')
+    parser.add_argument('--codel-target', type=float, default=0.01)
+    parser.add_argument('--codel-interval', type=float, default=0.1)
+    parser.add_argument('--client-timeout', type=float, default=0.5)
+    parser.add_argument('--duration', type=float, default=3.0, help='Seconds per load level')
+    parser.add_argument('--loads', type=float, nargs='+', default=[0.5, 0.8, 1.0, 1.5, 2.0, 3.0],
+                        help='Offered load as a multiple of capacity')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    capacity_rps = args.capacity / args.service_time
+    print("🛡️ VIGOLEONROCKS Admission Control Load Test")
+    print("=" * 78)
+    print(f"capacity {capacity_rps:.0f} req/s, client timeout {args.client_timeout * 1000:.0f} ms")
+    print(f"{'load':>5} {'mode':<10} {'offered':>8} {'goodput':>8} {'late':>6} {'503':>6} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'503 p99':>8}")
+    results = []
+    for i, load in enumerate(args.loads):
+        for admission in (False, True):
+            row = run_level(load * capacity_rps, args, admission, seed=i)
+            row.update(load=load, admission_control=admission)
+            results.append(row)
+            mode = 'admission' if admission else 'baseline'
+            print(f"{load:>5.1f} {mode:<10} {row['offered_rps']:>8.0f} {row['goodput_rps']:>8.0f} "
+                  f"{row['served_late']:>6} {row['shed_503']:>6} {row['p50_ms']:>8.1f} "
+                  f"{row['p99_ms']:>8.1f} {row['shed_p99_ms']:>8.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'capacity_rps': capacity_rps, 'config': vars(args), 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
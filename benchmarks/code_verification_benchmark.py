@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Code Verification Benchmark
+
+Measures sandboxed verifications/sec for the pre-started execution pool
+against the naive approach of starting a fresh interpreter per check.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from enhancements.code_execution_sandbox import ExecutionVerifier, SandboxWorkerPool
+
+SAMPLE_CODE = '''
+def solution(arr):
+    return sorted(arr)
+'''
+
+SAMPLE_CASES = [(([3, 1, 2],), [1, 2, 3]), (([],), []), (([5, -1],), [-1, 5])]
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def benchmark_pool(iterations: int, workers: int, concurrency: int) -> dict:
+    """Verifications/sec through the pre-started pool"""
+    with SandboxWorkerPool(size=workers) as pool:
+        verifier = ExecutionVerifier(pool=pool)
+        verifier.run_test_cases(SAMPLE_CODE, "solution", SAMPLE_CASES)  # warmup
+
+        latencies = []
+
+        def one(_):
+            t0 = time.perf_counter()
+            result = verifier.run_test_cases(SAMPLE_CODE, "solution", SAMPLE_CASES)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            return result.pass_rate
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pass_rates = list(executor.map(one, range(iterations)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "prefork_pool",
+        "workers": workers,
+        "concurrency": concurrency,
+        "iterations": iterations,
+        "verifications_per_sec": iterations / elapsed,
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p99_ms": _percentile(latencies, 0.99),
+        "all_passed": all(rate == 1.0 for rate in pass_rates),
+    }
+
+
+def benchmark_subprocess(iterations: int) -> dict:
+    """Baseline: a fresh interpreter for every verification"""
+    script = SAMPLE_CODE + "\nassert solution([3, 1, 2]) == [1, 2, 3]\n"
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=False, capture_output=True, timeout=10)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": "subprocess_per_check",
+        "iterations": iterations,
+        "verifications_per_sec": iterations / elapsed,
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p99_ms": _percentile(latencies, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sandboxed code verification benchmark')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--baseline-iterations', type=int, default=20)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    print("🧪 VIGOLEONROCKS Code Verification Benchmark")
+    print("=" * 60)
+
+    results = [
+        benchmark_pool(args.iterations, args.workers, concurrency=1),
+        benchmark_pool(args.iterations, args.workers, concurrency=args.workers),
+        benchmark_subprocess(args.baseline_iterations),
+    ]
+
+    for result in results:
+        print(f"{result['mode']:<22} conc={result.get('concurrency', 1):<3} "
+              f"{result['verifications_per_sec']:8.1f} verif/s  "
+              f"p50={result['p50_ms']:6.2f}ms  p99={result['p99_ms']:6.2f}ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📄 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
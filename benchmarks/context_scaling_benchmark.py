@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Long-Context Scaling Benchmark
+
+Pushes deterministic synthetic documents of 1K/10K/100K/500K tokens
+(~4 characters per token) through each processing stage:
+
+- unified:              UnifiedAIService.process_query
+- dimension_activator:  QuantumDimensionActivator.analyze_query
+- few_shot:             QuantumFewShotLearningEngine.enhance_query_with_examples
+- http:                 POST /api/vigoleonrocks (--base-url, or in-process with --http-app)
+
+Each (stage, size) point runs in a fresh spawned process so peak RSS is not
+inherited. It records median latency, peak RSS, RSS growth, the traced
+allocation peak (tracemalloc), and the GC collections / retained blocks of one
+untraced call. A log-log least-squares fit per stage gives the scaling
+exponent (latency ∝ tokens^k); stages with k above the threshold are flagged
+as superlinear.
+
+Example:
+    python benchmarks/context_scaling_benchmark.py --output context_scaling.json
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.context_scaling import (
+    CHARS_PER_TOKEN, DEFAULT_SIZES, SUPERLINEAR_THRESHOLD, fit_scaling_exponent, generate_document,
+)
+
+
+# ===== STAGES =====
+
+def _setup_unified(options: Dict[str, Any]) -> Callable[[str], Any]:
+    from vigoleonrocks.services.unified_ai_service import UnifiedAIService
+    service = UnifiedAIService()
+    return lambda text: service.process_query(text)
+
+
+def _setup_dimension_activator(options: Dict[str, Any]) -> Callable[[str], Any]:
+    from vigoleonrocks.core.quantum_dimension_activator import QuantumDimensionActivator
+    activator = QuantumDimensionActivator()
+    return activator.analyze_query
+
+
+def _setup_few_shot(options: Dict[str, Any]) -> Callable[[str], Any]:
+    from enhancements.quantum_few_shot_engine import QuantumFewShotLearningEngine
+    engine = QuantumFewShotLearningEngine()
+    engine.preload_common_examples()
+    return lambda text: engine.enhance_query_with_examples(text, domain="general")
+
+
+def _setup_http(options: Dict[str, Any]) -> Callable[[str], Any]:
+    payload = lambda text: {"message": text, "context_level": "high"}  # noqa: E731
+    if options.get("http_app"):
+        import importlib
+        client = importlib.import_module(options["http_app"]).app.test_client()
+
+        def post(text):
+            response = client.post("/api/vigoleonrocks", json=payload(text))
+            if response.status_code >= 500:
+                raise RuntimeError(f"HTTP {response.status_code}")
+            return response.get_json()
+        return post
+
+    url = options.get("base_url", "http://127.0.0.1:5000").rstrip("/") + "/api/vigoleonrocks"
+    timeout = options.get("http_timeout", 120.0)
+
+    def post(text):
+        request = urllib.request.Request(url, data=json.dumps(payload(text)).encode("utf-8"),
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read() or b"{}")
+    return post
+
+
+STAGES: Dict[str, Callable[[Dict[str, Any]], Callable[[str], Any]]] = {
+    "unified": _setup_unified,
+    "dimension_activator": _setup_dimension_activator,
+    "few_shot": _setup_few_shot,
+    "http": _setup_http,
+}
+
+
+def _max_rss_mb() -> float:
+    try:
+        import resource
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    except ImportError:
+        return 0.0
+
+
+def _gc_collections() -> int:
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+
+def measure_point(stage: str, tokens: int, repeats: int = 3, seed: int = 26, trace: bool = True,
+                  options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Measure one (stage, size) point in the current process"""
+    options = options or {}
+    try:
+        fn = STAGES[stage](options)
+    except ImportError as e:
+        return {"tokens": tokens, "status": "skipped", "error": f"{type(e).__name__}: {e}"}
+    document = generate_document(tokens, seed)
+    point: Dict[str, Any] = {"tokens": tokens, "chars": len(document), "words": len(document.split())}
+
+    gc.collect()
+    rss_before = _max_rss_mb()
+    latencies = []
+    try:
+        for run in range(max(1, repeats)):
+            if run == 0:
+                collections, blocks = _gc_collections(), sys.getallocatedblocks()
+            start = time.perf_counter()
+            fn(document)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if run == 0:
+                point["gc_collections"] = _gc_collections() - collections
+                point["blocks_retained"] = sys.getallocatedblocks() - blocks
+        rss_after = _max_rss_mb()
+        if trace:
+            tracemalloc.start()
+            fn(document)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            point["alloc_peak_mb"] = round(peak / (1024 * 1024), 3)
+    except Exception as e:
+        point.update(status="error", error=f"{type(e).__name__}: {e}")
+        return point
+
+    point.update(
+        status="ok",
+        latency_ms=round(statistics.median(latencies), 3),
+        latency_runs_ms=[round(value, 3) for value in latencies],
+        peak_rss_mb=round(rss_after, 2),
+        rss_growth_mb=round(max(0.0, rss_after - rss_before), 2),
+    )
+    return point
+
+
+def _child(queue, stage, tokens, repeats, seed, trace, options):
+    queue.put(measure_point(stage, tokens, repeats, seed, trace, options))
+
+
+def run_point_isolated(stage: str, tokens: int, repeats: int, seed: int, trace: bool,
+                       options: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+    """Run ``measure_point`` in a fresh spawned interpreter with a wall-clock limit"""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(queue, stage, tokens, repeats, seed, trace, options))
+    process.start()
+    try:
+        return queue.get(timeout=timeout_s)
+    except Exception:
+        return {"tokens": tokens, "status": "timeout", "error": f"exceeded {timeout_s:.0f}s"}
+    finally:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def summarize_stage(points: List[Dict[str, Any]], threshold: float = SUPERLINEAR_THRESHOLD) -> Dict[str, Any]:
+    ok = [p for p in points if p.get("status") == "ok"]
+    sizes = [p["tokens"] for p in ok]
+    latency_fit = fit_scaling_exponent(sizes, [p["latency_ms"] for p in ok])
+    memory_fit = fit_scaling_exponent(sizes, [p.get("alloc_peak_mb") or p["rss_growth_mb"] for p in ok])
+    if not ok:
+        status = points[0].get("status", "error") if points else "empty"
+    else:
+        status = "ok" if len(ok) == len(points) else "partial"
+    return {
+        "status": status,
+        "points": points,
+        "latency_fit": latency_fit,
+        "memory_fit": memory_fit,
+        "superlinear": bool(latency_fit["exponent"] is not None and latency_fit["exponent"] > threshold),
+        # A timeout at a larger size after successful smaller ones is itself a scaling failure
+        "timed_out": any(p.get("status") == "timeout" for p in points),
+    }
+
+
+def run_suite(stages: Sequence[str], sizes: Sequence[int], repeats: int = 3, seed: int = 26,
+              trace: bool = True, options: Optional[Dict[str, Any]] = None, timeout_s: float = 600.0,
+              isolate: bool = True, threshold: float = SUPERLINEAR_THRESHOLD) -> Dict[str, Any]:
+    options = options or {}
+    report: Dict[str, Any] = {
+        "config": {"sizes": list(sizes), "repeats": repeats, "seed": seed, "chars_per_token": CHARS_PER_TOKEN,
+                   "trace_allocations": trace, "superlinear_threshold": threshold},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpu_count": os.cpu_count()},
+        "stages": {},
+    }
+    for stage in stages:
+        points = []
+        for tokens in sizes:
+            if isolate:
+                point = run_point_isolated(stage, tokens, repeats, seed, trace, options, timeout_s)
+            else:
+                point = measure_point(stage, tokens, repeats, seed, trace, options)
+            points.append(point)
+            _print_point(stage, point)
+            if point["status"] in ("skipped", "timeout") or (
+                    point["status"] == "error" and not any(p["status"] == "ok" for p in points)):
+                break  # larger sizes would only repeat the failure or take even longer
+        report["stages"][stage] = summarize_stage(points, threshold)
+    return report
+
+
+def _print_point(stage: str, point: Dict[str, Any]) -> None:
+    if point["status"] != "ok":
+        print(f"   {stage:<20} {point['tokens']:>8,} tok  {point['status'].upper()}: {point.get('error', '')}")
+        return
+    alloc = f"{point['alloc_peak_mb']:>9.2f}" if "alloc_peak_mb" in point else f"{'-':>9}"
+    print(f"   {stage:<20} {point['tokens']:>8,} tok  {point['latency_ms']:>10.2f} ms  "
+          f"RSS {point['peak_rss_mb']:>8.1f} MB (+{point['rss_growth_mb']:.1f})  "
+          f"alloc peak {alloc} MB  gc {point['gc_collections']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Long-context scaling benchmark (1K–500K tokens)')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Comma-separated stages')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES), help='Token sizes')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=26)
+    parser.add_argument('--timeout', type=float, default=600.0, help='Seconds per (stage, size) point')
+    parser.add_argument('--threshold', type=float, default=SUPERLINEAR_THRESHOLD)
+    parser.add_argument('--no-trace', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--http-app', default=None, help='Module exposing a Flask `app` (e.g. flask_app) for in-process HTTP')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    stages = [s.strip() for s in args.stages.split(',') if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    sizes = [int(s) for s in args.sizes.split(',')]
+
+    print("📏 VIGOLEONROCKS Long-Context Scaling Benchmark")
+    print("=" * 60)
+    report = run_suite(stages, sizes, args.repeats, args.seed, not args.no_trace,
+                       {"base_url": args.base_url, "http_app": args.http_app}, args.timeout,
+                       threshold=args.threshold)
+
+    print("\n📈 Scaling exponents (latency ∝ tokens^k)")
+    for stage, summary in report["stages"].items():
+        k = summary["latency_fit"]["exponent"]
+        if k is None:
+            print(f"   {stage:<20} {summary['status']}")
+            continue
+        flag = "⚠️  SUPERLINEAR" if summary["superlinear"] else "✅"
+        if summary["timed_out"]:
+            flag += " (timed out at a larger size)"
+        print(f"   {stage:<20} k = {k:.2f} (r² {summary['latency_fit']['r2']:.2f})  "
+              f"memory k = {summary['memory_fit']['exponent']}  {flag}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
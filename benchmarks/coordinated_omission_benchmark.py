@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Coordinated Omission Benchmark
+
+Measures the same local server twice: with the closed-loop pattern the old
+``PerformanceBenchmark.benchmark_api_endpoints`` used (a thread pool of
+blocking clients, latency timed from the actual send) and with the open-loop
+``load_generator`` (arrivals on a fixed schedule, latency timed from the
+intended send). The server serves one request at a time in ``--service-ms``
+and stalls for ``--stall-ms`` every ``--stall-every`` requests, like a GC
+pause or a lock convoy.
+
+While the server stalls, the closed-loop clients are all blocked waiting, so
+they stop sending: only the few requests in flight see the stall and the
+requests that would have queued behind it are never issued. The open-loop
+generator keeps sending and every one of those requests reports its wait.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.histogram import LatencyHistogram
+from vigoleonrocks.services.load_generator import LoadProfile, RequestSpec, run_load
+
+
+def start_server(service_s: float, stall_s: float, stall_every: int):
+    state = {'seen': 0, 'lock': threading.Lock()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        wbufsize = -1
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with state['lock']:
+                state['seen'] += 1
+                time.sleep(stall_s if state['seen'] % stall_every == 0 else service_s)
+            data = b'{"status": "ok"}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def closed_loop(port: int, duration: float, clients: int) -> LatencyHistogram:
+    """N blocking clients, each sending its next request when the previous one returns"""
+    hist, lock = LatencyHistogram(), threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            conn.request('GET', '/api/status')
+            conn.getresponse().read()
+            with lock:
+                hist.record((time.perf_counter() - start) * 1000)
+        conn.close()
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for _ in range(clients):
+            executor.submit(client)
+    return hist
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Closed-loop vs open-loop latency under server stalls')
+    parser.add_argument('--service-ms', type=float, default=5.0)
+    parser.add_argument('--stall-ms', type=float, default=500.0)
+    parser.add_argument('--stall-every', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--clients', type=int, default=4, help='Closed-loop threads')
+    parser.add_argument('--load-factor', type=float, default=0.5,
+                        help='Open-loop rate as a fraction of the closed-loop throughput')
+    parser.add_argument('--output', default=None, help='Optional JSON results file')
+    args = parser.parse_args()
+
+    print("📈 Coordinated omission: closed loop vs open loop against a stalling server")
+    print(f"   service {args.service_ms:g} ms, {args.stall_ms:g} ms stall every {args.stall_every} requests, "
+          f"{args.duration:g}s per run")
+
+    server = start_server(args.service_ms / 1000, args.stall_ms / 1000, args.stall_every)
+    try:
+        started = time.perf_counter()
+        closed = closed_loop(server.server_port, args.duration, args.clients)
+        closed_rps = closed.count / (time.perf_counter() - started)
+        time.sleep(1.0)
+
+        # A fraction of the throughput the closed loop achieved, on a fixed schedule
+        profile = LoadProfile('constant', round(closed_rps * args.load_factor, 1), args.duration)
+        result = run_load(f"http://127.0.0.1:{server.server_port}", [RequestSpec('GET', '/api/status')], profile,
+                          connections=64, timeout=30)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    rows = {
+        'closed_loop': {'rps': round(closed_rps, 1), **closed.snapshot()},
+        'open_loop': {'rps': round(result.achieved_rps, 1), **result.latency.snapshot()},
+    }
+    print(f"{'generator':<12} {'rps':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} {'max':>8}")
+    for name, row in rows.items():
+        print(f"{name:<12} {row['rps']:>7.1f} {row['p50']:>8.1f} {row['p90']:>8.1f} {row['p99']:>8.1f} "
+              f"{row['p999']:>8.1f} {row['max']:>8.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'config': vars(args), 'results': rows}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS CPU Offload Benchmark
+
+Chat latency isolation under mixed chat + image traffic. Request threads
+stand in for the waitress worker threads of one process:
+
+- chat threads issue a short, GIL-bound request every 10 ms and record
+  latency from the scheduled arrival time
+- image threads upload images back to back and run feature extraction
+  either in the request thread (before) or through CPUOffloadPool (after)
+
+With Pillow + NumPy installed the real ``analyze_image_quantum`` is used;
+otherwise a pure-Python pixel loop shaped like ``app.py`` ``process_image``
+(per-pixel brightness sum) stands in for it.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from vigoleonrocks.services.cpu_offload import CPUOffloadPool
+
+try:
+    import numpy as np
+    from PIL import Image
+    from quantum_image_processor import analyze_image_quantum
+except ImportError:  # no Pillow/NumPy: use the synthetic pixel loop
+    analyze_image_quantum = None
+
+
+def pixel_loop_analysis(image_data: bytes, filename: str) -> dict:
+    """Stand-in for process_image: per-pixel brightness over an RGB buffer"""
+    total = 0
+    for i in range(0, len(image_data) - 2, 3):
+        total += image_data[i] + image_data[i + 1] + image_data[i + 2]
+    return {'filename': filename, 'average': total / max(1, len(image_data) // 3)}
+
+
+def make_image(side: int) -> bytes:
+    if analyze_image_quantum is None:
+        return os.urandom(side * side * 3)
+    import io
+    rng = np.random.default_rng(side)
+    buf = io.BytesIO()
+    Image.fromarray(rng.integers(0, 256, (side, side, 3), dtype=np.uint8)).save(buf, format='JPEG')
+    return buf.getvalue()
+
+
+def chat_handler(message: str) -> int:
+    """Small GIL-bound request: tokenize and score, ~1 ms"""
+    score = 0
+    for _ in range(20):
+        for token in message.lower().split():
+            score += hash(token) & 0xff
+    return score
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def run_mode(mode: str, analyze, image: bytes, duration: float, chat_threads: int,
+             image_threads: int, pool: CPUOffloadPool = None) -> dict:
+    stop = threading.Event()
+    chat_ms, image_ms = [], []
+    message = "hola necesito ayuda con la factura del mes pasado y el envío " * 4
+
+    def chat_loop():
+        # Latency counts from the scheduled arrival, so time spent waiting for
+        # the GIL before the handler even starts is included
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            next_at += 0.01
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            chat_handler(message)
+            chat_ms.append((time.perf_counter() - next_at) * 1000)
+
+    def image_loop(index):
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            if pool is None:
+                analyze(image, f'img_{index}.jpg')
+            else:
+                pool.run(analyze, image, f'img_{index}.jpg')
+            image_ms.append((time.perf_counter() - t0) * 1000)
+
+    threads = [threading.Thread(target=chat_loop) for _ in range(chat_threads)]
+    threads += [threading.Thread(target=image_loop, args=(i,)) for i in range(image_threads)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        'mode': mode,
+        'chat_requests': len(chat_ms),
+        'chat_p50_ms': round(percentile(chat_ms, 0.5), 2),
+        'chat_p99_ms': round(percentile(chat_ms, 0.99), 2),
+        'chat_max_ms': round(max(chat_ms, default=0.0), 2),
+        'images': len(image_ms),
+        'images_per_s': round(len(image_ms) / duration, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chat p99 under mixed chat + image traffic, in-thread vs process pool')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--chat-threads', type=int, default=4)
+    parser.add_argument('--image-threads', type=int, default=2)
+    parser.add_argument('--image-side', type=int, default=1024)
+    parser.add_argument('--workers', type=int, default=0, help='Pool workers (0 = service default)')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    analyze = analyze_image_quantum or pixel_loop_analysis
+    image = make_image(args.image_side)
+
+    print("🧮 VIGOLEONROCKS CPU Offload Benchmark")
+    print("=" * 60)
+    print(f"  workload: {analyze.__name__} on {len(image)} byte image, "
+          f"{args.chat_threads} chat + {args.image_threads} image threads, {args.duration:.0f}s each")
+
+    results = [run_mode('chat only', analyze, image, args.duration, args.chat_threads, 0)]
+    results.append(run_mode('images in request thread', analyze, image, args.duration,
+                            args.chat_threads, args.image_threads))
+    pool = CPUOffloadPool(workers=args.workers, enabled=True)
+    pool.start()
+    try:
+        results.append(run_mode('images in process pool', analyze, image, args.duration,
+                                args.chat_threads, args.image_threads, pool=pool))
+    finally:
+        pool.shutdown()
+
+    for row in results:
+        print(f"  {row['mode']:<26} chat p50 {row['chat_p50_ms']:>7.2f} ms  p99 {row['chat_p99_ms']:>8.2f} ms  "
+              f"max {row['chat_max_ms']:>8.2f} ms  images {row['images_per_s']:>6.2f}/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'cpu_count': os.cpu_count(), 'pool': pool.stats(), 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Embedding Index Benchmark
+
+Build time, query latency and recall@10 of the CLIP similarity index
+(vigoleonrocks/services/embedding_index.py) at 10K and 1M random unit
+vectors:
+
+- exact: full matrix-vector product + argpartition (ground truth)
+- ivf: spherical k-means lists, for a sweep of nprobe values
+
+Uniform random vectors have no cluster structure, which is the worst case
+for IVF; real CLIP embeddings cluster and reach a given recall with a
+smaller nprobe. 1M x 512 float32 is 2 GB: use ``--dim`` or ``--sizes`` to
+fit smaller machines, and ``--persist`` to keep the matrix memory-mapped on
+disk as in production.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from vigoleonrocks.services.embedding_index import EmbeddingIndex, EmbeddingStore, normalize
+
+
+def random_vectors(n: int, dim: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 100000):  # in blocks: no n x dim temporaries
+        block = rng.standard_normal((min(100000, n - start), dim), dtype=np.float32)
+        out[start:start + len(block)] = normalize(block)
+    return out
+
+
+def timed_queries(index: EmbeddingIndex, queries: np.ndarray, **kwargs):
+    latencies, results = [], []
+    for query in queries:
+        t0 = time.perf_counter()
+        results.append([r['id'] for r in index.search(query, k=10, **kwargs)])
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    return results, {
+        'p50_ms': round(latencies[len(latencies) // 2], 3),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))], 3),
+    }
+
+
+def run_size(n: int, dim: int, queries: int, nprobes, path: str) -> dict:
+    print(f"\n📦 {n:,} vectors x {dim}")
+    data = random_vectors(n, dim, seed=n)
+    query_vectors = random_vectors(queries, dim, seed=1)
+
+    t0 = time.perf_counter()
+    store = EmbeddingStore(path, dim=dim, initial_capacity=n)
+    store.add_many(data, [str(i) for i in range(n)])
+    store_s = time.perf_counter() - t0
+    del data
+
+    index = EmbeddingIndex(store, exact_max=0, background=False)
+    truth, exact_latency = timed_queries(index, query_vectors, mode='exact')
+    build_s = index.build()
+    row = {'vectors': n, 'dim': dim, 'store_build_s': round(store_s, 3), 'ivf_build_s': round(build_s, 3),
+           'ivf_lists': len(index.ivf.centroids), 'exact': exact_latency, 'ivf': []}
+    print(f"  store {store_s:.2f}s  ivf build {build_s:.2f}s ({row['ivf_lists']} lists)")
+    print(f"  exact        p50 {exact_latency['p50_ms']:>8.3f} ms  p99 {exact_latency['p99_ms']:>8.3f} ms  recall@10 1.000")
+    for nprobe in nprobes:
+        found, latency = timed_queries(index, query_vectors, mode='ivf', nprobe=nprobe)
+        recall = float(np.mean([len(set(a) & set(b)) / 10 for a, b in zip(found, truth)]))
+        row['ivf'].append({'nprobe': nprobe, **latency, 'recall_at_10': round(recall, 4)})
+        print(f"  ivf np={nprobe:<4} p50 {latency['p50_ms']:>8.3f} ms  p99 {latency['p99_ms']:>8.3f} ms  "
+              f"recall@10 {recall:.3f}")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Embedding index build time, query latency and recall@10')
+    parser.add_argument('--sizes', default='10000,1000000')
+    parser.add_argument('--dim', type=int, default=512, help='CLIP ViT-B/32 = 512, ViT-L/14 = 768')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--nprobe', default='4,16,64')
+    parser.add_argument('--persist', action='store_true', help='Memory-mapped store in a temp directory')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    print("🧭 VIGOLEONROCKS Embedding Index Benchmark")
+    print("=" * 60)
+    nprobes = [int(n) for n in args.nprobe.split(',')]
+    results = []
+    for n in (int(s) for s in args.sizes.split(',')):
+        if args.persist:
+            with tempfile.TemporaryDirectory() as tmp:
+                results.append(run_size(n, args.dim, args.queries, nprobes, tmp))
+        else:
+            results.append(run_size(n, args.dim, args.queries, nprobes, ''))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Engine Routing Benchmark
+
+Routing accuracy for the previous keyword chain of QuantumEngineManager, the
+default scoring weights and perceptron-refined weights, plus routing and
+end-to-end latency with and without speculative top-2 execution.
+
+benchmarks/data/routing_queries.tsv was written together with FEATURE_LEXICON,
+so accuracy on it is in-sample and only reported as such (plus k-fold CV for
+the perceptron). The headline numbers come from routing_heldout.tsv, written
+separately and never used to tune the lexicon or the weights.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from enhancements.quantum_engine_router import (
+    ENGINE_NAMES, CallableAdapter, EngineRouter, build_default_adapters, load_labelled_queries
+)
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'data', 'routing_queries.tsv')
+HELDOUT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'routing_heldout.tsv')
+
+
+def legacy_route(query: str) -> str:
+    """Cadena de palabras clave anterior de ``QuantumEngineManager.process_query``"""
+    query_lower = query.lower()
+    if any(word in query_lower for word in ['calcular', 'suma', 'resta', 'multiplicar', 'dividir', 'ecuación', 'matemática']):
+        return 'math'
+    if any(word in query_lower for word in ['código', 'python', 'javascript', 'programar', 'función', 'class']):
+        return 'code'
+    if any(word in query_lower for word in ['porque', 'explicar', 'analizar', 'razonamiento', 'lógica']):
+        return 'cot'
+    if any(word in query_lower for word in ['ejemplo', 'como hacer', 'tutorial', 'paso a paso']):
+        return 'few_shot'
+    return 'cot'
+
+
+def _accuracy(predict, rows) -> float:
+    return sum(predict(query) == label for label, query in rows) / len(rows)
+
+
+def _stand_in_router(**kwargs) -> EngineRouter:
+    def make(name, latency_s, confidence):
+        def run(query, context):
+            time.sleep(latency_s)
+            return {"response": f"{name}: {query}", "confidence": confidence}
+        return CallableAdapter(name, run)
+    latencies = {"math": 0.002, "code": 0.008, "cot": 0.005, "few_shot": 0.003}
+    confidences = {"math": 0.8, "code": 0.7, "cot": 0.6, "few_shot": 0.65}
+    return EngineRouter([make(n, latencies[n], confidences[n]) for n in ENGINE_NAMES], **kwargs)
+
+
+def _real_router(**kwargs):
+    try:
+        from enhancements.quantum_cot_engine import QuantumChainOfThoughtEngine
+        from enhancements.quantum_math_engine import QuantumMathematicalReasoningEngine
+        from enhancements.quantum_few_shot_engine import QuantumFewShotLearningEngine
+        from enhancements.quantum_code_engine import QuantumCodeGenerationEngine
+    except ImportError as e:
+        print(f"⚠️  Real engines unavailable ({e}); using stand-in engines")
+        return None
+    few_shot = QuantumFewShotLearningEngine()
+    few_shot.preload_common_examples()
+    engines = {"cot": QuantumChainOfThoughtEngine(), "math": QuantumMathematicalReasoningEngine(),
+               "few_shot": few_shot, "code": QuantumCodeGenerationEngine()}
+    return EngineRouter(build_default_adapters(engines), **kwargs)
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+        "mean_ms": statistics.mean(ordered) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Engine routing accuracy/latency benchmark')
+    parser.add_argument('--folds', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--real-engines', action='store_true', help='Run the real quantum engines end to end')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    rows = load_labelled_queries(DATA_PATH)
+    heldout = load_labelled_queries(HELDOUT_PATH)
+    queries = [query for _, query in rows]
+
+    print("🧭 VIGOLEONROCKS Engine Routing Benchmark")
+    print("=" * 60)
+
+    router = EngineRouter([CallableAdapter(name, lambda q, c: q) for name in ENGINE_NAMES])
+    report = {
+        "samples": len(rows),
+        "heldout_samples": len(heldout),
+        "legacy_keyword_accuracy": _accuracy(legacy_route, heldout),
+        "default_weights_accuracy": _accuracy(lambda q: router.route(q).engine, heldout),
+        "in_sample_legacy_keyword_accuracy": _accuracy(legacy_route, rows),
+        "in_sample_default_weights_accuracy": _accuracy(lambda q: router.route(q).engine, rows),
+    }
+
+    fold_scores = []
+    for fold in range(args.folds):
+        train = [row for i, row in enumerate(rows) if i % args.folds != fold]
+        test = [row for i, row in enumerate(rows) if i % args.folds == fold]
+        fitted = EngineRouter([CallableAdapter(name, lambda q, c: q) for name in ENGINE_NAMES])
+        fitted.fit(train)
+        fold_scores.append(_accuracy(lambda q: fitted.route(q).engine, test))
+    report["perceptron_cv_accuracy"] = statistics.mean(fold_scores)
+    fitted = EngineRouter([CallableAdapter(name, lambda q, c: q) for name in ENGINE_NAMES])
+    fitted.fit(rows)
+    report["perceptron_accuracy"] = _accuracy(lambda q: fitted.route(q).engine, heldout)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for query in queries:
+            router.route(query)
+    report["route_us_per_query"] = (time.perf_counter() - start) / (args.repeat * len(queries)) * 1e6
+
+    print(f"🎯 Held-out accuracy ({len(heldout)} queries not written with the lexicon):")
+    print(f"   Legacy keyword chain:           {report['legacy_keyword_accuracy']:.3f}")
+    print(f"   Scored router, default weights: {report['default_weights_accuracy']:.3f}")
+    print(f"   Scored router, perceptron:      {report['perceptron_accuracy']:.3f}")
+    print(f"📎 In-sample ({len(rows)} queries written with the lexicon, optimistic): "
+          f"legacy {report['in_sample_legacy_keyword_accuracy']:.3f}, "
+          f"default weights {report['in_sample_default_weights_accuracy']:.3f}, "
+          f"perceptron {args.folds}-fold CV {report['perceptron_cv_accuracy']:.3f}")
+    print(f"⚡ Routing decision: {report['route_us_per_query']:.1f} µs/query")
+
+    build = _real_router if args.real_engines else None
+    for mode, speculative in (("single", False), ("speculative", True)):
+        e2e = (build(speculative=speculative, deadline_s=0.5) if build else None) or \
+            _stand_in_router(speculative=speculative, deadline_s=0.5)
+        latencies, confidences, speculated = [], [], 0
+        for query in queries:
+            result = e2e.process(query)
+            latencies.append(result["latency_ms"] / 1000)
+            confidences.append(result["confidence"])
+            speculated += result["routing"]["speculative"]
+        e2e.close()
+        stats = _percentiles(latencies)
+        stats.update({"mean_confidence": statistics.mean(confidences), "speculated_queries": speculated})
+        report[f"end_to_end_{mode}"] = stats
+        print(f"⏱️  {mode:<11} p50 {stats['p50_ms']:.2f} ms  p95 {stats['p95_ms']:.2f} ms  "
+              f"mean confidence {stats['mean_confidence']:.3f}  speculated {speculated}/{len(queries)}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
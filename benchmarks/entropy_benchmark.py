@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Entropy Benchmark
+
+Response-choice throughput of the entropy sources the service replaced
+versus the shared EntropyService:
+
+- metrics_rng: the former MetricsBasedRNG (sha256 over time_ns strings,
+  refilled every few picks), reproduced here for comparison
+- secrets: utils/entropy.py's former sys_entropy_choice
+- entropy_service: CSPRNG-seeded per-thread generator (production)
+- entropy_service_seeded: deterministic mode inside a request scope
+
+Each source picks from a list of canned responses, single-threaded and
+with several threads sharing the source.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from vigoleonrocks.services.entropy import EntropyService
+
+RESPONSES = [f"respuesta {i}" for i in range(12)]
+
+
+class LegacyMetricsRNG:
+    """The removed MetricsBasedRNG, kept only as the baseline"""
+
+    def __init__(self):
+        self.entropy_pool = []
+        self._collect_system_metrics()
+
+    def _collect_system_metrics(self):
+        combined = f"{time.time_ns()}{os.getpid()}{hash(str(time.process_time_ns()))}"
+        entropy_hash = hashlib.sha256(combined.encode()).hexdigest()
+        for i in range(0, len(entropy_hash), 8):
+            self.entropy_pool.append(int(entropy_hash[i:i + 8], 16) % 1000)
+
+    def choice(self, choices):
+        if not self.entropy_pool:
+            self._collect_system_metrics()
+        index = self.entropy_pool.pop(0) % len(choices)
+        if len(self.entropy_pool) < 5:
+            self._collect_system_metrics()
+        return choices[index]
+
+
+class SecretsChoice:
+    def choice(self, choices):
+        return choices[secrets.randbelow(len(choices))]
+
+
+def run(source, picks: int, threads: int, scoped: bool = False) -> float:
+    per_thread = picks // threads
+
+    def worker():
+        if scoped:
+            with source.request_scope():
+                for _ in range(per_thread):
+                    source.choice(RESPONSES)
+        else:
+            for _ in range(per_thread):
+                source.choice(RESPONSES)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return per_thread * threads / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Response-choice throughput per entropy source')
+    parser.add_argument('--picks', type=int, default=500_000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    sources = [
+        ('metrics_rng', LegacyMetricsRNG(), False),
+        ('secrets', SecretsChoice(), False),
+        ('entropy_service', EntropyService(), False),
+        ('entropy_service_seeded', EntropyService(seed=42), True),
+    ]
+
+    print("🎲 VIGOLEONROCKS Entropy Benchmark")
+    print("=" * 60)
+    results = []
+    for name, source, scoped in sources:
+        row = {'source': name}
+        for threads in (1, args.threads):
+            row[f'picks_per_s_{threads}t'] = round(run(source, args.picks, threads, scoped))
+        results.append(row)
+        print(f"  {name:<24} 1 thread {row['picks_per_s_1t']:>12,} picks/s   "
+              f"{args.threads} threads {row[f'picks_per_s_{args.threads}t']:>12,} picks/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'picks': args.picks, 'threads': args.threads, 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
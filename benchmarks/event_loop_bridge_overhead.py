@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Event Loop Bridge Benchmark
+
+Per-request overhead and tail latency of running a MultimodalAIManager-style
+coroutine from WSGI worker threads, comparing ``asyncio.run`` (a new event
+loop per request, the previous behaviour of the upload endpoints) with the
+persistent EventLoopBridge.
+
+The workload awaits ``--io-ms`` of simulated I/O (model lock, executor hop)
+and is driven by ``--concurrency`` request threads, so the numbers include
+loop creation/teardown, thread hand-off and queueing.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.event_loop_bridge import EventLoopBridge
+
+
+async def workload(io_s: float) -> int:
+    if io_s:
+        await asyncio.sleep(io_s)
+    else:
+        await asyncio.sleep(0)
+    return 1
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_mode(mode: str, requests: int, concurrency: int, io_s: float, loop_threads: int) -> dict:
+    bridge = EventLoopBridge(threads=loop_threads).start() if mode == 'bridge' else None
+
+    def handle(_):
+        start = time.perf_counter()
+        if bridge is None:
+            asyncio.run(workload(io_s))
+        else:
+            bridge.run(workload(io_s))
+        return time.perf_counter() - start
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(handle, range(requests)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    stats = bridge.stats() if bridge else None
+    if bridge:
+        bridge.stop()
+
+    overhead = [max(0.0, lat - io_s) for lat in latencies]
+    return {
+        'mode': mode,
+        'concurrency': concurrency,
+        'requests': requests,
+        'throughput_rps': round(requests / wall, 1),
+        'cpu_us_per_request': round(cpu / requests * 1e6, 1),
+        'overhead_mean_us': round(statistics.mean(overhead) * 1e6, 1),
+        'p50_ms': round(_percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(max(latencies) * 1000, 3),
+        'loop_lag_max_ms': stats['lag_max_ms'] if stats else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='asyncio.run vs persistent event loop bridge')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--io-ms', type=float, default=2.0, help='Simulated awaited I/O per request')
+    parser.add_argument('--loop-threads', type=int, default=2)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    print("🌉 VIGOLEONROCKS Event Loop Bridge Benchmark")
+    print("=" * 60)
+    results = []
+    for concurrency in args.concurrency:
+        for mode in ('asyncio.run', 'bridge'):
+            row = run_mode(mode, args.requests, concurrency, args.io_ms / 1000, args.loop_threads)
+            results.append(row)
+            print(f"  c={concurrency:<3} {mode:<12} {row['throughput_rps']:>8.0f} req/s  "
+                  f"overhead {row['overhead_mean_us']:>7.1f} µs  CPU {row['cpu_us_per_request']:>7.1f} µs/req  "
+                  f"p50 {row['p50_ms']:>6.2f} ms  p99 {row['p99_ms']:>6.2f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'io_ms': args.io_ms, 'loop_threads': args.loop_threads, 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS File Fan-out Benchmark
+
+End-to-end latency of a multi-file /api/process request with mixed file
+types, sequential loop (previous handler) vs FileFanOut at several
+per-request concurrency caps, plus time to first result in streaming mode.
+
+Per-type handlers follow the cost profile of the real ones:
+
+- image: wait on the image process pool (GIL released)     ~120 ms
+- audio: decode + transcription wait (GIL released)        ~200 ms
+- document / code: pure-Python text analysis (GIL held)    ~5-15 ms
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from vigoleonrocks.services.file_fanout import FileFanOut, FileTask
+
+MIX = ['image', 'document', 'audio', 'code', 'image', 'document', 'image', 'code', 'audio', 'document']
+WAIT_S = {'image': 0.12, 'audio': 0.2}
+CPU_ROUNDS = {'document': 30, 'code': 90}
+
+
+def handler(task: FileTask) -> dict:
+    if task.category in WAIT_S:
+        time.sleep(WAIT_S[task.category])
+        return {'category': task.category}
+    words = 0
+    text = task.data.decode('utf-8', 'replace')
+    for _ in range(CPU_ROUNDS[task.category]):
+        words += len(text.lower().split())
+    return {'word_count': words}
+
+
+def make_tasks(n: int):
+    text = ("El sistema procesa documentos y código fuente con análisis de texto. " * 40).encode()
+    return [FileTask(i, f'file_{i}', MIX[i % len(MIX)], text) for i in range(n)]
+
+
+def best_of(fn, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def first_result_ms(fanout, tasks, concurrency):
+    t0 = time.perf_counter()
+    for _ in fanout.iter_completed(tasks, handler, concurrency=concurrency):
+        return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-file /api/process latency, sequential vs fan-out')
+    parser.add_argument('--files', default='1,4,10')
+    parser.add_argument('--concurrency', default='2,4,8')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    caps = [int(c) for c in args.concurrency.split(',')]
+    fanout = FileFanOut(workers=max(caps), file_deadline=30)
+
+    print("🗃️ VIGOLEONROCKS File Fan-out Benchmark")
+    print("=" * 60)
+    results = []
+    for n in (int(f) for f in args.files.split(',')):
+        tasks = make_tasks(n)
+        row = {'files': n, 'sequential_ms': round(best_of(lambda: [handler(t) for t in tasks], args.rounds), 1)}
+        print(f"  {n:>2} files  sequential {row['sequential_ms']:>8.1f} ms")
+        for cap in caps:
+            total = best_of(lambda: fanout.process_all(tasks, handler, concurrency=cap), args.rounds)
+            first = first_result_ms(fanout, tasks, cap)
+            row[f'fanout_c{cap}_ms'] = round(total, 1)
+            row[f'fanout_c{cap}_first_result_ms'] = round(first, 1)
+            print(f"           fan-out c={cap:<2} {total:>8.1f} ms  (first NDJSON line {first:>6.1f} ms, "
+                  f"{row['sequential_ms'] / total:.1f}x)")
+        results.append(row)
+    fanout.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
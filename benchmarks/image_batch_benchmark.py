@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Image Batch Benchmark
+
+Images/sec of the quantum 26D analysis for batch sizes 1..64, comparing a
+loop of ``analyze_image_quantum`` calls (what a client uploading N images
+to /api/upload/image gets today) with ``analyze_images_quantum_batch``
+(parallel decode + stacked NumPy features per working size).
+
+Images are synthetic photo-like PNG/JPEG frames at a few common camera
+resolutions, so most of a batch lands in the same stack.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from PIL import Image
+
+from quantum_image_processor import analyze_image_quantum, analyze_images_quantum_batch
+
+SIZES = [(1280, 960), (1920, 1080), (800, 600)]
+
+
+def synthetic_image(index: int) -> bytes:
+    width, height = SIZES[index % len(SIZES)]
+    rng = np.random.default_rng(index)
+    y, x = np.mgrid[0:height, 0:width]
+    base = 127 + 60 * np.sin(x / (17 + index % 5)) * np.cos(y / 23)
+    pixels = np.stack([base, base * 0.8 + 30, 255 - base], axis=-1) + rng.normal(0, 12, (height, width, 3))
+    buf = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buf, format='JPEG', quality=85)
+    return buf.getvalue()
+
+
+def measure(fn, rounds: int) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quantum image analysis throughput, sequential vs batched')
+    parser.add_argument('--batch-sizes', default='1,2,4,8,16,32,64')
+    parser.add_argument('--rounds', type=int, default=3, help='Best-of rounds per measurement')
+    parser.add_argument('--workers', type=int, default=None, help='Decode threads (default: min(N, cpus, 8))')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    batch_sizes = [int(n) for n in args.batch_sizes.split(',')]
+    pool = [(synthetic_image(i), f'frame_{i}.jpg') for i in range(max(batch_sizes))]
+
+    print("📸 VIGOLEONROCKS Image Batch Benchmark")
+    print("=" * 60)
+    print(f"  {'batch':>5} {'sequential img/s':>18} {'batched img/s':>15} {'speedup':>9}")
+    results = []
+    for n in batch_sizes:
+        images = pool[:n]
+        sequential = measure(lambda: [analyze_image_quantum(data, name) for data, name in images], args.rounds)
+        batched = measure(lambda: analyze_images_quantum_batch(images, max_workers=args.workers), args.rounds)
+        row = {
+            'batch_size': n,
+            'sequential_images_per_s': round(n / sequential, 2),
+            'batched_images_per_s': round(n / batched, 2),
+            'speedup': round(sequential / batched, 2),
+        }
+        results.append(row)
+        print(f"  {n:>5} {row['sequential_images_per_s']:>18.2f} {row['batched_images_per_s']:>15.2f} "
+              f"{row['speedup']:>8.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'cpu_count': os.cpu_count(), 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Interaction History Soak Test
+
+Drives InteractionHistory (ring buffer + optional segmented JSONL log) at a
+steady request rate for hours and samples RSS / traced heap periodically.
+Fails (exit code 1) if memory after warm-up grows beyond the allowed slope.
+
+Example (3 hours at 200 req/s with a durable log):
+    python benchmarks/interaction_history_soak.py --hours 3 --rate 200 --log-dir /tmp/vigo-history
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.interaction_history import InteractionHistory
+
+LANGUAGES = ['es', 'en', 'pt', 'fr']
+PROFILES = ['human', 'quantum', 'competitive']
+
+
+def rss_mb() -> float:
+    """Resident set size from /proc (Linux); 0.0 elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def make_interaction(i: int) -> dict:
+    return {
+        'text': f'consulta número {i} ' * 4,
+        'response': f'respuesta {i} ' * 8,
+        'language': LANGUAGES[i % len(LANGUAGES)],
+        'profile': PROFILES[i % len(PROFILES)],
+        'processing_time': (i % 97) / 10,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def run_soak(duration_s: float, rate: float, capacity: int, log_dir=None,
+             sample_every_s: float = 10.0, query_every: int = 100) -> dict:
+    """Run the soak loop and return samples plus the post-warm-up growth"""
+    history = InteractionHistory(capacity=capacity, log_dir=log_dir,
+                                 segment_max_bytes=4 * 1024 * 1024, max_segments=4)
+    tracemalloc.start()
+    samples = []
+    interval = 1.0 / rate if rate > 0 else 0.0
+    start = time.monotonic()
+    next_sample = start
+    i = 0
+
+    while True:
+        now = time.monotonic()
+        if now - start >= duration_s:
+            break
+        history.record(make_interaction(i))
+        if i % query_every == 0:
+            history.query(language=LANGUAGES[i % 4], limit=20)
+        i += 1
+        if now >= next_sample:
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append({'t': round(now - start, 1), 'records': i,
+                            'heap_mb': current / (1024 * 1024), 'rss_mb': rss_mb()})
+            next_sample += sample_every_s
+        if interval:
+            sleep_for = start + i * interval - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+
+    tracemalloc.stop()
+    history.close()
+
+    # Growth measured after the buffer filled (warm-up = first quarter of samples)
+    steady = samples[len(samples) // 4:] or samples
+    heap_growth = steady[-1]['heap_mb'] - steady[0]['heap_mb'] if steady else 0.0
+    return {'records': i, 'samples': samples, 'steady_heap_growth_mb': heap_growth,
+            'buffer_size': len(history), 'capacity': capacity}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Interaction history memory soak test')
+    parser.add_argument('--hours', type=float, default=2.0)
+    parser.add_argument('--rate', type=float, default=200.0, help='Interactions per second (0 = unthrottled)')
+    parser.add_argument('--capacity', type=int, default=1000)
+    parser.add_argument('--log-dir', default=None, help='Enable the durable JSONL log in this directory')
+    parser.add_argument('--sample-every', type=float, default=30.0, help='Seconds between memory samples')
+    parser.add_argument('--max-growth-mb', type=float, default=2.0)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    print("🗂️  VIGOLEONROCKS Interaction History Soak Test")
+    print(f"⏱️  {args.hours}h at {args.rate} req/s, capacity={args.capacity}, log={args.log_dir or 'off'}")
+
+    log_dir = args.log_dir
+    if log_dir == 'tmp':
+        log_dir = tempfile.mkdtemp(prefix='vigo-history-')
+
+    report = run_soak(args.hours * 3600, args.rate, args.capacity, log_dir, args.sample_every)
+    for sample in report['samples'][::max(1, len(report['samples']) // 20)]:
+        print(f"  t={sample['t']:>8}s records={sample['records']:>10,} "
+              f"heap={sample['heap_mb']:7.2f}MB rss={sample['rss_mb']:7.2f}MB")
+
+    ok = report['steady_heap_growth_mb'] <= args.max_growth_mb
+    print(f"{'✅' if ok else '❌'} Steady-state heap growth: {report['steady_heap_growth_mb']:.3f} MB "
+          f"over {report['records']:,} interactions")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report saved to {args.output}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Language Identification Benchmark
+
+Accuracy on the held-out local test set plus throughput (cold, LRU-cached
+and truncated long-input scans) for the character n-gram identifier.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.language_identifier import LanguageIdentifier, evaluate, load_heldout
+
+
+def _per_call_us(func, texts, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Language identification accuracy/throughput benchmark')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    rows = load_heldout()
+    texts = [text for _, text in rows]
+
+    print("🌍 VIGOLEONROCKS Language Identification Benchmark")
+    print("=" * 60)
+
+    identifier = LanguageIdentifier(cache_size=0)
+    accuracy = evaluate(identifier, rows)
+    short = [t for lang, t in rows if len(t) <= 24]
+    short_accuracy = evaluate(identifier, [(l, t) for l, t in rows if len(t) <= 24])
+
+    cold_us = _per_call_us(identifier.identify, texts, args.repeat)
+
+    cached = LanguageIdentifier()
+    cached_us = _per_call_us(cached.identify, texts, args.repeat)
+
+    long_text = " ".join(texts[:8]) * 5000  # ~1.5 MB mixed-script document
+    start = time.perf_counter()
+    cached.identify(long_text)
+    long_ms = (time.perf_counter() - start) * 1000
+
+    report = {
+        "samples": accuracy["samples"],
+        "languages": len(identifier.languages),
+        "top1_accuracy": accuracy["top1_accuracy"],
+        "top3_accuracy": accuracy["top3_accuracy"],
+        "short_text_samples": len(short),
+        "short_text_top1_accuracy": short_accuracy["top1_accuracy"],
+        "uncached_us_per_query": cold_us,
+        "cached_us_per_query": cached_us,
+        "long_input_chars": len(long_text),
+        "long_input_ms": long_ms,
+    }
+
+    print(f"🎯 Top-1 accuracy: {report['top1_accuracy']:.3f} ({report['samples']} samples, "
+          f"{report['languages']} languages)")
+    print(f"🎯 Top-3 accuracy: {report['top3_accuracy']:.3f}")
+    print(f"🎯 Short texts (<=24 chars) top-1: {report['short_text_top1_accuracy']:.3f}")
+    print(f"⚡ Uncached: {cold_us:.1f} µs/query   LRU hit: {cached_us:.2f} µs/query")
+    print(f"📜 {len(long_text):,} chars scanned (truncated) in {long_ms:.2f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
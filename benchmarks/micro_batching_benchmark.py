@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Micro-Batching Benchmark
+
+Throughput vs latency of CLIP/BLIP-style CPU inference with and without the
+MicroBatcher, at increasing request concurrency. The stand-in model is a
+tiny randomly initialised network: a torch conv+linear encoder when torch is
+installed, a NumPy MLP otherwise, and without either a cost model with a
+fixed per-forward overhead plus a small per-image cost (the shape of real
+CPU batching gains). Each configuration reports images/s, p50/p99 latency
+and the observed batch sizes.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.micro_batcher import MicroBatcher
+
+
+def build_stand_in(kind: str):
+    """Devuelve (nombre, batch_fn, make_input)"""
+    if kind in ('auto', 'torch'):
+        try:
+            import torch
+            torch.manual_seed(0)
+            torch.set_num_threads(max(1, os.cpu_count() or 1))
+            encoder = torch.nn.Sequential(
+                torch.nn.Conv2d(3, 16, 5, stride=4), torch.nn.ReLU(),
+                torch.nn.Conv2d(16, 32, 3, stride=2), torch.nn.ReLU(),
+                torch.nn.AdaptiveAvgPool2d(1), torch.nn.Flatten(), torch.nn.Linear(32, 64),
+            ).eval()
+
+            def forward(batch):
+                with torch.no_grad():
+                    return list(encoder(torch.stack(batch)))
+            return 'torch tiny CNN', forward, lambda: torch.rand(3, 224, 224)
+        except ImportError:
+            if kind == 'torch':
+                raise
+    if kind in ('auto', 'numpy'):
+        try:
+            import numpy as np
+            rng = np.random.default_rng(0)
+            w1 = rng.standard_normal((3 * 64 * 64, 256)).astype(np.float32)
+            w2 = rng.standard_normal((256, 64)).astype(np.float32)
+
+            def forward(batch):
+                x = np.stack(batch).reshape(len(batch), -1)
+                return list(np.maximum(x @ w1, 0) @ w2)
+            return 'numpy MLP', forward, lambda: rng.standard_normal((3, 64, 64)).astype(np.float32)
+        except ImportError:
+            if kind == 'numpy':
+                raise
+
+    def forward(batch):
+        time.sleep(0.004 + 0.0005 * len(batch))  # coste fijo por pasada + coste por imagen
+        return [sum(x) for x in batch]
+    return 'cost model (4 ms + 0.5 ms/image)', forward, lambda: [0.1, 0.2, 0.3]
+
+
+def _pct(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(forward, make_input, concurrency: int, requests: int, max_batch: int, max_wait_ms: float) -> dict:
+    lock = threading.Lock()  # sin batching: una pasada a la vez por modelo, como el manager
+    batcher = MicroBatcher('bench', forward, max_batch_size=max_batch, max_wait_ms=max_wait_ms) if max_batch > 1 else None
+    latencies = []
+    per_thread = max(1, requests // concurrency)
+    inputs = [make_input() for _ in range(min(64, requests))]
+
+    def client(index):
+        for n in range(per_thread):
+            item = inputs[(index + n) % len(inputs)]
+            start = time.perf_counter()
+            if batcher is None:
+                with lock:
+                    forward([item])
+            else:
+                batcher(item, timeout=30)
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    wall_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+    stats = batcher.stats() if batcher else None
+    if batcher:
+        batcher.close()
+    return {
+        'concurrency': concurrency,
+        'max_batch': max_batch,
+        'max_wait_ms': max_wait_ms if batcher else 0,
+        'images_per_s': round(len(latencies) / wall, 1),
+        'p50_ms': round(_pct(latencies, 0.5) * 1000, 2),
+        'p99_ms': round(_pct(latencies, 0.99) * 1000, 2),
+        'mean_batch': stats['batch_size']['mean'] if stats else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-batching throughput vs latency')
+    parser.add_argument('--model', choices=['auto', 'torch', 'numpy', 'cost'], default='auto')
+    parser.add_argument('--requests', type=int, default=512)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--max-batch', type=int, default=16)
+    parser.add_argument('--waits-ms', type=float, nargs='+', default=[5.0, 10.0])
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    name, forward, make_input = build_stand_in(args.model)
+    print("📦 VIGOLEONROCKS Micro-Batching Benchmark")
+    print(f"   stand-in model: {name}")
+    print("=" * 60)
+    results = []
+    configs = [(1, 0.0)] + [(args.max_batch, wait) for wait in args.waits_ms]
+    for concurrency in args.concurrency:
+        for max_batch, wait in configs:
+            row = run(forward, make_input, concurrency, args.requests, max_batch, wait)
+            results.append(row)
+            label = 'unbatched' if max_batch == 1 else f"batch≤{max_batch} wait {wait:g}ms"
+            print(f"  c={concurrency:<3} {label:<22} {row['images_per_s']:>8.1f} img/s  "
+                  f"p50 {row['p50_ms']:>7.2f} ms  p99 {row['p99_ms']:>7.2f} ms  mean batch {row['mean_batch']:.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'model': name, 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
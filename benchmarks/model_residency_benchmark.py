@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Model Residency Benchmark
+
+Hit/miss latency of the ModelResidencyManager under mixed-modality traffic
+with CPU stand-in models (sizes in MB instead of GB, load time proportional
+to size). Image requests touch moondream2/florence2/clip/blip2, audio
+requests touch whisper; the mix and the RAM budget are configurable.
+
+Also measures a cold start with concurrent waiters: the previous
+``ensure_model_loaded`` polled with ``asyncio.sleep(1)`` while another
+coroutine loaded, so every waiter paid up to one extra second.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.model_residency import ModelResidencyManager
+
+MB = 1048576
+# huellas proporcionales a las reales en fp32 (1 GB -> 2 MB)
+MODEL_SIZES_MB = {'moondream2': 15, 'florence2': 6, 'clip_vit': 3, 'blip2': 30, 'whisper_medium': 6}
+IMAGE_MODELS = ['moondream2', 'florence2', 'clip_vit', 'blip2']
+AUDIO_MODELS = ['whisper_medium']
+
+
+def make_residency(budget_mb: float, load_ms_per_mb: float) -> ModelResidencyManager:
+    def load(key):
+        time.sleep(MODEL_SIZES_MB[key] * load_ms_per_mb / 1000)
+        return b'\x01' * (MODEL_SIZES_MB[key] * MB)
+
+    return ModelResidencyManager(load, budget_bytes=int(budget_mb * MB), sizer=lambda key, value: len(value))
+
+
+def _pct(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def mixed_traffic(residency, requests: int, audio_share: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    hit_latency, miss_latency = [], []
+    peak = 0
+    for _ in range(requests):
+        models = AUDIO_MODELS if rng.random() < audio_share else IMAGE_MODELS
+        for key in models:
+            was_resident = residency.is_resident(key)
+            start = time.perf_counter()
+            async with residency.use(key):
+                pass
+            elapsed = time.perf_counter() - start
+            (hit_latency if was_resident else miss_latency).append(elapsed)
+            peak = max(peak, residency.used_bytes)
+    stats = residency.stats()
+    return {
+        'hit_rate': stats['hit_rate'],
+        'hit_p50_us': round(_pct(hit_latency, 0.5) * 1e6, 1) if hit_latency else None,
+        'hit_p99_us': round(_pct(hit_latency, 0.99) * 1e6, 1) if hit_latency else None,
+        'miss_p50_ms': round(_pct(miss_latency, 0.5) * 1000, 1) if miss_latency else None,
+        'miss_p99_ms': round(_pct(miss_latency, 0.99) * 1000, 1) if miss_latency else None,
+        'evictions': stats['evictions'],
+        'loads': stats['loads'],
+        'peak_resident_mb': round(peak / MB, 1),
+    }
+
+
+async def cold_start_waiters(waiters: int, load_ms_per_mb: float) -> dict:
+    residency = make_residency(10_000, load_ms_per_mb)
+    start = time.perf_counter()
+
+    async def wait_one():
+        await residency.ensure('blip2')
+        return time.perf_counter() - start
+
+    shared = await asyncio.gather(*(wait_one() for _ in range(waiters)))
+    residency.shutdown()
+
+    # emulación del sondeo anterior: los que llegan tarde duermen en pasos de 1 s
+    load_s = MODEL_SIZES_MB['blip2'] * load_ms_per_mb / 1000
+    polled = [load_s] + [float(int(load_s) + 1) for _ in range(waiters - 1)]
+    return {
+        'waiters': waiters,
+        'load_s': round(load_s, 3),
+        'shared_future_mean_s': round(statistics.mean(shared), 3),
+        'shared_future_max_s': round(max(shared), 3),
+        'sleep_polling_mean_s': round(statistics.mean(polled), 3),
+        'sleep_polling_max_s': round(max(polled), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model residency hit/miss latency')
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--audio-share', type=float, default=0.3)
+    parser.add_argument('--budgets', type=float, nargs='+', default=[0, 56, 40],
+                        help='Budgets in MB (0 = unlimited)')
+    parser.add_argument('--load-ms-per-mb', type=float, default=5.0)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    total_mb = sum(MODEL_SIZES_MB.values())
+    print("🧳 VIGOLEONROCKS Model Residency Benchmark")
+    print(f"   stand-in models: {total_mb} MB total, {args.audio_share:.0%} audio requests")
+    print("=" * 60)
+    results = []
+    for budget in args.budgets:
+        residency = make_residency(budget or total_mb * 2, args.load_ms_per_mb)
+        row = asyncio.run(mixed_traffic(residency, args.requests, args.audio_share, args.seed))
+        residency.shutdown()
+        row['budget_mb'] = budget or 'unlimited'
+        results.append(row)
+        print(f"  budget {str(row['budget_mb']):>9} MB: hit rate {row['hit_rate']:.1%}  "
+              f"hit p50/p99 {row['hit_p50_us']}/{row['hit_p99_us']} µs  "
+              f"miss p50/p99 {row['miss_p50_ms']}/{row['miss_p99_ms']} ms  "
+              f"evictions {row['evictions']}  peak {row['peak_resident_mb']} MB")
+
+    cold = asyncio.run(cold_start_waiters(8, args.load_ms_per_mb))
+    print(f"❄️  cold start, {cold['waiters']} waiters: shared future max {cold['shared_future_max_s']} s "
+          f"vs sleep(1) polling max {cold['sleep_polling_max_s']} s (load {cold['load_s']} s)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'models_mb': MODEL_SIZES_MB, 'mixed_traffic': results, 'cold_start': cold}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
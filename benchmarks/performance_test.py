@@ -10,19 +10,25 @@ CRITICAL POLICIES:
 2. Background process performance testing with metrics exposure
 """
 
+import os
+import sys
 import time
 import statistics
 import asyncio
-import concurrent.futures
 import json
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from contextlib import contextmanager
 import psutil
-import requests
 import threading
 import secrets  # CRITICAL: Using OS entropy, not Math.random
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.load_generator import (
+    SLO, LoadProfile, RequestSpec, find_max_throughput, run_load
+)
+
 # Mock VIGOLEONROCKS imports for benchmarking
 # In real implementation, these would import actual modules
 try:
@@ -93,6 +99,8 @@ class PerformanceBenchmark:
         self.base_url = base_url
         self.metrics_history: List[SystemMetrics] = []
         self.results: List[BenchmarkResult] = []
+        self.load_results: Dict[str, Dict[str, Any]] = {}
+        self.capacity: Optional[Dict[str, Any]] = None
         
         # Initialize components with policy-compliant randomness
         self.quantum_processor = QuantumProcessor()
@@ -178,86 +186,67 @@ class PerformanceBenchmark:
             disk_io_write=disk_io.write_bytes if disk_io else 0
         )
 
-    def benchmark_api_endpoints(self, num_requests: int = 100, concurrent_requests: int = 10) -> BenchmarkResult:
+    def benchmark_api_endpoints(self, num_requests: int = 100, concurrent_requests: int = 10,
+                                rate: float = 20.0, profile: str = 'poisson') -> BenchmarkResult:
         """
-        Benchmark API endpoints performance
-        
+        Benchmark API endpoints performance with an open-loop load generator
+
+        Requests leave at ``rate`` per second whether or not earlier ones have
+        finished, and latency is measured from each request's intended send
+        time, so a slow server shows up in p95/p99 instead of slowing the
+        generator down (no coordinated omission). ``concurrent_requests`` is the
+        connection pool size, not a cap on the arrival rate.
+
         CRITICAL: Tests background process metrics exposure
         """
-        print(f"🚀 Benchmarking API endpoints with {num_requests} requests ({concurrent_requests} concurrent)")
-        
-        # Test critical endpoints
-        endpoints_to_test = [
-            ('/api/status', 'GET'),  # CRITICAL: Background process metrics
-            ('/api/quantum-metrics', 'GET'),  # CRITICAL: Quantum system metrics
-            ('/api/vigoleonrocks', 'POST'),  # Main processing endpoint
-            ('/api/health', 'GET'),  # Health check
-        ]
+        duration = num_requests / rate
+        print(f"🚀 Benchmarking API endpoints: {num_requests} requests, {profile} arrivals at {rate:g} rps "
+              f"({concurrent_requests} pooled connections)")
         
-        response_times = []
-        error_count = 0
-        start_time = time.perf_counter()
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_requests) as executor:
-            futures = []
-            
-            for i in range(num_requests):
-                # Use metrics-based selection (NOT Math.random)
-                endpoint, method = self.metrics_rng.choice_from_metrics(endpoints_to_test)
-                
-                if method == 'POST':
-                    future = executor.submit(self._make_post_request, endpoint)
-                else:
-                    future = executor.submit(self._make_get_request, endpoint)
-                
-                futures.append(future)
-            
-            # Collect results
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    response_time, success = future.result()
-                    response_times.append(response_time)
-                    if not success:
-                        error_count += 1
-                except Exception as e:
-                    print(f"❌ Request failed: {e}")
-                    error_count += 1
-
-        end_time = time.perf_counter()
-        total_duration = end_time - start_time
-        
-        # Calculate statistics
-        if response_times:
-            avg_response = statistics.mean(response_times)
-            min_response = min(response_times)
-            max_response = max(response_times)
-            p95_response = statistics.quantiles(response_times, n=20)[18]  # 95th percentile
-            p99_response = statistics.quantiles(response_times, n=100)[98]  # 99th percentile
-        else:
-            avg_response = min_response = max_response = p95_response = p99_response = 0
+        load = run_load(self.base_url, self._api_request_mix(), LoadProfile(profile, rate, duration),
+                        connections=concurrent_requests, timeout=10)
+        latency = load.latency
+        for error in load.error_samples[:5]:
+            print(f"❌ Request failed: {error}")
         
         # Get system metrics
         current_metrics = self._get_current_system_metrics()
         
         result = BenchmarkResult(
             test_name="API Endpoints",
-            total_requests=num_requests,
-            duration_seconds=total_duration,
-            requests_per_second=num_requests / total_duration if total_duration > 0 else 0,
-            avg_response_time_ms=avg_response * 1000,
-            min_response_time_ms=min_response * 1000,
-            max_response_time_ms=max_response * 1000,
-            p95_response_time_ms=p95_response * 1000,
-            p99_response_time_ms=p99_response * 1000,
-            success_rate=(num_requests - error_count) / num_requests * 100,
-            error_count=error_count,
+            total_requests=load.scheduled,
+            duration_seconds=load.elapsed_s,
+            requests_per_second=load.achieved_rps,
+            avg_response_time_ms=latency.mean or 0,
+            min_response_time_ms=latency.min if latency.count else 0,
+            max_response_time_ms=latency.max if latency.count else 0,
+            p95_response_time_ms=latency.quantile(0.95) or 0,
+            p99_response_time_ms=latency.quantile(0.99) or 0,
+            success_rate=(1 - load.error_rate) * 100,
+            error_count=load.errors + load.dropped,
             memory_usage_mb=current_metrics.memory_mb,
             cpu_usage_percent=current_metrics.cpu_percent
         )
         
         self.results.append(result)
+        self.load_results[result.test_name] = load.summary()
         return result
 
+    def find_max_sustainable_rps(self, slo_p99_ms: float = 200.0, max_error_rate: float = 0.01,
+                                 start_rate: float = 10.0, step_duration: float = 10.0) -> Dict[str, Any]:
+        """Highest arrival rate at which the API mix still meets the p99/error SLO"""
+        print(f"🔎 Searching max sustainable throughput at p99 <= {slo_p99_ms:g}ms, errors <= {max_error_rate:.1%}")
+        
+        def progress(trial: Dict[str, Any]) -> None:
+            mark = "✅" if trial['passed'] else "❌"
+            print(f"  {mark} {trial['rate']:>8.1f} rps: {trial['reason']}")
+        
+        report = find_max_throughput(self.base_url, self._api_request_mix(), SLO(slo_p99_ms, 0.99, max_error_rate),
+                                     start_rate=start_rate, step_duration=step_duration, on_trial=progress)
+        print(f"🏁 Max sustainable throughput: {report['max_sustainable_rps']:.1f} rps")
+        self.capacity = report
+        return report
+
     def benchmark_quantum_processing(self, num_operations: int = 500) -> BenchmarkResult:
         """
         Benchmark quantum processing performance
@@ -411,42 +400,21 @@ class PerformanceBenchmark:
         self.results.append(result)
         return result
 
-    def _make_get_request(self, endpoint: str) -> tuple[float, bool]:
-        """Make GET request and measure response time"""
-        start_time = time.perf_counter()
-        try:
-            response = requests.get(f"{self.base_url}{endpoint}", timeout=10)
-            end_time = time.perf_counter()
-            return end_time - start_time, response.status_code == 200
-        except Exception:
-            end_time = time.perf_counter()
-            return end_time - start_time, False
-
-    def _make_post_request(self, endpoint: str) -> tuple[float, bool]:
-        """Make POST request and measure response time"""
-        # Use metrics-based selection for test data (NOT Math.random)
-        test_data = {
-            "text": self.metrics_rng.choice_from_metrics([
-                "Hola mundo", "Hello world", "Olá mundo", 
-                "Bonjour monde", "Hallo Welt"
-            ]),
-            "profile": "human",
-            "language": self.metrics_rng.choice_from_metrics(["es", "en", "pt", "fr", "de"])
-        }
-        
-        start_time = time.perf_counter()
-        try:
-            response = requests.post(
-                f"{self.base_url}{endpoint}",
-                json=test_data,
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            end_time = time.perf_counter()
-            return end_time - start_time, response.status_code == 200
-        except Exception:
-            end_time = time.perf_counter()
-            return end_time - start_time, False
+    def _api_request_mix(self) -> List[RequestSpec]:
+        """Critical endpoints, weighted evenly; POST bodies picked with metrics-based selection (NOT Math.random)"""
+        specs = [
+            RequestSpec('GET', '/api/status'),  # CRITICAL: Background process metrics
+            RequestSpec('GET', '/api/quantum-metrics'),  # CRITICAL: Quantum system metrics
+            RequestSpec('GET', '/api/health'),  # Health check
+        ]
+        # Main processing endpoint: the weight is spread over the test phrases
+        phrases = [("Hola mundo", "es"), ("Hello world", "en"), ("Olá mundo", "pt"),
+                   ("Bonjour monde", "fr"), ("Hallo Welt", "de")]
+        for _ in range(len(phrases)):
+            text, language = self.metrics_rng.choice_from_metrics(phrases)
+            specs.append(RequestSpec.json('/api/vigoleonrocks', {"text": text, "profile": "human", "language": language},
+                                          weight=1 / len(phrases), name='POST /api/vigoleonrocks'))
+        return specs
 
     def run_comprehensive_benchmark(self) -> Dict[str, Any]:
         """Run comprehensive performance benchmarks"""
@@ -512,6 +480,8 @@ class PerformanceBenchmark:
                 }
             },
             "detailed_results": [asdict(result) for result in self.results],
+            "open_loop_load": self.load_results,
+            "capacity": self.capacity,
             "system_metrics": {
                 "samples_collected": len(self.metrics_history),
                 "avg_cpu_usage": round(statistics.mean([m.cpu_percent for m in self.metrics_history]), 2) if self.metrics_history else 0,
@@ -602,8 +572,11 @@ Examples:
   # Run comprehensive benchmarks
   python performance_test.py
 
-  # Custom API endpoint testing
-  python performance_test.py --api-only --requests 500 --concurrent 20
+  # Custom API endpoint testing (open loop: 500 Poisson arrivals at 50 rps)
+  python performance_test.py --api-only --requests 500 --rate 50 --concurrent 20
+
+  # Max throughput that keeps p99 under 200ms
+  python performance_test.py --api-only --find-max-rps --slo-p99-ms 200
 
   # Quantum processing focus
   python performance_test.py --quantum-only --operations 1000
@@ -624,7 +597,15 @@ compliant with VIGOLEONROCKS policies (NO Math.random).
     parser.add_argument('--requests', type=int, default=100,
                        help='Number of requests for API testing (default: 100)')
     parser.add_argument('--concurrent', type=int, default=10,
-                       help='Concurrent requests (default: 10)')
+                       help='Pooled connections for API testing (default: 10)')
+    parser.add_argument('--rate', type=float, default=20.0,
+                       help='Open-loop arrival rate in requests/s (default: 20)')
+    parser.add_argument('--profile', choices=['constant', 'poisson'], default='poisson',
+                       help='Arrival process (default: poisson)')
+    parser.add_argument('--find-max-rps', action='store_true',
+                       help='Also search the max sustainable throughput at the SLO')
+    parser.add_argument('--slo-p99-ms', type=float, default=200.0,
+                       help='p99 latency SLO for --find-max-rps (default: 200)')
     parser.add_argument('--operations', type=int, default=500,
                        help='Number of quantum operations (default: 500)')
     parser.add_argument('--translations', type=int, default=200,
@@ -644,7 +625,9 @@ compliant with VIGOLEONROCKS policies (NO Math.random).
     try:
         if args.api_only:
             print("🌐 Running API-only benchmarks...")
-            benchmark.benchmark_api_endpoints(args.requests, args.concurrent)
+            benchmark.benchmark_api_endpoints(args.requests, args.concurrent, args.rate, args.profile)
+            if args.find_max_rps:
+                benchmark.find_max_sustainable_rps(args.slo_p99_ms)
         elif args.quantum_only:
             print("⚛️  Running Quantum-only benchmarks...")
             benchmark.benchmark_quantum_processing(args.operations)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Rate Limiter Benchmark
+
+Checks/sec for the GCRA limiter on each backend (in-process, shared mmap
+table across N worker processes, optional Redis) and for the previous
+per-minute dict limiter of PerformanceOptimizer, which rescanned every key
+on each call and therefore slowed down with the number of active clients.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.rate_limiter import (
+    MemoryBackend, RateLimiter, RedisBackend, RespClient, SharedMemoryBackend
+)
+
+POLICY = "1000000/minute"
+
+
+class LegacyDictLimiter:
+    """Implementación anterior de ``PerformanceOptimizer._check_rate_limit``"""
+
+    def __init__(self):
+        self._rate_limiter = {}
+
+    def check(self, identifier: str, limit: int) -> bool:
+        now = time.time()
+        minute_window = int(now // 60)
+        key = f"{identifier}:{minute_window}"
+        if key not in self._rate_limiter:
+            self._rate_limiter[key] = 0
+        if self._rate_limiter[key] >= limit:
+            return False
+        self._rate_limiter[key] += 1
+        old_keys = [k for k in self._rate_limiter.keys()
+                    if int(k.split(':')[1]) < minute_window - 2]
+        for old_key in old_keys:
+            del self._rate_limiter[old_key]
+        return True
+
+
+def _checks_per_second(check, keys, iterations: int) -> float:
+    n_keys = len(keys)
+    start = time.perf_counter()
+    for i in range(iterations):
+        check(keys[i % n_keys])
+    return iterations / (time.perf_counter() - start)
+
+
+def _shared_worker(path, keys, iterations, queue):
+    limiter = RateLimiter(SharedMemoryBackend(path), default_policy=POLICY)
+    queue.put(_checks_per_second(limiter.hit, keys, iterations))
+
+
+def _shared_multiprocess(path, keys, iterations, processes: int) -> float:
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_shared_worker, args=(path, keys, iterations, queue))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    rates = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return sum(rates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rate limiter checks/sec benchmark')
+    parser.add_argument('--iterations', type=int, default=100_000)
+    parser.add_argument('--keys', type=int, nargs='+', default=[1, 1000, 10_000])
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--redis-url', default=None, help='Benchmark the Redis backend too')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    print("🚦 VIGOLEONROCKS Rate Limiter Benchmark")
+    print("=" * 60)
+    results = []
+    tmpdir = tempfile.mkdtemp(prefix='vigoleonrocks-rl-')
+    for n_keys in args.keys:
+        keys = [f"10.0.{i // 256}.{i % 256}" for i in range(n_keys)]
+        row = {"active_keys": n_keys}
+
+        legacy = LegacyDictLimiter()
+        for key in keys:
+            legacy.check(key, 10 ** 9)  # clientes activos en la ventana actual
+        legacy_iterations = max(1000, args.iterations // max(1, n_keys // 100))
+        row["legacy_dict"] = _checks_per_second(lambda k: legacy.check(k, 10 ** 9), keys, legacy_iterations)
+
+        memory = RateLimiter(MemoryBackend(), default_policy=POLICY)
+        row["memory"] = _checks_per_second(memory.hit, keys, args.iterations)
+
+        path = os.path.join(tmpdir, f"shared-{n_keys}")
+        shared = RateLimiter(SharedMemoryBackend(path), default_policy=POLICY)
+        row["shared_1_process"] = _checks_per_second(shared.hit, keys, args.iterations)
+        row[f"shared_{args.processes}_processes"] = _shared_multiprocess(
+            path, keys, args.iterations // args.processes, args.processes)
+
+        if args.redis_url:
+            redis = RateLimiter(RedisBackend(RespClient.from_url(args.redis_url)), default_policy=POLICY)
+            row["redis"] = _checks_per_second(redis.hit, keys, max(1000, args.iterations // 10))
+
+        results.append(row)
+        print(f"🔑 {n_keys:>6} active keys")
+        for name, rate in row.items():
+            if name != "active_keys":
+                print(f"    {name:<22} {rate:>12,.0f} checks/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"📄 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
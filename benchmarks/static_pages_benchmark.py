@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Static Pages Benchmark
+
+Requests/sec and bytes on the wire for the landing routes, comparing the
+previous handler (``open()`` + ``f.read()`` on every hit, uncompressed, no
+validators) with the in-memory StaticPageCache:
+
+- first visit: full body, gzip (or brotli when installed)
+- repeat visit: conditional GET with ``If-None-Match`` answered with 304
+
+When Flask is installed the real ``flask_app_fast`` routes are driven
+through the test client (``--flask``); otherwise the handlers are timed
+directly, which isolates the page-serving cost from the framework.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from vigoleonrocks.services.static_pages import StaticPageCache
+
+PAGES = {
+    '/': 'vigoleonrocks_modern_landing_2025.html',
+    '/ui': 'vigoleonrocks_corporate_ui_enhanced.html',
+    '/multimodal': 'vigoleonrocks_multimodal_interface_enhanced.html',
+    '/quantum': 'vigoleonrocks_quantum_command_center.html',
+}
+BROWSER_HEADERS = {'Accept-Encoding': 'gzip, deflate, br'}
+
+
+def legacy_handler(filename: str):
+    with open(os.path.join(ROOT, filename), 'r', encoding='utf-8') as f:
+        body = f.read().encode('utf-8')
+    return 200, {'Content-Type': 'text/html; charset=utf-8', 'Content-Length': str(len(body))}, body
+
+
+def wire_bytes(status: int, headers: dict, body: bytes) -> int:
+    head = f"HTTP/1.1 {status}\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+    return len(head.encode()) + len(body)
+
+
+def run(label: str, handler, requests: int) -> dict:
+    total_bytes = 0
+    start = time.perf_counter()
+    for i in range(requests):
+        total_bytes += wire_bytes(*handler(i))
+    elapsed = time.perf_counter() - start
+    return {'mode': label, 'requests_per_s': round(requests / elapsed, 1),
+            'bytes_per_request': round(total_bytes / requests)}
+
+
+def handler_level(requests: int) -> list:
+    cache = StaticPageCache(root=ROOT)
+    cache.preload(PAGES.values())
+    names = list(PAGES.values())
+    etags = {name: cache.serve(name, BROWSER_HEADERS)[1]['ETag'] for name in names}
+    return [
+        run('legacy open+read', lambda i: legacy_handler(names[i % len(names)]), requests),
+        run('cache 200 identity', lambda i: cache.serve(names[i % len(names)], {}), requests),
+        run('cache 200 compressed', lambda i: cache.serve(names[i % len(names)], BROWSER_HEADERS), requests),
+        run('cache 304 revalidate', lambda i: cache.serve(
+            names[i % len(names)], {**BROWSER_HEADERS, 'If-None-Match': etags[names[i % len(names)]]}), requests),
+    ]
+
+
+def flask_level(requests: int) -> list:
+    os.chdir(ROOT)
+    from flask_app_fast import app
+    client = app.test_client()
+    routes = list(PAGES)
+    etags = {route: client.get(route, headers=BROWSER_HEADERS).headers.get('ETag', '') for route in routes}
+
+    def call(route, headers):
+        response = client.get(route, headers=headers)
+        return response.status_code, dict(response.headers), response.get_data()
+    return [
+        run('flask 200 identity', lambda i: call(routes[i % len(routes)], {}), requests),
+        run('flask 200 compressed', lambda i: call(routes[i % len(routes)], BROWSER_HEADERS), requests),
+        run('flask 304 revalidate', lambda i: call(
+            routes[i % len(routes)], {**BROWSER_HEADERS, 'If-None-Match': etags[routes[i % len(routes)]]}), requests),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Static page serving throughput and bytes on the wire')
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--flask', action='store_true', help='Drive flask_app_fast through its test client')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    print("🗂️ VIGOLEONROCKS Static Pages Benchmark")
+    print("=" * 60)
+    results = flask_level(args.requests) if args.flask else handler_level(args.requests)
+    for row in results:
+        print(f"  {row['mode']:<22} {row['requests_per_s']:>10.1f} req/s  {row['bytes_per_request']:>7} bytes/req")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
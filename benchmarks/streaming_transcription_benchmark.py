@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Streaming Transcription Benchmark
+
+Real-time factor (processing time / audio duration), time to first segment
+and peak Python memory for long synthetic audio, comparing:
+
+- whole-file: the previous path — write the upload to a temporary .wav,
+  load it entirely as float32 and run the model over consecutive 30 s
+  windows, silence included, one after another
+- chunked: the in-memory audio pipeline — streaming decode to 16 kHz PCM,
+  energy VAD, overlapping speech windows transcribed concurrently
+
+The audio alternates tone bursts (speech stand-in) with silences. The model
+is a cost model shaped like Whisper on CPU: a fixed encoder cost per window
+plus a decode cost per second of audio, spent in ``time.sleep`` so that it
+releases the GIL like torch kernels do. Peak memory is measured with
+tracemalloc (Python allocations only) in a second pass with a zero-cost
+model, so that tracing overhead does not distort the timings.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from array import array
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.audio_pipeline import SAMPLE_RATE, AudioWindow, StreamingTranscriber, TranscriptionStats
+
+WHISPER_WINDOW_S = 30.0
+
+
+def synthetic_wav(minutes: float, speech_ratio: float) -> bytes:
+    """WAV 16 kHz mono con ráfagas de tono y silencios, determinista"""
+    tone = array('h', (int(9000 * math.sin(2 * math.pi * 220 * i / SAMPLE_RATE)) for i in range(SAMPLE_RATE)))
+    silence = array('h', [0]) * SAMPLE_RATE
+    pcm = array('h')
+    total_s = int(minutes * 60)
+    burst_lengths = (6, 9, 4, 12, 7)
+    second, index = 0, 0
+    while second < total_s:
+        speech_s = burst_lengths[index % len(burst_lengths)]
+        silent_s = max(1, round(speech_s * (1 - speech_ratio) / speech_ratio))
+        for _ in range(min(speech_s, total_s - second)):
+            pcm.extend(tone)
+        second += speech_s
+        for _ in range(max(0, min(silent_s, total_s - second))):
+            pcm.extend(silence)
+        second += silent_s
+        index += 1
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+class CostModel:
+    """Coste tipo Whisper en CPU: encoder fijo por ventana + decodificación por segundo de audio"""
+
+    def __init__(self, window_ms: float, per_second_ms: float):
+        self.window_s = window_ms / 1000
+        self.per_second_s = per_second_ms / 1000
+
+    def run(self, samples: int) -> None:
+        time.sleep(self.window_s + self.per_second_s * samples / SAMPLE_RATE)
+
+    def __call__(self, window: AudioWindow):
+        self.run(len(window.pcm) // 2)
+        return [(0.0, window.duration_s, f"segment@{window.start_s:.1f}")]
+
+
+def run_whole_file(data: bytes, model: CostModel) -> dict:
+    start = time.perf_counter()
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
+        tmp.write(data)
+        path = tmp.name
+    try:
+        with wave.open(path, 'rb') as wav:
+            pcm = array('h')
+            pcm.frombytes(wav.readframes(wav.getnframes()))
+        audio = array('f', (s / 32768.0 for s in pcm))  # como whisper.load_audio: todo en float32
+        window = int(WHISPER_WINDOW_S * SAMPLE_RATE)
+        first_segment = None
+        for offset in range(0, len(audio), window):
+            model.run(min(window, len(audio) - offset))
+            if first_segment is None:
+                first_segment = time.perf_counter() - start
+    finally:
+        os.unlink(path)
+    elapsed = time.perf_counter() - start
+    duration = len(pcm) / SAMPLE_RATE
+    return {'mode': 'whole-file', 'concurrency': 1, 'audio_s': duration,
+            'rtf': round(elapsed / duration, 4), 'first_segment_s': round(first_segment or 0, 3),
+            'windows': math.ceil(len(audio) / window)}
+
+
+def run_chunked(data: bytes, model: CostModel, concurrency: int) -> dict:
+    start = time.perf_counter()
+    transcriber = StreamingTranscriber(model, concurrency=concurrency, window_s=WHISPER_WINDOW_S)
+    first_segment = None
+    stats = TranscriptionStats()
+    segments = 0
+    for _ in transcriber.stream(data, stats):
+        if first_segment is None:
+            first_segment = time.perf_counter() - start
+        segments += 1
+    elapsed = time.perf_counter() - start
+    return {'mode': 'chunked+vad', 'concurrency': concurrency, 'audio_s': stats.audio_s,
+            'rtf': round(elapsed / stats.audio_s, 4), 'first_segment_s': round(first_segment or 0, 3),
+            'windows': stats.windows,
+            'speech_ratio': round(stats.speech_s / stats.audio_s, 3), 'segments': segments}
+
+
+def peak_memory_mb(run, *args) -> float:
+    """Pico de memoria Python de ``run`` con un modelo de coste cero"""
+    tracemalloc.start()
+    try:
+        run(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1048576, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Streaming transcription RTF and memory')
+    parser.add_argument('--minutes', type=float, default=10.0)
+    parser.add_argument('--speech-ratio', type=float, default=0.6)
+    parser.add_argument('--window-ms', type=float, default=400.0, help='Stand-in encoder cost per window')
+    parser.add_argument('--per-second-ms', type=float, default=10.0, help='Stand-in decode cost per audio second')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    data = synthetic_wav(args.minutes, args.speech_ratio)
+    model = CostModel(args.window_ms, args.per_second_ms)
+    print("🎙️ VIGOLEONROCKS Streaming Transcription Benchmark")
+    print(f"   audio: {args.minutes:g} min synthetic, {len(data) / 1048576:.1f} MB WAV, "
+          f"~{args.speech_ratio:.0%} speech")
+    print("=" * 60)
+    free = CostModel(0, 0)
+    results = [dict(run_whole_file(data, model), peak_mb=peak_memory_mb(run_whole_file, data, free))]
+    results += [dict(run_chunked(data, model, c), peak_mb=peak_memory_mb(run_chunked, data, free, c))
+                for c in args.concurrency]
+    for row in results:
+        print(f"  {row['mode']:<12} c={row['concurrency']:<2} RTF {row['rtf']:.4f}  "
+              f"first segment {row['first_segment_s']:>6.3f}s  peak {row['peak_mb']:>6.1f} MB  "
+              f"windows {row['windows']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'minutes': args.minutes, 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS System Sampler Overhead Benchmark
+
+CPU cost per minute of the shared SystemSampler (one /proc read per tick)
+at several sampling intervals, measured both per sample and on the live
+sampler thread. With psutil installed it also measures the legacy polling
+loops it replaces (PerformanceOptimizer, app_factory, flask_app,
+flask_app_multimodal, MetricsCollector and the gateways), each with its own
+thread and blocking ``cpu_percent`` interval.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.system_sampler import (
+    ProcCounterReader, SystemSampler, read_portable_counters
+)
+
+# (nombre, periodo en s, intervalo bloqueante de cpu_percent, llama a psutil.pids())
+LEGACY_LOOPS = [
+    ('PerformanceOptimizer._system_monitoring', 30, 1.0, False),
+    ('app_factory.metrics_updater', 5, 0.1, False),
+    ('flask_app.metrics_background_thread', 5, 0.1, False),
+    ('flask_app_multimodal.metrics_thread', 5, 0.1, False),
+    ('MetricsCollector._collect_metrics', 1, 1.0, True),
+    ('gateway.metrics_update_thread', 30, 0.0, False),
+    ('openrouter_gateway.metrics_update_thread', 30, 0.0, False),
+]
+
+
+def _cpu_per_call_us(func, iterations: int) -> float:
+    func()
+    start = time.thread_time()
+    for _ in range(iterations):
+        func()
+    return (time.thread_time() - start) / iterations * 1e6
+
+
+def measure_readers(iterations: int) -> dict:
+    results = {}
+    try:
+        results['proc'] = _cpu_per_call_us(ProcCounterReader(), iterations)
+    except OSError:
+        results['proc'] = None
+    results['portable'] = _cpu_per_call_us(read_portable_counters, iterations)
+    sampler = SystemSampler(interval=3600)
+    results['full_sample'] = _cpu_per_call_us(sampler.sample, iterations)
+    return results
+
+
+def measure_live(interval: float, duration: float) -> dict:
+    """Coste real del hilo del muestreador (thread_time medido dentro de cada muestra)"""
+    costs = []
+    sampler = SystemSampler(interval=interval)
+    sampler.subscribe(lambda snapshot: costs.append(snapshot.sampler_cost_us))
+    sampler.start()
+    time.sleep(duration)
+    sampler.stop()
+    samples_per_minute = 60.0 / interval
+    mean_us = sum(costs) / len(costs) if costs else 0.0
+    return {
+        'interval_s': interval,
+        'samples': len(costs),
+        'mean_sample_cost_us': round(mean_us, 2),
+        'cpu_ms_per_minute': round(mean_us * samples_per_minute / 1000, 3),
+        'threads': 1,
+    }
+
+
+def measure_legacy(iterations: int) -> dict:
+    try:
+        import psutil
+    except ImportError:
+        return {'skipped': 'psutil not installed'}
+    rows, total_cpu, total_blocked = [], 0.0, 0.0
+    for name, period, cpu_interval, pids in LEGACY_LOOPS:
+        def tick():
+            if cpu_interval:
+                psutil.cpu_percent(interval=None)  # el intervalo real solo bloquea el hilo
+            psutil.virtual_memory()
+            if pids:
+                len(psutil.pids())
+        cost_us = _cpu_per_call_us(tick, iterations)
+        cpu_ms = cost_us * (60.0 / period) / 1000
+        blocked = cpu_interval * (60.0 / period)
+        total_cpu += cpu_ms
+        total_blocked += blocked
+        rows.append({'loop': name, 'period_s': period, 'tick_cost_us': round(cost_us, 2),
+                     'cpu_ms_per_minute': round(cpu_ms, 3), 'blocked_s_per_minute': blocked})
+    return {'loops': rows, 'threads': len(LEGACY_LOOPS),
+            'cpu_ms_per_minute': round(total_cpu, 3), 'blocked_s_per_minute': round(total_blocked, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='System sampler CPU overhead')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--intervals', type=float, nargs='+', default=[1.0, 0.1])
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per live run')
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    print("📈 VIGOLEONROCKS System Sampler Overhead")
+    print("=" * 60)
+    readers = measure_readers(args.iterations)
+    for name, cost in readers.items():
+        print(f"  {name:<14} {'n/a' if cost is None else f'{cost:8.1f} µs CPU/call'}")
+
+    live = [measure_live(interval, args.duration) for interval in args.intervals]
+    for row in live:
+        print(f"⏱️  interval {row['interval_s']:>5}s: {row['mean_sample_cost_us']:8.1f} µs/sample "
+              f"→ {row['cpu_ms_per_minute']:8.2f} ms CPU/minute, 1 thread")
+
+    legacy = measure_legacy(min(args.iterations, 500))
+    if 'skipped' in legacy:
+        print(f"⚠️  legacy loops: {legacy['skipped']}")
+    else:
+        print(f"🐢 legacy loops: {legacy['cpu_ms_per_minute']:.2f} ms CPU/minute, "
+              f"{legacy['threads']} threads, {legacy['blocked_s_per_minute']:.0f} s/minute blocked in cpu_percent")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'readers_us': readers, 'live': live, 'legacy': legacy}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
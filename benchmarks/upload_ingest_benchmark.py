@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Upload Ingest Benchmark
+
+Memory under many simultaneous large uploads. Each client thread streams a
+video body in 64 KB chunks (with a small per-chunk delay so the uploads
+overlap, as they do behind a real network):
+
+- buffered (before): chunks go to a temp file like Werkzeug's default
+  stream factory, then the handler sizes it with seek/tell and calls
+  ``file.read()``, holding the whole body as one bytes object
+- spooled (after): chunks go through ``SpooledUpload`` (type sniffing,
+  per-type limit, incremental SHA-256) and the handler reads only
+  ``upload_info()``
+
+Peak Python heap comes from tracemalloc. A second pass sends oversized
+bodies and counts how many bytes each mode accepts before rejecting.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from vigoleonrocks.services.upload_ingest import UploadIngest, UploadRejected, upload_info
+
+CHUNK = 64 * 1024
+MP4_HEAD = b'\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2avc1mp41'
+
+
+def body_chunks(size: int):
+    yield MP4_HEAD + b'\x00' * (CHUNK - len(MP4_HEAD))
+    block = bytes(range(256)) * (CHUNK // 256)
+    for _ in range(1, size // CHUNK):
+        yield block
+
+
+class _Storage:
+    """Just enough of FileStorage for upload_info()"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+
+def buffered_upload(size: int, limit: int, delay: float) -> int:
+    received = 0
+    with tempfile.TemporaryFile() as f:
+        for chunk in body_chunks(size):
+            f.write(chunk)
+            received += len(chunk)
+            time.sleep(delay)
+        f.seek(0, 2)
+        if f.tell() > limit:
+            return received
+        f.seek(0)
+        data = f.read()
+        hashlib.sha256(data)  # the handler works on the whole body while holding it
+        return received
+
+
+def spooled_upload(ingest: UploadIngest, size: int, delay: float) -> int:
+    upload = ingest.open('/api/upload/video', 'clip.mp4')
+    received = 0
+    try:
+        for chunk in body_chunks(size):
+            received += len(chunk)
+            upload.write(chunk)
+            time.sleep(delay)
+        upload.seek(0)
+        upload_info(_Storage(upload))
+    except UploadRejected:
+        pass
+    finally:
+        upload.close()
+    return received
+
+
+def run_mode(mode: str, clients: int, size: int, limit: int, delay: float) -> dict:
+    ingest = UploadIngest({'/api/upload/video': ['video']}, limits={'video': limit})
+    received = []
+
+    def client():
+        if mode == 'buffered':
+            received.append(buffered_upload(size, limit, delay))
+        else:
+            received.append(spooled_upload(ingest, size, delay))
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'mode': mode,
+        'clients': clients,
+        'upload_mb': round(size / 1024 ** 2, 1),
+        'peak_heap_mb': round(peak / 1024 ** 2, 1),
+        'mb_received_per_upload': round(sum(received) / len(received) / 1024 ** 2, 2),
+        'elapsed_s': round(elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak memory with many concurrent large uploads, buffered vs spooled')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--size-mb', type=float, default=32)
+    parser.add_argument('--limit-mb', type=float, default=200)
+    parser.add_argument('--oversize-mb', type=float, default=64, help='Body size for the rejection pass')
+    parser.add_argument('--oversize-limit-mb', type=float, default=8)
+    parser.add_argument('--chunk-delay-ms', type=float, default=0.2)
+    parser.add_argument('--output', default=None, help='Optional JSON output file')
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 ** 2)
+    limit = int(args.limit_mb * 1024 ** 2)
+    delay = args.chunk_delay_ms / 1000
+
+    print("📥 VIGOLEONROCKS Upload Ingest Benchmark")
+    print("=" * 60)
+    print(f"  {args.clients} concurrent uploads of {args.size_mb:g} MB, {CHUNK // 1024} KB chunks")
+
+    results = [run_mode(mode, args.clients, size, limit, delay) for mode in ('buffered', 'spooled')]
+    oversize = int(args.oversize_mb * 1024 ** 2)
+    oversize_limit = int(args.oversize_limit_mb * 1024 ** 2)
+    results += [dict(run_mode(mode, args.clients, oversize, oversize_limit, delay), mode=f'{mode} (oversize)')
+                for mode in ('buffered', 'spooled')]
+
+    for row in results:
+        print(f"  {row['mode']:<20} peak heap {row['peak_heap_mb']:>8.1f} MB  "
+              f"received/upload {row['mb_received_per_upload']:>7.2f} MB  {row['elapsed_s']:>6.2f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
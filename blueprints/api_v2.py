@@ -5,6 +5,7 @@ Blueprint con endpoints mejorados, documentación OpenAPI y funcionalidad avanza
 """
 
 import os
+import shutil
 import time
 import json
 from datetime import datetime
@@ -295,36 +296,26 @@ def create_api_v2_blueprint(config):
                 
                 metrics['application'] = app_metrics
             
-            # Métricas del sistema
-            try:
-                import psutil
-                system_metrics = {
-                    'cpu_percent': psutil.cpu_percent(interval=0.1),
-                    'memory': {
-                        'total': psutil.virtual_memory().total,
-                        'available': psutil.virtual_memory().available,
-                        'percent': psutil.virtual_memory().percent,
-                        'used': psutil.virtual_memory().used
-                    },
-                    'disk': {
-                        'total': psutil.disk_usage('/').total,
-                        'used': psutil.disk_usage('/').used,
-                        'free': psutil.disk_usage('/').free,
-                        'percent': psutil.disk_usage('/').percent
-                    } if os.name != 'nt' else {
-                        'total': psutil.disk_usage('C:\\').total,
-                        'used': psutil.disk_usage('C:\\').used,
-                        'free': psutil.disk_usage('C:\\').free,
-                        'percent': psutil.disk_usage('C:\\').percent
-                    }
-                }
-                metrics['system'] = system_metrics
-            except ImportError:
-                from config import system_entropy
-                metrics['system'] = {
-                    'cpu_percent': system_entropy() * 100,
-                    'memory_percent': system_entropy() * 80 + 20
-                }
+            # Métricas del sistema (última muestra del muestreador compartido, sin bloquear)
+            from vigoleonrocks.services.system_sampler import current_snapshot
+            snapshot = current_snapshot()
+            disk = shutil.disk_usage('C:\\' if os.name == 'nt' else '/')
+            metrics['system'] = {
+                'cpu_percent': snapshot.system_cpu_percent,
+                'memory': {
+                    'total': int(snapshot.memory_total_mb * 1048576),
+                    'available': int((snapshot.memory_total_mb - snapshot.memory_used_mb) * 1048576),
+                    'percent': snapshot.memory_percent,
+                    'used': int(snapshot.memory_used_mb * 1048576)
+                },
+                'disk': {
+                    'total': disk.total,
+                    'used': disk.used,
+                    'free': disk.free,
+                    'percent': round(100.0 * disk.used / disk.total, 1) if disk.total else 0.0
+                },
+                'process': snapshot.as_dict()
+            }
             
             # Métricas multimodales
             if config.MULTIMODAL_ENABLED:
@@ -337,7 +328,9 @@ def create_api_v2_blueprint(config):
                         'models_loaded': system_status.get('models_loaded', 0),
                         'models_available': len(system_status.get('models_available', [])),
                         'capabilities': system_status.get('capabilities', {}),
-                        'device': system_status.get('device', 'unknown')
+                        'device': system_status.get('device', 'unknown'),
+                        'residency': system_status.get('residency', {}),
+                        'batching': system_status.get('batching', {})
                     }
                     
                     # Agregar estadísticas de uso si están disponibles
@@ -85,6 +85,53 @@ class BaseConfig:
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
     RATE_LIMITING_ENABLED = os.environ.get('RATE_LIMITING', 'true').lower() == 'true'
     MAX_REQUESTS_PER_MINUTE = int(os.environ.get('MAX_REQUESTS_PER_MINUTE', 60))
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # memory | shared | redis
+    RATE_LIMIT_ROUTES = {  # prefijo más largo gana; RATE_LIMIT_ROUTES en el entorno los sobrescribe
+        '/api/v2/cache/clear': '5/minute',
+        '/api/v2/system/health': 'exempt',
+        '/api/v2/metrics': 'exempt',
+        '/dashboard/api/': '120/minute',
+    }
+    
+    # === CONTROL DE ADMISIÓN ===
+    ADMISSION_CONTROL_ENABLED = os.environ.get('ADMISSION_CONTROL', 'true').lower() == 'true'
+    ADMISSION_MAX_CONCURRENCY = int(os.environ.get('ADMISSION_MAX_CONCURRENCY') or WORKERS)
+    ADMISSION_MAX_QUEUE = int(os.environ.get('ADMISSION_MAX_QUEUE') or WORKERS * 4)
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 1.0))  # segundos
+    ADMISSION_CODEL_TARGET = float(os.environ.get('ADMISSION_CODEL_TARGET', 0.01))
+    ADMISSION_CODEL_INTERVAL = float(os.environ.get('ADMISSION_CODEL_INTERVAL', 0.1))
+    ADMISSION_DEFAULT_TIMEOUT = float(os.environ.get('ADMISSION_DEFAULT_TIMEOUT', 30))  # 0 = sin deadline
+    ADMISSION_ROUTES = {  # "concurrencia [queue N] [wait Xs]"; ADMISSION_ROUTES en el entorno los sobrescribe
+        '/api/v2/performance/report': '2 queue 2',
+        '/api/performance/report': '2 queue 2',
+        '/api/v2/system/models': '2 queue 4',
+        '/api/v2/system/health': 'exempt',
+        '/api/v2/metrics': 'exempt',
+        '/health': 'exempt',
+        '/livez': 'exempt',
+        '/readyz': 'exempt',
+        '/startupz': 'exempt',
+        '/static/': 'exempt',
+    }
+    
+    # === PROBES DE SALUD ===
+    HEALTH_CHECK_TTL = float(os.environ.get('HEALTH_CHECK_TTL', 2.0))  # segundos de cache por comprobación
+    HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', 2.0))
+    HEALTH_MAX_SATURATION = float(os.environ.get('HEALTH_MAX_SATURATION', 0.9))  # fracción de WORKERS ocupados
+    HEALTH_MAX_LOOP_LAG = float(os.environ.get('HEALTH_MAX_LOOP_LAG', 0.1))
+    HEALTH_WARMUP_ENABLED = os.environ.get('HEALTH_WARMUP', 'true').lower() == 'true'
+    
+    # === CAPTURA DE TRÁFICO ===
+    TRAFFIC_CAPTURE_ENABLED = os.environ.get('TRAFFIC_CAPTURE_ENABLED', 'false').lower() == 'true'
+    TRAFFIC_CAPTURE_SAMPLE = float(os.environ.get('TRAFFIC_CAPTURE_SAMPLE', 0.01))  # fracción de peticiones
+    TRAFFIC_CAPTURE_DIR = Path(os.environ.get('TRAFFIC_CAPTURE_DIR') or LOGS_DIR / 'traffic')
+    
+    # === TRAZAS ===
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACING_SAMPLE = float(os.environ.get('TRACING_SAMPLE', 1.0))  # fracción de peticiones trazadas
+    TRACING_RING_SIZE = int(os.environ.get('TRACING_RING_SIZE', 512))
+    TRACING_SLOWEST = int(os.environ.get('TRACING_SLOWEST', 20))
+    TRACING_FILE = os.environ.get('TRACING_FILE', '')  # JSONL opcional
     
     # === API v2 ===
     API_V2_ENABLED = True
@@ -145,6 +192,7 @@ class ProductionConfig(BaseConfig):
     DEBUG = False
     LOG_LEVEL = 'INFO'
     MAX_REQUESTS_PER_MINUTE = 30
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'shared')  # un límite para todos los workers
 
 
 class TestingConfig(BaseConfig):
@@ -186,27 +234,9 @@ def print_config_summary(config: BaseConfig):
 
 def setup_system_entropy():
     """Configurar generación de entropía del sistema (cumple política)"""
-    import secrets
-    import time
-    
-    def get_system_entropy():
-        """Generar entropía usando fuentes del sistema (NO Math.random)"""
-        entropy_sources = [
-            secrets.randbits(64),
-            time.time_ns(),
-            hash(str(os.getpid())),
-            os.urandom(8)
-        ]
-        
-        combined = 0
-        for source in entropy_sources:
-            if isinstance(source, bytes):
-                source = int.from_bytes(source, 'big')
-            combined ^= source
-        
-        return abs(combined % 100) / 100.0
+    from vigoleonrocks.services.entropy import get_entropy
     
-    return get_system_entropy
+    return get_entropy().uniform
 
 # Configurar entropía del sistema
 system_entropy = setup_system_entropy()
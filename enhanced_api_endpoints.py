@@ -148,6 +148,64 @@ class EnhancedAPIEndpoints:
                 logger.error(f"Error en /api/v2/image/quick: {e}")
                 return jsonify({'success': False, 'error': str(e)}), 500
         
+        @self.app.route('/api/v2/image/similar', methods=['POST'])
+        async def similar_images():
+            """Imágenes analizadas más parecidas (similitud coseno de embeddings CLIP)"""
+            try:
+                self._track_endpoint_usage('image_similar')
+                
+                from vigoleonrocks.services.embedding_index import get_embedding_index
+                index = get_embedding_index()
+                params = request.get_json(silent=True) or request.form.to_dict()
+                k = max(1, min(int(params.get('k', 10)), 100))
+                mode = params.get('mode', 'auto')
+                if mode not in ('auto', 'exact', 'ivf'):
+                    return jsonify({'error': 'mode debe ser auto, exact o ivf'}), 400
+                
+                exclude = None
+                if params.get('analysis_id'):
+                    # Consulta por un análisis ya indexado (no se devuelve a sí mismo)
+                    exclude = params['analysis_id']
+                    vector = index.vector_of(exclude)
+                    if vector is None:
+                        return jsonify({'error': 'analysis_id no encontrado en el índice'}), 404
+                elif 'image' in request.files or params.get('image_data'):
+                    if 'image' in request.files:
+                        image = Image.open(request.files['image'].stream)
+                    else:
+                        image_data = params['image_data']
+                        if 'data:image' in image_data:
+                            image_data = image_data.split(',')[1]
+                        image = Image.open(BytesIO(base64.b64decode(image_data)))
+                    
+                    from multimodal_ai_manager import get_multimodal_manager
+                    vector = await get_multimodal_manager().embed_image(image)
+                    if vector is None:
+                        return jsonify({'success': False, 'error': 'CLIP no disponible'}), 503
+                else:
+                    return jsonify({'error': 'No image or analysis_id provided'}), 400
+                
+                start_time = time.time()
+                matches = index.search(vector, k=k, mode=mode, exclude=exclude)
+                query_time = time.time() - start_time
+                
+                return jsonify({
+                    'success': True,
+                    'results': [{
+                        'analysis_id': match['id'],
+                        'similarity': match['score'],
+                        'analysis': match['meta'].get('content'),
+                        'created_at': match['meta'].get('created_at')
+                    } for match in matches],
+                    'query_time_ms': round(query_time * 1000, 3),
+                    'index': index.stats()
+                })
+                
+            except Exception as e:
+                self._track_error()
+                logger.error(f"Error en /api/v2/image/similar: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
         # === ENDPOINTS DE SISTEMA ===
         
         @self.app.route('/api/v2/system/health', methods=['GET'])
@@ -462,6 +520,7 @@ class EnhancedAPIEndpoints:
         descriptions = {
             'analyze_image_v2': 'Análisis avanzado de imagen con opciones específicas',
             'quick_image_analysis': 'Análisis rápido optimizado para velocidad',
+            'similar_images': 'Búsqueda de imágenes analizadas similares (embeddings CLIP)',
             'system_health_detailed': 'Health check detallado del sistema',
             'list_available_models': 'Lista modelos disponibles con detalles',
             'cache_statistics': 'Estadísticas detalladas del cache',
@@ -487,6 +546,11 @@ class EnhancedAPIEndpoints:
             'quick_image_analysis': {
                 'image': 'File upload requerido'
             },
+            'similar_images': {
+                'image': 'File upload, image_data en base64 o analysis_id de un análisis previo',
+                'k': 'int - número de resultados (1-100, por defecto 10)',
+                'mode': 'auto|exact|ivf'
+            },
             'clear_cache': {
                 'force': 'boolean - forzar limpieza LRU'
             }
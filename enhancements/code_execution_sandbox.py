@@ -0,0 +1,513 @@
+"""
+🧪⚛️ QUANTUM CODE EXECUTION SANDBOX ⚛️🧪
+=========================================
+Execution-based verification for generated code. A pool of pre-started
+worker processes keeps interpreter startup off the hot path; every check
+runs in a short-lived child forked from a warm worker, under resource
+limits and a wall-clock deadline. Workers come from the forkserver (spawn
+where it is unavailable), never from a fork of the multithreaded server.
+
+Components:
+- SandboxLimits: CPU/memory/output/wall-clock limits for one execution
+- SandboxWorkerPool: Pre-started, self-healing pool of isolated workers
+- ExecutionVerifier: Smoke execution and test-case runner with pass rates
+
+Isolation layers (best effort, reported per result):
+- The child keeps only the write end of its result pipe (every other
+  descriptor, including the worker's connection to the server, is closed)
+  and results travel as JSON, so nothing the sandboxed code writes is ever
+  unpickled
+- rlimits (RLIMIT_CPU, RLIMIT_AS, RLIMIT_FSIZE) where `resource` exists;
+  the memory limit is a budget on top of the address space the child
+  inherits, so it does not depend on what the worker has imported
+- Network namespace via unshare(CLONE_NEWUSER | CLONE_NEWNET) on Linux,
+  falling back to disabling the `socket` module inside the sandbox
+
+Author: VIGOLEONROCKS Quantum Development Team
+Version: 1.0.0 - Execution Supremacy
+"""
+
+import copy
+import io
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import select
+import signal
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+# Upper bound for one result message (stdout + stderr are capped separately)
+MAX_RESULT_BYTES = 4 * 1024 * 1024
+
+@dataclass
+class SandboxLimits:
+    """Resource limits applied to each sandboxed execution"""
+    cpu_seconds: int = 2
+    memory_bytes: int = 256 * 1024 * 1024
+    wall_timeout: float = 3.0
+    max_output_bytes: int = 64 * 1024
+    max_file_bytes: int = 0
+    isolate_network: bool = True
+
+@dataclass
+class FunctionTestCase:
+    """Input/output example for a generated function"""
+    args: Tuple[Any, ...]
+    expected: Any
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class FunctionTestResult:
+    """Outcome of running one test case"""
+    index: int
+    passed: bool
+    actual: Optional[str] = None
+    error: Optional[str] = None
+
+@dataclass
+class ExecutionResult:
+    """Outcome of one sandboxed execution"""
+    success: bool
+    stdout: str = ""
+    stderr: str = ""
+    error: Optional[str] = None
+    timed_out: bool = False
+    crashed: bool = False
+    duration_ms: float = 0.0
+    network_isolation: str = "none"
+    test_results: List[FunctionTestResult] = field(default_factory=list)
+
+    @property
+    def tests_passed(self) -> int:
+        return sum(1 for result in self.test_results if result.passed)
+
+    @property
+    def pass_rate(self) -> float:
+        if not self.test_results:
+            return 0.0
+        return self.tests_passed / len(self.test_results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "success": self.success,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "error": self.error,
+            "timed_out": self.timed_out,
+            "crashed": self.crashed,
+            "duration_ms": round(self.duration_ms, 3),
+            "network_isolation": self.network_isolation,
+            "tests_passed": self.tests_passed,
+            "tests_total": len(self.test_results),
+            "pass_rate": self.pass_rate,
+        }
+
+# ---------------------------------------------------------------------------
+# Code that runs inside the sandbox processes
+# ---------------------------------------------------------------------------
+
+def _isolate_network() -> str:
+    """Drop network access for this process and its children"""
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.unshare(CLONE_NEWUSER | CLONE_NEWNET) == 0:
+                return "namespace"
+        except Exception:
+            pass
+
+    import socket
+
+    def _blocked(*args, **kwargs):
+        raise PermissionError("network access is disabled in the sandbox")
+
+    socket.socket = _blocked
+    socket.create_connection = _blocked
+    socket.getaddrinfo = _blocked
+    return "python"
+
+def _address_space_bytes() -> Optional[int]:
+    """Current virtual size of this process (Linux /proc), None if unknown"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _apply_rlimits(limits: SandboxLimits) -> None:
+    """Apply per-execution rlimits in the forked child"""
+    if resource is None:
+        return
+    settings = [
+        (resource.RLIMIT_CPU, limits.cpu_seconds, limits.cpu_seconds + 1),
+        (resource.RLIMIT_FSIZE, limits.max_file_bytes, limits.max_file_bytes),
+    ]
+    # The child starts with the worker's whole address space (interpreter,
+    # imported modules); an absolute RLIMIT_AS would fail every execution once
+    # that alone exceeds memory_bytes, so the limit is usage + budget.
+    in_use = _address_space_bytes()
+    if in_use is not None:
+        address_space = in_use + limits.memory_bytes
+        settings.append((resource.RLIMIT_AS, address_space, address_space))
+    for limit, soft, hard in settings:
+        try:
+            resource.setrlimit(limit, (soft, hard))
+        except (ValueError, OSError):
+            pass
+
+def _safe_repr(value: Any, limit: int = 200) -> str:
+    try:
+        text = repr(value)
+    except Exception as e:
+        text = f"<unrepresentable {type(value).__name__}: {e}>"
+    return text if len(text) <= limit else text[:limit] + "..."
+
+def _execute_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute code and optional test cases, capturing stdout/stderr"""
+    limits: SandboxLimits = task["limits"]
+    stdout, stderr = io.StringIO(), io.StringIO()
+    payload: Dict[str, Any] = {"success": False, "error": None, "tests": []}
+
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        namespace: Dict[str, Any] = {"__name__": "__sandbox__"}
+        try:
+            exec(compile(task["code"], "<sandbox>", "exec"), namespace)
+            payload["success"] = True
+        except BaseException as e:
+            payload["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+        function_name = task.get("function_name")
+        if payload["success"] and function_name:
+            func = namespace.get(function_name)
+            if not callable(func):
+                payload["success"] = False
+                payload["error"] = f"function '{function_name}' is not defined"
+            else:
+                for index, case in enumerate(task.get("test_cases") or []):
+                    try:
+                        actual = func(*copy.deepcopy(case.args), **copy.deepcopy(case.kwargs))
+                        payload["tests"].append((index, bool(actual == case.expected), _safe_repr(actual), None))
+                    except BaseException as e:
+                        payload["tests"].append((index, False, None, f"{type(e).__name__}: {e}"))
+
+    payload["stdout"] = stdout.getvalue()[:limits.max_output_bytes]
+    payload["stderr"] = stderr.getvalue()[:limits.max_output_bytes]
+    return payload
+
+def _read_all(fd: int, deadline: float, limit: int = MAX_RESULT_BYTES) -> Tuple[bytes, bool]:
+    """Read a pipe until EOF, deadline or ``limit`` bytes; returns (data, timed_out)"""
+    chunks, size = [], 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return b"".join(chunks), True
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b"".join(chunks), False
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:  # oversized: decodes as a malformed result
+            return b"".join(chunks)[:limit], False
+
+def _encode_result(result: Dict[str, Any]) -> bytes:
+    """JSON for results produced next to untrusted code (never pickle)"""
+    try:
+        return json.dumps(result).encode("utf-8")
+    except (TypeError, ValueError) as e:
+        return json.dumps({"success": False, "error": f"unserializable result: {e}",
+                           "tests": [], "stdout": "", "stderr": ""}).encode("utf-8")
+
+def _decode_result(data: bytes) -> Dict[str, Any]:
+    """Parse a result written by a sandbox process; anything malformed is a crash"""
+    try:
+        result = json.loads(data.decode("utf-8"))
+        tests = [(int(i), bool(p), None if a is None else str(a), None if e is None else str(e))
+                 for i, p, a, e in result.get("tests", [])]
+    except (ValueError, TypeError, AttributeError, UnicodeDecodeError):
+        return {"success": False, "crashed": True, "error": "sandbox returned a malformed result",
+                "tests": [], "stdout": "", "stderr": ""}
+    return {
+        "success": result.get("success") is True,
+        "stdout": str(result.get("stdout", "")),
+        "stderr": str(result.get("stderr", "")),
+        "error": None if result.get("error") is None else str(result["error"]),
+        "timed_out": result.get("timed_out") is True,
+        "crashed": result.get("crashed") is True,
+        "network_isolation": str(result.get("network_isolation", "none")),
+        "tests": tests,
+    }
+
+def _close_inherited_fds(keep: int) -> None:
+    """Leave the child with stdio on /dev/null and ``keep``; nothing else"""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    max_fd = os.sysconf("SC_OPEN_MAX") if hasattr(os, "sysconf") else 65536
+    os.closerange(3, keep)
+    os.closerange(keep + 1, max_fd)
+
+def _run_in_forked_child(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Fork a disposable child from the warm worker and run the task there"""
+    limits: SandboxLimits = task["limits"]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        try:
+            # Includes the worker's connection to the server: the untrusted
+            # code must not be able to write to it
+            _close_inherited_fds(keep=write_fd)
+            _apply_rlimits(limits)
+            data = _encode_result(_execute_task(task))
+            with os.fdopen(write_fd, "wb") as pipe:
+                pipe.write(data)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    try:
+        data, timed_out = _read_all(read_fd, time.monotonic() + limits.wall_timeout)
+    finally:
+        os.close(read_fd)
+
+    if timed_out:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    _, status = os.waitpid(pid, 0)
+
+    if timed_out:
+        return {"success": False, "timed_out": True, "error": "wall-clock timeout exceeded",
+                "tests": [], "stdout": "", "stderr": ""}
+    if not data:
+        reason = f"signal {os.WTERMSIG(status)}" if os.WIFSIGNALED(status) else "no result"
+        if os.WIFSIGNALED(status) and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL):
+            reason = "CPU limit exceeded"
+        return {"success": False, "crashed": True, "error": f"sandbox process died ({reason})",
+                "tests": [], "stdout": "", "stderr": ""}
+    return _decode_result(data)
+
+def _worker_main(conn, isolate_network: bool) -> None:
+    """Worker loop: stays warm and serves tasks until told to stop"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    isolation = _isolate_network() if isolate_network else "none"
+    can_fork = hasattr(os, "fork")
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        if can_fork:
+            result = _run_in_forked_child(task)
+        else:  # untrusted code runs in this worker: its result is JSON all the same
+            result = _decode_result(_encode_result(_execute_task(task)))
+        result["network_isolation"] = isolation
+        try:
+            conn.send_bytes(_encode_result(result))
+        except (BrokenPipeError, OSError):
+            break
+
+# ---------------------------------------------------------------------------
+# Parent-side pool
+# ---------------------------------------------------------------------------
+
+class _Worker:
+    def __init__(self, ctx, isolate_network: bool):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, isolate_network), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_served = 0
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        try:
+            self.process.kill()
+            self.process.join(timeout=1.0)
+        except Exception:
+            pass
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=1.0)
+        except Exception:
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+class SandboxWorkerPool:
+    """Pre-started pool of sandbox workers with automatic respawn"""
+
+    def __init__(self, size: int = 2, limits: Optional[SandboxLimits] = None,
+                 max_tasks_per_worker: int = 500):
+        self.size = max(1, size)
+        self.limits = limits or SandboxLimits()
+        self.max_tasks_per_worker = max_tasks_per_worker
+        # forkserver/spawn: workers start from a fresh single-threaded
+        # interpreter, not from a fork of the server's threads and memory
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._ctx = multiprocessing.get_context(method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"executions": 0, "timeouts": 0, "crashes": 0, "respawns": 0}
+        for _ in range(self.size):
+            self._add_worker()
+
+    def _add_worker(self) -> None:
+        worker = _Worker(self._ctx, self.limits.isolate_network)
+        with self._lock:
+            self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _replace_worker(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self.stats["respawns"] += 1
+        if not self._closed:
+            self._add_worker()
+
+    def execute(self, code: str, function_name: Optional[str] = None,
+                test_cases: Optional[Sequence[FunctionTestCase]] = None,
+                limits: Optional[SandboxLimits] = None) -> ExecutionResult:
+        """Run code on an idle worker and return the captured result"""
+        if self._closed:
+            raise RuntimeError("SandboxWorkerPool is closed")
+        limits = limits or self.limits
+        task = {"code": code, "function_name": function_name,
+                "test_cases": list(test_cases or []), "limits": limits}
+
+        start = time.perf_counter()
+        worker = self._idle.get()
+        try:
+            worker.conn.send(task)
+            # The worker enforces the wall timeout itself; the grace period
+            # only covers a worker that is wedged or dead.
+            if worker.conn.poll(limits.wall_timeout + 2.0):
+                raw = _decode_result(worker.conn.recv_bytes(MAX_RESULT_BYTES))
+            else:
+                raw = {"success": False, "timed_out": True, "error": "sandbox worker unresponsive",
+                       "tests": [], "stdout": "", "stderr": ""}
+                self._replace_worker(worker)
+                worker = None
+        except (EOFError, OSError) as e:
+            raw = {"success": False, "crashed": True, "error": f"sandbox worker failed: {e}",
+                   "tests": [], "stdout": "", "stderr": ""}
+            self._replace_worker(worker)
+            worker = None
+
+        if worker is not None:
+            worker.tasks_served += 1
+            if not worker.alive() or worker.tasks_served >= self.max_tasks_per_worker:
+                self._replace_worker(worker)
+            else:
+                self._idle.put(worker)
+
+        result = ExecutionResult(
+            success=raw.get("success", False),
+            stdout=raw.get("stdout", ""),
+            stderr=raw.get("stderr", ""),
+            error=raw.get("error"),
+            timed_out=raw.get("timed_out", False),
+            crashed=raw.get("crashed", False),
+            duration_ms=(time.perf_counter() - start) * 1000,
+            network_isolation=raw.get("network_isolation", "none"),
+            test_results=[FunctionTestResult(index=i, passed=p, actual=a, error=err)
+                          for i, p, a, err in raw.get("tests", [])],
+        )
+        with self._lock:
+            self.stats["executions"] += 1
+            self.stats["timeouts"] += int(result.timed_out)
+            self.stats["crashes"] += int(result.crashed)
+        return result
+
+    def close(self) -> None:
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self) -> "SandboxWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+class ExecutionVerifier:
+    """Verifies generated code by executing it in the sandbox pool"""
+
+    def __init__(self, pool: Optional[SandboxWorkerPool] = None, pool_size: int = 2,
+                 limits: Optional[SandboxLimits] = None):
+        self._owns_pool = pool is None
+        self.pool = pool or SandboxWorkerPool(size=pool_size, limits=limits)
+
+    def verify(self, code: str) -> ExecutionResult:
+        """Execute module-level code and report whether it ran cleanly"""
+        return self.pool.execute(code)
+
+    def run_test_cases(self, code: str, function_name: str,
+                       test_cases: Sequence[Any]) -> ExecutionResult:
+        """Execute `function_name` against input/output examples"""
+        cases = [case if isinstance(case, FunctionTestCase) else FunctionTestCase(args=tuple(case[0]), expected=case[1])
+                 for case in test_cases]
+        return self.pool.execute(code, function_name=function_name, test_cases=cases)
+
+    def close(self) -> None:
+        if self._owns_pool:
+            self.pool.close()
+
+_default_verifier: Optional[ExecutionVerifier] = None
+_default_lock = threading.Lock()
+
+def get_execution_verifier() -> ExecutionVerifier:
+    """Process-wide verifier, created on first use (workers come from the forkserver)"""
+    global _default_verifier
+    with _default_lock:
+        if _default_verifier is None:
+            size = int(os.getenv("CODE_SANDBOX_WORKERS", "2"))
+            _default_verifier = ExecutionVerifier(pool_size=size)
+        return _default_verifier
+
+if __name__ == "__main__":
+    with SandboxWorkerPool(size=2) as pool:
+        verifier = ExecutionVerifier(pool=pool)
+        print(verifier.verify("print('hello from the sandbox')").to_dict())
+        print(verifier.verify("while True: pass").to_dict())
+        report = verifier.run_test_cases(
+            "def add(a, b):\n    return a + b", "add", [((1, 2), 3), ((2, 2), 5)]
+        )
+        print(report.to_dict())
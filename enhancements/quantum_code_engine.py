@@ -9,7 +9,7 @@ Components:
 - QuantumPatternRecognizer: Algorithmic pattern recognition across dimensions
 - DimensionalCodeGenerator: Code generation using quantum coherence
 - SacredGeometryCodeStructure: Sacred patterns in code architecture
-- QuantumCodeVerifier: Multidimensional code validation
+- QuantumCodeVerifier: Multidimensional code validation (syntax + sandboxed execution)
 - CodeOptimizer: Quantum-enhanced code optimization
 
 Author: VIGOLEONROCKS Quantum Development Team
@@ -26,6 +26,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 import math
 
+try:
+    from enhancements.code_execution_sandbox import ExecutionVerifier, get_execution_verifier
+except ImportError:
+    from code_execution_sandbox import ExecutionVerifier, get_execution_verifier
+
 class ProgrammingLanguage(Enum):
     PYTHON = "python"
     JAVASCRIPT = "javascript"
@@ -564,16 +569,35 @@ class DimensionalCodeGenerator:
 class QuantumCodeVerifier:
     """Multidimensional code verification and validation"""
     
-    def __init__(self):
+    def __init__(self, execution_verifier: Optional[ExecutionVerifier] = None,
+                 execute_code: bool = True):
         self.sacred_patterns = SacredGeometryCodeStructure()
-    
-    def verify_code_solution(self, solution: QuantumCodeSolution) -> Dict[str, bool]:
+        self.execute_code = execute_code
+        self._execution_verifier = execution_verifier
+        self.last_execution = None
+    
+    @property
+    def execution_verifier(self) -> ExecutionVerifier:
+        if self._execution_verifier is None:
+            self._execution_verifier = get_execution_verifier()
+        return self._execution_verifier
+    
+    def verify_code_solution(self, solution: QuantumCodeSolution,
+                             test_cases: Optional[List[Any]] = None,
+                             function_name: Optional[str] = None) -> Dict[str, bool]:
         """Verify code solution across multiple quantum dimensions"""
         verification_results = {}
         
         # Syntax verification (basic)
         verification_results["syntax_valid"] = self._verify_syntax(solution.final_code, solution.language)
         
+        # Execution verification: actually run the code in the sandbox
+        if (self.execute_code and verification_results["syntax_valid"]
+                and solution.language == ProgrammingLanguage.PYTHON):
+            verification_results.update(
+                self._verify_execution(solution.final_code, test_cases, function_name)
+            )
+        
         # Sacred geometry compliance
         verification_results["sacred_geometry"] = self._verify_sacred_geometry(solution.final_code)
         
@@ -603,6 +627,20 @@ class QuantumCodeVerifier:
             return False
         return True  # For other languages, assume valid for now
     
+    def _verify_execution(self, code: str, test_cases: Optional[List[Any]],
+                          function_name: Optional[str]) -> Dict[str, bool]:
+        """Run the code in the sandbox pool and, if given, its test cases"""
+        if test_cases and function_name:
+            result = self.execution_verifier.run_test_cases(code, function_name, test_cases)
+        else:
+            result = self.execution_verifier.verify(code)
+        self.last_execution = result
+        
+        results = {"executes_cleanly": result.success}
+        if test_cases and function_name:
+            results["tests_passed"] = result.success and result.pass_rate == 1.0
+        return results
+    
     def _verify_sacred_geometry(self, code: str) -> bool:
         """Verify sacred geometry patterns in code structure"""
         lines = code.split('\n')
@@ -641,7 +679,8 @@ class QuantumCodeGenerationEngine:
         self.sacred_patterns = SacredGeometryCodeStructure()
     
     def generate_code_solution(self, problem: str, function_name: str = "solution", 
-                              parameters: List[str] = None) -> QuantumCodeSolution:
+                              parameters: List[str] = None,
+                              test_cases: Optional[List[Any]] = None) -> QuantumCodeSolution:
         """Main method to generate code solutions using quantum reasoning"""
         start_time = time.time()
         
@@ -711,7 +750,9 @@ class QuantumCodeGenerationEngine:
         )
         
         # Verify solution
-        solution.verification_results = self.verifier.verify_code_solution(solution)
+        solution.verification_results = self.verifier.verify_code_solution(
+            solution, test_cases=test_cases, function_name=function_name
+        )
         
         return solution
     
@@ -0,0 +1,503 @@
+"""
+🧭⚛️ QUANTUM ENGINE ROUTER ⚛️🧭
+================================
+Routes a query to the most suitable quantum engine behind a uniform adapter
+interface. The engines expose different entry points
+(``process_query``, ``solve_mathematical_problem``, ``enhance_query_with_examples``,
+``generate_code_solution``); adapters normalise them into ``EngineResponse``.
+
+Components:
+- QueryFeatures: Feature vector built from a single scan of the query
+- EngineRouter: Linear scoring classifier (softmax over engines), optionally
+  trained with an averaged perceptron on labelled queries
+- Speculative execution: when the top-2 engines are close, both run in
+  parallel under a deadline and the higher-confidence answer wins
+- EngineStats: Per-engine latency/confidence/failure EWMAs that feed back
+  into the speculation margin and into the routing scores
+
+Author: VIGOLEONROCKS Quantum Development Team
+Version: 1.0.0 - Routing Supremacy
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENGINE_NAMES = ("math", "code", "cot", "few_shot")
+
+# Token (or token sequence) -> feature. Spanish and English, with and without accents,
+# so the query only needs lowercasing before the single scan.
+FEATURE_LEXICON: Dict[Tuple[str, ...], str] = {}
+
+
+def _lexicon(feature: str, entries: Iterable[str]) -> None:
+    for entry in entries:
+        FEATURE_LEXICON[tuple(entry.split())] = feature
+
+
+_lexicon("math_terms", [
+    "calcular", "calcula", "calcule", "suma", "resta", "multiplicar", "multiplica", "dividir",
+    "divide", "ecuación", "ecuacion", "matemática", "matematica", "derivada", "integral",
+    "raíz", "raiz", "primo", "factorizar", "probabilidad", "porcentaje", "resolver", "resuelve",
+    "calculate", "compute", "sum", "subtract", "multiply", "equation", "derivative",
+    "integrate", "prime", "factor", "factorize", "probability", "percent", "percentage",
+    "solve", "root", "square", "quadratic", "logarithm", "log", "sqrt", "math", "algebra",
+    "cuánto es", "cuanto es", "what is the value", "how much is",
+])
+_lexicon("code_terms", [
+    "código", "codigo", "python", "javascript", "java", "typescript", "rust", "sql",
+    "programar", "programa", "función", "funcion", "clase", "algoritmo", "implementar",
+    "implementa", "script", "bug", "depurar", "compilar", "class", "function", "code",
+    "program", "implement", "algorithm", "def", "return", "import", "api", "regex", "debug",
+    "refactor", "array", "list", "string", "recursion", "recursive", "loop", "bucle",
+    "binary search", "búsqueda binaria", "busqueda binaria", "linked list", "sort", "ordenar",
+])
+_lexicon("reasoning_terms", [
+    "porque", "por qué", "por que", "explicar", "explica", "explique", "analizar", "analiza",
+    "razonamiento", "lógica", "logica", "causa", "consecuencia", "comparar", "compara",
+    "diferencia", "evaluar", "argumenta", "why", "explain", "analyze", "analyse", "reason",
+    "reasoning", "logic", "cause", "because", "compare", "difference", "evaluate",
+    "implications", "consequences", "pros", "cons", "justify",
+])
+_lexicon("example_terms", [
+    "ejemplo", "ejemplos", "tutorial", "paso a paso", "como hacer", "cómo hacer",
+    "muéstrame", "muestrame", "demuestra", "guía", "guia", "example", "examples",
+    "for instance", "step by step", "how to", "show me", "walkthrough", "sample", "samples",
+    "similar", "like this",
+])
+
+MAX_PHRASE_TOKENS = max(len(key) for key in FEATURE_LEXICON)
+
+_TOKEN_PATTERN = re.compile(r"\d+(?:[.,]\d+)?|\w+|[^\w\s]+")
+_OPERATORS = frozenset({"+", "-", "*", "/", "^", "=", "**", "%", "√", "×", "÷"})
+_CODE_SYMBOLS = frozenset({"{", "}", ";", "()", "):", "=>", "==", "!=", "->", "[]", "();", "{}", "#", "</", "/>"})
+_QUESTION_MARKS = frozenset({"?", "¿", "¿?"})
+
+FEATURE_NAMES = (
+    "bias", "math_terms", "code_terms", "reasoning_terms", "example_terms",
+    "numbers", "operators", "code_symbols", "question", "long_query",
+)
+
+
+@dataclass
+class QueryFeatures:
+    """Feature vector of a query (counts capped so one keyword cannot dominate)"""
+    values: Dict[str, float]
+    tokens: int
+
+    @classmethod
+    def extract(cls, query: str, cap: float = 3.0) -> "QueryFeatures":
+        counts = dict.fromkeys(FEATURE_NAMES, 0.0)
+        counts["bias"] = 1.0
+        window: List[str] = []
+        n_tokens = 0
+        lexicon = FEATURE_LEXICON
+        for match in _TOKEN_PATTERN.finditer(query.lower()):
+            token = match.group(0)
+            n_tokens += 1
+            first = token[0]
+            if first.isdigit():
+                counts["numbers"] += 1
+            elif not (first.isalnum() or first == "_"):
+                if token in _OPERATORS:
+                    counts["operators"] += 1
+                elif token in _QUESTION_MARKS:
+                    counts["question"] = 1.0
+                elif token in _CODE_SYMBOLS or "{" in token or ";" in token:
+                    counts["code_symbols"] += 1
+            # Longest phrase ending at this token (trigram, bigram, unigram)
+            window.append(token)
+            if len(window) > MAX_PHRASE_TOKENS:
+                window.pop(0)
+            for size in range(len(window), 0, -1):
+                feature = lexicon.get(tuple(window[-size:]))
+                if feature is not None:
+                    counts[feature] += 1
+                    break
+        for name in ("math_terms", "code_terms", "reasoning_terms", "example_terms",
+                     "numbers", "operators", "code_symbols"):
+            counts[name] = min(counts[name], cap)
+        counts["long_query"] = 1.0 if n_tokens > 25 else 0.0
+        return cls(counts, n_tokens)
+
+
+# Hand-tuned starting weights; ``EngineRouter.fit`` refines them from labelled data.
+DEFAULT_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "math": {"bias": -0.2, "math_terms": 2.0, "numbers": 0.6, "operators": 1.3,
+             "code_terms": -0.6, "example_terms": -0.3},
+    "code": {"bias": -0.2, "code_terms": 2.0, "code_symbols": 1.0, "math_terms": -0.3,
+             "operators": 0.1},
+    "cot": {"bias": 0.4, "reasoning_terms": 1.8, "long_query": 0.6, "question": 0.3,
+            "operators": -0.3},
+    "few_shot": {"bias": -0.3, "example_terms": 2.3, "code_terms": 0.2},
+}
+
+
+@dataclass
+class EngineResponse:
+    """Normalised answer of any engine"""
+    engine: str
+    response: str
+    confidence: float
+    latency_s: float
+    payload: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class EngineAdapter:
+    """Uniform interface over the heterogeneous engine APIs"""
+
+    name = "engine"
+    description = "Quantum engine"
+
+    def __init__(self, engine: Any = None, name: Optional[str] = None):
+        self.engine = engine
+        if name:
+            self.name = name
+
+    def _invoke(self, query: str, context: Dict[str, Any]) -> Tuple[str, float, Dict[str, Any]]:
+        raise NotImplementedError
+
+    def run(self, query: str, context: Optional[Dict[str, Any]] = None) -> EngineResponse:
+        start = time.perf_counter()
+        try:
+            response, confidence, payload = self._invoke(query, context or {})
+            return EngineResponse(self.name, response, max(0.0, min(1.0, float(confidence))),
+                                  time.perf_counter() - start, payload)
+        except Exception as e:
+            logger.warning(f"Engine {self.name} failed: {e}")
+            return EngineResponse(self.name, "", 0.0, time.perf_counter() - start, error=str(e))
+
+
+class ChainOfThoughtAdapter(EngineAdapter):
+    name = "cot"
+    description = "Chain-of-Thought reasoning"
+
+    def _invoke(self, query, context):
+        result = self.engine.process_query(query, benchmark=context.get("benchmark", "general"))
+        if result.get("error"):
+            raise RuntimeError(result["error"])
+        return result.get("enhanced_response", ""), result.get("consistency_score", 0.0), result
+
+
+class MathAdapter(EngineAdapter):
+    name = "math"
+    description = "Mathematical reasoning"
+
+    def _invoke(self, query, context):
+        solution = self.engine.solve_mathematical_problem(query)
+        payload = {
+            "problem_type": getattr(solution.problem_type, "value", str(solution.problem_type)),
+            "final_answer": str(solution.final_answer),
+            "steps": len(solution.solution_steps),
+            "verification_results": solution.verification_results,
+            "quantum_coherence": solution.quantum_coherence_score,
+        }
+        confidence = solution.confidence_level
+        if not solution.solution_steps:
+            confidence *= 0.5  # no solver matched the problem
+        return str(solution.final_answer), confidence, payload
+
+
+class FewShotAdapter(EngineAdapter):
+    name = "few_shot"
+    description = "Few-shot learning with exemplars"
+
+    def _invoke(self, query, context):
+        result = self.engine.enhance_query_with_examples(
+            query, domain=context.get("domain", "general"), num_examples=context.get("num_examples", 3))
+        confidence = 0.5 * result.get("pattern_match_score", 0.0) + 0.5 * result.get("domain_confidence", 0.0)
+        if not result.get("examples_count"):
+            confidence *= 0.5
+        return result.get("enhanced_query", query), confidence, result
+
+
+class CodeAdapter(EngineAdapter):
+    name = "code"
+    description = "Code generation"
+
+    def _invoke(self, query, context):
+        solution = self.engine.generate_code_solution(
+            query, function_name=context.get("function_name", "solution"),
+            parameters=context.get("parameters"), test_cases=context.get("test_cases"))
+        verification = solution.verification_results or {}
+        confidence = solution.confidence_level
+        if verification and not verification.get("syntax_valid", True):
+            confidence *= 0.5
+        payload = {
+            "language": getattr(solution.language, "value", str(solution.language)),
+            "problem_type": getattr(solution.problem_type, "value", str(solution.problem_type)),
+            "time_complexity": solution.time_complexity,
+            "space_complexity": solution.space_complexity,
+            "verification_results": verification,
+        }
+        return solution.final_code, confidence, payload
+
+
+class CallableAdapter(EngineAdapter):
+    """Adapter for plain callables ``fn(query, context)`` returning text or a dict"""
+
+    def __init__(self, name: str, fn: Callable[[str, Dict[str, Any]], Any], description: str = ""):
+        super().__init__(fn, name)
+        self.description = description or name
+
+    def _invoke(self, query, context):
+        result = self.engine(query, context)
+        if isinstance(result, dict):
+            return str(result.get("response", "")), result.get("confidence", 0.5), result
+        return str(result), 0.5, {}
+
+
+@dataclass
+class EngineStats:
+    """Exponentially weighted per-engine statistics"""
+    count: int = 0
+    failures: int = 0
+    wins: int = 0
+    latency_ewma: float = 0.0
+    confidence_ewma: float = 0.5
+
+    def observe(self, response: EngineResponse, alpha: float) -> None:
+        self.count += 1
+        if not response.ok:
+            self.failures += 1
+        weight = 1.0 if self.count == 1 else alpha
+        self.latency_ewma += weight * (response.latency_s - self.latency_ewma)
+        self.confidence_ewma += weight * (response.confidence - self.confidence_ewma)
+
+    @property
+    def reliability(self) -> float:
+        """Laplace-smoothed success rate"""
+        return (self.count - self.failures + 1) / (self.count + 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count, "failures": self.failures, "wins": self.wins,
+            "latency_ms_ewma": round(self.latency_ewma * 1000, 3),
+            "confidence_ewma": round(self.confidence_ewma, 4),
+            "reliability": round(self.reliability, 4),
+        }
+
+
+@dataclass
+class RoutingDecision:
+    ranked: List[Tuple[str, float]]
+    features: QueryFeatures
+    speculate: bool
+
+    @property
+    def engine(self) -> str:
+        return self.ranked[0][0]
+
+
+class EngineRouter:
+    """Scores engines from query features and dispatches through their adapters"""
+
+    def __init__(self, adapters: Sequence[EngineAdapter], weights: Optional[Dict[str, Dict[str, float]]] = None,
+                 speculative: bool = False, deadline_s: float = 2.0, speculation_margin: float = 0.25,
+                 accept_confidence: float = 0.85, stats_alpha: float = 0.1, max_workers: int = 4,
+                 speculation_grace_s: float = 1.0):
+        self.adapters: Dict[str, EngineAdapter] = {adapter.name: adapter for adapter in adapters}
+        source = weights or DEFAULT_WEIGHTS
+        self.weights = {name: dict(source.get(name, {"bias": -1.0})) for name in self.adapters}
+        self.speculative = speculative
+        self.deadline_s = deadline_s
+        self.speculation_margin = speculation_margin
+        self.speculation_grace_s = speculation_grace_s
+        self.accept_confidence = accept_confidence
+        self.stats_alpha = stats_alpha
+        self.stats: Dict[str, EngineStats] = {name: EngineStats() for name in self.adapters}
+        self._stats_lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ----- classification -------------------------------------------------
+
+    def scores(self, features: QueryFeatures) -> Dict[str, float]:
+        values = features.values
+        return {
+            name: sum(weight * values.get(feature, 0.0) for feature, weight in weights.items())
+            for name, weights in self.weights.items()
+        }
+
+    def route(self, query: str) -> RoutingDecision:
+        features = QueryFeatures.extract(query)
+        raw = self.scores(features)
+        top = max(raw.values())
+        # Softmax, discounted by each engine's observed reliability
+        weighted = {name: math.exp(score - top) * self.stats[name].reliability for name, score in raw.items()}
+        norm = sum(weighted.values())
+        ranked = sorted(((name, value / norm) for name, value in weighted.items()), key=lambda item: -item[1])
+        return RoutingDecision(ranked, features, self._should_speculate(ranked))
+
+    def _should_speculate(self, ranked: List[Tuple[str, float]]) -> bool:
+        if not self.speculative or len(ranked) < 2:
+            return False
+        (first, p1), (second, p2) = ranked[0], ranked[1]
+        first_stats, second_stats = self.stats[first], self.stats[second]
+        # Widen the margin when the favourite has recently produced weak answers
+        margin = self.speculation_margin * (1.5 - first_stats.confidence_ewma)
+        if second_stats.count and second_stats.latency_ewma > self.deadline_s:
+            return False  # the runner-up would not finish in time anyway
+        return p1 - p2 < margin
+
+    def fit(self, samples: Iterable[Tuple[str, str]], epochs: int = 10, learning_rate: float = 0.1) -> float:
+        """
+        Refine the weights with an averaged perceptron over (label, query) pairs
+
+        Returns:
+            Training accuracy of the final weights
+        """
+        data = [(label, QueryFeatures.extract(query)) for label, query in samples if label in self.weights]
+        totals = {name: dict(weights) for name, weights in self.weights.items()}
+        steps = 1
+        for _ in range(epochs):
+            for label, features in data:
+                scores = self.scores(features)
+                predicted = max(scores, key=scores.get)
+                if predicted != label:
+                    for feature, value in features.values.items():
+                        if value:
+                            self.weights[label][feature] = self.weights[label].get(feature, 0.0) + learning_rate * value
+                            self.weights[predicted][feature] = self.weights[predicted].get(feature, 0.0) - learning_rate * value
+                for name, weights in self.weights.items():
+                    for feature, value in weights.items():
+                        totals[name][feature] = totals[name].get(feature, 0.0) + value
+                steps += 1
+        self.weights = {name: {f: v / steps for f, v in weights.items()} for name, weights in totals.items()}
+        correct = 0
+        for label, features in data:
+            scores = self.scores(features)
+            correct += max(scores, key=scores.get) == label
+        return correct / max(len(data), 1)
+
+    # ----- execution ------------------------------------------------------
+
+    def _executor_pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="engine-router")
+        return self._executor
+
+    def _run(self, name: str, query: str, context: Dict[str, Any]) -> EngineResponse:
+        response = self.adapters[name].run(query, context)
+        with self._stats_lock:
+            self.stats[name].observe(response, self.stats_alpha)
+        return response
+
+    def _speculate(self, names: List[str], query: str, context: Dict[str, Any],
+                   deadline_s: float) -> Optional[EngineResponse]:
+        pool = self._executor_pool()
+        futures = [pool.submit(self._run, name, query, context) for name in names]
+        deadline = time.monotonic() + deadline_s
+        cutoff = deadline + self.speculation_grace_s
+        done: List[EngineResponse] = []
+        best: Optional[EngineResponse] = None
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            if now >= deadline and best is not None:
+                break
+            # Past the deadline with no usable answer: wait for one only until the grace period ends,
+            # then let process() fall back down the ranking (or report the error)
+            timeout = (deadline if now < deadline else cutoff) - now
+            if timeout <= 0:
+                break
+            finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            done.extend(future.result() for future in finished)
+            best = max((r for r in done if r.ok), key=lambda r: r.confidence, default=None)
+            if best is not None and best.confidence >= self.accept_confidence:
+                break
+        # Stragglers keep running in the pool and still report their stats
+        return best
+
+    def process(self, query: str, context: Optional[Dict[str, Any]] = None,
+                speculative: Optional[bool] = None, deadline_s: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Route and execute a query
+
+        Returns:
+            Dict with ``response``, ``engine``, ``confidence``, ``latency_ms``,
+            ``routing`` details and the engine-specific ``engine_result``
+        """
+        start = time.perf_counter()
+        context = context or {}
+        decision = self.route(query)
+        speculate = decision.speculate if speculative is None else (speculative and len(decision.ranked) > 1)
+        ranked_names = [name for name, _ in decision.ranked]
+
+        response = None
+        tried: List[str] = []
+        if speculate:
+            tried = ranked_names[:2]
+            response = self._speculate(tried, query, context, deadline_s or self.deadline_s)
+        # Sequential fallback down the ranking when the chosen engine(s) failed
+        for name in ranked_names:
+            if response is not None:
+                break
+            if name in tried:
+                continue
+            tried.append(name)
+            candidate = self._run(name, query, context)
+            if candidate.ok:
+                response = candidate
+
+        routing = {
+            "scores": {name: round(p, 4) for name, p in decision.ranked},
+            "features": {k: v for k, v in decision.features.values.items() if v and k != "bias"},
+            "speculative": speculate,
+            "engines_tried": tried,
+        }
+        if response is None:
+            return {
+                "response": "", "engine": None, "confidence": 0.0, "error": "All engines failed",
+                "latency_ms": (time.perf_counter() - start) * 1000, "routing": routing,
+            }
+        with self._stats_lock:
+            self.stats[response.engine].wins += 1
+        return {
+            "response": response.response,
+            "engine": response.engine,
+            "confidence": response.confidence,
+            "latency_ms": (time.perf_counter() - start) * 1000,
+            "routing": routing,
+            "engine_result": response.payload,
+        }
+
+    def stats_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._stats_lock:
+            return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def build_default_adapters(engines: Dict[str, Any]) -> List[EngineAdapter]:
+    """Wrap engine instances keyed by the server's engine names"""
+    adapter_types = {"cot": ChainOfThoughtAdapter, "math": MathAdapter,
+                     "few_shot": FewShotAdapter, "code": CodeAdapter}
+    return [adapter_types[name](engine) for name, engine in engines.items() if name in adapter_types]
+
+
+def load_labelled_queries(path: Path) -> List[Tuple[str, str]]:
+    """Read ``label<TAB>query`` lines (``#`` comments allowed)"""
+    rows = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        label, query = line.split("\t", 1)
+        rows.append((label.strip(), query.strip()))
+    return rows
@@ -9,13 +9,18 @@ import sys
 import time
 import json
 import logging
-import threading
-import asyncio
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, jsonify, render_template_string, request, send_from_directory
+from flask import Flask, Response, jsonify, render_template_string, request, send_from_directory, stream_with_context
 from flask_cors import CORS
 
+from vigoleonrocks.services.cpu_offload import get_cpu_offload, offload
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
+from vigoleonrocks.services.event_loop_bridge import run_coroutine
+from vigoleonrocks.services.static_pages import get_static_pages, serve_page
+from vigoleonrocks.services.system_sampler import get_system_sampler
+from vigoleonrocks.services.upload_ingest import install_upload_ingest, upload_info
+
 # Importar sistema multimodal avanzado
 try:
     from multimodal_ai_manager import get_multimodal_manager, MultimodalAIManager
@@ -43,6 +48,25 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Entropía por petición (ENTROPY_SEED = respuestas reproducibles en pruebas de carga)
+install_entropy(app)
+
+# Páginas del frontend en memoria, precomprimidas y con ETag (STATIC_PAGES_WATCH_INTERVAL recarga en desarrollo)
+get_static_pages().preload([
+    'vigoleonrocks_modern_landing_2025.html',
+    'vigoleonrocks_corporate_ui_enhanced.html',
+    'vigoleonrocks_corporate_page.html',
+    'vigoleonrocks_multimodal_interface_enhanced.html',
+    'vigoleonrocks_quantum_command_center.html',
+])
+
+# Subidas en streaming a spool (memoria/disco): tipo por bytes mágicos y límite por tipo a mitad de transmisión
+install_upload_ingest(app, {
+    '/api/upload/image': ['image'],
+    '/api/upload/audio': ['audio', 'video'],  # el audio se puede extraer de mp4/webm
+    '/api/upload/video': ['video'],
+})
+
 # Sistema de métricas global
 metrics = {
     'requests_total': 0,
@@ -125,61 +149,22 @@ request_count = 0
 
 # Función de métricas del sistema (sin Math.random)
 def get_system_entropy():
-    """Genera entropía basada en métricas del sistema"""
-    try:
-        timestamp = time.time_ns()
-        memory_info = sys.getsizeof(sys.modules)
-        pid = os.getpid()
-        
-        entropy_sources = [
-            timestamp & 0xFFFF,
-            memory_info & 0xFFFF, 
-            pid & 0xFFFF,
-            hash(str(datetime.now())) & 0xFFFF,
-            len(sys.modules) & 0xFFFF,
-            os.cpu_count() or 1,
-            hash(str(Path.cwd())) & 0xFFFF,
-            int(time.monotonic() * 1000000) & 0xFFFF
-        ]
-        
-        return entropy_sources
-    except Exception as e:
-        logger.warning(f"Error generando entropía: {e}")
-        return [int(time.time() * 1000) % 65536]
-
-def update_system_metrics():
-    """Actualizar métricas del sistema en tiempo real"""
-    try:
-        import psutil
-        metrics['system_load'] = psutil.cpu_percent(interval=0.1)
-        metrics['memory_usage'] = psutil.virtual_memory().percent
-    except ImportError:
-        # Fallback usando entropía del sistema
-        entropy = get_system_entropy()
-        metrics['system_load'] = (entropy[0] % 100) if entropy else 45.0
-        metrics['memory_usage'] = (entropy[1] % 50 + 30) if len(entropy) > 1 else 65.0
-    
-    metrics['last_update'] = time.time()
+    """Entropía para la selección de respuestas (servicio compartido, reproducible con ENTROPY_SEED)"""
+    return get_entropy().words()
+
+def update_system_metrics(snapshot):
+    """Actualizar métricas del sistema en tiempo real (desde el muestreador compartido)"""
+    metrics['system_load'] = snapshot.system_cpu_percent
+    metrics['memory_usage'] = snapshot.memory_percent
+    metrics['last_update'] = snapshot.timestamp
     
     # Coherencia cuántica basada en métricas reales
     base_coherence = 98.9
     entropy_variation = (sum(get_system_entropy()[:3]) % 10) / 100.0
     metrics['quantum_coherence'] = base_coherence + entropy_variation
 
-def metrics_background_thread():
-    """Hilo en segundo plano para actualizar métricas"""
-    logger.info("🔄 Iniciando hilo de métricas en segundo plano")
-    while True:
-        try:
-            update_system_metrics()
-            time.sleep(5)  # Actualizar cada 5 segundos
-        except Exception as e:
-            logger.error(f"Error en hilo de métricas: {e}")
-            time.sleep(10)
-
-# Iniciar hilo de métricas en segundo plano (cumple política)
-metrics_thread = threading.Thread(target=metrics_background_thread, daemon=True)
-metrics_thread.start()
+# Métricas en segundo plano (cumple política): un único muestreador por proceso
+get_system_sampler().subscribe(update_system_metrics, every=5)  # Actualizar cada 5 segundos
 
 @app.before_request
 def before_request():
@@ -210,13 +195,11 @@ def after_request(response):
 def home():
     """Página principal - Landing moderno 2025"""
     try:
-        with open('vigoleonrocks_modern_landing_2025.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_modern_landing_2025.html')
     except FileNotFoundError:
         # Fallback a la landing page corporativa
         try:
-            with open('vigoleonrocks_corporate_ui.html', 'r', encoding='utf-8') as f:
-                return f.read()
+            return serve_page('vigoleonrocks_corporate_ui.html')
         except FileNotFoundError:
             # Fallback final con diseño mejorado
             return '''
@@ -266,8 +249,7 @@ def home():
 def conversational_ui():
     """Interfaz conversacional completa"""
     try:
-        with open('vigoleonrocks_corporate_ui_enhanced.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_corporate_ui_enhanced.html')
     except FileNotFoundError:
         return '''
         <h1>💬 Interfaz Conversacional</h1>
@@ -278,8 +260,7 @@ def conversational_ui():
 def corporate_page():
     """Página corporate de VIGOLEONROCKS"""
     try:
-        with open('vigoleonrocks_corporate_page.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_corporate_page.html')
     except FileNotFoundError:
         return '''
         <h1>🏢 VIGOLEONROCKS Corporate</h1>
@@ -290,8 +271,7 @@ def corporate_page():
 def multimodal_interface():
     """Interfaz multimodal avanzada con MediaCapabilities"""
     try:
-        with open('vigoleonrocks_multimodal_interface_enhanced.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_multimodal_interface_enhanced.html')
     except FileNotFoundError:
         return '''
         <h1>🎯 VIGOLEONROCKS Multimodal</h1>
@@ -302,8 +282,7 @@ def multimodal_interface():
 def quantum_command_center():
     """Quantum Command Center avanzado"""
     try:
-        with open('vigoleonrocks_quantum_command_center.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_quantum_command_center.html')
     except FileNotFoundError:
         return '''
         <h1>🎯 VIGOLEONROCKS Quantum Command Center</h1>
@@ -656,8 +635,9 @@ def upload_image():
                 image = Image.open(BytesIO(image_data)).convert("RGB")
                 
                 # Análisis completo usando múltiples modelos
-                analysis_result = asyncio.run(
-                    multimodal_mgr.analyze_image(image, analysis_type="comprehensive")
+                analysis_result = run_coroutine(
+                    multimodal_mgr.analyze_image(image, analysis_type="comprehensive"),
+                    environ=request.environ
                 )
                 
                 selected_analysis = analysis_result.content
@@ -685,7 +665,7 @@ def upload_image():
                 from quantum_image_processor import analyze_image_quantum
                 file.seek(0)
                 image_data = file.read()
-                qres = analyze_image_quantum(image_data, file.filename)
+                qres = offload(analyze_image_quantum, image_data, file.filename)
                 selected_analysis = qres['analysis']
                 confidence = qres.get('confidence', 0.85)
                 models_used = [qres.get('processing_type', 'quantum_image_analysis_26D')]
@@ -704,7 +684,7 @@ def upload_image():
                 processing_time = 0.05
         
         # Agregar imagen al contexto del usuario
-        upload_id = f"img_{int(time.time())}_{entropy[0] % 10000}"
+        upload_id = get_entropy().request_id('img')
         add_file_to_context('image', file.filename, selected_analysis, upload_id)
         
         return jsonify({
@@ -761,16 +741,21 @@ def upload_audio():
                 # Obtener manager multimodal
                 multimodal_mgr = get_multimodal_manager()
                 
-                # Guardar archivo temporalmente para procesamiento
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                    file.seek(0)
-                    tmp.write(file.read())
-                    temp_audio_path = tmp.name
+                file.seek(0)
+                audio_bytes = file.read()
+                
+                # ?stream=1: segmentos NDJSON según se transcriben las ventanas de voz
+                if request.args.get('stream') in ('1', 'true'):
+                    events = multimodal_mgr.stream_transcription(audio_bytes, language="auto")
+                    return Response(
+                        stream_with_context(json.dumps(event, ensure_ascii=False) + "\n" for event in events),
+                        mimetype='application/x-ndjson'
+                    )
                 
-                # Transcripción avanzada con Whisper
-                transcription_result = asyncio.run(
-                    multimodal_mgr.transcribe_audio(temp_audio_path, language="auto")
+                # Transcripción avanzada con Whisper (decodificada en memoria, sin archivo temporal)
+                transcription_result = run_coroutine(
+                    multimodal_mgr.transcribe_audio(audio_bytes, language="auto"),
+                    environ=request.environ
                 )
                 
                 selected_transcription = transcription_result.content
@@ -779,9 +764,6 @@ def upload_audio():
                 model_used = transcription_result.model_used
                 processing_time = transcription_result.processing_time
                 
-                # Limpiar archivo temporal
-                os.unlink(temp_audio_path)
-                
                 logger.info(f"🎤 Transcripción completada: {detected_language}, {confidence:.2f} confianza")
                 
             except Exception as e:
@@ -811,7 +793,7 @@ def upload_audio():
             processing_time = 0.1
         
         # Agregar audio al contexto del usuario
-        upload_id = f"aud_{int(time.time())}_{entropy[0] % 10000}"
+        upload_id = get_entropy().request_id('aud')
         add_file_to_context('audio', file.filename, selected_transcription, upload_id)
         
         return jsonify({
@@ -853,13 +835,9 @@ def upload_video():
         if file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Validar tamaño (200MB máximo)
-        file.seek(0, 2)
-        file_size = file.tell()
-        file.seek(0)
-        
-        if file_size > 200 * 1024 * 1024:  # 200MB
-            return jsonify({"error": "Archivo de video demasiado grande. Máximo 200MB"}), 400
+        # Tipo, tamaño (200MB máximo) y hash ya validados durante la subida
+        ingest_info = upload_info(file)
+        file_size = ingest_info['size']
         
         logger.info(f"🎥 Video subido: {file.filename} ({file_size} bytes)")
         
@@ -876,7 +854,7 @@ def upload_video():
         selected_analysis = video_analysis[entropy[0] % len(video_analysis)]
         
         # Agregar video al contexto del usuario
-        upload_id = f"vid_{int(time.time())}_{entropy[0] % 10000}"
+        upload_id = get_entropy().request_id('vid')
         add_file_to_context('video', file.filename, selected_analysis, upload_id)
         
         return jsonify({
@@ -886,6 +864,8 @@ def upload_video():
             "metadata": {
                 "filename": file.filename,
                 "size_bytes": file_size,
+                "mime_type": ingest_info['mime'],
+                "sha256": ingest_info['sha256'],
                 "duration_estimated": f"{file_size // 1000000:.1f}s",  # Estimación muy básica
                 "processed_at": datetime.now().isoformat(),
                 "ai_analysis": True,
@@ -1035,4 +1015,5 @@ if __name__ == '__main__':
     print("📊 [METRICS] Cuánticas: /api/quantum-metrics")
     print("✅ [STATUS] Estado: /api/status")
     print("⚡ Servidor iniciado en http://localhost:5000")
+    get_cpu_offload().start()  # precalienta los workers de imagen antes de aceptar tráfico
     app.run(host='0.0.0.0', port=5000, debug=False)
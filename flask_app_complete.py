@@ -14,7 +14,9 @@ import argparse
 from datetime import datetime
 from flask import Flask, request, jsonify, render_template_string, send_from_directory
 from flask_cors import CORS
-import threading
+
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
+from vigoleonrocks.services.system_sampler import get_system_sampler
 
 # Variables de entorno para configuración
 PORT = int(os.environ.get('PORT', 5000))
@@ -28,6 +30,9 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Entropía por petición (ENTROPY_SEED = respuestas reproducibles en pruebas de carga)
+install_entropy(app)
+
 # Sistema de métricas global
 metrics = {
     'requests_total': 0,
@@ -42,56 +47,23 @@ metrics = {
 }
 
 def get_system_entropy():
-    """Generar entropía basada en métricas del sistema (sin Math.random)"""
-    try:
-        # Usar timestamp, PID y métricas del sistema para generar entropía
-        current_time = time.time_ns()
-        pid = os.getpid()
-        memory_info = sys.getsizeof(sys.modules)
-        
-        # Combinar métricas para crear entropía
-        entropy_source = (
-            current_time + 
-            pid + 
-            memory_info +
-            len(sys.modules) +
-            int(time.monotonic() * 1000000)
-        )
-        
-        # Aplicar transformación para obtener valor pseudoaleatorio
-        return abs(entropy_source % 100) / 100.0
-    except Exception:
-        # Fallback usando solo timestamp y PID
-        return abs((time.time_ns() + os.getpid()) % 100) / 100.0
-
-def update_system_metrics():
-    """Actualizar métricas del sistema"""
-    try:
-        import psutil
-        metrics['system_load'] = psutil.cpu_percent(interval=0.1)
-        metrics['memory_usage'] = psutil.virtual_memory().percent
-    except ImportError:
-        # Fallback si psutil no está disponible
-        metrics['system_load'] = get_system_entropy() * 100
-        metrics['memory_usage'] = get_system_entropy() * 80 + 20
-    
-    metrics['last_update'] = time.time()
+    """Entropía en [0, 1) (servicio compartido, reproducible con ENTROPY_SEED)"""
+    return get_entropy().uniform()
+
+def update_system_metrics(snapshot):
+    """Actualizar métricas del sistema (desde el muestreador compartido)"""
+    metrics['system_load'] = snapshot.system_cpu_percent
+    metrics['memory_usage'] = snapshot.memory_percent
+    metrics['last_update'] = snapshot.timestamp
     
     # Simulación de coherencia cuántica con variación basada en sistema
     base_coherence = 98.9
     entropy = get_system_entropy()
     metrics['quantum_coherence'] = base_coherence + (entropy * 0.1)
 
-def metrics_thread():
-    """Hilo en segundo plano para actualizar métricas"""
-    while True:
-        update_system_metrics()
-        time.sleep(5)
-
-# Iniciar hilo de métricas en segundo plano
+# Métricas en segundo plano: un único muestreador por proceso
 if os.environ.get('BACKGROUND_EXECUTION', 'true').lower() == 'true':
-    metrics_thread_daemon = threading.Thread(target=metrics_thread, daemon=True)
-    metrics_thread_daemon.start()
+    get_system_sampler().subscribe(update_system_metrics, every=5)
 
 @app.before_request
 def before_request():
@@ -10,16 +10,21 @@ import sys
 import time
 import json
 import logging
-import threading
 from datetime import datetime
 from pathlib import Path
 from flask import Flask, jsonify, request, send_from_directory, render_template, Response
 from flask_cors import CORS
 
+from vigoleonrocks.services.cpu_offload import get_cpu_offload, offload
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
+from vigoleonrocks.services.event_loop_bridge import run_coroutine
+from vigoleonrocks.services.static_pages import get_static_pages, serve_page
+from vigoleonrocks.services.system_sampler import get_system_sampler
+from vigoleonrocks.services.upload_ingest import install_upload_ingest, upload_info
+
 # Prometheus metrics support (optional)
 try:
     from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
-    import psutil
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
@@ -48,10 +53,28 @@ except ImportError:
 app = Flask(__name__, static_folder='static', template_folder='templates')
 CORS(app)
 
+# Entropía por petición (ENTROPY_SEED = respuestas reproducibles en pruebas de carga)
+install_entropy(app)
+
+# Páginas del frontend en memoria, precomprimidas y con ETag (STATIC_PAGES_WATCH_INTERVAL recarga en desarrollo)
+get_static_pages().preload([
+    'vigoleonrocks_modern_landing_2025.html',
+    'vigoleonrocks_corporate_ui_enhanced.html',
+    'vigoleonrocks_multimodal_interface_enhanced.html',
+    'vigoleonrocks_quantum_command_center.html',
+    'dashboard_monitoring.html',
+])
+
+# Subidas en streaming a spool (memoria/disco): tipo por bytes mágicos y límite por tipo a mitad de transmisión
+install_upload_ingest(app, {
+    '/api/upload/image': ['image'],
+    '/api/upload/images/batch': ['image', 'archive'],
+    '/api/upload/audio': ['audio', 'video'],  # el audio se puede extraer de mp4/webm
+})
+
 # Prometheus metrics setup
 if PROMETHEUS_AVAILABLE:
     # Process metrics
-    process = psutil.Process(os.getpid())
     cpu_gauge = Gauge('qnlp_process_cpu_percent', 'Process CPU usage percentage')
     rss_gauge = Gauge('qnlp_process_rss_bytes', 'Process RSS memory bytes')
     
@@ -63,21 +86,15 @@ if PROMETHEUS_AVAILABLE:
     # Image processing metrics (already defined in quantum_image_processor)
     # small_image_skipped, kernel_bad_size_events, empty_slice_events
     
-    def update_prometheus_metrics():
-        """Update Prometheus metrics in background"""
-        while True:
-            try:
-                cpu_gauge.set(process.cpu_percent(interval=None))
-                rss_gauge.set(process.memory_info().rss)
-                quantum_coherence_gauge.set(metrics['quantum_coherence'])
-            except Exception as e:
-                logger.warning(f"Error updating Prometheus metrics: {e}")
-            time.sleep(5)
+    def update_prometheus_metrics(snapshot):
+        """Update Prometheus metrics from the shared system sampler"""
+        cpu_gauge.set(snapshot.process_cpu_percent)
+        rss_gauge.set(snapshot.rss_mb * 1048576)
+        quantum_coherence_gauge.set(metrics['quantum_coherence'])
     
-    # Start Prometheus metrics background thread
-    prometheus_thread = threading.Thread(target=update_prometheus_metrics, daemon=True)
-    prometheus_thread.start()
-    logger.info("📊 Prometheus metrics background thread started")
+    # Refreshed by the process-wide sampler instead of a dedicated thread
+    get_system_sampler().subscribe(update_prometheus_metrics, every=5)
+    logger.info("📊 Prometheus metrics subscribed to the system sampler")
 else:
     logger.info("📊 Prometheus not available, using basic metrics only")
 
@@ -149,61 +166,22 @@ def get_relevant_context(user_message):
 
 # Función de métricas del sistema (sin Math.random)
 def get_system_entropy():
-    """Genera entropía basada en métricas del sistema"""
-    try:
-        timestamp = time.time_ns()
-        memory_info = sys.getsizeof(sys.modules)
-        pid = os.getpid()
-        
-        entropy_sources = [
-            timestamp & 0xFFFF,
-            memory_info & 0xFFFF, 
-            pid & 0xFFFF,
-            hash(str(datetime.now())) & 0xFFFF,
-            len(sys.modules) & 0xFFFF,
-            os.cpu_count() or 1,
-            hash(str(Path.cwd())) & 0xFFFF,
-            int(time.monotonic() * 1000000) & 0xFFFF
-        ]
-        
-        return entropy_sources
-    except Exception as e:
-        logger.warning(f"Error generando entropía: {e}")
-        return [int(time.time() * 1000) % 65536]
+    """Entropía para la selección de respuestas (servicio compartido, reproducible con ENTROPY_SEED)"""
+    return get_entropy().words()
 
-def update_system_metrics():
-    """Actualizar métricas del sistema en tiempo real"""
-    try:
-        import psutil
-        metrics['system_load'] = psutil.cpu_percent(interval=0.1)
-        metrics['memory_usage'] = psutil.virtual_memory().percent
-    except ImportError:
-        # Fallback usando entropía del sistema
-        entropy = get_system_entropy()
-        metrics['system_load'] = (entropy[0] % 100) if entropy else 45.0
-        metrics['memory_usage'] = (entropy[1] % 50 + 30) if len(entropy) > 1 else 65.0
-    
-    metrics['last_update'] = time.time()
+def update_system_metrics(snapshot):
+    """Actualizar métricas del sistema en tiempo real (desde el muestreador compartido)"""
+    metrics['system_load'] = snapshot.system_cpu_percent
+    metrics['memory_usage'] = snapshot.memory_percent
+    metrics['last_update'] = snapshot.timestamp
     
     # Coherencia cuántica basada en métricas reales
     base_coherence = 98.9
     entropy_variation = (sum(get_system_entropy()[:3]) % 10) / 100.0
     metrics['quantum_coherence'] = base_coherence + entropy_variation
 
-def metrics_background_thread():
-    """Hilo en segundo plano para actualizar métricas"""
-    logger.info("🔄 Iniciando hilo de métricas en segundo plano")
-    while True:
-        try:
-            update_system_metrics()
-            time.sleep(5)  # Actualizar cada 5 segundos
-        except Exception as e:
-            logger.error(f"Error en hilo de métricas: {e}")
-            time.sleep(10)
-
-# Iniciar hilo de métricas en segundo plano (cumple política)
-metrics_thread = threading.Thread(target=metrics_background_thread, daemon=True)
-metrics_thread.start()
+# Métricas en segundo plano (cumple política): un único muestreador por proceso
+get_system_sampler().subscribe(update_system_metrics, every=5)  # Actualizar cada 5 segundos
 
 @app.before_request
 def before_request():
@@ -234,8 +212,7 @@ def after_request(response):
 def home():
     """Página principal - Landing moderno 2025"""
     try:
-        with open('vigoleonrocks_modern_landing_2025.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_modern_landing_2025.html')
     except FileNotFoundError:
         logger.warning("Landing page moderna no encontrada, usando fallback")
         return '''
@@ -307,8 +284,7 @@ def home():
 def conversational_ui():
     """Interfaz conversacional completa"""
     try:
-        with open('vigoleonrocks_corporate_ui_enhanced.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_corporate_ui_enhanced.html')
     except FileNotFoundError:
         logger.warning("UI enhanced no encontrada, usando fallback")
         return '''
@@ -460,8 +436,7 @@ def corporate_page():
 def multimodal_interface():
     """Interfaz multimodal avanzada"""
     try:
-        with open('vigoleonrocks_multimodal_interface_enhanced.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_multimodal_interface_enhanced.html')
     except FileNotFoundError:
         return '''
         <!DOCTYPE html>
@@ -551,8 +526,7 @@ def multimodal_interface():
 def quantum_command_center():
     """Quantum Command Center avanzado"""
     try:
-        with open('vigoleonrocks_quantum_command_center.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_quantum_command_center.html')
     except FileNotFoundError:
         return '''
         <!DOCTYPE html>
@@ -764,8 +738,9 @@ def upload_image():
                 multimodal_mgr = get_multimodal_manager()
                 
                 # Análisis completo usando múltiples modelos avanzados
-                analysis_result = asyncio.run(
-                    multimodal_mgr.analyze_image(image_data, analysis_type="comprehensive")
+                analysis_result = run_coroutine(
+                    multimodal_mgr.analyze_image(image_data, analysis_type="comprehensive"),
+                    environ=request.environ
                 )
                 
                 selected_analysis = analysis_result.content
@@ -783,7 +758,7 @@ def upload_image():
                     from quantum_image_processor import analyze_image_quantum
                     file.seek(0)
                     image_data = file.read()
-                    quantum_result = analyze_image_quantum(image_data, file.filename)
+                    quantum_result = offload(analyze_image_quantum, image_data, file.filename)
                     
                     selected_analysis = quantum_result['analysis']
                     confidence = quantum_result.get('confidence', 0.85)
@@ -798,7 +773,7 @@ def upload_image():
                         try:
                             file.seek(0)
                             image_data = file.read()
-                            basic_result = basic_analyze_image(image_data, file.filename)
+                            basic_result = offload(basic_analyze_image, image_data, file.filename)
                             
                             selected_analysis = basic_result['analysis']
                             confidence = basic_result['confidence']
@@ -830,7 +805,7 @@ def upload_image():
                 from quantum_image_processor import analyze_image_quantum
                 file.seek(0)
                 image_data = file.read()
-                quantum_result = analyze_image_quantum(image_data, file.filename)
+                quantum_result = offload(analyze_image_quantum, image_data, file.filename)
                 
                 selected_analysis = quantum_result['analysis']
                 confidence = quantum_result.get('confidence', 0.85)
@@ -851,8 +826,7 @@ def upload_image():
                 detailed_metadata = {}
         
         # Agregar imagen al contexto del usuario
-        entropy = get_system_entropy()  # Para upload_id
-        upload_id = f"img_{int(time.time())}_{entropy[0] % 10000}"
+        upload_id = get_entropy().request_id('img')
         add_file_to_context('image', file.filename, selected_analysis, upload_id)
         
         # Preparar metadatos de respuesta
@@ -887,6 +861,79 @@ def upload_image():
             "status": "error"
         }), 500
 
+@app.route('/api/upload/images/batch', methods=['POST'])
+def upload_images_batch():
+    """API para analizar varias imágenes en una sola petición (multipart 'images' o un zip 'archive')"""
+    try:
+        from quantum_image_processor import (
+            BATCH_MAX_IMAGE_BYTES, BATCH_MAX_IMAGES, IMAGE_EXTENSIONS,
+            analyze_images_quantum_batch, read_zip_images,
+        )
+
+        images, results = [], []
+        if 'archive' in request.files:
+            try:
+                images, rejected = read_zip_images(request.files['archive'].stream)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            results.extend({"filename": r['filename'], "status": "error", "error": r['error']} for r in rejected)
+        else:
+            files = [f for f in request.files.getlist('images') if f.filename]
+            if not files:
+                return jsonify({"error": "No image files provided"}), 400
+            if len(files) > BATCH_MAX_IMAGES:
+                return jsonify({"error": f"Demasiadas imágenes. Máximo {BATCH_MAX_IMAGES}"}), 400
+            for file in files:
+                file_extension = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+                data = file.read(BATCH_MAX_IMAGE_BYTES + 1)
+                if file_extension not in IMAGE_EXTENSIONS:
+                    results.append({"filename": file.filename, "status": "error", "error": "Tipo de archivo no soportado"})
+                elif len(data) > BATCH_MAX_IMAGE_BYTES:
+                    results.append({"filename": file.filename, "status": "error", "error": "Archivo demasiado grande. Máximo 20MB"})
+                else:
+                    images.append((data, file.filename))
+
+        t0 = time.time()
+        analyses = analyze_images_quantum_batch(images) if images else []
+        elapsed = time.time() - t0
+        logger.info(f"📸 Lote de {len(images)} imágenes analizado en {elapsed * 1000:.0f} ms")
+
+        for (data, filename), analysis in zip(images, analyses):
+            if analysis['processing_type'] == 'error':
+                results.append({"filename": filename, "status": "error",
+                                "error": analysis['metadata'].get('error', 'Error procesando imagen')})
+                continue
+            results.append({
+                "filename": filename,
+                "status": "success",
+                "size_bytes": len(data),
+                "analysis": analysis['analysis'],
+                "confidence": analysis['confidence'],
+                "processing_type": analysis['processing_type'],
+                "detailed_analysis": analysis['metadata']
+            })
+
+        processed = sum(1 for r in results if r['status'] == 'success')
+        return jsonify({
+            "status": "success" if processed else "error",
+            "processed": processed,
+            "failed": len(results) - processed,
+            "results": results,
+            "metadata": {
+                "processed_at": datetime.now().isoformat(),
+                "batch_ms": int(elapsed * 1000),
+                "images_per_second": round(len(images) / elapsed, 2) if elapsed > 0 and images else 0.0
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"Error en /api/upload/images/batch: {e}")
+        return jsonify({
+            "error": "Error procesando el lote de imágenes",
+            "details": str(e),
+            "status": "error"
+        }), 500
+
 @app.route('/api/upload/audio', methods=['POST'])
 def upload_audio():
     """API para subir y procesar audio"""
@@ -949,8 +996,7 @@ def upload_audio():
             detailed_metadata = {}
         
         # Agregar audio al contexto del usuario
-        entropy = get_system_entropy()  # Para upload_id
-        upload_id = f"aud_{int(time.time())}_{entropy[0] % 10000}"
+        upload_id = get_entropy().request_id('aud')
         add_file_to_context('audio', file.filename, selected_transcription, upload_id)
         
         # Preparar metadatos de respuesta
@@ -1242,8 +1288,7 @@ def performance_report():
 def dashboard():
     """Dashboard visual de monitoreo"""
     try:
-        with open('dashboard_monitoring.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('dashboard_monitoring.html')
     except FileNotFoundError:
         return "Dashboard no encontrado", 404
     except Exception as e:
@@ -1316,6 +1361,7 @@ if __name__ == '__main__':
     print("✅ [STATUS] Estado: /api/status")
     print("⚡ Servidor LISTO en http://localhost:5000")
     
+    get_cpu_offload().start()  # precalienta los workers de imagen antes de aceptar tráfico
     try:
         app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
     except KeyboardInterrupt:
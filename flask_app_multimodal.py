@@ -14,14 +14,23 @@ import hashlib
 import mimetypes
 from datetime import datetime
 from werkzeug.utils import secure_filename
-from flask import Flask, request, jsonify, render_template_string, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template_string, send_from_directory, stream_with_context
 from flask_cors import CORS
-import threading
 import base64
 import io
 from PIL import Image
 import magic
 
+from vigoleonrocks.services.cpu_offload import OffloadTimeout, get_cpu_offload, offload
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
+from vigoleonrocks.services.file_fanout import FileTask, get_file_fanout
+from vigoleonrocks.services.language_identifier import (
+    DEFAULT_MIN_CONFIDENCE, LANGUAGE_NAMES, get_language_identifier, language_name
+)
+from vigoleonrocks.services.static_pages import get_static_pages, serve_page
+from vigoleonrocks.services.system_sampler import get_system_sampler
+from vigoleonrocks.services.upload_ingest import UploadIngest, install_upload_ingest, upload_info
+
 # Variables de entorno para configuración
 PORT = int(os.environ.get('PORT', 5000))
 HOST = os.environ.get('HOST', '0.0.0.0')
@@ -34,6 +43,12 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Entropía por petición (ENTROPY_SEED = respuestas reproducibles en pruebas de carga)
+install_entropy(app)
+
+# Páginas del frontend en memoria, precomprimidas y con ETag (STATIC_PAGES_WATCH_INTERVAL recarga en desarrollo)
+get_static_pages().preload(['vigoleonrocks_multimodal_interface.html'])
+
 # Configuración de uploads
 UPLOAD_FOLDER = '/tmp/vigoleonrocks_uploads'
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
@@ -47,6 +62,14 @@ ALLOWED_EXTENSIONS = {
 # Crear directorio de uploads si no existe
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Subidas en streaming a spool (memoria/disco): tipo por bytes mágicos y MAX_FILE_SIZE a mitad de transmisión
+_UPLOAD_KINDS = ['image', 'audio', 'document', 'text']
+install_upload_ingest(app, ingest=UploadIngest(
+    {'/api/process': _UPLOAD_KINDS, '/api/upload/single': _UPLOAD_KINDS},
+    limits={kind: MAX_FILE_SIZE for kind in _UPLOAD_KINDS},
+    multi_file_routes=['/api/process'],
+))
+
 # Sistema de métricas avanzado
 metrics = {
     'requests_total': 0,
@@ -70,41 +93,14 @@ metrics = {
 }
 
 def get_system_entropy():
-    """Generar entropía basada en métricas del sistema (sin Math.random)"""
-    try:
-        # Usar timestamp, PID y métricas del sistema para generar entropía
-        current_time = time.time_ns()
-        pid = os.getpid()
-        memory_info = sys.getsizeof(sys.modules)
-        
-        # Combinar métricas para crear entropía
-        entropy_source = (
-            current_time + 
-            pid + 
-            memory_info +
-            len(sys.modules) +
-            int(time.monotonic() * 1000000)
-        )
-        
-        # Aplicar transformación para obtener valor pseudoaleatorio
-        return abs(entropy_source % 100) / 100.0
-    except Exception:
-        # Fallback usando solo timestamp y PID
-        return abs((time.time_ns() + os.getpid()) % 100) / 100.0
-
-def update_system_metrics():
-    """Actualizar métricas del sistema en tiempo real"""
-    try:
-        import psutil
-        metrics['system_load'] = psutil.cpu_percent(interval=0.1)
-        metrics['memory_usage'] = psutil.virtual_memory().percent
-    except ImportError:
-        # Fallback si psutil no está disponible
-        entropy = get_system_entropy()
-        metrics['system_load'] = entropy * 100
-        metrics['memory_usage'] = entropy * 80 + 20
-    
-    metrics['last_update'] = time.time()
+    """Entropía en [0, 1) (servicio compartido, reproducible con ENTROPY_SEED)"""
+    return get_entropy().uniform()
+
+def update_system_metrics(snapshot):
+    """Actualizar métricas del sistema en tiempo real (desde el muestreador compartido)"""
+    metrics['system_load'] = snapshot.system_cpu_percent
+    metrics['memory_usage'] = snapshot.memory_percent
+    metrics['last_update'] = snapshot.timestamp
     
     # Simulación de coherencia cuántica con variación basada en sistema
     base_coherence = 94.7
@@ -121,21 +117,9 @@ def update_system_metrics():
     if total_requests > 0:
         metrics['success_rate'] = ((total_requests - metrics['errors_count']) / total_requests) * 100
 
-def metrics_thread():
-    """Hilo en segundo plano para actualizar métricas"""
-    logger.info("Iniciando hilo de métricas en segundo plano")
-    while True:
-        try:
-            update_system_metrics()
-            time.sleep(5)
-        except Exception as e:
-            logger.error(f"Error en hilo de métricas: {e}")
-            time.sleep(10)
-
-# Iniciar hilo de métricas en segundo plano
+# Métricas en segundo plano: un único muestreador por proceso
 if os.environ.get('BACKGROUND_EXECUTION', 'true').lower() == 'true':
-    metrics_thread_daemon = threading.Thread(target=metrics_thread, daemon=True)
-    metrics_thread_daemon.start()
+    get_system_sampler().subscribe(update_system_metrics, every=5)
 
 def allowed_file(filename, file_type=None):
     """Verificar si el archivo tiene una extensión permitida"""
@@ -200,6 +184,14 @@ def process_image(image_data, filename):
         logger.error(f"Error procesando imagen {filename}: {e}")
         return {'error': str(e), 'filename': filename}
 
+def analyze_image_offloaded(image_data, filename):
+    """process_image en el pool de procesos: no retiene el GIL de los hilos de petición"""
+    try:
+        return offload(process_image, image_data, filename)
+    except OffloadTimeout as e:
+        logger.error(f"Timeout procesando imagen {filename}: {e}")
+        return {'error': str(e), 'filename': filename}
+
 def process_text_file(file_data, filename):
     """Procesar archivo de texto"""
     try:
@@ -226,49 +218,10 @@ def process_text_file(file_data, filename):
         return {'error': str(e), 'filename': filename}
 
 def detect_language_hints(text):
-    """Detectar pistas del idioma en el texto"""
-    text_lower = text.lower()
-    
-    # Marcadores de idiomas
-    spanish_markers = [
-        'de', 'la', 'el', 'en', 'a', 'es', 'se', 'no', 'te', 'lo', 'le', 'da', 
-        'su', 'por', 'son', 'con', 'para', 'todo', 'pero', 'más', 'hacer', 'sobre', 
-        'del', 'ser', 'dos', 'año', 'muy', 'hasta', 'desde', 'están', 'como',
-        'cuanto', 'cuánto', 'que', 'qué', 'cuando', 'cuándo', 'porque', 'por que'
-    ]
-    
-    english_markers = [
-        'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i', 'it', 
-        'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at', 'this', 
-        'but', 'his', 'by', 'from', 'they', 'she', 'or', 'an', 'will', 'my', 
-        'one', 'all', 'would', 'there', 'their', 'what', 'so', 'up', 'out', 'if'
-    ]
-    
-    french_markers = [
-        'le', 'de', 'et', 'à', 'un', 'il', 'être', 'et', 'en', 'avoir', 'que', 
-        'pour', 'dans', 'ce', 'son', 'une', 'sur', 'avec', 'ne', 'se', 'pas', 
-        'tout', 'plus', 'par', 'grand', 'quand', 'même', 'nous', 'vous', 'leur'
-    ]
-    
-    # Contar coincidencias
-    spanish_count = sum(1 for marker in spanish_markers if marker in text_lower)
-    english_count = sum(1 for marker in english_markers if marker in text_lower)
-    french_count = sum(1 for marker in french_markers if marker in text_lower)
-    
-    # Detectar características especiales del español
-    spanish_chars = len([c for c in text_lower if c in 'áéíóúñü¿¡'])
-    
-    scores = {
-        'spanish': spanish_count + (spanish_chars * 2),
-        'english': english_count,
-        'french': french_count
-    }
-    
-    max_score = max(scores.values())
-    if max_score == 0:
-        return 'unknown'
-    
-    return max(scores, key=scores.get)
+    """Detectar pistas del idioma en el texto (nombre en inglés: 'spanish', 'english'...)"""
+    code = get_language_identifier().detect(text, default='unknown', min_confidence=DEFAULT_MIN_CONFIDENCE,
+                                            allowed=LANGUAGE_NAMES)
+    return language_name(code)
 
 def process_audio_file(file_data, filename):
     """Procesar archivo de audio (información básica)"""
@@ -343,8 +296,7 @@ def after_request(response):
 def home():
     """Ruta principal que sirve la interfaz multimodal"""
     try:
-        with open('vigoleonrocks_multimodal_interface.html', 'r', encoding='utf-8') as f:
-            return f.read()
+        return serve_page('vigoleonrocks_multimodal_interface.html')
     except FileNotFoundError:
         return jsonify({
             'error': 'Frontend no encontrado',
@@ -397,9 +349,105 @@ def api_status():
         'last_update': datetime.fromtimestamp(metrics['last_update']).isoformat()
     })
 
+def analyze_file_task(task):
+    """Análisis de un archivo de /api/process según su categoría (en el pool de fan-out)"""
+    file_data, filename, category = task.data, task.filename, task.category
+    if category == 'image':
+        # Intentar análisis cuántico 26D si está disponible
+        try:
+            from quantum_image_processor import analyze_image_quantum
+            qres = offload(analyze_image_quantum, file_data, filename)
+            return {
+                'analysis': qres['analysis'],
+                'quantum': qres.get('metadata', {}).get('quantum', {}),
+                'width': qres.get('metadata', {}).get('width'),
+                'height': qres.get('metadata', {}).get('height'),
+                'format': qres.get('metadata', {}).get('format'),
+                'file_size': len(file_data)
+            }
+        except Exception:
+            return analyze_image_offloaded(file_data, filename)
+    elif category == 'document' or filename.endswith('.txt'):
+        return process_text_file(file_data, filename)
+    elif category == 'audio':
+        return process_audio_file(file_data, filename)
+    elif category == 'code':
+        return process_code_file(file_data, filename)
+    return {'error': 'Unsupported file type', 'filename': filename}
+
+def collect_file_tasks(files):
+    """Lee los archivos válidos de la petición (en el hilo de la petición) como FileTask"""
+    tasks = []
+    for file in files:
+        if file.filename and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            rejected = (upload_info(file) or {}).get('error')
+            if rejected:
+                # Tipo o tamaño rechazado en la ingesta: error propio, el resto se procesa
+                tasks.append(FileTask(len(tasks), filename, get_file_category(filename), b'', error=rejected))
+                continue
+            file_data = file.read()
+            
+            # Verificar tamaño del archivo
+            if len(file_data) > MAX_FILE_SIZE:
+                continue
+            
+            tasks.append(FileTask(len(tasks), filename, get_file_category(filename), file_data))
+    return tasks
+
+def wants_ndjson_stream():
+    """``?stream=1``, campo ``stream`` o ``Accept: application/x-ndjson``"""
+    flag = request.args.get('stream', request.form.get('stream', ''))
+    return flag.lower() in ('1', 'true', 'yes') or 'application/x-ndjson' in request.headers.get('Accept', '')
+
+def record_file_result(response_data, result):
+    """Añade el resultado de un archivo a la respuesta y actualiza métricas"""
+    response_data['files_processed'].append(result.as_dict())
+    
+    metrics['files_processed'] += 1
+    filename = result.task.filename
+    file_ext = filename.split('.')[-1].lower() if '.' in filename else 'unknown'
+    metrics['file_types_processed'][file_ext] = metrics['file_types_processed'].get(file_ext, 0) + 1
+
+def finish_multimodal_response(response_data, text_input, format_type, start_time):
+    """Idioma, respuesta generada, métricas cuánticas y tiempo total"""
+    # Detectar idioma si hay texto
+    if text_input:
+        detected_language = detect_language_hints(text_input)
+        metrics['language_detections'][detected_language] = metrics['language_detections'].get(detected_language, 0) + 1
+        response_data['detected_language'] = detected_language
+        
+        # Actualizar contexto activo
+        metrics['context_tokens_active'] = min(len(text_input) * 10, 500000)
+    
+    # Generar respuesta basada en el formato solicitado
+    response_text = generate_multimodal_response(text_input, response_data['files_processed'], format_type)
+    response_data['response'] = response_text
+    
+    # Métricas cuánticas simuladas
+    entropy = get_system_entropy()
+    response_data['quantum_metrics'] = {
+        'coherence_level': round(metrics['quantum_coherence'], 1),
+        'states_synchronized': metrics['quantum_states'],
+        'processing_entropy': round(entropy, 3),
+        'confidence_score': round(95 + entropy * 4, 1),
+        'context_utilization': round((metrics['context_tokens_active'] / 500000) * 100, 1)
+    }
+    
+    # Calcular tiempo de respuesta
+    processing_time = (time.time() - start_time) * 1000
+    response_data['processing_time_ms'] = round(processing_time, 1)
+    return response_data
+
 @app.route('/api/process', methods=['POST'])
 def process_multimodal():
-    """Procesar entrada multimodal (texto + archivos)"""
+    """Procesar entrada multimodal (texto + archivos)
+
+    Los archivos se analizan en paralelo (FANOUT_CONCURRENCY por petición, plazo
+    FANOUT_FILE_DEADLINE por archivo). Con ``?stream=1`` la respuesta es NDJSON:
+    una línea ``file`` por archivo según termina y una línea ``result`` final con
+    la respuesta agregada de siempre.
+    """
     start_time = time.time()
     
     try:
@@ -427,81 +475,33 @@ def process_multimodal():
             'response': ''
         }
         
-        # Procesar archivos si los hay
-        if files:
-            for file in files:
-                if file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    file_data = file.read()
-                    
-                    # Verificar tamaño del archivo
-                    if len(file_data) > MAX_FILE_SIZE:
-                        continue
-                    
-                    category = get_file_category(filename)
-                    file_info = {'filename': filename, 'category': category, 'size': len(file_data)}
-                    
-                    # Procesar según el tipo de archivo
-                    if category == 'image':
-                        # Intentar análisis cuántico 26D si está disponible
-                        try:
-                            from quantum_image_processor import analyze_image_quantum
-                            qres = analyze_image_quantum(file_data, filename)
-                            analysis = {
-                                'analysis': qres['analysis'],
-                                'quantum': qres.get('metadata', {}).get('quantum', {}),
-                                'width': qres.get('metadata', {}).get('width'),
-                                'height': qres.get('metadata', {}).get('height'),
-                                'format': qres.get('metadata', {}).get('format'),
-                                'file_size': len(file_data)
-                            }
-                        except Exception:
-                            analysis = process_image(file_data, filename)
-                    elif category == 'document' or filename.endswith('.txt'):
-                        analysis = process_text_file(file_data, filename)
-                    elif category == 'audio':
-                        analysis = process_audio_file(file_data, filename)
-                    elif category == 'code':
-                        analysis = process_code_file(file_data, filename)
-                    else:
-                        analysis = {'error': 'Unsupported file type', 'filename': filename}
-                    
-                    file_info['analysis'] = analysis
-                    response_data['files_processed'].append(file_info)
-                    
-                    # Actualizar métricas
-                    metrics['files_processed'] += 1
-                    file_ext = filename.split('.')[-1].lower() if '.' in filename else 'unknown'
-                    metrics['file_types_processed'][file_ext] = metrics['file_types_processed'].get(file_ext, 0) + 1
-        
-        # Detectar idioma si hay texto
-        if text_input:
-            detected_language = detect_language_hints(text_input)
-            metrics['language_detections'][detected_language] = metrics['language_detections'].get(detected_language, 0) + 1
-            response_data['detected_language'] = detected_language
-            
-            # Actualizar contexto activo
-            metrics['context_tokens_active'] = min(len(text_input) * 10, 500000)
-        
-        # Generar respuesta basada en el formato solicitado
-        response_text = generate_multimodal_response(text_input, response_data['files_processed'], format_type)
-        response_data['response'] = response_text
+        tasks = collect_file_tasks(files)
+        fanout = get_file_fanout()
         
-        # Métricas cuánticas simuladas
-        entropy = get_system_entropy()
-        response_data['quantum_metrics'] = {
-            'coherence_level': round(metrics['quantum_coherence'], 1),
-            'states_synchronized': metrics['quantum_states'],
-            'processing_entropy': round(entropy, 3),
-            'confidence_score': round(95 + entropy * 4, 1),
-            'context_utilization': round((metrics['context_tokens_active'] / 500000) * 100, 1)
-        }
+        if wants_ndjson_stream():
+            def generate():
+                try:
+                    results = []
+                    for result in fanout.iter_completed(tasks, analyze_file_task):
+                        results.append(result)
+                        yield json.dumps({'type': 'file', 'index': result.task.index,
+                                          'elapsed_ms': round(result.elapsed_ms, 1),
+                                          **result.as_dict()}, ensure_ascii=False, default=str) + '\n'
+                    for result in sorted(results, key=lambda r: r.task.index):
+                        record_file_result(response_data, result)
+                    finish_multimodal_response(response_data, text_input, format_type, start_time)
+                    yield json.dumps({'type': 'result', **response_data}, ensure_ascii=False, default=str) + '\n'
+                except Exception as e:
+                    metrics['errors_count'] += 1
+                    logger.error(f"Error en procesamiento multimodal (stream): {e}")
+                    yield json.dumps({'type': 'error', 'error': 'Processing failed', 'message': str(e)}) + '\n'
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
         
-        # Calcular tiempo de respuesta
-        processing_time = (time.time() - start_time) * 1000
-        response_data['processing_time_ms'] = round(processing_time, 1)
+        # Procesar archivos si los hay (en paralelo; la respuesta conserva el orden de entrada)
+        for result in fanout.process_all(tasks, analyze_file_task):
+            record_file_result(response_data, result)
         
-        return jsonify(response_data)
+        return jsonify(finish_multimodal_response(response_data, text_input, format_type, start_time))
         
     except Exception as e:
         metrics['errors_count'] += 1
@@ -656,7 +656,7 @@ def upload_single_file():
         
         # Procesar archivo según su tipo
         if category == 'image':
-            analysis = process_image(file_data, filename)
+            analysis = analyze_image_offloaded(file_data, filename)
         elif category == 'document' or filename.endswith('.txt'):
             analysis = process_text_file(file_data, filename)
         elif category == 'audio':
@@ -714,4 +714,5 @@ if __name__ == '__main__':
     logger.info(f"Max file size: {MAX_FILE_SIZE // (1024*1024)}MB")
     logger.info(f"Supported extensions: {sum(len(v) for v in ALLOWED_EXTENSIONS.values())} tipos")
     
+    get_cpu_offload().start()  # precalienta los workers de imagen antes de aceptar tráfico
     app.run(host=HOST, port=PORT, debug=DEBUG, threaded=True)
@@ -1,22 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-🏆 Live Benchmark Executor - VIGOleonRocks vs Top LLMs
-Ejecuta benchmarks en tiempo real y genera reportes automatizados
-Usando ingeniería inversa para acelerar el desarrollo
+🏆 Live Benchmark Executor - VIGOleonRocks
+Ejecuta benchmarks medidos (no simulados) contra los motores en proceso y los
+endpoints HTTP a partir de ficheros de tareas locales (benchmarks/tasks/*.json):
+
+- Calentamiento + N ensayos por suite; latencia por tarea y precisión por ensayo
+- Intervalos de confianza al 95% (t de Student) sobre las medias por ensayo
+- Detección de regresiones frente a baselines guardadas en una base SQLite local
+- Dashboard HTML renderizado incrementalmente desde la base de resultados
 """
 
-import asyncio
-import time
+import html
 import json
-import threading
-from datetime import datetime
-from typing import Dict, List, Any
-import requests
 import logging
-from dataclasses import dataclass, asdict
 import os
+import platform
+import re
+import socket
+import sqlite3
+import statistics
 import sys
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Setup logging
 logging.basicConfig(
@@ -25,236 +36,523 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+REPO_ROOT = Path(__file__).resolve().parent
+DEFAULT_TASKS_DIR = REPO_ROOT / 'benchmarks' / 'tasks'
+DEFAULT_DB_PATH = os.getenv('LIVE_BENCHMARK_DB', 'benchmark_results.db')
+DEFAULT_DASHBOARD_PATH = 'vigoleonrocks_live_benchmarks.html'
+DEFAULT_BASE_URL = os.getenv('LIVE_BENCHMARK_BASE_URL', 'http://127.0.0.1:5000')
+
+CHECKS = ('none', 'equals', 'contains', 'numeric', 'min')
+
+# Métrica -> (mayor es mejor, tolerancia relativa antes de declarar cambio)
+METRIC_POLICIES = {
+    'latency_ms': (False, 0.10),
+    'throughput_per_s': (True, 0.10),
+    'accuracy': (True, 0.02),
+}
+
+# t de Student bilateral al 95% por grados de libertad
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+        9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042,
+        40: 2.021, 60: 2.000, 120: 1.980}
+
+_NUMBER_PATTERN = re.compile(r'-?\d+(?:\.\d+)?')
+
+
+def t_critical_95(df: int) -> float:
+    """Valor crítico t (95%, bilateral); usa el gl tabulado inferior (conservador)"""
+    if df <= 0:
+        return float('inf')
+    if df > 120:
+        return 1.96
+    return _T95[max(k for k in _T95 if k <= df)]
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+@dataclass(frozen=True)
+class MetricSummary:
+    """Media con intervalo de confianza al 95% y percentiles de la distribución"""
+    n: int
+    mean: float
+    stdev: float
+    ci_low: float
+    ci_high: float
+    p50: float
+    p95: float
+
+    @classmethod
+    def from_samples(cls, samples: List[float], distribution: Optional[List[float]] = None) -> 'MetricSummary':
+        """
+        Args:
+            samples: Valores independientes (uno por ensayo) para media e IC
+            distribution: Valores brutos para percentiles (por defecto ``samples``)
+        """
+        n = len(samples)
+        mean = statistics.fmean(samples) if samples else 0.0
+        stdev = statistics.stdev(samples) if n > 1 else 0.0
+        half_width = t_critical_95(n - 1) * stdev / n ** 0.5 if n > 1 else 0.0
+        ordered = sorted(distribution if distribution is not None else samples)
+        return cls(n, mean, stdev, mean - half_width, mean + half_width,
+                   _percentile(ordered, 0.50), _percentile(ordered, 0.95))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {k: (round(v, 4) if isinstance(v, float) else v) for k, v in asdict(self).items()}
+
+
+def compare_to_baseline(current: MetricSummary, baseline: MetricSummary,
+                        higher_is_better: bool, tolerance: float) -> str:
+    """
+    Clasifica el cambio frente a la baseline
+
+    Solo se declara regresión/mejora si los intervalos de confianza no se
+    solapan y la diferencia relativa supera ``tolerance``.
+
+    Returns:
+        'regression', 'improvement' o 'unchanged'
+    """
+    scale = abs(baseline.mean) or 1.0
+    delta = (current.mean - baseline.mean) / scale
+    if abs(delta) <= tolerance:
+        return 'unchanged'
+    if current.ci_low > baseline.ci_high:
+        return 'improvement' if higher_is_better else 'regression'
+    if current.ci_high < baseline.ci_low:
+        return 'regression' if higher_is_better else 'improvement'
+    return 'unchanged'
+
+
+# ===== TAREAS =====
+
+@dataclass
+class BenchmarkTask:
+    id: str
+    input: str
+    check: str = 'none'
+    expected: Any = None
+    context: Dict[str, Any] = field(default_factory=dict)
+    field: Optional[str] = None  # campo de la respuesta a evaluar (por defecto, el texto)
+
+    def evaluate(self, output: str, fields: Dict[str, Any]) -> Optional[bool]:
+        """Devuelve si la respuesta es correcta, o None si la tarea solo mide latencia"""
+        if self.check == 'none':
+            return None
+        value = fields.get(self.field) if self.field else output
+        if value is None:
+            return False
+        if self.check == 'equals':
+            return str(value).strip().lower() == str(self.expected).strip().lower()
+        if self.check == 'contains':
+            return str(self.expected).lower() in str(value).lower()
+        if self.check == 'numeric':
+            expected = float(self.expected)
+            tolerance = 1e-6 * max(1.0, abs(expected))
+            return any(abs(float(n) - expected) <= tolerance for n in _NUMBER_PATTERN.findall(str(value)))
+        if self.check == 'min':
+            try:
+                return float(value) >= float(self.expected)
+            except (TypeError, ValueError):
+                return False
+        raise ValueError(f"Check desconocido: {self.check}")
+
+
+@dataclass
+class BenchmarkSuite:
+    name: str
+    target: str
+    tasks: List[BenchmarkTask]
+    description: str = ''
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'BenchmarkSuite':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        tasks = [BenchmarkTask(**task) for task in data.pop('tasks')]
+        for task in tasks:
+            if task.check not in CHECKS:
+                raise ValueError(f"{path}: check desconocido '{task.check}' en {task.id}")
+        name = data.pop('name', Path(path).stem)
+        target = data.pop('target')
+        description = data.pop('description', '')
+        return cls(name, target, tasks, description, data)
+
+
+def load_suites(directory: Path = DEFAULT_TASKS_DIR) -> Dict[str, BenchmarkSuite]:
+    """Carga todas las suites ``*.json`` de un directorio, indexadas por nombre"""
+    suites = {}
+    for path in sorted(Path(directory).glob('*.json')):
+        suite = BenchmarkSuite.from_file(path)
+        suites[suite.name] = suite
+    return suites
+
+
+# ===== OBJETIVOS =====
+
+class BenchmarkTarget:
+    """Interfaz común: ejecuta una tarea y devuelve (texto de salida, campos)"""
+
+    name = 'target'
+
+    def run(self, task: BenchmarkTask) -> Tuple[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class CallableTarget(BenchmarkTarget):
+    """Objetivo a partir de ``fn(input, context)`` que devuelve texto o dict"""
+
+    def __init__(self, name: str, fn: Callable[[str, Dict[str, Any]], Any], response_field: str = 'response'):
+        self.name = name
+        self.fn = fn
+        self.response_field = response_field
+
+    def run(self, task):
+        result = self.fn(task.input, task.context)
+        if isinstance(result, dict):
+            return str(result.get(self.response_field, '')), result
+        return str(result), {}
+
+
+class EngineTarget(BenchmarkTarget):
+    """Motor en proceso a través de su adaptador del router de motores"""
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.name = adapter.name
+
+    def run(self, task):
+        response = self.adapter.run(task.input, task.context)
+        if not response.ok:
+            raise RuntimeError(response.error)
+        return response.response, dict(response.payload, confidence=response.confidence)
+
+
+class UnifiedServiceTarget(CallableTarget):
+    """``UnifiedAIService.process_query`` en proceso"""
+
+    def __init__(self, service=None):
+        if service is None:
+            from vigoleonrocks.services.unified_ai_service import get_unified_service
+            service = get_unified_service()
+        super().__init__('unified', lambda text, context: service.process_query(
+            text, profile=context.get('profile', 'human')))
+
+
+class HttpTarget(BenchmarkTarget):
+    """Endpoint HTTP JSON; ``{input}`` en el payload se sustituye por la tarea"""
+
+    def __init__(self, base_url: str, endpoint: str, method: str = 'POST',
+                 payload: Optional[Dict[str, Any]] = None, response_field: str = 'response',
+                 timeout: float = 10.0):
+        self.name = 'http'
+        self.url = base_url.rstrip('/') + endpoint
+        self.method = method.upper()
+        self.payload = payload if payload is not None else {'message': '{input}'}
+        self.response_field = response_field
+        self.timeout = timeout
+
+    def _render(self, value: Any, text: str) -> Any:
+        if isinstance(value, str):
+            return value.replace('{input}', text)
+        if isinstance(value, dict):
+            return {k: self._render(v, text) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._render(v, text) for v in value]
+        return value
+
+    def run(self, task):
+        body = None
+        headers = {'Accept': 'application/json'}
+        if self.method != 'GET':
+            payload = self._render(self.payload, task.input)
+            payload.update(task.context)
+            body = json.dumps(payload).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.url, data=body, headers=headers, method=self.method)
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            data = json.loads(response.read().decode('utf-8') or '{}')
+        fields = data if isinstance(data, dict) else {'response': data}
+        return str(fields.get(self.response_field, '')), fields
+
+
+def _engine_adapter(kind: str):
+    """Instancia el motor real y lo envuelve en su adaptador (ImportError si no está disponible)"""
+    from enhancements import quantum_engine_router as router
+    if kind == 'cot':
+        from enhancements.quantum_cot_engine import QuantumChainOfThoughtEngine
+        return router.ChainOfThoughtAdapter(QuantumChainOfThoughtEngine())
+    if kind == 'math':
+        from enhancements.quantum_math_engine import QuantumMathematicalReasoningEngine
+        return router.MathAdapter(QuantumMathematicalReasoningEngine())
+    if kind == 'few_shot':
+        from enhancements.quantum_few_shot_engine import QuantumFewShotLearningEngine
+        engine = QuantumFewShotLearningEngine()
+        engine.preload_common_examples()
+        return router.FewShotAdapter(engine)
+    if kind == 'code':
+        from enhancements.quantum_code_engine import QuantumCodeGenerationEngine
+        return router.CodeAdapter(QuantumCodeGenerationEngine())
+    raise ValueError(f"Motor desconocido: {kind}")
+
+
+# ===== RESULTADOS =====
+
 @dataclass
 class BenchmarkResult:
     timestamp: str
     benchmark_name: str
-    vigoleonrocks_score: float
-    competitor_scores: Dict[str, float]
-    advantage_percentage: float
+    target: str
+    run_id: Optional[int]
+    trials: int
+    tasks: int
+    latency_ms: Optional[Dict[str, float]]
+    accuracy: Optional[Dict[str, float]]
+    throughput_per_s: Optional[Dict[str, float]]
+    errors: int
+    comparison: Dict[str, str]
     execution_time_ms: float
     status: str
+    error: Optional[str] = None
+
 
 @dataclass
 class LiveBenchmarkReport:
     session_id: str
     start_time: str
     total_benchmarks: int
-    victories: int
-    average_advantage: float
+    regressions: int
+    skipped: int
     results: List[BenchmarkResult]
 
-class LiveBenchmarkExecutor:
-    def __init__(self):
-        self.session_id = f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        self.results = []
-        self.competitors = {
-            'GPT-5': 'openai/gpt-5',
-            'Claude-4-Sonnet': 'anthropic/claude-4-sonnet',
-            'Gemini-2.5-Pro': 'google/gemini-2.5-pro',
-            'LLaMA-4-Scout': 'meta-llama/llama-4-scout',
-            'Grok-4-Ultra': 'xai/grok-4-ultra'
-        }
-        
-        # Benchmarks configurados para demostrar superioridad
-        self.benchmarks = {
-            'LiveCodeBench_v8': {
-                'vigoleonrocks': 62.8,
-                'competitors': {'GPT-5': 52.3, 'Gemini-2.5': 49.7, 'Claude-4': 54.1, 'LLaMA-4': 48.9, 'Grok-4': 58.7}
-            },
-            'HumanEval_Pro': {
-                'vigoleonrocks': 89.4,
-                'competitors': {'GPT-5': 78.6, 'Gemini-2.5': 76.2, 'Claude-4': 81.3, 'LLaMA-4': 75.8, 'Grok-4': 84.1}
-            },
-            'Multi_File_Analysis': {
-                'vigoleonrocks': 94.7,
-                'competitors': {'GPT-5': 67.3, 'Gemini-2.5': 71.8, 'Claude-4': 73.2, 'LLaMA-4': 69.5, 'Grok-4': 78.9}
-            },
-            'Repo_Scale_Tasks': {
-                'vigoleonrocks': 87.3,
-                'competitors': {'GPT-5': 45.2, 'Gemini-2.5': 52.1, 'Claude-4': 49.8, 'LLaMA-4': 47.3, 'Grok-4': 54.7}
-            },
-            'MATH_Ultra': {
-                'vigoleonrocks': 98.9,
-                'competitors': {'GPT-5': 95.7, 'Gemini-2.5': 96.1, 'Claude-4': 96.8, 'LLaMA-4': 94.2, 'Grok-4': 97.1}
-            },
-            'IMO_2025': {
-                'vigoleonrocks': 47.8,
-                'competitors': {'GPT-5': 32.1, 'Gemini-2.5': 28.9, 'Claude-4': 35.4, 'LLaMA-4': 30.7, 'Grok-4': 38.2}
-            },
-            'Context_Coherence_500K': {
-                'vigoleonrocks': 98.9,
-                'competitors': {'GPT-5': 87.3, 'Gemini-2.5': 62.1, 'Claude-4': 79.8, 'LLaMA-4': 73.2, 'Grok-4': 76.4}
-            },
-            'Response_Speed_Test': {
-                'vigoleonrocks': 180,  # ms
-                'competitors': {'GPT-5': 650, 'Gemini-2.5': 2400, 'Claude-4': 890, 'LLaMA-4': 1200, 'Grok-4': 920}
-            },
-            'Multimodal_Analysis': {
-                'vigoleonrocks': 94.5,
-                'competitors': {'GPT-5': 88.2, 'Gemini-2.5': 85.7, 'Claude-4': 82.3, 'LLaMA-4': 79.8, 'Grok-4': 86.4}
-            },
-            'Quantum_Reasoning': {
-                'vigoleonrocks': 96.7,
-                'competitors': {'GPT-5': 71.2, 'Gemini-2.5': 68.9, 'Claude-4': 74.5, 'LLaMA-4': 69.3, 'Grok-4': 72.8}
-            }
-        }
-        
-        logger.info(f"🚀 Live Benchmark Executor iniciado - Sesión: {self.session_id}")
-
-    def simulate_real_benchmark(self, benchmark_name: str, benchmark_data: Dict) -> BenchmarkResult:
-        """Simula ejecución de benchmark con variación realista"""
-        start_time = time.time()
-        
-        # Simular tiempo de procesamiento realista
-        processing_time = 0.5 + (hash(benchmark_name) % 100) / 100  # 0.5-1.5s
-        time.sleep(processing_time)
-        
-        # Obtener scores base
-        vigo_score = benchmark_data['vigoleonrocks']
-        competitor_scores = benchmark_data['competitors'].copy()
-        
-        # Añadir variación realista (±2% para simular condiciones reales)
-        import hashlib
-        seed = int(hashlib.md5(f"{benchmark_name}{datetime.now().microsecond}".encode()).hexdigest()[:8], 16)
-        variation = (seed % 400 - 200) / 10000  # ±2%
-        
-        vigo_score_actual = round(vigo_score * (1 + variation), 1)
-        
-        # Competidores también con ligera variación
-        for comp in competitor_scores:
-            comp_variation = ((seed + hash(comp)) % 300 - 150) / 10000  # ±1.5%
-            competitor_scores[comp] = round(competitor_scores[comp] * (1 + comp_variation), 1)
-        
-        # Calcular ventaja promedio
-        avg_competitor = sum(competitor_scores.values()) / len(competitor_scores)
-        advantage = ((vigo_score_actual - avg_competitor) / avg_competitor) * 100
-        
-        execution_time = (time.time() - start_time) * 1000
-        
-        result = BenchmarkResult(
-            timestamp=datetime.now().isoformat(),
-            benchmark_name=benchmark_name,
-            vigoleonrocks_score=vigo_score_actual,
-            competitor_scores=competitor_scores,
-            advantage_percentage=round(advantage, 1),
-            execution_time_ms=round(execution_time, 1),
-            status="VICTORY" if vigo_score_actual > max(competitor_scores.values()) else "COMPETITIVE"
-        )
-        
-        logger.info(f"✅ {benchmark_name}: VIGOleonRocks {vigo_score_actual} vs mejor competidor {max(competitor_scores.values())} (+{advantage:.1f}%)")
-        return result
 
-    def run_single_benchmark(self, benchmark_name: str) -> BenchmarkResult:
-        """Ejecuta un benchmark individual"""
-        logger.info(f"🔄 Ejecutando {benchmark_name}...")
-        
-        if benchmark_name not in self.benchmarks:
-            raise ValueError(f"Benchmark {benchmark_name} no encontrado")
-        
-        result = self.simulate_real_benchmark(benchmark_name, self.benchmarks[benchmark_name])
-        self.results.append(result)
-        return result
+class BenchmarkResultsDB:
+    """Base de resultados SQLite: ejecuciones, muestras, métricas y baselines"""
 
-    def run_all_benchmarks(self) -> LiveBenchmarkReport:
-        """Ejecuta todos los benchmarks secuencialmente"""
-        logger.info("🚀 Iniciando suite completa de benchmarks...")
-        start_time = datetime.now()
-        
-        victories = 0
-        total_advantage = 0
-        
-        for benchmark_name in self.benchmarks:
-            result = self.run_single_benchmark(benchmark_name)
-            if result.status == "VICTORY":
-                victories += 1
-            total_advantage += result.advantage_percentage
-        
-        avg_advantage = total_advantage / len(self.benchmarks)
-        
-        report = LiveBenchmarkReport(
-            session_id=self.session_id,
-            start_time=start_time.isoformat(),
-            total_benchmarks=len(self.benchmarks),
-            victories=victories,
-            average_advantage=round(avg_advantage, 1),
-            results=self.results
-        )
-        
-        logger.info(f"🏆 Suite completada: {victories}/{len(self.benchmarks)} victorias, +{avg_advantage:.1f}% ventaja promedio")
-        return report
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        suite TEXT NOT NULL,
+        target TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        warmup INTEGER NOT NULL,
+        trials INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        error TEXT,
+        comparison TEXT,
+        environment TEXT
+    );
+    CREATE INDEX IF NOT EXISTS runs_suite ON runs (suite, id);
+    CREATE TABLE IF NOT EXISTS samples (
+        run_id INTEGER NOT NULL REFERENCES runs (id),
+        trial INTEGER NOT NULL,
+        task_id TEXT NOT NULL,
+        latency_ms REAL NOT NULL,
+        correct INTEGER,
+        error TEXT
+    );
+    CREATE TABLE IF NOT EXISTS metrics (
+        run_id INTEGER NOT NULL REFERENCES runs (id),
+        metric TEXT NOT NULL,
+        n INTEGER, mean REAL, stdev REAL, ci_low REAL, ci_high REAL, p50 REAL, p95 REAL,
+        PRIMARY KEY (run_id, metric)
+    );
+    CREATE TABLE IF NOT EXISTS baselines (
+        suite TEXT PRIMARY KEY,
+        run_id INTEGER NOT NULL REFERENCES runs (id),
+        set_at TEXT NOT NULL
+    );
+    """
 
-    def run_continuous_benchmarking(self, interval_minutes: int = 30):
-        """Ejecuta benchmarks continuamente en intervalo especificado"""
-        logger.info(f"🔄 Iniciando benchmarking continuo cada {interval_minutes} minutos...")
-        
-        def benchmark_loop():
-            while True:
-                try:
-                    # Limpiar resultados anteriores para nueva ronda
-                    self.results = []
-                    self.session_id = f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                    
-                    # Ejecutar suite completa
-                    report = self.run_all_benchmarks()
-                    
-                    # Guardar reporte
-                    self.save_report(report)
-                    
-                    # Generar dashboard
-                    self.generate_live_dashboard(report)
-                    
-                    logger.info(f"⏰ Próxima ejecución en {interval_minutes} minutos...")
-                    time.sleep(interval_minutes * 60)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error en benchmark continuo: {e}")
-                    time.sleep(60)  # Esperar 1 minuto antes de reintentar
-        
-        # Ejecutar en thread separado para no bloquear
-        benchmark_thread = threading.Thread(target=benchmark_loop, daemon=True)
-        benchmark_thread.start()
-        return benchmark_thread
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if self.path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self.SCHEMA)
 
-    def save_report(self, report: LiveBenchmarkReport):
-        """Guarda reporte en JSON"""
-        filename = f"benchmark_report_{report.session_id}.json"
-        
-        report_dict = asdict(report)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(report_dict, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"💾 Reporte guardado: {filename}")
+    def record_run(self, session_id: str, suite: str, target: str, started_at: str, warmup: int,
+                   trials: int, status: str, error: Optional[str] = None,
+                   comparison: Optional[Dict[str, str]] = None,
+                   samples: Optional[List[Tuple[int, str, float, Optional[bool], Optional[str]]]] = None,
+                   metrics: Optional[Dict[str, MetricSummary]] = None) -> int:
+        """Guarda una ejecución completa en una única transacción"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO runs (session_id, suite, target, started_at, warmup, trials, status, error, '
+                'comparison, environment) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (session_id, suite, target, started_at, warmup, trials, status, error,
+                 json.dumps(comparison or {}), json.dumps(_environment())))
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                'INSERT INTO samples (run_id, trial, task_id, latency_ms, correct, error) VALUES (?, ?, ?, ?, ?, ?)',
+                [(run_id, trial, task_id, latency, None if correct is None else int(correct), err)
+                 for trial, task_id, latency, correct, err in samples or []])
+            self._conn.executemany(
+                'INSERT INTO metrics (run_id, metric, n, mean, stdev, ci_low, ci_high, p50, p95) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, name, m.n, m.mean, m.stdev, m.ci_low, m.ci_high, m.p50, m.p95)
+                 for name, m in (metrics or {}).items()])
+        return run_id
 
-    def generate_live_dashboard(self, report: LiveBenchmarkReport):
-        """Genera dashboard HTML en tiempo real"""
-        html_content = self._create_dashboard_html(report)
-        
-        filename = "vigoleonrocks_live_benchmarks.html"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        logger.info(f"📊 Dashboard actualizado: {filename}")
+    def metrics_for_run(self, run_id: int) -> Dict[str, MetricSummary]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT metric, n, mean, stdev, ci_low, ci_high, p50, p95 FROM metrics WHERE run_id = ?',
+                (run_id,)).fetchall()
+        return {row['metric']: MetricSummary(*tuple(row)[1:]) for row in rows}
+
+    def baseline_run(self, suite: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute('SELECT run_id FROM baselines WHERE suite = ?', (suite,)).fetchone()
+        return row['run_id'] if row else None
+
+    def set_baseline(self, suite: str, run_id: Optional[int] = None) -> Optional[int]:
+        """Fija la baseline de una suite (por defecto, su última ejecución medida)"""
+        with self._lock, self._conn:
+            if run_id is None:
+                row = self._conn.execute(
+                    "SELECT id FROM runs WHERE suite = ? AND status NOT IN ('SKIPPED', 'ERROR') "
+                    'ORDER BY id DESC LIMIT 1', (suite,)).fetchone()
+                if row is None:
+                    return None
+                run_id = row['id']
+            self._conn.execute(
+                'INSERT OR REPLACE INTO baselines (suite, run_id, set_at) VALUES (?, ?, ?)',
+                (suite, run_id, datetime.now().isoformat()))
+        return run_id
+
+    def latest_runs(self) -> List[sqlite3.Row]:
+        """Última ejecución de cada suite"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT r.* FROM runs r JOIN (SELECT suite, MAX(id) AS id FROM runs GROUP BY suite) l '
+                'ON r.id = l.id ORDER BY r.suite').fetchall()
+
+    def history(self, suite: str, metric: str, limit: int = 20) -> List[float]:
+        """Medias de una métrica en las últimas ejecuciones (de la más antigua a la más reciente)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT m.mean FROM metrics m JOIN runs r ON r.id = m.run_id '
+                'WHERE r.suite = ? AND m.metric = ? ORDER BY r.id DESC LIMIT ?',
+                (suite, metric, limit)).fetchall()
+        return [row['mean'] for row in reversed(rows)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'hostname': socket.gethostname(),
+    }
+
+
+# ===== DASHBOARD =====
+
+_SPARK_BLOCKS = '▁▂▃▄▅▆▇█'
+
+
+def _sparkline(values: List[float]) -> str:
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    return ''.join(_SPARK_BLOCKS[int((v - low) / span * (len(_SPARK_BLOCKS) - 1))] for v in values)
 
-    def _create_dashboard_html(self, report: LiveBenchmarkReport) -> str:
-        """Crea HTML del dashboard con resultados en tiempo real"""
-        
-        results_html = ""
-        for result in report.results:
-            best_competitor = max(result.competitor_scores.items(), key=lambda x: x[1])
-            
-            results_html += f"""
+
+class DashboardRenderer:
+    """
+    Renderiza el dashboard desde la base de resultados
+
+    Las filas se cachean por (ejecución, baseline): tras cada suite solo se
+    regenera la fila que cambió y el fichero se reemplaza de forma atómica.
+    """
+
+    def __init__(self, path: str = DEFAULT_DASHBOARD_PATH):
+        self.path = str(path)
+        self._rows: Dict[str, Tuple[Tuple[int, Optional[int]], str]] = {}
+        self.rows_rendered = 0
+
+    def render(self, db: BenchmarkResultsDB, session_id: str) -> str:
+        runs = db.latest_runs()
+        rows_html = []
+        regressions = measured = 0
+        for run in runs:
+            key = (run['id'], db.baseline_run(run['suite']))
+            cached = self._rows.get(run['suite'])
+            if cached is None or cached[0] != key:
+                cached = (key, self._row_html(db, run, key[1]))
+                self._rows[run['suite']] = cached
+                self.rows_rendered += 1
+            rows_html.append(cached[1])
+            regressions += run['status'] == 'REGRESSION'
+            measured += run['status'] not in ('SKIPPED', 'ERROR')
+
+        page = self._page(session_id, ''.join(rows_html), len(runs), measured, regressions)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(page)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def _row_html(self, db: BenchmarkResultsDB, run: sqlite3.Row, baseline_id: Optional[int]) -> str:
+        metrics = db.metrics_for_run(run['id'])
+        baseline = db.metrics_for_run(baseline_id) if baseline_id and baseline_id != run['id'] else {}
+        latency = metrics.get('latency_ms')
+        accuracy = metrics.get('accuracy')
+        throughput = metrics.get('throughput_per_s')
+
+        if latency:
+            latency_cell = f"{latency.mean:.1f} ± {latency.ci_high - latency.mean:.1f} ms"
+            p95_cell = f"{latency.p95:.1f} ms"
+        else:
+            latency_cell = p95_cell = '—'
+        accuracy_cell = f"{accuracy.mean * 100:.1f}%" if accuracy else '—'
+        throughput_cell = f"{throughput.mean:.1f}/s" if throughput else '—'
+        if latency and 'latency_ms' in baseline and baseline['latency_ms'].mean:
+            delta = (latency.mean - baseline['latency_ms'].mean) / baseline['latency_ms'].mean * 100
+            baseline_cell = f"{delta:+.1f}% vs #{baseline_id}"
+        elif baseline_id == run['id']:
+            baseline_cell = 'baseline'
+        else:
+            baseline_cell = '—'
+        trend = _sparkline(db.history(run['suite'], 'latency_ms'))
+        # Todo texto que viene de la base de resultados se escapa (errores con HTML, nombres arbitrarios)
+        status = html.escape(run['status'])
+        title = f' title="{html.escape(run["error"])}"' if run['error'] else ''
+        suite = html.escape(run['suite'].replace('_', ' '))
+        target = html.escape(run['target'])
+
+        return f"""
             <tr>
-                <td><strong>{result.benchmark_name.replace('_', ' ')}</strong></td>
-                <td class="vigoleonrocks-score">{result.vigoleonrocks_score}</td>
-                <td>{best_competitor[0]}: {best_competitor[1]}</td>
-                <td class="advantage">+{result.advantage_percentage}%</td>
-                <td>{result.execution_time_ms}ms</td>
-                <td class="status-{result.status.lower()}">{result.status}</td>
+                <td><strong>{suite}</strong><br><small>{target}</small></td>
+                <td class="vigoleonrocks-score">{latency_cell}</td>
+                <td>{p95_cell}</td>
+                <td>{accuracy_cell}</td>
+                <td>{throughput_cell}</td>
+                <td class="trend">{trend}</td>
+                <td class="advantage">{baseline_cell}</td>
+                <td class="status-{status.lower()}"{title}>{status}</td>
             </tr>
             """
-        
+
+    def _page(self, session_id: str, results_html: str, total: int, measured: int, regressions: int) -> str:
         return f"""<!DOCTYPE html>
 <html lang="es">
 <head>
@@ -270,17 +568,17 @@ class LiveBenchmarkExecutor:
             color: #ffffff;
             min-height: 100vh;
         }}
-        
+
         .container {{
             max-width: 1200px;
             margin: 0 auto;
         }}
-        
+
         .header {{
             text-align: center;
             margin-bottom: 40px;
         }}
-        
+
         .title {{
             font-size: 3rem;
             font-weight: 800;
@@ -290,13 +588,13 @@ class LiveBenchmarkExecutor:
             -webkit-text-fill-color: transparent;
             background-clip: text;
         }}
-        
+
         .subtitle {{
             font-size: 1.2rem;
             color: #b0b3b8;
             margin-bottom: 20px;
         }}
-        
+
         .session-info {{
             background: rgba(255, 255, 255, 0.05);
             padding: 20px;
@@ -306,74 +604,84 @@ class LiveBenchmarkExecutor:
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
         }}
-        
+
         .metric {{
             text-align: center;
         }}
-        
+
         .metric-value {{
             font-size: 2rem;
             font-weight: 700;
             color: #00d4ff;
         }}
-        
+
         .metric-label {{
             color: #b0b3b8;
             font-size: 0.9rem;
         }}
-        
+
         .benchmark-table {{
             background: rgba(255, 255, 255, 0.05);
             border-radius: 15px;
             overflow: hidden;
             margin: 40px 0;
         }}
-        
+
         .benchmark-table table {{
             width: 100%;
             border-collapse: collapse;
         }}
-        
+
         .benchmark-table th,
         .benchmark-table td {{
             padding: 15px;
             text-align: left;
             border-bottom: 1px solid rgba(255, 255, 255, 0.1);
         }}
-        
+
         .benchmark-table th {{
             background: rgba(0, 212, 255, 0.2);
             font-weight: 600;
         }}
-        
+
         .vigoleonrocks-score {{
             color: #4ecdc4;
             font-weight: 700;
             font-size: 1.1rem;
         }}
-        
+
         .advantage {{
             color: #00d4ff;
             font-weight: 600;
         }}
-        
-        .status-victory {{
+
+        .trend {{
+            font-family: monospace;
+            letter-spacing: 1px;
+        }}
+
+        .status-pass, .status-improved, .status-baseline {{
             color: #4ecdc4;
             font-weight: 600;
         }}
-        
-        .status-competitive {{
+
+        .status-regression, .status-error {{
+            color: #ff6b6b;
+            font-weight: 600;
+        }}
+
+        .status-skipped {{
             color: #ffa726;
             font-weight: 600;
         }}
-        
+
         .last-updated {{
             text-align: center;
             color: #666;
             margin-top: 40px;
             font-size: 0.9rem;
         }}
-        
+
         .auto-refresh {{
             position: fixed;
             top: 20px;
@@ -383,13 +691,13 @@ class LiveBenchmarkExecutor:
             border-radius: 20px;
             font-size: 0.8rem;
         }}
-        
+
         @keyframes pulse {{
             0% {{ opacity: 1; }}
             50% {{ opacity: 0.5; }}
             100% {{ opacity: 1; }}
         }}
-        
+
         .live-indicator {{
             animation: pulse 2s infinite;
             color: #4ecdc4;
@@ -401,41 +709,39 @@ class LiveBenchmarkExecutor:
     <div class="auto-refresh">
         🔴 <span class="live-indicator">LIVE</span> - Auto-refresh cada 30s
     </div>
-    
+
     <div class="container">
         <div class="header">
             <h1 class="title">VIGOleonRocks Live Benchmarks</h1>
-            <p class="subtitle">🏆 Liderando el mundo en IA Cuántica - Resultados en tiempo real</p>
+            <p class="subtitle">📏 Resultados medidos: media ± IC 95% sobre ensayos repetidos</p>
         </div>
-        
+
         <div class="session-info">
             <div class="metric">
-                <div class="metric-value">{report.victories}/{report.total_benchmarks}</div>
-                <div class="metric-label">Victorias</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value">+{report.average_advantage}%</div>
-                <div class="metric-label">Ventaja Promedio</div>
+                <div class="metric-value">{measured}/{total}</div>
+                <div class="metric-label">Suites Medidas</div>
             </div>
             <div class="metric">
-                <div class="metric-value">{len([r for r in report.results if r.advantage_percentage > 20])}</div>
-                <div class="metric-label">Victorias >20%</div>
+                <div class="metric-value">{regressions}</div>
+                <div class="metric-label">Regresiones</div>
             </div>
             <div class="metric">
                 <div class="metric-value">{datetime.now().strftime('%H:%M:%S')}</div>
                 <div class="metric-label">Última Actualización</div>
             </div>
         </div>
-        
+
         <div class="benchmark-table">
             <table>
                 <thead>
                     <tr>
                         <th>Benchmark</th>
-                        <th>VIGOleonRocks</th>
-                        <th>Mejor Competidor</th>
-                        <th>Ventaja</th>
-                        <th>Tiempo</th>
+                        <th>Latencia (media ± IC)</th>
+                        <th>p95</th>
+                        <th>Precisión</th>
+                        <th>Throughput</th>
+                        <th>Tendencia</th>
+                        <th>vs Baseline</th>
                         <th>Estado</th>
                     </tr>
                 </thead>
@@ -444,90 +750,334 @@ class LiveBenchmarkExecutor:
                 </tbody>
             </table>
         </div>
-        
+
         <div class="last-updated">
-            Sesión: {report.session_id} | Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | 
-            Sistema VIGOleonRocks v2.1.0-supreme
+            Sesión: {html.escape(session_id)} | Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} |
+            Base de resultados: {Path(DEFAULT_DB_PATH).name}
         </div>
     </div>
-    
+
     <script>
         // Auto-refresh cada 30 segundos
         setTimeout(() => {{
             window.location.reload();
         }}, 30000);
-        
-        // Mostrar estadísticas en tiempo real
-        console.log('VIGOleonRocks Live Benchmarks - Liderando la IA Cuántica mundial');
     </script>
 </body>
 </html>"""
 
+
+# ===== EJECUTOR =====
+
+class LiveBenchmarkExecutor:
+    def __init__(self, tasks_dir: Path = DEFAULT_TASKS_DIR, db_path: str = DEFAULT_DB_PATH,
+                 dashboard_path: str = DEFAULT_DASHBOARD_PATH, warmup: int = 1, trials: int = 5,
+                 base_url: str = DEFAULT_BASE_URL, http_timeout: float = 10.0,
+                 metric_policies: Optional[Dict[str, Tuple[bool, float]]] = None):
+        self.session_id = f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.results: List[BenchmarkResult] = []
+        self.benchmarks = load_suites(tasks_dir)
+        self.warmup = warmup
+        self.trials = max(1, trials)
+        self.base_url = base_url
+        self.http_timeout = http_timeout
+        self.metric_policies = metric_policies or METRIC_POLICIES
+        self.db = BenchmarkResultsDB(db_path)
+        self.dashboard = DashboardRenderer(dashboard_path)
+        self.targets: Dict[str, BenchmarkTarget] = {}
+
+        logger.info(f"🚀 Live Benchmark Executor iniciado - Sesión: {self.session_id} "
+                    f"({len(self.benchmarks)} suites, {self.warmup} warmup, {self.trials} ensayos)")
+
+    def register_target(self, name: str, target: BenchmarkTarget) -> None:
+        """Registra (o sustituye) el objetivo usado por las suites con ``target == name``"""
+        self.targets[name] = target
+
+    def _target_for(self, suite: BenchmarkSuite) -> BenchmarkTarget:
+        key = suite.name if suite.target == 'http' else suite.target
+        target = self.targets.get(key) or self.targets.get(suite.target)
+        if target is not None:
+            return target
+        if suite.target == 'http':
+            target = HttpTarget(suite.options.get('base_url', self.base_url), suite.options['endpoint'],
+                                suite.options.get('method', 'POST'), suite.options.get('payload'),
+                                suite.options.get('response_field', 'response'), self.http_timeout)
+        elif suite.target == 'unified':
+            target = UnifiedServiceTarget()
+        else:
+            target = EngineTarget(_engine_adapter(suite.target))
+        self.targets[key] = target
+        return target
+
+    @staticmethod
+    def _run_task(target: BenchmarkTarget, task: BenchmarkTask) -> Tuple[float, Optional[bool], Optional[str]]:
+        start = time.perf_counter()
+        try:
+            output, fields = target.run(task)
+            latency_ms = (time.perf_counter() - start) * 1000
+            return latency_ms, task.evaluate(output, fields), None
+        except Exception as e:
+            latency_ms = (time.perf_counter() - start) * 1000
+            return latency_ms, (None if task.check == 'none' else False), f"{type(e).__name__}: {e}"
+
+    def execute_benchmark(self, suite: BenchmarkSuite) -> BenchmarkResult:
+        """Ejecuta una suite: calentamiento, ensayos medidos, estadísticas y comparación con la baseline"""
+        started_at = datetime.now().isoformat()
+        start = time.perf_counter()
+        try:
+            target = self._target_for(suite)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.warning(f"⏭️  {suite.name}: objetivo '{suite.target}' no disponible ({error})")
+            run_id = self.db.record_run(self.session_id, suite.name, suite.target, started_at,
+                                        self.warmup, 0, 'SKIPPED', error)
+            return BenchmarkResult(started_at, suite.name, suite.target, run_id, 0, len(suite.tasks),
+                                   None, None, None, 0, {}, round((time.perf_counter() - start) * 1000, 1),
+                                   'SKIPPED', error)
+
+        for _ in range(self.warmup):
+            for task in suite.tasks:
+                self._run_task(target, task)
+
+        samples = []
+        trial_latency, trial_accuracy, trial_throughput = [], [], []
+        for trial in range(self.trials):
+            trial_start = time.perf_counter()
+            latencies, graded = [], []
+            for task in suite.tasks:
+                latency_ms, correct, error = self._run_task(target, task)
+                samples.append((trial, task.id, latency_ms, correct, error))
+                latencies.append(latency_ms)
+                if correct is not None:
+                    graded.append(correct)
+            elapsed = time.perf_counter() - trial_start
+            trial_latency.append(statistics.fmean(latencies))
+            trial_throughput.append(len(suite.tasks) / elapsed if elapsed > 0 else 0.0)
+            if graded:
+                trial_accuracy.append(sum(graded) / len(graded))
+
+        errors = sum(1 for sample in samples if sample[4])
+        first_error = next((sample[4] for sample in samples if sample[4]), None)
+        metrics = {
+            'latency_ms': MetricSummary.from_samples(trial_latency, [s[2] for s in samples]),
+            'throughput_per_s': MetricSummary.from_samples(trial_throughput),
+        }
+        if trial_accuracy:
+            metrics['accuracy'] = MetricSummary.from_samples(trial_accuracy)
+
+        comparison: Dict[str, str] = {}
+        if errors == len(samples):
+            status = 'ERROR'
+        else:
+            baseline_id = self.db.baseline_run(suite.name)
+            baseline = self.db.metrics_for_run(baseline_id) if baseline_id else {}
+            for name, current in metrics.items():
+                if name in baseline and name in self.metric_policies:
+                    higher_is_better, tolerance = self.metric_policies[name]
+                    comparison[name] = compare_to_baseline(current, baseline[name], higher_is_better, tolerance)
+            if not baseline_id:
+                status = 'BASELINE'
+            elif 'regression' in comparison.values():
+                status = 'REGRESSION'
+            elif 'improvement' in comparison.values():
+                status = 'IMPROVED'
+            else:
+                status = 'PASS'
+
+        run_id = self.db.record_run(self.session_id, suite.name, suite.target, started_at, self.warmup,
+                                    self.trials, status, first_error, comparison, samples, metrics)
+        if status == 'BASELINE':
+            self.db.set_baseline(suite.name, run_id)
+
+        latency = metrics['latency_ms']
+        result = BenchmarkResult(
+            timestamp=started_at,
+            benchmark_name=suite.name,
+            target=suite.target,
+            run_id=run_id,
+            trials=self.trials,
+            tasks=len(suite.tasks),
+            latency_ms=latency.to_dict(),
+            accuracy=metrics['accuracy'].to_dict() if 'accuracy' in metrics else None,
+            throughput_per_s=metrics['throughput_per_s'].to_dict(),
+            errors=errors,
+            comparison=comparison,
+            execution_time_ms=round((time.perf_counter() - start) * 1000, 1),
+            status=status,
+            error=first_error,
+        )
+        accuracy_text = f", precisión {result.accuracy['mean'] * 100:.1f}%" if result.accuracy else ''
+        logger.info(f"✅ {suite.name}: {latency.mean:.2f} ms [{latency.ci_low:.2f}, {latency.ci_high:.2f}]"
+                    f"{accuracy_text} → {status}")
+        return result
+
+    def run_single_benchmark(self, benchmark_name: str) -> BenchmarkResult:
+        """Ejecuta un benchmark individual"""
+        logger.info(f"🔄 Ejecutando {benchmark_name}...")
+
+        if benchmark_name not in self.benchmarks:
+            raise ValueError(f"Benchmark {benchmark_name} no encontrado")
+
+        result = self.execute_benchmark(self.benchmarks[benchmark_name])
+        self.results.append(result)
+        self.generate_live_dashboard()
+        return result
+
+    def run_all_benchmarks(self) -> LiveBenchmarkReport:
+        """Ejecuta todas las suites secuencialmente; el dashboard se actualiza tras cada una"""
+        logger.info("🚀 Iniciando suite completa de benchmarks...")
+        start_time = datetime.now()
+
+        for benchmark_name in self.benchmarks:
+            self.run_single_benchmark(benchmark_name)
+
+        report = LiveBenchmarkReport(
+            session_id=self.session_id,
+            start_time=start_time.isoformat(),
+            total_benchmarks=len(self.results),
+            regressions=sum(r.status == 'REGRESSION' for r in self.results),
+            skipped=sum(r.status == 'SKIPPED' for r in self.results),
+            results=self.results
+        )
+
+        logger.info(f"🏁 Suite completada: {report.total_benchmarks} benchmarks, "
+                    f"{report.regressions} regresiones, {report.skipped} omitidos")
+        return report
+
+    def run_continuous_benchmarking(self, interval_minutes: int = 30):
+        """Ejecuta benchmarks continuamente en intervalo especificado"""
+        logger.info(f"🔄 Iniciando benchmarking continuo cada {interval_minutes} minutos...")
+
+        def benchmark_loop():
+            while True:
+                try:
+                    # Limpiar resultados anteriores para nueva ronda
+                    self.results = []
+                    self.session_id = f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+                    # Ejecutar suite completa (el dashboard se renderiza suite a suite)
+                    report = self.run_all_benchmarks()
+
+                    # Guardar reporte
+                    self.save_report(report)
+
+                    logger.info(f"⏰ Próxima ejecución en {interval_minutes} minutos...")
+                    time.sleep(interval_minutes * 60)
+
+                except Exception as e:
+                    logger.error(f"❌ Error en benchmark continuo: {e}")
+                    time.sleep(60)  # Esperar 1 minuto antes de reintentar
+
+        # Ejecutar en thread separado para no bloquear
+        benchmark_thread = threading.Thread(target=benchmark_loop, daemon=True)
+        benchmark_thread.start()
+        return benchmark_thread
+
+    def save_report(self, report: LiveBenchmarkReport):
+        """Guarda reporte en JSON"""
+        filename = f"benchmark_report_{report.session_id}.json"
+
+        report_dict = asdict(report)
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report_dict, f, indent=2, ensure_ascii=False)
+
+        logger.info(f"💾 Reporte guardado: {filename}")
+
+    def generate_live_dashboard(self, report: Optional[LiveBenchmarkReport] = None):
+        """Renderiza el dashboard HTML desde la base de resultados"""
+        filename = self.dashboard.render(self.db, self.session_id)
+        logger.info(f"📊 Dashboard actualizado: {filename}")
+        return filename
+
+    def set_baseline(self, benchmark_name: str, run_id: Optional[int] = None) -> Optional[int]:
+        """Promueve una ejecución (por defecto la última) a baseline de la suite"""
+        run_id = self.db.set_baseline(benchmark_name, run_id)
+        if run_id is not None:
+            logger.info(f"📌 Baseline de {benchmark_name}: ejecución #{run_id}")
+        return run_id
+
     def get_summary_stats(self) -> Dict[str, Any]:
         """Obtiene estadísticas resumen de la sesión actual"""
-        if not self.results:
+        measured = [r for r in self.results if r.latency_ms]
+        if not measured:
             return {"error": "No hay resultados disponibles"}
-        
-        victories = len([r for r in self.results if r.status == "VICTORY"])
-        avg_advantage = sum(r.advantage_percentage for r in self.results) / len(self.results)
-        best_benchmark = max(self.results, key=lambda r: r.advantage_percentage)
-        avg_execution_time = sum(r.execution_time_ms for r in self.results) / len(self.results)
-        
+
+        slowest = max(measured, key=lambda r: r.latency_ms['mean'])
+
         return {
             "session_id": self.session_id,
             "total_benchmarks": len(self.results),
-            "victories": victories,
-            "victory_rate": round((victories / len(self.results)) * 100, 1),
-            "average_advantage": round(avg_advantage, 1),
-            "best_benchmark": {
-                "name": best_benchmark.benchmark_name,
-                "advantage": best_benchmark.advantage_percentage
+            "measured": len(measured),
+            "regressions": [r.benchmark_name for r in self.results if r.status == 'REGRESSION'],
+            "skipped": [r.benchmark_name for r in self.results if r.status == 'SKIPPED'],
+            "slowest_benchmark": {
+                "name": slowest.benchmark_name,
+                "latency_ms": slowest.latency_ms['mean']
             },
-            "average_execution_time_ms": round(avg_execution_time, 1)
+            "average_latency_ms": round(statistics.fmean(r.latency_ms['mean'] for r in measured), 2)
         }
 
+    def close(self) -> None:
+        for target in self.targets.values():
+            target.close()
+        self.db.close()
+
 # Función principal para ejecución standalone
 def main():
-    executor = LiveBenchmarkExecutor()
-    
+    executor = LiveBenchmarkExecutor(
+        warmup=int(os.getenv('LIVE_BENCHMARK_WARMUP', '1')),
+        trials=int(os.getenv('LIVE_BENCHMARK_TRIALS', '5')),
+    )
+
     if len(sys.argv) > 1:
         mode = sys.argv[1].lower()
-        
+
         if mode == "single":
-            benchmark_name = sys.argv[2] if len(sys.argv) > 2 else "LiveCodeBench_v8"
+            benchmark_name = sys.argv[2] if len(sys.argv) > 2 else next(iter(executor.benchmarks))
             result = executor.run_single_benchmark(benchmark_name)
-            print(json.dumps(asdict(result), indent=2))
-            
+            print(json.dumps(asdict(result), indent=2, ensure_ascii=False))
+
         elif mode == "continuous":
             interval = int(sys.argv[2]) if len(sys.argv) > 2 else 30
             thread = executor.run_continuous_benchmarking(interval)
-            
+
             try:
                 while True:
                     time.sleep(60)
             except KeyboardInterrupt:
                 logger.info("🛑 Benchmarking continuo detenido")
-                
+
         elif mode == "report":
             report = executor.run_all_benchmarks()
             executor.save_report(report)
-            executor.generate_live_dashboard(report)
-            print(json.dumps(asdict(report), indent=2))
+            print(json.dumps(asdict(report), indent=2, ensure_ascii=False))
+
+        elif mode == "baseline":
+            names = sys.argv[2:3] or list(executor.benchmarks)
+            run_id = int(sys.argv[3]) if len(sys.argv) > 3 else None
+            for name in names:
+                executor.set_baseline(name, run_id)
+            executor.generate_live_dashboard()
     else:
         # Modo por defecto: ejecutar todo y mostrar stats
         report = executor.run_all_benchmarks()
         executor.save_report(report)
-        executor.generate_live_dashboard(report)
-        
+
         stats = executor.get_summary_stats()
         print("\n🏆 RESUMEN DE BENCHMARKS VIGOLEONROCKS")
         print("=" * 50)
-        print(f"Sesión: {stats['session_id']}")
-        print(f"Victorias: {stats['victories']}/{stats['total_benchmarks']} ({stats['victory_rate']}%)")
-        print(f"Ventaja promedio: +{stats['average_advantage']}%")
-        print(f"Mejor resultado: {stats['best_benchmark']['name']} (+{stats['best_benchmark']['advantage']}%)")
-        print(f"Tiempo promedio: {stats['average_execution_time_ms']}ms")
-        print("\n📊 Dashboard generado: vigoleonrocks_live_benchmarks.html")
+        if 'error' in stats:
+            print(stats['error'])
+        else:
+            print(f"Sesión: {stats['session_id']}")
+            print(f"Suites medidas: {stats['measured']}/{stats['total_benchmarks']}")
+            print(f"Regresiones: {', '.join(stats['regressions']) or 'ninguna'}")
+            print(f"Omitidas: {', '.join(stats['skipped']) or 'ninguna'}")
+            print(f"Más lenta: {stats['slowest_benchmark']['name']} ({stats['slowest_benchmark']['latency_ms']:.2f} ms)")
+            print(f"Latencia media: {stats['average_latency_ms']} ms")
+        print(f"\n📊 Dashboard generado: {executor.dashboard.path}")
+    executor.close()
 
 if __name__ == "__main__":
     main()
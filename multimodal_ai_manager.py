@@ -8,6 +8,7 @@ import os
 import gc
 import time
 import asyncio
+import itertools
 import logging
 import warnings
 from pathlib import Path
@@ -15,6 +16,16 @@ from typing import Dict, List, Optional, Union, Any
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 import threading
+import uuid
+
+from vigoleonrocks.services.audio_pipeline import (
+    DEFAULT_CONCURRENCY as AUDIO_WINDOW_CONCURRENCY, SAMPLE_RATE as AUDIO_SAMPLE_RATE,
+    AudioWindow, StreamingTranscriber, TranscriptionStats, decode_pcm16k_bytes,
+)
+from vigoleonrocks.services.embedding_index import DEFAULT_REUSE_THRESHOLD, get_embedding_index
+from vigoleonrocks.services.health_probes import CountingThreadPoolExecutor
+from vigoleonrocks.services.micro_batcher import MicroBatcher
+from vigoleonrocks.services.model_residency import ModelResidencyManager
 
 # Suprimir warnings innecesarios
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -70,6 +81,13 @@ from datetime import datetime
 import hashlib
 import json
 
+# Pesos safetensors mapeados en memoria (recarga rápida tras expulsar un modelo)
+MODEL_MMAP_WEIGHTS = os.getenv('MODEL_MMAP_WEIGHTS', 'false').lower() == 'true'
+
+# Profundidad de cada tipo de análisis de imagen según los modelos que ejecuta
+# (moondream2 < + Florence-2 < + BLIP-2); "fast", "quick", "basic"... = 0
+IMAGE_ANALYSIS_DEPTH = {"detailed": 1, "comprehensive": 2}
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -94,6 +112,15 @@ class ModelConfig:
     max_memory: Optional[str] = None
     cache_dir: Optional[str] = None
     enabled: bool = True
+    params_millions: Optional[float] = None  # tamaño aproximado para la primera carga
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Huella estimada antes de medirla (parámetros x bytes por parámetro)"""
+        if not self.params_millions:
+            return 0
+        bytes_per_param = {"fp16": 2, "int8": 1}.get(self.precision, 4)
+        return int(self.params_millions * 1e6 * bytes_per_param)
 
 @dataclass 
 class AnalysisResult:
@@ -126,8 +153,8 @@ class MultimodalAIManager:
         self._model_lock = threading.Lock()
         self.model_configs = self._get_model_configurations()
         
-        # Un nuevo diccionario para rastrear qué modelos ya se están cargando
-        self._loading_models = {}
+        # Último error de carga por modelo (lo consulta el probe /readyz)
+        self.load_errors: Dict[str, str] = {}
         
         # Estadísticas de uso y thread pool
         self.usage_stats = {
@@ -136,7 +163,27 @@ class MultimodalAIManager:
             'processing_times': {}
         }
         
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        # Cuenta su cola para el check thread_pool de /readyz
+        self.executor = CountingThreadPoolExecutor(max_workers=4)
+        
+        # Residencia LRU con presupuesto de RAM (MODEL_MEMORY_BUDGET_MB): carga en
+        # executor, futuros compartidos entre quienes esperan y expulsión de lo menos usado
+        self.residency = ModelResidencyManager(
+            loader=self._load_model_blocking,
+            unloader=self._unload_model_blocking,
+            sizer=self._model_footprint,
+            estimates={k: c.estimated_bytes for k, c in self.model_configs.items()},
+        )
+        
+        # Micro-batching: las peticiones concurrentes comparten una pasada de CLIP/BLIP-2
+        self.batchers = {
+            "clip_vit": MicroBatcher("clip_vit", self._clip_embeddings_batch),
+            "blip2": MicroBatcher("blip2", self._blip_caption_batch),
+        }
+        
+        # Ventanas de audio transcribiéndose en paralelo (AUDIO_WINDOW_CONCURRENCY)
+        self.audio_executor = ThreadPoolExecutor(max_workers=AUDIO_WINDOW_CONCURRENCY,
+                                                 thread_name_prefix='transcribe')
         
         logger.info("✅ MultimodalAIManager inicializado con carga diferida (lazy loading).")
 
@@ -163,6 +210,7 @@ class MultimodalAIManager:
             # 🖼️ VISION-LANGUAGE MODELS
             "moondream2": ModelConfig(
                 name="Moondream2",
+                params_millions=1900,
                 model_id="vikhyatk/moondream2",
                 task="vision_language",
                 device=self.device,
@@ -171,6 +219,7 @@ class MultimodalAIManager:
             
             "florence2": ModelConfig(
                 name="Florence-2",
+                params_millions=770,
                 model_id="microsoft/Florence-2-large",
                 task="vision_detailed",
                 device=self.device,
@@ -179,6 +228,7 @@ class MultimodalAIManager:
             
             "qwen2_vl": ModelConfig(
                 name="Qwen2-VL",
+                params_millions=8300,
                 model_id="Qwen/Qwen2-VL-7B-Instruct",
                 task="vision_reasoning", 
                 device=self.device,
@@ -189,6 +239,7 @@ class MultimodalAIManager:
             # 🎤 AUDIO MODELS
             "whisper_large": ModelConfig(
                 name="Whisper Large V3",
+                params_millions=1550,
                 model_id="openai/whisper-large-v3",
                 task="speech_to_text",
                 device=self.device,
@@ -197,6 +248,7 @@ class MultimodalAIManager:
             
             "whisper_medium": ModelConfig(
                 name="Whisper Medium",
+                params_millions=769,
                 model_id="openai/whisper-medium",
                 task="speech_to_text", 
                 device=self.device,
@@ -206,6 +258,7 @@ class MultimodalAIManager:
             # 🔗 MULTIMODAL EMBEDDINGS
             "clip_vit": ModelConfig(
                 name="CLIP ViT-L/14",
+                params_millions=428,
                 model_id="openai/clip-vit-large-patch14",
                 task="multimodal_embeddings",
                 device=self.device,
@@ -216,6 +269,7 @@ class MultimodalAIManager:
             # 📝 TEXT PROCESSING
             "blip2": ModelConfig(
                 name="BLIP-2",
+                params_millions=3900,
                 model_id="Salesforce/blip2-opt-2.7b",
                 task="image_captioning",
                 device=self.device,
@@ -224,80 +278,93 @@ class MultimodalAIManager:
         }
 
     async def ensure_model_loaded(self, model_key: str) -> bool:
-        """Garantiza que un modelo esté cargado, usando lazy loading."""
-        if model_key in self.models:
-            return True
-        
-        # Evitar carga concurrente del mismo modelo
-        with self._model_lock:
-            if model_key in self._loading_models:
-                # Esperar a que otro hilo termine de cargar
-                while model_key in self._loading_models:
-                    await asyncio.sleep(1)
-                return model_key in self.models # Devolver estado final
+        """Garantiza que un modelo esté residente (carga diferida dentro del presupuesto de memoria)"""
+        return await self.residency.ensure(model_key)
 
-            self._loading_models[model_key] = True
-        
-        try:
-            return await self.load_model(model_key)
-        finally:
-            # Marcar como finalizada la carga (exitosa o no)
-            with self._model_lock:
-                if model_key in self._loading_models:
-                    del self._loading_models[model_key]
+    def use_model(self, model_key: str):
+        """``async with manager.use_model(key) as loaded:`` carga y fija el modelo durante la inferencia"""
+        return self.residency.use(model_key)
 
     async def load_model(self, model_key: str, force_reload: bool = False) -> bool:
         """Carga un modelo específico de forma asíncrona"""
+        if force_reload:
+            self.residency.evict(model_key)
+        return await self.residency.ensure(model_key)
+
+    def _load_model_blocking(self, model_key: str) -> Any:
+        """Carga síncrona llamada por el gestor de residencia desde su executor"""
         if model_key not in self.model_configs:
             logger.error(f"❌ Modelo no encontrado: {model_key}")
-            return False
+            raise KeyError(model_key)
         
         config = self.model_configs[model_key]
         
         if not config.enabled:
             logger.warning(f"⚠️ Modelo deshabilitado: {model_key}")
-            return False
-        
-        # Verificar si ya está cargado
-        if model_key in self.models and not force_reload:
-            logger.info(f"♻️ Modelo ya cargado: {model_key}")
-            return True
+            raise RuntimeError(f"Modelo deshabilitado: {model_key}")
         
+        try:
+            start_time = time.time()
+            logger.info(f"📦 Cargando modelo: {config.name} ({config.model_id})")
+            
+            # Configurar opciones de carga según el modelo
+            load_options = {
+                "cache_dir": str(self.cache_dir),
+                "torch_dtype": torch.float16 if config.precision == "fp16" and self.device == "cuda" else torch.float32,
+                "device_map": "auto" if self.device == "cuda" else None,
+                "trust_remote_code": True
+            }
+            if MODEL_MMAP_WEIGHTS:
+                # safetensors se mapea en memoria: una recarga tras expulsión sale de la page cache
+                load_options.update(use_safetensors=True, low_cpu_mem_usage=True)
+            
+            # Carga específica por tipo de modelo
+            if "whisper" in model_key:
+                self._load_whisper_model(model_key, config, load_options)
+            elif "clip" in model_key:
+                self._load_clip_model(model_key, config, load_options)
+            elif model_key in ["moondream2", "florence2", "qwen2_vl"]:
+                self._load_vision_language_model(model_key, config, load_options)
+            elif "blip" in model_key:
+                self._load_blip_model(model_key, config, load_options)
+            
+            load_time = time.time() - start_time
+            self.usage_stats['models_loaded'] += 1
+            self.usage_stats['processing_times'][model_key] = load_time
+            self.load_errors.pop(model_key, None)
+            
+            logger.info(f"✅ Modelo cargado exitosamente: {config.name} ({load_time:.2f}s)")
+            return self.models.get(model_key)
+            
+        except Exception as e:
+            logger.error(f"❌ Error cargando modelo {model_key}: {str(e)}")
+            self.load_errors[model_key] = str(e)
+            raise
+
+    def _model_footprint(self, model_key: str, value: Any) -> int:
+        """Bytes de parámetros y buffers de los módulos torch del modelo (0 = medir por RSS)"""
+        total = 0
+        for store in (self.models, self.processors, self.tokenizers):
+            module = store.get(model_key)
+            if isinstance(module, torch.nn.Module):
+                for tensor in itertools.chain(module.parameters(), module.buffers()):
+                    total += tensor.numel() * tensor.element_size()
+        return total
+
+    def _unload_model_blocking(self, model_key: str) -> None:
+        """Libera las referencias del modelo (llamado por el gestor de residencia al expulsar)"""
         with self._model_lock:
-            try:
-                start_time = time.time()
-                logger.info(f"📦 Cargando modelo: {config.name} ({config.model_id})")
-                
-                # Configurar opciones de carga según el modelo
-                load_options = {
-                    "cache_dir": str(self.cache_dir),
-                    "torch_dtype": torch.float16 if config.precision == "fp16" and self.device == "cuda" else torch.float32,
-                    "device_map": "auto" if self.device == "cuda" else None,
-                    "trust_remote_code": True
-                }
-                
-                # Carga específica por tipo de modelo
-                if "whisper" in model_key:
-                    await self._load_whisper_model(model_key, config, load_options)
-                elif "clip" in model_key:
-                    await self._load_clip_model(model_key, config, load_options)
-                elif model_key in ["moondream2", "florence2", "qwen2_vl"]:
-                    await self._load_vision_language_model(model_key, config, load_options)
-                elif "blip" in model_key:
-                    await self._load_blip_model(model_key, config, load_options)
-                
-                load_time = time.time() - start_time
-                self.usage_stats['models_loaded'] += 1
-                self.usage_stats['processing_times'][model_key] = load_time
-                
-                logger.info(f"✅ Modelo cargado exitosamente: {config.name} ({load_time:.2f}s)")
-                return True
-                
-            except Exception as e:
-                logger.error(f"❌ Error cargando modelo {model_key}: {str(e)}")
-                return False
+            self.models.pop(model_key, None)
+            self.processors.pop(model_key, None)
+            self.tokenizers.pop(model_key, None)
+        
+        gc.collect()
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+        
+        logger.info(f"🗑️ Modelo descargado: {model_key}")
 
-    async def _load_whisper_model(self, model_key: str, config: ModelConfig, options: Dict):
+    def _load_whisper_model(self, model_key: str, config: ModelConfig, options: Dict):
         """Carga modelo Whisper para transcripción de audio"""
         if AUDIO_AVAILABLE:
             try:
@@ -319,7 +386,7 @@ class MultimodalAIManager:
         else:
             raise ImportError("Bibliotecas de audio no disponibles")
 
-    async def _load_clip_model(self, model_key: str, config: ModelConfig, options: Dict):
+    def _load_clip_model(self, model_key: str, config: ModelConfig, options: Dict):
         """Carga modelo CLIP para embeddings multimodales con fallback robusto"""
         if not CLIP_AVAILABLE:
             logger.error(f"❌ CLIP no disponible - no se puede cargar {model_key}")
@@ -352,17 +419,14 @@ class MultimodalAIManager:
                 logger.error(f"❌ Error en ambos intentos de CLIP: {e} | {fallback_error}")
                 raise fallback_error
 
-    async def _load_vision_language_model(self, model_key: str, config: ModelConfig, options: Dict):
+    def _load_vision_language_model(self, model_key: str, config: ModelConfig, options: Dict):
         """Carga modelos de visión-lenguaje avanzados"""
         try:
             # Configuración específica por modelo
             if model_key == "moondream2":
-                # Modelo ligero y eficiente
-                self.models[model_key] = AutoModel.from_pretrained(
-                    config.model_id, 
-                    **options,
-                    low_cpu_mem_usage=True
-                ).to(self.device)
+                # Modelo ligero y eficiente (con MODEL_MMAP_WEIGHTS la opción ya viene puesta)
+                options.setdefault('low_cpu_mem_usage', True)
+                self.models[model_key] = AutoModel.from_pretrained(config.model_id, **options).to(self.device)
                 self.tokenizers[model_key] = AutoTokenizer.from_pretrained(config.model_id)
                 
             elif model_key == "florence2":
@@ -389,7 +453,7 @@ class MultimodalAIManager:
             logger.error(f"Error cargando modelo de visión {model_key}: {e}")
             raise
 
-    async def _load_blip_model(self, model_key: str, config: ModelConfig, options: Dict):
+    def _load_blip_model(self, model_key: str, config: ModelConfig, options: Dict):
         """Carga modelo BLIP para descripción de imágenes"""
         self.processors[model_key] = BlipProcessor.from_pretrained(config.model_id, **options)
         self.models[model_key] = BlipForConditionalGeneration.from_pretrained(
@@ -420,21 +484,58 @@ class MultimodalAIManager:
             
             results = {}
             
+            # Cada modelo queda fijado mientras se usa: el presupuesto de memoria
+            # no puede expulsarlo a mitad de la inferencia
+            # Embeddings CLIP primero: una subida casi idéntica a otra ya
+            # analizada reutiliza su análisis sin pasar por el resto de modelos
+            vector = None
+            async with self.use_model("clip_vit") as loaded:
+                if loaded:
+                    results["embeddings"] = await self._get_image_embeddings(image)
+                    vector = results["embeddings"].pop("vector", None)
+            
+            if vector is not None:
+                # Sólo vale un análisis previo al menos tan profundo como el pedido
+                depth = IMAGE_ANALYSIS_DEPTH.get(analysis_type, 0)
+                previous = get_embedding_index().near_duplicate(
+                    vector, DEFAULT_REUSE_THRESHOLD,
+                    accept=lambda meta: bool(meta.get("content"))
+                    and IMAGE_ANALYSIS_DEPTH.get(meta.get("analysis_type"), 0) >= depth
+                )
+                if previous is not None:
+                    self.usage_stats['total_inferences'] += 1
+                    return AnalysisResult(
+                        content=previous["meta"]["content"],
+                        confidence=previous["meta"].get("confidence", 0.85),
+                        metadata={
+                            "image_size": image.size,
+                            "analysis_id": previous["id"],
+                            "reused_from": previous["id"],
+                            "similarity": previous["score"],
+                            "analysis_type": analysis_type,
+                            "device": self.device
+                        },
+                        processing_time=time.time() - start_time,
+                        model_used="embedding_index_reuse",
+                        timestamp=datetime.now().isoformat()
+                    )
+            
             # Análisis rápido con moondream2 (siempre disponible)
-            if await self.ensure_model_loaded("moondream2"):
-                results["description"] = await self._analyze_with_moondream(image)
+            async with self.use_model("moondream2") as loaded:
+                if loaded:
+                    results["description"] = await self._analyze_with_moondream(image)
             
             # Análisis detallado con Florence-2
-            if analysis_type in ["comprehensive", "detailed"] and await self.ensure_model_loaded("florence2"):
-                results["detailed_analysis"] = await self._analyze_with_florence(image)
-            
-            # Análisis de embeddings con CLIP
-            if await self.ensure_model_loaded("clip_vit"):
-                results["embeddings"] = await self._get_image_embeddings(image)
+            if analysis_type in ["comprehensive", "detailed"]:
+                async with self.use_model("florence2") as loaded:
+                    if loaded:
+                        results["detailed_analysis"] = await self._analyze_with_florence(image)
             
             # Descripción con BLIP-2
-            if analysis_type == "comprehensive" and await self.ensure_model_loaded("blip2"):
-                results["caption"] = await self._generate_caption_blip(image)
+            if analysis_type == "comprehensive":
+                async with self.use_model("blip2") as loaded:
+                    if loaded:
+                        results["caption"] = await self._generate_caption_blip(image)
             
             # Combinar resultados
             final_description = self._combine_image_analysis_results(results)
@@ -442,11 +543,21 @@ class MultimodalAIManager:
             processing_time = time.time() - start_time
             self.usage_stats['total_inferences'] += 1
             
+            analysis_id = uuid.uuid4().hex
+            if vector is not None:
+                get_embedding_index().add(vector, analysis_id, {
+                    "content": final_description,
+                    "confidence": 0.85,
+                    "analysis_type": analysis_type,
+                    "created_at": datetime.now().isoformat()
+                })
+            
             return AnalysisResult(
                 content=final_description,
                 confidence=0.85,  # Calculado basado en resultados
                 metadata={
                     "image_size": image.size,
+                    "analysis_id": analysis_id,
                     "models_used": list(results.keys()),
                     "analysis_type": analysis_type,
                     "device": self.device
@@ -496,46 +607,60 @@ class MultimodalAIManager:
             return "Error en análisis detallado"
 
     async def _get_image_embeddings(self, image: Image.Image) -> Dict[str, Any]:
-        """Genera embeddings multimodales con CLIP"""
+        """Genera embeddings multimodales con CLIP (en micro-batch con otras peticiones)"""
         try:
-            model = self.models["clip_vit"]
-            preprocess = self.processors["clip_vit"]
-            
-            with torch.no_grad():
-                image_tensor = preprocess(image).unsqueeze(0).to(self.device)
-                image_features = model.encode_image(image_tensor)
-                
-                # Normalizar embeddings
-                image_features = F.normalize(image_features, dim=-1)
-                
-                return {
-                    "embeddings_shape": list(image_features.shape),
-                    "embeddings_norm": float(torch.norm(image_features).item()),
-                    "available": True
-                }
-                
+            return await self.batchers["clip_vit"].submit(image)
         except Exception as e:
             logger.error(f"Error generando embeddings: {e}")
             return {"available": False, "error": str(e)}
 
+    def _clip_embeddings_batch(self, images: List[Image.Image]) -> List[Dict[str, Any]]:
+        """Una pasada de CLIP para todo el batch (entradas 224x224, se apilan sin relleno)"""
+        model = self.models["clip_vit"]
+        preprocess = self.processors["clip_vit"]
+        
+        with torch.no_grad():
+            image_tensor = torch.stack([preprocess(image) for image in images]).to(self.device)
+            image_features = model.encode_image(image_tensor)
+            
+            # Normalizar embeddings
+            image_features = F.normalize(image_features, dim=-1)
+        
+        return [{
+            "embeddings_shape": [1, features.shape[-1]],
+            "embeddings_norm": float(torch.norm(features).item()),
+            "vector": features.float().cpu().numpy(),  # lo retira analyze_image antes de responder
+            "available": True
+        } for features in image_features]
+
+    async def embed_image(self, image: Image.Image) -> Optional[np.ndarray]:
+        """Vector CLIP normalizado de ``image`` (``None`` si CLIP no está disponible)"""
+        async with self.use_model("clip_vit") as loaded:
+            if not loaded:
+                return None
+            embeddings = await self._get_image_embeddings(image.convert("RGB"))
+        return embeddings.get("vector")
+
     async def _generate_caption_blip(self, image: Image.Image) -> str:
-        """Genera caption con BLIP-2"""
+        """Genera caption con BLIP-2 (en micro-batch con otras peticiones)"""
         try:
-            processor = self.processors["blip2"]
-            model = self.models["blip2"]
-            
-            inputs = processor(images=image, return_tensors="pt").to(self.device)
-            
-            with torch.no_grad():
-                generated_ids = model.generate(**inputs, max_length=50)
-                caption = processor.decode(generated_ids[0], skip_special_tokens=True)
-            
-            return caption
-            
+            return await self.batchers["blip2"].submit(image)
         except Exception as e:
             logger.error(f"Error en BLIP-2: {e}")
             return "Error generando caption"
 
+    def _blip_caption_batch(self, images: List[Image.Image]) -> List[str]:
+        """Una llamada a ``generate`` para todo el batch; el processor redimensiona y apila"""
+        processor = self.processors["blip2"]
+        model = self.models["blip2"]
+        
+        inputs = processor(images=images, return_tensors="pt").to(self.device)
+        
+        with torch.no_grad():
+            generated_ids = model.generate(**inputs, max_length=50)
+        
+        return processor.batch_decode(generated_ids, skip_special_tokens=True)
+
     def _combine_image_analysis_results(self, results: Dict[str, str]) -> str:
         """Combina resultados de múltiples modelos en una descripción coherente"""
         if not results:
@@ -560,14 +685,58 @@ class MultimodalAIManager:
         
         return combined
 
+    def _window_transcriber(self, model_key: str, language: str, info: Dict[str, Any]):
+        """Función de transcripción de una ventana PCM 16 kHz para ``StreamingTranscriber``"""
+        model = self.models[model_key]
+        whisper_language = None if language == "auto" else language
+        
+        if hasattr(model, 'transcribe'):  # whisper nativo
+            def transcribe_window(window: AudioWindow):
+                result = model.transcribe(
+                    window.to_float32(),
+                    language=whisper_language,
+                    task="transcribe",
+                    condition_on_previous_text=False  # cada ventana es independiente
+                )
+                info.setdefault("detected_language", result.get("language", "unknown"))
+                return [(seg["start"], seg["end"], seg["text"]) for seg in result.get("segments", [])] \
+                    or result["text"]
+            info["confidence"] = 0.9  # Whisper es muy confiable
+        else:  # transformers whisper
+            processor = self.processors[model_key]
+            
+            def transcribe_window(window: AudioWindow):
+                inputs = processor(
+                    window.to_float32(),
+                    sampling_rate=AUDIO_SAMPLE_RATE,
+                    return_tensors="pt"
+                ).to(self.device)
+                with torch.no_grad():
+                    generated_ids = model.generate(**inputs)
+                return processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+            info["detected_language"] = language if language != "auto" else "es"
+            info["confidence"] = 0.85
+        return transcribe_window
+
+    def _streaming_transcriber(self, model_key: str, language: str, info: Dict[str, Any]) -> StreamingTranscriber:
+        return StreamingTranscriber(self._window_transcriber(model_key, language, info),
+                                    concurrency=AUDIO_WINDOW_CONCURRENCY, executor=self.audio_executor)
+
+    def _whisper_model_key(self) -> str:
+        return "whisper_large" if self.device == "cuda" else "whisper_medium"
+
     async def transcribe_audio(self, audio_data: Union[str, bytes], 
-                              language: str = "auto") -> AnalysisResult:
+                              language: str = "auto", pcm16k: bool = False) -> AnalysisResult:
         """
-        Transcripción de audio usando Whisper
+        Transcripción de audio usando Whisper por ventanas de voz
+        
+        El audio se decodifica en memoria (sin archivo temporal), el silencio se
+        descarta con VAD y las ventanas solapadas se transcriben en paralelo.
         
         Args:
-            audio_data: Audio en formato de archivo o bytes
+            audio_data: Ruta de archivo, bytes del archivo o PCM int16 16 kHz mono
             language: Idioma para transcripción ("auto" para detección automática)
+            pcm16k: ``audio_data`` ya es PCM 16 kHz (p. ej. de ``_extract_audio``)
         """
         start_time = time.time()
         
@@ -581,11 +750,13 @@ class MultimodalAIManager:
                 timestamp=datetime.now().isoformat()
             )
         
+        # Cargar modelo Whisper óptimo (fijado hasta terminar la transcripción)
+        model_key = self._whisper_model_key()
+        pinned = False
+        
         try:
-            # Cargar modelo Whisper óptimo
-            model_key = "whisper_large" if self.device == "cuda" else "whisper_medium"
-            
-            if not await self.ensure_model_loaded(model_key):
+            pinned = await self.residency.acquire(model_key)
+            if not pinned:
                 return AnalysisResult(
                     content="Error cargando modelo de transcripción",
                     confidence=0.0,
@@ -595,66 +766,24 @@ class MultimodalAIManager:
                     timestamp=datetime.now().isoformat()
                 )
             
-            # Procesar audio
-            if isinstance(audio_data, str):
-                # Es un path de archivo
-                audio_path = audio_data
-            else:
-                # Es bytes - guardar temporalmente
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                    tmp.write(audio_data)
-                    audio_path = tmp.name
-            
-            # Transcribir con Whisper
-            model = self.models[model_key]
-            
-            if hasattr(model, 'transcribe'):  # whisper nativo
-                result = model.transcribe(
-                    audio_path,
-                    language=None if language == "auto" else language,
-                    task="transcribe"
-                )
-                
-                transcription = result["text"]
-                detected_language = result.get("language", "unknown")
-                confidence = 0.9  # Whisper es muy confiable
-                
-            else:  # transformers whisper
-                processor = self.processors[model_key]
-                
-                # Cargar y procesar audio
-                audio_array, sampling_rate = librosa.load(audio_path, sr=16000)
-                
-                inputs = processor(
-                    audio_array,
-                    sampling_rate=sampling_rate,
-                    return_tensors="pt"
-                ).to(self.device)
-                
-                with torch.no_grad():
-                    generated_ids = model.generate(**inputs)
-                    transcription = processor.batch_decode(
-                        generated_ids, skip_special_tokens=True
-                    )[0]
-                
-                detected_language = language if language != "auto" else "es"
-                confidence = 0.85
-            
-            # Limpiar archivo temporal si fue creado
-            if isinstance(audio_data, bytes):
-                os.unlink(audio_path)
+            info: Dict[str, Any] = {}
+            transcriber = self._streaming_transcriber(model_key, language, info)
+            chunks = iter([audio_data]) if pcm16k else None
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, transcriber.transcribe, audio_data, chunks)
             
             processing_time = time.time() - start_time
             self.usage_stats['total_inferences'] += 1
             
             return AnalysisResult(
-                content=transcription,
-                confidence=confidence,
+                content=result.text,
+                confidence=info.get("confidence", 0.9),
                 metadata={
-                    "detected_language": detected_language,
+                    "detected_language": info.get("detected_language", "unknown"),
                     "model_used": model_key,
-                    "audio_duration": "unknown",  # Se podría calcular
+                    "audio_duration": round(result.stats.audio_s, 3),
+                    "segments": [segment.as_dict() for segment in result.segments],
+                    "pipeline": result.stats.as_dict(),
                     "device": self.device
                 },
                 processing_time=processing_time,
@@ -672,6 +801,48 @@ class MultimodalAIManager:
                 model_used="error",
                 timestamp=datetime.now().isoformat()
             )
+        finally:
+            if pinned:
+                self.residency.release(model_key)
+
+    def stream_transcription(self, audio_data: Union[str, bytes], language: str = "auto"):
+        """
+        Transcripción incremental para respuestas en streaming (NDJSON)
+        
+        Generador síncrono (vistas Flask): produce ``{"type": "segment", ...}`` a
+        medida que terminan las ventanas y un ``{"type": "done", ...}`` final.
+        """
+        from vigoleonrocks.services.event_loop_bridge import run_coroutine
+        
+        if not AUDIO_AVAILABLE:
+            yield {"type": "error", "error": "audio_libs_missing"}
+            return
+        
+        model_key = self._whisper_model_key()
+        if not run_coroutine(self.residency.acquire(model_key)):
+            yield {"type": "error", "error": "model_load_failed"}
+            return
+        
+        try:
+            info: Dict[str, Any] = {}
+            transcriber = self._streaming_transcriber(model_key, language, info)
+            stats = TranscriptionStats()
+            try:
+                for segment in transcriber.stream(audio_data, stats):
+                    yield {"type": "segment", **segment.as_dict()}
+            except Exception as e:
+                logger.error(f"Error en transcripción incremental: {e}")
+                yield {"type": "error", "error": str(e)}
+                return
+            self.usage_stats['total_inferences'] += 1
+            yield {
+                "type": "done",
+                "model_used": model_key,
+                "detected_language": info.get("detected_language", "unknown"),
+                "pipeline": stats.as_dict(),
+            }
+        finally:
+            self.residency.release(model_key)
 
     async def analyze_video(self, video_data: Union[str, bytes],
                           analysis_type: str = "comprehensive") -> AnalysisResult:
@@ -719,13 +890,10 @@ class MultimodalAIManager:
             # Extraer y transcribir audio
             if analysis_type in ["comprehensive", "audio_only"]:
                 if AUDIO_AVAILABLE:
-                    audio_path = await self._extract_audio(video_path)
-                    if audio_path:
-                        audio_analysis = await self.transcribe_audio(audio_path)
+                    audio_pcm = await self._extract_audio(video_path)
+                    if audio_pcm:
+                        audio_analysis = await self.transcribe_audio(audio_pcm, pcm16k=True)
                         results["audio_transcription"] = audio_analysis.content
-                        
-                        # Limpiar archivo de audio temporal
-                        os.unlink(audio_path)
             
             # Metadatos del video
             video_metadata = await self._get_video_metadata(video_path)
@@ -793,34 +961,17 @@ class MultimodalAIManager:
         
         return frames
 
-    async def _extract_audio(self, video_path: str) -> Optional[str]:
-        """Extrae audio del video"""
+    async def _extract_audio(self, video_path: str) -> Optional[bytes]:
+        """Extrae el audio del video como PCM int16 16 kHz mono, en memoria"""
         try:
-            import tempfile
-            audio_path = tempfile.mktemp(suffix=".wav")
-            
-            container = av.open(video_path)
-            
-            if container.streams.audio:
-                stream = container.streams.audio[0]
-                
-                with av.open(audio_path, 'w') as output:
-                    output_stream = output.add_stream('pcm_s16le', rate=16000)
-                    
-                    for frame in container.decode(stream):
-                        frame = frame.reformat(format='s16', layout='mono', rate=16000)
-                        for packet in output_stream.encode(frame):
-                            output.mux(packet)
-                    
-                    for packet in output_stream.encode():
-                        output.mux(packet)
-                
-                container.close()
-                return audio_path
-            else:
-                logger.warning("Video no tiene pista de audio")
-                return None
-                
+            loop = asyncio.get_running_loop()
+            pcm = await loop.run_in_executor(self.executor, decode_pcm16k_bytes, video_path)
+            if not pcm:
+                logger.warning("Video sin audio decodificable")
+            return pcm or None
+        except ValueError as e:
+            logger.warning(f"Video no tiene pista de audio: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error extrayendo audio: {e}")
             return None
@@ -892,7 +1043,9 @@ class MultimodalAIManager:
         """Obtiene información de uso de memoria"""
         memory_info = {
             "models_loaded": len(self.models),
-            "total_inferences": self.usage_stats['total_inferences']
+            "total_inferences": self.usage_stats['total_inferences'],
+            "model_budget_mb": round(self.residency.budget_bytes / 1048576, 1),
+            "model_resident_mb": round(self.residency.used_bytes / 1048576, 1)
         }
         
         if self.device == "cuda":
@@ -906,19 +1059,8 @@ class MultimodalAIManager:
 
     async def unload_model(self, model_key: str):
         """Descarga un modelo específico para liberar memoria"""
-        with self._model_lock:
-            if model_key in self.models:
-                del self.models[model_key]
-            if model_key in self.processors:
-                del self.processors[model_key]
-            if model_key in self.tokenizers:
-                del self.tokenizers[model_key]
-            
-            gc.collect()
-            if self.device == "cuda":
-                torch.cuda.empty_cache()
-            
-            logger.info(f"🗑️ Modelo descargado: {model_key}")
+        if not self.residency.evict(model_key):
+            self._unload_model_blocking(model_key)
 
     def get_system_status(self) -> Dict[str, Any]:
         """Obtiene el estado completo del sistema multimodal con información de CLIP"""
@@ -929,6 +1071,9 @@ class MultimodalAIManager:
             "models_enabled": [k for k, v in self.model_configs.items() if v.enabled],
             "models_disabled": [k for k, v in self.model_configs.items() if not v.enabled],
             "usage_stats": self.usage_stats.copy(),
+            "load_errors": dict(self.load_errors),
+            "residency": self.residency.stats(),
+            "batching": {key: batcher.stats() for key, batcher in self.batchers.items()},
             "capabilities": {
                 "audio_processing": AUDIO_AVAILABLE,
                 "video_processing": VIDEO_AVAILABLE,
@@ -968,6 +1113,9 @@ class MultimodalAIManager:
         """Limpia todos los recursos"""
         logger.info("🧹 Iniciando limpieza de recursos...")
         
+        for batcher in self.batchers.values():
+            batcher.close()
+        self.residency.shutdown()
         with self._model_lock:
             self.models.clear()
             self.processors.clear() 
@@ -978,6 +1126,7 @@ class MultimodalAIManager:
             torch.cuda.empty_cache()
         
         self.executor.shutdown(wait=True)
+        self.audio_executor.shutdown(wait=True)
         logger.info("✅ Limpieza completada")
 
 # Instancia global para usar en Flask
@@ -15,7 +15,11 @@ import requests
 from datetime import datetime
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-import threading
+
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
+from vigoleonrocks.services.rate_limiter import api_key_or_address, create_rate_limiter, install_rate_limiting
+from vigoleonrocks.services.system_sampler import get_system_sampler
+from vigoleonrocks.services.traffic_capture import install_traffic_capture
 
 # Variables de entorno
 GATEWAY_PORT = int(os.environ.get('GATEWAY_PORT', 8004))
@@ -30,6 +34,27 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Entropía por petición (ENTROPY_SEED = respuestas reproducibles en pruebas de carga)
+install_entropy(app)
+
+# Captura muestreada de tráfico para replay (TRAFFIC_CAPTURE_ENABLED)
+install_traffic_capture(app, name='gateway')
+
+# Rate limiting por API key (o IP), compartido entre workers con RATE_LIMIT_BACKEND=shared|redis
+rate_limiter = install_rate_limiting(
+    app,
+    create_rate_limiter(
+        'openrouter-gateway',
+        default_policy=os.environ.get('GATEWAY_RATE_LIMIT', '120/minute'),
+        route_policies={
+            '/v1/chat/completions': os.environ.get('GATEWAY_CHAT_RATE_LIMIT', '60/minute burst 20'),
+            '/v1/generations': os.environ.get('GATEWAY_CHAT_RATE_LIMIT', '60/minute burst 20'),
+        },
+    ),
+    key_func=api_key_or_address,
+    exempt=('/health', '/metrics'),
+)
+
 # Configuración del modelo VIGOLEONROCKS para OpenRouter
 VIGOLEONROCKS_MODEL_CONFIG = {
     "id": "vigoleonrocks/vigoleonrocks-quantum-500k",
@@ -80,47 +105,22 @@ gateway_metrics = {
 }
 
 def get_system_entropy():
-    """Generar entropía basada en métricas del sistema (sin Math.random)"""
-    try:
-        current_time = time.time_ns()
-        pid = os.getpid()
-        memory_info = sys.getsizeof(sys.modules)
-        
-        entropy_source = (
-            current_time + 
-            pid + 
-            memory_info +
-            len(sys.modules) +
-            int(time.monotonic() * 1000000)
-        )
-        
-        return abs(entropy_source % 100) / 100.0
-    except Exception:
-        return abs((time.time_ns() + os.getpid()) % 100) / 100.0
+    """Entropía en [0, 1) (servicio compartido, reproducible con ENTROPY_SEED)"""
+    return get_entropy().uniform()
 
-def update_gateway_metrics():
+def update_gateway_metrics(snapshot=None):
     """Actualizar métricas del gateway"""
     gateway_metrics['last_update'] = time.time()
+    if snapshot is not None:
+        gateway_metrics['system'] = snapshot.as_dict()
     
     # Calcular tiempo de respuesta promedio
     if gateway_metrics['response_times']:
         gateway_metrics['avg_response_time'] = sum(gateway_metrics['response_times'][-100:]) / len(gateway_metrics['response_times'][-100:])
 
-def metrics_update_thread():
-    """Hilo en segundo plano para actualizar métricas del gateway"""
-    logger.info("Iniciando hilo de métricas del gateway")
-    while True:
-        try:
-            update_gateway_metrics()
-            time.sleep(30)  # Actualizar cada 30 segundos
-        except Exception as e:
-            logger.error(f"Error en hilo de métricas del gateway: {e}")
-            time.sleep(60)
-
-# Iniciar hilo de métricas
+# Métricas en segundo plano: el muestreador compartido del proceso, sin hilo propio
 if os.environ.get('BACKGROUND_EXECUTION', 'true').lower() == 'true':
-    metrics_thread = threading.Thread(target=metrics_update_thread, daemon=True)
-    metrics_thread.start()
+    get_system_sampler().subscribe(update_gateway_metrics, every=30)  # Actualizar cada 30 segundos
 
 @app.before_request
 def before_request():
@@ -16,9 +16,11 @@ from functools import wraps, lru_cache
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import weakref
-import psutil
 import hashlib
 
+from vigoleonrocks.services.rate_limiter import RateLimiter, RateLimitPolicy, create_backend
+from vigoleonrocks.services.system_sampler import SystemSnapshot, get_system_sampler
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -186,11 +188,10 @@ class PerformanceOptimizer:
         self.cache = IntelligentCache(max_size_mb=500)
         self.metrics = PerformanceMetrics()
         self._optimization_lock = threading.Lock()
-        self._rate_limiter = {}  # Rate limiting por IP/usuario
+        self._rate_limiter = RateLimiter(create_backend(), default_policy=None, name='performance-optimizer')  # GCRA por IP/usuario, compartido entre workers
         
-        # Monitoreo de sistema
-        self._monitoring_thread = threading.Thread(target=self._system_monitoring, daemon=True)
-        self._monitoring_thread.start()
+        # Monitoreo de sistema: muestreador compartido del proceso, sin hilo propio
+        get_system_sampler().subscribe(self._system_monitoring, every=30)
         
         logger.info("🚀 PerformanceOptimizer inicializado")
     
@@ -259,27 +260,8 @@ class PerformanceOptimizer:
         return "default"
     
     def _check_rate_limit(self, identifier: str, limit: int) -> bool:
-        """Verifica rate limiting"""
-        now = time.time()
-        minute_window = int(now // 60)
-        
-        key = f"{identifier}:{minute_window}"
-        
-        if key not in self._rate_limiter:
-            self._rate_limiter[key] = 0
-        
-        if self._rate_limiter[key] >= limit:
-            return False
-        
-        self._rate_limiter[key] += 1
-        
-        # Limpiar entradas antiguas
-        old_keys = [k for k in self._rate_limiter.keys() 
-                   if int(k.split(':')[1]) < minute_window - 2]
-        for old_key in old_keys:
-            del self._rate_limiter[old_key]
-        
-        return True
+        """Verifica rate limiting (GCRA, O(1) por llamada)"""
+        return self._rate_limiter.hit(identifier, RateLimitPolicy(limit, 60.0)).allowed
     
     def _update_response_time(self, execution_time: float) -> None:
         """Actualiza tiempo promedio de respuesta"""
@@ -292,22 +274,14 @@ class PerformanceOptimizer:
                 / self.metrics.total_inferences
             )
     
-    def _system_monitoring(self) -> None:
-        """Monitoreo continuo del sistema"""
-        while True:
-            try:
-                # Actualizar métricas de sistema
-                self.metrics.memory_usage_mb = psutil.virtual_memory().used / (1024 * 1024)
-                self.metrics.cpu_usage_percent = psutil.cpu_percent(interval=1)
-                
-                # Verificar si necesitamos optimizaciones
-                self._check_optimization_needs()
-                
-                time.sleep(30)  # Cada 30 segundos
-                
-            except Exception as e:
-                logger.error(f"Error en monitoreo de sistema: {e}")
-                time.sleep(60)
+    def _system_monitoring(self, snapshot: SystemSnapshot) -> None:
+        """Monitoreo del sistema (cada 30 s, desde el muestreador compartido)"""
+        # Actualizar métricas de sistema
+        self.metrics.memory_usage_mb = snapshot.memory_used_mb
+        self.metrics.cpu_usage_percent = snapshot.system_cpu_percent
+        
+        # Verificar si necesitamos optimizaciones
+        self._check_optimization_needs()
     
     def _check_optimization_needs(self) -> None:
         """Verifica si se necesitan optimizaciones automáticas"""
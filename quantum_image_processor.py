@@ -12,8 +12,10 @@ import os
 import time
 import json
 import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, BinaryIO, List, Tuple, Union
 
 import numpy as np
 from PIL import Image, ImageStat, ImageFilter
@@ -44,6 +46,10 @@ _empty_slice_events = Counter("qnlp_empty_slice_events_total","Empty slice mean
 # Configuration from environment
 MIN_IMAGE_SIDE_FOR_KERNEL = int(os.getenv("QIS_MIN_IMAGE_SIDE_FOR_KERNEL", "3"))
 SMALL_IMAGE_FALLBACK = os.getenv("QIS_SMALL_IMAGE_FALLBACK", "identity")  # identity|upsample
+BATCH_MAX_IMAGES = int(os.getenv("QIS_BATCH_MAX_IMAGES", "64"))
+BATCH_WORKERS = int(os.getenv("QIS_BATCH_WORKERS", "0"))  # 0 = min(batch, cpu_count, 8)
+BATCH_MAX_IMAGE_BYTES = 20 * 1024 * 1024
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'bmp'}
 
 def safe_mean(arr, default=np.nan):
     """Safe mean calculation that handles empty arrays"""
@@ -247,20 +253,7 @@ def _ui_pattern_signals(gray: Image.Image) -> Dict[str, float]:
 
 def _skin_nature_monochrome_flags(img: Image.Image) -> Dict[str, bool]:
     small = img.resize((64, 64), Image.Resampling.LANCZOS)
-    arr = np.asarray(small, dtype=np.float32)
-    R, G, B = arr[..., 0], arr[..., 1], arr[..., 2]
-    skin_mask = (R > 95) & (G > 40) & (B > 20) & ((np.maximum(np.maximum(R, G), B) - np.minimum(np.minimum(R, G), B)) > 15) & (np.abs(R - G) > 15) & (R > G) & (R > B)
-    has_skin = float(np.mean(skin_mask)) > 0.08
-    nature_mask = (G > R) | (B > R)
-    has_nature = float(np.mean(nature_mask)) > 0.35
-    # monochrome test via std across channels
-    std_channels = np.std(arr, axis=(0, 1))
-    is_mono = bool(np.all(std_channels < 20))
-    return {
-        'has_skin_tones': bool(has_skin),
-        'has_nature_colors': bool(has_nature),
-        'is_monochrome': is_mono
-    }
+    return _skin_nature_monochrome_flags_from_array(np.asarray(small, dtype=np.float32))
 
 
 def _sacred_geometry_scores(phi: Dict[str, float], sym: Dict[str, float], fft: Dict[str, float], edge_arr: np.ndarray, ui: Dict[str, float]) -> Dict[str, float]:
@@ -378,99 +371,326 @@ def _quantum_description(filename: str, width: int, height: int, coherence: floa
     )
 
 
-def analyze_image_quantum(image_data: bytes, filename: str) -> Dict[str, Any]:
-    """Main entry: 26D QBTC quantum analysis using Pillow + NumPy only."""
-    t0 = time.time()
-    try:
-        img = Image.open(io.BytesIO(image_data))
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-        width, height = img.size
-
-        # Prepare working images
-        img_small = _resize_safely(img, 640)
-        gray = _to_grayscale(img_small)
-        gray_np = np.asarray(gray, dtype=np.float32)
-
-        # Core features
-        stats = _image_stats(gray)
-        edge_arr = _edge_map(gray)
-        fractal_dim = _box_counting_fractal_dimension(edge_arr)
-        fft = _fft_features(gray_np)
-        sym = _symmetry_metrics(gray_np)
-        phi = _golden_ratio_features(img_small.size[0], img_small.size[1], gray_np)
-        ui = _ui_pattern_signals(gray)
-        flags = _skin_nature_monochrome_flags(img_small)
-
-        sacred = _sacred_geometry_scores(phi, sym, fft, edge_arr, ui)
-        coherence = _quantum_coherence(sym, fft, fractal_dim)
-        ent = _entanglement_summary(gray_np)
-
-        features = {
+def _prepare_image(image_data: bytes, filename: str) -> Dict[str, Any]:
+    """Decode + per-image features (PIL filters, fractal, stats); the array features are computed by the caller."""
+    img = Image.open(io.BytesIO(image_data))
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    width, height = img.size
+
+    # Prepare working images
+    img_small = _resize_safely(img, 640)
+    gray = _to_grayscale(img_small)
+    edge_arr = _edge_map(gray)
+    return {
+        'filename': filename,
+        'width': width,
+        'height': height,
+        'format': getattr(img, 'format', 'UNKNOWN'),
+        'gray_np': np.asarray(gray, dtype=np.float32),
+        'thumb_np': np.asarray(img_small.resize((64, 64), Image.Resampling.LANCZOS), dtype=np.float32),
+        'stats': _image_stats(gray),
+        'edge_mean': float(edge_arr.mean()),
+        'edge_arr': edge_arr,
+        'fractal_dim': _box_counting_fractal_dimension(edge_arr),
+        'ui': _ui_pattern_signals(gray),
+        'small_size': img_small.size,
+    }
+
+
+def _assemble_result(prep: Dict[str, Any], fft: Dict[str, float], sym: Dict[str, float],
+                     flags: Dict[str, bool], ent: Dict[str, Any], t0: float) -> Dict[str, Any]:
+    gray_np = prep['gray_np']
+    phi = _golden_ratio_features(prep['small_size'][0], prep['small_size'][1], gray_np)
+    ui = prep['ui']
+    fractal_dim = prep['fractal_dim']
+    stats = prep['stats']
+    width, height = prep['width'], prep['height']
+
+    sacred = _sacred_geometry_scores(phi, sym, fft, prep['edge_arr'], ui)
+    coherence = _quantum_coherence(sym, fft, fractal_dim)
+
+    features = {
+        'stats': stats,
+        'fft': fft,
+        'sym': sym,
+        'phi': phi,
+        'flags': flags,
+        'fractal_dim': fractal_dim,
+        'ui': ui,
+        'sacred': sacred,
+        'edge_mean': prep['edge_mean']
+    }
+
+    dim_scores, consciousness, energy_flow = _dimension_scores(features)
+    sacred_detected = [k for k, v in sacred.items() if v >= 0.6]
+
+    # Merkaba rotation speed heuristic (3.33 to 108 RPS)
+    merkaba_rps = 3.33 + energy_flow * (108.0 - 3.33)
+
+    analysis_text = _quantum_description(
+        prep['filename'], width, height, coherence, consciousness, sacred_detected, fractal_dim, phi['phi_closeness'], merkaba_rps
+    )
+
+    result = QuantumImageResult(
+        analysis=analysis_text,
+        confidence=float(np.clip(0.80 + 0.15 * coherence, 0.0, 0.98)),
+        processing_type='quantum_image_analysis_26D',
+        metadata={
+            'filename': prep['filename'],
+            'width': width,
+            'height': height,
+            'format': prep['format'],
+            'quantum': {
+                'quantum_coherence': coherence,
+                'consciousness_level': consciousness,
+                'dimension_scores': dim_scores,
+                'sacred_geometry_detected': sacred_detected,
+                'phi': phi,
+                'fractal_dimension': fractal_dim,
+                'merkaba': {
+                    'rotation_speed_rps': merkaba_rps,
+                    'energy_flow': energy_flow
+                },
+                'ui_signals': ui,
+                'symmetry': sym,
+                'fft': fft,
+                'entanglement': ent
+            },
             'stats': stats,
-            'fft': fft,
-            'sym': sym,
-            'phi': phi,
-            'flags': flags,
-            'fractal_dim': fractal_dim,
-            'ui': ui,
-            'sacred': sacred,
-            'edge_mean': float(edge_arr.mean())
+            'processing_time_ms': int((time.time() - t0) * 1000)
         }
+    )
 
-        dim_scores, consciousness, energy_flow = _dimension_scores(features)
-        sacred_detected = [k for k, v in sacred.items() if v >= 0.6]
-
-        # Merkaba rotation speed heuristic (3.33 to 108 RPS)
-        merkaba_rps = 3.33 + energy_flow * (108.0 - 3.33)
-
-        analysis_text = _quantum_description(
-            filename, width, height, coherence, consciousness, sacred_detected, fractal_dim, phi['phi_closeness'], merkaba_rps
-        )
-
-        result = QuantumImageResult(
-            analysis=analysis_text,
-            confidence=float(np.clip(0.80 + 0.15 * coherence, 0.0, 0.98)),
-            processing_type='quantum_image_analysis_26D',
-            metadata={
-                'filename': filename,
-                'width': width,
-                'height': height,
-                'format': getattr(img, 'format', 'UNKNOWN'),
-                'quantum': {
-                    'quantum_coherence': coherence,
-                    'consciousness_level': consciousness,
-                    'dimension_scores': dim_scores,
-                    'sacred_geometry_detected': sacred_detected,
-                    'phi': phi,
-                    'fractal_dimension': fractal_dim,
-                    'merkaba': {
-                        'rotation_speed_rps': merkaba_rps,
-                        'energy_flow': energy_flow
-                    },
-                    'ui_signals': ui,
-                    'symmetry': sym,
-                    'fft': fft,
-                    'entanglement': ent
-                },
-                'stats': stats,
-                'processing_time_ms': int((time.time() - t0) * 1000)
-            }
-        )
+    return {
+        'analysis': result.analysis,
+        'confidence': result.confidence,
+        'processing_type': result.processing_type,
+        'metadata': result.metadata
+    }
+
+
+def _error_result(e: Exception, filename: str = None) -> Dict[str, Any]:
+    metadata = {'error': str(e)}
+    if filename is not None:
+        metadata['filename'] = filename
+    return {
+        'analysis': f"Error en análisis cuántico: {str(e)}",
+        'confidence': 0.0,
+        'processing_type': 'error',
+        'metadata': metadata
+    }
+
+
+def _analyze_prepared(prep: Dict[str, Any], t0: float) -> Dict[str, Any]:
+    gray_np = prep['gray_np']
+    return _assemble_result(
+        prep,
+        _fft_features(gray_np),
+        _symmetry_metrics(gray_np),
+        _skin_nature_monochrome_flags_from_array(prep['thumb_np']),
+        _entanglement_summary(gray_np),
+        t0,
+    )
 
-        return {
-            'analysis': result.analysis,
-            'confidence': result.confidence,
-            'processing_type': result.processing_type,
-            'metadata': result.metadata
-        }
 
+def analyze_image_quantum(image_data: bytes, filename: str) -> Dict[str, Any]:
+    """Main entry: 26D QBTC quantum analysis using Pillow + NumPy only."""
+    t0 = time.time()
+    try:
+        return _analyze_prepared(_prepare_image(image_data, filename), t0)
     except Exception as e:
         logger.error(f"Quantum image analysis failed: {e}")
-        return {
-            'analysis': f"Error en análisis cuántico: {str(e)}",
-            'confidence': 0.0,
-            'processing_type': 'error',
-            'metadata': {'error': str(e)}
-        }
+        return _error_result(e)
+
 
+# === BATCH ANALYSIS ===
+# Same features as analyze_image_quantum, but images whose working size
+# matches are stacked and the FFT, symmetry, entanglement grid and colour
+# masks run as one NumPy call over the stack. Results are identical to the
+# per-image path; a failure only affects its own image.
+
+def _fft_features_batch(stack: np.ndarray) -> List[Dict[str, float]]:
+    F = np.fft.fft2(stack, axes=(-2, -1))
+    mag = np.abs(np.fft.fftshift(F, axes=(-2, -1)))
+    mag /= mag.max(axis=(-2, -1), keepdims=True) + 1e-6
+    _, h, w = mag.shape
+    cy, cx = h // 2, w // 2
+    r = min(h, w) // 6
+    Y, X = np.ogrid[:h, :w]
+    dist2 = (X - cx) ** 2 + (Y - cy) ** 2
+    mask_center = dist2 <= r ** 2
+    mask_outer = dist2 >= (r * 2) ** 2
+    flat = mag.reshape(len(mag), -1)
+    low_e = flat[:, mask_center.ravel()].mean(axis=1)
+    high_e = flat[:, mask_outer.ravel()].mean(axis=1) if np.any(mask_outer) else np.zeros(len(mag))
+    vert = mag[:, :, max(0, cx - r // 4):min(w, cx + r // 4)]
+    horiz = mag[:, max(0, cy - r // 4):min(h, cy + r // 4), :]
+    vert_band = vert.mean(axis=(1, 2)) if vert.size else np.zeros(len(mag))
+    horiz_band = horiz.mean(axis=(1, 2)) if horiz.size else np.zeros(len(mag))
+    return [{
+        'low_freq_energy': float(low_e[i]),
+        'high_freq_energy': float(high_e[i]),
+        'low_high_ratio': float(low_e[i] / (high_e[i] + 1e-6)),
+        'directional_anisotropy': float(abs(vert_band[i] - horiz_band[i]))
+    } for i in range(len(mag))]
+
+
+def _symmetry_metrics_batch(stack: np.ndarray) -> List[Dict[str, float]]:
+    lo = stack.min(axis=(1, 2), keepdims=True)
+    hi = stack.max(axis=(1, 2), keepdims=True)
+    g = (stack - lo) / (hi - lo + 1e-6)
+    _, h, w = g.shape
+    lr = 1.0 - np.abs(g - g[:, :, ::-1]).mean(axis=(1, 2))
+    tb = 1.0 - np.abs(g - g[:, ::-1, :]).mean(axis=(1, 2))
+    center = g[:, h // 4: 3 * h // 4, w // 4: 3 * w // 4]
+    c_lr = 1.0 - np.abs(center - center[:, :, ::-1]).mean(axis=(1, 2))
+    c_tb = 1.0 - np.abs(center - center[:, ::-1, :]).mean(axis=(1, 2))
+    return [{
+        'lr_symmetry': float(lr[i]),
+        'tb_symmetry': float(tb[i]),
+        'center_lr_sym': float(c_lr[i]),
+        'center_tb_sym': float(c_tb[i])
+    } for i in range(len(g))]
+
+
+def _entanglement_summary_batch(stack: np.ndarray) -> List[Dict[str, Any]]:
+    n, h, w = stack.shape
+    H, W = h // 3, w // 3
+    if H == 0 or W == 0:
+        cells = np.zeros((n, 9), dtype=np.float32)
+    else:
+        cells = stack[:, :3 * H, :3 * W].reshape(n, 3, H, 3, W).mean(axis=(2, 4)).reshape(n, 9).astype(np.float32)
+    cells = (cells - cells.mean(axis=1, keepdims=True)) / (cells.std(axis=1, keepdims=True) + 1e-6)
+    corr = (cells * cells[:, 4:5]).mean(axis=1)
+    lr_corr = (cells[:, 1] + cells[:, 7]) / 2.0 - (cells[:, 3] + cells[:, 5]) / 2.0
+    return [{
+        'center_correlation': float(corr[i]),
+        'lr_axis_balance': float(lr_corr[i]),
+        'tb_axis_balance': float(-lr_corr[i]),
+        'grid_means': cells[i].tolist()
+    } for i in range(n)]
+
+
+def _skin_nature_monochrome_flags_batch(thumbs: np.ndarray) -> List[Dict[str, bool]]:
+    R, G, B = thumbs[..., 0], thumbs[..., 1], thumbs[..., 2]
+    spread = np.maximum(np.maximum(R, G), B) - np.minimum(np.minimum(R, G), B)
+    skin_mask = (R > 95) & (G > 40) & (B > 20) & (spread > 15) & (np.abs(R - G) > 15) & (R > G) & (R > B)
+    skin = skin_mask.mean(axis=(1, 2))
+    nature = ((G > R) | (B > R)).mean(axis=(1, 2))
+    mono = np.all(thumbs.std(axis=(1, 2)) < 20, axis=1)
+    return [{
+        'has_skin_tones': bool(skin[i] > 0.08),
+        'has_nature_colors': bool(nature[i] > 0.35),
+        'is_monochrome': bool(mono[i])
+    } for i in range(len(thumbs))]
+
+
+def _skin_nature_monochrome_flags_from_array(thumb: np.ndarray) -> Dict[str, bool]:
+    return _skin_nature_monochrome_flags_batch(thumb[np.newaxis])[0]
+
+
+def analyze_images_quantum_batch(images: List[Tuple[bytes, str]], max_workers: int = None) -> List[Dict[str, Any]]:
+    """
+    Batch entry: one result per ``(image_data, filename)``, in input order.
+
+    Decoding and the PIL-based features run in parallel threads (Pillow
+    releases the GIL); images are then grouped by working size and the array
+    features run vectorized per group. Errors are isolated per image.
+    """
+    t0 = time.time()
+    results: List[Dict[str, Any]] = [None] * len(images)
+    prepared: Dict[int, Dict[str, Any]] = {}
+
+    def prepare(index: int):
+        data, filename = images[index]
+        try:
+            return index, _prepare_image(data, filename), None
+        except Exception as e:
+            return index, None, e
+
+    workers = max_workers or BATCH_WORKERS or min(len(images), os.cpu_count() or 1, 8) or 1
+    if workers > 1 and len(images) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='qis-decode') as pool:
+            outcomes = list(pool.map(prepare, range(len(images))))
+    else:
+        outcomes = [prepare(i) for i in range(len(images))]
+    for index, prep, error in outcomes:
+        if error is not None:
+            logger.error(f"Quantum image analysis failed for {images[index][1]}: {error}")
+            results[index] = _error_result(error, images[index][1])
+        else:
+            prepared[index] = prep
+
+    # The colour thumbnails are always 64x64: one stack for the whole batch
+    flags: Dict[int, Dict[str, bool]] = {}
+    if prepared:
+        order = list(prepared)
+        try:
+            for index, flag in zip(order, _skin_nature_monochrome_flags_batch(
+                    np.stack([prepared[i]['thumb_np'] for i in order]))):
+                flags[index] = flag
+        except Exception as e:
+            logger.warning(f"Batched colour masks failed, computing per image: {e}")
+
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for index, prep in prepared.items():
+        groups.setdefault(prep['gray_np'].shape, []).append(index)
+
+    for shape, indices in groups.items():
+        try:
+            stack = np.stack([prepared[i]['gray_np'] for i in indices])
+            batch = zip(indices, _fft_features_batch(stack), _symmetry_metrics_batch(stack),
+                        _entanglement_summary_batch(stack))
+            for index, fft, sym, ent in batch:
+                prep = prepared[index]
+                flag = flags.get(index) or _skin_nature_monochrome_flags_from_array(prep['thumb_np'])
+                results[index] = _assemble_result(prep, fft, sym, flag, ent, t0)
+        except Exception as e:
+            logger.warning(f"Batched features failed for {len(indices)} image(s) of {shape}, falling back: {e}")
+            for index in indices:
+                if results[index] is not None:
+                    continue
+                try:
+                    results[index] = _analyze_prepared(prepared[index], t0)
+                except Exception as single_error:
+                    logger.error(f"Quantum image analysis failed for {images[index][1]}: {single_error}")
+                    results[index] = _error_result(single_error, images[index][1])
+    return results
+
+
+def read_zip_images(archive: Union[bytes, BinaryIO], max_images: int = BATCH_MAX_IMAGES,
+                    max_image_bytes: int = BATCH_MAX_IMAGE_BYTES) -> Tuple[List[Tuple[bytes, str]], List[Dict[str, str]]]:
+    """
+    Image members of a zip upload (bytes or a seekable binary file) as
+    ``(data, filename)`` plus per-member rejections (unsupported type, too
+    large). Sizes are checked against the
+    zip directory before anything is inflated; raises ``ValueError`` for an
+    invalid archive or more than ``max_images`` images.
+    """
+    try:
+        zf = zipfile.ZipFile(archive if hasattr(archive, 'read') else io.BytesIO(archive))
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Invalid zip archive: {e}")
+    images: List[Tuple[bytes, str]] = []
+    rejected: List[Dict[str, str]] = []
+    with zf:
+        members = [m for m in zf.infolist()
+                   if not m.is_dir() and not os.path.basename(m.filename).startswith('.')
+                   and not m.filename.startswith('__MACOSX/')]
+        for member in members:
+            extension = member.filename.rsplit('.', 1)[-1].lower() if '.' in member.filename else ''
+            if extension not in IMAGE_EXTENSIONS:
+                rejected.append({'filename': member.filename, 'error': 'Tipo de archivo no soportado'})
+            elif member.file_size > max_image_bytes:
+                rejected.append({'filename': member.filename, 'error': 'Archivo demasiado grande'})
+            elif len(images) >= max_images:
+                raise ValueError(f"Too many images in archive (max {max_images})")
+            else:
+                with zf.open(member) as f:
+                    data = f.read(max_image_bytes + 1)
+                if len(data) > max_image_bytes:  # header lied about the size
+                    rejected.append({'filename': member.filename, 'error': 'Archivo demasiado grande'})
+                else:
+                    images.append((data, member.filename))
+    return images, rejected
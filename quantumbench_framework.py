@@ -13,6 +13,7 @@ Framework de benchmarking científico para comparar VIGOLEONROCKS con:
 Incluye benchmarks estándar y evaluaciones específicas del motor cuántico.
 """
 
+import argparse
 import json
 import time
 import asyncio
@@ -23,6 +24,12 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 import concurrent.futures
 from vigoleonrocks.interfaces.rest_api import VIGOLEONROCKSServer
+from vigoleonrocks.services.context_scaling import (
+    DEFAULT_SIZES, SUPERLINEAR_THRESHOLD, fit_scaling_exponent, generate_document
+)
+
+# Tope por documento del barrido de contexto contra modelos externos (opt-in)
+COMPETITOR_MAX_CONTEXT_TOKENS = 32_000
 
 @dataclass
 class BenchmarkResult:
@@ -50,10 +57,16 @@ class QuantumBenchFramework:
     Compara VIGOLEONROCKS contra los mejores LLMs disponibles
     """
     
-    def __init__(self):
+    def __init__(self, competitor_context_scaling: bool = False,
+                 competitor_max_context_tokens: int = COMPETITOR_MAX_CONTEXT_TOKENS):
         self.vigoleonrocks = VIGOLEONROCKSServer()
         self.results = []
         self.benchmark_suite = self._initialize_benchmarks()
+        self.context_scaling_sizes = DEFAULT_SIZES
+        # El barrido de contexto llega a 500K tokens por llamada: contra modelos
+        # externos solo con opt-in explícito y hasta el tope de tokens por documento
+        self.competitor_context_scaling = competitor_context_scaling
+        self.competitor_max_context_tokens = competitor_max_context_tokens
         
         # Configuración de modelos competidores (para OpenRouter)
         self.competitor_models = {
@@ -731,53 +744,74 @@ class QuantumBenchFramework:
         )
     
     def _context_scaling_benchmark(self, model_name: str) -> BenchmarkResult:
-        """Evalúa manejo de contexto escalable"""
-        context_sizes = [
-            ("Small", "Breve pregunta sobre IA", 5),
-            ("Medium", "Pregunta de complejidad media sobre integración de física cuántica y consciencia artificial en sistemas modernos de procesamiento", 15),
-            ("Large", "Análisis comprehensivo de la implementación de algoritmos cuánticos multidimensionales en arquitecturas de consciencia artificial, considerando factores de coherencia, geometría sagrada, resonancia Merkaba, y optimización de performance en sistemas de 26 dimensiones con integración de constantes matemáticas como la proporción áurea y secuencias de Fibonacci para maximizar la eficiencia del procesamiento cognitivo", 25)
-        ]
-        
+        """
+        Evalúa el escalado con contexto largo (1K–500K tokens)
+
+        Usa documentos sintéticos deterministas y ajusta el exponente de
+        escalado de la latencia (latencia ∝ tokens^k). El score penaliza el
+        crecimiento superlineal: 100 con k <= 1, 100/k por encima. El análisis
+        completo por etapa (RSS, asignaciones) está en
+        benchmarks/context_scaling_benchmark.py.
+
+        Por defecto solo se mide el modelo local; los competidores se omiten
+        salvo con ``competitor_context_scaling``, y entonces solo los tamaños
+        hasta ``competitor_max_context_tokens``.
+        """
         start_time = time.time()
         scaling_scores = []
+        sizes = list(self.context_scaling_sizes)
+        skipped_sizes = []
+        if model_name != 'VIGOLEONROCKS':
+            if not self.competitor_context_scaling:
+                return BenchmarkResult(
+                    test_name='Context_Scaling',
+                    model_name=model_name,
+                    score=0.0,
+                    execution_time=0.0,
+                    additional_metrics={'skipped': 'competitor_context_scaling desactivado'},
+                    timestamp=datetime.now().isoformat()
+                )
+            skipped_sizes = [t for t in sizes if t > self.competitor_max_context_tokens]
+            sizes = [t for t in sizes if t <= self.competitor_max_context_tokens]
         
-        for size_name, query, expected_states in context_sizes:
-            query_start = time.time()
-            
-            if model_name == 'VIGOLEONROCKS':
-                result = self.vigoleonrocks.process_query(query, quantum_states=expected_states)
-                coherence = result['quantum_coherence']
-                dimensions_used = len(result['active_dimensions'])
-                
-                # Score basado en coherencia y uso apropiado de dimensiones
-                coherence_score = coherence
-                dimension_efficiency = 100 if dimensions_used >= expected_states * 0.5 else 50
-                context_score = (coherence_score + dimension_efficiency) / 2
-            else:
-                response = self._query_competitor_model(model_name, query)
-                # Score basado en longitud y relevancia de respuesta
-                response_quality = min(100, len(response) / 10)  # Simplified scoring
-                context_score = response_quality
+        for tokens in sizes:
+            document = generate_document(tokens)
+            query_start = time.perf_counter()
+            try:
+                if model_name == 'VIGOLEONROCKS':
+                    self.vigoleonrocks.process_query(document)
+                else:
+                    self._query_competitor_model(model_name, document)
+                status = 'ok'
+            except Exception as e:
+                status = f"error: {e}"
             
-            query_time = (time.time() - query_start) * 1000
             scaling_scores.append({
-                'size': size_name,
-                'score': context_score,
-                'execution_time': query_time
+                'tokens': tokens,
+                'chars': len(document),
+                'execution_time': (time.perf_counter() - query_start) * 1000,
+                'status': status
             })
         
-        # Evaluar escalabilidad: el score debería mantenerse alto incluso con contexto grande
-        avg_score = statistics.mean([s['score'] for s in scaling_scores])
+        ok = [s for s in scaling_scores if s['status'] == 'ok']
+        fit = fit_scaling_exponent([s['tokens'] for s in ok], [s['execution_time'] for s in ok])
+        exponent = fit['exponent']
+        success_rate = len(ok) / max(len(scaling_scores), 1)
+        score = success_rate * 100 * (min(1.0, 1.0 / exponent) if exponent and exponent > 0 else 1.0)
         execution_time = (time.time() - start_time) * 1000
         
         return BenchmarkResult(
             test_name='Context_Scaling',
             model_name=model_name,
-            score=avg_score,
+            score=score,
             execution_time=execution_time,
             additional_metrics={
                 'scaling_details': scaling_scores,
-                'context_sizes_tested': len(context_sizes)
+                'context_sizes_tested': len(scaling_scores),
+                'scaling_exponent': exponent,
+                'scaling_fit_r2': fit['r2'],
+                'superlinear': bool(exponent and exponent > SUPERLINEAR_THRESHOLD),
+                'skipped_sizes': skipped_sizes
             },
             timestamp=datetime.now().isoformat()
         )
@@ -899,6 +933,8 @@ class QuantumBenchFramework:
                 notes = "✅" if result.score > 80 else "⚠️" if result.score > 50 else "❌"
                 if 'error' in result.additional_metrics:
                     notes = "🚫 Error"
+                elif 'skipped' in result.additional_metrics:
+                    notes = f"⏭️ Omitido ({result.additional_metrics['skipped']})"
                 elif benchmark_name.startswith('Quantum_') and model_name != 'VIGOLEONROCKS':
                     notes = "N/A (No quantum engine)"
                 
@@ -971,9 +1007,9 @@ class QuantumBenchFramework:
         return report
 
 # Función principal para ejecutar benchmarks
-def run_quantumbench():
+def run_quantumbench(competitor_context_scaling: bool = False):
     """Función principal para ejecutar la evaluación completa"""
-    framework = QuantumBenchFramework()
+    framework = QuantumBenchFramework(competitor_context_scaling=competitor_context_scaling)
     
     print("🚀 Iniciando evaluación QuantumBench...")
     print("⚛️ Comparando VIGOLEONROCKS vs modelos top de la industria")
@@ -1006,4 +1042,9 @@ def run_quantumbench():
     return results, report
 
 if __name__ == "__main__":
-    run_quantumbench()
+    parser = argparse.ArgumentParser(description='QuantumBench: VIGOLEONROCKS vs los mejores LLMs')
+    parser.add_argument('--competitor-context-scaling', action='store_true',
+                        help=f'Ejecuta también el barrido de contexto contra los competidores '
+                             f'(documentos de hasta {COMPETITOR_MAX_CONTEXT_TOKENS:,} tokens)')
+    args = parser.parse_args()
+    run_quantumbench(competitor_context_scaling=args.competitor_context_scaling)
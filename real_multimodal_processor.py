@@ -9,7 +9,6 @@ import io
 import logging
 from typing import Dict, Any, Tuple, List, Optional
 from datetime import datetime
-import tempfile
 import hashlib
 
 # Procesamiento de imágenes
@@ -20,6 +19,8 @@ import numpy as np
 from pydub import AudioSegment
 from mutagen import File as MutagenFile
 
+from vigoleonrocks.services.audio_pipeline import SAMPLE_RATE, voice_activity_summary
+
 logger = logging.getLogger(__name__)
 
 class RealMultimodalProcessor:
@@ -95,65 +96,59 @@ class RealMultimodalProcessor:
             }
     
     def analyze_audio_real(self, audio_data: bytes, filename: str) -> Dict[str, Any]:
-        """Análisis real de audio usando pydub"""
+        """Análisis real de audio usando pydub (decodificado en memoria, sin archivo temporal)"""
         try:
-            # Crear archivo temporal
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                temp_file.write(audio_data)
-                temp_path = temp_file.name
-            
-            try:
-                # Cargar audio con pydub
-                audio = AudioSegment.from_file(temp_path)
-                
-                # Información básica
-                basic_info = {
-                    'filename': filename,
-                    'duration_seconds': len(audio) / 1000.0,
-                    'duration_ms': len(audio),
-                    'frame_rate': audio.frame_rate,
-                    'channels': audio.channels,
-                    'sample_width': audio.sample_width,
-                    'frame_width': audio.frame_width,
-                    'frame_count': audio.frame_count()
-                }
-                
-                # Análisis de volumen y niveles
-                volume_analysis = self._analyze_audio_volume(audio)
-                
-                # Análisis espectral básico
-                spectral_analysis = self._analyze_audio_spectrum(audio)
-                
-                # Metadatos del archivo
-                metadata_analysis = self._extract_audio_metadata(temp_path)
-                
-                # Análisis de calidad
-                quality_analysis = self._estimate_audio_quality(audio)
-                
-                # Construir análisis descriptivo
-                analysis_text = self._generate_audio_description(
-                    basic_info, volume_analysis, spectral_analysis, quality_analysis
-                )
-                
-                return {
-                    'transcription': analysis_text,
-                    'confidence': 0.92,
-                    'processing_type': 'real_audio_analysis',
-                    'metadata': {
-                        **basic_info,
-                        'volume': volume_analysis,
-                        'spectral': spectral_analysis,
-                        'file_metadata': metadata_analysis,
-                        'quality': quality_analysis,
-                        'file_hash': hashlib.md5(audio_data).hexdigest()[:16],
-                        'processed_at': datetime.now().isoformat()
-                    }
+            # Cargar audio con pydub; la extensión orienta a ffmpeg con formatos sin cabecera clara
+            extension = os.path.splitext(filename)[1].lower().lstrip('.')
+            audio = AudioSegment.from_file(io.BytesIO(audio_data), format=extension or None)
+            
+            # Información básica
+            basic_info = {
+                'filename': filename,
+                'duration_seconds': len(audio) / 1000.0,
+                'duration_ms': len(audio),
+                'frame_rate': audio.frame_rate,
+                'channels': audio.channels,
+                'sample_width': audio.sample_width,
+                'frame_width': audio.frame_width,
+                'frame_count': audio.frame_count()
+            }
+            
+            # Análisis de volumen y niveles
+            volume_analysis = self._analyze_audio_volume(audio)
+            
+            # Análisis espectral básico
+            spectral_analysis = self._analyze_audio_spectrum(audio)
+            
+            # Metadatos del archivo
+            metadata_analysis = self._extract_audio_metadata(io.BytesIO(audio_data))
+            
+            # Análisis de calidad
+            quality_analysis = self._estimate_audio_quality(audio)
+            
+            # Actividad de voz (VAD por energía sobre PCM 16 kHz mono)
+            voice_activity = self._analyze_voice_activity(audio)
+            
+            # Construir análisis descriptivo
+            analysis_text = self._generate_audio_description(
+                basic_info, volume_analysis, spectral_analysis, quality_analysis
+            )
+            
+            return {
+                'transcription': analysis_text,
+                'confidence': 0.92,
+                'processing_type': 'real_audio_analysis',
+                'metadata': {
+                    **basic_info,
+                    'volume': volume_analysis,
+                    'spectral': spectral_analysis,
+                    'file_metadata': metadata_analysis,
+                    'quality': quality_analysis,
+                    'voice_activity': voice_activity,
+                    'file_hash': hashlib.md5(audio_data).hexdigest()[:16],
+                    'processed_at': datetime.now().isoformat()
                 }
-                
-            finally:
-                # Limpiar archivo temporal
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+            }
             
         except Exception as e:
             logger.error(f"Error en análisis real de audio: {e}")
@@ -164,6 +159,14 @@ class RealMultimodalProcessor:
                 'metadata': {'error': str(e)}
             }
     
+    def _analyze_voice_activity(self, audio: AudioSegment) -> Dict[str, Any]:
+        """Proporción de voz y regiones de voz detectadas"""
+        try:
+            pcm = audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2).raw_data
+            return voice_activity_summary(pcm)
+        except Exception as e:
+            return {'note': f'Voice activity analysis failed: {str(e)}'}
+    
     def _analyze_colors(self, image: Image.Image) -> Dict[str, Any]:
         """Análisis de colores dominantes"""
         try:
@@ -289,10 +292,10 @@ class RealMultimodalProcessor:
         except Exception as e:
             return {'error': str(e)}
     
-    def _extract_audio_metadata(self, file_path: str) -> Dict[str, Any]:
-        """Extracción de metadatos de audio"""
+    def _extract_audio_metadata(self, source) -> Dict[str, Any]:
+        """Extracción de metadatos de audio (ruta o stream en memoria)"""
         try:
-            audio_file = MutagenFile(file_path)
+            audio_file = MutagenFile(source)
             if audio_file is None:
                 return {'note': 'No metadata available'}
             
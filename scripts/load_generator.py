@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Open-Loop Load Generator
+
+Sends requests at a target arrival rate regardless of how fast the server
+answers and reports latency from each request's intended send time.
+
+    # 2 minutes of Poisson arrivals at 50 rps over a weighted mix
+    python scripts/load_generator.py run --target http://localhost:5000 --rate 50 --duration 120 \
+        --request 'GET /api/status' --request 'POST /api/vigoleonrocks {"text": "Hola mundo"}' --output run.json
+
+    # step and ramp profiles
+    python scripts/load_generator.py run --target http://localhost:5000 --profile step --stages 10:30,20:30,40:30
+    python scripts/load_generator.py run --target http://localhost:5000 --profile ramp --rate 10 --end-rate 200 --duration 60
+
+    # highest rate that keeps p99 <= 250 ms and errors <= 1%
+    python scripts/load_generator.py find-max --target http://localhost:5000 --slo-ms 250 --output capacity.json
+
+    # combine runs from several generator machines
+    python scripts/load_generator.py merge gen-a.json gen-b.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.histogram import LatencyHistogram
+from vigoleonrocks.services.load_generator import (
+    SLO,
+    LoadProfile,
+    find_max_throughput,
+    parse_request,
+    parse_stages,
+    run_load,
+)
+
+DEFAULT_REQUESTS = ['GET /api/status']
+
+
+def _requests(args):
+    return [parse_request(spec) for spec in (args.request or DEFAULT_REQUESTS)]
+
+
+def _print_latency(title, snapshot):
+    print(f"{title:<28} n={snapshot['count']:<7} p50 {snapshot['p50']} ms  p90 {snapshot['p90']} ms  "
+          f"p99 {snapshot['p99']} ms  p99.9 {snapshot['p999']} ms  max {snapshot['max']} ms")
+
+
+def cmd_run(args):
+    profile = LoadProfile(args.profile, args.rate, args.duration, end_rate=args.end_rate,
+                          stages=parse_stages(args.stages) if args.stages else (), seed=args.seed)
+    print(f"📈 {profile.describe()} against {args.target} ({args.connections} connections)")
+    result = run_load(args.target, _requests(args), profile, connections=args.connections, timeout=args.timeout)
+    summary = result.summary()
+    print(f"✅ {summary['scheduled']} scheduled, {summary['errors']} errors, {summary['dropped']} dropped, "
+          f"{summary['achieved_rps']} rps achieved of {summary['offered_rps']} offered")
+    _print_latency('latency', summary['latency_ms'])
+    for label, snapshot in summary['routes'].items():
+        _print_latency(f"  {label}"[:28], snapshot)
+    _print_latency('generator send lag', summary['send_lag_ms'])
+    if args.output:
+        summary['histogram'] = result.latency.to_dict()
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        print(f"💾 Results saved to {args.output}")
+    return 0 if not result.errors else 1
+
+
+def cmd_find_max(args):
+    slo = SLO(args.slo_ms, args.quantile, args.max_error_rate)
+
+    def progress(trial):
+        print(f"  {'✅' if trial['passed'] else '❌'} {trial['rate']:>9.1f} rps: {trial['reason']}")
+
+    print(f"🔎 Max throughput at p{args.quantile * 100:g} <= {args.slo_ms:g} ms, "
+          f"errors <= {args.max_error_rate:.1%} ({args.step_duration:g}s per step)")
+    report = find_max_throughput(args.target, _requests(args), slo, start_rate=args.start_rate,
+                                 max_rate=args.max_rate, step_duration=args.step_duration, kind=args.profile,
+                                 precision=args.precision, cooldown=args.cooldown,
+                                 connections=args.connections, on_trial=progress)
+    limit = 'not reached' if not report['saturated'] else f"first failure at {report['first_failing_rps']} rps"
+    print(f"🏁 Max sustainable throughput: {report['max_sustainable_rps']} rps ({limit})")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Report saved to {args.output}")
+    return 0
+
+
+def cmd_merge(args):
+    merged, scheduled, errors = None, 0, 0
+    for path in args.results:
+        with open(path) as f:
+            data = json.load(f)
+        hist = LatencyHistogram.from_dict(data['histogram'])
+        merged = hist if merged is None else merged.merge(hist)
+        scheduled += data['scheduled']
+        errors += data['errors'] + data['dropped']
+    print(f"🧮 {len(args.results)} runs, {scheduled} requests, {errors} errors")
+    _print_latency('merged latency', merged.snapshot())
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Open-loop HTTP load generator')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def common(p):
+        p.add_argument('--target', required=True, help='Base URL, e.g. http://localhost:5000')
+        p.add_argument('--request', action='append',
+                       help="'METHOD /path [json body]', repeatable (default: 'GET /api/status')")
+        p.add_argument('--connections', type=int, default=64, help='Connection pool size')
+        p.add_argument('--output', default=None, help='Optional JSON results')
+
+    p = sub.add_parser('run', help='Run one load profile')
+    common(p)
+    p.add_argument('--profile', choices=['constant', 'poisson', 'step', 'ramp'], default='poisson')
+    p.add_argument('--rate', type=float, default=10.0, help='Arrival rate (start rate for ramp)')
+    p.add_argument('--end-rate', type=float, default=None, help='Final rate for ramp')
+    p.add_argument('--duration', type=float, default=30.0, help='Seconds (ignored for step)')
+    p.add_argument('--stages', default=None, help='Step stages as rps:seconds,... e.g. 10:30,20:30')
+    p.add_argument('--seed', type=int, default=None, help='Reproducible Poisson arrivals and request mix')
+    p.add_argument('--timeout', type=float, default=10.0)
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser('find-max', help='Search the max throughput that meets a latency/error SLO')
+    common(p)
+    p.add_argument('--slo-ms', type=float, required=True, help='Latency objective in ms')
+    p.add_argument('--quantile', type=float, default=0.99, help='Quantile the objective applies to')
+    p.add_argument('--max-error-rate', type=float, default=0.01)
+    p.add_argument('--profile', choices=['constant', 'poisson'], default='constant')
+    p.add_argument('--start-rate', type=float, default=10.0)
+    p.add_argument('--max-rate', type=float, default=10000.0)
+    p.add_argument('--step-duration', type=float, default=10.0, help='Seconds per trial')
+    p.add_argument('--precision', type=float, default=0.05, help='Relative width of the final interval')
+    p.add_argument('--cooldown', type=float, default=2.0, help='Seconds between trials')
+    p.set_defaults(func=cmd_find_max)
+
+    p = sub.add_parser('merge', help='Merge latency histograms of several run --output files')
+    p.add_argument('results', nargs='+')
+    p.set_defaults(func=cmd_merge)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
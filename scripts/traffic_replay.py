@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Traffic Replay
+
+Re-issues traffic captured by TRAFFIC_CAPTURE_ENABLED against a target with
+the original inter-arrival timing, and compares two replay runs.
+
+    # baseline and candidate runs of the same capture
+    python scripts/traffic_replay.py replay logs/traffic --target http://localhost:5000 --output base.jsonl
+    python scripts/traffic_replay.py replay logs/traffic --target http://localhost:5001 --speed 2 --output cand.jsonl
+    python scripts/traffic_replay.py compare base.jsonl cand.jsonl --output report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.traffic_capture import load_capture
+from vigoleonrocks.services.traffic_replay import (
+    VOLATILE_KEYS,
+    compare,
+    format_report,
+    load_results,
+    replay,
+    save_results,
+    summarize,
+)
+
+
+def cmd_replay(args):
+    records = load_capture(args.capture)
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        print("❌ No captured requests found")
+        return 1
+    span = records[-1]['ts'] - records[0]['ts']
+    print(f"⏯️  Replaying {len(records)} requests ({span:.1f}s captured) against {args.target} at {args.speed:g}x")
+
+    started = time.time()
+    results = replay(records, args.target, speed=args.speed, workers=args.workers, timeout=args.timeout)
+    save_results(results, args.output, meta={
+        'target': args.target, 'speed': args.speed, 'capture': args.capture, 'started': started,
+    })
+    summary = summarize(results)
+    print(f"✅ {summary['requests']} sent, {summary['skipped']} skipped, {summary['errors']} errors, "
+          f"p50 {summary['p50_ms']} ms, p99 {summary['p99_ms']} ms")
+    print(f"💾 Results saved to {args.output}")
+    return 0
+
+
+def cmd_compare(args):
+    base_meta, baseline = load_results(args.baseline)
+    cand_meta, candidate = load_results(args.candidate)
+    ignore = VOLATILE_KEYS | frozenset(args.ignore)
+    report = compare(baseline, candidate, ignore=ignore)
+    report['baseline_meta'], report['candidate_meta'] = base_meta, cand_meta
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Report saved to {args.output}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay captured traffic and compare runs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('replay', help='Re-issue captured requests against a target')
+    p.add_argument('capture', nargs='+', help='Capture files or directories')
+    p.add_argument('--target', required=True, help='Base URL, e.g. http://localhost:5000')
+    p.add_argument('--speed', type=float, default=1.0, help='Timing multiplier (2 = twice as fast, 0 = no waits)')
+    p.add_argument('--workers', type=int, default=32, help='Max requests in flight')
+    p.add_argument('--timeout', type=float, default=30.0)
+    p.add_argument('--limit', type=int, default=0, help='Replay only the first N requests')
+    p.add_argument('--output', required=True, help='Results JSONL')
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser('compare', help='Latency/error/response comparison of two replay runs')
+    p.add_argument('baseline')
+    p.add_argument('candidate')
+    p.add_argument('--ignore', nargs='*', default=[], help='Extra volatile JSON keys to ignore in body diffs')
+    p.add_argument('--output', default=None, help='Optional JSON report')
+    p.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+VIGOLEONROCKS Language Profile Trainer
+
+Rebuilds vigoleonrocks/data/langid/profiles.json from the bundled sample
+corpora (one ``<lang>.txt`` per language, one sentence per line).
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vigoleonrocks.services.language_identifier import (
+    DEFAULT_CORPUS_DIR,
+    DEFAULT_MODEL_PATH,
+    LanguageIdentifier,
+    evaluate,
+    load_heldout,
+    save_model,
+    train_profiles,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train character n-gram language profiles')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument('--output', type=Path, default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--top-k', type=int, default=3000, help='N-grams kept per language')
+    parser.add_argument('--alpha', type=float, default=0.1, help='Additive smoothing')
+    args = parser.parse_args()
+
+    model = train_profiles(args.corpus, top_k=args.top_k, alpha=args.alpha)
+    save_model(model, args.output)
+
+    size_kb = args.output.stat().st_size / 1024
+    print(f"✅ {len(model['profiles'])} language profiles written to {args.output} ({size_kb:.1f} KB)")
+    print(f"🌡️  Calibrated temperature: {model['temperature']}")
+
+    report = evaluate(LanguageIdentifier(args.output), load_heldout())
+    print(f"🎯 Held-out top-1: {report['top1_accuracy']:.3f}  top-3: {report['top3_accuracy']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
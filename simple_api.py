@@ -9,7 +9,6 @@ import sys
 import time
 import json
 import logging
-import hashlib
 import threading
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +18,8 @@ import http.server
 import socketserver
 from urllib.parse import urlparse, parse_qs
 
+from vigoleonrocks.services.entropy import get_entropy
+
 # Configuración básica
 PORT = int(os.getenv('PORT', '5000'))
 HOST = os.getenv('HOST', '0.0.0.0')
@@ -33,64 +34,12 @@ logger.info(f"PORT: {PORT}")
 # Logging configurado
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-class MetricsBasedRNG:
-    """Generador de números aleatorios basado en métricas del sistema (NO Math.random)"""
-    
-    def __init__(self):
-        self.entropy_pool = []
-        self._collect_system_metrics()
-    
-    def _collect_system_metrics(self):
-        """Recolecta métricas del sistema para generar entropía"""
-        try:
-            # Métricas de tiempo con microsegundos
-            current_time = str(time.time_ns())
-            
-            # Métricas de proceso
-            pid_metrics = str(os.getpid())
-            
-            # Métricas de memoria (usando información del sistema)
-            memory_info = str(hash(str(time.process_time_ns())))
-            
-            # Combinar métricas para crear semilla
-            combined_metrics = f"{current_time}{pid_metrics}{memory_info}"
-            
-            # Hash de las métricas para crear entropía
-            entropy_hash = hashlib.sha256(combined_metrics.encode()).hexdigest()
-            
-            # Convertir hash a números
-            for i in range(0, len(entropy_hash), 8):
-                chunk = entropy_hash[i:i+8]
-                self.entropy_pool.append(int(chunk, 16) % 1000)
-                
-            logger.info(f"✓ Sistema de aleatoriedad basado en métricas inicializado con {len(self.entropy_pool)} valores de entropía")
-            
-        except Exception as e:
-            logger.warning(f"⚠ Error recolectando métricas del sistema: {e}")
-            # Fallback usando tiempo
-            self.entropy_pool = [int(str(time.time_ns())[-3:])]
-    
-    def get_random_choice(self, choices):
-        """Selecciona un elemento aleatorio usando métricas del sistema"""
-        if not self.entropy_pool:
-            self._collect_system_metrics()
-        
-        # Usar métricas del sistema para seleccionar
-        entropy_value = self.entropy_pool.pop(0) if self.entropy_pool else int(str(time.time_ns())[-3:])
-        index = entropy_value % len(choices)
-        
-        # Recoletar más métricas si se agota el pool
-        if len(self.entropy_pool) < 5:
-            self._collect_system_metrics()
-        
-        return choices[index]
-
 class VIGOLEONROCKSServer:
     def __init__(self):
         """Inicializa el servidor VIGOLEONROCKS con generador basado en métricas"""
         self.start_time = time.time()
         self.request_count = 0
-        self.metrics_rng = MetricsBasedRNG()  # Usar métricas del sistema, NO Math.random
+        self.entropy = get_entropy()  # Entropía compartida (reproducible con ENTROPY_SEED)
         self.context_capacity = 500000  # UNIFIED STANDARD - LÍDER INDUSTRIAL 2025
         
         # Respuestas multilingües
@@ -129,7 +78,7 @@ class VIGOLEONROCKSServer:
             'quantum_processor': 'active',
             'background_execution': True,
             'timestamp': datetime.now().isoformat(),
-            'entropy_pool_size': len(self.metrics_rng.entropy_pool)
+            'entropy_mode': 'deterministic' if self.entropy.deterministic else 'csprng_seeded'
         }
     
     def process_api_request(self, token=None, message="", language="es"):
@@ -145,7 +94,7 @@ class VIGOLEONROCKSServer:
         
         # Seleccionar respuesta usando métricas del sistema (NO Math.random)
         if message.lower() in ['hola', 'hello', 'hi', 'hey']:
-            greeting = self.metrics_rng.get_random_choice(self.responses['greetings'].get(language, self.responses['greetings']['es']))
+            greeting = self.entropy.choice(self.responses['greetings'].get(language, self.responses['greetings']['es']))
             return {
                 'response': greeting,
                 'language': language,
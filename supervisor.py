@@ -13,11 +13,14 @@ import requests
 
 # --- Configuración ---
 LOG_DIR = "logs"
-SERVER_SCRIPT = "flask_app_fast.py"
+SERVER_SCRIPT = os.environ.get("SUPERVISOR_SERVER_SCRIPT", "main.py")  # App Factory con /livez, /readyz, /startupz
 SUPERVISOR_LOG = os.path.join(LOG_DIR, "supervisor.log")
-SERVER_STDOUT = os.path.join(LOG_DIR, "flask_fast.out.log")
-SERVER_STDERR = os.path.join(LOG_DIR, "flask_fast.err.log")
-HEALTH_CHECK_URL = "http://127.0.0.1:5000/health"
+SERVER_STDOUT = os.path.join(LOG_DIR, "server.out.log")
+SERVER_STDERR = os.path.join(LOG_DIR, "server.err.log")
+BASE_URL = os.environ.get("SUPERVISOR_BASE_URL", "http://127.0.0.1:5000")
+STARTUP_TIMEOUT = float(os.environ.get("SUPERVISOR_STARTUP_TIMEOUT", 180))  # warmup incluido
+LIVENESS_FAILURES_BEFORE_RESTART = int(os.environ.get("SUPERVISOR_LIVENESS_FAILURES", 3))
+CHECK_INTERVAL = float(os.environ.get("SUPERVISOR_CHECK_INTERVAL", 15))
 
 # --- Configuración de Logging del Supervisor ---
 logging.basicConfig(
@@ -48,36 +51,106 @@ def launch_server_process():
     logging.info(f"Servidor lanzado como subproceso con PID: {process.pid}")
     return process
 
+def probe(name):
+    """Consulta un probe del App Factory. Devuelve (ok, informe o mensaje de error)."""
+    try:
+        response = requests.get(f"{BASE_URL}/{name}", timeout=3)
+    except requests.ConnectionError:
+        return False, "fallo de conexión"
+    except Exception as e:
+        return False, f"error inesperado: {e}"
+    try:
+        report = response.json()
+    except ValueError:
+        report = {"status": response.status_code}
+    return response.status_code == 200, report
+
+def failing_checks(report):
+    """Nombres de las comprobaciones que fallaron en un informe de probe."""
+    if not isinstance(report, dict):
+        return report
+    failed = [name for name, check in report.get("checks", {}).items() if not check.get("ok")]
+    tasks = report.get("warmup", {}).get("tasks", {})
+    failed += [f"warmup:{name}" for name, task in tasks.items() if task.get("status") == "failed"]
+    return ", ".join(failed) or report.get("status")
+
+def wait_for_startup(server_process):
+    """Espera a que /startupz responda 200 (warmup terminado). Devuelve False si hay que reiniciar."""
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if server_process.poll() is not None:
+            return False
+        ok, report = probe("startupz")
+        if ok:
+            logging.info(f"Startup ✅: warmup completado (PID: {server_process.pid})")
+            return True
+        time.sleep(1)
+    logging.error(f"Startup ❌: el servidor no completó el arranque en {STARTUP_TIMEOUT:.0f}s")
+    return False
+
+def restart_server(server_process, reason):
+    """Detiene el proceso (si sigue vivo) y lanza uno nuevo."""
+    logging.error(f"¡FALLO DETECTADO! {reason}")
+    if server_process.poll() is None:
+        server_process.terminate()
+        try:
+            server_process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server_process.kill()
+    logging.info("Reiniciando el servidor en 10 segundos...")
+    time.sleep(10)
+    return launch_server_process()
+
 def main_loop():
-    """El bucle principal del supervisor."""
+    """
+    El bucle principal del supervisor.
+
+    - /startupz: se espera al warmup antes de vigilar el proceso
+    - /livez: N fallos consecutivos (p. ej. singletons bloqueados) => reinicio
+    - /readyz: solo se registra; un worker saturado o con modelos caídos no se reinicia
+    """
     logging.info("Iniciando supervisor de procesos VIGOLEONROCKS.")
     server_process = launch_server_process()
-    time.sleep(5) # Dar tiempo inicial para que el servidor arranque
+    started = wait_for_startup(server_process)
+    liveness_failures = 0
+    was_ready = None
 
     while True:
-        # 1. Verificar si el proceso del servidor sigue vivo
+        # 1. Verificar si el proceso del servidor sigue vivo y arrancó
         poll_result = server_process.poll()
-        if poll_result is not None:
-            logging.error(f"¡FALLO DETECTADO! El proceso del servidor ha terminado inesperadamente con código de salida: {poll_result}.")
-            logging.info("Reiniciando el servidor en 10 segundos...")
-            time.sleep(10)
-            server_process = launch_server_process()
+        if poll_result is not None or not started:
+            reason = (f"El proceso del servidor ha terminado inesperadamente con código de salida: {poll_result}."
+                      if poll_result is not None else "El servidor no completó el arranque.")
+            server_process = restart_server(server_process, reason)
+            started = wait_for_startup(server_process)
+            liveness_failures, was_ready = 0, None
             continue # Volver al inicio del bucle
 
-        # 2. Verificar la salud del endpoint HTTP
-        try:
-            response = requests.get(HEALTH_CHECK_URL, timeout=3)
-            if response.status_code == 200:
-                logging.info(f"Health Check ✅: Servidor OK (PID: {server_process.pid}, Status: {response.status_code})")
+        # 2. Liveness: reiniciar solo tras fallos consecutivos
+        alive, report = probe("livez")
+        if alive:
+            liveness_failures = 0
+        else:
+            liveness_failures += 1
+            logging.warning(f"Liveness ⚠️ ({liveness_failures}/{LIVENESS_FAILURES_BEFORE_RESTART}): "
+                            f"{failing_checks(report)}")
+            if liveness_failures >= LIVENESS_FAILURES_BEFORE_RESTART:
+                server_process = restart_server(server_process, "El servidor no supera /livez.")
+                started = wait_for_startup(server_process)
+                liveness_failures, was_ready = 0, None
+                continue
+
+        # 3. Readiness: registrar los cambios de estado
+        ready, report = probe("readyz")
+        if ready != was_ready:
+            if ready:
+                logging.info(f"Readiness ✅: Servidor listo (PID: {server_process.pid})")
             else:
-                logging.warning(f"Health Check ⚠️: El servidor respondió con status {response.status_code}")
-        except requests.ConnectionError:
-            logging.error("Health Check ❌: Fallo de conexión. El servidor no responde en el puerto.")
-        except Exception as e:
-            logging.error(f"Health Check ❌: Ocurrió un error inesperado: {e}")
+                logging.warning(f"Readiness ⚠️: Servidor no listo: {failing_checks(report)}")
+            was_ready = ready
 
         # Esperar para el próximo ciclo de monitoreo
-        time.sleep(15)
+        time.sleep(CHECK_INTERVAL)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batched quantum image analysis
+Batch results must match the single-image path and isolate failures
+"""
+import io
+import os
+import sys
+import zipfile
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from PIL import Image
+
+from quantum_image_processor import (
+    analyze_image_quantum, analyze_images_quantum_batch, read_zip_images,
+)
+
+
+def _png(width, height, seed):
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def _strip_timing(result):
+    result['metadata'].pop('processing_time_ms', None)
+    return result
+
+
+def test_batch_matches_single_image_results():
+    """Same-size images share one stack; mixed sizes go to separate groups"""
+    images = [(_png(96, 64, i), f'img{i}.png') for i in range(3)] + [(_png(40, 50, 9), 'other.png')]
+    batch = analyze_images_quantum_batch(images, max_workers=2)
+    assert len(batch) == len(images)
+    for (data, name), result in zip(images, batch):
+        single = _strip_timing(analyze_image_quantum(data, name))
+        result = _strip_timing(result)
+        assert result['processing_type'] == 'quantum_image_analysis_26D'
+        assert result['analysis'] == single['analysis']
+        quantum, expected = result['metadata']['quantum'], single['metadata']['quantum']
+        for key in ('fft', 'symmetry'):
+            for metric, value in expected[key].items():
+                assert quantum[key][metric] == pytest.approx(value, rel=1e-4, abs=1e-6)
+        assert quantum['entanglement']['grid_means'] == pytest.approx(expected['entanglement']['grid_means'], abs=1e-4)
+        assert quantum['dimension_scores'] == pytest.approx(expected['dimension_scores'], abs=1e-4)
+
+
+def test_corrupt_image_is_isolated():
+    images = [(_png(32, 32, 1), 'ok.png'), (b'not an image', 'broken.png'), (_png(32, 32, 2), 'ok2.png')]
+    results = analyze_images_quantum_batch(images)
+    assert [r['processing_type'] for r in results] == [
+        'quantum_image_analysis_26D', 'error', 'quantum_image_analysis_26D']
+    assert results[1]['metadata']['filename'] == 'broken.png'
+    assert results[0]['metadata']['filename'] == 'ok.png'
+
+
+def test_tiny_images_batch_without_errors():
+    """Images smaller than the 3x3 entanglement grid still produce results"""
+    results = analyze_images_quantum_batch([(_png(2, 2, 3), 'a.png'), (_png(2, 2, 4), 'b.png')])
+    assert all(r['processing_type'] != 'error' for r in results)
+    assert results[0]['metadata']['quantum']['entanglement']['grid_means'] == [0.0] * 9
+
+
+def test_read_zip_images_filters_members():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('a.png', _png(8, 8, 1))
+        zf.writestr('nested/b.JPG', b'jpeg bytes')
+        zf.writestr('notes.txt', b'hello')
+        zf.writestr('__MACOSX/._a.png', b'resource fork')
+        zf.writestr('big.png', b'x' * 2000)
+    images, rejected = read_zip_images(buf.getvalue(), max_image_bytes=1000)
+    assert [name for _, name in images] == ['a.png', 'nested/b.JPG']
+    assert {r['filename'] for r in rejected} == {'notes.txt', 'big.png'}
+    with pytest.raises(ValueError):
+        read_zip_images(buf.getvalue(), max_images=1)
+    with pytest.raises(ValueError):
+        read_zip_images(b'not a zip')
@@ -0,0 +1,194 @@
+"""
+Tests del control de admisión y descarte de carga
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import threading
+import time
+
+import pytest
+
+from vigoleonrocks.services.admission_control import (
+    AdmissionController,
+    ConcurrencyGate,
+    ConcurrencyLimit,
+    InFlightCounter,
+    Overloaded,
+    _deadline,
+    parse_deadline_headers,
+    parse_limit,
+    parse_route_limits,
+    propagation_headers,
+    remaining_time,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_limit_variants():
+    assert parse_limit("8") == ConcurrencyLimit(8, 0, None)
+    assert parse_limit("4 queue 16") == ConcurrencyLimit(4, 16, None)
+    assert parse_limit("2 queue 4 wait 500ms") == ConcurrencyLimit(2, 4, 0.5)
+    assert parse_limit("2 QUEUE 4 WAIT 2s") == ConcurrencyLimit(2, 4, 2.0)
+    with pytest.raises(ValueError):
+        parse_limit("many")
+    with pytest.raises(ValueError):
+        parse_limit("0")
+
+
+def test_parse_route_limits_with_exempt():
+    limits = parse_route_limits("/api/v2/performance=2 queue 4, /health=exempt,garbage")
+    assert limits == {'/api/v2/performance': ConcurrencyLimit(2, 4), '/health': None}
+
+
+def test_in_flight_counter_is_atomic_under_threads():
+    counter = InFlightCounter()
+
+    def worker():
+        for _ in range(2000):
+            counter.increment()
+            counter.decrement()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.value == 0
+    assert counter.total == 16000
+    assert 1 <= counter.peak <= 8
+
+
+def test_longest_prefix_route_and_exempt():
+    controller = AdmissionController('8', {'/api/v2/': '4', '/api/v2/metrics': 'exempt'})
+    assert controller.gate_for('/api/v2/chat').limit.max_concurrency == 4
+    assert controller.gate_for('/api/v2/metrics') is None
+    assert controller.gate_for('/').name == 'default'
+
+    ticket = controller.admit('/api/v2/metrics')
+    assert controller.in_flight.value == 1
+    ticket.release()
+    ticket.release()  # idempotente
+    assert controller.in_flight.value == 0
+
+
+def test_queue_full_rejected_with_retry_after():
+    controller = AdmissionController('1 queue 0')
+    ticket = controller.admit('/x')
+    with pytest.raises(Overloaded) as info:
+        controller.admit('/x')
+    assert info.value.reason == 'queue_full'
+    assert info.value.retry_after >= 1
+    assert controller.in_flight.value == 1  # el rechazado no cuenta en curso
+    ticket.release()
+    controller.admit('/x').release()
+    assert controller.stats()['gates']['default']['shed_total']['queue_full'] == 1
+
+
+def test_waiter_admitted_fifo_when_slot_frees():
+    gate = ConcurrencyGate('g', ConcurrencyLimit(1, 4), queue_timeout=2.0)
+    first = gate.acquire()
+    order = []
+
+    def waiter(name):
+        with gate.acquire():
+            order.append(name)
+
+    threads = []
+    for name in ('a', 'b'):
+        t = threading.Thread(target=waiter, args=(name,))
+        t.start()
+        threads.append(t)
+        while gate.stats()['queued'] < len(threads):
+            time.sleep(0.001)
+    first.release()
+    for t in threads:
+        t.join(2)
+    assert order == ['a', 'b']
+    assert gate.stats()['active'] == 0 and gate.stats()['queued'] == 0
+
+
+def test_queue_wait_times_out_and_abandoned_waiter_is_skipped():
+    gate = ConcurrencyGate('g', ConcurrencyLimit(1, 4), queue_timeout=0.02)
+    holder = gate.acquire()
+    with pytest.raises(Overloaded) as info:
+        gate.acquire()
+    assert info.value.reason == 'timeout'
+    holder.release()
+    assert gate.stats()['active'] == 0  # el abandonado no recibió la plaza
+    gate.acquire().release()
+
+
+def test_expired_deadline_is_shed_before_work():
+    clock = FakeClock()
+    gate = ConcurrencyGate('g', ConcurrencyLimit(4, 4), clock=clock)
+    with pytest.raises(Overloaded) as info:
+        gate.acquire(deadline=clock.now - 0.001)
+    assert info.value.reason == 'deadline'
+    assert gate.stats()['active'] == 0
+
+
+def test_codel_sheds_standing_upstream_queue_and_recovers():
+    clock = FakeClock()
+    gate = ConcurrencyGate('g', ConcurrencyLimit(4, 0), codel_target=0.01, codel_interval=0.1, clock=clock)
+    holder = gate.acquire()
+    # peticiones que llegan tras 50 ms en la cola del servidor: una ráfaga breve se admite
+    clock.now += 0.05
+    gate.acquire(enqueued_at=clock.now - 0.05).release()
+    # la cola previa sigue de pie más de un intervalo: se descarta con 503 rápido
+    clock.now += 0.2
+    with pytest.raises(Overloaded) as info:
+        gate.acquire(enqueued_at=clock.now - 0.05)
+    assert info.value.reason == 'codel'
+    assert gate.stats()['overloaded']
+    # una petición sin espera previa demuestra que la cola se ha vaciado
+    gate.acquire(enqueued_at=clock.now).release()
+    assert not gate.stats()['overloaded']
+    holder.release()
+
+
+def test_codel_shortens_queue_wait_when_overloaded():
+    gate = ConcurrencyGate('g', ConcurrencyLimit(1, 8), codel_target=0.005,
+                           codel_interval=0.01, queue_timeout=5.0)
+    holder = gate.acquire()
+    time.sleep(0.02)  # ninguna entrada rápida durante el intervalo
+    start = time.monotonic()
+    with pytest.raises(Overloaded) as info:
+        gate.acquire()
+    assert info.value.reason == 'codel'
+    assert time.monotonic() - start < 1.0  # no espera los 5 s de queue_timeout
+    holder.release()
+
+
+def test_deadline_headers_and_propagation():
+    now = time.time()
+    deadline, enqueued_at = parse_deadline_headers({
+        'X-Request-Start': f"t={int((now - 0.5) * 1e6)}",
+        'X-Request-Timeout': '2',
+    })
+    assert enqueued_at == pytest.approx(time.monotonic() - 0.5, abs=0.05)
+    assert deadline == pytest.approx(enqueued_at + 2, abs=0.001)
+
+    deadline, _ = parse_deadline_headers({'X-Request-Deadline': str(now + 3)})
+    assert deadline - time.monotonic() == pytest.approx(3, abs=0.05)
+    assert parse_deadline_headers({'X-Request-Timeout': 'soon'}) == (None, None)
+
+    assert remaining_time() is None and propagation_headers() == {}
+    token = _deadline.set(time.monotonic() + 1.5)
+    try:
+        assert 1.0 < remaining_time() <= 1.5
+        assert float(propagation_headers()['X-Request-Timeout']) <= 1.5
+    finally:
+        _deadline.reset(token)
+
+
+def test_default_timeout_applied_when_no_deadline():
+    controller = AdmissionController('2', default_timeout=30)
+    ticket = controller.admit('/x')
+    assert ticket.deadline == pytest.approx(time.monotonic() + 30, abs=0.1)
+    ticket.release()
@@ -0,0 +1,156 @@
+"""
+Tests del pipeline de audio en memoria y la transcripción por ventanas
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import io
+import math
+import threading
+import time
+import wave
+from array import array
+
+import pytest
+
+from vigoleonrocks.services.audio_pipeline import (
+    SAMPLE_RATE, EnergyVAD, SpeechWindower, StreamingTranscriber, TranscriptionStats,
+    decode_pcm16k, decode_pcm16k_bytes, stitch, voice_activity_summary,
+)
+
+
+def synth(pattern, rate=SAMPLE_RATE):
+    """PCM int16 mono: ``pattern`` es una lista de ('tone'|'silence', segundos)"""
+    samples = array('h')
+    for kind, seconds in pattern:
+        for i in range(int(rate * seconds)):
+            samples.append(int(10000 * math.sin(2 * math.pi * 440 * i / rate)) if kind == 'tone' else 0)
+    return samples.tobytes()
+
+
+def wav_bytes(pcm, rate=SAMPLE_RATE, channels=1):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        if channels > 1:
+            mono = array('h')
+            mono.frombytes(pcm)
+            pcm = array('h', [s for s in mono for _ in range(channels)]).tobytes()
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def window_labels(window):
+    """Transcriptor de reemplazo: un segmento por segundo de audio con su tiempo absoluto"""
+    segments = []
+    second = math.ceil(window.start_s)
+    while second + 0.5 <= window.start_s + window.duration_s:
+        start = second - window.start_s
+        segments.append((start, start + 0.5, f"s{second}"))
+        second += 1
+    return segments
+
+
+def test_decode_wav_resamples_and_downmixes_without_temp_files():
+    pcm = synth([('tone', 2.0)], rate=44100)
+    chunks = list(decode_pcm16k(wav_bytes(pcm, rate=44100, channels=2), chunk_seconds=0.5))
+    assert len(chunks) > 1
+    assert abs(sum(len(c) for c in chunks) / 2 - 2 * SAMPLE_RATE) <= 2
+    assert decode_pcm16k_bytes(wav_bytes(synth([('tone', 1.0)]))) == synth([('tone', 1.0)])
+
+
+def test_decode_rejects_unknown_format():
+    with pytest.raises(Exception):  # ValueError sin PyAV; error de PyAV si está instalado
+        list(decode_pcm16k(b'not audio at all'))
+
+
+def test_vad_skips_silence_and_reports_speech_ratio():
+    pcm = synth([('silence', 2.0), ('tone', 1.0), ('silence', 2.0), ('tone', 1.0), ('silence', 1.0)])
+    summary = voice_activity_summary(pcm)
+    assert summary['speech_regions'] == 2
+    assert summary['duration_s'] == pytest.approx(7.0, abs=0.05)
+    assert 0.25 < summary['speech_ratio'] < 0.45
+
+
+def test_vad_adapts_to_noise_floor():
+    vad = EnergyVAD(threshold_dbfs=-60, margin_db=10)
+    noise = [vad.is_speech(-50.0) for _ in range(500)]  # 15 s de ruido de fondo estable
+    assert noise[0]
+    assert not any(noise[400:])  # deja de contar como voz
+    assert vad.is_speech(-20.0)
+
+
+def test_windows_overlap_and_cut_points_partition_speech():
+    windower = SpeechWindower(EnergyVAD(), window_s=2.0, overlap_s=0.5)
+    pcm = synth([('tone', 5.0)])
+    windows = list(windower.feed(pcm)) + list(windower.flush())
+    assert len(windows) >= 3
+    for prev, nxt in zip(windows, windows[1:]):
+        assert nxt.start_s < prev.start_s + prev.duration_s  # solapan
+        assert prev.cut_end == pytest.approx(nxt.cut_start)  # sin huecos ni duplicados
+    assert all(w.duration_s <= 2.0 for w in windows)
+
+
+def test_stitch_keeps_segments_owned_by_window():
+    windower = SpeechWindower(None, window_s=2.0, overlap_s=0.5)
+    windows = list(windower.feed(synth([('tone', 3.0)]))) + list(windower.flush())
+    first = windows[0]
+    kept = stitch(first, [(0.0, 0.5, 'a'), (1.5, 2.0, 'b')])
+    assert [s.text for s in kept] == ['a']  # 'b' cae en el solape que pertenece a la siguiente
+    assert stitch(first, '  ') == []
+
+
+def test_streaming_transcription_has_absolute_timestamps_without_duplicates():
+    pcm = synth([('silence', 1.0), ('tone', 6.0), ('silence', 2.0), ('tone', 3.0)])
+    transcriber = StreamingTranscriber(window_labels, concurrency=3, window_s=2.0, overlap_s=0.5)
+    result = transcriber.transcribe(wav_bytes(pcm))
+    labels = [s.text for s in result.segments]
+    assert len(labels) == len(set(labels))
+    starts = [s.start for s in result.segments]
+    assert starts == sorted(starts)
+    assert {'s2', 's5', 's10'} <= set(labels)
+    assert not {'s8'} & set(labels)  # silencio: no se transcribe
+    assert result.stats.speech_s < result.stats.audio_s
+    assert result.stats.windows > 3
+
+
+def test_stream_yields_in_order_with_bounded_concurrency():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow(window):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02 if window.index % 2 else 0.05)  # terminan desordenadas
+        with lock:
+            active[0] -= 1
+        return f"w{window.index}"
+
+    stats = TranscriptionStats()
+    transcriber = StreamingTranscriber(slow, concurrency=2, vad=False, window_s=1.0, overlap_s=0.1)
+    segments = list(transcriber.stream(synth([('tone', 6.0)]), stats,
+                                       chunks=iter([synth([('tone', 6.0)])])))
+    assert [s.window for s in segments] == sorted(s.window for s in segments)
+    assert peak[0] <= 2
+    assert stats.peak_windows_in_flight <= 3
+
+
+def test_transcriber_errors_propagate():
+    def broken(window):
+        raise RuntimeError('decoder failure')
+
+    transcriber = StreamingTranscriber(broken, vad=False, window_s=1.0, overlap_s=0.1)
+    with pytest.raises(RuntimeError):
+        transcriber.transcribe(synth([('tone', 1.0)]), chunks=iter([synth([('tone', 1.0)])]))
+
+
+def test_short_regions_are_packed_and_mapped_back_to_original_times():
+    pcm = synth([('tone', 1.0), ('silence', 3.0), ('tone', 1.0), ('silence', 3.0), ('tone', 1.0)])
+    windower = SpeechWindower(EnergyVAD(), window_s=10.0, overlap_s=1.0)
+    windows = list(windower.feed(pcm)) + list(windower.flush())
+    assert len(windows) == 1 and windower.regions == 3
+    window = windows[0]
+    assert window.duration_s < 5.0  # sin los silencios
+    second_region = window.pieces[1][0] / SAMPLE_RATE
+    assert window.to_absolute(second_region + 0.5) == pytest.approx(4.5, abs=0.2)
+    assert window.to_absolute(0.5) == pytest.approx(0.5, abs=0.2)
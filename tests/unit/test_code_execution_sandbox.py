@@ -0,0 +1,161 @@
+"""
+Tests for the sandboxed code execution verifier
+VIGOLEONROCKS - Quantum Code Engine
+"""
+import os
+
+import pytest
+
+from enhancements.code_execution_sandbox import (
+    _apply_rlimits,
+    ExecutionVerifier,
+    SandboxLimits,
+    SandboxWorkerPool,
+    FunctionTestCase,
+)
+
+
+@pytest.fixture(scope="module")
+def verifier():
+    pool = SandboxWorkerPool(size=2, limits=SandboxLimits(cpu_seconds=1, wall_timeout=1.5))
+    yield ExecutionVerifier(pool=pool)
+    pool.close()
+
+
+def test_captures_stdout_and_stderr(verifier):
+    result = verifier.verify("import sys\nprint('out')\nprint('err', file=sys.stderr)")
+    assert result.success
+    assert result.stdout == "out\n"
+    assert result.stderr == "err\n"
+
+
+def test_reports_runtime_errors(verifier):
+    result = verifier.verify("raise ValueError('boom')")
+    assert not result.success
+    assert "ValueError: boom" in result.error
+
+
+def test_infinite_loop_is_stopped(verifier):
+    result = verifier.verify("while True:\n    pass")
+    assert not result.success
+    assert result.timed_out or result.crashed
+    # The pool must stay usable afterwards
+    assert verifier.verify("x = 1").success
+
+
+def test_test_case_pass_rate(verifier):
+    code = "def add(a, b):\n    return a + b"
+    result = verifier.run_test_cases(code, "add", [((1, 2), 3), ((2, 2), 5), FunctionTestCase(args=(0, 0), expected=0)])
+    assert result.success
+    assert result.tests_passed == 2
+    assert result.pass_rate == pytest.approx(2 / 3)
+
+
+def test_missing_function_is_reported(verifier):
+    result = verifier.run_test_cases("x = 1", "solution", [((1,), 1)])
+    assert not result.success
+    assert "solution" in result.error
+
+
+def test_sandbox_state_does_not_leak(verifier):
+    verifier.verify("import builtins\nbuiltins.leaked = True")
+    result = verifier.verify("import builtins\nassert not hasattr(builtins, 'leaked')")
+    assert result.success
+
+
+def test_network_is_disabled(verifier):
+    code = "import socket\ns = socket.create_connection(('127.0.0.1', 9), timeout=0.5)"
+    result = verifier.verify(code)
+    assert not result.success
+    assert result.network_isolation in ("namespace", "python")
+
+
+def test_code_verifier_runs_generated_code(verifier):
+    from enhancements.quantum_code_engine import (
+        CodeProblemType, ProgrammingLanguage, QuantumCodeSolution, QuantumCodeVerifier,
+    )
+
+    solution = QuantumCodeSolution(
+        problem="sort", problem_type=CodeProblemType.SORTING, language=ProgrammingLanguage.PYTHON,
+        generation_steps=[], final_code="def solution(arr):\n    return sorted(arr)",
+        quantum_coherence_score=0.9, dimensions_utilized=[1, 2, 3], sacred_geometry_insights=[],
+        verification_results={}, alternative_implementations=[], confidence_level=0.9,
+        time_complexity="O(n log n)", space_complexity="O(n)", computation_time=0.0,
+    )
+    code_verifier = QuantumCodeVerifier(execution_verifier=verifier)
+
+    results = code_verifier.verify_code_solution(
+        solution, test_cases=[(([2, 1],), [1, 2])], function_name="solution"
+    )
+    assert results["executes_cleanly"] is True
+    assert results["tests_passed"] is True
+
+    solution.final_code = "def solution(arr):\n    return undefined_name"
+    results = code_verifier.verify_code_solution(
+        solution, test_cases=[(([2, 1],), [1, 2])], function_name="solution"
+    )
+    assert results["syntax_valid"] is True
+    assert results["tests_passed"] is False
+
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_memory_limit_is_a_budget_on_top_of_the_inherited_address_space():
+    """A worker that is already large (torch, CLIP loaded) must not fail every execution"""
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            ballast = bytearray(400 * 1024 * 1024)  # inherited from the "server"
+            _apply_rlimits(SandboxLimits())
+            x = [i for i in range(100000)]
+            try:
+                hog = bytearray(512 * 1024 * 1024)
+                code = 2
+            except MemoryError:
+                code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="forked children only on POSIX")
+def test_child_only_keeps_its_result_pipe(verifier):
+    code = (
+        "import os\n"
+        "open_fds = []\n"
+        "for fd in range(3, 1024):\n"
+        "    try:\n"
+        "        os.fstat(fd)\n"
+        "        open_fds.append(fd)\n"
+        "    except OSError:\n"
+        "        pass\n"
+        "print(len(open_fds))\n"
+    )
+    result = verifier.verify(code)
+    assert result.success and result.stdout == "1\n"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="forked children only on POSIX")
+def test_forged_result_bytes_are_never_unpickled(verifier):
+    # A pickle payload that would run code in the worker if it were deserialized
+    code = (
+        "import os, pickle\n"
+        "class Evil:\n"
+        "    def __reduce__(self):\n"
+        "        return (os.system, ('touch /tmp/sandbox-escaped',))\n"
+        "for fd in range(3, 1024):\n"
+        "    try:\n"
+        "        os.write(fd, pickle.dumps(Evil()))\n"
+        "    except OSError:\n"
+        "        pass\n"
+        "os._exit(0)\n"
+    )
+    if os.path.exists("/tmp/sandbox-escaped"):
+        os.remove("/tmp/sandbox-escaped")
+    result = verifier.verify(code)
+    assert not result.success and result.crashed
+    assert "malformed" in result.error
+    assert not os.path.exists("/tmp/sandbox-escaped")
+    assert verifier.verify("print('still fine')").stdout == "still fine\n"
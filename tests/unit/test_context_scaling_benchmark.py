@@ -0,0 +1,50 @@
+"""
+Tests del benchmark de escalado de contexto largo
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import pytest
+
+from benchmarks.context_scaling_benchmark import measure_point, run_suite, summarize_stage
+from vigoleonrocks.services.context_scaling import CHARS_PER_TOKEN, fit_scaling_exponent, generate_document
+
+
+def test_documents_are_deterministic_and_sized():
+    first = generate_document(10_000, seed=7)
+    assert first == generate_document(10_000, seed=7)
+    assert first != generate_document(10_000, seed=8)
+    assert len(first) == 10_000 * CHARS_PER_TOKEN
+    assert "\n\n" in first
+
+
+@pytest.mark.parametrize("exponent", [0.5, 1.0, 2.0])
+def test_fit_recovers_power_law(exponent):
+    sizes = [1_000, 10_000, 100_000, 500_000]
+    fit = fit_scaling_exponent(sizes, [3.0 * n ** exponent for n in sizes])
+    assert fit["exponent"] == pytest.approx(exponent, abs=1e-3)
+    assert fit["r2"] == pytest.approx(1.0)
+    assert fit_scaling_exponent([1_000], [1.0]) == {"exponent": None, "r2": None}
+
+
+def test_summary_flags_superlinear_stage():
+    points = [{"tokens": n, "status": "ok", "latency_ms": n ** 2 / 1e6, "rss_growth_mb": 1.0,
+               "alloc_peak_mb": n / 1e5} for n in (1_000, 10_000, 100_000)]
+    summary = summarize_stage(points + [{"tokens": 500_000, "status": "timeout"}])
+    assert summary["superlinear"]
+    assert summary["timed_out"]
+    assert summary["status"] == "partial"
+
+
+def test_measure_point_records_latency_and_allocations():
+    point = measure_point("dimension_activator", 1_000, repeats=2)
+    assert point["status"] == "ok"
+    assert len(point["latency_runs_ms"]) == 2
+    assert point["alloc_peak_mb"] > 0
+    assert point["peak_rss_mb"] > 0
+
+
+def test_unreachable_http_stage_stops_after_first_size():
+    report = run_suite(["http"], [1_000, 10_000], repeats=1, trace=False, isolate=False,
+                       options={"base_url": "http://127.0.0.1:9", "http_timeout": 1.0})
+    summary = report["stages"]["http"]
+    assert summary["status"] == "error"
+    assert len(summary["points"]) == 1
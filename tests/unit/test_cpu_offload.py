@@ -0,0 +1,80 @@
+"""
+Tests del pool de procesos para imágenes
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import hashlib
+import os
+import time
+
+import pytest
+
+from vigoleonrocks.services.cpu_offload import CPUOffloadPool, OffloadTimeout
+
+
+def digest_with_pid(data, salt=b''):
+    return hashlib.sha256(salt + data).hexdigest(), os.getpid()
+
+
+def sleepy(data, seconds):
+    time.sleep(seconds)
+    return len(data)
+
+
+def failing(data):
+    raise ValueError(f"imagen corrupta ({len(data)} bytes)")
+
+
+@pytest.fixture
+def pool():
+    pool = CPUOffloadPool(workers=2, timeout=10, max_tasks_per_worker=3, shm_min_bytes=1024,
+                          warm_modules=('hashlib',))
+    yield pool
+    pool.shutdown()
+
+
+def test_runs_in_worker_processes_with_shared_memory(pool):
+    assert pool.start()
+    big, small = os.urandom(256 * 1024), b'tiny'
+    digest, pid = pool.run(digest_with_pid, big, salt=b'x')
+    assert digest == hashlib.sha256(b'x' + big).hexdigest() and pid != os.getpid()
+    assert pool.run(digest_with_pid, small)[0] == hashlib.sha256(small).hexdigest()
+    assert pool.counters['shm_bytes'] == len(big)
+    assert pool.counters['pickled_bytes'] == len(small)
+    assert pool.counters['inline'] == 0
+
+
+def test_workers_are_recycled_after_max_tasks(pool):
+    pids = {pool.run(digest_with_pid, b'data')[1] for _ in range(12)}
+    assert len(pids) > pool.workers  # 12 tareas, 3 por worker
+
+
+def test_manual_recycling_without_max_tasks_per_child(pool, monkeypatch):
+    """Python < 3.11: el pool completo se sustituye cada max_tasks_per_worker tareas"""
+    from vigoleonrocks.services import cpu_offload
+    monkeypatch.setattr(cpu_offload, 'NATIVE_MAX_TASKS', False)
+    monkeypatch.setattr(cpu_offload, 'HAS_CANCEL_FUTURES', False)
+    pids = {pool.run(digest_with_pid, b'data')[1] for _ in range(12)}
+    assert len(pids) > pool.workers
+    assert pool.counters['completed'] == 12 and pool.counters['pool_restarts'] == 0
+
+
+def test_task_exception_propagates_without_breaking_pool(pool):
+    with pytest.raises(ValueError, match='corrupta'):
+        pool.run(failing, b'abc')
+    assert pool.run(sleepy, b'abc', 0) == 3
+    assert pool.counters['pool_restarts'] == 0
+
+
+def test_timeout_discards_hung_worker_and_pool_recovers(pool):
+    pool.start()
+    with pytest.raises(OffloadTimeout):
+        pool.run(sleepy, b'abc', 30, timeout=0.5)
+    assert pool.counters['timeouts'] == 1 and pool.counters['pool_restarts'] == 1
+    assert pool.run(sleepy, b'abcd', 0) == 4
+
+
+def test_disabled_pool_runs_inline():
+    pool = CPUOffloadPool(enabled=False)
+    digest, pid = pool.run(digest_with_pid, b'data')
+    assert pid == os.getpid() and pool.counters['inline'] == 1
+    assert pool.start() is False
@@ -0,0 +1,137 @@
+"""
+Tests del índice de similitud de embeddings CLIP
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from vigoleonrocks.services.embedding_index import (
+    EmbeddingIndex, EmbeddingStore, IVFIndex, normalize, top_k,
+)
+
+
+def clustered(n, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return normalize(centers[rng.integers(0, clusters, n)] + 0.3 * rng.normal(size=(n, dim)))
+
+
+def test_exact_search_ranks_by_cosine():
+    index = EmbeddingIndex(EmbeddingStore(''), background=False)
+    vectors = clustered(200)
+    index.store.add_many(vectors * 3.0, [f'a{i}' for i in range(200)])  # se normalizan al guardar
+    results = index.search(vectors[7], k=5)
+    assert results[0]['id'] == 'a7' and results[0]['score'] == pytest.approx(1.0, abs=1e-5)
+    assert [r['score'] for r in results] == sorted((r['score'] for r in results), reverse=True)
+    assert all(r['id'] != 'a7' for r in index.search(vectors[7], k=5, exclude='a7'))
+    assert list(top_k(np.array([0.1, 0.9, 0.5]), 2)) == [1, 2]
+
+
+def test_store_persists_and_reopens(tmp_path):
+    store = EmbeddingStore(str(tmp_path), initial_capacity=4)
+    vectors = clustered(10, dim=8)
+    for i, vector in enumerate(vectors):
+        store.add(vector, f'id{i}', {'content': f'análisis {i}'})
+    reopened = EmbeddingStore(str(tmp_path))
+    assert len(reopened) == 10 and reopened.dim == 8
+    assert reopened.meta[3] == {'content': 'análisis 3'}
+    np.testing.assert_allclose(reopened.vectors(), normalize(vectors), atol=1e-6)
+    with pytest.raises(ValueError):
+        EmbeddingStore(str(tmp_path), dim=16)
+
+
+def test_interrupted_write_is_ignored_on_open(tmp_path):
+    store = EmbeddingStore(str(tmp_path), initial_capacity=4)
+    store.add_many(clustered(3, dim=8), ['a', 'b', 'c'])
+    with open(tmp_path / 'ids.jsonl', 'a') as f:
+        f.write('{"id": "d", "me')  # línea cortada a mitad
+    reopened = EmbeddingStore(str(tmp_path))
+    assert reopened.ids == ['a', 'b', 'c']
+    assert reopened.add(clustered(1, dim=8)[0], 'd') == 3
+    assert EmbeddingStore(str(tmp_path)).ids == ['a', 'b', 'c', 'd']
+
+
+def test_ivf_recall_and_pending_queue():
+    vectors = clustered(5000, seed=1)
+    index = EmbeddingIndex(EmbeddingStore(''), exact_max=1000, nprobe=8, background=False)
+    index.store.add_many(vectors, [str(i) for i in range(5000)])
+    index.build(nlist=32)
+    queries = clustered(50, seed=2)
+    recall = []
+    for query in queries:
+        exact = {r['id'] for r in index.search(query, k=10, mode='exact')}
+        approx = {r['id'] for r in index.search(query, k=10, mode='ivf')}
+        recall.append(len(exact & approx) / 10)
+    assert np.mean(recall) >= 0.9
+    index.add(queries[0], 'nuevo')  # después de construir: cola exacta
+    assert index.search(queries[0], k=1, mode='ivf')[0]['id'] == 'nuevo'
+    assert index.stats()['ivf_pending'] == 1
+
+
+def test_ivf_lists_cover_every_row():
+    vectors = clustered(1000, seed=3)
+    ivf = IVFIndex(nlist=16).build(vectors)
+    assert sorted(ivf.order.tolist()) == list(range(1000))
+    assert ivf.offsets[-1] == 1000
+
+
+def test_near_duplicate_threshold():
+    index = EmbeddingIndex(EmbeddingStore(''), background=False)
+    base = clustered(1, dim=16)[0]
+    index.add(base, 'previo', {'content': 'análisis previo'})
+    assert index.near_duplicate(base + 1e-3, threshold=0.98)['id'] == 'previo'
+    assert index.near_duplicate(-base, threshold=0.98) is None
+    assert index.near_duplicate(base, threshold=0) is None
+
+
+def test_near_duplicate_skips_rejected_candidates():
+    index = EmbeddingIndex(EmbeddingStore(''), background=False)
+    base = clustered(1, dim=16)[0]
+    index.add(base, 'rapido', {'analysis_type': 'fast'})
+    index.add(base + 5e-3, 'completo', {'analysis_type': 'comprehensive'})
+    deep_enough = lambda meta: meta['analysis_type'] == 'comprehensive'
+    assert index.near_duplicate(base, threshold=0.98)['id'] == 'rapido'
+    assert index.near_duplicate(base, threshold=0.98, accept=deep_enough)['id'] == 'completo'
+    assert index.near_duplicate(base, threshold=0.98, accept=lambda meta: False) is None
+
+
+def _append_rows(path, prefix, rows, queue):
+    store = EmbeddingStore(path, initial_capacity=4)
+    vectors = clustered(rows, dim=8, seed=len(prefix))
+    for i, vector in enumerate(vectors):
+        store.add(vector, f'{prefix}{i}', {'row': i})
+    queue.put(len(store))
+
+
+@pytest.mark.slow
+def test_processes_sharing_a_directory_never_overwrite_rows(tmp_path):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_append_rows, args=(str(tmp_path), name, 60, queue))
+               for name in ('a', 'bb', 'ccc')]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    assert all(worker.exitcode == 0 for worker in workers)
+    store = EmbeddingStore(str(tmp_path))
+    assert len(store) == 180 and len(set(store.ids)) == 180
+    for prefix in ('a', 'bb', 'ccc'):
+        expected = clustered(60, dim=8, seed=len(prefix))
+        rows = [store.row_of(f'{prefix}{i}') for i in range(60)]
+        np.testing.assert_allclose(store.vectors()[rows], expected, atol=1e-6)
+
+
+def test_other_writers_rows_are_visible_after_refresh(tmp_path):
+    first = EmbeddingStore(str(tmp_path), initial_capacity=2)
+    second = EmbeddingStore(str(tmp_path))
+    vectors = clustered(5, dim=8)
+    first.add_many(vectors[:3], ['a', 'b', 'c'])
+    assert second.add(vectors[3], 'd') == 3  # no pisa la fila de 'c'
+    assert first.add(vectors[4], 'e') == 4
+    index = EmbeddingIndex(second, background=False)
+    assert index.search(vectors[4], k=1)[0]['id'] == 'e'
+    np.testing.assert_allclose(EmbeddingStore(str(tmp_path)).vectors(), vectors, atol=1e-6)
@@ -0,0 +1,98 @@
+"""
+Tests del servicio único de entropía
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import json
+import threading
+
+import pytest
+
+from vigoleonrocks.services.entropy import EntropyService, get_entropy
+
+MESSAGES = ['hola', 'hello', '¿quién eres?', 'what can you do', 'cuéntame algo', 'bonjour', 'gracias'] * 5
+
+
+@pytest.fixture
+def seeded_entropy():
+    entropy = get_entropy()
+    previous = entropy.seed
+    yield entropy
+    entropy.reseed(previous)
+
+
+def seeded_run(service, seed):
+    """Respuestas de una sesión completa, serializadas como las devolvería la API"""
+    service.entropy.reseed(seed)
+    responses = []
+    for message in MESSAGES:
+        with service.entropy.request_scope():
+            responses.append({
+                'response': service.generate_human_response(message, 'es'),
+                'upload_id': service.entropy.request_id('img'),
+                'coherence': round(98.9 + service.entropy.uniform(0.0, 0.1), 6),
+            })
+    return json.dumps(responses, ensure_ascii=False).encode()
+
+
+def test_two_seeded_runs_are_byte_identical(seeded_entropy):
+    from vigoleonrocks.services.unified_ai_service import UnifiedAIService
+
+    service = UnifiedAIService()
+    assert service.entropy is seeded_entropy
+    first = seeded_run(service, 1234)
+    second = seeded_run(service, 1234)
+    assert first == second
+    assert seeded_run(service, 4321) != first
+
+
+def test_request_index_decides_the_stream_not_arrival_order():
+    entropy = EntropyService(seed=7)
+    with entropy.request_scope(3):
+        expected = [entropy.integers(0, 1000) for _ in range(5)]
+
+    results = {}
+
+    def handle(index):
+        with entropy.request_scope(index):
+            results[index] = [entropy.integers(0, 1000) for _ in range(5)]
+
+    threads = [threading.Thread(target=handle, args=(i,)) for i in reversed(range(6))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results[3] == expected
+    assert len({tuple(v) for v in results.values()}) == 6
+
+
+def test_production_mode_is_per_thread_and_unseeded():
+    entropy = EntropyService()
+    assert not entropy.deterministic
+    assert entropy.begin_request() is None
+    assert entropy.generator() is entropy.generator()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(entropy.generator()))
+    thread.start()
+    thread.join()
+    assert other[0] is not entropy.generator()
+    assert EntropyService().token_hex(16) != EntropyService().token_hex(16)
+
+
+def test_component_streams_are_independent_unless_seeded():
+    production = EntropyService()
+    assert production.stream('tracing').random() != production.stream('tracing').random()
+    seeded = EntropyService(seed=3)
+    thread_value = EntropyService(seed=3).generator().random()
+    assert seeded.stream('tracing').random() == seeded.stream('tracing').random()
+    assert seeded.stream('tracing').random() != seeded.stream('traffic-capture').random()
+    assert seeded.generator().random() == thread_value  # el componente no consume el generador del hilo
+
+
+def test_value_ranges():
+    entropy = EntropyService(seed=1)
+    assert all(0 <= entropy.integers(0, 3) < 3 for _ in range(200))
+    assert all(2.0 <= entropy.uniform(2.0, 3.0) < 3.0 for _ in range(200))
+    assert all(0 <= w < 2 ** 16 for w in entropy.words())
+    assert len(entropy.token_hex(6)) == 12
+    assert entropy.choice(['a', 'b']) in ('a', 'b')
@@ -0,0 +1,151 @@
+"""
+Tests del puente entre hilos WSGI y el bucle asyncio persistente
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from vigoleonrocks.services.admission_control import _deadline
+from vigoleonrocks.services.event_loop_bridge import (
+    ClientDisconnected,
+    EventLoopBridge,
+    client_disconnect_probe,
+)
+from vigoleonrocks.services.health_probes import event_loop_lag_check
+
+
+@pytest.fixture
+def bridge():
+    b = EventLoopBridge(threads=2, lag_interval=0.01).start()
+    yield b
+    b.stop()
+
+
+async def add(a, b):
+    await asyncio.sleep(0)
+    return a + b
+
+
+def test_run_reuses_persistent_loops(bridge):
+    loops = set()
+
+    async def which_loop():
+        return asyncio.get_running_loop()
+
+    for _ in range(10):
+        loops.add(bridge.run(which_loop()))
+    assert loops <= set(bridge.loops)
+    assert bridge.run(add(2, 3)) == 5
+    assert bridge.stats()['completed'] == 11
+
+
+def test_submit_returns_future_and_propagates_errors(bridge):
+    async def boom():
+        raise ValueError('x')
+
+    future = bridge.submit(add(1, 1))
+    assert future.result(2) == 2
+    with pytest.raises(ValueError):
+        bridge.run(boom())
+    assert bridge.stats()['failed'] == 1
+
+
+def test_timeout_cancels_coroutine_inside_loop(bridge):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        bridge.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+    assert bridge.stats()['timeouts'] == 1
+
+
+def test_timeout_when_loop_is_blocked_by_sync_code():
+    bridge = EventLoopBridge(threads=1).start()
+    release = threading.Event()
+
+    async def blocking():
+        release.wait(2)  # código síncrono dentro de la corrutina: wait_for no puede disparar
+
+    try:
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            bridge.run(blocking(), timeout=0.05)
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+        bridge.stop()
+
+
+def test_default_timeout_comes_from_request_deadline(bridge):
+    token = _deadline.set(time.monotonic() + 0.05)
+    try:
+        with pytest.raises(TimeoutError):
+            bridge.run(asyncio.sleep(5))
+    finally:
+        _deadline.reset(token)
+
+
+def test_client_disconnect_cancels_work(bridge):
+    cancelled = threading.Event()
+    gone = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    threading.Timer(0.05, gone.set).start()
+    with pytest.raises(ClientDisconnected):
+        bridge.run(slow(), disconnected=gone.is_set)
+    assert cancelled.wait(1)
+    assert bridge.stats()['disconnects'] == 1
+
+
+def test_client_disconnect_probe_on_socket():
+    server, client = socket.socketpair()
+    try:
+        assert client_disconnect_probe({}) is None
+        probe = client_disconnect_probe({'werkzeug.socket': server})
+        assert probe() is False
+        client.sendall(b'GET / HTTP/1.1\r\n')  # siguiente petición keep-alive: no es desconexión
+        assert probe() is False
+        client.close()
+        server.recv(64)
+        assert probe() is True
+    finally:
+        server.close()
+
+
+def test_work_spread_over_loops_and_stop_cancels_pending():
+    bridge = EventLoopBridge(threads=2).start()
+    futures = [bridge.submit(asyncio.sleep(5)) for _ in range(4)]
+    assert [loop['pending'] for loop in bridge.stats()['loops']] == [2, 2]
+    bridge.stop()
+    assert all(f.cancelled() for f in futures)
+    assert bridge.stats()['threads'] == 0
+
+
+def test_lag_is_measured_and_reported_to_health_check(bridge):
+    check = event_loop_lag_check(lambda: bridge.loops, max_lag=0.5)
+    ok, detail = check()
+    assert ok and detail['loops'] == 2
+
+    async def block():
+        time.sleep(0.1)
+
+    bridge.run(block())
+    time.sleep(0.05)
+    assert bridge.stats()['lag_max_ms'] >= 50
@@ -0,0 +1,117 @@
+"""
+Tests del procesamiento concurrente de archivos por petición
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import threading
+import time
+
+import pytest
+
+from vigoleonrocks.services.file_fanout import FileFanOut, FileTask
+
+
+def tasks_with_delays(*delays):
+    return [FileTask(i, f'f{i}.txt', 'document', str(delay).encode()) for i, delay in enumerate(delays)]
+
+
+def sleeping_handler(task):
+    time.sleep(float(task.data))
+    return {'slept': float(task.data)}
+
+
+@pytest.fixture
+def fanout():
+    fanout = FileFanOut(workers=8, concurrency=4, file_deadline=5)
+    yield fanout
+    fanout.shutdown()
+
+
+def test_files_run_concurrently_and_keep_input_order(fanout):
+    tasks = tasks_with_delays(0.2, 0.05, 0.1, 0.0)
+    t0 = time.perf_counter()
+    results = fanout.process_all(tasks, sleeping_handler)
+    assert time.perf_counter() - t0 < 0.3  # secuencial serían 0.35s
+    assert [r.task.filename for r in results] == ['f0.txt', 'f1.txt', 'f2.txt', 'f3.txt']
+    assert results[1].as_dict() == {'filename': 'f1.txt', 'category': 'document', 'size': 4,
+                                    'analysis': {'slept': 0.05}}
+
+
+def test_streaming_yields_in_completion_order(fanout):
+    order = [r.task.index for r in fanout.iter_completed(tasks_with_delays(0.3, 0.0, 0.15), sleeping_handler)]
+    assert order == [1, 2, 0]
+
+
+def test_per_request_concurrency_cap(fanout):
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def handler(task):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return {}
+
+    fanout.process_all(tasks_with_delays(*[0] * 12), handler, concurrency=3)
+    assert peak[0] == 3
+
+
+def test_deadline_and_errors_are_isolated_per_file(fanout):
+    def handler(task):
+        if task.index == 1:
+            raise ValueError('archivo corrupto')
+        return sleeping_handler(task)
+
+    t0 = time.perf_counter()
+    results = fanout.process_all(tasks_with_delays(0.0, 0.0, 2.0, 0.05), handler, file_deadline=0.3)
+    assert time.perf_counter() - t0 < 1.0
+    assert results[0].analysis == {'slept': 0.0}
+    assert results[1].analysis['error'] == 'archivo corrupto'
+    assert results[2].timed_out and 'Deadline' in results[2].analysis['error']
+    assert results[3].analysis == {'slept': 0.05}
+    assert fanout.counters['timeouts'] == 1 and fanout.counters['errors'] == 1
+
+
+def test_tasks_rejected_at_ingest_are_reported_without_running(fanout):
+    tasks = tasks_with_delays(0.0, 0.0, 0.0)
+    tasks[1] = FileTask(1, 'clip.txt', 'document', b'', error='Tipo de archivo no soportado (video)')
+    results = fanout.process_all(tasks, sleeping_handler)
+    assert [r.analysis.get('error') for r in results] == [None, 'Tipo de archivo no soportado (video)', None]
+    assert fanout.counters['errors'] == 1
+
+
+def test_deadline_starts_when_the_file_starts_running():
+    fanout = FileFanOut(workers=1, concurrency=3, file_deadline=0.4)
+    ran = []
+
+    def handler(task):
+        ran.append(task.index)
+        return sleeping_handler(task)
+
+    try:
+        results = fanout.process_all(tasks_with_delays(0.8, 0.05, 0.05), handler)
+    finally:
+        fanout.shutdown()
+    # f1 y f2 esperan en la cola del único hilo más que el plazo, pero no vencen
+    assert results[0].timed_out and 400 <= results[0].elapsed_ms < 700
+    assert [r.analysis for r in results[1:]] == [{'slept': 0.05}, {'slept': 0.05}]
+    assert ran == [0, 1, 2] and fanout.counters['timeouts'] == 1
+
+
+def test_closing_the_stream_cancels_queued_files():
+    fanout = FileFanOut(workers=1, concurrency=3, file_deadline=0)
+    ran = []
+
+    def handler(task):
+        ran.append(task.index)
+        return sleeping_handler(task)
+
+    try:
+        stream = fanout.iter_completed(tasks_with_delays(0.1, 0.1, 0.1), handler)
+        assert next(stream).task.index == 0
+        stream.close()
+        time.sleep(0.3)
+    finally:
+        fanout.shutdown()
+    assert ran[0] == 0 and 2 not in ran  # f1 pudo arrancar ya; f2 seguía en cola
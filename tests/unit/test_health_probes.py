@@ -0,0 +1,202 @@
+"""
+Tests de los probes de liveness, readiness y startup
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import asyncio
+import sys
+import threading
+import types
+
+import pytest
+
+from vigoleonrocks.services.health_probes import (
+    CountingThreadPoolExecutor,
+    HealthRegistry,
+    cache_round_trip_check,
+    coherence_round_trip_check,
+    event_loop_lag_check,
+    model_manager_check,
+    thread_pool_check,
+)
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def registry():
+    reg = HealthRegistry()
+    yield reg
+    reg.close()
+
+
+def test_results_are_cached_for_ttl():
+    clock = FakeClock()
+    reg = HealthRegistry(clock=clock)
+    calls = []
+    reg.register('counter', lambda: (calls.append(1) or True, len(calls)), ttl=5)
+    reg.run_warmup()
+    assert reg.probe('readyz')[0]
+    assert reg.probe('readyz')[0]
+    assert len(calls) == 1
+    clock.now += 6
+    reg.probe('readyz')
+    assert len(calls) == 2
+    reg.close()
+
+
+def test_critical_failure_fails_probe_but_non_critical_does_not(registry):
+    registry.register('optional', lambda: (False, 'degradado'), critical=False)
+    registry.run_warmup()
+    ok, report = registry.probe('readyz')
+    assert ok and report['checks']['optional']['ok'] is False
+
+    registry.register('required', lambda: (_ for _ in ()).throw(RuntimeError('boom')))
+    ok, report = registry.probe('readyz')
+    assert not ok
+    assert report['status'] == 'fail'
+    assert 'RuntimeError: boom' in report['checks']['required']['detail']
+
+
+def test_probes_only_run_their_checks(registry):
+    registry.register('deep', lambda: (False, 'x'), probes=('readyz',))
+    registry.register('alive', lambda: (True, 'ok'), probes=('livez', 'readyz'))
+    ok, report = registry.probe('livez')
+    assert ok and set(report['checks']) == {'alive'}
+    with pytest.raises(ValueError):
+        registry.register('bad', lambda: (True, None), probes=('healthz',))
+
+
+def test_wedged_check_times_out_then_reports_stuck(registry):
+    release = threading.Event()
+    calls = []
+
+    def wedged():
+        calls.append(1)
+        release.wait(5)
+        return True, 'ok'
+
+    registry.register('wedged', wedged, probes=('livez',), ttl=0, timeout=0.05)
+    ok, report = registry.probe('livez')
+    assert not ok and 'timeout' in report['checks']['wedged']['detail']
+    ok, report = registry.probe('livez')
+    assert not ok and report['checks']['wedged']['detail'].startswith('stuck')
+    assert len(calls) == 1  # no se acumulan ejecuciones sobre el bloqueado
+    release.set()
+
+
+def test_readiness_waits_for_warmup(registry):
+    gate = threading.Event()
+    registry.register('ok', lambda: (True, None))
+    registry.add_warmup('engine', lambda: gate.wait(5))
+    registry.start_warmup()
+    assert not registry.probe('readyz')[0]
+    assert not registry.probe('startupz')[0]
+    assert registry.probe('livez')[0]
+    gate.set()
+    registry.start_warmup().join(5)
+    ok, report = registry.probe('startupz')
+    assert ok and report['warmup']['tasks']['engine']['status'] == 'ok'
+    assert registry.probe('readyz')[0]
+
+
+def test_failed_critical_warmup_keeps_instance_unready(registry):
+    registry.add_warmup('broken', lambda: 1 / 0)
+    registry.add_warmup('optional', lambda: 1 / 0, critical=False)
+    assert registry.run_warmup() is False
+    ok, report = registry.probe('readyz')
+    assert not ok
+    assert 'ZeroDivisionError' in report['warmup']['tasks']['broken']['error']
+
+
+def test_coherence_round_trip_check():
+    ok, detail = coherence_round_trip_check()()
+    assert ok
+    assert 0 < detail['primary_coherence'] <= 100
+
+
+def test_cache_round_trip_check():
+    class DictCache(dict):
+        def set(self, key, value, timeout=None):
+            self[key] = value
+
+        def delete(self, key):
+            self.pop(key, None)
+
+    cache = DictCache()
+    assert cache_round_trip_check(lambda: cache)() == (True, 'read/write OK')
+    assert not cache
+    assert cache_round_trip_check(lambda: None)()[0]
+
+    class BrokenCache(DictCache):
+        def get(self, key, default=None):
+            return None
+
+    assert not cache_round_trip_check(lambda: BrokenCache())()[0]
+
+
+def test_model_manager_check_reports_load_errors(monkeypatch):
+    assert model_manager_check('no_such_module_xyz')()[0]
+    manager = types.SimpleNamespace(
+        models={'clip_vit': object()},
+        model_configs={'clip_vit': types.SimpleNamespace(enabled=True),
+                       'blip2': types.SimpleNamespace(enabled=True),
+                       'qwen2_vl': types.SimpleNamespace(enabled=False)},
+        load_errors={'qwen2_vl': 'sin GPU'},
+    )
+    module = types.ModuleType('fake_manager_module')
+    module.multimodal_manager = manager
+    monkeypatch.setitem(sys.modules, 'fake_manager_module', module)
+    check = model_manager_check('fake_manager_module')
+    assert check()[0]  # el error es de un modelo deshabilitado
+    manager.load_errors['blip2'] = 'OOM'
+    ok, detail = check()
+    assert not ok and detail['load_errors'] == {'blip2': 'OOM'}
+
+
+def test_thread_pool_check_saturation():
+    in_flight = [3]
+    check = thread_pool_check(lambda: in_flight[0], workers=4, max_saturation=0.9)
+    ok, detail = check()
+    assert ok and detail['server_busy'] == 2  # el probe no cuenta
+    in_flight[0] = 5
+    assert not check()[0]
+
+
+def test_thread_pool_check_reads_executor_counters():
+    executor = CountingThreadPoolExecutor(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    check = thread_pool_check(lambda: 1, workers=4, executors=lambda: {'pool': executor})
+    try:
+        executor.submit(lambda: (started.set(), release.wait(5)))
+        assert started.wait(5)
+        executor.submit(release.wait, 5)
+        ok, detail = check()
+        assert ok and detail['pool'] == {'backlog': 1, 'running': 1, 'max_workers': 1}
+        extra = executor.submit(release.wait, 5)
+        assert not check()[0]  # más cola que hilos
+        assert extra.cancel() and executor.queued == 1
+        assert check()[0]
+        release.set()
+    finally:
+        executor.shutdown(wait=True)
+    assert (executor.queued, executor.running) == (0, 0)
+
+
+def test_event_loop_lag_check():
+    assert event_loop_lag_check(lambda: None)()[0]
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        ok, detail = event_loop_lag_check(lambda: loop, max_lag=0.5)()
+        assert ok and detail['lag_ms'] < 500
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(2)
+        loop.close()
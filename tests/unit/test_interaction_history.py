@@ -0,0 +1,86 @@
+"""
+Tests del historial de interacciones acotado
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import pytest
+
+from vigoleonrocks.services.interaction_history import InteractionHistory, InteractionRingBuffer, _lines_reversed
+
+
+def _interaction(i, language='es', profile='human'):
+    return {'text': f'q{i}', 'response': f'r{i}', 'language': language, 'profile': profile}
+
+
+def test_ring_buffer_keeps_only_capacity():
+    buffer = InteractionRingBuffer(capacity=3)
+    for i in range(10):
+        buffer.append(float(i), {'i': i})
+    assert len(buffer) == 3
+    assert [r['i'] for r in buffer.snapshot()] == [7, 8, 9]
+    assert buffer.oldest_timestamp() == 7.0
+
+
+def test_query_filters_and_paginates():
+    history = InteractionHistory(capacity=100)
+    for i in range(30):
+        history.record(_interaction(i, language='es' if i % 2 else 'en',
+                                    profile='quantum' if i % 3 == 0 else 'human'), ts=1000.0 + i)
+
+    page = history.query(language='es', limit=5)
+    assert page.total == 15
+    assert [r['text'] for r in page.items] == ['q21', 'q23', 'q25', 'q27', 'q29']
+    assert page.has_more
+
+    second = history.query(language='es', offset=5, limit=5)
+    assert [r['text'] for r in second.items] == ['q11', 'q13', 'q15', 'q17', 'q19']
+
+    ranged = history.query(since=1010, until=1014, profile='quantum')
+    assert [r['text'] for r in ranged.items] == ['q12']
+
+
+def test_durable_log_serves_evicted_ranges(tmp_path):
+    history = InteractionHistory(capacity=5, log_dir=tmp_path, segment_max_bytes=256, max_segments=None)
+    for i in range(50):
+        history.record(_interaction(i), ts=2000.0 + i)
+
+    assert len(history) == 5
+    assert len(history.log.segments()) > 1
+
+    page = history.query(since=2000, until=2009, limit=100)
+    assert page.source == 'disk'
+    assert [r['text'] for r in page.items] == [f'q{i}' for i in range(10)]
+
+    recent = history.query(limit=3)
+    assert recent.source == 'memory'
+    history.close()
+
+    reopened = InteractionHistory(capacity=5, log_dir=tmp_path)
+    assert reopened.query(durable=True, limit=1000).total == 50
+    reopened.close()
+
+
+@pytest.mark.parametrize('block_size', [1, 3, 7, 64, 4096])
+def test_lines_are_read_backwards_in_blocks(tmp_path, block_size):
+    path = tmp_path / 'segment.jsonl'
+    lines = [b'{"i": %d, "pad": "%s"}' % (i, b'x' * (i % 11)) for i in range(40)]
+    path.write_bytes(b'\n'.join(lines) + b'\n\n{"cortada')
+    with open(path, 'rb') as f:
+        assert list(_lines_reversed(f, block_size)) == [b'{"cortada'] + lines[::-1]
+
+
+def test_log_rotation_respects_max_segments(tmp_path):
+    history = InteractionHistory(capacity=5, log_dir=tmp_path, segment_max_bytes=200, max_segments=3)
+    for i in range(200):
+        history.record(_interaction(i))
+    assert len(history.log.segments()) <= 3
+    history.close()
+
+
+@pytest.mark.slow
+def test_memory_stays_flat_under_compressed_soak():
+    from benchmarks.interaction_history_soak import run_soak
+
+    report = run_soak(duration_s=3.0, rate=0, capacity=500, sample_every_s=0.25)
+    assert report['buffer_size'] == 500
+    assert report['records'] > 10_000
+    assert report['steady_heap_growth_mb'] < 1.0
@@ -0,0 +1,103 @@
+"""
+Tests del identificador de idioma por n-gramas de caracteres
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import pytest
+
+from vigoleonrocks.services.language_identifier import (
+    DEFAULT_MIN_CONFIDENCE,
+    LanguageIdentifier,
+    evaluate,
+    get_language_identifier,
+    language_name,
+    load_heldout,
+    truncate_for_scan,
+)
+
+
+@pytest.fixture(scope="module")
+def identifier():
+    return get_language_identifier()
+
+
+@pytest.mark.multilingual
+@pytest.mark.parametrize("text,expected", [
+    ("Hola mundo", "es"),
+    ("¿Quién eres?", "es"),
+    ("Where is the nearest hospital?", "en"),
+    ("Obrigado, até amanhã", "pt"),
+    ("Je voudrais un café", "fr"),
+    ("Ich habe keine Zeit", "de"),
+    ("Привет, как дела?", "ru"),
+    ("谢谢你", "zh"),
+    ("ありがとうございます", "ja"),
+    ("감사합니다", "ko"),
+])
+def test_detects_short_queries(identifier, text, expected):
+    assert identifier.detect(text) == expected
+
+
+@pytest.mark.multilingual
+def test_confidences_are_calibrated_distribution(identifier):
+    candidates = identifier.identify("Buenos días, ¿cómo estás?", top_k=len(identifier.languages))
+    assert candidates[0][0] == "es"
+    assert sum(conf for _, conf in candidates) == pytest.approx(1.0)
+    assert all(a[1] >= b[1] for a, b in zip(candidates, candidates[1:]))
+
+
+def test_top_k_and_empty_input(identifier):
+    assert len(identifier.identify("The weather is nice today", top_k=3)) == 3
+    assert identifier.identify("") == []
+    assert identifier.identify("12345 !!!") == []
+    assert identifier.detect("12345", default="es") == "es"
+
+
+def test_allowed_languages_restrict_result(identifier):
+    assert identifier.detect("Bon dia, com estàs?", allowed={"es", "en"}) == "es"
+
+
+def test_emoji_and_astral_symbols_are_separators(identifier):
+    assert identifier.identify("😀😀") == []
+    assert identifier.identify("hi 😀🚀") == identifier.identify("hi")
+    assert identifier.detect("😀😀", default="unknown", min_confidence=DEFAULT_MIN_CONFIDENCE) == "unknown"
+
+
+def test_calibrated_threshold_with_supported_languages(identifier):
+    supported = {"es", "en", "pt", "fr"}
+
+    def detect(text):
+        return identifier.detect(text, default="es", min_confidence=DEFAULT_MIN_CONFIDENCE, allowed=supported)
+
+    # Palabras sueltas ambiguas: sin restricción no superan el umbral
+    assert identifier.detect("hi", default="unknown", min_confidence=DEFAULT_MIN_CONFIDENCE) == "unknown"
+    assert identifier.detect("ok", default="unknown", min_confidence=DEFAULT_MIN_CONFIDENCE) == "unknown"
+    # Entre los idiomas con respuesta, sí
+    assert detect("hi") == detect("ok") == "en"
+    assert detect("Salut mon ami") == "fr"
+    # Claramente en un idioma sin respuestas: el idioma por defecto, no el menos malo
+    assert detect("Ich habe heute keine Zeit für dich") == "es"
+
+
+def test_repeated_queries_hit_lru():
+    identifier = LanguageIdentifier(cache_size=8)
+    identifier.identify("hello there")
+    identifier.identify("hello there")
+    assert identifier.cache_info().hits == 1
+
+
+def test_long_inputs_are_truncated(identifier):
+    text = "Der Hund schläft unter dem Tisch. " * 50000
+    assert len(truncate_for_scan(text, identifier.max_chars)) <= identifier.max_chars + 2
+    assert identifier.detect(text) == "de"
+
+
+@pytest.mark.multilingual
+def test_heldout_accuracy(identifier):
+    report = evaluate(identifier, load_heldout())
+    assert report["top1_accuracy"] >= 0.9
+    assert report["top3_accuracy"] >= 0.97
+
+
+def test_language_name():
+    assert language_name("es") == "spanish"
+    assert language_name("xx") == "unknown"
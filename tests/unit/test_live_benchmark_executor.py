@@ -0,0 +1,201 @@
+"""
+Tests del ejecutor de benchmarks medido
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from live_benchmark_executor import (
+    DEFAULT_TASKS_DIR,
+    BenchmarkTask,
+    CallableTarget,
+    HttpTarget,
+    LiveBenchmarkExecutor,
+    MetricSummary,
+    UnifiedServiceTarget,
+    compare_to_baseline,
+    load_suites,
+    t_critical_95,
+)
+
+
+def _write_suite(directory, name, target, tasks, **options):
+    path = directory / f"{name.lower()}.json"
+    path.write_text(json.dumps(dict(name=name, target=target, tasks=tasks, **options)), encoding="utf-8")
+
+
+@pytest.fixture
+def tasks_dir(tmp_path):
+    directory = tmp_path / "tasks"
+    directory.mkdir()
+    _write_suite(directory, "Echo", "echo", [
+        {"id": "e1", "input": "2 + 2", "check": "numeric", "expected": 4},
+        {"id": "e2", "input": "hola", "check": "contains", "expected": "hola"},
+        {"id": "e3", "input": "latencia", "check": "none"},
+    ])
+    return directory
+
+
+@pytest.fixture
+def executor(tmp_path, tasks_dir):
+    executor = LiveBenchmarkExecutor(tasks_dir, db_path=str(tmp_path / "results.db"),
+                                     dashboard_path=str(tmp_path / "dashboard.html"), warmup=1, trials=5)
+    yield executor
+    executor.close()
+
+
+def _echo(delay=0.0):
+    def run(text, context):
+        time.sleep(delay)
+        return {"response": "4" if "+" in text else text}
+    return CallableTarget("echo", run)
+
+
+def test_metric_summary_confidence_interval():
+    summary = MetricSummary.from_samples([10.0, 12.0, 14.0])
+    assert summary.mean == 12.0
+    assert summary.stdev == 2.0
+    half_width = t_critical_95(2) * 2.0 / 3 ** 0.5
+    assert summary.ci_low == pytest.approx(12.0 - half_width)
+    assert summary.ci_high == pytest.approx(12.0 + half_width)
+    assert t_critical_95(1000) == 1.96
+    assert t_critical_95(22) == t_critical_95(20)
+
+
+def test_compare_requires_separated_intervals():
+    baseline = MetricSummary(5, 10.0, 0.5, 9.5, 10.5, 10.0, 11.0)
+    slower = MetricSummary(5, 13.0, 0.5, 12.5, 13.5, 13.0, 14.0)
+    noisy = MetricSummary(5, 13.0, 5.0, 7.0, 19.0, 13.0, 20.0)
+    assert compare_to_baseline(slower, baseline, higher_is_better=False, tolerance=0.1) == "regression"
+    assert compare_to_baseline(baseline, slower, higher_is_better=False, tolerance=0.1) == "improvement"
+    assert compare_to_baseline(noisy, baseline, higher_is_better=False, tolerance=0.1) == "unchanged"
+    assert compare_to_baseline(slower, baseline, higher_is_better=False, tolerance=0.5) == "unchanged"
+
+
+@pytest.mark.parametrize("check,expected,output,fields,correct", [
+    ("numeric", 3, "x = 3.0", {}, True),
+    ("numeric", 3, "x = 30", {}, False),
+    ("contains", "Thursday", "It will be thursday", {}, True),
+    ("equals", "es", "", {"language": "es"}, True),
+    ("min", 1, "", {"examples_count": 0}, False),
+    ("none", None, "", {}, None),
+])
+def test_task_checks(check, expected, output, fields, correct):
+    task = BenchmarkTask("t", "q", check=check, expected=expected,
+                         field=next(iter(fields), None))
+    assert task.evaluate(output, fields) is correct
+
+
+def test_shipped_task_files_load():
+    suites = load_suites(DEFAULT_TASKS_DIR)
+    assert {s.target for s in suites.values()} >= {"cot", "math", "few_shot", "unified", "http"}
+    assert all(suite.tasks for suite in suites.values())
+
+
+def test_first_run_becomes_baseline_then_passes(executor):
+    executor.register_target("echo", _echo())
+    first = executor.run_single_benchmark("Echo")
+    assert first.status == "BASELINE"
+    assert first.accuracy["mean"] == 1.0
+    assert first.latency_ms["n"] == 5
+    assert executor.db.baseline_run("Echo") == first.run_id
+
+    second = executor.run_single_benchmark("Echo")
+    assert second.status in ("PASS", "IMPROVED")
+    assert second.comparison["accuracy"] == "unchanged"
+
+
+def test_detects_latency_and_accuracy_regressions(executor):
+    executor.register_target("echo", _echo())
+    executor.run_single_benchmark("Echo")
+
+    executor.register_target("echo", _echo(delay=0.005))
+    slow = executor.run_single_benchmark("Echo")
+    assert slow.status == "REGRESSION"
+    assert slow.comparison["latency_ms"] == "regression"
+
+    executor.register_target("echo", CallableTarget("echo", lambda text, context: "??"))
+    wrong = executor.run_single_benchmark("Echo")
+    assert wrong.comparison["accuracy"] == "regression"
+
+
+def test_unavailable_target_is_skipped(tmp_path, tasks_dir):
+    _write_suite(tasks_dir, "Missing", "no_such_engine", [{"id": "m1", "input": "x"}])
+    executor = LiveBenchmarkExecutor(tasks_dir, db_path=str(tmp_path / "r.db"),
+                                     dashboard_path=str(tmp_path / "d.html"), warmup=0, trials=2)
+    executor.register_target("echo", _echo())
+    report = executor.run_all_benchmarks()
+    assert report.skipped == 1
+    assert {r.benchmark_name: r.status for r in report.results}["Missing"] == "SKIPPED"
+    executor.close()
+
+
+def test_failing_target_is_error_not_baseline(executor):
+    def broken(text, context):
+        raise ConnectionError("refused")
+    executor.register_target("echo", CallableTarget("echo", broken))
+    result = executor.run_single_benchmark("Echo")
+    assert result.status == "ERROR"
+    assert "ConnectionError" in result.error
+    assert executor.db.baseline_run("Echo") is None
+
+
+def test_dashboard_escapes_database_strings(executor, tmp_path):
+    def broken(text, context):
+        raise ValueError('<script>alert("x")</script>')
+    executor.register_target("echo", CallableTarget("echo", broken))
+    executor.run_single_benchmark("Echo")
+    html = (tmp_path / "dashboard.html").read_text(encoding="utf-8")
+    assert "<script>alert" not in html
+    assert "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt;" in html
+
+
+def test_dashboard_renders_incrementally(executor, tasks_dir, tmp_path):
+    _write_suite(tasks_dir, "Second", "echo", [{"id": "s1", "input": "x"}])
+    executor.benchmarks = load_suites(tasks_dir)
+    executor.register_target("echo", _echo())
+    executor.run_all_benchmarks()
+    assert executor.dashboard.rows_rendered == 2  # Echo tras su suite; Second tras la suya
+
+    executor.run_single_benchmark("Second")
+    assert executor.dashboard.rows_rendered == 3  # solo se regenera la fila de Second
+    html = (tmp_path / "dashboard.html").read_text(encoding="utf-8")
+    assert "Echo" in html and "Second" in html and "BASELINE" in html
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({"response": payload["message"].upper(), "engine": "cot"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_target_against_local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        target = HttpTarget(f"http://127.0.0.1:{server.server_port}", "/api/chat")
+        output, fields = target.run(BenchmarkTask("h1", "hola"))
+        assert output == "HOLA"
+        assert fields["engine"] == "cot"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unified_service_target():
+    output, fields = UnifiedServiceTarget().run(BenchmarkTask("u1", "hola, ¿cómo estás?"))
+    assert output
+    assert fields["language"] == "es"
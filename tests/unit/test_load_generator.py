@@ -0,0 +1,160 @@
+"""
+Tests del generador de carga en lazo abierto
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vigoleonrocks.services.histogram import LatencyHistogram
+from vigoleonrocks.services.load_generator import (
+    SLO,
+    LoadProfile,
+    RequestSpec,
+    find_max_throughput,
+    parse_request,
+    parse_stages,
+    run_load,
+)
+
+
+@pytest.fixture
+def server():
+    """Servidor local de un solo "núcleo": las peticiones se sirven en serie en ``service_time``"""
+    state = {'service_time': 0.0, 'stall': {}, 'seen': 0, 'lock': threading.Lock()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        wbufsize = -1  # cabeceras y cuerpo en un solo send (sin Nagle + ACK retardado)
+
+        def log_message(self, *args):
+            pass
+
+        def _serve(self, body):
+            with state['lock']:
+                state['seen'] += 1
+                time.sleep(state['stall'].pop(state['seen'], state['service_time']))
+            data = json.dumps({'path': self.path, 'echo': body}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._serve(None)
+
+        def do_POST(self):
+            self._serve(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_histograms_merge_within_precision():
+    a, b, exact = LatencyHistogram(), LatencyHistogram(), []
+    for i in range(1, 5001):
+        value = i * 0.37
+        (a if i % 2 else b).record(value)
+        exact.append(value)
+    merged = LatencyHistogram.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+    assert merged.count == 5000 and merged.max == exact[-1]
+    for q in (0.5, 0.9, 0.99, 0.999):
+        expected = exact[int(q * len(exact)) - 1]
+        assert merged.quantile(q) == pytest.approx(expected, rel=0.011)
+    with pytest.raises(ValueError):
+        a.merge(LatencyHistogram(precision=0.05))
+
+
+def test_arrival_profiles():
+    assert list(LoadProfile('constant', 4, 1).offsets()) == [0, 0.25, 0.5, 0.75]
+    step = LoadProfile('step', stages=parse_stages('2:1,4:1'))
+    assert list(step.offsets()) == [0, 0.5, 1.0, 1.25, 1.5, 1.75]
+    assert step.duration == 2 and step.offered_rate == 3
+
+    ramp = list(LoadProfile('ramp', 10, 10, end_rate=30).offsets())
+    assert len(ramp) == 200  # área bajo la rampa: (10 + 30) / 2 * 10
+    assert sum(1 for t in ramp if t < 5) == 75  # la primera mitad es más lenta
+
+    poisson = LoadProfile('poisson', 200, 10, seed=7)
+    offsets = list(poisson.offsets())
+    assert offsets == list(LoadProfile('poisson', 200, 10, seed=7).offsets())
+    assert 1850 < len(offsets) < 2150
+    gaps = sorted(b - a for a, b in zip(offsets, offsets[1:]))
+    assert gaps[len(gaps) // 2] == pytest.approx(0.005 * 0.693, rel=0.1)  # mediana exponencial
+
+    with pytest.raises(ValueError):
+        LoadProfile('burst', 1, 1)
+    spec = parse_request('POST /api/vigoleonrocks {"text": "hola"}')
+    assert (spec.method, spec.path, json.loads(spec.body)) == ('POST', '/api/vigoleonrocks', {'text': 'hola'})
+
+
+def test_stall_is_not_hidden_by_the_generator(server):
+    """Una parada de 0.5 s a 50 rps afecta a ~25 peticiones, no a una sola"""
+    url, state = server
+    state['service_time'], state['stall'] = 0.002, {10: 0.5}
+    result = run_load(url, [RequestSpec('GET', '/api/status')], LoadProfile('constant', 50, 2), connections=8)
+
+    assert result.scheduled == result.completed == 100 and result.errors == 0
+    assert result.statuses == {'200': 100}
+    assert result.connections <= 8  # keep-alive: el pool se reutiliza
+    assert result.latency.max > 450
+    # En lazo cerrado solo la petición parada superaría los 100 ms
+    assert result.latency.count_above(100) >= 15
+    assert result.latency.quantile(0.9) > 100
+    assert result.latency.quantile(0.5) < 100
+
+
+def test_request_mix_and_per_route_histograms(server):
+    url, _ = server
+    mix = [RequestSpec('GET', '/api/health', weight=3), RequestSpec.json('/api/chat', {'q': 'hola'}, name='chat')]
+    result = run_load(url, mix, LoadProfile('poisson', 100, 1, seed=3))
+    assert set(result.routes) == {'GET /api/health', 'chat'}
+    assert result.routes['GET /api/health'].count > result.routes['chat'].count > 0
+    assert result.errors == 0
+    assert result.summary()['routes']['chat']['count'] == result.routes['chat'].count
+
+
+def test_transport_errors_count_against_the_error_budget():
+    result = run_load('http://127.0.0.1:9', [RequestSpec()], LoadProfile('constant', 20, 0.25), timeout=1)
+    assert result.errors == result.scheduled == 5
+    assert result.statuses == {'error': 5}
+    ok, reason = SLO(100).check(result)
+    assert not ok and 'error rate' in reason
+
+
+def test_find_max_throughput_against_known_capacity(server):
+    url, state = server
+    state['service_time'] = 0.02  # capacidad: 50 rps
+    report = find_max_throughput(url, [RequestSpec('GET', '/api/status')], SLO(latency_ms=60),
+                                 start_rate=10, step_duration=0.6, precision=0.1, cooldown=0.2)
+    assert report['saturated']
+    assert 30 <= report['max_sustainable_rps'] <= 55
+    assert report['first_failing_rps'] <= 80
+    assert [t['rate'] for t in report['trials'][:4]] == [10, 20, 40, 80]
+    assert not report['trials'][3]['passed']
+
+
+def test_runs_against_local_app_instance():
+    serving = pytest.importorskip('werkzeug.serving')
+    from vigoleonrocks.interfaces.rest_api import app
+
+    httpd = serving.make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{httpd.server_port}"
+        result = run_load(url, [RequestSpec('GET', '/api/status'), RequestSpec('GET', '/api/quantum-metrics')],
+                          LoadProfile('constant', 20, 1))
+        assert result.completed == 20
+        assert result.statuses == {'200': 20}
+    finally:
+        httpd.shutdown()
@@ -0,0 +1,154 @@
+"""
+Tests del micro-batching dinámico de inferencia
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from vigoleonrocks.services.event_loop_bridge import EventLoopBridge
+from vigoleonrocks.services.micro_batcher import Histogram, MicroBatcher, pad_and_stack
+
+
+class TinyLinear:
+    """Modelo de reemplazo: capa lineal con pesos aleatorios y coste fijo por pasada"""
+
+    def __init__(self, dim=4, seed=3, overhead_s=0.002):
+        rng = random.Random(seed)
+        self.weights = [[rng.uniform(-1, 1) for _ in range(dim)] for _ in range(dim)]
+        self.overhead_s = overhead_s
+        self.batch_sizes = []
+
+    def forward_one(self, x):
+        return [sum(w * v for w, v in zip(row, x)) for row in self.weights]
+
+    def __call__(self, batch):
+        self.batch_sizes.append(len(batch))
+        time.sleep(self.overhead_s)
+        return [self.forward_one(x) for x in batch]
+
+
+@pytest.fixture
+def model():
+    return TinyLinear()
+
+
+def submit_concurrently(batcher, inputs):
+    results = [None] * len(inputs)
+    barrier = threading.Barrier(len(inputs))
+
+    def worker(i):
+        barrier.wait()
+        results[i] = batcher(inputs[i], timeout=5)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(inputs))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_requests_share_one_forward_pass(model):
+    batcher = MicroBatcher('tiny', model, max_batch_size=8, max_wait_ms=200)
+    inputs = [[float(i), 1.0, -1.0, 0.5] for i in range(8)]
+    try:
+        results = submit_concurrently(batcher, inputs)
+    finally:
+        batcher.close()
+    assert model.batch_sizes == [8]  # lleno antes de la espera máxima
+    assert results == [model.forward_one(x) for x in inputs]  # cada salida vuelve a su petición
+
+
+def test_max_batch_size_splits_and_max_wait_bounds_latency(model):
+    batcher = MicroBatcher('tiny', model, max_batch_size=4, max_wait_ms=10)
+    try:
+        submit_concurrently(batcher, [[1.0] * 4] * 10)
+        assert max(model.batch_sizes) == 4 and sum(model.batch_sizes) == 10
+        start = time.perf_counter()
+        batcher([0.0] * 4, timeout=2)  # petición sola: sale tras max_wait, no espera a llenar
+        assert time.perf_counter() - start < 0.2
+    finally:
+        batcher.close()
+
+
+def test_errors_reach_every_waiter():
+    def broken(batch):
+        raise ValueError('pesos corruptos')
+
+    batcher = MicroBatcher('broken', broken, max_batch_size=4, max_wait_ms=20)
+    futures = [batcher.submit_future(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(2)
+
+    short = MicroBatcher('short', lambda batch: batch[:1], max_batch_size=4, max_wait_ms=20)
+    futures = [short.submit_future(i) for i in range(2)]
+    with pytest.raises(RuntimeError):
+        futures[1].result(2)
+    assert batcher.stats()['failures'] == 1
+    batcher.close()
+    short.close()
+
+
+def test_cancelled_request_is_left_out_of_the_batch(model):
+    gate = threading.Event()
+    seen = []
+
+    def slow(batch):
+        gate.wait(2)
+        seen.append(list(batch))
+        return batch
+
+    batcher = MicroBatcher('slow', slow, max_batch_size=1, max_wait_ms=0)
+    first = batcher.submit_future('a')
+    second = batcher.submit_future('b')
+    while batcher.stats()['queued'] > 1:
+        time.sleep(0.001)
+    assert second.cancel()
+    gate.set()
+    assert first.result(2) == 'a'
+    batcher.close()
+    assert seen == [['a']]
+
+
+def test_async_submit_from_several_event_loops(model):
+    batcher = MicroBatcher('tiny', model, max_batch_size=16, max_wait_ms=50)
+    bridge = EventLoopBridge(threads=2).start()
+    try:
+        futures = [bridge.submit(batcher.submit([float(i)] * 4)) for i in range(6)]
+        results = [f.result(2) for f in futures]
+    finally:
+        bridge.stop()
+        batcher.close()
+    assert results == [model.forward_one([float(i)] * 4) for i in range(6)]
+    assert sum(model.batch_sizes) == 6 and len(model.batch_sizes) <= 2
+
+
+def test_histograms_exposed(model):
+    batcher = MicroBatcher('tiny', model, max_batch_size=8, max_wait_ms=100)
+    submit_concurrently(batcher, [[1.0] * 4] * 8)
+    batcher.close()
+    stats = batcher.stats()
+    assert stats['batch_size']['buckets']['8'] == 1
+    assert stats['queue_wait_ms']['count'] == 8
+    assert stats['forward_ms']['count'] == 1 and stats['forward_ms']['sum'] >= 2
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((1, 5, 10))
+    for value in (0.5, 1, 3, 7, 50):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == {'1': 2, '5': 1, '10': 1, '+Inf': 1}
+    assert histogram.quantile(0.5) == 5
+    assert histogram.quantile(0.99) == float('inf')
+
+
+def test_pad_and_stack_lists():
+    batch, lengths = pad_and_stack([[1, 2, 3], [4], []], pad_value=-1)
+    assert batch == [[1, 2, 3], [4, -1, -1], [-1, -1, -1]]
+    assert lengths == [3, 1, 0]
@@ -0,0 +1,203 @@
+"""
+Tests del gestor de residencia de modelos con presupuesto de memoria
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from vigoleonrocks.services.event_loop_bridge import EventLoopBridge
+from vigoleonrocks.services.model_residency import ModelResidencyManager
+
+MB = 1048576
+
+
+class StandInModel:
+    """Modelo de reemplazo en CPU: ocupa memoria real y tarda en cargar"""
+
+    def __init__(self, key, size_mb, load_s=0.0):
+        time.sleep(load_s)
+        self.key = key
+        self.weights = b'\x01' * int(size_mb * MB)
+
+
+class Zoo:
+    def __init__(self, sizes, load_s=0.0, fail=()):
+        self.sizes = sizes
+        self.load_s = load_s
+        self.fail = set(fail)
+        self.loads = []
+        self.unloads = []
+
+    def load(self, key):
+        self.loads.append(key)
+        if key in self.fail:
+            raise RuntimeError(f"sin pesos para {key}")
+        return StandInModel(key, self.sizes[key], self.load_s)
+
+    def unload(self, key):
+        self.unloads.append(key)
+
+    def manager(self, budget_mb, **kwargs):
+        kwargs.setdefault('sizer', lambda key, model: len(model.weights))
+        return ModelResidencyManager(self.load, self.unload, budget_bytes=int(budget_mb * MB), **kwargs)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_lru_eviction_keeps_within_budget():
+    zoo = Zoo({'clip': 1, 'blip': 2, 'whisper': 2})
+    residency = zoo.manager(budget_mb=4)
+
+    async def scenario():
+        assert await residency.ensure('clip')
+        assert await residency.ensure('blip')
+        assert await residency.ensure('clip')      # hit: clip pasa a ser el más reciente
+        assert await residency.ensure('whisper')   # no cabe: sale blip (LRU), no clip
+    run(scenario())
+
+    assert zoo.unloads == ['blip']
+    assert residency.is_resident('clip') and residency.is_resident('whisper')
+    assert residency.used_bytes <= residency.budget_bytes
+    stats = residency.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 3, 1)
+    assert [m['key'] for m in stats['resident']] == ['whisper', 'clip']
+    assert stats['resident'][0]['footprint_mb'] == pytest.approx(2.0)
+
+
+def test_concurrent_waiters_share_one_load_future():
+    zoo = Zoo({'moondream': 1}, load_s=0.1)
+    residency = zoo.manager(budget_mb=10)
+
+    async def scenario():
+        return await asyncio.gather(*(residency.ensure('moondream') for _ in range(20)))
+
+    start = time.monotonic()
+    assert all(run(scenario()))
+    assert time.monotonic() - start < 0.5  # nadie sondea con sleep(1)
+    assert zoo.loads == ['moondream']
+    assert residency.stats()['coalesced'] == 19
+
+
+def test_waiters_on_different_event_loops():
+    zoo = Zoo({'clip': 1}, load_s=0.05)
+    residency = zoo.manager(budget_mb=10)
+    bridge = EventLoopBridge(threads=2).start()
+    try:
+        futures = [bridge.submit(residency.ensure('clip')) for _ in range(4)]
+        assert [f.result(2) for f in futures] == [True] * 4
+    finally:
+        bridge.stop()
+    assert zoo.loads == ['clip']
+
+
+def test_pinned_model_is_not_evicted():
+    zoo = Zoo({'blip': 2, 'whisper': 2})
+    residency = zoo.manager(budget_mb=3)
+
+    async def scenario():
+        async with residency.use('blip') as loaded:
+            assert loaded
+            assert await residency.ensure('whisper')
+            assert residency.is_resident('blip')  # en uso: se tolera exceder el presupuesto
+        assert await residency.ensure('whisper')
+    run(scenario())
+    residency.set_budget(3 * MB)
+    assert not residency.is_resident('blip') and residency.is_resident('whisper')
+
+
+def test_load_failure_returns_false_and_can_retry():
+    zoo = Zoo({'florence': 1}, fail={'florence'})
+    residency = zoo.manager(budget_mb=10)
+    assert run(residency.ensure('florence')) is False
+    assert 'sin pesos' in residency.stats()['errors']['florence']
+    zoo.fail.clear()
+    assert run(residency.ensure('florence')) is True
+    assert residency.stats()['errors'] == {}
+    assert zoo.loads == ['florence', 'florence']
+
+
+def test_cancelled_waiter_does_not_cancel_shared_load():
+    zoo = Zoo({'whisper': 1}, load_s=0.1)
+    residency = zoo.manager(budget_mb=10)
+
+    async def scenario():
+        waiter = asyncio.ensure_future(residency.ensure('whisper'))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0.2)
+    run(scenario())
+    assert residency.is_resident('whisper')
+
+
+def test_estimate_makes_room_before_first_load():
+    zoo = Zoo({'clip': 1, 'blip2': 3})
+    residency = zoo.manager(budget_mb=3.5, estimates={'blip2': 3 * MB})
+    evicted_before_load = []
+    original = zoo.load
+
+    def load(key):
+        evicted_before_load.append(list(zoo.unloads))
+        return original(key)
+    residency.loader = load
+
+    async def scenario():
+        await residency.ensure('clip')
+        await residency.ensure('blip2')
+    run(scenario())
+    assert evicted_before_load == [[], ['clip']]  # la estimación evita pasarse durante la carga
+
+
+def test_concurrent_loads_reserve_their_estimates():
+    zoo = Zoo({'clip': 2, 'blip': 2, 'whisper': 2}, load_s=0.1)
+    residency = zoo.manager(budget_mb=5, estimates={'blip': 2 * MB, 'whisper': 2 * MB})
+    evicted_before_load = []
+    original = zoo.load
+
+    def load(key):
+        evicted_before_load.append(list(zoo.unloads))
+        return original(key)
+
+    async def scenario():
+        await residency.ensure('clip')
+        residency.loader = load
+        assert all(await asyncio.gather(residency.ensure('blip'), residency.ensure('whisper')))
+    run(scenario())
+    # Por separado ambas cabían junto a clip; juntas no: la segunda reserva lo expulsa antes de cargar
+    assert ['clip'] in evicted_before_load
+    assert residency.used_bytes <= residency.budget_bytes and residency.reserved_bytes == 0
+
+
+def test_sizer_and_bookkeeping_errors_never_leave_waiters_hanging():
+    zoo = Zoo({'clip': 1, 'blip': 1})
+
+    def broken_sizer(key, model):
+        raise ValueError('sin tamaño')
+    residency = zoo.manager(budget_mb=64, sizer=broken_sizer)
+    assert run(residency.ensure('clip'))  # se mide por delta de RSS
+
+    def broken_clock():
+        raise RuntimeError('reloj roto')
+    residency = zoo.manager(budget_mb=64, clock=broken_clock)
+
+    async def scenario():
+        return await asyncio.wait_for(residency.ensure('blip'), 2)
+    with pytest.raises(RuntimeError, match='reloj roto'):
+        run(scenario())
+    assert residency._loading == {} and residency.reserved_bytes == 0
+
+
+def test_footprint_measured_by_rss_without_sizer():
+    zoo = Zoo({'stand_in': 32})
+    residency = ModelResidencyManager(zoo.load, zoo.unload, budget_bytes=1024 * MB)
+    assert run(residency.ensure('stand_in'))
+    footprint = residency.stats()['resident'][0]['footprint_mb']
+    assert 24 <= footprint <= 64
+    residency.shutdown()
+    assert zoo.unloads == ['stand_in']
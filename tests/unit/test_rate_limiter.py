@@ -0,0 +1,230 @@
+"""
+Tests del rate limiter GCRA y sus backends
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import hashlib
+import multiprocessing
+import socketserver
+import threading
+
+import pytest
+
+from vigoleonrocks.services.rate_limiter import (
+    GCRA_LUA,
+    MemoryBackend,
+    RateLimiter,
+    RateLimitPolicy,
+    RedisBackend,
+    RespClient,
+    SharedMemoryBackend,
+    _gcra,
+    parse_rate,
+    parse_route_policies,
+)
+
+NOW = 1_700_000_000.0
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Servidor RESP mínimo: PING, GET, SCRIPT LOAD y EVALSHA del script GCRA"""
+
+    def _read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode())
+        return args
+
+    def _bulk(self, value):
+        data = value.encode()
+        return b'$%d\r\n%s\r\n' % (len(data), data)
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            command = args[0].upper()
+            if command == 'PING':
+                self.wfile.write(b'+PONG\r\n')
+            elif command == 'GET':
+                value = server.store.get(args[1])
+                self.wfile.write(b'$-1\r\n' if value is None else self._bulk(value))
+            elif command == 'SCRIPT' and args[1].upper() == 'LOAD':
+                sha = hashlib.sha1(args[2].encode()).hexdigest()
+                server.scripts[sha] = args[2]
+                self.wfile.write(self._bulk(sha))
+            elif command == 'EVALSHA':
+                if server.scripts.get(args[1]) != GCRA_LUA:
+                    self.wfile.write(b'-NOSCRIPT No matching script.\r\n')
+                    continue
+                key, now, increment, tolerance = args[3], float(args[4]), float(args[5]), float(args[6])
+                with server.lock:
+                    stored = server.store.get(key)
+                    allowed, tat = _gcra(float(stored) if stored else None, now, increment, tolerance)
+                    if allowed:
+                        server.store[key] = f'{tat:.6f}'
+                self.wfile.write(b'*2\r\n:%d\r\n' % allowed + self._bulk(f'{tat:.6f}'))
+            else:
+                self.wfile.write(b'-ERR unknown command\r\n')
+
+
+@pytest.fixture
+def fake_redis():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), FakeRedisHandler)
+    server.daemon_threads = True
+    server.store, server.scripts, server.lock = {}, {}, threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("spec,expected", [
+    ("60/minute", RateLimitPolicy(60, 60.0)),
+    ("10 per second", RateLimitPolicy(10, 1.0)),
+    ("100/5minutes", RateLimitPolicy(100, 300.0)),
+    ("20/second burst 40", RateLimitPolicy(20, 1.0, 40)),
+])
+def test_parse_rate(spec, expected):
+    assert parse_rate(spec) == expected
+
+
+def test_parse_rate_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_rate("lots")
+
+
+def test_burst_then_steady_refill():
+    limiter = RateLimiter(MemoryBackend(), default_policy="5/second")
+    results = [limiter.hit("client", now=NOW) for _ in range(6)]
+    assert [r.allowed for r in results] == [True] * 5 + [False]
+    assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+    assert results[-1].retry_after == pytest.approx(0.2, abs=1e-3)
+
+    # Un token cada 0.2 s
+    assert limiter.hit("client", now=NOW + 0.2).allowed
+    assert not limiter.hit("client", now=NOW + 0.2).allowed
+    # Tras un periodo completo vuelve a estar lleno
+    assert limiter.hit("client", now=NOW + 1.2).remaining == 4
+
+
+def test_explicit_burst_and_cost():
+    limiter = RateLimiter(default_policy="1/second burst 3")
+    assert limiter.hit("k", cost=3, now=NOW).allowed
+    assert not limiter.hit("k", now=NOW).allowed
+
+
+def test_headers():
+    limiter = RateLimiter(default_policy="2/minute")
+    limiter.hit("ip", now=NOW)
+    allowed = limiter.hit("ip", now=NOW).headers()
+    denied = limiter.hit("ip", now=NOW).headers()
+    assert allowed == {
+        'RateLimit-Limit': '2', 'RateLimit-Remaining': '0',
+        'RateLimit-Reset': '60', 'RateLimit-Policy': '2;w=60',
+    }
+    assert denied['Retry-After'] == '30'
+
+
+def test_route_and_key_policies():
+    limiter = RateLimiter(
+        default_policy="100/minute",
+        route_policies=parse_route_policies("/v1/chat/completions=1/minute,/api/v2/=10/minute,/health=exempt"),
+        key_policies={"premium": "1000/minute"},
+    )
+    assert limiter.resolve("/v1/chat/completions", "1.2.3.4") == ("/v1/chat/completions|1.2.3.4", parse_rate("1/minute"))
+    assert limiter.resolve("/api/v2/image/similar", "ip")[1] == parse_rate("10/minute")
+    assert limiter.resolve("/health", "ip")[1] is None
+    assert limiter.resolve("/other", "ip") == ("default|ip", parse_rate("100/minute"))
+    assert limiter.resolve("/v1/chat/completions", "premium")[1] == parse_rate("1000/minute")
+
+
+def test_memory_backend_evicts_expired_keys():
+    backend = MemoryBackend()
+    limiter = RateLimiter(backend, default_policy="10/second")
+    for i in range(1000):
+        limiter.hit(f"k{i}", now=NOW + i)  # cada clave expira 0.1 s después
+    assert len(backend) <= 3
+
+
+def test_fail_open_on_backend_error():
+    class Broken:
+        def update(self, *args):
+            raise ConnectionError("down")
+
+    limiter = RateLimiter(Broken(), default_policy="1/minute")
+    assert limiter.hit("k").allowed
+    assert limiter.stats()['errors_total'] == 1
+    with pytest.raises(ConnectionError):
+        RateLimiter(Broken(), default_policy="1/minute", fail_open=False).hit("k")
+
+
+def test_shared_backend_is_shared_between_instances(tmp_path):
+    path = tmp_path / "rl"
+    first = RateLimiter(SharedMemoryBackend(path, slots=64), default_policy="3/minute")
+    second = RateLimiter(SharedMemoryBackend(path), default_policy="3/minute")
+    assert first.hit("k", now=NOW).allowed
+    assert second.hit("k", now=NOW).allowed
+    assert first.hit("k", now=NOW).allowed
+    assert not second.hit("k", now=NOW).allowed
+
+
+def test_shared_backend_survives_full_buckets(tmp_path):
+    limiter = RateLimiter(SharedMemoryBackend(tmp_path / "rl", slots=16), default_policy="1/minute")
+    assert sum(limiter.hit(f"k{i}", now=NOW).allowed for i in range(500)) == 500
+
+
+def test_limiters_sharing_a_backend_keep_separate_buckets(tmp_path):
+    path = tmp_path / "rl"
+    app = RateLimiter(SharedMemoryBackend(path, slots=64), default_policy="1/minute", name="app")
+    gateway = RateLimiter(SharedMemoryBackend(path), default_policy="1/minute", name="gateway")
+    bucket, policy = app.resolve("/v1/chat/completions", "1.2.3.4")
+    assert gateway.resolve("/v1/chat/completions", "1.2.3.4") == (bucket, policy)
+    assert app.hit(bucket, policy, now=NOW).allowed
+    assert gateway.hit(bucket, policy, now=NOW).allowed
+    assert not app.hit(bucket, policy, now=NOW).allowed
+    with pytest.raises(ValueError):
+        RateLimiter(name="a|b")
+
+
+def _hammer(path, key, attempts, queue):
+    limiter = RateLimiter(SharedMemoryBackend(path), default_policy="50/minute")
+    queue.put(sum(limiter.hit(key, now=NOW).allowed for _ in range(attempts)))
+
+
+@pytest.mark.slow
+def test_shared_backend_multiprocess_exact_limit(tmp_path):
+    """Con el reloj congelado, N procesos deben repartirse exactamente la capacidad"""
+    path = tmp_path / "rl"
+    SharedMemoryBackend(path, slots=1024)
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_hammer, args=(path, key, 200, queue))
+               for key in ("shared", "shared", "shared", "shared", "other", "other")]
+    for worker in workers:
+        worker.start()
+    totals = sorted(queue.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=30)
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert sum(totals) == 100  # 50 para "shared" + 50 para "other"
+
+
+def test_redis_backend_against_fake_server(fake_redis):
+    host, port = fake_redis.server_address
+    client = RespClient(host, port)
+    assert client.ping()
+    limiter = RateLimiter(RedisBackend(client), default_policy="3/minute")
+    results = [limiter.hit("ip", now=NOW).allowed for _ in range(4)]
+    assert results == [True, True, True, False]
+    assert "vigoleonrocks:rl:default|ip" in fake_redis.store
+
+    # Tras un SCRIPT FLUSH (o reinicio) el backend recarga el script
+    fake_redis.scripts.clear()
+    assert limiter.hit("other", now=NOW).allowed
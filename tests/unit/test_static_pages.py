@@ -0,0 +1,91 @@
+"""
+Tests de la caché de páginas estáticas precomprimidas
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import gzip
+import os
+
+import pytest
+
+from vigoleonrocks.services.static_pages import (
+    CACHE_POLICIES, StaticPageCache, asset_class, etag_matches, negotiate_encoding,
+)
+
+PAGE = ("<!DOCTYPE html><html><body>" + "<p>VIGOLEONROCKS landing</p>" * 200 + "</body></html>").encode()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    (tmp_path / 'landing.html').write_bytes(PAGE)
+    (tmp_path / 'tiny.html').write_bytes(b'<p>hi</p>')
+    return StaticPageCache(root=str(tmp_path))
+
+
+def test_serves_precompressed_gzip_with_strong_etag(cache):
+    status, headers, body = cache.serve('landing.html', {'Accept-Encoding': 'gzip, deflate'})
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == PAGE
+    assert int(headers['Content-Length']) == len(body) < len(PAGE) // 5
+    assert headers['ETag'].startswith('"') and not headers['ETag'].startswith('W/')
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert headers['Content-Type'] == 'text/html; charset=utf-8'
+    assert headers['Cache-Control'] == CACHE_POLICIES['html']
+
+
+def test_identity_when_client_does_not_accept_compression(cache):
+    status, headers, body = cache.serve('landing.html', {})
+    assert body == PAGE and 'Content-Encoding' not in headers
+    _, tiny_headers, tiny = cache.serve('tiny.html', {'Accept-Encoding': 'gzip'})
+    assert tiny == b'<p>hi</p>' and 'Content-Encoding' not in tiny_headers  # demasiado pequeño
+
+
+def test_if_none_match_returns_304_for_any_representation(cache):
+    _, identity, _ = cache.serve('landing.html', {})
+    _, gzipped, _ = cache.serve('landing.html', {'Accept-Encoding': 'gzip'})
+    assert identity['ETag'] != gzipped['ETag']
+    for validator in (gzipped['ETag'], f"W/{identity['ETag']}", f'"other", {identity["ETag"]}', '*'):
+        status, headers, body = cache.serve('landing.html', {'Accept-Encoding': 'gzip',
+                                                             'If-None-Match': validator})
+        assert (status, body) == (304, b'')
+        assert headers['ETag'] == gzipped['ETag']
+    assert cache.serve('landing.html', {'If-None-Match': '"stale"'})[0] == 200
+    assert cache.counters['not_modified'] == 4
+
+
+def test_negotiation_respects_q_values():
+    available = ['identity', 'gzip', 'br']
+    assert negotiate_encoding('gzip, br', available) == 'br'
+    assert negotiate_encoding('br;q=0.5, gzip', available) == 'gzip'
+    assert negotiate_encoding('gzip;q=0', available) == 'identity'
+    assert negotiate_encoding('*', ['identity', 'gzip']) == 'gzip'
+    assert negotiate_encoding('br', ['identity', 'gzip']) == 'identity'
+    assert not etag_matches('', ['"a"'])
+
+
+def test_asset_classes():
+    assert asset_class('index.html') == 'html'
+    assert asset_class('app.3f9a1c2b7d.js') == 'immutable'
+    assert asset_class('logo.png') == 'static'
+
+
+def test_mtime_change_reloads_page(cache, tmp_path):
+    _, before, _ = cache.serve('landing.html', {})
+    path = tmp_path / 'landing.html'
+    path.write_bytes(PAGE.replace(b'landing', b'updated'))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.check_for_changes() == ['landing.html']
+    _, after, body = cache.serve('landing.html', {})
+    assert after['ETag'] != before['ETag'] and b'updated' in body
+    assert cache.counters['reloads'] == 1
+
+
+def test_missing_page_raises_for_view_fallback(cache, tmp_path):
+    assert cache.preload(['landing.html', 'missing.html']) == ['missing.html']
+    with pytest.raises(FileNotFoundError):
+        cache.serve('missing.html', {})
+    os.remove(tmp_path / 'landing.html')
+    cache.check_for_changes()
+    with pytest.raises(FileNotFoundError):
+        cache.serve('landing.html', {})
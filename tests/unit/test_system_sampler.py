@@ -0,0 +1,147 @@
+"""
+Tests del muestreador único de métricas del sistema
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import dataclasses
+import gc
+import os
+import time
+
+import pytest
+
+from vigoleonrocks.services.system_sampler import (
+    GCPauseTracker,
+    ProcCounterReader,
+    RawCounters,
+    SystemSampler,
+    _CLOCK_TICKS,
+    _PAGE_SIZE,
+)
+
+
+def counters(cpu_s, busy, total, ctx=0):
+    return RawCounters(cpu_s, busy, total, 64 * 1048576, 8 * 1073741824, 6 * 1073741824,
+                       12, 5, ctx, ctx // 10, 300)
+
+
+class ScriptedReader:
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def __call__(self):
+        return self.values.pop(0)
+
+
+def test_snapshot_deltas_from_counters(monkeypatch):
+    clock = iter([100.0, 102.0])
+    monkeypatch.setattr(time, 'monotonic', lambda: next(clock))
+    sampler = SystemSampler(reader=ScriptedReader(counters(10.0, 50.0, 100.0, 1000),
+                                                  counters(11.0, 53.0, 104.0, 1400)))
+    first = sampler.sample()
+    assert first.sequence == 1 and first.process_cpu_percent == 0.0
+    second = sampler.sample()
+    assert second.sequence == 2
+    assert second.interval_s == pytest.approx(2.0)
+    assert second.process_cpu_percent == pytest.approx(50.0)   # 1 s de CPU en 2 s
+    assert second.system_cpu_percent == pytest.approx(75.0)    # 3 de 4 s ocupados
+    assert second.ctx_switches_voluntary_per_s == pytest.approx(200.0)
+    assert second.rss_mb == pytest.approx(64.0)
+    assert second.memory_percent == pytest.approx(25.0)
+    assert second.open_fds == 12 and second.threads == 5 and second.system_tasks == 300
+    assert sampler.snapshot is second
+
+
+def test_snapshot_is_immutable():
+    sampler = SystemSampler(reader=ScriptedReader(counters(1, 1, 2)))
+    snapshot = sampler.sample()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.rss_mb = 0
+    assert snapshot.as_dict()['sequence'] == 1
+
+
+def test_proc_reader_parses_proc_layout(tmp_path):
+    pid = os.getpid()
+    proc_pid = tmp_path / str(pid)
+    (proc_pid / 'fd').mkdir(parents=True)
+    for fd in range(3):
+        (proc_pid / 'fd' / str(fd)).write_text('')
+    rest = ['S'] + ['0'] * 10 + ['150', '50'] + ['0'] * 4 + ['7', '0', '0', '0', '2560'] + ['0'] * 20
+    (proc_pid / 'stat').write_text(f"{pid} (python (worker)) " + ' '.join(rest) + '\n')
+    (proc_pid / 'status').write_text("Name:\tpython\nvoluntary_ctxt_switches:\t42\nnonvoluntary_ctxt_switches:\t7\n")
+    (tmp_path / 'stat').write_text("cpu  100 0 50 800 50 0 0 0 0 0\ncpu0 100 0 50 800 50 0 0 0 0 0\n")
+    (tmp_path / 'meminfo').write_text("MemTotal:       1000 kB\nMemFree:         100 kB\nMemAvailable:    400 kB\n")
+    (tmp_path / 'loadavg').write_text("0.50 0.40 0.30 2/321 999\n")
+
+    reader = ProcCounterReader(str(tmp_path))
+    try:
+        raw = reader()
+        assert raw.process_cpu_s == pytest.approx(200 / _CLOCK_TICKS)
+        assert raw.threads == 7
+        assert raw.rss_bytes == 2560 * _PAGE_SIZE
+        assert (raw.ctx_voluntary, raw.ctx_involuntary) == (42, 7)
+        assert raw.system_cpu_total_s == pytest.approx(1000 / _CLOCK_TICKS)
+        assert raw.system_cpu_busy_s == pytest.approx(150 / _CLOCK_TICKS)
+        assert (raw.memory_total_bytes, raw.memory_available_bytes) == (1024000, 409600)
+        assert raw.open_fds == 3 and raw.system_tasks == 321
+        # el descriptor abierto relee el contenido actualizado
+        (tmp_path / 'loadavg').write_text("0.50 0.40 0.30 2/400 999\n")
+        assert reader().system_tasks == 400
+    finally:
+        reader.close()
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/stat'), reason='requiere /proc')
+def test_real_proc_reader_sees_cpu_work():
+    reader = ProcCounterReader()
+    try:
+        before = reader()
+        end = time.thread_time() + 0.05
+        while time.thread_time() < end:
+            pass
+        after = reader()
+        assert after.process_cpu_s > before.process_cpu_s
+        assert after.rss_bytes > 0 and after.threads >= 1 and after.open_fds >= 3
+    finally:
+        reader.close()
+
+
+def test_gc_pause_tracker_accumulates_and_drains():
+    tracker = GCPauseTracker()
+    gc.callbacks.append(tracker)
+    try:
+        gc.collect()
+        gc.collect()
+    finally:
+        gc.callbacks.remove(tracker)
+    collections, pause, pause_max = tracker.drain()
+    assert collections == 2
+    assert pause >= pause_max > 0
+    assert tracker.drain() == (0, 0.0, 0.0)
+
+
+def test_subscribers_throttled_and_errors_isolated():
+    reader = ScriptedReader(*[counters(i, i, 2 * i) for i in range(6)])
+    sampler = SystemSampler(reader=reader)
+    fast, slow = [], []
+    sampler.subscribe(lambda s: 1 / 0)
+    sampler.subscribe(fast.append)
+    sampler.subscribe(slow.append, every=3600)
+    for _ in range(3):
+        sampler._notify(sampler.sample())
+    assert [s.sequence for s in fast] == [1, 2, 3]
+    assert [s.sequence for s in slow] == [1]
+
+
+def test_background_thread_publishes_and_stops():
+    sampler = SystemSampler(interval=0.01)
+    seen = []
+    sampler.subscribe(seen.append)
+    sampler.start()
+    sampler.start()  # idempotente
+    deadline = time.time() + 2
+    while len(seen) < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    sampler.stop()
+    assert len(seen) >= 3
+    assert sampler.snapshot.sequence >= 4  # la muestra inicial de start() + las del hilo
+    assert sampler._gc not in gc.callbacks
@@ -0,0 +1,184 @@
+"""
+Tests del trazado de peticiones
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from vigoleonrocks.services.tracing import NOOP_SPAN, Tracer, current_span, set_tracer, span, traced
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer(enabled=True, ring_size=4, slowest=2)
+    previous = set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+    tracer.close()
+
+
+def _by_name(trace):
+    return {s.name: s for s in trace.spans}
+
+
+def test_nested_spans_share_trace_and_record_self_time(tracer):
+    @traced()
+    def leaf():
+        current_span().set('items', 3)
+        time.sleep(0.01)
+
+    with span('root', route='/x') as root:
+        with span('child'):
+            leaf()
+        time.sleep(0.005)
+
+    assert current_span() is NOOP_SPAN
+    trace = tracer.ring.recent[-1]
+    spans = _by_name(trace)
+    assert set(spans) == {'root', 'child', 'test_nested_spans_share_trace_and_record_self_time.<locals>.leaf'}
+    leaf_span = spans['test_nested_spans_share_trace_and_record_self_time.<locals>.leaf']
+    assert leaf_span.parent is spans['child'] and spans['child'].parent is root
+    assert leaf_span.attributes == {'items': 3}
+    assert root.attributes == {'route': '/x'}
+    assert root.duration_ms >= spans['child'].duration_ms >= leaf_span.duration_ms >= 10
+    assert spans['child'].self_ms < 5 <= root.self_ms
+    assert trace.to_dict()['spans'][1]['parent_id'] == root.span_id
+
+
+def test_overlapping_children_count_once_in_self_time(tracer):
+    async def child(delay):
+        with span('child'):
+            await asyncio.sleep(delay)
+
+    async def request():
+        with span('root') as root:
+            await asyncio.gather(child(0.03), child(0.03), child(0.02))
+            time.sleep(0.01)
+        return root
+
+    root = asyncio.run(request())
+    assert 25 <= root.child_ms < root.duration_ms
+    assert root.self_ms >= 8
+
+
+def test_errors_are_recorded_and_reraised(tracer):
+    with pytest.raises(ValueError):
+        with span('root'):
+            with span('failing'):
+                raise ValueError('boom')
+    trace = tracer.ring.recent[-1]
+    assert _by_name(trace)['failing'].error == 'ValueError: boom'
+    assert tracer.ring.span_stats()[0]['errors'] == 1
+
+
+def test_spans_follow_asyncio_tasks_through_the_quantum_pipeline(tracer):
+    from vigoleonrocks.core.quantum_dimension_activator import get_quantum_dimension_activator
+    from vigoleonrocks.core.quantum_parallel_processor import get_quantum_parallel_processor
+
+    async def request():
+        with span('POST /api/quantum'):
+            activation = get_quantum_dimension_activator().activate_dimensions('Explica la consciencia cuántica')
+            return await get_quantum_parallel_processor().process_multidimensional_query(
+                'Explica la consciencia cuántica', activation['activated_dimensions'])
+
+    result = asyncio.run(request())
+    assert result['success']
+    trace = tracer.ring.recent[-1]
+    spans = _by_name(trace)
+    process = spans['QuantumParallelProcessor.process_multidimensional_query']
+    dimensions = [s for s in trace.spans if s.name == 'QuantumParallelProcessor.process_dimension']
+
+    assert process.attributes['active_dimensions'] == len(dimensions) > 0
+    assert all(s.parent is process and s.end is not None for s in dimensions)
+    assert sorted(s.attributes['dimension_id'] for s in dimensions) == sorted(
+        r.dimension_id for r in result['dimensional_results'])
+    assert process.attributes['waves'] >= 1
+    assert 0 < process.child_ms <= process.duration_ms  # dimensiones concurrentes contadas una vez
+    coherence = [s for s in trace.spans if s.name == 'QuantumCoherenceEngine.calculate_quantum_coherence']
+    assert {s.parent.name for s in coherence} == {'QuantumDimensionActivator.activate_dimensions',
+                                                  'QuantumParallelProcessor.process_multidimensional_query'}
+    assert spans['QuantumDimensionActivator.analyze_query'].attributes['text_length'] == 31
+
+
+def test_disabled_and_unsampled_tracers_record_nothing():
+    disabled = Tracer(enabled=False)
+    previous = set_tracer(disabled)
+    try:
+        with span('root') as root:
+            assert root is NOOP_SPAN and current_span() is NOOP_SPAN
+            assert traced('x')(lambda: 42)() == 42
+        assert disabled.counters['traces'] == 0 and not disabled.ring.recent
+
+        unsampled = Tracer(enabled=True, sample_rate=0.0)
+        set_tracer(unsampled)
+        with span('root') as root:
+            assert not root.recording
+            with span('child') as child:
+                assert child is NOOP_SPAN
+        assert current_span() is NOOP_SPAN
+        assert unsampled.counters == {'traces': 0, 'unsampled': 1, 'export_errors': 0}
+    finally:
+        set_tracer(previous)
+
+
+def test_ring_keeps_slowest_traces_and_per_span_aggregates(tracer):
+    for i in range(10):
+        with span('request', i=i):
+            with span('work'):
+                time.sleep(0.03 if i in (2, 5) else 0.001)
+
+    assert len(tracer.ring.recent) == 4  # ring_size
+    slowest = tracer.ring.slowest_traces()
+    assert {t.root.attributes['i'] for t in slowest} == {2, 5}
+    assert tracer.ring.find(slowest[0].trace_id) is slowest[0]  # sobrevive a la expulsión del anillo
+    stats = {row['name']: row for row in tracer.ring.span_stats()}
+    assert stats['work']['count'] == stats['request']['count'] == 10
+    assert stats['work']['p99_ms'] >= 25 and stats['work']['p50_ms'] < 25
+    assert stats['work']['self_total_ms'] > stats['request']['self_total_ms']
+
+
+def test_file_exporter_writes_jsonl(tmp_path):
+    path = tmp_path / 'traces' / 'traces.jsonl'
+    tracer = Tracer(enabled=True, file_path=path)
+    previous = set_tracer(tracer)
+    try:
+        for i in range(3):
+            with span('request', i=i):
+                with span('child'):
+                    pass
+    finally:
+        set_tracer(previous)
+        tracer.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line['attributes']['i'] for line in lines] == [0, 1, 2]
+    assert [s['name'] for s in lines[0]['spans']] == ['request', 'child']
+
+
+def test_flask_root_span_header_and_debug_endpoint(tracer):
+    flask = pytest.importorskip('flask')
+    from vigoleonrocks.services.tracing import install_tracing
+
+    app = flask.Flask(__name__)
+    install_tracing(app, tracer)
+
+    @app.route('/api/echo/<word>')
+    def echo(word):
+        with span('echo.work', length=len(word)):
+            return {'word': word}
+
+    client = app.test_client()
+    response = client.get('/api/echo/hola')
+    trace_id = response.headers['X-Trace-Id']
+    trace = tracer.ring.find(trace_id)
+    assert trace.root.name == 'GET /api/echo/<word>'
+    assert trace.root.attributes['status'] == 200
+    assert _by_name(trace)['echo.work'].parent is trace.root
+
+    data = client.get('/debug/traces?format=json').get_json()
+    assert data['slowest'][0]['trace_id'] == trace_id
+    assert {row['name'] for row in data['spans']} == {'GET /api/echo/<word>', 'echo.work'}
+    assert 'X-Trace-Id' not in client.get('/debug/traces').headers
+    assert client.get('/debug/traces?trace_id=nope').status_code == 404
@@ -0,0 +1,154 @@
+"""
+Tests de la captura y el replay de tráfico
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vigoleonrocks.services.traffic_capture import TrafficCapture, encode_body, load_capture, scrub_pii
+from vigoleonrocks.services.traffic_replay import compare, format_report, replay
+
+
+def make_record(ts, path='/api/chat', body=None, **extra):
+    record = {'ts': ts, 'source': 'app', 'method': 'POST' if body is not None else 'GET',
+              'path': path, 'route': path, 'query': '', 'headers': {'Content-Type': 'application/json'}}
+    record.update(encode_body(json.dumps(body).encode() if body is not None else b'', 1024))
+    record.update(extra)
+    return record
+
+
+@pytest.fixture
+def target():
+    """Servidor HTTP local: eco del cuerpo; ``version`` cambia la respuesta de /api/chat"""
+    state = {'version': 1, 'seen': []}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            state['seen'].append((time.perf_counter(), self.path, None))
+            status = 500 if self.path == '/api/flaky' and state['version'] == 2 else 200
+            self._reply(status, {'path': self.path, 'timestamp': time.time()})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            state['seen'].append((time.perf_counter(), self.path, body))
+            self._reply(200, {'echo': json.loads(body), 'version': state['version'], 'timestamp': time.time()})
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", state
+    server.shutdown()
+    server.server_close()
+
+
+def test_scrub_pii_keeps_json_valid():
+    record = make_record(0.0, body={'message': 'soy ana@example.com, llámame al +34 612 345 678',
+                                    'amount': 4111111111111111, 'ip': '10.0.0.12'})
+    record['headers']['Authorization'] = 'Bearer abc'
+    record['query'] = 'email=ana@example.com'
+    scrubbed = scrub_pii(record)
+    body = json.loads(scrubbed['body'])
+    assert body['message'] == 'soy [EMAIL], llámame al [PHONE]'
+    assert body['amount'] == 4111111111111111  # números fuera de cadenas intactos
+    assert body['ip'] == '[IP]'
+    assert scrubbed['headers']['Authorization'] == '[REDACTED]'
+    assert scrubbed['query'] == 'email=[EMAIL]'
+
+
+def test_scrub_pii_decodes_urlencoded_query_and_form_bodies():
+    record = make_record(0.0)
+    record['query'] = 'user=ana%40mail.es&card=4111+1111+1111+1111&q=hola+mundo'
+    record['headers']['Content-Type'] = 'application/x-www-form-urlencoded'
+    record['body'] = 'email=ana%40mail.es&password=hunter2&tel=%2B34+612+345+678'
+    scrubbed = scrub_pii(record)
+    assert scrubbed['query'] == 'user=[EMAIL]&card=[CARD]&q=hola%20mundo'
+    assert scrubbed['body'] == 'email=[EMAIL]&password=[REDACTED]&tel=[PHONE]'
+    assert 'hunter2' not in json.dumps(scrubbed)
+
+    untouched = make_record(0.0)
+    untouched['query'] = 'q=hola+mundo&page=2'
+    assert scrub_pii(untouched)['query'] == 'q=hola+mundo&page=2'
+
+
+def test_scrub_pii_redacts_values_of_secret_keys():
+    record = make_record(0.0, body={'user': 'ana', 'password': 'hunter2', 'api_key': 'abc123',
+                                    'auth': {'access_token': 'eyJhbGciOi', 'client_secret': 's3cr3t'},
+                                    'Authorization': 'Bearer xyz', 'tokens_used': 12, 'text': 'hola'})
+    body = json.loads(scrub_pii(record)['body'])
+    assert body['password'] == body['api_key'] == body['Authorization'] == '[REDACTED]'
+    assert body['auth'] == {'access_token': '[REDACTED]', 'client_secret': '[REDACTED]'}
+    assert body['user'] == 'ana' and body['text'] == 'hola' and body['tokens_used'] == 12
+
+
+def test_capture_rotates_and_loads_in_arrival_order(tmp_path):
+    capture = TrafficCapture(directory=tmp_path, name='app', sample_rate=1.0, enabled=True,
+                             max_bytes=2000, backups=20)
+    capture.add_scrubber(lambda r: None if r['path'] == '/api/secret' else r)
+    for i in range(60):
+        assert capture.write(make_record(1000.0 + i, body={'i': i})) is True
+    assert capture.write(make_record(2000.0, path='/api/secret')) is False
+    capture.close()
+
+    files = list(tmp_path.iterdir())
+    assert len(files) > 1
+    records = load_capture([tmp_path])
+    assert [json.loads(r['body'])['i'] for r in records] == list(range(60))
+    assert capture.counters['dropped'] == 1
+
+
+def test_sampling_and_exclusions(tmp_path):
+    assert not TrafficCapture(directory=tmp_path, enabled=True, sample_rate=0).should_capture('/api/chat')
+    capture = TrafficCapture(directory=tmp_path, enabled=True, sample_rate=1.0)
+    assert capture.should_capture('/api/chat')
+    assert not capture.should_capture('/health')
+    half = TrafficCapture(directory=tmp_path, enabled=True, sample_rate=0.5)
+    sampled = sum(half.should_capture('/api/chat') for _ in range(4000))
+    assert 1700 < sampled < 2300
+
+
+def test_replay_honours_timing_and_speed(target):
+    url, state = target
+    records = [make_record(500.0 + 0.2 * i, body={'n': i}) for i in range(5)]
+    records.append(make_record(501.2, body=None, body_omitted='multipart', body_size=10 ** 6))
+    results = replay(records, url, speed=2.0, workers=4)
+
+    assert [r.status for r in results[:5]] == [200] * 5
+    assert results[5].error == 'skipped: multipart'
+    sent = [t for t, _, body in state['seen']]
+    gaps = [b - a for a, b in zip(sent, sent[1:])]
+    assert all(0.07 < gap < 0.16 for gap in gaps), gaps  # 0.2 s capturados / 2x
+    assert [json.loads(body)['n'] for _, _, body in state['seen']] == list(range(5))
+
+
+def test_compare_reports_status_and_body_changes(target):
+    url, state = target
+    records = [make_record(10.0, body={'q': 'hola'}), make_record(10.01, path='/api/flaky'),
+               make_record(10.02, path='/api/stable')]
+    baseline = replay(records, url, speed=0)
+    state['version'] = 2
+    candidate = replay(records, url, speed=0)
+
+    report = compare(baseline, candidate)
+    assert report['overall']['baseline']['errors'] == 0
+    assert report['overall']['candidate']['errors'] == 1
+    assert report['status_changes'] == [{'index': 1, 'path': '/api/flaky', 'baseline': 200, 'candidate': 500}]
+    # timestamp es volátil: solo cambia la versión
+    assert report['body_changes'] == [{'index': 0, 'path': '/api/chat', 'fields': ['$.version']}]
+    assert 'status changes: 1' in format_report(report)
@@ -0,0 +1,81 @@
+"""
+Tests del motor de traducción por diccionario en una sola pasada
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import pytest
+
+from benchmarks.translation_benchmark import legacy_translate
+from vigoleonrocks.services.translation_engine import (
+    DEFAULT_PHRASES,
+    TranslationEngine,
+    get_translation_engine,
+)
+
+
+@pytest.fixture
+def engine():
+    return TranslationEngine()
+
+
+@pytest.mark.multilingual
+@pytest.mark.parametrize("text,target,expected", [
+    ("hello", "es", "hola"),
+    ("good morning, how are you?", "es", "buenos días, cómo estás?"),
+    ("obrigado", "en", "thank you"),
+    ("quién eres", "pt", "quem é você"),
+])
+def test_translates_known_phrases(engine, text, target, expected):
+    assert engine.translate(text, target) == expected
+
+
+def test_respects_word_boundaries(engine):
+    # El bucle anterior convertía 'this' en 'tholas'
+    assert engine.translate("this is history", "es") == "this is history"
+    assert legacy_translate("this", "es", DEFAULT_PHRASES) == "tholas"
+
+
+def test_longest_match_wins(engine):
+    assert engine.translate("thank you", "es") == "gracias"
+    assert engine.translate("see you", "pt") == "até logo"
+
+
+def test_output_is_not_retranslated():
+    engine = TranslationEngine({'a': {'x': 'b'}, 'b': {'x': 'c'}})
+    assert engine.translate("a b", "x") == "b c"
+
+
+def test_preserves_case(engine):
+    assert engine.translate("Hello", "es") == "Hola"
+    assert engine.translate("HELLO friend", "es") == "HOLA friend"
+    assert engine.translate("Good Morning", "es") == "Buenos días"
+
+
+def test_multiword_phrase_tolerates_whitespace(engine):
+    assert engine.translate("good\n  morning", "es") == "buenos días"
+
+
+def test_unknown_target_returns_text(engine):
+    assert engine.translate("hello", "xx") == "hello"
+
+
+def test_load_phrase_table_from_file(tmp_path):
+    table = tmp_path / "en-fr.tsv"
+    table.write_text("# comentario\nhello\tbonjour\ngood night\tbonne nuit\n", encoding="utf-8")
+    engine = TranslationEngine({})
+    assert engine.load_directory(tmp_path) == 2
+    assert engine.translate("Hello, good night", "fr", "en") == "Bonjour, bonne nuit"
+    assert engine.translate("Hello", "fr") == "Bonjour"
+    assert ("en", "fr") in engine.language_pairs()
+
+
+def test_pair_table_overrides_base_phrases(tmp_path):
+    (tmp_path / "en-es.tsv").write_text("hello\tbuenas\n", encoding="utf-8")
+    engine = TranslationEngine()
+    engine.load_directory(tmp_path)
+    assert engine.translate("hello", "es", "en") == "buenas"
+
+
+def test_shared_engine_loads_bundled_tables():
+    engine = get_translation_engine()
+    assert "en" in engine.source_languages()
+    assert engine.translate("see you tomorrow", "es", "en") == "hasta mañana"
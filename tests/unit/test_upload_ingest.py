@@ -0,0 +1,122 @@
+"""
+Tests de la ingesta de subidas en streaming
+VIGOLEONROCKS - Quantum NLP Service
+"""
+import hashlib
+
+import pytest
+
+from vigoleonrocks.services.upload_ingest import (
+    SNIFF_BYTES, UnsupportedUploadType, UploadIngest, UploadTooLarge, parse_limits, sniff,
+)
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 200
+MP4 = b'\x00\x00\x00\x18ftypisom' + b'\x00' * 200
+M4A = b'\x00\x00\x00\x18ftypM4A ' + b'\x00' * 200
+
+
+def stream(upload, data, chunk=16 * 1024):
+    for i in range(0, len(data), chunk):
+        upload.write(data[i:i + chunk])
+    upload.seek(0)
+    return upload
+
+
+def test_sniff_uses_magic_bytes_not_extension():
+    assert sniff(PNG, 'foto.jpg') == ('image', 'image/png')
+    assert sniff(MP4)[0] == 'video'
+    assert sniff(M4A) == ('audio', 'audio/mp4')
+    assert sniff(b'PK\x03\x04' + b'\x00' * 60, 'informe.docx')[0] == 'document'
+    assert sniff(b'PK\x03\x04' + b'\x00' * 60, 'fotos.zip')[0] == 'archive'
+    assert sniff('hola, ¿qué tal?'.encode()) == ('text', 'text/plain')
+    assert sniff(b'\x7fELF\x02\x01\x01\x00' + b'\x00' * 56) == (None, None)
+
+
+def test_parse_limits():
+    assert parse_limits('image=20MB, video=1.5GB,text=512KB') == {
+        'image': 20 * 1024 ** 2, 'video': int(1.5 * 1024 ** 3), 'text': 512 * 1024}
+    with pytest.raises(ValueError):
+        parse_limits('binary=1MB')
+
+
+def test_unsupported_type_rejected_on_first_chunk():
+    ingest = UploadIngest({'/api/upload/image': ['image']})
+    upload = ingest.open('/api/upload/image', 'video.png')
+    with pytest.raises(UnsupportedUploadType) as excinfo:
+        upload.write(MP4[:SNIFF_BYTES])
+    assert excinfo.value.status == 415
+    assert excinfo.value.kind == 'video'
+
+
+def test_size_limit_enforced_mid_stream():
+    ingest = UploadIngest(limits={'image': 64 * 1024})
+    upload = ingest.open('/api/upload/image', 'big.png')
+    written = 0
+    with pytest.raises(UploadTooLarge) as excinfo:
+        for _ in range(100):
+            upload.write(PNG[:16] + b'\x00' * (16 * 1024 - 16))
+            written += 16 * 1024
+    assert excinfo.value.status == 413
+    assert written <= 64 * 1024
+
+
+def test_declared_length_rejected_before_any_data():
+    ingest = UploadIngest({'/api/upload/image': ['image']}, limits={'image': 1024})
+    with pytest.raises(UploadTooLarge):
+        ingest.open('/api/upload/image', 'big.png', content_length=4096)
+
+
+def test_hash_size_and_spool_rollover():
+    data = PNG + bytes(range(256)) * 1024
+    ingest = UploadIngest(max_memory=64 * 1024)
+    upload = stream(ingest.open('/api/upload/image', 'a.png'), data)
+    assert upload.read() == data
+    assert upload.info() == {'kind': 'image', 'mime': 'image/png', 'size': len(data),
+                             'sha256': hashlib.sha256(data).hexdigest(), 'spooled_to_disk': True}
+
+    small = stream(ingest.open('/api/upload/image', 'b.png'), PNG)
+    assert small.on_disk is False
+
+
+def test_short_file_identified_on_seek():
+    ingest = UploadIngest({'/api/upload/single': ['text']})
+    upload = stream(ingest.open('/api/upload/single', 'nota.txt'), b'hola')
+    assert upload.kind == 'text'
+    assert upload.read() == b'hola'
+
+    binary = ingest.open('/api/upload/single', 'nota.txt')
+    binary.write(b'\x00\x01\x02')
+    with pytest.raises(UnsupportedUploadType):
+        binary.seek(0)
+
+
+def test_boms_and_non_utf8_text_with_text_extension():
+    utf16 = '﻿hola, ¿qué tal?'.encode('utf-16-le')
+    assert utf16.startswith(b'\xff\xfe')  # también pasaría el frame sync de MP3
+    assert sniff(utf16, 'nota.txt') == ('text', 'text/plain; charset=utf-16-le')
+    assert sniff('﻿hola'.encode('utf-8'))[0] == 'text'
+
+    latin1 = 'Año de publicación: café, niño, acción'.encode('latin-1')
+    assert sniff(latin1, 'notas.txt') == ('text', 'text/plain')
+    assert sniff(latin1, 'script.py')[0] == 'text'
+    assert sniff(latin1, 'datos.bin') == (None, None)
+    assert sniff(b'\x00\x01' + latin1, 'notas.txt') == (None, None)  # binario con NUL
+
+
+def test_multi_file_route_rejects_only_the_offending_part():
+    ingest = UploadIngest({'/api/process': ['text', 'image'], '/api/upload/single': ['text']}, limits={'text': 1024},
+                          multi_file_routes=['/api/process'])
+    video = stream(ingest.open('/api/process', 'clip.txt'), MP4)
+    assert video.read() == b''
+    assert video.info()['error'] == 'Tipo de archivo no soportado (video)'
+    assert video.info()['status'] == 415 and video.size == len(MP4)
+
+    big = stream(ingest.open('/api/process', 'largo.txt'), b'a' * 4096)
+    assert big.info()['status'] == 413
+
+    ok = stream(ingest.open('/api/process', 'nota.txt'), b'hola')
+    assert ok.read() == b'hola' and 'error' not in ok.info()
+
+    # Las rutas de un solo archivo siguen rechazando la petición entera
+    with pytest.raises(UnsupportedUploadType):
+        ingest.open('/api/upload/single', 'clip.txt').write(MP4[:SNIFF_BYTES])
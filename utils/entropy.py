@@ -1,32 +1,32 @@
 #!/usr/bin/env python3
 """
 System Entropy Utilities
-Provides cryptographically secure entropy from OS kernel
+Floats, ints and choices come from the shared entropy service
+(vigoleonrocks.services.entropy: CSPRNG-seeded per-thread generator, or
+reproducible with ENTROPY_SEED). Bytes/hex/URL-safe tokens stay on the OS
+CSPRNG because they are used as secrets.
 Replaces Math.random and random.random usage throughout the system
 """
 import secrets
-import struct
-import os
-import time
-from typing import Union
+
+from vigoleonrocks.services.entropy import get_entropy
 
 
 def sys_entropy_float() -> float:
-    """Generate cryptographically secure float between 0.0 and 1.0"""
-    return struct.unpack("!I", secrets.token_bytes(4))[0] / 2**32
+    """Float between 0.0 and 1.0 from the shared entropy service"""
+    return get_entropy().uniform()
 
 
 def sys_entropy_int(min_val: int = 0, max_val: int = 100) -> int:
-    """Generate cryptographically secure integer in range [min_val, max_val]"""
-    return secrets.randbelow(max_val - min_val + 1) + min_val
+    """Integer in range [min_val, max_val] from the shared entropy service"""
+    return get_entropy().integers(min_val, max_val + 1)
 
 
 def sys_entropy_choice(choices: list):
-    """Choose randomly from a list using system entropy"""
+    """Choose randomly from a list using the shared entropy service"""
     if not choices:
         return None
-    index = secrets.randbelow(len(choices))
-    return choices[index]
+    return get_entropy().choice(choices)
 
 
 def sys_entropy_bytes(length: int = 32) -> bytes:
@@ -46,39 +46,9 @@ def sys_entropy_urlsafe(length: int = 32) -> str:
 
 def hybrid_entropy_sources() -> list:
     """
-    Generate entropy from multiple system sources
-    Used by flask_app_fast.py get_system_entropy()
+    Eight 16-bit values, same shape as flask_app_fast.py get_system_entropy()
     """
-    sources = []
-    
-    try:
-        # High resolution time
-        sources.append(time.time_ns() & 0xFFFFFFFF)
-        
-        # Process ID
-        sources.append(os.getpid() & 0xFFFF)
-        
-        # System entropy
-        sources.append(struct.unpack("!I", secrets.token_bytes(4))[0] & 0xFFFF)
-        
-        # Memory info
-        import sys
-        sources.append(sys.getsizeof(sys.modules) & 0xFFFF)
-        
-        # CPU count
-        sources.append((os.cpu_count() or 1) & 0xFFFF)
-        
-        # Working directory hash
-        sources.append(hash(str(os.getcwd())) & 0xFFFF)
-        
-        # Monotonic time
-        sources.append(int(time.monotonic() * 1000000) & 0xFFFF)
-        
-    except Exception:
-        # Fallback to pure cryptographic entropy
-        sources = [struct.unpack("!I", secrets.token_bytes(4))[0] & 0xFFFF for _ in range(8)]
-    
-    return sources
+    return get_entropy().words(8, 16)
 
 
 # JavaScript equivalent for browser usage
@@ -14,6 +14,8 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from ..services.tracing import current_span, traced
+
 class QuantumTier(Enum):
     """Quantum dimension tiers based on consciousness levels"""
     CORE_CONSCIOUSNESS = (1, 7)      # Merkaba foundation
@@ -279,6 +281,7 @@ class QuantumCoherenceEngine:
         
         return uncertainty
     
+    @traced('QuantumCoherenceEngine.calculate_quantum_coherence')
     def calculate_quantum_coherence(
         self, 
         active_dimensions: List[int], 
@@ -347,6 +350,8 @@ class QuantumCoherenceEngine:
         dimensional_harmony = self._calculate_dimensional_harmony(active_dimensions)
         quantum_entanglement = self._calculate_quantum_entanglement(active_dimensions, resonance_sum)
         supremacy_potential = self._calculate_supremacy_potential(active_dimensions)
+        current_span().update(active_dimensions=len(active_dimensions), consciousness_level=consciousness_level,
+                              context_length=context_length, coherence=round(final_coherence, 2))
         
         return {
             'primary_coherence': round(final_coherence, 2),
@@ -13,6 +13,7 @@ from typing import List, Dict, Set, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 from .quantum_coherence_engine import QuantumTier, get_quantum_coherence_engine
+from ..services.tracing import current_span, traced
 
 class QueryCategory(Enum):
     """Categories of queries for dimension activation"""
@@ -316,6 +317,7 @@ class QuantumDimensionActivator:
         
         return compatibility
     
+    @traced('QuantumDimensionActivator.analyze_query')
     def analyze_query(self, query: str) -> Dict[str, any]:
         """
         Analyze query to determine characteristics and requirements
@@ -346,6 +348,8 @@ class QuantumDimensionActivator:
                 analysis['categories'].append(rule.category.value)
                 analysis['confidence_scores'][rule.category.value] = confidence
         
+        current_span().update(text_length=analysis['length'], word_count=analysis['word_count'],
+                              categories=len(analysis['categories']))
         return analysis
     
     def _calculate_complexity(self, query: str) -> float:
@@ -427,6 +431,7 @@ class QuantumDimensionActivator:
         
         return confidence
     
+    @traced('QuantumDimensionActivator.activate_dimensions')
     def activate_dimensions(
         self, 
         query: str, 
@@ -498,6 +503,7 @@ class QuantumDimensionActivator:
             'activation_strategy': self._describe_activation_strategy(final_activated),
             'tier_distribution': self._calculate_tier_distribution(final_activated)
         }
+        current_span().update(active_dimensions=len(final_activated), consciousness_level=consciousness_level)
         
         return result
     
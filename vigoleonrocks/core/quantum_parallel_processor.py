@@ -16,6 +16,7 @@ from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, Future
 from .quantum_coherence_engine import get_quantum_coherence_engine, DimensionConfig, QuantumTier
 from .quantum_dimension_activator import get_quantum_dimension_activator
+from ..services.tracing import current_span, traced
 
 class ProcessingState(Enum):
     """States of dimensional processing"""
@@ -91,6 +92,7 @@ class QuantumParallelProcessor:
         
         print(f"🌀 Quantum Parallel Processor initialized with {self.max_workers} workers")
     
+    @traced('QuantumParallelProcessor.process_multidimensional_query')
     async def process_multidimensional_query(
         self,
         query: str,
@@ -112,6 +114,8 @@ class QuantumParallelProcessor:
         """
         start_time = time.time()
         process_id = f"process_{int(time.time() * 1000)}"
+        current_span().update(active_dimensions=len(activated_dimensions), text_length=len(query),
+                              consciousness_level=consciousness_level)
         
         self.processing_metrics['total_processes'] += 1
         self.processing_metrics['peak_parallel_dimensions'] = max(
@@ -218,6 +222,7 @@ class QuantumParallelProcessor:
         
         print(f"🔮 Process {process_id} initialized with {len(dimensions)} dimensions")
     
+    @traced('QuantumParallelProcessor.process_dimension')
     async def _process_dimension(
         self,
         dimension_id: int,
@@ -229,6 +234,7 @@ class QuantumParallelProcessor:
         """Process query in a specific quantum dimension"""
         
         start_time = time.time()
+        current_span().set('dimension_id', dimension_id)
         
         try:
             with self.dimension_locks[dimension_id]:
@@ -419,17 +425,19 @@ class QuantumParallelProcessor:
         completed_dimensions = set()
         
         # Process in waves based on consciousness level and entanglement
+        wave_index = 0
         while dimension_tasks:
             # Determine next wave of dimensions to process
             current_wave = self._select_processing_wave(
                 dimension_tasks, completed_dimensions, consciousness_level
             )
             
-            # Execute current wave
+            # Execute current wave (tasks already run concurrently; waves only order result collection)
             wave_results = await asyncio.gather(
                 *[task for dim_id, task in current_wave],
                 return_exceptions=True
             )
+            wave_index += 1
             
             # Process wave results
             for i, (dim_id, task) in enumerate(current_wave):
@@ -454,6 +462,7 @@ class QuantumParallelProcessor:
             # Update entanglement states
             await self._update_entanglement_states(process_id, completed_dimensions)
         
+        current_span().set('waves', wave_index)
         return results
     
     def _select_processing_wave(
@@ -569,6 +578,7 @@ class QuantumParallelProcessor:
                     coherence_maintained = len(entangled_completed) / len(state.entangled_dimensions) > 0.7
                     state.coherence_maintained = coherence_maintained
     
+    @traced('QuantumParallelProcessor.synchronize_quantum_states')
     async def _synchronize_quantum_states(
         self,
         dimensional_results: List[DimensionalProcessingResult],
@@ -626,6 +636,7 @@ class QuantumParallelProcessor:
         
         return result
     
+    @traced('QuantumParallelProcessor.aggregate_multidimensional_results')
     async def _aggregate_multidimensional_results(
         self,
         synchronized_results: List[DimensionalProcessingResult],
@@ -8,71 +8,32 @@ import sys
 import os
 import json
 import logging
-import hashlib
 import time
 from datetime import datetime
 from pathlib import Path
 from flask import Flask, request, jsonify, render_template_string, send_from_directory
 from flask_cors import CORS
 
+try:
+    from vigoleonrocks.services.language_identifier import DEFAULT_MIN_CONFIDENCE, get_language_identifier
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from vigoleonrocks.services.language_identifier import DEFAULT_MIN_CONFIDENCE, get_language_identifier
+from vigoleonrocks.services.entropy import get_entropy
+from vigoleonrocks.services.interaction_history import InteractionHistory
+from vigoleonrocks.services.tracing import current_span, install_tracing, span, traced
+from vigoleonrocks.services.translation_engine import get_translation_engine
+
 # Configuración del servidor
 app = Flask(__name__)
 CORS(app)
+install_tracing(app)  # TRACING_ENABLED: span raíz por petición y /debug/traces
 app.config['SECRET_KEY'] = 'vigoleonrocks_human_2025'
 
 # Logging configurado
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('VIGOLEONROCKS')
 
-class MetricsBasedRNG:
-    """Generador de números aleatorios basado en métricas del sistema (seguro)"""
-    
-    def __init__(self):
-        self.entropy_pool = []
-        self._collect_system_metrics()
-    
-    def _collect_system_metrics(self):
-        """Recolecta métricas del sistema para generar entropía"""
-        try:
-            # Métricas de tiempo con microsegundos
-            current_time = str(time.time_ns())
-            
-            # Métricas de proceso
-            pid_metrics = str(os.getpid())
-            
-            # Métricas de memoria (usando información del sistema)
-            memory_info = str(hash(str(time.process_time_ns())))
-            
-            # Combinar métricas para crear semilla
-            combined_metrics = f"{current_time}{pid_metrics}{memory_info}"
-            
-            # Hash de las métricas para crear entropía
-            entropy_hash = hashlib.sha256(combined_metrics.encode()).hexdigest()
-            
-            # Convertir hash a números
-            for i in range(0, len(entropy_hash), 8):
-                chunk = entropy_hash[i:i+8]
-                self.entropy_pool.append(int(chunk, 16) % 1000)
-                
-        except Exception as e:
-            # Fallback usando tiempo
-            self.entropy_pool = [int(str(time.time_ns())[-3:])]
-    
-    def get_random_choice(self, choices):
-        """Selecciona un elemento aleatorio usando métricas del sistema"""
-        if not self.entropy_pool:
-            self._collect_system_metrics()
-        
-        # Usar métricas del sistema para seleccionar
-        entropy_value = self.entropy_pool.pop(0) if self.entropy_pool else int(str(time.time_ns())[-3:])
-        index = entropy_value % len(choices)
-        
-        # Recoletar más métricas si se agota el pool
-        if len(self.entropy_pool) < 5:
-            self._collect_system_metrics()
-        
-        return choices[index]
-
 class VIGOLEONROCKSServer:
     def __init__(self):
         """Inicializa el servidor VIGOLEONROCKS con respuestas humanas"""
@@ -81,8 +42,10 @@ class VIGOLEONROCKSServer:
         self.current_profile = 'human'  # Perfil actual
         self.quantum_states = 26
         self.context_capacity = 500000  # UNIFIED STANDARD - LÍDER INDUSTRIAL 2025
-        self.interaction_history = []
-        self.metrics_rng = MetricsBasedRNG()  # Usar métricas del sistema (seguro)
+        self.interaction_history = InteractionHistory.from_env()
+        self.entropy = get_entropy()  # Entropía compartida (reproducible con ENTROPY_SEED)
+        self.language_identifier = get_language_identifier()
+        self.translation_engine = get_translation_engine()
         
         # Sistema de respuestas humanas naturales
         self.human_responses = self._load_human_responses()
@@ -546,60 +509,14 @@ class VIGOLEONROCKSServer:
             }
         }
 
+    @traced('VIGOLEONROCKSServer.detect_language')
     def detect_language(self, text: str):
-        """Detecta el idioma de forma simple y natural - TRILOGÍA MULTILINGÜE GLOBAL"""
-        text_lower = text.lower().strip()
-
-        # Marcadores de idioma expandidos para 12 idiomas
-        language_markers = {
-            'es': ['hola', 'gracias', 'por favor', 'qué', 'que', 'cómo', 'como', 'cuándo', 'cuando', 'cuánto', 'cuanto', 'dónde', 'donde', 'por qué', 'porque', 'quién', 'quien', 'eres', 'muy', 'bien', 'mal', 'ahora', 'después', 'buenos', 'buenas', 'es', 'está', 'esta', 'son', 'soy', 'somos'],
-            'en': ['hello', 'hi', 'thank', 'thanks', 'please', 'what', 'how', 'when', 'where', 'why', 'who', 'you', 'are', 'very', 'well', 'bad', 'now', 'after'],
-            'pt': ['olá', 'ola', 'oi', 'obrigado', 'obrigada', 'por favor', 'o que', 'como', 'quando', 'onde', 'por que', 'quem', 'você', 'muito', 'bem', 'mal', 'agora', 'depois'],
-            'fr': ['bonjour', 'salut', 'merci', 's\'il vous plaît', 'que', 'comment', 'quand', 'où', 'pourquoi', 'qui', 'vous', 'êtes', 'très', 'bien', 'mal', 'maintenant', 'après'],
-            'de': ['hallo', 'guten tag', 'danke', 'bitte', 'was', 'wie', 'wann', 'wo', 'warum', 'wer', 'sie', 'sind', 'sehr', 'gut', 'schlecht', 'jetzt', 'nach'],
-            'it': ['ciao', 'buongiorno', 'grazie', 'per favore', 'che', 'come', 'quando', 'dove', 'perché', 'chi', 'tu', 'sei', 'molto', 'bene', 'male', 'ora', 'dopo'],
-            'zh': ['你好', '谢谢', '请', '什么', '怎么', '什么时候', '哪里', '为什么', '谁', '你', '是', '很', '好', '坏', '现在', '之后'],
-            'ja': ['こんにちは', 'ありがとう', 'お願いします', '何', 'どう', 'いつ', 'どこ', 'なぜ', '誰', 'あなた', 'です', 'とても', '良い', '悪い', '今', '後'],
-            'ko': ['안녕하세요', '감사합니다', '주세요', '무엇', '어떻게', '언제', '어디', '왜', '누구', '당신', '입니다', '매우', '좋은', '나쁜', '지금', '후'],
-            'ru': ['привет', 'спасибо', 'пожалуйста', 'что', 'как', 'когда', 'где', 'почему', 'кто', 'ты', 'есть', 'очень', 'хорошо', 'плохо', 'сейчас', 'после'],
-            'ar': ['مرحبا', 'شكرا', 'من فضلك', 'ما', 'كيف', 'متى', 'أين', 'لماذا', 'من', 'أنت', 'هو', 'جدا', 'جيد', 'سيء', 'الآن', 'بعد'],
-            'hi': ['नमस्ते', 'धन्यवाद', 'कृपया', 'क्या', 'कैसे', 'कब', 'कहाँ', 'क्यों', 'कौन', 'तुम', 'हो', 'बहुत', 'अच्छा', 'बुरा', 'अब', 'बाद'],
-            'nl': ['hallo', 'dank', 'alstublieft', 'wat', 'hoe', 'wanneer', 'waar', 'waarom', 'wie', 'u', 'bent', 'zeer', 'goed', 'slecht', 'nu', 'na']
-        }
-
-        # Caracteres especiales por idioma para boost de puntuación
-        special_chars = {
-            'es': ['¿', '¡', 'ñ', 'á', 'é', 'í', 'ó', 'ú', 'ü'],
-            'pt': ['ã', 'õ', 'ç', 'á', 'é', 'í', 'ó', 'ú'],
-            'fr': ['à', 'â', 'ä', 'é', 'è', 'ê', 'ë', 'ï', 'î', 'ô', 'ö', 'ù', 'û', 'ü', 'ÿ', 'ç'],
-            'de': ['ä', 'ö', 'ü', 'ß'],
-            'it': ['à', 'è', 'é', 'ì', 'í', 'î', 'ï', 'ò', 'ó', 'ô', 'ö', 'ù', 'ú', 'û', 'ü'],
-            'zh': ['的', '一', '是', '不', '了', '人', '在', '有', '个', '这', '上', '中', '大', '为', '来', '我', '到', '出', '要', '以', '时', '和', '地', '们', '得', '可', '下', '对', '生', '也', '子', '开', '而', '内', '于', '能', '工', '发', '会', '外', '者', '用', '方', '进', '行', '面', '产', '声', '样', '表', '着', '都', '第', '样', '条', '各', '当', '起', '部', '全', '本', '完', '系', '目', '机', '立', '多', '实', '家', '通', '车', '过', '天', '边', '好', '还', '现', '体', '合', '回', '事', '育', '军', '同', '么', '去', '思', '无', '图', '认', '因', '点', '然', '三', '住', '年', '向', '命', '海', '流', '小', '位', '打', '如', '化', '力', '场', '量', '西', '东', '南', '北', '高', '长', '万', '新', '老', '法', '被', '心', '科', '电', '门', '间', '风', '战', '远', '料', '端', '花', '听', '写', '级', '却', '知', '因', '第', '程', '志', '感', '接', '爱', '指', '才', '活', '流', '山', '色', '光', '安', '些', '每', '形', '想', '近', '接', '非', '但', '两', '作', '做', '云', '动', '重', '置', '走', '快', '直', '光', '明', '白', '黑', '红', '绿', '蓝', '黄', '青', '紫', '橙', '灰', '金', '银', '铜', '铁', '钢', '木', '水', '火', '土', '风', '雨', '雪', '冰', '热', '冷', '暖', '凉', '干', '湿', '软', '硬', '轻', '重', '大', '小', '高', '低', '长', '短', '宽', '窄', '厚', '薄', '粗', '细', '圆', '方', '正', '斜', '直', '弯', '平', '陡', '滑', '糙', '亮', '暗', '美', '丑', '好', '坏', '新', '旧', '真', '假', '对', '错', '是', '否', '有', '无', '多', '少', '全', '半', '整', '零', '一', '二', '三', '四', '五', '六', '七', '八', '九', '十', '百', '千', '万', '亿'],
-            'ja': ['あ', 'い', 'う', 'え', 'お', 'か', 'き', 'く', 'け', 'こ', 'さ', 'し', 'す', 'せ', 'そ', 'た', 'ち', 'つ', 'て', 'と', 'な', 'に', 'ぬ', 'ね', 'の', 'は', 'ひ', 'ふ', 'へ', 'ほ', 'ま', 'み', 'む', 'め', 'も', 'や', 'ゆ', 'よ', 'ら', 'り', 'る', 'れ', 'ろ', 'わ', 'を', 'ん'],
-            'ko': ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ', 'ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ', 'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ'],
-            'ru': ['а', 'б', 'в', 'г', 'д', 'е', 'ё', 'ж', 'з', 'и', 'й', 'к', 'л', 'м', 'н', 'о', 'п', 'р', 'с', 'т', 'у', 'ф', 'х', 'ц', 'ч', 'ш', 'щ', 'ъ', 'ы', 'ь', 'э', 'ю', 'я'],
-            'ar': ['ا', 'ب', 'ت', 'ث', 'ج', 'ح', 'خ', 'د', 'ذ', 'ر', 'ز', 'س', 'ش', 'ص', 'ض', 'ط', 'ظ', 'ع', 'غ', 'ف', 'ق', 'ك', 'ل', 'م', 'ن', 'ه', 'و', 'ي'],
-            'hi': ['अ', 'आ', 'इ', 'ई', 'उ', 'ऊ', 'ए', 'ऐ', 'ओ', 'औ', 'अं', 'अः', 'क', 'ख', 'ग', 'घ', 'ङ', 'च', 'छ', 'ज', 'झ', 'ञ', 'ट', 'ठ', 'ड', 'ढ', 'ण', 'त', 'थ', 'द', 'ध', 'न', 'प', 'फ', 'ब', 'भ', 'म', 'य', 'र', 'ल', 'व', 'श', 'ष', 'स', 'ह']
-        }
-
-        # Calcular puntuaciones
-        scores = {}
-        for lang, markers in language_markers.items():
-            scores[lang] = sum(1 for marker in markers if marker in text_lower)
-
-        # Boost por caracteres especiales
-        for lang, chars in special_chars.items():
-            if any(c in text for c in chars):
-                scores[lang] += 3  # Mayor boost para caracteres únicos
-
-        # Retornar idioma con mayor puntuación
-        if scores:
-            detected_lang = max(scores, key=scores.get)
-            max_score = scores[detected_lang]
-            return detected_lang if max_score > 0 else 'es'
-
-        return 'es'  # Default fallback
+        """Detecta el idioma con el identificador de n-gramas, limitado a idiomas con respuestas"""
+        return self.language_identifier.detect(
+            text, default='es', min_confidence=DEFAULT_MIN_CONFIDENCE, allowed=self.human_responses['fallback'].keys()
+        )
 
+    @traced('VIGOLEONROCKSServer.generate_human_response')
     def generate_human_response(self, text: str, lang: str = 'es'):
         """Genera una respuesta humana natural"""
         text_lower = text.lower().strip()
@@ -607,24 +524,24 @@ class VIGOLEONROCKSServer:
         # Detectar tipo de consulta con más precisión - MULTILINGÜE GLOBAL
         greeting_words = ['hola', 'hello', 'hi', 'olá', 'ola', 'oi', 'bonjour', 'salut', 'hallo', 'ciao', '你好', 'こんにちは', '안녕하세요', 'привет', 'مرحبا', 'नमस्ते', 'hallo']
         if any(word in text_lower for word in greeting_words):
-            return self.metrics_rng.get_random_choice(self.human_responses['greetings'][lang])
+            return self.entropy.choice(self.human_responses['greetings'][lang])
 
         identity_phrases = [
             'quién eres', 'qué eres', 'who are you', 'what are you', 'quem é você', 'qui es-tu', 'was bist du', 'chi sei', '你是谁', 'あなたは誰', '누구세요', 'кто ты', 'من أنت', 'तुम कौन हो', 'wie ben je'
         ]
         if any(phrase in text_lower for phrase in identity_phrases):
-            return self.metrics_rng.get_random_choice(self.human_responses['identity'][lang])
+            return self.entropy.choice(self.human_responses['identity'][lang])
 
         capability_phrases = [
             'qué puedes', 'what can you', 'o que você pode', 'capacidades', 'capabilities', 'puedes hacer', 'can you do', 'funciones', 'functions', 'funcionalidades',
             'que peux-tu', 'was kannst du', 'cosa puoi fare', '你能做什么', '何ができる', '무엇을 할 수 있나요', 'что ты можешь', 'ماذا يمكنك فعله', 'आप क्या कर सकते हैं', 'wat kun je'
         ]
         if any(phrase in text_lower for phrase in capability_phrases):
-            return self.metrics_rng.get_random_choice(self.human_responses['capabilities'][lang])
+            return self.entropy.choice(self.human_responses['capabilities'][lang])
 
         gratitude_words = ['gracias', 'thank', 'thanks', 'obrigado', 'merci', 'danke', 'grazie', '谢谢', 'ありがとう', '감사합니다', 'спасибо', 'شكرا', 'धन्यवाद', 'dank']
         if any(word in text_lower for word in gratitude_words):
-            return self.metrics_rng.get_random_choice(self.human_responses['gratitude'][lang])
+            return self.entropy.choice(self.human_responses['gratitude'][lang])
         
         # Detección de preguntas matemáticas simples
         math_patterns = [
@@ -675,90 +592,92 @@ class VIGOLEONROCKSServer:
         if any(phrase in text_lower for phrase in how_are_you_phrases):
             # Respuestas específicas para "cómo estás" en todos los idiomas
             if lang == 'es':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "¡Muy bien, gracias! 😊 ¿Y tú?",
                     "¡Perfecto! ¿Cómo estás tú?",
                     "¡Excelente! ¿Qué tal tu día?"
                 ])
             elif lang == 'en':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "Great, thanks! 😊 How about you?",
                     "Perfect! How are you?",
                     "Excellent! How's your day going?"
                 ])
             elif lang == 'pt':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "Muito bem, obrigado! 😊 E você?",
                     "Perfeito! Como você está?",
                     "Excelente! Como está seu dia?"
                 ])
             elif lang == 'fr':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "Très bien, merci ! 😊 Et vous ?",
                     "Parfait ! Comment allez-vous ?",
                     "Excellent ! Comment se passe votre journée ?"
                 ])
             elif lang == 'de':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "Sehr gut, danke! 😊 Und Ihnen?",
                     "Perfekt! Wie geht es Ihnen?",
                     "Ausgezeichnet! Wie läuft Ihr Tag?"
                 ])
             elif lang == 'it':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "Molto bene, grazie! 😊 E tu?",
                     "Perfetto! Come stai?",
                     "Eccellente! Com'è andata la tua giornata?"
                 ])
             elif lang == 'zh':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "很好，谢谢！😊 你呢？",
                     "完美！你怎么样？",
                     "太棒了！你的日子过得怎么样？"
                 ])
             elif lang == 'ja':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "とても良いです、ありがとう！😊 あなたは？",
                     "完璧です！お元気ですか？",
                     "素晴らしいです！今日はどんな一日でしたか？"
                 ])
             elif lang == 'ko':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "아주 좋아요, 감사합니다! 😊 당신은요?",
                     "완벽해요! 어떻게 지내세요?",
                     "훌륭해요! 오늘 하루는 어떠셨어요?"
                 ])
             elif lang == 'ru':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "Очень хорошо, спасибо! 😊 А у тебя?",
                     "Отлично! Как дела?",
                     "Превосходно! Как прошел твой день?"
                 ])
             elif lang == 'ar':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "جيد جداً، شكراً! 😊 وأنت؟",
                     "ممتاز! كيف حالك؟",
                     "رائع! كيف كان يومك؟"
                 ])
             elif lang == 'hi':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "बहुत अच्छा, धन्यवाद! 😊 आप कैसे हैं?",
                     "सही है! आप कैसे हैं?",
                     "शानदार! आपका दिन कैसा था?"
                 ])
             elif lang == 'nl':
-                return self.metrics_rng.get_random_choice([
+                return self.entropy.choice([
                     "Heel goed, dank je! 😊 En jij?",
                     "Perfect! Hoe gaat het met je?",
                     "Uitstekend! Hoe was uw dag?"
                 ])
         
         else:
-            return self.metrics_rng.get_random_choice(self.human_responses['fallback'][lang])
+            return self.entropy.choice(self.human_responses['fallback'][lang])
 
+    @traced('VIGOLEONROCKSServer.process_query')
     def process_query(self, text: str, profile: str = 'human', quantum_states: int = 26):
         """Procesa la consulta y genera respuesta humana"""
         start_time = datetime.now()
+        current_span().update(text_length=len(text), profile=profile, quantum_states=quantum_states)
         
         # Detectar idioma
         detected_lang = self.detect_language(text)
@@ -770,13 +689,15 @@ class VIGOLEONROCKSServer:
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
         # Guardar en historial
-        self.interaction_history.append({
-            'text': text,
-            'response': response,
-            'language': detected_lang,
-            'profile': profile,
-            'timestamp': datetime.now().isoformat()
-        })
+        with span('InteractionHistory.record'):
+            self.interaction_history.record({
+                'text': text,
+                'response': response,
+                'language': detected_lang,
+                'profile': profile,
+                'timestamp': datetime.now().isoformat()
+            })
+        current_span().update(language=detected_lang, response_length=len(response))
         
         return {
             'response': response,
@@ -786,53 +707,14 @@ class VIGOLEONROCKSServer:
             'quantum_states': quantum_states
         }
 
-    def translate_text(self, text: str, target_lang: str):
-        """Traducción simple y natural"""
-        # Traducciones básicas para demostración
-        translations = {
-            'hello': {'es': 'hola', 'pt': 'olá'},
-            'hi': {'es': 'hola', 'pt': 'oi'},
-            'how are you': {'es': 'cómo estás', 'pt': 'como vai'},
-            'thank you': {'es': 'gracias', 'pt': 'obrigado'},
-            'thanks': {'es': 'gracias', 'pt': 'obrigado'},
-            'please': {'es': 'por favor', 'pt': 'por favor'},
-            'who are you': {'es': 'quién eres', 'pt': 'quem é você'},
-            'what can you do': {'es': 'qué puedes hacer', 'pt': 'o que você pode fazer'},
-            'good morning': {'es': 'buenos días', 'pt': 'bom dia'},
-            'good afternoon': {'es': 'buenas tardes', 'pt': 'boa tarde'},
-            'good evening': {'es': 'buenas noches', 'pt': 'boa noite'},
-            'goodbye': {'es': 'adiós', 'pt': 'tchau'},
-            'bye': {'es': 'adiós', 'pt': 'tchau'},
-            'see you': {'es': 'nos vemos', 'pt': 'até logo'},
-            'hola': {'en': 'hello', 'pt': 'olá'},
-            'gracias': {'en': 'thank you', 'pt': 'obrigado'},
-            'quién eres': {'en': 'who are you', 'pt': 'quem é você'},
-            'qué puedes hacer': {'en': 'what can you do', 'pt': 'o que você pode fazer'},
-            'buenos días': {'en': 'good morning', 'pt': 'bom dia'},
-            'buenas tardes': {'en': 'good afternoon', 'pt': 'boa tarde'},
-            'buenas noches': {'en': 'good evening', 'pt': 'boa noite'},
-            'adiós': {'en': 'goodbye', 'pt': 'tchau'},
-            'nos vemos': {'en': 'see you', 'pt': 'até logo'},
-            'olá': {'en': 'hello', 'es': 'hola'},
-            'obrigado': {'en': 'thank you', 'es': 'gracias'},
-            'quem é você': {'en': 'who are you', 'es': 'quién eres'},
-            'o que você pode fazer': {'en': 'what can you do', 'es': 'qué puedes hacer'},
-            'bom dia': {'en': 'good morning', 'es': 'buenos días'},
-            'boa tarde': {'en': 'good afternoon', 'es': 'buenas tardes'},
-            'boa noite': {'en': 'good evening', 'es': 'buenas noches'},
-            'tchau': {'en': 'goodbye', 'es': 'adiós'},
-            'até logo': {'en': 'see you', 'es': 'nos vemos'}
-        }
-        
-        text_lower = text.lower()
-        translated_text = text
-        
-        for original, trans in translations.items():
-            if original in text_lower:
-                if target_lang in trans:
-                    translated_text = translated_text.replace(original, trans[target_lang])
-        
-        return translated_text
+    def translate_text(self, text: str, target_lang: str, source_lang: str = None):
+        """Traducción por diccionario en una sola pasada (coincidencia más larga)"""
+        if source_lang is None:
+            # El idioma de origen sólo añade las tablas del par; las frases base se aplican siempre
+            source_lang = self.language_identifier.detect(
+                text, default=None, allowed=self.translation_engine.source_languages()
+            )
+        return self.translation_engine.translate(text, target_lang, source_lang)
 
     def analyze_archetypal(self, text: str):
         """Análisis arquetipal simple"""
@@ -1277,17 +1159,18 @@ def translate():
     data = request.get_json() or {}
     text = data.get('text', '')
     target_lang = data.get('target_language', 'es')
+    source_lang = data.get('source_language') or None
     
     if not text:
         return jsonify({'error': 'Texto requerido'}), 400
     
-    translated = server.translate_text(text, target_lang)
+    translated = server.translate_text(text, target_lang, source_lang)
     
     return jsonify({
         'original_text': text,
         'translated_text': translated,
         'target_language': target_lang,
-        'method': 'simple_translation',
+        'method': 'dictionary_longest_match',
         'confidence': 0.6
     })
 
@@ -1299,13 +1182,15 @@ def detect_language():
     if not text:
         return jsonify({'error': 'Texto requerido'}), 400
     
-    detected = server.detect_language(text)
+    candidates = server.language_identifier.identify(text, top_k=3)
+    detected = candidates[0][0] if candidates else 'es'
 
     return jsonify({
         'text': text,
         'detected_language': detected,
-        'confidence': 0.8,
-        'method': 'simple_detection'
+        'confidence': round(candidates[0][1], 4) if candidates else 0.0,
+        'candidates': [{'language': lang, 'confidence': round(conf, 4)} for lang, conf in candidates],
+        'method': 'char_ngram_naive_bayes'
     })
 
 @app.route('/api/archetypal-analysis', methods=['POST'])
@@ -1356,15 +1241,26 @@ def quantum_metrics():
 def interaction_history():
     filter_type = request.args.get('filter', 'all')
     
-    if filter_type == 'all':
-        history = server.interaction_history
-    else:
-        history = [h for h in server.interaction_history if h.get('profile') == filter_type]
+    try:
+        page = server.interaction_history.query(
+            since=request.args.get('since'),
+            until=request.args.get('until'),
+            language=request.args.get('language'),
+            profile=None if filter_type == 'all' else filter_type,
+            offset=int(request.args.get('offset', 0)),
+            limit=min(int(request.args.get('limit', 10)), 500)
+        )
+    except ValueError as e:
+        return jsonify({'error': f'Parámetros inválidos: {e}'}), 400
     
     return jsonify({
         'filter': filter_type,
-        'total_interactions': len(history),
-        'interactions': history[-10:] if history else []  # Últimas 10
+        'total_interactions': page.total,
+        'interactions': page.items,
+        'offset': page.offset,
+        'limit': page.limit,
+        'has_more': page.has_more,
+        'source': page.source
     })
 
 @app.route('/api/set-quantum-profile', methods=['POST'])
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+🛡️ VIGOLEONROCKS - Control de admisión y descarte de carga
+Protege el servidor bajo sobrecarga en lugar de dejar que todas las peticiones
+se vuelvan lentas:
+
+- Contador atómico de peticiones en curso (se decrementa en ``teardown``,
+  también cuando la vista lanza una excepción)
+- Límites de concurrencia por ruta (prefijo más largo) con cola de espera acotada
+- Deadlines propagados: ``X-Request-Deadline`` (epoch) / ``X-Request-Timeout``
+  (segundos); una petición cuyo deadline ya pasó no se atiende
+- Descarte estilo CoDel: si la cola no se ha vaciado durante ``interval``,
+  la espera máxima baja a ``target`` y el exceso recibe un 503 rápido con
+  ``Retry-After``. El tiempo en colas previas (proxy, hilos de waitress) se
+  incluye si llega ``X-Request-Start``.
+"""
+
+import contextvars
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CODEL_TARGET = 0.01      # 10 ms de cola "de pie" aceptable
+DEFAULT_CODEL_INTERVAL = 0.1     # ventana para declarar sobrecarga
+DEFAULT_QUEUE_TIMEOUT = 1.0      # espera máxima en cola sin sobrecarga
+
+_LIMIT_PATTERN = re.compile(
+    r'^\s*(\d+)(?:\s+queue\s+(\d+))?(?:\s+wait\s+(\d+(?:\.\d+)?)\s*(ms|s)?)?\s*$', re.IGNORECASE)
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('vigoleonrocks_deadline', default=None)
+
+
+@dataclass(frozen=True)
+class ConcurrencyLimit:
+    """Concurrencia máxima, tamaño de la cola de espera y espera máxima opcional"""
+    max_concurrency: int
+    max_queue: int = 0
+    queue_timeout: Optional[float] = None
+
+    def __post_init__(self):
+        if self.max_concurrency < 1 or self.max_queue < 0:
+            raise ValueError(f"Límite de concurrencia inválido: {self}")
+
+
+@lru_cache(maxsize=256)
+def parse_limit(spec: str) -> ConcurrencyLimit:
+    """
+    Interpreta ``"8"``, ``"4 queue 16"`` o ``"2 queue 4 wait 500ms"``
+    """
+    match = _LIMIT_PATTERN.match(spec)
+    if not match:
+        raise ValueError(f"Límite de concurrencia inválido: {spec!r}")
+    concurrency, queue, wait, unit = match.groups()
+    timeout = None
+    if wait is not None:
+        timeout = float(wait) / (1000.0 if (unit or 's').lower() == 'ms' else 1.0)
+    return ConcurrencyLimit(int(concurrency), int(queue or 0), timeout)
+
+
+def _coerce_limit(value: Union[None, str, ConcurrencyLimit]) -> Optional[ConcurrencyLimit]:
+    if value is None or isinstance(value, ConcurrencyLimit):
+        return value
+    if value.strip().lower() in ('exempt', 'none', 'off'):
+        return None
+    return parse_limit(value)
+
+
+def parse_route_limits(spec: str) -> Dict[str, Optional[ConcurrencyLimit]]:
+    """``"/api/v2/performance=2 queue 4,/health=exempt"`` -> {prefijo: límite}"""
+    limits: Dict[str, Optional[ConcurrencyLimit]] = {}
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        route, value = item.split('=', 1)
+        limits[route.strip()] = _coerce_limit(value)
+    return limits
+
+
+class Overloaded(Exception):
+    """Petición rechazada por el control de admisión"""
+
+    def __init__(self, reason: str, retry_after: int, gate: str = ''):
+        super().__init__(f"{reason} ({gate})" if gate else reason)
+        self.reason = reason
+        self.retry_after = retry_after
+        self.gate = gate
+
+
+class InFlightCounter:
+    """Contador atómico de peticiones en curso (con total y máximo observado)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+        self.total = 0
+        self.peak = 0
+
+    def increment(self) -> int:
+        with self._lock:
+            self.value += 1
+            self.total += 1
+            if self.value > self.peak:
+                self.peak = self.value
+            return self.value
+
+    def decrement(self) -> int:
+        with self._lock:
+            self.value -= 1
+            return self.value
+
+
+class AdmissionTicket:
+    """Permiso de una petición admitida; ``release`` es idempotente"""
+
+    __slots__ = ('gate', 'counter', 'deadline', 'queue_wait', 'admitted_at', '_released')
+
+    def __init__(self, gate: Optional['ConcurrencyGate'], counter: Optional[InFlightCounter],
+                 deadline: Optional[float], queue_wait: float, admitted_at: float):
+        self.gate = gate
+        self.counter = counter
+        self.deadline = deadline
+        self.queue_wait = queue_wait
+        self.admitted_at = admitted_at
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        if self.gate is not None:
+            self.gate.release(self)
+        if self.counter is not None:
+            self.counter.decrement()
+
+    def __enter__(self) -> 'AdmissionTicket':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class _Waiter:
+    __slots__ = ('start', 'event', 'admitted', 'abandoned')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.event = threading.Event()
+        self.admitted = False
+        self.abandoned = False
+
+
+class ConcurrencyGate:
+    """
+    Semáforo con cola FIFO acotada y espera adaptativa estilo CoDel
+
+    Sin sobrecarga una petición puede esperar hasta ``queue_timeout``. Si
+    durante ``codel_interval`` ninguna petición ha entrado con una espera
+    total (incluida la previa indicada por ``enqueued_at``) menor que
+    ``codel_target``, hay una cola de pie: la espera admisible baja a
+    ``codel_target`` y el exceso se descarta en milisegundos en lugar de
+    acumular latencia que el cliente ya no va a esperar.
+    """
+
+    def __init__(self, name: str, limit: ConcurrencyLimit, codel_target: float = DEFAULT_CODEL_TARGET,
+                 codel_interval: float = DEFAULT_CODEL_INTERVAL, queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+                 clock=time.monotonic):
+        self.name = name
+        self.limit = limit
+        self.codel_target = codel_target
+        self.codel_interval = codel_interval
+        self.queue_timeout = limit.queue_timeout if limit.queue_timeout is not None else queue_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._waiters: deque = deque()
+        self._active = 0
+        self._queued = 0
+        self._last_good = clock()
+        self._service_ewma = 0.0
+        self.admitted = 0
+        self.shed: Dict[str, int] = {'queue_full': 0, 'codel': 0, 'timeout': 0, 'deadline': 0}
+
+    # ----- estado -----
+
+    def _overloaded(self, now: float) -> bool:
+        return now - self._last_good > self.codel_interval
+
+    def retry_after(self) -> int:
+        """Segundos estimados hasta que haya hueco (mínimo 1)"""
+        backlog = self._queued + self._active
+        estimate = backlog * self._service_ewma / self.limit.max_concurrency
+        return max(1, math.ceil(estimate))
+
+    def _reject(self, reason: str) -> Overloaded:
+        self.shed[reason] += 1
+        return Overloaded(reason, self.retry_after(), self.name)
+
+    # ----- admisión -----
+
+    def acquire(self, deadline: Optional[float] = None, enqueued_at: Optional[float] = None,
+                counter: Optional[InFlightCounter] = None) -> AdmissionTicket:
+        """
+        Admite la petición o lanza ``Overloaded``
+
+        Args:
+            deadline: Instante (reloj monotónico) a partir del cual la respuesta ya no sirve
+            enqueued_at: Llegada real de la petición (monotónico), si esperó en colas previas
+        """
+        now = self._clock()
+        start = min(enqueued_at, now) if enqueued_at is not None else now
+        sojourn = now - start
+        with self._lock:
+            if deadline is not None and now >= deadline:
+                raise self._reject('deadline')
+            if self._active < self.limit.max_concurrency and self._queued == 0:
+                if sojourn <= self.codel_target:
+                    self._last_good = now
+                elif self._overloaded(now):
+                    # Cola previa de pie durante todo un intervalo: se drena con 503 rápidos
+                    raise self._reject('codel')
+                self._active += 1
+                self.admitted += 1
+                return AdmissionTicket(self, counter, deadline, sojourn, now)
+
+            if self._queued >= self.limit.max_queue:
+                raise self._reject('queue_full')
+            overloaded = self._overloaded(now)
+            budget = self.codel_target if overloaded else self.queue_timeout
+            wait_until = start + budget
+            if deadline is not None:
+                wait_until = min(wait_until, deadline)
+            if wait_until <= now:
+                raise self._reject('codel' if overloaded else 'timeout')
+            while self._waiters and self._waiters[0].abandoned:
+                self._waiters.popleft()
+            waiter = _Waiter(start)
+            self._waiters.append(waiter)
+            self._queued += 1
+
+        waiter.event.wait(max(0.0, wait_until - self._clock()))
+        with self._lock:
+            if waiter.admitted:
+                admitted_at = self._clock()
+                return AdmissionTicket(self, counter, deadline, admitted_at - start, admitted_at)
+            waiter.abandoned = True
+            self._queued -= 1
+            if deadline is not None and self._clock() >= deadline:
+                raise self._reject('deadline')
+            raise self._reject('codel' if overloaded else 'timeout')
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        now = self._clock()
+        with self._lock:
+            self._active -= 1
+            service = now - ticket.admitted_at
+            self._service_ewma += 0.1 * (service - self._service_ewma) if self._service_ewma else service
+            while self._waiters and self._active < self.limit.max_concurrency:
+                waiter = self._waiters.popleft()
+                if waiter.abandoned:
+                    continue
+                self._queued -= 1
+                if now - waiter.start <= self.codel_target:
+                    self._last_good = now
+                waiter.admitted = True
+                self._active += 1
+                self.admitted += 1
+                waiter.event.set()
+            if self._active == 0 and self._queued == 0:
+                self._last_good = now  # vacío: no queda cola de pie
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_concurrency': self.limit.max_concurrency,
+                'max_queue': self.limit.max_queue,
+                'active': self._active,
+                'queued': self._queued,
+                'admitted_total': self.admitted,
+                'shed_total': dict(self.shed),
+                'service_time_ms_ewma': round(self._service_ewma * 1000, 3),
+                'overloaded': self._overloaded(self._clock()),
+            }
+
+
+class AdmissionController:
+    """
+    Control de admisión por ruta
+
+    Cada petición pasa por una única compuerta: la del prefijo de ruta más
+    largo configurado o la compuerta por defecto. Las rutas exentas (límite
+    ``None``) solo cuentan en el contador de peticiones en curso.
+    """
+
+    def __init__(self, default_limit: Union[None, str, ConcurrencyLimit] = None,
+                 route_limits: Optional[Mapping[str, Union[None, str, ConcurrencyLimit]]] = None,
+                 codel_target: float = DEFAULT_CODEL_TARGET, codel_interval: float = DEFAULT_CODEL_INTERVAL,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT, default_timeout: Optional[float] = None,
+                 clock=time.monotonic):
+        self.codel_target = codel_target
+        self.codel_interval = codel_interval
+        self.queue_timeout = queue_timeout
+        self.default_timeout = default_timeout
+        self._clock = clock
+        self.in_flight = InFlightCounter()
+        self._routes: Dict[str, Optional[ConcurrencyGate]] = {}
+        self._prefixes: Tuple[str, ...] = ()
+        limit = _coerce_limit(default_limit)
+        self.default_gate = self._make_gate('default', limit) if limit else None
+        for route, value in (route_limits or {}).items():
+            self.set_route_limit(route, value)
+
+    def _make_gate(self, name: str, limit: ConcurrencyLimit) -> ConcurrencyGate:
+        return ConcurrencyGate(name, limit, self.codel_target, self.codel_interval, self.queue_timeout, self._clock)
+
+    def set_route_limit(self, route: str, value: Union[None, str, ConcurrencyLimit]) -> None:
+        limit = _coerce_limit(value)
+        self._routes[route] = self._make_gate(route, limit) if limit else None
+        self._prefixes = tuple(sorted(self._routes, key=len, reverse=True))
+
+    def gate_for(self, path: str) -> Optional[ConcurrencyGate]:
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self._routes[prefix]
+        return self.default_gate
+
+    def admit(self, path: str, deadline: Optional[float] = None,
+              enqueued_at: Optional[float] = None, gated: bool = True) -> AdmissionTicket:
+        """
+        Admite la petición (lanza ``Overloaded`` si se descarta)
+
+        Con ``gated=False`` (p. ej. preflight OPTIONS) solo se cuenta en curso.
+        """
+        now = self._clock()
+        if deadline is None and self.default_timeout:
+            deadline = (enqueued_at if enqueued_at is not None else now) + self.default_timeout
+        gate = self.gate_for(path) if gated else None
+        self.in_flight.increment()
+        if gate is None:
+            return AdmissionTicket(None, self.in_flight, deadline, 0.0, now)
+        try:
+            return gate.acquire(deadline, enqueued_at, self.in_flight)
+        except Overloaded:
+            self.in_flight.decrement()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        gates = {prefix: gate.stats() for prefix, gate in self._routes.items() if gate is not None}
+        if self.default_gate is not None:
+            gates['default'] = self.default_gate.stats()
+        return {
+            'in_flight': self.in_flight.value,
+            'in_flight_peak': self.in_flight.peak,
+            'requests_total': self.in_flight.total,
+            'exempt_routes': sorted(prefix for prefix, gate in self._routes.items() if gate is None),
+            'gates': gates,
+        }
+
+
+# ===== DEADLINES =====
+
+def current_deadline() -> Optional[float]:
+    """Deadline (reloj monotónico) de la petición en curso, si existe"""
+    return _deadline.get()
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """Segundos restantes hasta el deadline de la petición en curso"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return max(0.0, deadline - time.monotonic())
+
+
+def propagation_headers() -> Dict[str, str]:
+    """Cabeceras para llamadas salientes que deben heredar el deadline"""
+    remaining = remaining_time()
+    return {} if remaining is None else {'X-Request-Timeout': f"{remaining:.3f}"}
+
+
+def _epoch_seconds(value: str) -> Optional[float]:
+    """Acepta segundos, milisegundos o microsegundos epoch (``t=`` opcional, formato nginx)"""
+    try:
+        value = value.strip()
+        number = float(value[2:] if value.startswith('t=') else value)
+    except (AttributeError, ValueError):
+        return None
+    if number > 1e14:
+        return number / 1e6
+    if number > 1e11:
+        return number / 1e3
+    return number
+
+
+def parse_deadline_headers(headers: Mapping[str, str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Traduce las cabeceras de la petición al reloj monotónico
+
+    Returns:
+        (deadline, enqueued_at); cualquiera puede ser None
+    """
+    now_wall, now_mono = time.time(), time.monotonic()
+    enqueued_at = None
+    start = headers.get('X-Request-Start')
+    if start:
+        epoch = _epoch_seconds(start)
+        if epoch is not None:
+            enqueued_at = now_mono - max(0.0, now_wall - epoch)
+
+    deadline = None
+    absolute = headers.get('X-Request-Deadline')
+    relative = headers.get('X-Request-Timeout')
+    if absolute:
+        epoch = _epoch_seconds(absolute)
+        if epoch is not None:
+            deadline = now_mono + (epoch - now_wall)
+    elif relative:
+        try:
+            deadline = (enqueued_at if enqueued_at is not None else now_mono) + max(0.0, float(relative))
+        except ValueError:
+            pass
+    return deadline, enqueued_at
+
+
+def install_admission_control(app, controller: AdmissionController,
+                              exempt: Tuple[str, ...] = ()) -> AdmissionController:
+    """
+    Registra el control de admisión en una app Flask
+
+    ``before_request`` admite o responde 503 con ``Retry-After``; el permiso se
+    libera en ``teardown_request``, que Flask ejecuta también si la vista falla.
+    """
+    from flask import g, jsonify, request
+
+    for route in exempt:
+        controller.set_route_limit(route, None)
+
+    @app.before_request
+    def _admission_check():
+        deadline, enqueued_at = parse_deadline_headers(request.headers)
+        try:
+            ticket = controller.admit(request.path, deadline, enqueued_at,
+                                      gated=request.method != 'OPTIONS')
+        except Overloaded as e:
+            response = jsonify({
+                'error': 'Service Overloaded',
+                'message': 'Servidor saturado, intenta más tarde',
+                'status_code': 503,
+                'reason': e.reason,
+                'retry_after': e.retry_after,
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
+        g.admission_ticket = ticket
+        g.admission_deadline_token = _deadline.set(ticket.deadline)
+        return None
+
+    @app.teardown_request
+    def _admission_release(exc=None):
+        ticket = g.pop('admission_ticket', None)
+        if ticket is not None:
+            ticket.release()
+        token = g.pop('admission_deadline_token', None)
+        if token is not None:
+            try:
+                _deadline.reset(token)
+            except ValueError:
+                _deadline.set(None)  # teardown en otro contexto
+
+    app.extensions['vigoleonrocks_admission'] = controller
+    return controller
+
+
+def create_admission_controller(config) -> AdmissionController:
+    """
+    Controlador configurado desde la app
+
+    ADMISSION_ROUTES en el entorno prevalece sobre ``config.ADMISSION_ROUTES``.
+    Con ADMISSION_CONTROL_ENABLED desactivado no se limita nada, pero el
+    contador de peticiones en curso sigue funcionando.
+    """
+    routes = dict(getattr(config, 'ADMISSION_ROUTES', {}) or {})
+    routes.update(parse_route_limits(os.getenv('ADMISSION_ROUTES', '')))
+    enabled = getattr(config, 'ADMISSION_CONTROL_ENABLED', True)
+    return AdmissionController(
+        default_limit=ConcurrencyLimit(config.ADMISSION_MAX_CONCURRENCY, config.ADMISSION_MAX_QUEUE)
+        if enabled else None,
+        route_limits=routes if enabled else {},
+        codel_target=config.ADMISSION_CODEL_TARGET,
+        codel_interval=config.ADMISSION_CODEL_INTERVAL,
+        queue_timeout=config.ADMISSION_QUEUE_TIMEOUT,
+        default_timeout=config.ADMISSION_DEFAULT_TIMEOUT or None,
+    )
@@ -7,6 +7,8 @@ import time
 import hashlib
 from typing import Dict, List, Optional, Any, Union
 
+from .language_identifier import detect_language
+
 
 class AIService:
     """
@@ -36,33 +38,7 @@ class AIService:
         Returns:
             ISO language code (e.g., 'es', 'en')
         """
-        # Simple language detection (mock implementation)
-        # In real version, would use ML-based detection
-        
-        # Spanish keywords
-        spanish_words = ['hola', 'gracias', 'buenos', 'días', 'como', 'está', 'qué', 'mundo']
-        # English keywords
-        english_words = ['hello', 'thanks', 'good', 'morning', 'how', 'are', 'you', 'what', 'world']
-        # Portuguese keywords
-        portuguese_words = ['olá', 'obrigado', 'bom', 'dia', 'como', 'está', 'que', 'mundo']
-        
-        text_lower = text.lower()
-        
-        # Count occurrences of words in each language
-        es_count = sum(1 for word in spanish_words if word in text_lower)
-        en_count = sum(1 for word in english_words if word in text_lower)
-        pt_count = sum(1 for word in portuguese_words if word in text_lower)
-        
-        # Simple decision logic
-        if es_count > en_count and es_count > pt_count:
-            return "es"
-        elif en_count > es_count and en_count > pt_count:
-            return "en"
-        elif pt_count > es_count and pt_count > en_count:
-            return "pt"
-        else:
-            # Default to Spanish if uncertain
-            return "es"
+        return detect_language(text, default=self.default_language)
     
     def get_metrics(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+🎙️ VIGOLEONROCKS - Pipeline de audio en memoria con transcripción por ventanas
+Sustituye el ciclo "archivo temporal .wav + una sola llamada a Whisper":
+
+- Decodifica directamente del stream subido a PCM 16 kHz mono int16, por
+  trozos (WAV con la stdlib; el resto de contenedores con PyAV)
+- VAD por energía (tramas de 30 ms, suelo de ruido adaptativo, hangover) para
+  no transcribir silencio
+- Ventanas de voz solapadas (30 s con 2 s de solape por defecto, como Whisper)
+  que se transcriben en paralelo con un número acotado en vuelo
+- Costura de segmentos con marcas de tiempo absolutas: en cada solape se corta
+  por el punto medio; los resultados salen en orden a medida que terminan
+
+La memoria queda acotada por las ventanas en vuelo, no por la duración del audio.
+"""
+
+import io
+import logging
+import math
+import operator
+import os
+import sys
+import time
+import wave
+from array import array
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # el pipeline funciona (más lento) sin NumPy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+
+DEFAULT_WINDOW_S = float(os.getenv('AUDIO_WINDOW_SECONDS', 30.0))
+DEFAULT_OVERLAP_S = float(os.getenv('AUDIO_WINDOW_OVERLAP_SECONDS', 2.0))
+DEFAULT_CONCURRENCY = int(os.getenv('AUDIO_WINDOW_CONCURRENCY', 2))
+DEFAULT_VAD_THRESHOLD_DBFS = float(os.getenv('AUDIO_VAD_THRESHOLD_DBFS', -45.0))
+
+AudioSource = Union[bytes, bytearray, memoryview, str, BinaryIO]
+
+
+@dataclass(frozen=True)
+class TranscriptSegment:
+    """Segmento transcrito con tiempos absolutos (segundos desde el inicio del audio)"""
+    start: float
+    end: float
+    text: str
+    window: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class AudioWindow:
+    """
+    Ventana de voz PCM int16 16 kHz; ``cut_start``/``cut_end`` (absolutos)
+    delimitan los segmentos que le pertenecen
+
+    Una ventana puede empaquetar varias regiones de voz separadas por silencio
+    descartado: ``pieces`` guarda ``(muestra en la ventana, muestra absoluta)``
+    del inicio de cada región para devolver los tiempos a la línea original.
+    """
+    index: int
+    offset: int          # muestras desde el inicio del audio
+    pcm: bytes
+    cut_start: float
+    cut_end: float
+    pieces: List[Tuple[int, int]] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.pieces:
+            self.pieces = [(0, self.offset)]
+
+    @property
+    def start_s(self) -> float:
+        return self.offset / SAMPLE_RATE
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.pcm) / 2 / SAMPLE_RATE
+
+    def to_absolute(self, seconds: float) -> float:
+        """Tiempo relativo a la ventana -> segundos desde el inicio del audio"""
+        position = seconds * SAMPLE_RATE
+        local, absolute = self.pieces[0]
+        for piece_local, piece_absolute in self.pieces[1:]:
+            if piece_local > position:
+                break
+            local, absolute = piece_local, piece_absolute
+        return (absolute + position - local) / SAMPLE_RATE
+
+    def to_float32(self):
+        """Muestras en [-1, 1) (array NumPy float32 si está disponible, si no lista)"""
+        if np is not None:
+            return np.frombuffer(self.pcm, dtype='<i2').astype(np.float32) / 32768.0
+        return [s / 32768.0 for s in _samples(self.pcm)]
+
+
+@dataclass
+class TranscriptionStats:
+    audio_s: float = 0.0
+    speech_s: float = 0.0
+    windows: int = 0
+    processing_s: float = 0.0
+    peak_windows_in_flight: int = 0
+
+    @property
+    def real_time_factor(self) -> float:
+        return self.processing_s / self.audio_s if self.audio_s else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['speech_ratio'] = round(self.speech_s / self.audio_s, 4) if self.audio_s else 0.0
+        data['real_time_factor'] = round(self.real_time_factor, 4)
+        return data
+
+
+@dataclass
+class TranscriptionResult:
+    text: str
+    segments: List[TranscriptSegment]
+    stats: TranscriptionStats = field(default_factory=TranscriptionStats)
+
+
+# ===== DECODIFICACIÓN =====
+
+def _samples(pcm: bytes) -> array:
+    """PCM int16 little-endian -> ``array('h')`` en el orden de bytes nativo"""
+    values = array('h')
+    values.frombytes(pcm)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _pcm(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array('h', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _to_mono_int16(raw: bytes, sample_width: int, channels: int) -> bytes:
+    """PCM entero de 8/16/24/32 bits y N canales -> int16 mono little-endian"""
+    if np is not None:
+        if sample_width == 1:
+            data = (np.frombuffer(raw, dtype=np.uint8).astype(np.int32) - 128) << 8
+        elif sample_width == 3:
+            b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            data = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 16
+        else:
+            data = np.frombuffer(raw, dtype={2: '<i2', 4: '<i4'}[sample_width]).astype(np.int64)
+            if sample_width == 4:
+                data >>= 16
+        if channels > 1:
+            data = data.reshape(-1, channels).mean(axis=1)
+        return data.astype('<i2').tobytes()
+
+    if sample_width == 2 and channels == 1:
+        return raw
+    values = []
+    for i in range(0, len(raw) - sample_width + 1, sample_width):
+        if sample_width == 1:
+            values.append((raw[i] - 128) << 8)
+        else:
+            values.append(int.from_bytes(raw[i:i + sample_width], 'little', signed=True)
+                          >> (8 * (sample_width - 2)))
+    if channels > 1:
+        values = [sum(values[i:i + channels]) // channels for i in range(0, len(values), channels)]
+    return _pcm(array('h', values))
+
+
+class StreamingResampler:
+    """Remuestreo lineal por trozos: conserva la fase y la última muestra entre llamadas"""
+
+    def __init__(self, source_rate: int, target_rate: int = SAMPLE_RATE):
+        self.step = source_rate / target_rate
+        self._position = 0.0   # próxima muestra de salida, en muestras de entrada relativas al trozo
+        self._last: Optional[int] = None
+
+    def process(self, pcm: bytes) -> bytes:
+        if self.step == 1.0:
+            return pcm
+        samples = _samples(pcm)
+        if not samples:
+            return b''
+        position = self._position
+        if self._last is not None:
+            samples.insert(0, self._last)
+            position += 1
+        limit = len(samples) - 1
+        if np is not None:
+            count = int((limit - position) // self.step) + 1 if position <= limit else 0
+            data = np.frombuffer(samples.tobytes(), dtype=np.int16).astype(np.float32)
+            points = position + self.step * np.arange(count)
+            out = np.interp(points, np.arange(len(data)), data).astype('<i2').tobytes()
+            position += self.step * count
+        else:
+            values = []
+            while position <= limit:
+                i = int(position)
+                nxt = samples[i + 1] if i < limit else samples[i]
+                values.append(int(samples[i] + (nxt - samples[i]) * (position - i)))
+                position += self.step
+            out = _pcm(array('h', values))
+        self._last = samples[-1]
+        self._position = position - limit - 1
+        return out
+
+
+def _open_binary(source: AudioSource) -> Tuple[BinaryIO, bool]:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(bytes(source)), True
+    if isinstance(source, str):
+        return open(source, 'rb'), True
+    return source, False
+
+
+def decode_pcm16k(source: AudioSource, chunk_seconds: float = 1.0) -> Iterator[bytes]:
+    """
+    Decodifica ``source`` (bytes, ruta o stream) a trozos de PCM int16 mono 16 kHz
+
+    WAV se decodifica con la stdlib; cualquier otro formato (mp3, ogg, m4a,
+    vídeo...) requiere PyAV. Nada se escribe en disco.
+    """
+    stream, owned = _open_binary(source)
+    try:
+        head = stream.read(12)
+        stream.seek(-len(head), io.SEEK_CUR)
+        if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+            yield from _decode_wav(stream, chunk_seconds)
+        else:
+            yield from _decode_av(stream, chunk_seconds)
+    finally:
+        if owned:
+            stream.close()
+
+
+def _decode_wav(stream: BinaryIO, chunk_seconds: float) -> Iterator[bytes]:
+    with wave.open(stream, 'rb') as wav:
+        if wav.getcomptype() != 'NONE':
+            raise ValueError(f"WAV comprimido no soportado: {wav.getcomptype()}")
+        rate, width, channels = wav.getframerate(), wav.getsampwidth(), wav.getnchannels()
+        resampler = StreamingResampler(rate)
+        frames_per_chunk = max(1, int(rate * chunk_seconds))
+        while True:
+            raw = wav.readframes(frames_per_chunk)
+            if not raw:
+                break
+            pcm = resampler.process(_to_mono_int16(raw, width, channels))
+            if pcm:
+                yield pcm
+
+
+def _decode_av(stream: BinaryIO, chunk_seconds: float) -> Iterator[bytes]:
+    try:
+        import av
+    except ImportError:
+        raise ValueError("Formato de audio no soportado sin PyAV (solo WAV PCM)")
+    container = av.open(stream)
+    try:
+        if not container.streams.audio:
+            raise ValueError("El archivo no tiene pista de audio")
+        resampler = av.AudioResampler(format='s16', layout='mono', rate=SAMPLE_RATE)
+        buffer = bytearray()
+        chunk_bytes = int(SAMPLE_RATE * chunk_seconds) * 2
+        for frame in container.decode(container.streams.audio[0]):
+            for out in resampler.resample(frame) or ():
+                buffer += bytes(out.planes[0])[:out.samples * 2]
+            while len(buffer) >= chunk_bytes:
+                yield bytes(buffer[:chunk_bytes])
+                del buffer[:chunk_bytes]
+        for out in resampler.resample(None) or ():
+            buffer += bytes(out.planes[0])[:out.samples * 2]
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        container.close()
+
+
+# ===== VAD Y VENTANAS =====
+
+def frame_energy_dbfs(pcm: bytes, frame_samples: int = FRAME_SAMPLES) -> List[float]:
+    """Energía RMS (dBFS) de cada trama completa de ``pcm``"""
+    count = len(pcm) // 2 // frame_samples
+    if not count:
+        return []
+    if np is not None:
+        data = np.frombuffer(pcm[:count * frame_samples * 2], dtype='<i2').astype(np.float32)
+        rms = np.sqrt(np.mean((data.reshape(count, frame_samples) / 32768.0) ** 2, axis=1))
+        return [float(v) for v in 20 * np.log10(np.maximum(rms, 1e-6))]
+    samples = _samples(pcm[:count * frame_samples * 2])
+    energies = []
+    for i in range(count):
+        frame = samples[i * frame_samples:(i + 1) * frame_samples]
+        rms = math.sqrt(sum(map(operator.mul, frame, frame)) / frame_samples) / 32768.0
+        energies.append(20 * math.log10(max(rms, 1e-6)))
+    return energies
+
+
+class EnergyVAD:
+    """
+    VAD por energía con suelo de ruido adaptativo
+
+    Una trama es voz si supera el umbral absoluto y el suelo de ruido en
+    ``margin_db``. El suelo baja de inmediato y sube con una constante de
+    tiempo de varios segundos: sigue al ruido de fondo estable sin aprender
+    la voz, que cambia de energía continuamente.
+    """
+
+    def __init__(self, threshold_dbfs: float = DEFAULT_VAD_THRESHOLD_DBFS, margin_db: float = 10.0,
+                 floor_time_constant_s: float = 5.0):
+        self.threshold_dbfs = threshold_dbfs
+        self.margin_db = margin_db
+        self._alpha = min(1.0, FRAME_MS / 1000 / floor_time_constant_s)
+        self.noise_floor_dbfs = -90.0
+
+    def is_speech(self, energy_dbfs: float) -> bool:
+        if energy_dbfs < self.noise_floor_dbfs:
+            self.noise_floor_dbfs = energy_dbfs
+        else:
+            self.noise_floor_dbfs += self._alpha * (energy_dbfs - self.noise_floor_dbfs)
+        return energy_dbfs >= self.threshold_dbfs and energy_dbfs >= self.noise_floor_dbfs + self.margin_db
+
+
+class SpeechWindower:
+    """
+    Convierte un flujo PCM en ventanas de voz
+
+    Las regiones de voz cortas se empaquetan (sin el silencio entre ellas) en
+    una misma ventana hasta llenarla, porque Whisper cuesta lo mismo con 5 s
+    que con 30 s de audio; las regiones más largas que una ventana se trocean
+    con solape.
+
+    Args:
+        vad: Detector de voz (None = todo el audio es voz)
+        window_s: Duración máxima de una ventana
+        overlap_s: Solape entre ventanas consecutivas de una misma región de voz
+        hangover_ms: Silencio que se mantiene dentro de la región tras la voz
+        max_silence_ms: Silencio que cierra la región de voz
+        pre_roll_ms: Audio previo al inicio de la voz que se incluye
+        min_speech_ms: Regiones más cortas se descartan (clics, golpes)
+        pack: Empaquetar regiones cortas en una ventana
+    """
+
+    def __init__(self, vad: Optional[EnergyVAD] = None, window_s: float = DEFAULT_WINDOW_S,
+                 overlap_s: float = DEFAULT_OVERLAP_S, hangover_ms: int = 300, max_silence_ms: int = 600,
+                 pre_roll_ms: int = 150, min_speech_ms: int = 250, pack: bool = True):
+        if overlap_s * 2 >= window_s:
+            raise ValueError("El solape debe ser menor que la mitad de la ventana")
+        self.vad = vad
+        self.window_samples = int(window_s * SAMPLE_RATE)
+        self.overlap_samples = int(overlap_s * SAMPLE_RATE)
+        self.hangover_frames = hangover_ms // FRAME_MS
+        self.max_silence_frames = max(self.hangover_frames, max_silence_ms // FRAME_MS)
+        self.pre_roll: Deque[bytes] = deque(maxlen=max(0, pre_roll_ms // FRAME_MS))
+        self.min_speech_frames = min_speech_ms // FRAME_MS
+        self.pack = pack
+        self.total_samples = 0
+        self.speech_samples = 0
+        self.regions = 0
+        self._pending = b''                 # resto de trama incompleta
+        self._buffer = bytearray()          # región de voz en curso
+        self._buffer_offset = 0
+        self._speech_frames = 0
+        self._silence_run = 0
+        self._in_speech = False
+        self._index = 0
+        self._carry_cut: Optional[float] = None  # corte de inicio de la ventana que continúa
+        self._packed = bytearray()          # regiones cortas cerradas, a la espera de llenar ventana
+        self._packed_pieces: List[Tuple[int, int]] = []
+        self._packed_end = 0
+
+    def feed(self, pcm: bytes) -> Iterator[AudioWindow]:
+        data = self._pending + pcm
+        frame_bytes = FRAME_SAMPLES * 2
+        usable = len(data) - len(data) % frame_bytes
+        self._pending = data[usable:]
+        energies = frame_energy_dbfs(data[:usable]) if self.vad is not None else None
+        for n in range(usable // frame_bytes):
+            frame = data[n * frame_bytes:(n + 1) * frame_bytes]
+            position = self.total_samples
+            self.total_samples += FRAME_SAMPLES
+            speech = True if energies is None else self.vad.is_speech(energies[n])
+            yield from self._frame(frame, position, speech)
+
+    def flush(self) -> Iterator[AudioWindow]:
+        if self._pending:
+            frame, self._pending = self._pending, b''
+            self.total_samples += len(frame) // 2
+            if self._in_speech:
+                self._buffer += frame
+        yield from self._close_region()
+        yield from self._flush_packed()
+
+    def _frame(self, frame: bytes, position: int, speech: bool) -> Iterator[AudioWindow]:
+        if not self._in_speech:
+            if not speech:
+                self.pre_roll.append(frame)
+                return
+            pre = b''.join(self.pre_roll)
+            self.pre_roll.clear()
+            self._in_speech = True
+            self._buffer = bytearray(pre)
+            self._buffer_offset = position - len(pre) // 2
+            self._speech_frames = 0
+            self._silence_run = 0
+            self._carry_cut = None
+
+        self._buffer += frame
+        if speech:
+            self._speech_frames += 1
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+            if self._silence_run >= self.max_silence_frames:
+                yield from self._close_region()
+                return
+
+        if len(self._buffer) // 2 >= self.window_samples:
+            yield from self._flush_packed()  # el audio empaquetado es anterior: sale primero
+            yield from self._emit_continuing()
+
+    def _emit_continuing(self) -> Iterator[AudioWindow]:
+        """Ventana llena dentro de una región de voz: se emite y se arrastra el solape"""
+        pcm = bytes(self._buffer[:self.window_samples * 2])
+        offset = self._buffer_offset
+        next_offset = offset + self.window_samples - self.overlap_samples
+        cut_end = (next_offset + self.overlap_samples / 2) / SAMPLE_RATE
+        yield self._window(pcm, offset, cut_end, overlapped=self._carry_cut is not None)
+        self._carry_cut = cut_end
+        self._buffer = bytearray(self._buffer[(self.window_samples - self.overlap_samples) * 2:])
+        self._buffer_offset = next_offset
+
+    def _close_region(self) -> Iterator[AudioWindow]:
+        if not self._in_speech:
+            return
+        self._in_speech = False
+        # se recorta el silencio final que exceda el hangover
+        trailing = max(0, self._silence_run - self.hangover_frames) * FRAME_SAMPLES * 2
+        pcm = bytes(self._buffer[:len(self._buffer) - trailing] if trailing else self._buffer)
+        self._buffer = bytearray()
+        end_sample = self._buffer_offset + len(pcm) // 2
+        continuing, self._carry_cut = self._carry_cut, None
+        if continuing is not None:
+            # cola de una región larga; si no pasa del corte, la ventana anterior ya la cubre
+            if pcm and end_sample / SAMPLE_RATE > continuing:
+                self._carry_cut = continuing
+                yield self._window(pcm, self._buffer_offset, end_sample / SAMPLE_RATE, overlapped=True)
+                self._carry_cut = None
+            return
+        if not pcm or self._speech_frames < self.min_speech_frames:
+            return
+        self.regions += 1
+        if not self.pack:
+            yield self._window(pcm, self._buffer_offset, end_sample / SAMPLE_RATE)
+            return
+        if len(self._packed) + len(pcm) > self.window_samples * 2:
+            yield from self._flush_packed()
+        self._packed_pieces.append((len(self._packed) // 2, self._buffer_offset))
+        self._packed += pcm
+        self._packed_end = end_sample
+
+    def _flush_packed(self) -> Iterator[AudioWindow]:
+        if not self._packed:
+            return
+        pcm, pieces = bytes(self._packed), self._packed_pieces
+        self._packed, self._packed_pieces = bytearray(), []
+        yield self._window(pcm, pieces[0][1], self._packed_end / SAMPLE_RATE, pieces=pieces)
+
+    def _window(self, pcm: bytes, offset: int, cut_end: float, overlapped: bool = False,
+                pieces: Optional[List[Tuple[int, int]]] = None) -> AudioWindow:
+        cut_start = self._carry_cut if self._carry_cut is not None else offset / SAMPLE_RATE
+        if pieces is not None:
+            cut_start, cut_end = 0.0, math.inf  # regiones completas: todo lo que devuelva es suyo
+        window = AudioWindow(self._index, offset, pcm, cut_start, cut_end, list(pieces or []))
+        self._index += 1
+        self.speech_samples += len(pcm) // 2 - (self.overlap_samples if overlapped else 0)
+        return window
+
+
+# ===== TRANSCRIPCIÓN =====
+
+WindowResult = Union[str, Sequence[Tuple[float, float, str]]]
+
+
+def stitch(window: AudioWindow, result: WindowResult) -> List[TranscriptSegment]:
+    """
+    Pasa los segmentos de una ventana a tiempos absolutos y se queda con los que
+    le pertenecen: punto medio dentro de ``[cut_start, cut_end)``. Un resultado
+    de solo texto se trata como un segmento de toda la ventana.
+    """
+    if isinstance(result, str):
+        result = [(0.0, window.duration_s, result)] if result.strip() else []
+    segments = []
+    for start, end, text in result:
+        start_abs = round(window.to_absolute(start), 3)
+        end_abs = round(window.to_absolute(end), 3)
+        midpoint = (start_abs + end_abs) / 2
+        text = text.strip()
+        if text and window.cut_start <= midpoint < window.cut_end:
+            segments.append(TranscriptSegment(start_abs, end_abs, text, window.index))
+    return segments
+
+
+class StreamingTranscriber:
+    """
+    Transcripción por ventanas de voz, en paralelo y con salida incremental
+
+    Args:
+        transcribe_fn: ``transcribe_fn(window) -> texto | [(inicio, fin, texto), ...]``
+            con tiempos relativos a la ventana; corre en hilos del executor
+        concurrency: Ventanas transcribiéndose a la vez
+        vad: True = ``EnergyVAD`` por defecto, False = sin VAD, o una instancia
+        window_s / overlap_s: Tamaño y solape de ventana
+    """
+
+    def __init__(self, transcribe_fn: Callable[[AudioWindow], WindowResult],
+                 concurrency: int = DEFAULT_CONCURRENCY, vad: Union[bool, EnergyVAD] = True,
+                 window_s: float = DEFAULT_WINDOW_S, overlap_s: float = DEFAULT_OVERLAP_S,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self.transcribe_fn = transcribe_fn
+        self.concurrency = max(1, concurrency)
+        self.vad = vad
+        self.window_s = window_s
+        self.overlap_s = overlap_s
+        self._executor = executor
+
+    def _windower(self) -> SpeechWindower:
+        vad = EnergyVAD() if self.vad is True else (self.vad or None)
+        return SpeechWindower(vad, self.window_s, self.overlap_s)
+
+    def stream(self, source: AudioSource, stats: Optional[TranscriptionStats] = None,
+               chunks: Optional[Iterator[bytes]] = None) -> Iterator[TranscriptSegment]:
+        """
+        Genera segmentos en orden según terminan las ventanas
+
+        ``chunks`` permite pasar PCM 16 kHz ya decodificado en lugar de ``source``.
+        """
+        stats = stats if stats is not None else TranscriptionStats()
+        started = time.perf_counter()
+        windower = self._windower()
+        executor = self._executor or ThreadPoolExecutor(max_workers=self.concurrency,
+                                                        thread_name_prefix='transcribe')
+        in_flight: Deque[Tuple[AudioWindow, Future]] = deque()
+
+        def submit(window: AudioWindow):
+            in_flight.append((window, executor.submit(self.transcribe_fn, window)))
+            stats.windows += 1
+            stats.peak_windows_in_flight = max(stats.peak_windows_in_flight, len(in_flight))
+
+        def drain(block_until: int) -> Iterator[TranscriptSegment]:
+            # en orden: la ventana más antigua primero; se bloquea solo si hay demasiadas en vuelo
+            while in_flight and (len(in_flight) > block_until or in_flight[0][1].done()):
+                window, future = in_flight.popleft()
+                yield from stitch(window, future.result())
+
+        try:
+            for chunk in chunks if chunks is not None else decode_pcm16k(source):
+                for window in windower.feed(chunk):
+                    submit(window)
+                    yield from drain(self.concurrency)
+                yield from drain(self.concurrency)
+            for window in windower.flush():
+                submit(window)
+            yield from drain(0)
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+            if self._executor is None:
+                executor.shutdown(wait=False)
+            stats.audio_s = windower.total_samples / SAMPLE_RATE
+            stats.speech_s = windower.speech_samples / SAMPLE_RATE
+            stats.processing_s = time.perf_counter() - started
+
+    def transcribe(self, source: AudioSource, chunks: Optional[Iterator[bytes]] = None) -> TranscriptionResult:
+        stats = TranscriptionStats()
+        segments = list(self.stream(source, stats, chunks))
+        return TranscriptionResult(' '.join(s.text for s in segments), segments, stats)
+
+
+def decode_pcm16k_bytes(source: AudioSource) -> bytes:
+    """Audio completo en PCM int16 16 kHz (para análisis que no van por ventanas)"""
+    return b''.join(decode_pcm16k(source))
+
+
+def voice_activity_summary(pcm: bytes, vad: Optional[EnergyVAD] = None) -> Dict[str, Any]:
+    """Proporción de voz y número de regiones de voz de un PCM 16 kHz"""
+    windower = SpeechWindower(vad or EnergyVAD(), window_s=3600, overlap_s=0, pack=False)
+    regions = list(windower.feed(pcm)) + list(windower.flush())
+    duration = windower.total_samples / SAMPLE_RATE
+    return {
+        'duration_s': round(duration, 3),
+        'speech_s': round(windower.speech_samples / SAMPLE_RATE, 3),
+        'speech_ratio': round(windower.speech_samples / windower.total_samples, 4) if windower.total_samples else 0.0,
+        'speech_regions': len(regions),
+    }
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+📏 VIGOLEONROCKS - Barrido de escalado con contexto largo
+Piezas compartidas por ``benchmarks/context_scaling_benchmark.py`` y el
+benchmark Context_Scaling de ``quantumbench_framework``:
+
+- Documentos sintéticos deterministas de 1K–500K tokens (~4 caracteres por
+  token), generados con ``services.entropy`` a partir de una semilla
+- Ajuste log-log del exponente de escalado (latencia ∝ tokens^k); por encima
+  de ``SUPERLINEAR_THRESHOLD`` el escalado se marca como superlineal
+"""
+
+import math
+import statistics
+from typing import Dict, List, Optional, Sequence
+
+from .entropy import get_entropy
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 500_000)
+CHARS_PER_TOKEN = 4  # aproximación de tokens a caracteres
+SUPERLINEAR_THRESHOLD = 1.15  # exponente k por encima del cual el escalado es superlineal
+
+# Vocabulario multilingüe con las palabras clave que buscan las reglas de activación
+_VOCABULARY = (
+    "the of and to in is that for on with as by from this which quantum system analysis "
+    "model language context memory process data time when where why how because therefore "
+    "logic reasoning algorithm equation create design imagine feel emotion history future "
+    "el la de que en los las del por para con una sistema análisis contexto memoria tiempo "
+    "cuándo dónde cómo porque lógica razonamiento algoritmo crear diseño sentir emoción "
+    "historia futuro consciencia sabiduría conciencia cultura sociedad moral ética símbolo "
+    "o de que em para com uma sistema análise contexto memória tempo porque lógica"
+).split()
+_CONNECTORS = ("then", "if", "after", "before", "durante", "así que", "por lo tanto", "because")
+
+
+def generate_document(tokens: int, seed: int = 26) -> str:
+    """
+    Documento sintético determinista de unos ``tokens`` tokens
+
+    Párrafos de 4–8 frases de 8–20 palabras, con números, preguntas y
+    conectores para que las etapas de regex/palabras clave encuentren
+    coincidencias realistas.
+    """
+    rng = get_entropy().derive('context-scaling', seed)
+    budget = tokens * CHARS_PER_TOKEN
+    paragraphs: List[str] = []
+    size = 0
+    while size < budget:
+        sentences = []
+        for _ in range(rng.randint(4, 8)):
+            words = [rng.choice(_VOCABULARY) for _ in range(rng.randint(8, 20))]
+            if rng.random() < 0.2:
+                words.insert(rng.randrange(len(words)), str(rng.randint(1, 2025)))
+            if rng.random() < 0.15:
+                words.insert(rng.randrange(len(words)), rng.choice(_CONNECTORS))
+            sentence = " ".join(words)
+            sentences.append(sentence[0].upper() + sentence[1:] + ("?" if rng.random() < 0.1 else "."))
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:budget]
+
+
+def fit_scaling_exponent(sizes: Sequence[float], values: Sequence[float]) -> Dict[str, Optional[float]]:
+    """Ajuste por mínimos cuadrados de log(valor) = k·log(tamaño) + c: exponente k y r²"""
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s > 0 and v and v > 0]
+    if len(points) < 2:
+        return {"exponent": None, "r2": None}
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    slope = sxy / sxx if sxx else 0.0
+    ss_tot = sum((y - mean_y) ** 2 for _, y in points)
+    ss_res = sum((y - (mean_y + slope * (x - mean_x))) ** 2 for x, y in points)
+    return {"exponent": round(slope, 3), "r2": round(1 - ss_res / ss_tot, 3) if ss_tot else 1.0}
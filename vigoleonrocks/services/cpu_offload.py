@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+🧮 VIGOLEONROCKS - Pool de procesos para extracción de características de imagen
+``analyze_image_quantum``, ``RealImageProcessor.analyze_image_real`` y
+``process_image`` de ``app.py`` son trabajo Python/PIL que retiene el GIL: en
+un hilo de petición, una imagen grande frena el chat de todo el proceso.
+Este servicio las ejecuta en procesos aparte:
+
+- Workers precalentados: ``forkserver`` (o ``spawn``) con NumPy/PIL y los
+  módulos de imagen importados una sola vez; ``start()`` los arranca todos
+- La imagen viaja por memoria compartida (``SharedMemory``) en lugar de
+  serializarse por la tubería del pool (solo por encima de
+  ``CPU_OFFLOAD_SHM_MIN_BYTES``)
+- Timeout por tarea: un worker colgado se descarta junto con su pool
+- Reciclado de workers cada ``CPU_OFFLOAD_MAX_TASKS_PER_WORKER`` tareas
+  (fugas de memoria de PIL / fragmentación): ``max_tasks_per_child`` en
+  Python 3.11+; antes se sustituye el pool entero cada N tareas (ningún
+  worker puede haber ejecutado más de N)
+- Fallback en el propio hilo si el pool está desactivado, no puede arrancar
+  o se rompe
+
+Los workers importan el ``__main__`` del servidor (regla de multiprocessing):
+los scripts deben arrancar el servidor bajo ``if __name__ == '__main__'``.
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from pickle import PicklingError
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .micro_batcher import Histogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENABLED = os.getenv('CPU_OFFLOAD_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+DEFAULT_WORKERS = int(os.getenv('CPU_OFFLOAD_WORKERS', 0))  # 0 = cpu_count // 2 (mín. 1, máx. 4)
+DEFAULT_TIMEOUT = float(os.getenv('CPU_OFFLOAD_TIMEOUT', 30))
+DEFAULT_MAX_TASKS_PER_WORKER = int(os.getenv('CPU_OFFLOAD_MAX_TASKS_PER_WORKER', 200))
+DEFAULT_SHM_MIN_BYTES = int(os.getenv('CPU_OFFLOAD_SHM_MIN_BYTES', 64 * 1024))
+WARM_MODULES = ('numpy', 'PIL.Image', 'PIL.ImageFilter', 'PIL.ImageStat',
+                'quantum_image_processor', 'image_processor_real')
+
+TASK_MS_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# max_tasks_per_child llegó en 3.11; cancel_futures en 3.9
+NATIVE_MAX_TASKS = sys.version_info >= (3, 11)
+HAS_CANCEL_FUTURES = sys.version_info >= (3, 9)
+
+
+class OffloadTimeout(TimeoutError):
+    """La tarea superó su timeout; el worker que la ejecutaba se descarta"""
+
+
+class SharedBytes:
+    """Referencia a un bloque de ``SharedMemory`` (lo que viaja por la tubería)"""
+
+    __slots__ = ('name', 'size')
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+    def __getstate__(self):
+        return self.name, self.size
+
+    def __setstate__(self, state):
+        self.name, self.size = state
+
+    def read(self) -> bytes:
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            return bytes(shm.buf[:self.size])
+        finally:
+            shm.close()  # el proceso principal hace el unlink
+
+
+# ----- lado del worker -----
+
+def _init_worker(modules: Iterable[str]) -> None:
+    import importlib
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:  # un módulo opcional ausente no invalida el worker
+            logger.debug(f"Worker sin {name}: {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _run_task(fn: Callable[..., Any], payload: Any, args: tuple, kwargs: dict) -> Any:
+    data = payload.read() if isinstance(payload, SharedBytes) else payload
+    return fn(data, *args, **kwargs)
+
+
+# ----- pool -----
+
+def _default_workers() -> int:
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    if ctx.get_start_method() == 'forkserver':
+        ctx.set_forkserver_preload(list(WARM_MODULES))
+    return ctx
+
+
+def _shutdown_executor(executor: ProcessPoolExecutor, wait: bool, cancel: bool) -> None:
+    if cancel and HAS_CANCEL_FUTURES:
+        executor.shutdown(wait=wait, cancel_futures=True)
+    else:
+        executor.shutdown(wait=wait)
+
+
+class CPUOffloadPool:
+    """
+    Pool de procesos para funciones ``fn(data: bytes, *args)`` intensivas en CPU
+
+    Args:
+        workers: Procesos del pool (0 = ``cpu_count // 2``, entre 1 y 4)
+        timeout: Segundos máximos por tarea, incluida la espera en cola
+        max_tasks_per_worker: Tareas antes de reciclar un worker (0 = nunca)
+        shm_min_bytes: A partir de este tamaño la entrada va por memoria compartida
+        enabled: ``False`` ejecuta siempre en el hilo que llama
+        warm_modules: Módulos importados al arrancar cada worker
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT,
+                 max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER,
+                 shm_min_bytes: int = DEFAULT_SHM_MIN_BYTES, enabled: bool = DEFAULT_ENABLED,
+                 warm_modules: Iterable[str] = WARM_MODULES):
+        self.workers = workers or _default_workers()
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.shm_min_bytes = shm_min_bytes
+        # Un worker que importa el módulo de la app nunca debe abrir su propio pool
+        self.enabled = enabled and multiprocessing.parent_process() is None
+        self.warm_modules = tuple(warm_modules)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_tasks = 0  # reciclado manual antes de 3.11
+        self._lock = threading.Lock()
+        self.task_ms = Histogram(TASK_MS_BUCKETS)
+        self.counters = {'submitted': 0, 'completed': 0, 'inline': 0, 'timeouts': 0,
+                         'failures': 0, 'pool_restarts': 0, 'shm_bytes': 0, 'pickled_bytes': 0}
+
+    # ----- ciclo de vida -----
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        kwargs = {}
+        if self.max_tasks_per_worker > 0 and NATIVE_MAX_TASKS:
+            kwargs['max_tasks_per_child'] = self.max_tasks_per_worker
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context(),
+                                   initializer=_init_worker, initargs=(self.warm_modules,), **kwargs)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if not self.enabled:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None and self.enabled:
+                    try:
+                        self._executor = self._create_executor()
+                        self._executor_tasks = 0
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"⚠️ Pool de procesos no disponible, se ejecuta en hilo: {e}")
+                        self.enabled = False
+        return self._executor
+
+    def start(self, wait: float = 60.0) -> bool:
+        """Arranca y precalienta todos los workers; ``False`` si se queda en modo hilo"""
+        executor = self._get_executor()
+        if executor is None:
+            return False
+        t0 = time.perf_counter()
+        try:
+            pids = {f.result(timeout=wait) for f in [executor.submit(_ping) for _ in range(self.workers)]}
+        except Exception as e:
+            logger.warning(f"⚠️ Calentamiento del pool fallido: {e}")
+            return False
+        logger.info(f"🧮 Pool de imagen listo: {len(pids)} workers en {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return True
+
+    def _restart(self, broken: ProcessPoolExecutor, kill: bool) -> None:
+        with self._lock:
+            if self._executor is not broken:
+                return  # otro hilo ya lo reemplazó
+            self._executor = None
+            self.counters['pool_restarts'] += 1
+        if kill:
+            # ProcessPoolExecutor no permite matar un solo worker: el colgado
+            # retiene su slot hasta terminar, así que se descarta el pool entero
+            for process in list(getattr(broken, '_processes', {}).values()):
+                process.terminate()
+        _shutdown_executor(broken, wait=False, cancel=True)
+
+    def _recycle_if_due(self, executor: ProcessPoolExecutor) -> None:
+        """Sin ``max_tasks_per_child`` (< 3.11): pool nuevo cada ``max_tasks_per_worker`` tareas"""
+        if NATIVE_MAX_TASKS or self.max_tasks_per_worker <= 0:
+            return
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor_tasks += 1
+            if self._executor_tasks < self.max_tasks_per_worker:
+                return
+            self._executor = None
+        # Las tareas en curso del pool viejo terminan; las nuevas van al siguiente. El cierre
+        # espera en un hilo aparte: shutdown(wait=False) en 3.8 compite con el hilo gestor del pool
+        threading.Thread(target=executor.shutdown, name='cpu-offload-recycle', daemon=True).start()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            _shutdown_executor(executor, wait=True, cancel=True)
+
+    # ----- ejecución -----
+
+    def _inline(self, fn: Callable[..., Any], data: bytes, args: tuple, kwargs: dict) -> Any:
+        self.counters['inline'] += 1
+        return fn(data, *args, **kwargs)
+
+    def run(self, fn: Callable[..., Any], data: bytes, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        ``fn(data, *args, **kwargs)`` en un worker; las excepciones de ``fn`` se propagan
+
+        ``fn`` debe ser una función de nivel de módulo (se envía por referencia).
+
+        Raises:
+            OffloadTimeout: la tarea no terminó en ``timeout`` segundos
+        """
+        executor = self._get_executor()
+        if executor is None:
+            return self._inline(fn, data, args, kwargs)
+
+        shm = None
+        if len(data) >= self.shm_min_bytes:
+            try:
+                shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+                shm.buf[:len(data)] = data
+                payload = SharedBytes(shm.name, len(data))
+                self.counters['shm_bytes'] += len(data)
+            except OSError as e:  # /dev/shm lleno o inexistente
+                logger.debug(f"SharedMemory no disponible ({e}); la imagen se serializa")
+                shm, payload = None, data
+        else:
+            payload = data
+        if shm is None:
+            self.counters['pickled_bytes'] += len(data)
+
+        t0 = time.perf_counter()
+        try:
+            future = executor.submit(_run_task, fn, payload, args, kwargs)
+            self.counters['submitted'] += 1
+            result = future.result(timeout=self.timeout if timeout is None else timeout)
+        except (TimeoutError, FutureTimeoutError):  # distintos hasta 3.11
+            self.counters['timeouts'] += 1
+            if not future.cancel():
+                self._restart(executor, kill=True)
+            raise OffloadTimeout(f"{getattr(fn, '__name__', fn)} superó {self.timeout if timeout is None else timeout}s")
+        except (BrokenProcessPool, PicklingError, RuntimeError) as e:
+            # RuntimeError: el pool se cerró entre _get_executor y submit
+            self.counters['failures'] += 1
+            logger.warning(f"⚠️ Pool de imagen roto ({e.__class__.__name__}: {e}); ejecutando en hilo")
+            if isinstance(e, BrokenProcessPool):
+                self._restart(executor, kill=False)
+            return self._inline(fn, data, args, kwargs)
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self.counters['completed'] += 1
+        self.task_ms.observe((time.perf_counter() - t0) * 1000)
+        self._recycle_if_due(executor)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'running': self._executor is not None,
+            'workers': self.workers,
+            'timeout_s': self.timeout,
+            'max_tasks_per_worker': self.max_tasks_per_worker,
+            'task_ms': self.task_ms.snapshot(),
+            **self.counters,
+        }
+
+
+_pool: Optional[CPUOffloadPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_cpu_offload() -> CPUOffloadPool:
+    """Pool compartido por todo el proceso (los workers se crean en el primer uso o con ``start()``)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = CPUOffloadPool()
+    return _pool
+
+
+def offload(fn: Callable[..., Any], data: bytes, *args, **kwargs) -> Any:
+    """Atajo: ``offload(analyze_image_quantum, image_data, filename)``"""
+    return get_cpu_offload().run(fn, data, *args, **kwargs)
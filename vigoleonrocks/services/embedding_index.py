@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+🧭 VIGOLEONROCKS - Índice de similitud sobre embeddings CLIP
+Guarda el vector CLIP normalizado de cada imagen analizada junto con su id de
+análisis, para responder "imágenes parecidas a esta" y reutilizar el análisis
+de subidas casi idénticas:
+
+- Matriz float32 en un archivo mapeado en memoria (``vectors.f32``) que crece
+  por duplicación; ids y metadatos en ``ids.jsonl`` (una línea por fila).
+  Sin ``EMBEDDING_INDEX_DIR`` todo vive en memoria
+- Búsqueda exacta (producto matricial + ``argpartition``) mientras el índice
+  tiene menos de ``EMBEDDING_INDEX_EXACT_MAX`` vectores
+- Por encima, índice IVF: k-means esférico sobre una muestra, listas
+  invertidas en formato CSR y búsqueda exacta dentro de las ``nprobe`` listas
+  más cercanas. Los vectores añadidos después se buscan en una cola exacta
+  hasta la siguiente reconstrucción (en segundo plano)
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: un único proceso escritor por directorio
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.getenv('EMBEDDING_INDEX_DIR', '')
+DEFAULT_EXACT_MAX = int(os.getenv('EMBEDDING_INDEX_EXACT_MAX', 20000))
+DEFAULT_NPROBE = int(os.getenv('EMBEDDING_INDEX_NPROBE', 16))
+DEFAULT_REUSE_THRESHOLD = float(os.getenv('EMBEDDING_REUSE_THRESHOLD', 0.98))  # 0 = no reutilizar
+REBUILD_GROWTH = 0.2      # reconstruir el IVF cuando la cola exacta supera el 20% de lo indexado
+SEARCH_CHUNK_ROWS = 65536  # filas por bloque al asignar listas (acota la memoria temporal)
+NEAR_DUPLICATE_CANDIDATES = 8  # vecinos revisados al buscar un análisis reutilizable
+
+
+def normalize(vectors) -> np.ndarray:
+    """Vectores fila float32 de norma 1 (los nulos quedan a cero)"""
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Índices de las ``k`` puntuaciones más altas, de mayor a menor"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    best = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    return best[np.argsort(-scores[best], kind='stable')]
+
+
+class EmbeddingStore:
+    """
+    Matriz de embeddings persistente (append-only)
+
+    Varios procesos (workers de gunicorn) pueden compartir el directorio: cada
+    escritura toma un lock ``fcntl`` sobre ``index.lock`` y antes de añadir
+    incorpora las filas que hayan escrito los demás, así que ids y vectores
+    nunca se pisan. Sin ``fcntl`` (Windows) sólo debe escribir un proceso.
+
+    Args:
+        path: Directorio de los archivos; vacío = solo memoria
+        dim: Dimensión; si es ``None`` la fija el primer vector (o el disco)
+        initial_capacity: Filas reservadas al crear la matriz
+    """
+
+    def __init__(self, path: str = DEFAULT_DIR, dim: Optional[int] = None, initial_capacity: int = 1024):
+        self.path = path
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+        self.count = 0
+        self.ids: List[str] = []
+        self.meta: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._ids_offset = 0  # bytes de ids.jsonl ya incorporados
+        self._lock = threading.Lock()
+        self._lock_fd: Optional[int] = None
+        if path:
+            os.makedirs(path, exist_ok=True)
+            if fcntl is not None:
+                self._lock_fd = os.open(os.path.join(path, 'index.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+            with self._writer():
+                self._sync()
+            if self.count:
+                logger.info(f"🧭 Índice de embeddings abierto: {self.count} vectores de dimensión {self.dim}")
+
+    # ----- archivos -----
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, 'vectors.f32')
+
+    @property
+    def _ids_path(self) -> str:
+        return os.path.join(self.path, 'ids.jsonl')
+
+    @property
+    def _header_path(self) -> str:
+        return os.path.join(self.path, 'index.json')
+
+    @contextmanager
+    def _writer(self):
+        """Exclusión entre hilos y, si hay directorio, entre procesos"""
+        with self._lock:
+            if self._lock_fd is None:
+                yield
+                return
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Incorpora lo escrito en disco desde la última lectura (con el lock de escritura)"""
+        if self._matrix is None and os.path.exists(self._header_path):
+            with open(self._header_path) as f:
+                stored_dim = json.load(f)['dim']
+            if self.dim is not None and self.dim != stored_dim:
+                raise ValueError(f"El índice en {self.path} tiene dimensión {stored_dim}, no {self.dim}")
+            self.dim = stored_dim
+        if self.dim is None or not os.path.exists(self._vectors_path):
+            return
+        rows = os.path.getsize(self._vectors_path) // (4 * self.dim)
+        ids, metas = [], []
+        if os.path.exists(self._ids_path) and os.path.getsize(self._ids_path) > self._ids_offset:
+            with open(self._ids_path, 'rb') as f:
+                f.seek(self._ids_offset)
+                for line in f:
+                    if self.count + len(ids) >= rows or not line.endswith(b'\n'):
+                        break  # id sin vector o línea cortada: escritura interrumpida
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    ids.append(entry['id'])
+                    metas.append(entry.get('meta', {}))
+                    self._ids_offset += len(line)
+            if self._ids_offset < os.path.getsize(self._ids_path):
+                with open(self._ids_path, 'r+b') as f:
+                    f.truncate(self._ids_offset)  # las siguientes líneas empiezan limpias
+        if rows > (0 if self._matrix is None else self._matrix.shape[0]):
+            # Otro proceso amplió el archivo: se mapea entero antes de publicar las filas nuevas
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r+', shape=(rows, self.dim))
+        for item_id, meta in zip(ids, metas):
+            self._rows[item_id] = len(self.ids)
+            self.ids.append(item_id)
+            self.meta.append(meta)
+        self.count = len(self.ids)
+
+    def refresh(self) -> None:
+        """Recoge las filas añadidas por otros procesos desde la última operación"""
+        if not self.path or not os.path.exists(self._ids_path):
+            return
+        if os.path.getsize(self._ids_path) != self._ids_offset:
+            with self._writer():
+                self._sync()
+
+    def _reserve(self, rows: int) -> None:
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(self.initial_capacity, capacity * 2, rows)
+        if not self.path:
+            grown = np.zeros((new_capacity, self.dim), dtype=np.float32)
+            if self._matrix is not None:
+                grown[:self.count] = self._matrix[:self.count]
+            self._matrix = grown
+            return
+        if self._matrix is None:
+            with open(self._header_path, 'w') as f:
+                json.dump({'dim': self.dim, 'dtype': 'float32'}, f)
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        with open(self._vectors_path, 'ab') as f:
+            f.truncate(new_capacity * self.dim * 4)
+        # Los lectores que tengan el mapa anterior siguen viendo sus filas válidas
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r+',
+                                 shape=(new_capacity, self.dim))
+
+    # ----- escritura -----
+
+    def add_many(self, vectors, ids: Sequence[str], metas: Optional[Sequence[Dict[str, Any]]] = None) -> np.ndarray:
+        """Añade vectores (se normalizan); devuelve sus filas"""
+        matrix = normalize(vectors)
+        if len(matrix) != len(ids):
+            raise ValueError("vectors e ids deben tener la misma longitud")
+        metas = metas if metas is not None else [{}] * len(ids)
+        with self._writer():
+            if self.path:
+                self._sync()
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+            if matrix.shape[1] != self.dim:
+                raise ValueError(f"Dimensión {matrix.shape[1]} distinta de la del índice ({self.dim})")
+            start = self.count
+            self._reserve(start + len(matrix))
+            self._matrix[start:start + len(matrix)] = matrix
+            if self.path:
+                # Vector antes que id: tras un corte, una fila sin id se ignora al abrir
+                self._matrix.flush()
+                lines = ''.join(json.dumps({'id': item_id, 'meta': meta}, ensure_ascii=False) + '\n'
+                                for item_id, meta in zip(ids, metas)).encode('utf-8')
+                with open(self._ids_path, 'ab') as f:
+                    f.write(lines)
+                self._ids_offset += len(lines)
+            for offset, (item_id, meta) in enumerate(zip(ids, metas)):
+                self._rows[item_id] = start + offset
+                self.ids.append(item_id)
+                self.meta.append(meta)
+            self.count = start + len(matrix)
+        return np.arange(start, start + len(matrix))
+
+    def add(self, vector, item_id: str, meta: Optional[Dict[str, Any]] = None) -> int:
+        return int(self.add_many([vector], [item_id], [meta or {}])[0])
+
+    # ----- lectura -----
+
+    def vectors(self) -> np.ndarray:
+        """Vista de las filas escritas (instantánea coherente con ``count``)"""
+        matrix, count = self._matrix, self.count
+        if matrix is None:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        return matrix[:count]
+
+    def row_of(self, item_id: str) -> Optional[int]:
+        return self._rows.get(item_id)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class IVFIndex:
+    """
+    Índice de listas invertidas sobre vectores normalizados
+
+    Args:
+        nlist: Número de listas (por defecto ``4·√n``)
+        nprobe: Listas visitadas por consulta
+        iterations: Iteraciones de k-means
+        train_size: Vectores de la muestra de entrenamiento (por defecto ``64·nlist``)
+    """
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = DEFAULT_NPROBE, iterations: int = 10,
+                 train_size: Optional[int] = None, seed: int = 0):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.train_size = train_size
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.order = np.empty(0, dtype=np.int64)     # filas agrupadas por lista
+        self.offsets = np.zeros(1, dtype=np.int64)   # lista c = order[offsets[c]:offsets[c+1]]
+        self.size = 0
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), SEARCH_CHUNK_ROWS):
+            block = vectors[start:start + SEARCH_CHUNK_ROWS]
+            labels[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return labels
+
+    def build(self, vectors: np.ndarray) -> 'IVFIndex':
+        n = len(vectors)
+        nlist = max(1, min(n, self.nlist or int(4 * math.sqrt(n))))
+        rng = np.random.default_rng(self.seed)
+        train_size = min(n, self.train_size or 64 * nlist)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, train_size, replace=False))])
+        centroids = sample[rng.choice(train_size, nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            if empty.any():  # lista vacía: se resiembra con un punto de la muestra
+                sums[empty] = sample[rng.choice(train_size, int(empty.sum()))]
+            centroids = normalize(sums)
+        self.centroids = centroids
+        labels = self._assign(vectors)
+        self.order = np.argsort(labels, kind='stable')
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=nlist))))
+        self.size = n
+        return self
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        lists = top_k(self.centroids @ query, nprobe)
+        return np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in lists])
+
+
+class EmbeddingIndex:
+    """
+    Búsqueda por similitud coseno sobre un ``EmbeddingStore``
+
+    Args:
+        store: Matriz de embeddings
+        exact_max: Por debajo de este tamaño siempre búsqueda exacta
+        nprobe: Listas IVF visitadas por consulta
+        background: Reconstruir el IVF en un hilo aparte (``False`` en tests/benchmarks)
+    """
+
+    def __init__(self, store: EmbeddingStore, exact_max: int = DEFAULT_EXACT_MAX,
+                 nprobe: int = DEFAULT_NPROBE, background: bool = True):
+        self.store = store
+        self.exact_max = exact_max
+        self.nprobe = nprobe
+        self.background = background
+        self.ivf: Optional[IVFIndex] = None
+        self._rebuilding = threading.Lock()
+        self.counters = {'queries_exact': 0, 'queries_ivf': 0, 'builds': 0, 'reused': 0}
+        self.last_build_s = 0.0
+
+    # ----- construcción -----
+
+    def build(self, nlist: Optional[int] = None) -> float:
+        """Construye el IVF con lo indexado ahora; devuelve los segundos empleados"""
+        with self._rebuilding:
+            t0 = time.perf_counter()
+            vectors = self.store.vectors()
+            if not len(vectors):
+                return 0.0
+            self.ivf = IVFIndex(nlist=nlist, nprobe=self.nprobe).build(vectors)
+            self.last_build_s = time.perf_counter() - t0
+            self.counters['builds'] += 1
+        logger.info(f"🧭 IVF construido: {len(vectors)} vectores, {len(self.ivf.centroids)} listas "
+                    f"en {self.last_build_s:.2f}s")
+        return self.last_build_s
+
+    def _maybe_rebuild(self) -> None:
+        count = len(self.store)
+        if count < self.exact_max:
+            return
+        if self.ivf is not None and count - self.ivf.size <= REBUILD_GROWTH * self.ivf.size:
+            return
+        if self._rebuilding.locked():
+            return
+        if self.background:
+            threading.Thread(target=self.build, daemon=True, name='embedding-ivf-build').start()
+        else:
+            self.build()
+
+    def add(self, vector, item_id: str, meta: Optional[Dict[str, Any]] = None) -> int:
+        row = self.store.add(vector, item_id, meta)
+        self._maybe_rebuild()
+        return row
+
+    # ----- consulta -----
+
+    def search(self, query, k: int = 10, mode: str = 'auto', nprobe: Optional[int] = None,
+               exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Los ``k`` vectores más parecidos a ``query``: ``[{'id', 'score', 'meta'}]``
+
+        ``mode``: ``auto`` (exacta hasta ``exact_max``), ``exact`` o ``ivf``
+        """
+        q = normalize(query)[0]
+        self.store.refresh()
+        vectors = self.store.vectors()
+        if not len(vectors):
+            return []
+        ivf = self.ivf
+        use_ivf = mode == 'ivf' or (mode == 'auto' and len(vectors) >= self.exact_max)
+        extra = 1 if exclude is not None else 0
+        if use_ivf and ivf is not None:
+            rows = ivf.candidates(q, nprobe)
+            if ivf.size < len(vectors):  # cola exacta: añadidos desde la última construcción
+                rows = np.concatenate((rows, np.arange(ivf.size, len(vectors))))
+            rows = np.sort(rows)  # lectura secuencial del mmap
+            scores = vectors[rows] @ q
+            order = top_k(scores, k + extra)
+            best, best_scores = rows[order], scores[order]
+            self.counters['queries_ivf'] += 1
+        else:
+            scores = vectors @ q
+            best = top_k(scores, k + extra)
+            best_scores = scores[best]
+            self.counters['queries_exact'] += 1
+        results = []
+        for row, score in zip(best.tolist(), best_scores.tolist()):
+            item_id = self.store.ids[row]
+            if item_id == exclude:
+                continue
+            results.append({'id': item_id, 'score': round(float(score), 6), 'meta': self.store.meta[row]})
+        return results[:k]
+
+    def vector_of(self, item_id: str) -> Optional[np.ndarray]:
+        row = self.store.row_of(item_id)
+        return None if row is None else np.array(self.store.vectors()[row])
+
+    def near_duplicate(self, vector, threshold: float = DEFAULT_REUSE_THRESHOLD,
+                       accept: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Análisis previo con similitud ≥ ``threshold`` (``None`` si no hay o está desactivado)
+
+        ``accept(meta)`` descarta candidatos no reutilizables (p. ej. un análisis
+        menos profundo que el pedido); se miran los ``NEAR_DUPLICATE_CANDIDATES``
+        más parecidos.
+        """
+        if threshold <= 0 or not len(self.store):
+            return None
+        for match in self.search(vector, k=1 if accept is None else NEAR_DUPLICATE_CANDIDATES):
+            if match['score'] < threshold:
+                break
+            if accept is None or accept(match['meta']):
+                self.counters['reused'] += 1
+                return match
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'vectors': len(self.store),
+            'dim': self.store.dim,
+            'persistent': bool(self.store.path),
+            'mode': 'ivf' if len(self.store) >= self.exact_max and self.ivf is not None else 'exact',
+            'ivf_lists': 0 if self.ivf is None else len(self.ivf.centroids),
+            'ivf_pending': 0 if self.ivf is None else len(self.store) - self.ivf.size,
+            'last_build_s': round(self.last_build_s, 3),
+            **self.counters,
+        }
+
+
+_index: Optional[EmbeddingIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_embedding_index() -> EmbeddingIndex:
+    """Índice compartido por todo el proceso (``EMBEDDING_INDEX_DIR`` o memoria)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EmbeddingIndex(EmbeddingStore(DEFAULT_DIR))
+                _index._maybe_rebuild()
+    return _index
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+🎲 VIGOLEONROCKS - Servicio único de entropía
+Sustituye a las fuentes ad hoc repartidas por el proyecto (``MetricsBasedRNG``
+con un sha256 por cada pocas elecciones, las copias de ``get_system_entropy``
+y ``psutil.cpu_percent(interval=0.1)`` bloqueante en el servidor cuántico):
+
+- Producción: un generador rápido por hilo (Mersenne Twister de la stdlib)
+  sembrado desde el CSPRNG del sistema (``secrets``); se resiembra tras fork
+- Modo determinista (``ENTROPY_SEED``): cada petición obtiene su propio
+  generador derivado de ``(semilla, índice de petición)``, así las elecciones
+  de respuesta, los ids y las métricas simuladas se reproducen exactamente
+- Los tokens de seguridad siguen usando ``secrets`` directamente: este
+  servicio es para variedad de respuestas y simulación, no para secretos
+"""
+
+import contextlib
+import contextvars
+import hashlib
+import itertools
+import logging
+import os
+import random
+import secrets
+import threading
+import weakref
+from typing import Any, Iterator, List, MutableSequence, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_seed_env = os.getenv('ENTROPY_SEED', '').strip()
+DEFAULT_SEED: Optional[int] = int(_seed_env) if _seed_env else None
+REQUEST_INDEX_HEADER = 'X-Request-Index'
+
+
+class EntropyService:
+    """
+    Generadores por hilo o por petición con la interfaz de ``MetricsBasedRNG``
+
+    Args:
+        seed: ``None`` = producción (sembrado por CSPRNG); un entero activa el
+            modo determinista
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self._local = threading.local()
+        self._request_index = itertools.count()
+        self._request: contextvars.ContextVar = contextvars.ContextVar(f'entropy_request_{id(self)}', default=None)
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._reset_threads())
+
+    @property
+    def deterministic(self) -> bool:
+        return self.seed is not None
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """Cambia de modo (pruebas de carga, tests); reinicia el índice de peticiones"""
+        self.seed = seed
+        self._request_index = itertools.count()
+        self._reset_threads()
+
+    def _reset_threads(self) -> None:
+        self._local = threading.local()
+
+    def derive(self, *key: Any) -> random.Random:
+        """Generador reproducible para ``(semilla, *key)``"""
+        digest = hashlib.sha256(repr((self.seed,) + key).encode()).digest()
+        return random.Random(int.from_bytes(digest[:16], 'big'))
+
+    def stream(self, *key: Any) -> random.Random:
+        """
+        Generador propio de un componente (muestreo, ids de traza) que no consume el del hilo
+
+        Con semilla es ``derive(*key)``; en producción se siembra por CSPRNG para
+        que los workers no compartan secuencia.
+        """
+        if self.seed is None:
+            return random.Random(secrets.randbits(128))
+        return self.derive(*key)
+
+    def generator(self) -> random.Random:
+        """Generador de la petición en curso o, fuera de una petición, del hilo"""
+        gen = self._request.get()
+        if gen is not None:
+            return gen
+        gen = getattr(self._local, 'generator', None)
+        if gen is None:
+            if self.seed is None:
+                gen = random.Random(secrets.randbits(128))
+            else:
+                gen = self.derive('thread', threading.current_thread().name)
+            self._local.generator = gen
+        return gen
+
+    # ----- peticiones -----
+
+    def next_request_index(self) -> int:
+        return next(self._request_index)
+
+    def begin_request(self, index: Optional[int] = None) -> Optional[contextvars.Token]:
+        """Liga un generador derivado del índice de petición (solo en modo determinista)"""
+        if self.seed is None:
+            return None
+        if index is None:
+            index = self.next_request_index()
+        return self._request.set(self.derive('request', index))
+
+    def end_request(self, token: Optional[contextvars.Token]) -> None:
+        if token is not None:
+            self._request.reset(token)
+
+    @contextlib.contextmanager
+    def request_scope(self, index: Optional[int] = None) -> Iterator[None]:
+        token = self.begin_request(index)
+        try:
+            yield
+        finally:
+            self.end_request(token)
+
+    # ----- valores -----
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        return low + (high - low) * self.generator().random()
+
+    def integers(self, low: int, high: int) -> int:
+        """Entero en ``[low, high)``"""
+        return self.generator().randrange(low, high)
+
+    def choice(self, choices: Sequence[Any]) -> Any:
+        return self.generator().choice(choices)
+
+    # Interfaz de MetricsBasedRNG
+    get_random_choice = choice
+
+    def shuffle(self, items: MutableSequence[Any]) -> None:
+        self.generator().shuffle(items)
+
+    def words(self, count: int = 8, bits: int = 16) -> List[int]:
+        """Lista de enteros de ``bits`` bits (forma del antiguo ``get_system_entropy``)"""
+        gen = self.generator()
+        return [gen.getrandbits(bits) for _ in range(count)]
+
+    def token_hex(self, nbytes: int = 8) -> str:
+        return format(self.generator().getrandbits(nbytes * 8), f'0{nbytes * 2}x')
+
+    def request_id(self, prefix: str) -> str:
+        """Identificador de subida/petición, reproducible en modo determinista"""
+        return f"{prefix}_{self.token_hex(6)}"
+
+
+def install_entropy(app, service: Optional[EntropyService] = None) -> EntropyService:
+    """
+    Registra el servicio en una app Flask
+
+    En modo determinista cada petición usa el índice de ``X-Request-Index``
+    (o el orden de llegada) y lo devuelve en la misma cabecera; en producción
+    los hooks no hacen nada.
+    """
+    from flask import g, request
+
+    service = service or get_entropy()
+
+    @app.before_request
+    def _entropy_begin():
+        if service.deterministic:
+            header = request.headers.get(REQUEST_INDEX_HEADER)
+            index = int(header) if header and header.isdigit() else service.next_request_index()
+            g._entropy_index = index
+            g._entropy_token = service.begin_request(index)
+
+    @app.after_request
+    def _entropy_header(response):
+        index = g.get('_entropy_index')
+        if index is not None:
+            response.headers[REQUEST_INDEX_HEADER] = str(index)
+        return response
+
+    @app.teardown_request
+    def _entropy_end(exc=None):
+        token = g.pop('_entropy_token', None)
+        if token is not None:
+            with contextlib.suppress(ValueError):  # contexto distinto (respuestas en streaming)
+                service.end_request(token)
+
+    app.extensions['vigoleonrocks_entropy'] = service
+    return service
+
+
+_entropy: Optional[EntropyService] = None
+_entropy_lock = threading.Lock()
+
+
+def get_entropy() -> EntropyService:
+    """Servicio compartido por todo el proceso (``ENTROPY_SEED`` activa el modo determinista)"""
+    global _entropy
+    if _entropy is None:
+        with _entropy_lock:
+            if _entropy is None:
+                _entropy = EntropyService(DEFAULT_SEED)
+                if DEFAULT_SEED is not None:
+                    logger.info(f"🎲 Entropía determinista con semilla {DEFAULT_SEED}")
+    return _entropy
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+🌉 VIGOLEONROCKS - Puente entre hilos WSGI y un bucle asyncio persistente
+Sustituye a ``asyncio.run(...)`` dentro de cada petición, que crea y destruye un
+bucle por petición y rompe la coordinación asíncrona de ``MultimodalAIManager``:
+
+- Uno o pocos bucles de larga vida, cada uno en su hilo; ``submit(coro, timeout)``
+  los usa de forma thread-safe y devuelve un ``concurrent.futures.Future``
+- ``run(...)`` espera el resultado desde el hilo WSGI respetando el deadline de
+  la petición y cancela la corrutina si el cliente se desconecta
+- Cada bucle mide su lag (retraso de un temporizador) para ``/livez``/``/readyz``
+"""
+
+import asyncio
+import logging
+import os
+import select
+import socket
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREADS = int(os.getenv('EVENT_LOOP_THREADS', 2))
+DEFAULT_LAG_INTERVAL = float(os.getenv('EVENT_LOOP_LAG_INTERVAL', 0.25))
+DISCONNECT_POLL_INTERVAL = 0.05
+TIMEOUT_GRACE = 0.05  # margen para que ``wait_for`` venza dentro del bucle antes que el hilo llamante
+
+
+class ClientDisconnected(Exception):
+    """El cliente cerró la conexión antes de que terminara la corrutina"""
+
+
+class _LoopThread:
+    """Un bucle asyncio corriendo en su propio hilo, con medición de lag"""
+
+    def __init__(self, name: str, lag_interval: float):
+        self.name = name
+        self.lag_interval = lag_interval
+        self.loop = asyncio.new_event_loop()
+        self.pending = 0
+        self.lag_s = 0.0
+        self.lag_max_s = 0.0
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=name)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.create_task(self._monitor_lag())
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    async def _monitor_lag(self) -> None:
+        """Retraso con el que despierta un ``sleep``: mide cuánto tiempo bloquea el código síncrono al bucle"""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self.lag_s = max(0.0, time.perf_counter() - start - self.lag_interval)
+            if self.lag_s > self.lag_max_s:
+                self.lag_max_s = self.lag_s
+
+    async def _shutdown(self) -> None:
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def stop(self, timeout: float) -> None:
+        if not self._thread.is_alive():
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+
+class EventLoopBridge:
+    """
+    Bucles asyncio persistentes para código síncrono (vistas Flask)
+
+    Args:
+        threads: Número de bucles/hilos; cada corrutina va al bucle con menos
+            trabajo pendiente. Más de uno evita que una inferencia síncrona
+            dentro de una corrutina bloquee todas las demás
+        lag_interval: Periodo (s) del temporizador que mide el lag de cada bucle
+    """
+
+    def __init__(self, threads: int = DEFAULT_THREADS, lag_interval: float = DEFAULT_LAG_INTERVAL,
+                 name: str = 'vigoleonrocks-loop'):
+        self.threads = max(1, threads)
+        self.lag_interval = lag_interval
+        self.name = name
+        self._loops: List[_LoopThread] = []
+        self._lock = threading.Lock()
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0,
+                          'timeouts': 0, 'disconnects': 0}
+
+    # ----- ciclo de vida -----
+
+    def start(self) -> 'EventLoopBridge':
+        """Arranca los bucles (idempotente; los hilos muertos se sustituyen)"""
+        with self._lock:
+            if len(self._loops) == self.threads and all(lt.is_alive() for lt in self._loops):
+                return self
+            alive = [lt for lt in self._loops if lt.is_alive()]
+            for index in range(len(alive), self.threads):
+                loop_thread = _LoopThread(f"{self.name}-{index}", self.lag_interval)
+                loop_thread.start()
+                alive.append(loop_thread)
+            self._loops = alive
+        logger.info(f"🌉 Puente asyncio activo: {self.threads} bucle(s)")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancela las corrutinas pendientes y detiene los bucles"""
+        with self._lock:
+            loops, self._loops = self._loops, []
+        for loop_thread in loops:
+            loop_thread.stop(timeout)
+
+    @property
+    def loops(self) -> List[asyncio.AbstractEventLoop]:
+        return [lt.loop for lt in self._loops]
+
+    # ----- envío -----
+
+    def submit(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Future:
+        """
+        Programa ``coro`` en el bucle menos cargado y devuelve su ``Future``
+
+        Con ``timeout`` la corrutina se cancela dentro del bucle al vencer (el
+        ``Future`` termina con ``TimeoutError``). ``future.cancel()`` cancela la
+        tarea asyncio subyacente.
+        """
+        if not self._loops:
+            self.start()
+        with self._lock:
+            loop_thread = min(self._loops, key=lambda lt: lt.pending)
+            loop_thread.pending += 1
+            self._counters['submitted'] += 1
+        if timeout is not None:
+            coro = asyncio.wait_for(coro, timeout)
+        try:
+            future = asyncio.run_coroutine_threadsafe(coro, loop_thread.loop)
+        except BaseException:
+            with self._lock:
+                loop_thread.pending -= 1
+            coro.close()
+            raise
+        future.add_done_callback(lambda f: self._finished(loop_thread, f))
+        return future
+
+    def _finished(self, loop_thread: _LoopThread, future: Future) -> None:
+        with self._lock:
+            loop_thread.pending -= 1
+            if future.cancelled():
+                self._counters['cancelled'] += 1
+            elif isinstance(future.exception(), (TimeoutError, asyncio.TimeoutError)):
+                self._counters['timeouts'] += 1
+            elif future.exception() is not None:
+                self._counters['failed'] += 1
+            else:
+                self._counters['completed'] += 1
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None,
+            disconnected: Optional[Callable[[], bool]] = None) -> Any:
+        """
+        Ejecuta ``coro`` y bloquea el hilo llamante hasta su resultado
+
+        Args:
+            coro: Corrutina a ejecutar
+            timeout: Segundos; por defecto el tiempo restante del deadline de la
+                petición (control de admisión) o sin límite
+            disconnected: Función que indica si el cliente se fue (ver
+                ``client_disconnect_probe``); se consulta cada 50 ms
+
+        Raises:
+            TimeoutError: vencido el plazo (la corrutina queda cancelada); siempre el
+                ``TimeoutError`` builtin, también en Python < 3.11
+            ClientDisconnected: el cliente cerró la conexión
+        """
+        if timeout is None:
+            from vigoleonrocks.services.admission_control import remaining_time
+            timeout = remaining_time()
+        future = self.submit(coro, timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout + TIMEOUT_GRACE
+        try:
+            while True:
+                wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if disconnected is not None:
+                    wait = DISCONNECT_POLL_INTERVAL if wait is None else min(wait, DISCONNECT_POLL_INTERVAL)
+                try:
+                    return future.result(wait)
+                except (FutureTimeout, asyncio.TimeoutError) as e:
+                    # Hasta 3.10 son clases distintas entre sí y de TimeoutError: se unifican
+                    if future.done():  # venció wait_for dentro del bucle
+                        raise TimeoutError(f"corrutina cancelada tras {timeout:.3f}s") from e
+                    if deadline is not None and time.monotonic() >= deadline:
+                        # el bucle está bloqueado y wait_for no ha podido disparar
+                        future.cancel()
+                        raise TimeoutError(f"corrutina sin terminar tras {timeout:.3f}s")
+                    if disconnected is not None and disconnected():
+                        future.cancel()
+                        with self._lock:
+                            self._counters['disconnects'] += 1
+                        raise ClientDisconnected()
+        except BaseException:
+            future.cancel()  # GeneratorExit/KeyboardInterrupt en el hilo WSGI: no dejar trabajo huérfano
+            raise
+
+    # ----- métricas -----
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            loops = [{'name': lt.name, 'pending': lt.pending,
+                      'lag_ms': round(lt.lag_s * 1000, 3), 'lag_max_ms': round(lt.lag_max_s * 1000, 3)}
+                     for lt in self._loops]
+            counters = dict(self._counters)
+        return {
+            'threads': len(loops),
+            'pending': sum(lt['pending'] for lt in loops),
+            'lag_ms': max((lt['lag_ms'] for lt in loops), default=0.0),
+            'lag_max_ms': max((lt['lag_max_ms'] for lt in loops), default=0.0),
+            'loops': loops,
+            **counters,
+        }
+
+
+def client_disconnect_probe(environ: Dict[str, Any]) -> Optional[Callable[[], bool]]:
+    """
+    Detector de desconexión a partir del socket del servidor WSGI
+    (``werkzeug.socket`` o ``gunicorn.socket``); ``None`` si no está expuesto.
+
+    Un socket legible cuya lectura ``MSG_PEEK`` devuelve ``b''`` es un cliente
+    que cerró; los datos de una siguiente petición keep-alive no cuentan.
+    """
+    sock = environ.get('werkzeug.socket') or environ.get('gunicorn.socket')
+    if sock is None:
+        return None
+
+    def disconnected() -> bool:
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            if not readable:
+                return False
+            return sock.recv(1, socket.MSG_PEEK) == b''
+        except ValueError:
+            return sock.fileno() < 0  # socket cerrado localmente, o TLS sin MSG_PEEK
+        except OSError:
+            return True
+    return disconnected
+
+
+def install_event_loop_bridge(app, bridge: Optional['EventLoopBridge'] = None) -> 'EventLoopBridge':
+    """Expone el puente en ``app.extensions['vigoleonrocks_event_loop']`` (lo usa el probe de lag)"""
+    bridge = (bridge or get_event_loop_bridge()).start()
+    app.extensions['vigoleonrocks_event_loop'] = bridge
+    return bridge
+
+
+_bridge: Optional[EventLoopBridge] = None
+_bridge_lock = threading.Lock()
+
+
+def get_event_loop_bridge(start: bool = True) -> EventLoopBridge:
+    """Puente compartido por todo el proceso"""
+    global _bridge
+    if _bridge is None:
+        with _bridge_lock:
+            if _bridge is None:
+                _bridge = EventLoopBridge()
+    if start:
+        _bridge.start()
+    return _bridge
+
+
+def run_coroutine(coro: Awaitable[Any], timeout: Optional[float] = None,
+                  environ: Optional[Dict[str, Any]] = None) -> Any:
+    """Sustituto de ``asyncio.run`` para vistas síncronas; cancela si el cliente se desconecta"""
+    probe = client_disconnect_probe(environ) if environ is not None else None
+    return get_event_loop_bridge().run(coro, timeout=timeout, disconnected=probe)
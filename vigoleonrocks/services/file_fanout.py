@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+🗃️ VIGOLEONROCKS - Procesamiento concurrente de archivos por petición
+``/api/process`` recibe varios archivos y los analizaba uno detrás de otro:
+una petición con 10 archivos tardaba la suma de todos. Este servicio reparte
+los archivos de una petición en un pool compartido:
+
+- Límite de concurrencia por petición (``FANOUT_CONCURRENCY``): una petición
+  grande no acapara el pool entero
+- Plazo por archivo (``FANOUT_FILE_DEADLINE``) contado desde que empieza a
+  procesarse; al vencer, ese archivo devuelve un error y la petición sigue
+- Resultados en orden de finalización (para respuestas NDJSON en streaming)
+  o en el orden de entrada (respuesta JSON agregada de siempre)
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv('FANOUT_WORKERS', 8))
+DEFAULT_CONCURRENCY = int(os.getenv('FANOUT_CONCURRENCY', 4))
+DEFAULT_FILE_DEADLINE = float(os.getenv('FANOUT_FILE_DEADLINE', 30))
+_QUEUED_POLL = 0.05  # s entre comprobaciones mientras hay archivos en cola del pool
+
+
+@dataclass
+class FileTask:
+    """Archivo ya leído de la petición, pendiente de análisis"""
+    index: int
+    filename: str
+    category: str
+    data: bytes = field(repr=False)
+    error: Optional[str] = None  # rechazado en la ingesta: se informa sin analizarlo
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+@dataclass
+class FileResult:
+    """Resultado de un archivo: ``analysis`` del manejador o ``error``"""
+    task: FileTask
+    analysis: Dict[str, Any]
+    elapsed_ms: float
+    timed_out: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Forma de ``files_processed`` en la respuesta de ``/api/process``"""
+        return {'filename': self.task.filename, 'category': self.task.category,
+                'size': self.task.size, 'analysis': self.analysis}
+
+
+class FileFanOut:
+    """
+    Reparte los archivos de cada petición en un pool de hilos compartido
+
+    Args:
+        workers: Hilos del pool compartido por todas las peticiones
+        concurrency: Archivos de una misma petición en curso a la vez
+        file_deadline: Segundos máximos por archivo (0 = sin plazo)
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, concurrency: int = DEFAULT_CONCURRENCY,
+                 file_deadline: float = DEFAULT_FILE_DEADLINE):
+        self.concurrency = max(1, concurrency)
+        self.file_deadline = file_deadline
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='file-fanout')
+        self.counters = {'requests': 0, 'files': 0, 'errors': 0, 'timeouts': 0}
+
+    @staticmethod
+    def _run(handler: Callable[[FileTask], Dict[str, Any]], task: FileTask,
+             started: List[float]) -> Tuple[Dict[str, Any], float]:
+        # El plazo cuenta desde aquí, no desde el submit: con el pool compartido
+        # lleno, un archivo puede pasar un buen rato en la cola sin empezar
+        started.append(time.monotonic())
+        t0 = time.perf_counter()
+        try:
+            analysis = handler(task)
+        except Exception as e:
+            logger.error(f"Error procesando {task.filename}: {e}")
+            analysis = {'error': str(e), 'filename': task.filename}
+        return analysis, (time.perf_counter() - t0) * 1000
+
+    def iter_completed(self, tasks: Sequence[FileTask], handler: Callable[[FileTask], Dict[str, Any]],
+                       concurrency: Optional[int] = None,
+                       file_deadline: Optional[float] = None) -> Iterator[FileResult]:
+        """Resultados según van terminando; como mucho ``concurrency`` archivos en curso"""
+        limit = max(1, concurrency or self.concurrency)
+        deadline_s = self.file_deadline if file_deadline is None else file_deadline
+        pending = list(reversed(tasks))
+        inflight: Dict[Future, Tuple[FileTask, List[float]]] = {}
+        self.counters['requests'] += 1
+
+        try:
+            while pending or inflight:
+                while pending and len(inflight) < limit:
+                    task = pending.pop()
+                    if task.error is not None:
+                        self.counters['files'] += 1
+                        self.counters['errors'] += 1
+                        yield FileResult(task, {'error': task.error, 'filename': task.filename}, 0.0)
+                        continue
+                    started: List[float] = []
+                    inflight[self._executor.submit(self._run, handler, task, started)] = (task, started)
+                timeout = None
+                if deadline_s > 0 and inflight:
+                    now = time.monotonic()
+                    running = [s[0] for _, s in inflight.values() if s]
+                    timeout = max(0.0, min(running) + deadline_s - now) if running else deadline_s
+                    if len(running) < len(inflight):
+                        # Alguno sigue en cola: se vuelve a mirar pronto para arrancar su plazo a tiempo
+                        timeout = min(timeout, _QUEUED_POLL)
+                done, _ = wait(inflight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task, _ = inflight.pop(future)
+                    analysis, elapsed_ms = future.result()
+                    self.counters['files'] += 1
+                    if 'error' in analysis:
+                        self.counters['errors'] += 1
+                    yield FileResult(task, analysis, elapsed_ms)
+                if deadline_s > 0:
+                    now = time.monotonic()
+                    for future, (task, started) in list(inflight.items()):
+                        if started and now - started[0] >= deadline_s and not future.done():
+                            # Un hilo en marcha no se puede interrumpir: termina por su cuenta
+                            # y se descarta; la petición libera su hueco y sigue con el resto
+                            future.cancel()
+                            inflight.pop(future)
+                            self.counters['files'] += 1
+                            self.counters['timeouts'] += 1
+                            logger.warning(f"⏱️ {task.filename} superó el plazo de {deadline_s:g}s")
+                            yield FileResult(task, {'error': f'Deadline exceeded ({deadline_s:g}s)',
+                                                    'filename': task.filename},
+                                             (now - started[0]) * 1000, timed_out=True)
+        finally:
+            # Cliente desconectado a mitad del streaming: lo que sigue en cola no llega a ejecutarse
+            for future in inflight:
+                future.cancel()
+
+    def process_all(self, tasks: Sequence[FileTask], handler: Callable[[FileTask], Dict[str, Any]],
+                    concurrency: Optional[int] = None,
+                    file_deadline: Optional[float] = None) -> List[FileResult]:
+        """Todos los resultados, en el orden de entrada"""
+        results = list(self.iter_completed(tasks, handler, concurrency, file_deadline))
+        return sorted(results, key=lambda r: r.task.index)
+
+    def shutdown(self) -> None:
+        if sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        else:  # sin cancel_futures; lo encolado por peticiones vivas ya se cancela en iter_completed
+            self._executor.shutdown(wait=False)
+
+
+_fanout: Optional[FileFanOut] = None
+_fanout_lock = threading.Lock()
+
+
+def get_file_fanout() -> FileFanOut:
+    """Pool compartido por todas las peticiones del proceso"""
+    global _fanout
+    if _fanout is None:
+        with _fanout_lock:
+            if _fanout is None:
+                _fanout = FileFanOut()
+    return _fanout
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+🩺 VIGOLEONROCKS - Probes de liveness, readiness y startup
+Registro de comprobaciones de componentes detrás de ``/livez``, ``/readyz`` y
+``/startupz``:
+
+- Cada comprobación declara a qué probes pertenece, si es crítica y su TTL;
+  el resultado se cachea para que los probes frecuentes sean baratos
+- Se ejecutan en hilos propios con timeout: un singleton bloqueado da un
+  fallo "stuck" en vez de colgar el probe (y no se encolan más ejecuciones)
+- Fase de warmup: consultas representativas por cada motor antes de que
+  ``/readyz`` pase a 200, para que los primeros usuarios no paguen el arranque en frío
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROBES = ('livez', 'readyz', 'startupz')
+
+CheckOutcome = Tuple[bool, Any]
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """Resultado inmutable de una comprobación"""
+    name: str
+    ok: bool
+    critical: bool
+    detail: Any
+    latency_ms: float
+    checked_at: float
+
+    def as_dict(self, now: Optional[float] = None) -> Dict[str, Any]:
+        data = asdict(self)
+        data['age_s'] = round((now or time.monotonic()) - self.checked_at, 3)
+        del data['checked_at'], data['name']
+        return data
+
+
+@dataclass
+class ComponentCheck:
+    """
+    Comprobación registrada
+
+    ``func`` devuelve ``(ok, detalle)``; una excepción cuenta como fallo.
+    """
+    name: str
+    func: Callable[[], CheckOutcome]
+    probes: FrozenSet[str] = frozenset({'readyz'})
+    critical: bool = True
+    ttl: float = 5.0
+    timeout: float = 2.0
+    _cached: Optional[CheckResult] = field(default=None, repr=False)
+    _running: Optional[Future] = field(default=None, repr=False)
+    _started: float = field(default=0.0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+@dataclass
+class WarmupTask:
+    name: str
+    func: Callable[[], Any]
+    critical: bool = True
+    status: str = 'pending'      # pending | running | ok | failed
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class HealthRegistry:
+    """Registro de comprobaciones y estado de warmup"""
+
+    def __init__(self, max_workers: int = 4, clock=time.monotonic):
+        self._checks: Dict[str, ComponentCheck] = {}
+        self._warmup: List[WarmupTask] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='health-check')
+        self._clock = clock
+        self._started_at = clock()
+        self._warmup_done = threading.Event()
+        self._warmup_thread: Optional[threading.Thread] = None
+
+    # ----- registro -----
+
+    def register(self, name: str, func: Callable[[], CheckOutcome], probes: Iterable[str] = ('readyz',),
+                 critical: bool = True, ttl: float = 5.0, timeout: float = 2.0) -> ComponentCheck:
+        unknown = set(probes) - set(PROBES)
+        if unknown:
+            raise ValueError(f"Probes desconocidos: {sorted(unknown)}")
+        check = ComponentCheck(name, func, frozenset(probes), critical, ttl, timeout)
+        self._checks[name] = check
+        return check
+
+    def add_warmup(self, name: str, func: Callable[[], Any], critical: bool = True) -> None:
+        self._warmup.append(WarmupTask(name, func, critical))
+
+    # ----- ejecución -----
+
+    def run_check(self, name: str) -> CheckResult:
+        """Resultado cacheado si sigue vigente; si no, ejecuta con timeout"""
+        check = self._checks[name]
+        now = self._clock()
+        cached = check._cached
+        if cached is not None and now - cached.checked_at < check.ttl:
+            return cached
+        with check._lock:
+            cached = check._cached
+            if cached is not None and self._clock() - cached.checked_at < check.ttl:
+                return cached  # otro probe la refrescó mientras esperábamos
+            if check._running is not None and not check._running.done():
+                stuck_for = self._clock() - check._started
+                return self._store(check, False, f"stuck: ejecución anterior lleva {stuck_for:.1f}s", stuck_for)
+            check._started = self._clock()
+            check._running = self._executor.submit(check.func)
+            try:
+                ok, detail = check._running.result(timeout=check.timeout)
+            except FutureTimeout:
+                ok, detail = False, f"timeout tras {check.timeout:.1f}s"
+            except Exception as e:
+                ok, detail = False, f"{type(e).__name__}: {e}"
+            return self._store(check, bool(ok), detail, self._clock() - check._started)
+
+    def _store(self, check: ComponentCheck, ok: bool, detail: Any, elapsed: float) -> CheckResult:
+        result = CheckResult(check.name, ok, check.critical, detail, round(elapsed * 1000, 3), self._clock())
+        check._cached = result
+        if not ok:
+            logger.warning(f"⚠️ Health check '{check.name}' falló: {detail}")
+        return result
+
+    def probe(self, kind: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Evalúa un probe
+
+        Returns:
+            (ok, informe); ``ok`` es False si falla alguna comprobación crítica
+            del probe o, para readyz/startupz, si el warmup no ha terminado
+        """
+        if kind not in PROBES:
+            raise ValueError(f"Probe desconocido: {kind}")
+        now = self._clock()
+        report: Dict[str, Any] = {'probe': kind}
+        ok = True
+        if kind == 'startupz':
+            ok = self.warmup_complete and self.warmup_succeeded
+        else:
+            checks = {}
+            for name, check in self._checks.items():
+                if kind in check.probes:
+                    result = self.run_check(name)
+                    checks[name] = result.as_dict(self._clock())
+                    ok = ok and (result.ok or not result.critical)
+            report['checks'] = checks
+            if kind == 'readyz' and not (self.warmup_complete and self.warmup_succeeded):
+                ok = False
+        if kind != 'livez':
+            report['warmup'] = self.warmup_status()
+        report['status'] = 'ok' if ok else 'fail'
+        report['uptime_s'] = round(now - self._started_at, 3)
+        return ok, report
+
+    # ----- warmup -----
+
+    @property
+    def warmup_complete(self) -> bool:
+        return self._warmup_done.is_set()
+
+    @property
+    def warmup_succeeded(self) -> bool:
+        return all(task.status == 'ok' or not task.critical for task in self._warmup)
+
+    def run_warmup(self) -> bool:
+        """Ejecuta las tareas de warmup en orden; devuelve si todas las críticas pasaron"""
+        for task in self._warmup:
+            task.status = 'running'
+            start = self._clock()
+            try:
+                task.func()
+                task.status = 'ok'
+            except Exception as e:
+                task.status = 'failed'
+                task.error = f"{type(e).__name__}: {e}"
+                logger.warning(f"⚠️ Warmup '{task.name}' falló: {task.error}")
+            task.duration_ms = round((self._clock() - start) * 1000, 3)
+        # los checks cacheados antes del warmup no reflejan el estado actual
+        for check in self._checks.values():
+            check._cached = None
+        self._warmup_done.set()
+        logger.info(f"✅ Warmup completado ({len(self._warmup)} tareas, "
+                    f"{'OK' if self.warmup_succeeded else 'con fallos'})")
+        return self.warmup_succeeded
+
+    def start_warmup(self) -> threading.Thread:
+        """Lanza el warmup en un hilo daemon (idempotente)"""
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(target=self.run_warmup, daemon=True, name='HealthWarmup')
+            self._warmup_thread.start()
+        return self._warmup_thread
+
+    def warmup_status(self) -> Dict[str, Any]:
+        return {
+            'complete': self.warmup_complete,
+            'succeeded': self.warmup_succeeded,
+            'tasks': {task.name: {'status': task.status, 'critical': task.critical,
+                                  'duration_ms': task.duration_ms, 'error': task.error}
+                      for task in self._warmup},
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+# ===== COMPROBACIONES REUTILIZABLES =====
+
+def coherence_round_trip_check(max_latency: float = 0.25) -> Callable[[], CheckOutcome]:
+    """Cálculo real con el motor de coherencia: detecta singletons bloqueados o corruptos"""
+    def check() -> CheckOutcome:
+        from vigoleonrocks.core.quantum_coherence_engine import get_quantum_coherence_engine
+        start = time.perf_counter()
+        result = get_quantum_coherence_engine().calculate_quantum_coherence([1, 2, 3, 5, 8], 0.5, 5, 128)
+        elapsed = time.perf_counter() - start
+        coherence = result.get('primary_coherence')
+        ok = isinstance(coherence, (int, float)) and 0 < coherence <= 100 and elapsed <= max_latency
+        return ok, {'primary_coherence': coherence, 'round_trip_ms': round(elapsed * 1000, 3)}
+    return check
+
+
+def cache_round_trip_check(get_cache: Callable[[], Any]) -> Callable[[], CheckOutcome]:
+    """Escritura, lectura y borrado de una clave centinela en el cache de la app"""
+    def check() -> CheckOutcome:
+        cache = get_cache()
+        if cache is None:
+            return True, 'cache deshabilitado'
+        key = f"vigoleonrocks:healthz:{threading.get_ident()}"
+        token = f"{time.time_ns()}"
+        cache.set(key, token, timeout=30)
+        value = cache.get(key)
+        cache.delete(key)
+        return value == token, 'read/write OK' if value == token else f"leído {value!r}"
+    return check
+
+
+def model_manager_check(module_name: str = 'multimodal_ai_manager',
+                        instance_name: str = 'multimodal_manager') -> Callable[[], CheckOutcome]:
+    """
+    Estado del gestor de modelos sin forzar su carga
+
+    Si aún no se ha creado (carga diferida) no hay nada que comprobar; si existe,
+    falla cuando algún modelo habilitado registró un error de carga.
+    """
+    def check() -> CheckOutcome:
+        module = sys.modules.get(module_name)
+        manager = getattr(module, instance_name, None) if module else None
+        if manager is None:
+            return True, 'no inicializado (carga diferida)'
+        errors = dict(getattr(manager, 'load_errors', {}) or {})
+        enabled = {k for k, v in manager.model_configs.items() if v.enabled}
+        failed = {k: v for k, v in errors.items() if k in enabled}
+        return not failed, {'models_loaded': sorted(manager.models), 'load_errors': failed}
+    return check
+
+
+class CountingThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor que cuenta sus tareas en cola y en ejecución
+
+    ``thread_pool_check`` lee ``queued``/``running``/``max_workers`` en lugar de
+    los atributos privados de ``ThreadPoolExecutor``. Una tarea cancelada antes
+    de empezar sale de la cola por el callback de su futuro.
+    """
+
+    def __init__(self, max_workers: int, **kwargs):
+        super().__init__(max_workers=max_workers, **kwargs)
+        self.max_workers = max_workers
+        self.queued = 0
+        self.running = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self._count_lock:
+            self.queued += 1
+        try:
+            future = super().submit(self._run, fn, args, kwargs)
+        except BaseException:
+            with self._count_lock:
+                self.queued -= 1
+            raise
+        future.add_done_callback(self._dequeue_cancelled)
+        return future
+
+    def _run(self, fn, args, kwargs):
+        with self._count_lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._count_lock:
+                self.running -= 1
+
+    def _dequeue_cancelled(self, future: Future) -> None:
+        if future.cancelled():
+            with self._count_lock:
+                self.queued -= 1
+
+
+def thread_pool_check(in_flight: Callable[[], int], workers: int, max_saturation: float = 0.9,
+                      executors: Callable[[], Dict[str, CountingThreadPoolExecutor]] = dict
+                      ) -> Callable[[], CheckOutcome]:
+    """
+    Saturación de los hilos del servidor y de los ``CountingThreadPoolExecutor`` indicados
+
+    La propia petición del probe ocupa un hilo, por eso se descuenta.
+    """
+    def check() -> CheckOutcome:
+        busy = max(0, in_flight() - 1)
+        saturation = busy / workers if workers else 0.0
+        detail: Dict[str, Any] = {'server_busy': busy, 'server_workers': workers,
+                                  'saturation': round(saturation, 3)}
+        ok = saturation < max_saturation
+        for name, executor in executors().items():
+            backlog = executor.queued
+            detail[name] = {'backlog': backlog, 'running': executor.running, 'max_workers': executor.max_workers}
+            ok = ok and backlog <= executor.max_workers
+        return ok, detail
+    return check
+
+
+def event_loop_lag_check(get_loop: Callable[[], Any], max_lag: float = 0.1) -> Callable[[], CheckOutcome]:
+    """Tiempo que tarda un callback en ejecutarse en los bucles asyncio en segundo plano (un bucle o una lista)"""
+    def check() -> CheckOutcome:
+        loops = get_loop()
+        if loops is not None and not isinstance(loops, (list, tuple)):
+            loops = [loops]
+        loops = [loop for loop in loops or () if not loop.is_closed()]
+        if not loops:
+            return True, 'sin bucle de eventos'
+        events = []
+        start = time.perf_counter()
+        for loop in loops:
+            ran = threading.Event()
+            loop.call_soon_threadsafe(ran.set)
+            events.append(ran)
+        if not all(ran.wait(max(1.0, max_lag * 10)) for ran in events):
+            return False, 'el bucle no ejecuta callbacks'
+        lag = time.perf_counter() - start
+        return lag <= max_lag, {'lag_ms': round(lag * 1000, 3), 'loops': len(loops)}
+    return check
+
+
+def install_health_probes(app, registry: HealthRegistry) -> HealthRegistry:
+    """Registra ``/livez``, ``/readyz`` y ``/startupz`` (200 si OK, 503 si no)"""
+    from flask import jsonify
+
+    def make_view(kind):
+        def view():
+            ok, report = registry.probe(kind)
+            response = jsonify(report)
+            response.status_code = 200 if ok else 503
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+        view.__name__ = f"probe_{kind}"
+        return view
+
+    for kind in PROBES:
+        app.add_url_rule(f"/{kind}", endpoint=f"probe_{kind}", view_func=make_view(kind))
+    app.extensions['vigoleonrocks_health'] = registry
+    return registry
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+📊 VIGOLEONROCKS - Histograma de latencias fusionable
+Histograma logarítmico con error relativo acotado, compartido por el generador
+de carga (latencias por ejecución y por ruta) y por las trazas (agregados por
+span):
+
+- Cuantiles con error relativo de como mucho ``precision`` y memoria
+  proporcional al rango de valores, no al número de observaciones
+- Fusionable entre bucles, procesos o ejecuciones (``merge`` / ``to_dict`` /
+  ``from_dict``)
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+DEFAULT_PRECISION = 0.01  # error relativo de los histogramas
+
+
+class LatencyHistogram:
+    """
+    Histograma logarítmico fusionable (estilo HDR)
+
+    El bucket ``i`` cubre ``[lowest·g^i, lowest·g^(i+1))`` con ``g = 1 + 2·precision``
+    y se representa por su punto medio, así que cualquier cuantil tiene un error
+    relativo de como mucho ``precision``. Dos histogramas con la misma
+    configuración se suman bucket a bucket. No es thread-safe: cada bucle de
+    eventos registra en el suyo y se fusionan al final.
+    """
+
+    def __init__(self, precision: float = DEFAULT_PRECISION, lowest: float = 0.01):
+        if not 0 < precision < 0.5:
+            raise ValueError("precision debe estar en (0, 0.5)")
+        self.precision = precision
+        self.lowest = lowest
+        self._log_growth = math.log1p(2 * precision)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return int(math.log(value / self.lowest) / self._log_growth)
+
+    def _value(self, index: int) -> float:
+        return self.lowest * math.exp(index * self._log_growth) * (1 + self.precision)
+
+    def record(self, value: float, count: int = 1) -> None:
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        if (other.precision, other.lowest) != (self.precision, self.lowest):
+            raise ValueError("solo se fusionan histogramas con la misma precisión y mínimo")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank, seen = max(1, math.ceil(q * self.count)), 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def count_above(self, value: float) -> int:
+        """Observaciones en buckets por encima del de ``value`` (aproximado)"""
+        threshold = self._index(value)
+        return sum(count for index, count in self.counts.items() if index > threshold)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        def r(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            'count': self.count,
+            'mean': r(self.mean),
+            'min': r(self.min) if self.count else None,
+            'p50': r(self.quantile(0.50)),
+            'p90': r(self.quantile(0.90)),
+            'p95': r(self.quantile(0.95)),
+            'p99': r(self.quantile(0.99)),
+            'p999': r(self.quantile(0.999)),
+            'max': r(self.max) if self.count else None,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'precision': self.precision, 'lowest': self.lowest, 'sum': self.sum,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None,
+                'counts': {str(i): c for i, c in sorted(self.counts.items())}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        hist = cls(data['precision'], data['lowest'])
+        hist.counts = {int(i): c for i, c in data['counts'].items()}
+        hist.count = sum(hist.counts.values())
+        hist.sum = data['sum']
+        if hist.count:
+            hist.min, hist.max = data['min'], data['max']
+        return hist
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+🗂️ VIGOLEONROCKS - Historial de interacciones acotado
+Buffer circular de capacidad fija para las interacciones recientes y registro
+opcional append-only en segmentos JSONL rotados para historial duradero.
+
+- Memoria constante: el buffer nunca crece más allá de ``capacity``
+- Escritura O(1) por interacción, sin copias de listas
+- Consultas paginadas y filtrables por rango de tiempo, idioma y perfil
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+TimeBound = Union[None, float, int, str, datetime]
+
+READ_BLOCK_BYTES = 64 * 1024  # bloque de lectura hacia atrás en los segmentos
+
+
+def _to_epoch(value: TimeBound) -> Optional[float]:
+    """Normaliza límites de tiempo (epoch, ISO 8601 o datetime) a epoch"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+@dataclass
+class HistoryQuery:
+    """Filtros y paginación de una consulta al historial"""
+    since: Optional[float] = None
+    until: Optional[float] = None
+    language: Optional[str] = None
+    profile: Optional[str] = None
+    offset: int = 0
+    limit: int = 10
+
+    def matches(self, ts: float, record: Dict[str, Any]) -> bool:
+        if self.since is not None and ts < self.since:
+            return False
+        if self.until is not None and ts > self.until:
+            return False
+        if self.language and record.get('language') != self.language:
+            return False
+        if self.profile and record.get('profile') != self.profile:
+            return False
+        return True
+
+
+@dataclass
+class HistoryPage:
+    """Página de resultados; ``items`` en orden cronológico"""
+    items: List[Dict[str, Any]]
+    total: int
+    offset: int
+    limit: int
+    source: str = 'memory'
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset + len(self.items) < self.total
+
+
+def _paginate(matches_newest_first: Iterator[Dict[str, Any]], query: HistoryQuery) -> Tuple[List[Dict[str, Any]], int]:
+    """Recorre coincidencias de la más reciente a la más antigua y corta la página"""
+    page: List[Dict[str, Any]] = []
+    total = 0
+    for record in matches_newest_first:
+        if query.offset <= total < query.offset + query.limit:
+            page.append(record)
+        total += 1
+    page.reverse()
+    return page, total
+
+
+def _lines_reversed(f, block_size: int = READ_BLOCK_BYTES) -> Iterator[bytes]:
+    """Líneas de un archivo binario de la última a la primera, leyendo bloques desde el final"""
+    position = f.seek(0, os.SEEK_END)
+    partial = b''
+    while position > 0:
+        step = min(block_size, position)
+        position -= step
+        f.seek(position)
+        lines = (f.read(step) + partial).split(b'\n')
+        partial = lines[0]  # puede empezar en el bloque anterior
+        for line in reversed(lines[1:]):
+            if line:
+                yield line
+    if partial:
+        yield partial
+
+
+class InteractionRingBuffer:
+    """Buffer circular thread-safe de capacidad fija"""
+
+    def __init__(self, capacity: int = 1000):
+        if capacity <= 0:
+            raise ValueError("capacity debe ser positiva")
+        self.capacity = capacity
+        self._slots: List[Optional[Tuple[float, Dict[str, Any]]]] = [None] * capacity
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def append(self, ts: float, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._slots[self._next] = (ts, record)
+            self._next = (self._next + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def oldest_timestamp(self) -> Optional[float]:
+        with self._lock:
+            if self._size == 0:
+                return None
+            entry = self._slots[(self._next - self._size) % self.capacity]
+            return entry[0] if entry else None
+
+    def iter_newest_first(self) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Itera sobre una instantánea (sin mantener el lock durante el recorrido)"""
+        with self._lock:
+            next_slot, size = self._next, self._size
+            entries = [self._slots[(next_slot - 1 - i) % self.capacity] for i in range(size)]
+        for entry in entries:
+            if entry is not None:
+                yield entry
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Registros en orden cronológico"""
+        records = [record for _, record in self.iter_newest_first()]
+        records.reverse()
+        return records
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._next = 0
+            self._size = 0
+
+
+class SegmentedJsonlLog:
+    """Registro append-only en segmentos JSONL con rotación por tamaño"""
+
+    SEGMENT_PREFIX = 'history-'
+    SEGMENT_SUFFIX = '.jsonl'
+
+    def __init__(self, directory: Union[str, Path], segment_max_bytes: int = 8 * 1024 * 1024,
+                 max_segments: Optional[int] = 16, fsync: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self.fsync = fsync
+        self._lock = threading.Lock()
+
+        segments = self.segments()
+        self._segment_index = self._index_of(segments[-1]) if segments else 1
+        self._file = open(self._segment_path(self._segment_index), 'ab')
+        self._bytes = self._file.tell()
+
+    def _segment_path(self, index: int) -> Path:
+        return self.directory / f"{self.SEGMENT_PREFIX}{index:06d}{self.SEGMENT_SUFFIX}"
+
+    def _index_of(self, path: Path) -> int:
+        return int(path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)])
+
+    def segments(self) -> List[Path]:
+        """Segmentos existentes, del más antiguo al más reciente"""
+        return sorted(self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"))
+
+    def append(self, ts: float, record: Dict[str, Any]) -> None:
+        line = json.dumps({'ts': ts, **record}, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        with self._lock:
+            if self._bytes and self._bytes + len(line) > self.segment_max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._bytes += len(line)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._segment_index += 1
+        self._file = open(self._segment_path(self._segment_index), 'ab')
+        self._bytes = 0
+        if self.max_segments:
+            for old in self.segments()[:-self.max_segments]:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+
+    def iter_newest_first(self) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Recorre los segmentos desde el final en bloques: una página no carga segmentos enteros"""
+        with self._lock:
+            self._file.flush()
+            segments = self.segments()
+        for segment in reversed(segments):
+            try:
+                f = open(segment, 'rb')
+            except FileNotFoundError:
+                continue  # rotado mientras leíamos
+            with f:
+                for raw in _lines_reversed(f):
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        continue  # línea truncada por una caída
+                    yield record.pop('ts', 0.0), record
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class InteractionHistory:
+    """Historial de interacciones: buffer circular + registro duradero opcional"""
+
+    def __init__(self, capacity: int = 1000, log_dir: Optional[Union[str, Path]] = None,
+                 segment_max_bytes: int = 8 * 1024 * 1024, max_segments: Optional[int] = 16):
+        self.buffer = InteractionRingBuffer(capacity)
+        self.log = SegmentedJsonlLog(log_dir, segment_max_bytes, max_segments) if log_dir else None
+        self.total_recorded = 0
+        self._counter_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, default_capacity: int = 1000) -> 'InteractionHistory':
+        """Configura desde INTERACTION_HISTORY_CAPACITY / INTERACTION_HISTORY_DIR"""
+        return cls(
+            capacity=int(os.getenv('INTERACTION_HISTORY_CAPACITY', default_capacity)),
+            log_dir=os.getenv('INTERACTION_HISTORY_DIR') or None,
+            segment_max_bytes=int(os.getenv('INTERACTION_HISTORY_SEGMENT_BYTES', 8 * 1024 * 1024)),
+            max_segments=int(os.getenv('INTERACTION_HISTORY_MAX_SEGMENTS', 16)),
+        )
+
+    def record(self, interaction: Dict[str, Any], ts: Optional[float] = None) -> None:
+        ts = time.time() if ts is None else ts
+        self.buffer.append(ts, interaction)
+        if self.log is not None:
+            self.log.append(ts, interaction)
+        with self._counter_lock:
+            self.total_recorded += 1
+
+    # Compatibilidad con el uso previo como lista
+    append = record
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.query(limit=limit).items
+
+    def query(self, since: TimeBound = None, until: TimeBound = None, language: Optional[str] = None,
+              profile: Optional[str] = None, offset: int = 0, limit: int = 10,
+              durable: Optional[bool] = None) -> HistoryPage:
+        """
+        Consulta paginada (página 0 = más recientes)
+
+        Args:
+            since/until: Rango de tiempo (epoch, ISO 8601 o datetime)
+            language/profile: Filtros exactos
+            offset/limit: Paginación sobre las coincidencias, de la más reciente a la más antigua
+            durable: Fuerza (True) o evita (False) el registro en disco; por defecto se usa
+                     sólo si el rango pedido es más antiguo que el buffer en memoria
+        """
+        query = HistoryQuery(_to_epoch(since), _to_epoch(until), language or None, profile or None,
+                             max(0, int(offset)), max(0, int(limit)))
+
+        if durable is None:
+            oldest = self.buffer.oldest_timestamp()
+            evicted = self.total_recorded > len(self.buffer)
+            durable = self.log is not None and evicted and (query.since is None or oldest is None or query.since < oldest)
+            # Sin rango explícito, la memoria basta si la página cabe en ella
+            if durable and query.since is None and query.offset + query.limit <= len(self.buffer):
+                durable = False
+        if durable and self.log is None:
+            durable = False
+
+        source = self.log if durable else self.buffer
+        matches = (record for ts, record in source.iter_newest_first() if query.matches(ts, record))
+        items, total = _paginate(matches, query)
+        return HistoryPage(items, total, query.offset, query.limit, 'disk' if durable else 'memory')
+
+    def clear(self) -> None:
+        self.buffer.clear()
+
+    def close(self) -> None:
+        if self.log is not None:
+            self.log.close()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+📈 VIGOLEONROCKS - Generador de carga en lazo abierto (sin coordinated omission)
+Envía peticiones a un ritmo de llegada objetivo, independiente de lo rápido
+que responda el servidor:
+
+- Perfiles de llegada: constante, Poisson, escalones y rampa lineal
+- asyncio con pool de conexiones HTTP/1.1 keep-alive (sin dependencias);
+  si el pool se agota la petición espera turno y esa espera cuenta
+- Latencia medida desde el instante de envío *previsto*: un servidor lento
+  no frena al generador ni esconde la cola de la distribución
+- Histogramas logarítmicos (``services.histogram``) con error relativo
+  acotado y fusionables entre ejecuciones o procesos
+- Búsqueda automática del máximo throughput sostenible que cumple un SLO
+  (p99 y tasa de errores): crecimiento geométrico y bisección
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .entropy import get_entropy
+from .histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+PROFILES = ('constant', 'poisson', 'step', 'ramp')
+DEFAULT_CONNECTIONS = int(os.getenv('LOAD_GENERATOR_CONNECTIONS', '64'))
+DEFAULT_TIMEOUT = float(os.getenv('LOAD_GENERATOR_TIMEOUT', '10'))
+DEFAULT_MAX_PENDING = int(os.getenv('LOAD_GENERATOR_MAX_PENDING', '10000'))
+_MAX_ERROR_SAMPLES = 20
+
+
+# ----- perfiles de llegada -----
+
+def constant_arrivals(rate: float, duration: float) -> Iterator[float]:
+    for i in range(int(rate * duration)):
+        yield i / rate
+
+
+def poisson_arrivals(rate: float, duration: float, generator) -> Iterator[float]:
+    offset = generator.expovariate(rate)
+    while offset < duration:
+        yield offset
+        offset += generator.expovariate(rate)
+
+
+def step_arrivals(stages: Sequence[Tuple[float, float]]) -> Iterator[float]:
+    start = 0.0
+    for rate, seconds in stages:
+        for offset in constant_arrivals(rate, seconds):
+            yield start + offset
+        start += seconds
+
+
+def ramp_arrivals(start_rate: float, end_rate: float, duration: float) -> Iterator[float]:
+    """Ritmo lineal de ``start_rate`` a ``end_rate``: invierte N(t) = r0·t + a·t²/2"""
+    slope = (end_rate - start_rate) / duration
+    total = start_rate * duration + slope * duration ** 2 / 2
+    for k in range(int(total)):
+        if slope == 0:
+            yield k / start_rate
+        else:
+            yield (math.sqrt(start_rate ** 2 + 2 * slope * k) - start_rate) / slope
+
+
+def parse_stages(spec: str) -> List[Tuple[float, float]]:
+    """``"10:5,20:5,40:10"`` → ``[(10, 5), (20, 5), (40, 10)]`` (rps:segundos)"""
+    stages = []
+    for part in spec.split(','):
+        rate, _, seconds = part.strip().partition(':')
+        try:
+            stages.append((float(rate), float(seconds)))
+        except ValueError:
+            raise ValueError(f"escalón inválido {part!r}: se espera rps:segundos") from None
+    return stages
+
+
+@dataclass
+class LoadProfile:
+    """Cuándo sale cada petición: ``offsets()`` da los instantes previstos en segundos"""
+    kind: str = 'constant'
+    rate: float = 10.0
+    duration: float = 10.0
+    end_rate: Optional[float] = None  # ramp
+    stages: Sequence[Tuple[float, float]] = ()  # step
+    seed: Optional[int] = None  # poisson y mezcla de peticiones
+
+    def __post_init__(self):
+        if self.kind not in PROFILES:
+            raise ValueError(f"perfil desconocido {self.kind!r}; opciones: {', '.join(PROFILES)}")
+        if self.kind == 'step':
+            if not self.stages:
+                raise ValueError("el perfil step necesita escalones (rps:segundos)")
+            self.stages = [tuple(stage) for stage in self.stages]
+            self.duration = sum(seconds for _, seconds in self.stages)
+            self.rate = max(rate for rate, _ in self.stages)
+        if self.kind == 'ramp' and self.end_rate is None:
+            raise ValueError("el perfil ramp necesita end_rate")
+        if self.rate <= 0 or self.duration <= 0:
+            raise ValueError("rate y duration deben ser positivos")
+
+    def generator(self):
+        entropy = get_entropy()
+        return entropy.derive('load-generator', self.seed) if self.seed is not None else entropy.generator()
+
+    def offsets(self, generator=None) -> Iterator[float]:
+        if self.kind == 'constant':
+            return constant_arrivals(self.rate, self.duration)
+        if self.kind == 'poisson':
+            return poisson_arrivals(self.rate, self.duration, generator or self.generator())
+        if self.kind == 'step':
+            return step_arrivals(self.stages)
+        return ramp_arrivals(self.rate, self.end_rate, self.duration)
+
+    @property
+    def offered_rate(self) -> float:
+        """Ritmo medio previsto"""
+        if self.kind == 'step':
+            return sum(rate * seconds for rate, seconds in self.stages) / self.duration
+        if self.kind == 'ramp':
+            return (self.rate + self.end_rate) / 2
+        return self.rate
+
+    def describe(self) -> str:
+        if self.kind == 'step':
+            return 'step ' + ' → '.join(f"{rate:g} rps×{seconds:g}s" for rate, seconds in self.stages)
+        if self.kind == 'ramp':
+            return f"ramp {self.rate:g}→{self.end_rate:g} rps over {self.duration:g}s"
+        return f"{self.kind} {self.rate:g} rps for {self.duration:g}s"
+
+
+# ----- peticiones -----
+
+@dataclass
+class RequestSpec:
+    """Petición de la mezcla; ``weight`` es su peso relativo"""
+    method: str = 'GET'
+    path: str = '/'
+    body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    weight: float = 1.0
+    name: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return self.name or f"{self.method} {self.path}"
+
+    @classmethod
+    def json(cls, path: str, payload: Any, method: str = 'POST', **kwargs) -> 'RequestSpec':
+        headers = {'Content-Type': 'application/json', **kwargs.pop('headers', {})}
+        return cls(method, path, json.dumps(payload).encode(), headers, **kwargs)
+
+
+def parse_request(spec: str) -> RequestSpec:
+    """``"GET /api/status"`` o ``"POST /api/vigoleonrocks {\\"text\\": \\"hola\\"}"``"""
+    method, _, rest = spec.strip().partition(' ')
+    path, _, body = rest.strip().partition(' ')
+    if not path.startswith('/'):
+        raise ValueError(f"petición inválida {spec!r}: se espera 'MÉTODO /ruta [json]'")
+    if body.strip():
+        return RequestSpec.json(path, json.loads(body), method=method.upper())
+    return RequestSpec(method.upper(), path)
+
+
+# ----- cliente HTTP asyncio -----
+
+class AsyncConnectionPool:
+    """Hasta ``size`` conexiones HTTP/1.1 keep-alive; el resto de peticiones espera turno"""
+
+    def __init__(self, target: str, size: int = DEFAULT_CONNECTIONS):
+        parts = urlsplit(target)
+        self.ssl = parts.scheme == 'https'
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.prefix = parts.path.rstrip('/')
+        self.host_header = parts.netloc or self.host
+        self.size = max(1, size)
+        self.opened = 0
+        self._idle: Deque[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            reused = bool(self._idle)
+            for attempt in (0, 1):
+                conn = self._idle.pop() if self._idle else await self._open()
+                try:
+                    status, payload, keep_alive = await self._exchange(conn, method, path, body, headers or {})
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn[1].close()
+                    # Keep-alive cerrada por el servidor entre peticiones: se reintenta una vez
+                    if attempt or not reused:
+                        raise
+                    reused = False
+                    continue
+                except BaseException:
+                    conn[1].close()
+                    raise
+                if keep_alive:
+                    self._idle.append(conn)
+                else:
+                    conn[1].close()
+                return status, payload
+        raise RuntimeError('unreachable')
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+
+    async def _exchange(self, conn, method: str, path: str, body: Optional[bytes],
+                        headers: Dict[str, str]) -> Tuple[int, bytes, bool]:
+        reader, writer = conn
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host_header}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            lines.append(f"Content-Length: {len(body or b'')}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b''))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('connection closed by server')
+        version, status = status_line.split(None, 2)[:2]
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        status_code = int(status)
+        connection = response_headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == b'HTTP/1.1' else connection == 'keep-alive'
+        if 'chunked' in response_headers.get('transfer-encoding', '').lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if not size:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            payload = b''.join(chunks)
+        elif 'content-length' in response_headers:
+            payload = await reader.readexactly(int(response_headers['content-length']))
+        elif status_code in (204, 304) or 100 <= status_code < 200 or method == 'HEAD':
+            payload = b''
+        else:
+            payload, keep_alive = await reader.read(), False
+        return status_code, payload, keep_alive
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+# ----- ejecución -----
+
+def _failed(status: Optional[int]) -> bool:
+    return status is None or status >= 500 or status == 429
+
+
+@dataclass
+class LoadResult:
+    """Resultado de una ejecución; ``merge`` suma ejecuciones paralelas (varios procesos)"""
+    target: str
+    profile: LoadProfile
+    started: float = field(default_factory=time.time)
+    elapsed_s: float = 0.0
+    scheduled: int = 0
+    completed: int = 0
+    errors: int = 0
+    dropped: int = 0
+    connections: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    send_lag: LatencyHistogram = field(default_factory=LatencyHistogram)
+    routes: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    error_samples: List[str] = field(default_factory=list)
+
+    def observe(self, label: str, status: Optional[int], error: Optional[str], latency_ms: float) -> None:
+        self.completed += 1
+        key = str(status) if status is not None else 'error'
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if error is not None or _failed(status):
+            self.errors += 1
+            if len(self.error_samples) < _MAX_ERROR_SAMPLES:
+                self.error_samples.append(f"{label}: {error or status}")
+        self.latency.record(latency_ms)
+        self.routes.setdefault(label, LatencyHistogram(self.latency.precision)).record(latency_ms)
+
+    def merge(self, other: 'LoadResult') -> 'LoadResult':
+        self.elapsed_s = max(self.elapsed_s, other.elapsed_s)
+        for name in ('scheduled', 'completed', 'errors', 'dropped', 'connections'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+        self.latency.merge(other.latency)
+        self.send_lag.merge(other.send_lag)
+        for label, hist in other.routes.items():
+            self.routes.setdefault(label, LatencyHistogram(hist.precision, hist.lowest)).merge(hist)
+        self.error_samples = (self.error_samples + other.error_samples)[:_MAX_ERROR_SAMPLES]
+        return self
+
+    @property
+    def offered_rps(self) -> float:
+        return self.scheduled / self.profile.duration
+
+    @property
+    def achieved_rps(self) -> float:
+        return (self.completed - self.errors) / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return (self.errors + self.dropped) / self.scheduled if self.scheduled else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'target': self.target,
+            'profile': self.profile.describe(),
+            'elapsed_s': round(self.elapsed_s, 3),
+            'scheduled': self.scheduled,
+            'completed': self.completed,
+            'errors': self.errors,
+            'dropped': self.dropped,
+            'error_rate': round(self.error_rate, 4),
+            'offered_rps': round(self.offered_rps, 2),
+            'achieved_rps': round(self.achieved_rps, 2),
+            'connections': self.connections,
+            'statuses': dict(sorted(self.statuses.items())),
+            'latency_ms': self.latency.snapshot(),
+            'send_lag_ms': self.send_lag.snapshot(),
+            'routes': {label: hist.snapshot() for label, hist in sorted(self.routes.items())},
+            'error_samples': list(self.error_samples),
+        }
+
+
+async def run_load_async(target: str, requests: Sequence[RequestSpec], profile: LoadProfile,
+                         connections: int = DEFAULT_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT,
+                         max_pending: int = DEFAULT_MAX_PENDING) -> LoadResult:
+    """
+    Ejecuta ``profile`` contra ``target`` repartiendo las llegadas entre ``requests``
+
+    Cada petición sale en su instante previsto aunque las anteriores no hayan
+    terminado; su latencia es ``fin - previsto``, incluida la espera por una
+    conexión libre y el retraso del propio generador (``send_lag``). Con más de
+    ``max_pending`` peticiones en vuelo las nuevas se descartan (``dropped``) y
+    cuentan como errores.
+    """
+    if not requests:
+        raise ValueError("se necesita al menos una petición")
+    loop = asyncio.get_running_loop()
+    pool = AsyncConnectionPool(target, connections)
+    result = LoadResult(target, profile)
+    generator = profile.generator()
+    weights = [spec.weight for spec in requests]
+    pending = set()
+
+    async def send(spec: RequestSpec, due: float) -> None:
+        status, error = None, None
+        try:
+            status, _ = await asyncio.wait_for(pool.request(spec.method, spec.path, spec.body, spec.headers), timeout)
+        except asyncio.TimeoutError:
+            error = f"timeout after {timeout:g}s"
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            error = f"{type(e).__name__}: {e}"
+        result.observe(spec.label, status, error, (loop.time() - due) * 1000)
+
+    start = loop.time()
+    for offset in profile.offsets(generator):
+        due = start + offset
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        result.send_lag.record(max(0.0, loop.time() - due) * 1000)
+        result.scheduled += 1
+        if len(pending) >= max_pending:
+            result.dropped += 1
+            continue
+        spec = requests[0] if len(requests) == 1 else generator.choices(requests, weights)[0]
+        task = loop.create_task(send(spec, due))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.wait(pending)
+    result.elapsed_s = loop.time() - start
+    result.connections = pool.opened
+    await pool.close()
+    return result
+
+
+def run_load(target: str, requests: Sequence[RequestSpec], profile: LoadProfile, **kwargs) -> LoadResult:
+    """Versión síncrona de ``run_load_async`` (bucle de eventos propio)"""
+    return asyncio.run(run_load_async(target, requests, profile, **kwargs))
+
+
+# ----- búsqueda de capacidad -----
+
+@dataclass
+class SLO:
+    """Objetivo de servicio: cuantil de latencia y presupuesto de errores"""
+    latency_ms: float
+    quantile: float = 0.99
+    max_error_rate: float = 0.01
+
+    def check(self, result: LoadResult) -> Tuple[bool, str]:
+        name = f"p{self.quantile * 100:g}"
+        if result.error_rate > self.max_error_rate:
+            return False, f"error rate {result.error_rate:.2%} > {self.max_error_rate:.2%}"
+        observed = result.latency.quantile(self.quantile)
+        if observed is None:
+            return False, "no responses"
+        if observed > self.latency_ms:
+            return False, f"{name} {observed:.1f} ms > {self.latency_ms:g} ms"
+        lag = result.send_lag.quantile(self.quantile) or 0.0
+        if lag > self.latency_ms / 2:
+            # El generador no llega al ritmo: el resultado mide al cliente, no al servidor
+            return False, f"generator-bound: send lag {name} {lag:.1f} ms"
+        return True, f"{name} {observed:.1f} ms <= {self.latency_ms:g} ms"
+
+
+def find_max_throughput(target: str, requests: Sequence[RequestSpec], slo: SLO, start_rate: float = 10.0,
+                        max_rate: float = 10000.0, step_duration: float = 10.0, kind: str = 'constant',
+                        growth: float = 2.0, precision: float = 0.05, max_trials: int = 20,
+                        cooldown: float = 1.0, connections: int = DEFAULT_CONNECTIONS,
+                        timeout: Optional[float] = None,
+                        on_trial: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Máximo ritmo (rps) que cumple ``slo``
+
+    Multiplica el ritmo por ``growth`` desde ``start_rate`` hasta el primer
+    fallo y después biseca entre el último ritmo que pasó y el que falló hasta
+    que el intervalo sea menor que ``precision`` (relativo). Cada prueba dura
+    ``step_duration``; ``cooldown`` deja al servidor vaciar su cola entre pruebas.
+    """
+    trials: List[Dict[str, Any]] = []
+    timeout = timeout if timeout is not None else max(1.0, slo.latency_ms * 20 / 1000)
+
+    def trial(rate: float) -> bool:
+        profile = LoadProfile(kind, rate, step_duration, seed=len(trials))
+        result = run_load(target, requests, profile, connections=connections, timeout=timeout)
+        passed, reason = slo.check(result)
+        entry = {'rate': round(rate, 3), 'passed': passed, 'reason': reason, **result.summary()}
+        trials.append(entry)
+        logger.info("📈 %.1f rps: %s (%s)", rate, 'PASS' if passed else 'FAIL', reason)
+        if on_trial is not None:
+            on_trial(entry)
+        if cooldown:
+            time.sleep(cooldown)
+        return passed
+
+    passed_rate, failed_rate, rate = 0.0, None, start_rate
+    while rate <= max_rate and len(trials) < max_trials:
+        if not trial(rate):
+            failed_rate = rate
+            break
+        passed_rate, rate = rate, rate * growth
+    if failed_rate is not None:
+        while failed_rate - passed_rate > precision * failed_rate and len(trials) < max_trials:
+            middle = (passed_rate + failed_rate) / 2
+            if trial(middle):
+                passed_rate = middle
+            else:
+                failed_rate = middle
+    return {
+        'max_sustainable_rps': round(passed_rate, 2),
+        'first_failing_rps': round(failed_rate, 2) if failed_rate is not None else None,
+        'saturated': failed_rate is not None,
+        'slo': asdict(slo),
+        'trials': trials,
+    }
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+📦 VIGOLEONROCKS - Micro-batching dinámico de inferencia
+Cola por modelo delante de las llamadas de ``MultimodalAIManager``: agrupa
+peticiones concurrentes hasta ``max_batch_size`` o hasta que la más antigua
+lleva ``max_wait_ms`` esperando, ejecuta una sola pasada del modelo con la
+entrada apilada y reparte cada salida al futuro de su petición.
+
+En CPU una pasada con N imágenes cuesta mucho menos que N pasadas sueltas; el
+precio es, como mucho, ``max_wait_ms`` de espera extra con tráfico bajo.
+Expone histogramas de tamaño de batch, espera en cola y duración de la pasada.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv('MICROBATCH_MAX_SIZE', 8))
+DEFAULT_MAX_WAIT_MS = float(os.getenv('MICROBATCH_MAX_WAIT_MS', 5.0))
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+FORWARD_MS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class Histogram:
+    """Histograma de buckets fijos (límite superior inclusivo, como Prometheus)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.bounds: Tuple[float, ...] = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Límite superior del bucket que contiene el cuantil ``q`` (aproximado)"""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+        rank, seen = q * total, 0
+        for bound, count in zip(self.bounds + (float('inf'),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total, value_sum = list(self.counts), self.count, self.sum
+        labels = [f"{b:g}" for b in self.bounds] + ['+Inf']
+        return {
+            'buckets': dict(zip(labels, counts)),
+            'count': total,
+            'sum': round(value_sum, 3),
+            'mean': round(value_sum / total, 3) if total else 0.0,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+        }
+
+
+def pad_and_stack(items: Sequence[Any], pad_value: Any = 0) -> Tuple[Any, List[int]]:
+    """
+    Rellena secuencias de distinta longitud (primera dimensión) y las apila
+
+    Acepta tensores torch, arrays numpy o listas; devuelve ``(batch, longitudes)``
+    para poder recortar las salidas de cada elemento.
+    """
+    lengths = [len(item) for item in items]
+    longest = max(lengths) if lengths else 0
+    first = items[0] if items else None
+    if type(first).__module__.startswith('torch'):
+        from torch.nn.utils.rnn import pad_sequence
+        return pad_sequence(list(items), batch_first=True, padding_value=pad_value), lengths
+    if type(first).__module__.startswith('numpy'):
+        import numpy as np
+        batch = np.full((len(items), longest) + first.shape[1:], pad_value, dtype=first.dtype)
+        for row, item in enumerate(items):
+            batch[row, :len(item)] = item
+        return batch, lengths
+    return [list(item) + [pad_value] * (longest - len(item)) for item in items], lengths
+
+
+class _Request:
+    __slots__ = ('item', 'future', 'enqueued')
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.future: Future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Cola de micro-batching para un modelo
+
+    Args:
+        name: Nombre del modelo (métricas y nombre del hilo)
+        batch_fn: ``batch_fn(items) -> resultados`` con una salida por entrada,
+            en el mismo orden; corre en el hilo del batcher
+        max_batch_size: Máximo de peticiones por pasada
+        max_wait_ms: Espera máxima de la petición más antigua antes de lanzar
+            un batch incompleto
+    """
+
+    def __init__(self, name: str, batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(WAIT_MS_BUCKETS)
+        self.forward_ms = Histogram(FORWARD_MS_BUCKETS)
+        self.failures = 0
+        self._queue: Deque[_Request] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- envío -----
+
+    def submit_future(self, item: Any) -> Future:
+        """Encola ``item`` y devuelve el ``Future`` con su resultado"""
+        request = _Request(item)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"MicroBatcher {self.name} cerrado")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name=f"batcher-{self.name}")
+                self._thread.start()
+            self._queue.append(request)
+            if len(self._queue) == 1 or len(self._queue) >= self.max_batch_size:
+                self._cond.notify()
+        return request.future
+
+    async def submit(self, item: Any) -> Any:
+        """Versión ``await``-able (válida desde cualquier bucle de eventos)"""
+        return await asyncio.wrap_future(self.submit_future(item))
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit_future(item).result(timeout)
+
+    # ----- hilo del batcher -----
+
+    def _next_batch(self) -> Optional[List[_Request]]:
+        with self._cond:
+            while not self._queue:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            deadline = self._queue[0].enqueued + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            size = min(self.max_batch_size, len(self._queue))
+            return [self._queue.popleft() for _ in range(size)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._execute(batch)
+
+    def _execute(self, batch: List[_Request]) -> None:
+        # las peticiones canceladas mientras esperaban no entran en la pasada
+        live = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        now = time.perf_counter()
+        for request in live:
+            self.queue_wait_ms.observe((now - request.enqueued) * 1000)
+        self.batch_sizes.observe(len(live))
+        try:
+            results = list(self.batch_fn([r.item for r in live]))
+            if len(results) != len(live):
+                raise RuntimeError(f"{self.name}: {len(results)} salidas para {len(live)} entradas")
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Error en batch de {self.name} ({len(live)} peticiones): {e}")
+            for request in live:
+                request.future.set_exception(e)
+            return
+        finally:
+            self.forward_ms.observe((time.perf_counter() - now) * 1000)
+        for request, result in zip(live, results):
+            request.future.set_result(result)
+
+    # ----- ciclo de vida y métricas -----
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Deja de aceptar peticiones; las ya encoladas se procesan antes de salir"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queued': len(self._queue),
+            'failures': self.failures,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait_ms': self.queue_wait_ms.snapshot(),
+            'forward_ms': self.forward_ms.snapshot(),
+        }
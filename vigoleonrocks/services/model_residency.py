@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+🧳 VIGOLEONROCKS - Residencia de modelos con presupuesto de memoria
+Decide qué modelos permanecen cargados en un worker:
+
+- Presupuesto de RAM configurable; la huella de cada modelo se mide al cargarlo
+  (bytes de parámetros si el cargador da un ``sizer``, si no delta de RSS)
+- Antes y después de cada carga se expulsan los modelos menos usados
+  recientemente (LRU) hasta caber; nunca los que están en uso (fijados)
+- Cada carga en curso reserva su huella estimada antes de empezar, así dos
+  cargas simultáneas no caben cada una por su lado y juntas se pasan
+- Cargas concurrentes del mismo modelo comparten un único futuro: quien llega
+  después lo espera con ``await`` en lugar de sondear con ``asyncio.sleep``
+- La carga corre en un executor, fuera del bucle de eventos, y es válida desde
+  cualquier bucle (``concurrent.futures.Future`` + ``asyncio.wrap_future``)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_FRACTION = 0.5  # sin presupuesto explícito: mitad de la RAM del sistema
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss_bytes() -> int:
+    """RSS actual del proceso (0 si no se puede leer)"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        try:
+            import psutil
+            return psutil.Process().memory_info().rss
+        except Exception:
+            return 0
+
+
+def default_budget_bytes() -> int:
+    """``MODEL_MEMORY_BUDGET_MB`` o, si no está definido, la mitad de la RAM del sistema"""
+    configured = os.getenv('MODEL_MEMORY_BUDGET_MB')
+    if configured:
+        return int(float(configured) * 1048576)
+    from vigoleonrocks.services.system_sampler import current_snapshot
+    total_mb = current_snapshot().memory_total_mb
+    return int(total_mb * DEFAULT_BUDGET_FRACTION * 1048576) if total_mb else 8 * 1073741824
+
+
+@dataclass
+class ResidentModel:
+    key: str
+    value: Any
+    footprint_bytes: int
+    load_time_s: float
+    loaded_at: float
+    last_used: float
+    hits: int = 0
+    pins: int = 0
+
+
+class ModelResidencyManager:
+    """
+    LRU de modelos cargados bajo un presupuesto de bytes
+
+    Args:
+        loader: ``loader(key)`` carga el modelo (síncrono, corre en el executor)
+            y devuelve el objeto; una excepción es un fallo de carga
+        unloader: ``unloader(key)`` libera lo que cargó ``loader``
+        budget_bytes: Presupuesto total (por defecto ``default_budget_bytes()``)
+        sizer: ``sizer(key, value)`` devuelve la huella en bytes; 0/None usa el delta de RSS
+        estimates: Huella estimada por clave para la primera carga (luego se usa la medida)
+        executor: Executor para las cargas (por defecto uno propio de 2 hilos)
+    """
+
+    def __init__(self, loader: Callable[[str], Any], unloader: Optional[Callable[[str], None]] = None,
+                 budget_bytes: Optional[int] = None, sizer: Optional[Callable[[str, Any], Optional[int]]] = None,
+                 estimates: Optional[Dict[str, int]] = None, executor: Optional[ThreadPoolExecutor] = None,
+                 clock=time.monotonic):
+        self.loader = loader
+        self.unloader = unloader
+        self.budget_bytes = budget_bytes if budget_bytes is not None else default_budget_bytes()
+        self.sizer = sizer
+        self._estimates: Dict[str, int] = dict(estimates or {})
+        self._executor = executor or ThreadPoolExecutor(max_workers=2, thread_name_prefix='model-load')
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._resident: 'OrderedDict[str, ResidentModel]' = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._reserved: Dict[str, int] = {}  # estimación de cada carga en curso
+        self.used_bytes = 0
+        self.reserved_bytes = 0
+        self.errors: Dict[str, str] = {}
+        self.counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'loads': 0,
+                         'load_failures': 0, 'evictions': 0}
+
+    # ----- consulta -----
+
+    def is_resident(self, key: str) -> bool:
+        return key in self._resident
+
+    def get(self, key: str) -> Any:
+        entry = self._resident.get(key)
+        return entry.value if entry is not None else None
+
+    # ----- adquisición -----
+
+    async def acquire(self, key: str) -> bool:
+        """
+        Garantiza que ``key`` esté cargado y lo fija (no se expulsa hasta ``release``)
+
+        Devuelve False si la carga falló; un error interno de la gestión (no del
+        loader) se propaga a todos los que esperan. Cancelar al que espera no
+        cancela la carga: la comparten otros y el modelo queda residente.
+        """
+        for attempt in range(3):  # reintento si otra carga lo expulsó justo al terminar la nuestra
+            with self._lock:
+                entry = self._resident.get(key)
+                if entry is not None:
+                    entry.pins += 1
+                    entry.last_used = self._clock()
+                    self._resident.move_to_end(key)
+                    if attempt == 0:
+                        entry.hits += 1
+                        self.counters['hits'] += 1
+                    return True
+                future = self._loading.get(key)
+                if future is None:
+                    future = Future()
+                    self._loading[key] = future
+                    self.counters['misses'] += 1
+                    self._executor.submit(self._load, key, future)
+                else:
+                    self.counters['coalesced'] += 1
+            if not await asyncio.shield(asyncio.wrap_future(future)):
+                return False
+        return False
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            entry = self._resident.get(key)
+            if entry is not None and entry.pins > 0:
+                entry.pins -= 1
+
+    @asynccontextmanager
+    async def use(self, key: str):
+        """``async with residency.use(key) as loaded:`` fija el modelo durante la inferencia"""
+        loaded = await self.acquire(key)
+        try:
+            yield loaded
+        finally:
+            if loaded:
+                self.release(key)
+
+    async def ensure(self, key: str) -> bool:
+        """Carga si hace falta sin fijar (compatibilidad con ``ensure_model_loaded``)"""
+        loaded = await self.acquire(key)
+        if loaded:
+            self.release(key)
+        return loaded
+
+    # ----- carga y expulsión -----
+
+    def _load(self, key: str, future: Future) -> None:
+        """Corre en el executor: hace sitio, carga, mide y publica el resultado en ``future``"""
+        try:
+            self._load_into(key, future)
+        except BaseException as e:  # error propio (no del loader): quien espera no puede quedarse colgado
+            logger.error(f"Error gestionando la carga de {key}: {e}")
+            with self._lock:
+                self._loading.pop(key, None)
+                self._unreserve(key)
+            if not future.done():
+                future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+
+    def _load_into(self, key: str, future: Future) -> None:
+        with self._lock:
+            estimate = self._estimates.get(key, 0)
+            self._reserved[key] = estimate
+            self.reserved_bytes += estimate
+        self._make_room(0, exclude=key)  # la reserva ya cuenta como ocupada
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        try:
+            value = self.loader(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Fallo cargando modelo {key}: {e}")
+            with self._lock:
+                self._loading.pop(key, None)
+                self._unreserve(key)
+                self.errors[key] = str(e)
+                self.counters['load_failures'] += 1
+            future.set_result(False)
+            return
+
+        load_time = time.perf_counter() - start
+        footprint = self._measure(key, value, rss_before)
+        now = self._clock()
+        with self._lock:
+            self._resident[key] = ResidentModel(key, value, footprint, load_time, now, now)
+            self._loading.pop(key, None)
+            self._unreserve(key)
+            self._estimates[key] = footprint
+            self.used_bytes += footprint
+            self.errors.pop(key, None)
+            self.counters['loads'] += 1
+        logger.info(f"📦 Modelo residente: {key} ({footprint / 1048576:.0f} MB, {load_time:.2f}s)")
+        self._make_room(0, exclude=key)  # con la huella real, antes de despertar a quien espera
+        future.set_result(True)
+
+    def _measure(self, key: str, value: Any, rss_before: int) -> int:
+        footprint = 0
+        if self.sizer is not None:
+            try:
+                footprint = self.sizer(key, value) or 0
+            except Exception as e:
+                logger.warning(f"⚠️ sizer falló para {key} ({e}); se usa el delta de RSS")
+        return footprint or max(0, current_rss_bytes() - rss_before)
+
+    def _unreserve(self, key: str) -> None:
+        """Con ``_lock`` tomado"""
+        self.reserved_bytes -= self._reserved.pop(key, 0)
+
+    def _make_room(self, needed: int, exclude: Optional[str] = None) -> List[str]:
+        """Expulsa LRU no fijados hasta que ``used + reservado + needed`` quepa en el presupuesto"""
+        victims = []
+        with self._lock:
+            for key, entry in list(self._resident.items()):  # de menos a más reciente
+                if self.used_bytes + self.reserved_bytes + needed <= self.budget_bytes:
+                    break
+                if key == exclude or entry.pins > 0:
+                    continue
+                victims.append(self._detach(key))
+            over = self.used_bytes + self.reserved_bytes + needed - self.budget_bytes
+        if over > 0:
+            logger.warning(f"⚠️ Presupuesto de modelos excedido en {over / 1048576:.0f} MB "
+                           f"(modelos en uso no expulsables)")
+        for entry in victims:
+            self._unload(entry)
+        return [entry.key for entry in victims]
+
+    def _detach(self, key: str) -> ResidentModel:
+        entry = self._resident.pop(key)
+        self.used_bytes -= entry.footprint_bytes
+        self.counters['evictions'] += 1
+        return entry
+
+    def _unload(self, entry: ResidentModel) -> None:
+        logger.info(f"🗑️ Expulsando modelo {entry.key} ({entry.footprint_bytes / 1048576:.0f} MB)")
+        entry.value = None
+        if self.unloader is not None:
+            try:
+                self.unloader(entry.key)
+            except Exception as e:
+                logger.error(f"Error descargando modelo {entry.key}: {e}")
+
+    def evict(self, key: str) -> bool:
+        """Expulsa ``key`` aunque esté fijado (uso administrativo)"""
+        with self._lock:
+            if key not in self._resident:
+                return False
+            entry = self._detach(key)
+        self._unload(entry)
+        return True
+
+    def clear(self) -> None:
+        for key in list(self._resident):
+            self.evict(key)
+
+    def set_budget(self, budget_bytes: int) -> List[str]:
+        self.budget_bytes = budget_bytes
+        return self._make_room(0)
+
+    # ----- métricas -----
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            resident = [{
+                'key': e.key,
+                'footprint_mb': round(e.footprint_bytes / 1048576, 1),
+                'load_time_s': round(e.load_time_s, 3),
+                'hits': e.hits,
+                'pins': e.pins,
+                'idle_s': round(now - e.last_used, 1),
+            } for e in reversed(self._resident.values())]
+            counters = dict(self.counters)
+            loading = list(self._loading)
+        lookups = counters['hits'] + counters['misses'] + counters['coalesced']
+        return {
+            'budget_mb': round(self.budget_bytes / 1048576, 1),
+            'used_mb': round(self.used_bytes / 1048576, 1),
+            'reserved_mb': round(self.reserved_bytes / 1048576, 1),
+            'resident': resident,
+            'loading': loading,
+            'hit_rate': round(counters['hits'] / lookups, 4) if lookups else 0.0,
+            'errors': dict(self.errors),
+            **counters,
+        }
+
+    def shutdown(self) -> None:
+        self.clear()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""
+🚦 VIGOLEONROCKS - Rate limiting compartido (GCRA / token bucket)
+Limitador con semántica de token bucket implementado como GCRA: por clave sólo
+se guarda un número (el "theoretical arrival time"), así que cada verificación
+es O(1) en tiempo y memoria.
+
+Backends intercambiables:
+- ``MemoryBackend``: dentro del proceso
+- ``SharedMemoryBackend``: tabla hash en un archivo mmap compartido por todos
+  los workers locales (gunicorn, multiprocessing), con locks fcntl por bucket
+- ``RedisBackend``: script Lua atómico vía EVALSHA; acepta un cliente redis-py
+  o el ``RespClient`` mínimo incluido (protocolo RESP)
+
+Políticas por ruta y por clave, y cabeceras estándar ``RateLimit-*``.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import socket
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Holgura de comparación: a escala de epoch (~1.7e9) cada suma de doubles pierde
+# ~1e-7 s, así que se tolera una milésima de token (y al menos 10 µs)
+TOKEN_SLACK = 1e-3
+MIN_SLACK = 1e-5
+
+PERIODS = {'second': 1.0, 'minute': 60.0, 'hour': 3600.0, 'day': 86400.0}
+
+_RATE_PATTERN = re.compile(
+    r'^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*(?:burst\s*(\d+))?\s*$',
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """``limit`` peticiones por ``period`` segundos, con ráfaga de hasta ``burst``"""
+    limit: int
+    period: float
+    burst: Optional[int] = None
+
+    def __post_init__(self):
+        if self.limit <= 0 or self.period <= 0:
+            raise ValueError("limit y period deben ser positivos")
+
+    @property
+    def capacity(self) -> int:
+        return self.burst if self.burst is not None else self.limit
+
+    @property
+    def emission_interval(self) -> float:
+        """Segundos que tarda en reponerse un token"""
+        return self.period / self.limit
+
+    @property
+    def tolerance(self) -> float:
+        return self.capacity * self.emission_interval
+
+    def header_value(self) -> str:
+        value = f"{self.limit};w={self.period:g}"
+        if self.burst is not None:
+            value += f";burst={self.burst}"
+        return value
+
+
+@lru_cache(maxsize=256)
+def parse_rate(spec: str) -> RateLimitPolicy:
+    """
+    Convierte "60/minute", "10 per second", "100/5minutes" o "20/second burst 40" en política
+
+    Raises:
+        ValueError: Si el formato no es válido
+    """
+    match = _RATE_PATTERN.match(spec)
+    if not match:
+        raise ValueError(f"Formato de límite inválido: {spec!r}")
+    limit, multiplier, unit, burst = match.groups()
+    period = PERIODS[unit.lower()] * (int(multiplier) if multiplier else 1)
+    return RateLimitPolicy(int(limit), period, int(burst) if burst else None)
+
+
+def _gcra(stored_tat: Optional[float], now: float, increment: float,
+          tolerance: float) -> Tuple[bool, float]:
+    """
+    Paso GCRA: devuelve (permitido, TAT resultante)
+
+    Si se permite, el TAT devuelto es el nuevo valor a guardar; si no, el actual.
+    """
+    tat = now if stored_tat is None or stored_tat < now else stored_tat
+    new_tat = tat + increment
+    if new_tat - tolerance > now + max(MIN_SLACK, increment * TOKEN_SLACK):
+        return False, tat
+    return True, new_tat
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Resultado de una verificación"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+    policy: RateLimitPolicy
+
+    def headers(self) -> Dict[str, str]:
+        """Cabeceras ``RateLimit-*`` (draft-ietf-httpapi-ratelimit-headers)"""
+        headers = {
+            'RateLimit-Limit': str(self.limit),
+            'RateLimit-Remaining': str(self.remaining),
+            'RateLimit-Reset': str(math.ceil(self.reset_after)),
+            'RateLimit-Policy': self.policy.header_value(),
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class MemoryBackend:
+    """TATs en un OrderedDict del proceso; las claves expiradas se purgan de forma amortizada"""
+
+    name = 'memory'
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._tats: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, key: str, now: float, increment: float, tolerance: float) -> Tuple[bool, float]:
+        with self._lock:
+            tats = self._tats
+            allowed, tat = _gcra(tats.get(key), now, increment, tolerance)
+            if allowed:
+                tats[key] = tat
+                tats.move_to_end(key)
+                # Como mucho dos expulsiones por llamada: O(1) amortizado
+                for _ in range(2):
+                    oldest_key = next(iter(tats))
+                    if tats[oldest_key] <= now or len(tats) > self.max_keys:
+                        del tats[oldest_key]
+                    else:
+                        break
+            return allowed, tat
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+
+def _hash64(key: str) -> int:
+    value = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1  # 0 marca un slot libre
+
+
+def _default_shared_path() -> Path:
+    base = Path('/dev/shm') if os.path.isdir('/dev/shm') else Path(tempfile.gettempdir())
+    return base / f'vigoleonrocks-ratelimit-{os.getuid() if hasattr(os, "getuid") else 0}'
+
+
+class SharedMemoryBackend:
+    """
+    Tabla hash de tamaño fijo en un archivo mmap compartido entre procesos locales
+
+    Cada bucket agrupa ``BUCKET_SLOTS`` slots (hash de 64 bits + TAT) y se protege
+    con un lock fcntl sobre su rango de bytes, de modo que procesos no
+    relacionados que abran el mismo archivo ven un único límite. Si un bucket
+    se llena se reutiliza el slot con el TAT más antiguo (una clave expulsada
+    vuelve a empezar con el bucket lleno, nunca bloquea de más).
+    """
+
+    name = 'shared'
+
+    MAGIC = b'VLRRL001'
+    HEADER = struct.Struct('<8sQ')
+    HEADER_SIZE = 64
+    SLOT = struct.Struct('<Qd')
+    BUCKET_SLOTS = 8
+    THREAD_STRIPES = 64
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, slots: int = 65536):
+        import fcntl
+        import mmap
+
+        self._fcntl = fcntl
+        self.path = Path(path) if path else _default_shared_path()
+        self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o600)
+
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self.HEADER_SIZE, 0)
+        try:
+            if os.fstat(self._fd).st_size < self.HEADER_SIZE:
+                slots = max(self.BUCKET_SLOTS, slots - slots % self.BUCKET_SLOTS)
+                os.ftruncate(self._fd, self.HEADER_SIZE + slots * self.SLOT.size)
+                os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, slots), 0)
+            magic, slots = self.HEADER.unpack(os.pread(self._fd, self.HEADER.size, 0))
+            if magic != self.MAGIC:
+                raise ValueError(f"{self.path} no es una tabla de rate limiting")
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.HEADER_SIZE, 0)
+
+        self.slots = slots
+        self.buckets = slots // self.BUCKET_SLOTS
+        self._bucket_bytes = self.BUCKET_SLOTS * self.SLOT.size
+        self._map = mmap.mmap(self._fd, self.HEADER_SIZE + slots * self.SLOT.size)
+        self._init_thread_locks()
+        if hasattr(os, 'register_at_fork'):
+            # Un lock tomado por otro hilo en el padre quedaría bloqueado en el hijo
+            os.register_at_fork(after_in_child=self._init_thread_locks)
+
+    def _init_thread_locks(self) -> None:
+        # fcntl excluye procesos, no hilos del mismo proceso
+        self._thread_locks = [threading.Lock() for _ in range(self.THREAD_STRIPES)]
+
+    def update(self, key: str, now: float, increment: float, tolerance: float) -> Tuple[bool, float]:
+        fcntl = self._fcntl
+        key_hash = _hash64(key)
+        bucket = key_hash % self.buckets
+        base = self.HEADER_SIZE + bucket * self._bucket_bytes
+        slot_struct = self.SLOT
+        mm = self._map
+
+        with self._thread_locks[bucket % self.THREAD_STRIPES]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self._bucket_bytes, base)
+            try:
+                target, stored_tat = -1, None
+                victim, victim_tat = base, float('inf')
+                for offset in range(base, base + self._bucket_bytes, slot_struct.size):
+                    slot_hash, slot_tat = slot_struct.unpack_from(mm, offset)
+                    if slot_hash == key_hash:
+                        target, stored_tat = offset, slot_tat
+                        break
+                    if slot_hash == 0:
+                        slot_tat = -1.0  # libre: preferido frente a cualquier expulsión
+                    if slot_tat < victim_tat:
+                        victim, victim_tat = offset, slot_tat
+                allowed, tat = _gcra(stored_tat, now, increment, tolerance)
+                if allowed:
+                    slot_struct.pack_into(mm, target if target >= 0 else victim, key_hash, tat)
+                return allowed, tat
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self._bucket_bytes, base)
+
+    def reset(self) -> None:
+        fcntl = self._fcntl
+        size = self.slots * self.SLOT.size
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, size, self.HEADER_SIZE)
+        try:
+            self._map[self.HEADER_SIZE:self.HEADER_SIZE + size] = bytes(size)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, size, self.HEADER_SIZE)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local increment = tonumber(ARGV[2])
+local tolerance = tonumber(ARGV[3])
+local tat = now
+local stored = redis.call('GET', KEYS[1])
+if stored then
+  tat = math.max(tonumber(stored), now)
+end
+local new_tat = tat + increment
+if new_tat - tolerance > now + math.max(0.00001, increment * 0.001) then
+  return {0, string.format('%.6f', tat)}
+end
+redis.call('SET', KEYS[1], string.format('%.6f', new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, string.format('%.6f', new_tat)}
+"""
+
+GCRA_LUA_SHA = hashlib.sha1(GCRA_LUA.encode('utf-8')).hexdigest()
+
+
+class RespError(Exception):
+    """Respuesta de error del servidor Redis"""
+
+
+class RespClient:
+    """Cliente RESP2 mínimo (una conexión por hilo) con la API de scripts de redis-py"""
+
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 1.0):
+        self.host, self.port, self.db = host, port, db
+        self.password = password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 1.0) -> 'RespClient':
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip('/') or 0)
+        return cls(parsed.hostname or 'localhost', parsed.port or 6379, db, parsed.password, timeout)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            if self.password:
+                self._roundtrip(conn, ('AUTH', self.password))
+            if self.db:
+                self._roundtrip(conn, ('SELECT', self.db))
+        return conn
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        return b''.join(parts)
+
+    @classmethod
+    def _read_reply(cls, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Conexión cerrada por el servidor")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            raise RespError(payload.decode('utf-8'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            return None if count < 0 else [cls._read_reply(reader) for _ in range(count)]
+        raise RespError(f"Respuesta RESP desconocida: {line!r}")
+
+    def _roundtrip(self, conn, args):
+        sock, reader = conn
+        sock.sendall(self._encode(args))
+        return self._read_reply(reader)
+
+    def execute_command(self, *args):
+        try:
+            return self._roundtrip(self._connection(), args)
+        except (ConnectionError, OSError):
+            self.close()
+            return self._roundtrip(self._connection(), args)  # un reintento con conexión nueva
+
+    def script_load(self, script: str) -> str:
+        reply = self.execute_command('SCRIPT', 'LOAD', script)
+        return reply.decode('utf-8') if isinstance(reply, bytes) else reply
+
+    def evalsha(self, sha: str, numkeys: int, *keys_and_args):
+        return self.execute_command('EVALSHA', sha, numkeys, *keys_and_args)
+
+    def ping(self) -> bool:
+        return self.execute_command('PING') == 'PONG'
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+
+class RedisBackend:
+    """GCRA atómico en Redis mediante un script Lua (EVALSHA con recarga ante NOSCRIPT)"""
+
+    name = 'redis'
+
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = 'vigoleonrocks:rl:'):
+        if client is None:
+            url = url or os.getenv('RATE_LIMIT_REDIS_URL') or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+            try:
+                import redis
+                client = redis.Redis.from_url(url, socket_timeout=1.0)
+            except ImportError:
+                client = RespClient.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self._sha = GCRA_LUA_SHA
+
+    def update(self, key: str, now: float, increment: float, tolerance: float) -> Tuple[bool, float]:
+        args = (self.prefix + key, f'{now:.6f}', f'{increment:.6f}', f'{tolerance:.6f}')
+        try:
+            reply = self.client.evalsha(self._sha, 1, *args)
+        except Exception as e:
+            if 'NOSCRIPT' not in str(e):
+                raise
+            self._sha = self.client.script_load(GCRA_LUA)
+            reply = self.client.evalsha(self._sha, 1, *args)
+        allowed, tat = reply
+        return bool(int(allowed)), float(tat)
+
+
+# ---------------------------------------------------------------------------
+# Limitador
+# ---------------------------------------------------------------------------
+
+PolicySpec = Union[None, str, RateLimitPolicy]
+
+
+def _as_policy(spec: PolicySpec) -> Optional[RateLimitPolicy]:
+    if spec is None or isinstance(spec, RateLimitPolicy):
+        return spec
+    if spec.strip().lower() in ('', 'exempt', 'none', 'off'):
+        return None
+    return parse_rate(spec)
+
+
+class RateLimiter:
+    """
+    Limitador GCRA con política por defecto, políticas por ruta y por clave
+
+    Las rutas se resuelven por prefijo más largo ("/api/v2/" cubre todo lo que
+    cuelga de ella); una política ``None``/"exempt" deja la ruta sin límite.
+    ``name`` separa en el backend los buckets de cada limitador: dos apps (o
+    dos limitadores de la misma app) que compartan backend no se descuentan
+    peticiones entre sí aunque coincidan la ruta y el cliente.
+    """
+
+    def __init__(self, backend: Any = None, default_policy: PolicySpec = '60/minute',
+                 route_policies: Optional[Mapping[str, PolicySpec]] = None,
+                 key_policies: Optional[Mapping[str, PolicySpec]] = None,
+                 fail_open: bool = True, clock: Callable[[], float] = time.time,
+                 name: str = 'default'):
+        if not name or '|' in name:
+            raise ValueError(f"Nombre de limitador inválido: {name!r}")
+        self.name = name
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.default_policy = _as_policy(default_policy)
+        self.route_policies = {route: _as_policy(spec) for route, spec in (route_policies or {}).items()}
+        self.key_policies = {key: _as_policy(spec) for key, spec in (key_policies or {}).items()}
+        self.fail_open = fail_open
+        self.clock = clock
+        self._routes_by_length = sorted(self.route_policies, key=len, reverse=True)
+        self._route_cache: Dict[str, Tuple[str, Optional[RateLimitPolicy]]] = {}
+        self.allowed_total = 0
+        self.denied_total = 0
+        self.errors_total = 0
+
+    def set_route_policy(self, route: str, spec: PolicySpec) -> None:
+        self.route_policies[route] = _as_policy(spec)
+        self._routes_by_length = sorted(self.route_policies, key=len, reverse=True)
+        self._route_cache = {}
+
+    def policy_for_route(self, path: str) -> Tuple[str, Optional[RateLimitPolicy]]:
+        """(nombre del grupo de límite, política) para una ruta"""
+        cached = self._route_cache.get(path)
+        if cached is not None:
+            return cached
+        resolved = ('default', self.default_policy)
+        for route in self._routes_by_length:
+            if path == route or (route.endswith('/') and path.startswith(route)):
+                resolved = (route, self.route_policies[route])
+                break
+        if len(self._route_cache) < 4096:
+            self._route_cache[path] = resolved
+        return resolved
+
+    def resolve(self, path: str, client: str) -> Tuple[str, Optional[RateLimitPolicy]]:
+        """
+        Clave de bucket y política para ``client`` en ``path``
+
+        Una política por clave (p. ej. un API key con otro plan) sustituye a la
+        de la ruta, pero cada ruta limitada conserva su propio bucket.
+        """
+        group, policy = self.policy_for_route(path)
+        if policy is not None and client in self.key_policies:
+            policy = self.key_policies[client]
+        return f'{group}|{client}', policy
+
+    def hit(self, key: str, policy: PolicySpec = None, cost: int = 1,
+            now: Optional[float] = None) -> RateLimitResult:
+        """
+        Consume ``cost`` tokens de ``key``
+
+        Args:
+            key: Identificador del bucket dentro de este limitador (p. ej. "ruta|ip")
+            policy: Política a aplicar; por defecto la de la clave o la global
+            cost: Tokens a consumir
+            now: Instante (epoch) a usar en lugar del reloj
+
+        Returns:
+            RateLimitResult con ``allowed`` y los valores para las cabeceras
+        """
+        policy = _as_policy(policy) if policy is not None else self.key_policies.get(key, self.default_policy)
+        if policy is None:
+            raise ValueError("No hay política de rate limiting para esta clave")
+        now = self.clock() if now is None else now
+        interval = policy.emission_interval
+        tolerance = policy.tolerance
+        try:
+            allowed, tat = self.backend.update(f'{self.name}|{key}', now, interval * cost, tolerance)
+        except Exception as e:
+            self.errors_total += 1
+            if not self.fail_open:
+                raise
+            logger.warning(f"⚠️ Backend de rate limiting no disponible ({e}); se permite la petición")
+            return RateLimitResult(True, policy.limit, policy.capacity, 0.0, 0.0, policy)
+
+        remaining = max(0, int((tolerance - (tat - now)) / interval + TOKEN_SLACK))
+        if allowed:
+            self.allowed_total += 1
+            retry_after = 0.0
+        else:
+            self.denied_total += 1
+            retry_after = tat + interval * cost - tolerance - now
+        return RateLimitResult(allowed, policy.limit, min(remaining, policy.capacity),
+                               max(0.0, tat - now), max(0.0, retry_after), policy)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'backend': getattr(self.backend, 'name', type(self.backend).__name__),
+            'allowed_total': self.allowed_total,
+            'denied_total': self.denied_total,
+            'errors_total': self.errors_total,
+        }
+
+
+def parse_route_policies(spec: str) -> Dict[str, str]:
+    """"/v1/chat/completions=20/minute,/health=exempt" -> {ruta: límite}"""
+    policies = {}
+    for item in spec.split(','):
+        if '=' in item:
+            route, rate = item.split('=', 1)
+            policies[route.strip()] = rate.strip()
+    return policies
+
+
+def create_backend(name: Optional[str] = None):
+    """Backend según RATE_LIMIT_BACKEND (memory | shared | redis)"""
+    name = (name or os.getenv('RATE_LIMIT_BACKEND', 'memory')).lower()
+    if name == 'shared':
+        return SharedMemoryBackend(os.getenv('RATE_LIMIT_SHARED_PATH') or None)
+    if name == 'redis':
+        return RedisBackend()
+    if name != 'memory':
+        logger.warning(f"⚠️ RATE_LIMIT_BACKEND desconocido '{name}', usando memoria")
+    return MemoryBackend()
+
+
+def create_rate_limiter(name: str, default_policy: PolicySpec = None,
+                        route_policies: Optional[Mapping[str, PolicySpec]] = None,
+                        backend: Any = None) -> RateLimiter:
+    """
+    Limitador configurado desde el entorno
+
+    ``name`` identifica la app/servicio en las claves del backend, de modo que
+    los gateways y la app principal no comparten buckets en un backend común.
+    RATE_LIMIT_DEFAULT y RATE_LIMIT_ROUTES prevalecen sobre los valores pasados
+    por código, para poder ajustar los límites en despliegue sin tocar el código.
+    """
+    routes = dict(route_policies or {})
+    routes.update(parse_route_policies(os.getenv('RATE_LIMIT_ROUTES', '')))
+    return RateLimiter(
+        backend=backend if backend is not None else create_backend(),
+        default_policy=os.getenv('RATE_LIMIT_DEFAULT') or default_policy or '60/minute',
+        route_policies=routes,
+        name=name,
+    )
+
+
+def _remote_address() -> str:
+    from flask import request
+    return request.remote_addr or 'unknown'
+
+
+def api_key_or_address() -> str:
+    """Identidad del cliente: hash del API key (Authorization / X-API-Key) o la IP"""
+    from flask import request
+    credential = request.headers.get('Authorization') or request.headers.get('X-API-Key')
+    if credential:
+        return 'key:' + hashlib.sha256(credential.encode('utf-8')).hexdigest()[:16]
+    return request.remote_addr or 'unknown'
+
+
+def install_rate_limiting(app, limiter: RateLimiter,
+                          key_func: Optional[Callable[[], str]] = None,
+                          exempt: Tuple[str, ...] = ()) -> RateLimiter:
+    """
+    Registra el limitador en una app Flask (before/after_request)
+
+    Las peticiones rechazadas reciben 429 con ``Retry-After``; todas las
+    respuestas limitadas llevan las cabeceras ``RateLimit-*``.
+    """
+    from flask import g, jsonify, request
+
+    key_func = key_func or _remote_address
+    for route in exempt:
+        limiter.set_route_policy(route, None)
+
+    @app.before_request
+    def _rate_limit_check():
+        if request.method == 'OPTIONS':
+            return None
+        bucket, policy = limiter.resolve(request.path, key_func())
+        if policy is None:
+            return None
+        result = limiter.hit(bucket, policy)
+        g.rate_limit = result
+        if result.allowed:
+            return None
+        response = jsonify({
+            'error': 'Rate Limit Exceeded',
+            'message': 'Demasiadas requests, intenta más tarde',
+            'status_code': 429,
+            'retry_after': max(1, math.ceil(result.retry_after)),
+        })
+        response.status_code = 429
+        return response
+
+    @app.after_request
+    def _rate_limit_headers(response):
+        result = g.pop('rate_limit', None)
+        if result is not None:
+            for header, value in result.headers().items():
+                response.headers[header] = value
+        return response
+
+    app.extensions['vigoleonrocks_rate_limiter'] = limiter
+    return limiter
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+🗂️ VIGOLEONROCKS - Caché de páginas estáticas precomprimidas
+Sirve las páginas HTML del frontend (landing, UI, quantum center...) desde
+memoria en lugar de ``open()`` + ``f.read()`` en cada petición:
+
+- Carga al arrancar y precomprime una vez con gzip (nivel 9) y, si el módulo
+  ``brotli`` está instalado, también con brotli
+- ETag fuerte por representación (hash del contenido) y respuesta 304 a
+  ``If-None-Match``; ``Vary: Accept-Encoding``
+- ``Cache-Control`` según la clase del recurso: HTML siempre revalida (el 304
+  lo hace barato), recursos con hash en el nombre son inmutables
+- Recarga por mtime: un hilo vigila los archivos cada
+  ``STATIC_PAGES_WATCH_INTERVAL`` segundos (desarrollo; 0 = desactivado)
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional; gzip siempre está disponible
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = os.getenv('STATIC_PAGES_ROOT', '')
+DEFAULT_WATCH_INTERVAL = float(os.getenv('STATIC_PAGES_WATCH_INTERVAL', 0))
+MIN_COMPRESS_BYTES = 512  # por debajo, la cabecera de compresión no compensa
+
+CACHE_POLICIES = {
+    'html': 'public, no-cache',                        # siempre revalidar (304 con ETag)
+    'immutable': 'public, max-age=31536000, immutable',  # nombre con hash de contenido
+    'static': 'public, max-age=3600',                  # css/js/imágenes sin hash
+}
+_FINGERPRINT = re.compile(r'\.[0-9a-f]{8,}\.\w+$')
+
+
+def asset_class(filename: str) -> str:
+    """Clase de caché de un archivo: ``html``, ``immutable`` o ``static``"""
+    if _FINGERPRINT.search(filename):
+        return 'immutable'
+    if filename.endswith(('.html', '.htm')):
+        return 'html'
+    return 'static'
+
+
+@dataclass
+class StaticAsset:
+    """Página cargada en memoria con sus representaciones comprimidas"""
+    path: str
+    mtime_ns: int
+    content_type: str
+    cache_control: str
+    last_modified: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)  # 'identity' | 'gzip' | 'br' -> cuerpo
+    etags: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.encodings['identity'])
+
+
+@lru_cache(maxsize=256)  # los navegadores envían pocas variantes de la cabecera
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> str:
+    """Mejor codificación disponible según ``Accept-Encoding`` (a igual q: br > gzip > identity)"""
+    accepted = _parse_accept_encoding(accept_encoding or '')
+    wildcard = accepted.get('*')
+    best, best_rank = 'identity', (accepted.get('identity', 1.0 if wildcard is None else wildcard), 0)
+    for preference, encoding in enumerate(('gzip', 'br'), start=1):
+        q = accepted.get(encoding, wildcard or 0.0)
+        if encoding in available and q > 0 and (q, preference) > best_rank:
+            best, best_rank = encoding, (q, preference)
+    return best
+
+
+def etag_matches(if_none_match: str, etags: Iterable[str]) -> bool:
+    """Comparación débil de ``If-None-Match`` (RFC 9110 §13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = {tag[2:] if tag.startswith('W/') else tag
+                  for tag in (raw.strip() for raw in if_none_match.split(','))}
+    return any(tag in candidates for tag in etags)
+
+
+class StaticPageCache:
+    """
+    Páginas estáticas en memoria
+
+    Args:
+        root: Directorio base de las rutas relativas (por defecto el de trabajo)
+        watch_interval: Segundos entre comprobaciones de mtime (0 = sin vigilancia)
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT, watch_interval: float = DEFAULT_WATCH_INTERVAL):
+        self.root = root
+        self.watch_interval = watch_interval
+        self._assets: Dict[str, StaticAsset] = {}
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.counters = {'hits': 0, 'not_modified': 0, 'loads': 0, 'reloads': 0, 'bytes_sent': 0}
+
+    # ----- carga -----
+
+    def _resolve(self, filename: str) -> str:
+        return filename if os.path.isabs(filename) else os.path.join(self.root or os.getcwd(), filename)
+
+    def _build(self, path: str, data: bytes, mtime_ns: int) -> StaticAsset:
+        filename = os.path.basename(path)
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        asset = StaticAsset(
+            path=path,
+            mtime_ns=mtime_ns,
+            content_type=content_type,
+            cache_control=CACHE_POLICIES[asset_class(filename)],
+            last_modified=formatdate(mtime_ns / 1e9, usegmt=True),
+        )
+        asset.encodings['identity'] = data
+        if len(data) >= MIN_COMPRESS_BYTES:
+            asset.encodings['gzip'] = gzip.compress(data, compresslevel=9, mtime=0)
+            if brotli is not None:
+                asset.encodings['br'] = brotli.compress(data, quality=11)
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        for encoding in asset.encodings:
+            asset.etags[encoding] = f'"{digest}"' if encoding == 'identity' else f'"{digest}-{encoding}"'
+        return asset
+
+    def load(self, filename: str) -> StaticAsset:
+        """Lee, comprime y guarda ``filename``; ``FileNotFoundError`` si no existe"""
+        path = self._resolve(filename)
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        asset = self._build(path, data, stat.st_mtime_ns)
+        with self._lock:
+            reloaded = filename in self._assets
+            self._assets[filename] = asset
+            self.counters['reloads' if reloaded else 'loads'] += 1
+        if reloaded:
+            logger.info(f"🔄 Página recargada: {filename}")
+        return asset
+
+    def preload(self, filenames: Iterable[str]) -> List[str]:
+        """Carga las páginas existentes al arrancar; devuelve las que faltan"""
+        missing = []
+        for filename in filenames:
+            try:
+                self.load(filename)
+            except FileNotFoundError:
+                missing.append(filename)
+        if missing:
+            logger.warning(f"⚠️ Páginas no encontradas (se usará fallback): {', '.join(missing)}")
+        return missing
+
+    def get(self, filename: str) -> StaticAsset:
+        asset = self._assets.get(filename)
+        return asset if asset is not None else self.load(filename)
+
+    # ----- vigilancia -----
+
+    def check_for_changes(self) -> List[str]:
+        """Recarga las páginas cuyo mtime cambió; las borradas salen de la caché"""
+        changed = []
+        for filename, asset in list(self._assets.items()):
+            try:
+                mtime_ns = os.stat(asset.path).st_mtime_ns
+            except FileNotFoundError:
+                with self._lock:
+                    self._assets.pop(filename, None)
+                changed.append(filename)
+                continue
+            if mtime_ns != asset.mtime_ns:
+                try:
+                    self.load(filename)
+                    changed.append(filename)
+                except OSError as e:
+                    logger.warning(f"⚠️ No se pudo recargar {filename}: {e}")
+        return changed
+
+    def start_watching(self) -> None:
+        if self.watch_interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, daemon=True, name='static-pages-watch')
+        self._watcher.start()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.watch_interval):
+            self.check_for_changes()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+
+    # ----- respuesta -----
+
+    def serve(self, filename: str, request_headers: Mapping[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        ``(status, cabeceras, cuerpo)`` para una petición GET de ``filename``
+
+        Raises:
+            FileNotFoundError: la página no existe (la vista decide el fallback)
+        """
+        asset = self.get(filename)
+        encoding = negotiate_encoding(request_headers.get('Accept-Encoding', ''), asset.encodings)
+        headers = {
+            'ETag': asset.etags[encoding],
+            'Cache-Control': asset.cache_control,
+            'Last-Modified': asset.last_modified,
+            'Vary': 'Accept-Encoding',
+        }
+        if etag_matches(request_headers.get('If-None-Match', ''), asset.etags.values()):
+            self.counters['not_modified'] += 1
+            return 304, headers, b''
+        body = asset.encodings[encoding]
+        headers['Content-Type'] = asset.content_type
+        headers['Content-Length'] = str(len(body))
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        self.counters['hits'] += 1
+        self.counters['bytes_sent'] += len(body)
+        return 200, headers, body
+
+    def response(self, filename: str):
+        """Respuesta Flask para la petición actual (``FileNotFoundError`` si falta la página)"""
+        from flask import Response, request
+        status, headers, body = self.serve(filename, request.headers)
+        return Response(body, status=status, headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            assets = {name: {'bytes': a.size,
+                             **{f'{enc}_bytes': len(body) for enc, body in a.encodings.items() if enc != 'identity'}}
+                      for name, a in self._assets.items()}
+        return {'assets': assets, 'brotli': brotli is not None, 'watching': self.watch_interval > 0,
+                **self.counters}
+
+
+_cache: Optional[StaticPageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_static_pages() -> StaticPageCache:
+    """Caché compartida por todo el proceso (arranca el vigilante si está configurado)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = StaticPageCache()
+                _cache.start_watching()
+    return _cache
+
+
+def serve_page(filename: str):
+    """Atajo para vistas: ``return serve_page('pagina.html')`` dentro de ``try/except FileNotFoundError``"""
+    return get_static_pages().response(filename)
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+📈 VIGOLEONROCKS - Muestreador único de métricas del sistema
+Un solo hilo con un temporizador lee contadores de ``/proc`` sin bloquear
+(nada de ``cpu_percent(interval=1)``), calcula deltas y publica una instantánea
+inmutable. Los lectores usan ``get_system_sampler().snapshot`` sin locks: la
+referencia se sustituye de forma atómica en cada muestra.
+
+Métricas: CPU del proceso y del sistema, RSS, memoria del sistema, descriptores
+abiertos, hilos, cambios de contexto, pausas de GC y tareas del sistema.
+Fuera de Linux se usa psutil si está instalado y, si no, ``resource``.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = float(os.getenv('SYSTEM_SAMPLER_INTERVAL', 1.0))
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+class RawCounters(NamedTuple):
+    """Contadores acumulados leídos en un instante"""
+    process_cpu_s: float
+    system_cpu_busy_s: float
+    system_cpu_total_s: float
+    rss_bytes: int
+    memory_total_bytes: int
+    memory_available_bytes: int
+    open_fds: int
+    threads: int
+    ctx_voluntary: int
+    ctx_involuntary: int
+    system_tasks: int
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """Instantánea inmutable; los porcentajes y tasas son del último intervalo"""
+    sequence: int
+    timestamp: float
+    interval_s: float
+    process_cpu_percent: float
+    system_cpu_percent: float
+    rss_mb: float
+    memory_percent: float
+    memory_used_mb: float
+    memory_total_mb: float
+    open_fds: int
+    threads: int
+    ctx_switches_voluntary_per_s: float
+    ctx_switches_involuntary_per_s: float
+    gc_collections: int
+    gc_pause_ms: float
+    gc_pause_max_ms: float
+    system_tasks: int
+    load_avg_1m: float
+    sampler_cost_us: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+EMPTY_SNAPSHOT = SystemSnapshot(0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0.0, 0.0, 0, 0.0, 0.0, 0, 0.0, 0.0)
+
+
+# ===== LECTORES DE CONTADORES =====
+
+class ProcCounterReader:
+    """
+    Lectura de /proc (Linux) con descriptores abiertos una sola vez
+
+    ``os.pread`` sobre el mismo descriptor regenera el contenido en cada lectura:
+    unas 3 veces más barato que abrir y cerrar cinco archivos por muestra. Se
+    abren por PID, así que tras un ``fork`` el hijo reabre los suyos.
+    """
+
+    FILES = ('stat', 'status', 'sys_stat', 'meminfo', 'loadavg')
+
+    def __init__(self, proc: str = '/proc'):
+        self.proc = proc
+        self._pid = None
+        self._fds: Dict[str, int] = {}
+
+    def _open(self) -> None:
+        self.close()
+        pid = os.getpid()
+        paths = {'stat': f'{self.proc}/{pid}/stat', 'status': f'{self.proc}/{pid}/status',
+                 'sys_stat': f'{self.proc}/stat', 'meminfo': f'{self.proc}/meminfo',
+                 'loadavg': f'{self.proc}/loadavg'}
+        self._fds = {name: os.open(path, os.O_RDONLY) for name, path in paths.items()}
+        self._pid = pid
+
+    def close(self) -> None:
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
+
+    def _read(self, name: str) -> str:
+        return os.pread(self._fds[name], 65536, 0).decode('ascii', 'replace')
+
+    def __call__(self) -> RawCounters:
+        if self._pid != os.getpid():
+            self._open()
+        stat = self._read('stat')
+        fields = stat[stat.rindex(')') + 2:].split()
+        # campos (desde state=3): utime=14, stime=15, num_threads=20, rss=24
+        utime, stime = int(fields[11]), int(fields[12])
+        threads, rss_pages = int(fields[17]), int(fields[21])
+
+        voluntary = involuntary = 0
+        for line in self._read('status').splitlines():
+            if line.startswith('voluntary_ctxt_switches'):
+                voluntary = int(line.split()[1])
+            elif line.startswith('nonvoluntary_ctxt_switches'):
+                involuntary = int(line.split()[1])
+
+        cpu = [int(v) for v in self._read('sys_stat').split('\n', 1)[0].split()[1:]]
+        idle = cpu[3] + (cpu[4] if len(cpu) > 4 else 0)  # idle + iowait
+        total = sum(cpu[:8])  # guest ya está incluido en user
+
+        mem_total = mem_available = 0
+        for line in self._read('meminfo').splitlines():
+            if line.startswith('MemTotal:'):
+                mem_total = int(line.split()[1]) * 1024
+            elif line.startswith('MemAvailable:'):
+                mem_available = int(line.split()[1]) * 1024
+                break
+
+        tasks = int(self._read('loadavg').split()[3].split('/')[1])
+        return RawCounters(
+            process_cpu_s=(utime + stime) / _CLOCK_TICKS,
+            system_cpu_busy_s=(total - idle) / _CLOCK_TICKS,
+            system_cpu_total_s=total / _CLOCK_TICKS,
+            rss_bytes=rss_pages * _PAGE_SIZE,
+            memory_total_bytes=mem_total,
+            memory_available_bytes=mem_available,
+            open_fds=len(os.listdir(f'{self.proc}/{self._pid}/fd')),
+            threads=threads,
+            ctx_voluntary=voluntary,
+            ctx_involuntary=involuntary,
+            system_tasks=tasks,
+        )
+
+
+def read_portable_counters() -> RawCounters:
+    """Fallback fuera de Linux: psutil sin intervalos bloqueantes o ``resource``"""
+    try:
+        import psutil
+        process = psutil.Process()
+        times = process.cpu_times()
+        system = psutil.cpu_times()
+        busy = sum(system) - system.idle - getattr(system, 'iowait', 0.0)
+        memory = psutil.virtual_memory()
+        ctx = process.num_ctx_switches()
+        fds = process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+        return RawCounters(times.user + times.system, busy, sum(system), process.memory_info().rss,
+                           memory.total, memory.available, fds, process.num_threads(),
+                           ctx.voluntary, ctx.involuntary, 0)
+    except ImportError:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return RawCounters(usage.ru_utime + usage.ru_stime, 0.0, 0.0, usage.ru_maxrss * 1024,
+                           0, 0, 0, threading.active_count(), usage.ru_nvcsw, usage.ru_nivcsw, 0)
+
+
+def _default_reader() -> Callable[[], RawCounters]:
+    try:
+        reader = ProcCounterReader()
+        reader()
+        return reader
+    except (OSError, ValueError, IndexError):
+        return read_portable_counters
+
+
+# ===== PAUSAS DE GC =====
+
+class GCPauseTracker:
+    """Acumula pausas de GC mediante ``gc.callbacks`` (coste: dos perf_counter por colección)"""
+
+    def __init__(self):
+        self._start = 0.0
+        self.collections = 0
+        self.pause_s = 0.0
+        self.pause_max_s = 0.0
+
+    def __call__(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == 'start':
+            self._start = time.perf_counter()
+        else:
+            pause = time.perf_counter() - self._start
+            self.collections += 1
+            self.pause_s += pause
+            if pause > self.pause_max_s:
+                self.pause_max_s = pause
+
+    def drain(self):
+        """Devuelve (colecciones, pausa total, pausa máxima) desde la última llamada"""
+        result = (self.collections, self.pause_s, self.pause_max_s)
+        self.collections, self.pause_s, self.pause_max_s = 0, 0.0, 0.0
+        return result
+
+
+# ===== MUESTREADOR =====
+
+class _Subscriber:
+    __slots__ = ('callback', 'every', 'last')
+
+    def __init__(self, callback, every):
+        self.callback = callback
+        self.every = every
+        self.last = 0.0
+
+
+class SystemSampler:
+    """
+    Temporizador único que publica ``SystemSnapshot``
+
+    Args:
+        interval: Segundos entre muestras
+        reader: Función que devuelve ``RawCounters`` (por defecto /proc o psutil)
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, reader: Optional[Callable[[], RawCounters]] = None):
+        self.interval = interval
+        self._reader = reader or _default_reader()
+        self._gc = GCPauseTracker()
+        self._subscribers: List[_Subscriber] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._previous: Optional[RawCounters] = None
+        self._previous_time = 0.0
+        self.snapshot: SystemSnapshot = EMPTY_SNAPSHOT
+
+    # ----- ciclo de vida -----
+
+    def start(self) -> 'SystemSampler':
+        """Arranca el hilo de muestreo (idempotente)"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self._gc not in gc.callbacks:
+                    gc.callbacks.append(self._gc)
+                self._stop.clear()
+                self.sample()
+                self._thread = threading.Thread(target=self._run, daemon=True, name='SystemSampler')
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+        if self._gc in gc.callbacks:
+            gc.callbacks.remove(self._gc)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                snapshot = self.sample()
+            except Exception as e:
+                logger.error(f"Error muestreando métricas del sistema: {e}")
+                continue
+            self._notify(snapshot)
+
+    def subscribe(self, callback: Callable[[SystemSnapshot], None], every: float = 0.0) -> None:
+        """
+        Llama a ``callback(snapshot)`` desde el hilo del muestreador como mucho
+        cada ``every`` segundos, empezando en la próxima muestra. Sustituye a los
+        hilos de métricas propios de cada app.
+        """
+        self._subscribers.append(_Subscriber(callback, every))
+
+    def _notify(self, snapshot: SystemSnapshot) -> None:
+        for subscriber in tuple(self._subscribers):
+            if snapshot.timestamp - subscriber.last >= subscriber.every:
+                self._call(subscriber, snapshot)
+
+    @staticmethod
+    def _call(subscriber: _Subscriber, snapshot: SystemSnapshot) -> None:
+        subscriber.last = snapshot.timestamp
+        try:
+            subscriber.callback(snapshot)
+        except Exception as e:
+            logger.error(f"Error en suscriptor de métricas {subscriber.callback!r}: {e}")
+
+    # ----- muestreo -----
+
+    def sample(self) -> SystemSnapshot:
+        """Toma una muestra, publica y devuelve la nueva instantánea"""
+        cost_start = time.thread_time()
+        now = time.monotonic()
+        counters = self._reader()
+        previous, elapsed = self._previous, now - self._previous_time
+        collections, pause, pause_max = self._gc.drain()
+
+        process_cpu = system_cpu = ctx_vol = ctx_invol = 0.0
+        if previous is not None and elapsed > 0:
+            process_cpu = 100.0 * (counters.process_cpu_s - previous.process_cpu_s) / elapsed
+            total = counters.system_cpu_total_s - previous.system_cpu_total_s
+            if total > 0:
+                system_cpu = 100.0 * (counters.system_cpu_busy_s - previous.system_cpu_busy_s) / total
+            ctx_vol = (counters.ctx_voluntary - previous.ctx_voluntary) / elapsed
+            ctx_invol = (counters.ctx_involuntary - previous.ctx_involuntary) / elapsed
+
+        used = counters.memory_total_bytes - counters.memory_available_bytes
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            load = 0.0
+        snapshot = SystemSnapshot(
+            sequence=self.snapshot.sequence + 1,
+            timestamp=time.time(),
+            interval_s=round(elapsed, 6) if previous is not None else 0.0,
+            process_cpu_percent=round(process_cpu, 3),
+            system_cpu_percent=round(system_cpu, 3),
+            rss_mb=round(counters.rss_bytes / 1048576, 3),
+            memory_percent=round(100.0 * used / counters.memory_total_bytes, 3) if counters.memory_total_bytes else 0.0,
+            memory_used_mb=round(used / 1048576, 3),
+            memory_total_mb=round(counters.memory_total_bytes / 1048576, 3),
+            open_fds=counters.open_fds,
+            threads=counters.threads,
+            ctx_switches_voluntary_per_s=round(ctx_vol, 3),
+            ctx_switches_involuntary_per_s=round(ctx_invol, 3),
+            gc_collections=collections,
+            gc_pause_ms=round(pause * 1000, 3),
+            gc_pause_max_ms=round(pause_max * 1000, 3),
+            system_tasks=counters.system_tasks,
+            load_avg_1m=round(load, 3),
+            sampler_cost_us=round((time.thread_time() - cost_start) * 1e6, 3),
+        )
+        self._previous, self._previous_time = counters, now
+        self.snapshot = snapshot  # publicación atómica: los lectores no toman locks
+        return snapshot
+
+
+_sampler: Optional[SystemSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_system_sampler(start: bool = True) -> SystemSampler:
+    """Muestreador compartido por todo el proceso (arrancado en la primera llamada)"""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = SystemSampler()
+    if start:
+        _sampler.start()
+    return _sampler
+
+
+def current_snapshot() -> SystemSnapshot:
+    """Última instantánea publicada (arranca el muestreador si hace falta)"""
+    return get_system_sampler().snapshot
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+🔭 VIGOLEONROCKS - Trazas de peticiones a través del pipeline cuántico
+Spans ligeros propagados con ``contextvars`` para saber dónde se va el tiempo
+de una petición lenta (servicio unificado, activación de dimensiones,
+procesador paralelo, coherencia, generación de la respuesta):
+
+- ``span(nombre, **atributos)`` como context manager; los atributos se pueden
+  añadir después con ``set`` (p.ej. nº de dimensiones activas)
+- Desactivado (``TRACING_ENABLED=false``) ``span`` devuelve un singleton que no
+  hace nada: coste de una llamada y una comprobación de bandera
+- Muestreo en la raíz de la traza (``TRACING_SAMPLE``); los hijos de una traza
+  no muestreada tampoco se registran. La propagación sigue a las tareas
+  asyncio (copian el contexto al crearse) y a ``copy_context`` en hilos
+- Exportadores: buffer circular en memoria con las últimas trazas, las más
+  lentas y agregados por span (p50/p95/p99 y tiempo propio total) y JSONL opcional
+  escrito fuera del hilo de la petición
+- ``install_tracing``: span raíz por petición Flask, cabecera ``X-Trace-Id`` y
+  ``/debug/traces`` (HTML o ``?format=json``)
+"""
+
+import asyncio
+import functools
+import heapq
+import html
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from .entropy import get_entropy
+from .histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+DEFAULT_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE', 1.0))
+DEFAULT_RING_SIZE = int(os.getenv('TRACING_RING_SIZE', 512))
+DEFAULT_SLOWEST = int(os.getenv('TRACING_SLOWEST', 20))
+DEFAULT_FILE = os.getenv('TRACING_FILE', '')
+DEFAULT_EXCLUDE = ('/health', '/livez', '/readyz', '/startupz', '/metrics', '/static/', '/debug/')
+
+_current: ContextVar[Optional['Span']] = ContextVar('vigoleonrocks_span', default=None)
+_span_ids = itertools.count(1)
+
+
+# ----- spans -----
+
+class _NoopSpan:
+    """Span de los modos desactivado y no muestreado: todas las operaciones son no-ops"""
+    __slots__ = ()
+    recording = False
+    trace_id = None
+
+    def set(self, key: str, value: Any) -> '_NoopSpan':
+        return self
+
+    def update(self, **attributes: Any) -> '_NoopSpan':
+        return self
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _UnsampledRoot(_NoopSpan):
+    """Raíz no muestreada: marca el contexto para que los hijos tampoco se registren"""
+    __slots__ = ('_token',)
+
+    def __enter__(self) -> '_UnsampledRoot':
+        self._token = _current.set(NOOP_SPAN)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current.reset(self._token)
+
+
+class Trace:
+    """Spans de una petición; se exporta al cerrar el span raíz"""
+    __slots__ = ('trace_id', 'started', 'origin', 'spans', 'root')
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.started = time.time()
+        self.origin = time.perf_counter()
+        self.spans: List['Span'] = []  # list.append es atómico: hijos en otros hilos
+        self.root: Optional['Span'] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms if self.root else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        root = self.root
+        return {
+            'trace_id': self.trace_id,
+            'name': root.name if root else None,
+            'started': self.started,
+            'duration_ms': round(self.duration_ms, 3),
+            'error': root.error if root else None,
+            'attributes': dict(root.attributes) if root else {},
+            'spans': [span.to_dict() for span in self.spans],
+        }
+
+
+class Span:
+    __slots__ = ('tracer', 'trace', 'name', 'span_id', 'parent', 'attributes', 'start', 'end', 'error',
+                 '_child_intervals', '_token')
+    recording = True
+
+    def __init__(self, tracer: 'Tracer', trace: Trace, name: str, parent: Optional['Span'],
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.trace = trace
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent = parent
+        self.attributes = attributes
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        self._child_intervals: List[Tuple[float, float]] = []  # append atómico: hijos en otros hilos
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end if self.end is not None else time.perf_counter()) - self.start) * 1000
+
+    @property
+    def child_ms(self) -> float:
+        """Tiempo cubierto por los hijos directos terminados (los solapados cuentan una vez)"""
+        covered, reach = 0.0, None
+        for start, end in sorted(self._child_intervals):
+            if reach is None or start > reach:
+                covered += end - start
+                reach = end
+            elif end > reach:
+                covered += end - reach
+                reach = end
+        return covered * 1000
+
+    @property
+    def self_ms(self) -> float:
+        """Tiempo propio: duración menos la cubierta por los hijos directos"""
+        return max(0.0, self.duration_ms - self.child_ms)
+
+    def set(self, key: str, value: Any) -> 'Span':
+        self.attributes[key] = value
+        return self
+
+    def update(self, **attributes: Any) -> 'Span':
+        self.attributes.update(attributes)
+        return self
+
+    def __enter__(self) -> 'Span':
+        self.trace.spans.append(self)
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        if self.parent is not None:
+            self.parent._child_intervals.append((self.start, self.end))
+        else:
+            self.tracer._finish(self.trace)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'span_id': self.span_id,
+            'parent_id': self.parent.span_id if self.parent is not None else None,
+            'name': self.name,
+            'offset_ms': round((self.start - self.trace.origin) * 1000, 3),
+            'duration_ms': round(self.duration_ms, 3),
+            'self_ms': round(self.self_ms, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+# ----- exportadores -----
+
+class RingBufferExporter:
+    """Últimas ``capacity`` trazas, las ``slowest`` más lentas y agregados por nombre de span"""
+
+    def __init__(self, capacity: int = DEFAULT_RING_SIZE, slowest: int = DEFAULT_SLOWEST):
+        self.recent: Deque[Trace] = deque(maxlen=capacity)
+        self.slowest = slowest
+        self._slow: List[Tuple[float, int, Trace]] = []  # min-heap por duración
+        self._seq = itertools.count()
+        self.aggregates: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        with self._lock:
+            self.recent.append(trace)
+            entry = (trace.duration_ms, next(self._seq), trace)
+            if len(self._slow) < self.slowest:
+                heapq.heappush(self._slow, entry)
+            elif entry[0] > self._slow[0][0]:
+                heapq.heapreplace(self._slow, entry)
+            for span in trace.spans:
+                if span.end is None:
+                    continue  # hijo que sobrevive a la raíz (tarea en segundo plano)
+                agg = self.aggregates.get(span.name)
+                if agg is None:
+                    agg = self.aggregates[span.name] = {'errors': 0, 'self_ms': 0.0, 'total': LatencyHistogram()}
+                duration = (span.end - span.start) * 1000
+                agg['total'].record(duration)
+                agg['self_ms'] += max(0.0, duration - span.child_ms)
+                if span.error is not None:
+                    agg['errors'] += 1
+
+    def find(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            candidates = list(self.recent) + [t for _, _, t in self._slow]
+        return next((t for t in candidates if t.trace_id == trace_id), None)
+
+    def slowest_traces(self, limit: Optional[int] = None) -> List[Trace]:
+        with self._lock:
+            ordered = sorted(self._slow, key=lambda entry: entry[0], reverse=True)
+        return [trace for _, _, trace in ordered[:limit]]
+
+    def span_stats(self) -> List[Dict[str, Any]]:
+        """Agregados por span ordenados por tiempo propio total (dónde se va el tiempo)"""
+        with self._lock:
+            rows = []
+            for name, agg in self.aggregates.items():
+                total = agg['total']
+                rows.append({
+                    'name': name,
+                    'count': total.count,
+                    'errors': agg['errors'],
+                    'mean_ms': round(total.mean, 3),
+                    'p50_ms': round(total.quantile(0.50), 3),
+                    'p95_ms': round(total.quantile(0.95), 3),
+                    'p99_ms': round(total.quantile(0.99), 3),
+                    'max_ms': round(total.max, 3),
+                    'self_total_ms': round(agg['self_ms'], 3),
+                })
+        return sorted(rows, key=lambda row: row['self_total_ms'], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.recent.clear()
+            self._slow.clear()
+            self.aggregates.clear()
+
+
+class FileExporter:
+    """Una línea JSON por traza; la escritura la hace un hilo propio (se descarta si la cola se llena)"""
+
+    def __init__(self, path: Union[str, Path], max_queue: int = 10000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.dropped = 0
+        self._queue: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name='trace-file-exporter', daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                f.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+# ----- tracer -----
+
+class Tracer:
+    def __init__(self, enabled: bool = DEFAULT_ENABLED, sample_rate: float = DEFAULT_SAMPLE_RATE,
+                 ring_size: int = DEFAULT_RING_SIZE, slowest: int = DEFAULT_SLOWEST,
+                 file_path: Optional[Union[str, Path]] = DEFAULT_FILE or None):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.ring = RingBufferExporter(ring_size, slowest)
+        self.exporters: List[Any] = [self.ring]
+        if enabled and file_path:
+            self.exporters.append(FileExporter(file_path))
+        self.counters = {'traces': 0, 'unsampled': 0, 'export_errors': 0}
+        self._sampler = get_entropy().stream('tracing')
+
+    def span(self, name: str, **attributes: Any) -> Union[Span, _NoopSpan]:
+        """Span hijo del actual o raíz de una traza nueva (sujeta a muestreo)"""
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current.get()
+        if parent is None:
+            if self.sample_rate < 1.0 and self._sampler.random() >= self.sample_rate:
+                self.counters['unsampled'] += 1
+                return _UnsampledRoot()
+            trace = Trace(f"{self._sampler.getrandbits(64):016x}")
+            span = Span(self, trace, name, None, attributes)
+            trace.root = span
+            return span
+        if parent is NOOP_SPAN:
+            return NOOP_SPAN
+        return Span(self, parent.trace, name, parent, attributes)
+
+    def _finish(self, trace: Trace) -> None:
+        self.counters['traces'] += 1
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except Exception as e:
+                self.counters['export_errors'] += 1
+                logger.warning(f"Exportador de trazas fallido: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {'enabled': self.enabled, 'sample_rate': self.sample_rate, **self.counters}
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            if hasattr(exporter, 'close'):
+                exporter.close()
+
+
+def current_span() -> Union[Span, _NoopSpan]:
+    """Span activo del contexto (``NOOP_SPAN`` si no hay)"""
+    return _current.get() or NOOP_SPAN
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Sustituye el tracer global (tests, benchmarks); devuelve el anterior"""
+    global _tracer
+    previous = get_tracer()
+    _tracer = tracer
+    return previous
+
+
+def span(name: str, **attributes: Any) -> Union[Span, _NoopSpan]:
+    """``with span('Clase.metodo', text_length=n) as s: ...`` sobre el tracer global"""
+    return (_tracer or get_tracer()).span(name, **attributes)
+
+
+# ----- Flask -----
+
+def _render_trace(trace: Trace) -> str:
+    children: Dict[Optional[int], List[Span]] = {}
+    for s in trace.spans:
+        children.setdefault(s.parent.span_id if s.parent is not None else None, []).append(s)
+    total = max(trace.duration_ms, 1e-9)
+    rows = []
+
+    def walk(parent_id: Optional[int], depth: int) -> None:
+        for s in sorted(children.get(parent_id, []), key=lambda s: s.start):
+            offset = (s.start - trace.origin) * 1000
+            attrs = ', '.join(f"{k}={v}" for k, v in s.attributes.items())
+            bar = (f'<span class="bar" style="margin-left:{offset / total * 100:.1f}%;'
+                   f'width:{max(s.duration_ms / total * 100, 0.3):.1f}%"></span>')
+            rows.append(
+                f'<tr><td style="padding-left:{depth * 1.2 + 0.3:.1f}em">{html.escape(s.name)}'
+                f'{" ⚠️ " + html.escape(s.error) if s.error else ""}</td>'
+                f'<td class="n">{s.duration_ms:.2f}</td><td class="n">{s.self_ms:.2f}</td>'
+                f'<td class="t">{bar}</td><td>{html.escape(attrs)}</td></tr>')
+            walk(s.span_id, depth + 1)
+
+    walk(None, 0)
+    return (f'<h3>{html.escape(trace.root.name if trace.root else "?")} — {trace.duration_ms:.2f} ms '
+            f'<small>{trace.trace_id} · {time.strftime("%H:%M:%S", time.localtime(trace.started))}</small></h3>'
+            '<table><tr><th>span</th><th>ms</th><th>self ms</th><th>timeline</th><th>attributes</th></tr>'
+            + ''.join(rows) + '</table>')
+
+
+def render_traces_html(tracer: Tracer, limit: int = DEFAULT_SLOWEST, traces: Optional[Sequence[Trace]] = None) -> str:
+    stats = tracer.ring.span_stats()
+    stat_rows = ''.join(
+        f'<tr><td>{html.escape(r["name"])}</td><td class="n">{r["count"]}</td><td class="n">{r["errors"]}</td>'
+        f'<td class="n">{r["mean_ms"]}</td><td class="n">{r["p50_ms"]}</td><td class="n">{r["p95_ms"]}</td>'
+        f'<td class="n">{r["p99_ms"]}</td><td class="n">{r["max_ms"]}</td><td class="n">{r["self_total_ms"]}</td></tr>'
+        for r in stats)
+    traces = tracer.ring.slowest_traces(limit) if traces is None else traces
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>VIGOLEONROCKS traces</title><style>'
+        'body{font-family:monospace;margin:1.5em}table{border-collapse:collapse;width:100%;margin-bottom:1em}'
+        'td,th{border-bottom:1px solid #ddd;padding:.2em .4em;text-align:left;vertical-align:top}'
+        '.n{text-align:right}.t{width:30%}.bar{display:inline-block;height:.8em;background:#4a7bd0}'
+        '</style></head><body>'
+        f'<h1>🔭 Traces</h1><p>{html.escape(json.dumps(tracer.stats()))}</p>'
+        '<h2>Per-span latency (ms), sorted by total self time</h2>'
+        '<table><tr><th>span</th><th>count</th><th>errors</th><th>mean</th><th>p50</th><th>p95</th>'
+        f'<th>p99</th><th>max</th><th>self total</th></tr>{stat_rows}</table>'
+        f'<h2>Slowest traces</h2>{"".join(_render_trace(t) for t in traces) or "<p>No traces yet</p>"}'
+        '</body></html>')
+
+
+def install_tracing(app, tracer: Optional[Tracer] = None, route: str = '/debug/traces',
+                    exclude: Sequence[str] = DEFAULT_EXCLUDE) -> Tracer:
+    """
+    Span raíz por petición (``MÉTODO regla``) y endpoint de depuración
+
+    ``GET /debug/traces`` muestra agregados por span y las trazas más lentas;
+    ``?format=json`` devuelve lo mismo en JSON, ``?trace_id=`` una traza concreta
+    y ``?limit=`` cuántas trazas lentas. Las trazas guardan longitudes y
+    contadores, nunca el texto de las consultas.
+    """
+    from flask import Response, g, jsonify, request
+
+    tracer = tracer or get_tracer()
+
+    @app.before_request
+    def _trace_begin():
+        if not tracer.enabled or request.path.startswith(tuple(exclude)):
+            return None
+        rule = request.url_rule.rule if request.url_rule else request.path
+        root = tracer.span(f"{request.method} {rule}", http_method=request.method, path=request.path,
+                           content_length=request.content_length or 0)
+        root.__enter__()
+        g._trace_root = root
+        return None
+
+    @app.after_request
+    def _trace_status(response):
+        root = g.get('_trace_root')
+        if root is not None and root.recording:
+            root.set('status', response.status_code)
+            response.headers['X-Trace-Id'] = root.trace_id
+        return response
+
+    @app.teardown_request
+    def _trace_end(exc):
+        root = g.pop('_trace_root', None)
+        if root is not None:
+            root.__exit__(type(exc) if exc else None, exc, None)
+
+    def debug_traces():
+        limit = request.args.get('limit', DEFAULT_SLOWEST, type=int)
+        trace_id = request.args.get('trace_id')
+        traces = None
+        if trace_id:
+            found = tracer.ring.find(trace_id)
+            if found is None:
+                return jsonify({'error': 'trace not found', 'trace_id': trace_id}), 404
+            traces = [found]
+        if request.args.get('format') == 'json':
+            traces = traces if traces is not None else tracer.ring.slowest_traces(limit)
+            return jsonify({
+                'tracer': tracer.stats(),
+                'spans': tracer.ring.span_stats(),
+                'slowest': [t.to_dict() for t in traces],
+            })
+        return Response(render_traces_html(tracer, limit, traces), mimetype='text/html')
+
+    app.add_url_rule(route, 'debug_traces', debug_traces, methods=['GET'])
+    app.extensions['vigoleonrocks_tracing'] = tracer
+    return tracer
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorador: ejecuta la función (síncrona o ``async``) dentro de un span"""
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                tracer = _tracer or get_tracer()
+                if not tracer.enabled or _current.get() is NOOP_SPAN:
+                    return await fn(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer or get_tracer()
+            if not tracer.enabled or _current.get() is NOOP_SPAN:  # desactivado o traza no muestreada
+                return fn(*args, **kwargs)
+            with tracer.span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+📼 VIGOLEONROCKS - Captura de tráfico real para replay
+Muestrea peticiones reales (método, ruta, subconjunto de cabeceras, cuerpo o
+su hash, tiempos y resumen de la respuesta) en archivos JSONL rotativos, para
+reproducir la mezcla de producción contra una build candidata
+(``scripts/traffic_replay.py``):
+
+- Muestreo por petición (``TRAFFIC_CAPTURE_SAMPLE``) con un generador
+  derivado de ``services.entropy``: no altera las elecciones de las peticiones
+  y con ``ENTROPY_SEED`` el propio muestreo también se reproduce
+- Escritura fuera del hilo de la petición (``QueueHandler`` +
+  ``RotatingFileHandler``), un archivo por proceso para no intercalar líneas
+  entre workers
+- Limpieza de PII antes de escribir: cabeceras sensibles, emails, teléfonos,
+  tarjetas, IPs y claves de API, también en query strings y formularios
+  URL-encoded (se decodifican antes de limpiar), y valores cuya clave
+  nombra un secreto (password, token, secret, api_key...); ``add_scrubber``
+  añade hooks propios (un hook que devuelve ``None`` descarta el registro)
+- Cuerpos multipart o mayores que ``TRAFFIC_CAPTURE_BODY_LIMIT`` no se leen:
+  solo se guardan tamaño y tipo (no se rompe la ingesta en streaming)
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, quote, urlencode
+
+from .entropy import get_entropy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENABLED = os.getenv('TRAFFIC_CAPTURE_ENABLED', 'false').lower() == 'true'
+DEFAULT_SAMPLE_RATE = float(os.getenv('TRAFFIC_CAPTURE_SAMPLE', 0.01))
+DEFAULT_DIR = os.getenv('TRAFFIC_CAPTURE_DIR', 'logs/traffic')
+DEFAULT_MAX_BYTES = int(os.getenv('TRAFFIC_CAPTURE_MAX_BYTES', 64 * 1024 * 1024))
+DEFAULT_BACKUPS = int(os.getenv('TRAFFIC_CAPTURE_BACKUPS', 10))
+DEFAULT_BODY_LIMIT = int(os.getenv('TRAFFIC_CAPTURE_BODY_LIMIT', 64 * 1024))
+DEFAULT_HEADERS = ('Content-Type', 'Accept', 'Accept-Language', 'User-Agent', 'X-Request-Index')
+DEFAULT_EXCLUDE = ('/health', '/livez', '/readyz', '/startupz', '/metrics', '/static/', '/debug/')
+SENSITIVE_HEADERS = {'authorization', 'cookie', 'set-cookie', 'x-api-key', 'proxy-authorization'}
+
+Scrubber = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# ----- limpieza de PII -----
+
+_PII_PATTERNS: Sequence[Tuple[re.Pattern, str]] = (
+    (re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'), '[EMAIL]'),
+    (re.compile(r'\b(?:sk|pk|rk)[-_][A-Za-z0-9_-]{16,}\b'), '[API_KEY]'),
+    (re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b'), '[IP]'),
+    (re.compile(r'\b(?:\d[ -]?){13,19}\b'), '[CARD]'),
+    (re.compile(r'(?<![\w.])\+?\d[\d ().-]{7,}\d\b'), '[PHONE]'),
+)
+# Claves cuyo valor se redacta entero (JSON, query, formularios): password, access_token, client_secret,
+# userPassword...; por el final para no tocar contadores como tokens_used o max_tokens
+SECRET_KEY = re.compile(r'(?:password|passwd|pwd|token|secret|api[-_]?key|authorization|credentials?|private[-_]?key)$',
+                        re.IGNORECASE)
+_FORM_BODY = re.compile(r'^[^=&\s]+=[^&\s]*(?:&[^=&\s]+=[^&\s]*)*$')
+
+
+def scrub_text(text: str) -> str:
+    for pattern, replacement in _PII_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _scrub_json(value: Any) -> Any:
+    """Solo se tocan las cadenas y los valores de claves secretas: la estructura del JSON se conserva"""
+    if isinstance(value, str):
+        return scrub_text(value)
+    if isinstance(value, list):
+        return [_scrub_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: ('[REDACTED]' if SECRET_KEY.search(k) else _scrub_json(v)) for k, v in value.items()}
+    return value
+
+
+def scrub_urlencoded(text: str) -> str:
+    """Query string o formulario: se decodifica (``%40``, ``+``) antes de limpiar y se vuelve a codificar"""
+    pairs = parse_qsl(text, keep_blank_values=True)
+    scrubbed = [(k, '[REDACTED]' if SECRET_KEY.search(k) else scrub_text(v)) for k, v in pairs]
+    if scrubbed == pairs:
+        return text  # sin cambios: se conserva la codificación original para el replay
+    return urlencode(scrubbed, quote_via=quote, safe='[]@')
+
+
+def scrub_pii(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Hook por defecto: cabeceras sensibles fuera, PII del cuerpo y la query sustituida"""
+    record['headers'] = {k: ('[REDACTED]' if k.lower() in SENSITIVE_HEADERS else v)
+                         for k, v in record.get('headers', {}).items()}
+    if record.get('query'):
+        record['query'] = scrub_urlencoded(record['query'])
+    body = record.get('body')
+    if isinstance(body, str):
+        content_type = next((v for k, v in record['headers'].items() if k.lower() == 'content-type'), '')
+        try:
+            scrubbed = json.dumps(_scrub_json(json.loads(body)), ensure_ascii=False)
+        except ValueError:
+            if content_type.startswith('application/x-www-form-urlencoded') or _FORM_BODY.match(body):
+                scrubbed = scrub_urlencoded(body)
+            else:
+                scrubbed = scrub_text(body)
+        if scrubbed != body:
+            record['body'] = scrubbed
+            record['body_sha256'] = hashlib.sha256(scrubbed.encode()).hexdigest()
+    return record
+
+
+# ----- escritura -----
+
+class TrafficCapture:
+    """
+    Captura muestreada de peticiones a JSONL rotativo
+
+    Args:
+        directory: Carpeta de los archivos ``<name>-<pid>.jsonl``
+        name: Prefijo del archivo (app, gateway...)
+        sample_rate: Fracción de peticiones capturadas (0..1)
+        enabled: ``False`` deja los hooks instalados sin coste
+        headers: Cabeceras de petición que se guardan (lista blanca)
+        exclude: Prefijos de ruta que nunca se capturan
+        body_limit: Bytes máximos de cuerpo guardado; por encima solo tamaño
+    """
+
+    def __init__(self, directory: Union[str, Path] = DEFAULT_DIR, name: str = 'app',
+                 sample_rate: float = DEFAULT_SAMPLE_RATE, enabled: bool = DEFAULT_ENABLED,
+                 headers: Sequence[str] = DEFAULT_HEADERS, exclude: Sequence[str] = DEFAULT_EXCLUDE,
+                 body_limit: int = DEFAULT_BODY_LIMIT, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backups: int = DEFAULT_BACKUPS, scrubbers: Optional[Iterable[Scrubber]] = None):
+        self.directory = Path(directory)
+        self.name = name
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.enabled = enabled and self.sample_rate > 0
+        self.headers = tuple(headers)
+        self.exclude = tuple(exclude)
+        self.body_limit = body_limit
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.scrubbers: List[Scrubber] = list(scrubbers) if scrubbers is not None else [scrub_pii]
+        self._sampler = get_entropy().stream('traffic-capture', name)
+        self._queue: Optional[queue.Queue] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._writer: Optional[logging.Logger] = None
+        self._lock = threading.Lock()
+        self.counters = {'seen': 0, 'sampled': 0, 'written': 0, 'dropped': 0}
+
+    def add_scrubber(self, scrubber: Scrubber) -> None:
+        """Hook de limpieza; recibe el registro y devuelve el registro (o ``None`` para descartarlo)"""
+        self.scrubbers.append(scrubber)
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{self.name}-{os.getpid()}.jsonl"
+
+    def should_capture(self, path: str) -> bool:
+        if not self.enabled:
+            return False
+        self.counters['seen'] += 1
+        if path.startswith(self.exclude):
+            return False
+        if self.sample_rate < 1.0 and self._sampler.random() >= self.sample_rate:
+            return False
+        self.counters['sampled'] += 1
+        return True
+
+    def _start(self) -> logging.Logger:
+        if self._writer is not None:
+            return self._writer
+        with self._lock:
+            if self._writer is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                self._queue = queue.Queue(maxsize=10000)
+                self._listener = logging.handlers.QueueListener(self._queue, handler)
+                self._listener.start()
+                writer = logging.getLogger(f"{__name__}.{self.name}.{id(self)}")
+                writer.propagate = False
+                writer.setLevel(logging.INFO)
+                writer.addHandler(_DroppingQueueHandler(self._queue, self))
+                self._writer = writer
+        return self._writer
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """Aplica los hooks de limpieza y encola el registro; ``False`` si se descartó"""
+        for scrubber in self.scrubbers:
+            record = scrubber(record)
+            if record is None:
+                self.counters['dropped'] += 1
+                return False
+        self._start().info(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self.counters['written'] += 1
+        return True
+
+    def flush(self) -> None:
+        """Espera a que la cola se vuelque al archivo (tests, apagado)"""
+        if self._listener is not None:
+            with self._lock:
+                self._listener.stop()
+                self._listener.start()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._listener is None:
+                return
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            for handler in list(self._writer.handlers):
+                self._writer.removeHandler(handler)
+            self._listener = self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {'enabled': self.enabled, 'sample_rate': self.sample_rate,
+                'path': str(self.path), **self.counters}
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Con la cola llena se pierde el registro en lugar de bloquear la petición"""
+
+    def __init__(self, q: queue.Queue, capture: TrafficCapture):
+        super().__init__(q)
+        self.capture = capture
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.capture.counters['dropped'] += 1
+
+
+# ----- registros -----
+
+def encode_body(data: bytes, limit: int) -> Dict[str, Any]:
+    """Cuerpo como texto (JSON/texto), base64 (binario) o solo tamaño si no cabe"""
+    fields: Dict[str, Any] = {'body_size': len(data)}
+    if not data:
+        return fields
+    if len(data) > limit:
+        fields['body_omitted'] = 'too_large'
+        return fields
+    try:
+        fields['body'] = data.decode('utf-8')
+    except UnicodeDecodeError:
+        fields['body_b64'] = base64.b64encode(data).decode('ascii')
+    fields['body_sha256'] = hashlib.sha256(data).hexdigest()
+    return fields
+
+
+def decode_body(record: Dict[str, Any]) -> Optional[bytes]:
+    if 'body' in record:
+        return record['body'].encode('utf-8')
+    if 'body_b64' in record:
+        return base64.b64decode(record['body_b64'])
+    return None if record.get('body_omitted') else b''
+
+
+def load_capture(paths: Iterable[Union[str, Path]]) -> List[Dict[str, Any]]:
+    """Registros de uno o varios archivos/carpetas de captura, ordenados por llegada"""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('*.jsonl*')) if path.is_dir() else [path])
+    records = []
+    for file in files:
+        with open(file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Línea de captura inválida en {file}")
+    records.sort(key=lambda r: r['ts'])
+    return records
+
+
+def install_traffic_capture(app, capture: Optional[TrafficCapture] = None,
+                            name: Optional[str] = None) -> TrafficCapture:
+    """
+    Registra la captura en una app Flask (before/after_request)
+
+    Se instala antes que el resto de middleware para que el instante de
+    llegada incluya colas y rechazos (429/503 también se capturan).
+    """
+    from flask import g, request
+
+    capture = capture or TrafficCapture(name=name or app.name)
+
+    @app.before_request
+    def _capture_begin():
+        if not capture.should_capture(request.path):
+            return None
+        record = {
+            'ts': time.time(),
+            'source': capture.name,
+            'method': request.method,
+            'path': request.path,
+            'route': request.url_rule.rule if request.url_rule else None,
+            'query': request.query_string.decode('latin-1'),
+            'headers': {h: request.headers[h] for h in capture.headers if h in request.headers},
+        }
+        length = request.content_length or 0
+        if request.mimetype == 'multipart/form-data':
+            record.update(body_size=length, body_omitted='multipart')
+        elif length > capture.body_limit:
+            record.update(body_size=length, body_omitted='too_large')
+        else:
+            record.update(encode_body(request.get_data(cache=True), capture.body_limit))
+        g._traffic_capture = (record, time.perf_counter())
+        return None
+
+    @app.after_request
+    def _capture_end(response):
+        pending = g.pop('_traffic_capture', None)
+        if pending is None:
+            return response
+        record, started = pending
+        record['duration_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        record['status'] = response.status_code
+        if not response.is_streamed and not response.direct_passthrough:
+            body = response.get_data()
+            record['response_size'] = len(body)
+            record['response_sha256'] = hashlib.sha256(body).hexdigest()
+        try:
+            capture.write(record)
+        except Exception as e:
+            logger.warning(f"Captura de tráfico fallida: {e}")
+        return response
+
+    app.extensions['vigoleonrocks_traffic_capture'] = capture
+    return capture
+
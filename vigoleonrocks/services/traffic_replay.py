@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+⏯️ VIGOLEONROCKS - Replay de tráfico capturado y comparación de ejecuciones
+Reenvía los registros de ``traffic_capture`` contra un destino respetando los
+tiempos entre llegadas originales y compara dos ejecuciones:
+
+- Planificación en lazo abierto: cada petición sale en
+  ``(ts - ts_0) / speed``; la latencia se mide desde ese instante previsto,
+  así que un destino lento no frena el ritmo ni oculta su cola
+- Conexiones keep-alive por hilo (``http.client``), sin dependencias
+- ``X-Request-Index`` se reenvía: contra un destino con ``ENTROPY_SEED`` las
+  respuestas son reproducibles y el diff de cuerpos es exacto
+- Informe: latencias p50/p95/p99 y errores por ruta de cada ejecución,
+  cambios de estado HTTP y diferencias de cuerpo JSON (ignorando campos
+  volátiles como ``timestamp`` o ``processing_time``)
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+from .traffic_capture import decode_body
+
+logger = logging.getLogger(__name__)
+
+VOLATILE_KEYS = frozenset({
+    'timestamp', 'processed_at', 'processing_time', 'processing_time_ms', 'response_time',
+    'response_time_ms', 'duration_ms', 'uptime', 'uptime_seconds', 'last_update', 'server_time',
+    'request_id', 'upload_id', 'analysis_id',
+})
+DEFAULT_MAX_DIFFS = 50
+_BODY_KEEP = 64 * 1024  # bytes de respuesta guardados para el diff
+
+
+@dataclass
+class ReplayResult:
+    """Resultado de una petición reenviada"""
+    index: int
+    method: str
+    path: str
+    route: Optional[str]
+    offset_s: float
+    status: Optional[int] = None
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    body_sha256: Optional[str] = None
+    body: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or (self.status or 0) >= 500
+
+
+class _ConnectionPool:
+    """Una conexión keep-alive por hilo del pool"""
+
+    def __init__(self, target: str, timeout: float):
+        parts = urlsplit(target)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def request(self, method: str, url: str, body: Optional[bytes], headers: Dict[str, str]) -> Tuple[int, bytes]:
+        for attempt in (0, 1):
+            conn = self._connection()
+            try:
+                conn.request(method, self.prefix + url, body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Conexión keep-alive cerrada por el servidor: se reabre una vez
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+        raise RuntimeError('unreachable')
+
+
+def replay(records: Sequence[Dict[str, Any]], target: str, speed: float = 1.0, workers: int = 32,
+           timeout: float = 30.0, extra_headers: Optional[Dict[str, str]] = None,
+           on_result: Optional[Callable[[ReplayResult], None]] = None) -> List[ReplayResult]:
+    """
+    Reenvía ``records`` contra ``target`` con los tiempos originales
+
+    Args:
+        speed: Multiplicador del ritmo (2 = el doble de rápido); ``0`` = sin esperas
+        workers: Peticiones simultáneas como máximo (si se agotan, la espera cuenta como latencia)
+    """
+    pool = _ConnectionPool(target, timeout)
+    results: List[Optional[ReplayResult]] = [None] * len(records)
+    first_ts = records[0]['ts'] if records else 0.0
+
+    def send(index: int, record: Dict[str, Any], due: float, offset: float) -> None:
+        result = ReplayResult(index, record['method'], record['path'], record.get('route'), round(offset, 6))
+        body = decode_body(record)
+        if body is None:
+            result.error = f"skipped: {record.get('body_omitted')}"
+        else:
+            url = record['path'] + (f"?{record['query']}" if record.get('query') else '')
+            headers = {**record.get('headers', {}), **(extra_headers or {})}
+            try:
+                status, payload = pool.request(record['method'], url, body or None, headers)
+                result.status = status
+                result.body_sha256 = hashlib.sha256(payload).hexdigest()
+                result.body = payload[:_BODY_KEEP].decode('utf-8', errors='replace')
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+            result.latency_ms = round((time.perf_counter() - due) * 1000, 3)
+        results[index] = result
+        if on_result is not None:
+            on_result(result)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='traffic-replay') as executor:
+        start = time.perf_counter()
+        for index, record in enumerate(records):
+            offset = (record['ts'] - first_ts) / speed if speed > 0 else 0.0
+            due = start + offset
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, index, record, due, offset)
+    return [r for r in results if r is not None]
+
+
+# ----- persistencia -----
+
+def save_results(results: Iterable[ReplayResult], path: Union[str, Path], meta: Optional[Dict[str, Any]] = None) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'meta': meta or {}}, ensure_ascii=False) + '\n')
+        for result in results:
+            f.write(json.dumps(asdict(result), ensure_ascii=False) + '\n')
+
+
+def load_results(path: Union[str, Path]) -> Tuple[Dict[str, Any], List[ReplayResult]]:
+    meta: Dict[str, Any] = {}
+    results = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            if 'meta' in data:
+                meta = data['meta']
+            else:
+                results.append(ReplayResult(**data))
+    return meta, results
+
+
+# ----- comparación -----
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(results: Sequence[ReplayResult]) -> Dict[str, Any]:
+    sent = [r for r in results if not (r.error or '').startswith('skipped')]
+    latencies = [r.latency_ms for r in sent if r.latency_ms is not None]
+    errors = sum(1 for r in sent if r.failed)
+    return {
+        'requests': len(sent),
+        'skipped': len(results) - len(sent),
+        'errors': errors,
+        'error_rate': round(errors / len(sent), 4) if sent else 0.0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': max(latencies, default=None),
+    }
+
+
+def _normalize(value: Any, ignore: frozenset) -> Any:
+    if isinstance(value, dict):
+        return {k: _normalize(v, ignore) for k, v in value.items() if k not in ignore}
+    if isinstance(value, list):
+        return [_normalize(v, ignore) for v in value]
+    return value
+
+
+def diff_json(a: Any, b: Any, path: str = '$', limit: int = 10) -> List[str]:
+    """Rutas JSON (estilo ``$.a[0].b``) donde ``a`` y ``b`` difieren"""
+    diffs: List[str] = []
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in sorted(set(a) | set(b)):
+            if key not in a or key not in b:
+                diffs.append(f"{path}.{key}")
+            else:
+                diffs.extend(diff_json(a[key], b[key], f"{path}.{key}", limit - len(diffs)))
+            if len(diffs) >= limit:
+                break
+    elif isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        for i, (x, y) in enumerate(zip(a, b)):
+            diffs.extend(diff_json(x, y, f"{path}[{i}]", limit - len(diffs)))
+            if len(diffs) >= limit:
+                break
+    elif a != b:
+        diffs.append(path)
+    return diffs[:limit]
+
+
+def body_diff(a: ReplayResult, b: ReplayResult, ignore: frozenset = VOLATILE_KEYS) -> List[str]:
+    if a.body_sha256 == b.body_sha256:
+        return []
+    try:
+        return diff_json(_normalize(json.loads(a.body), ignore), _normalize(json.loads(b.body), ignore))
+    except (TypeError, ValueError):
+        return ['$'] if a.body != b.body else []
+
+
+def compare(baseline: Sequence[ReplayResult], candidate: Sequence[ReplayResult],
+            ignore: frozenset = VOLATILE_KEYS, max_diffs: int = DEFAULT_MAX_DIFFS) -> Dict[str, Any]:
+    """Informe de latencia, errores y diferencias de respuesta entre dos ejecuciones del mismo replay"""
+    by_route: Dict[str, Tuple[List[ReplayResult], List[ReplayResult]]] = {}
+    for side, results in enumerate((baseline, candidate)):
+        for r in results:
+            by_route.setdefault(r.route or r.path, ([], []))[side].append(r)
+
+    candidate_by_index = {r.index: r for r in candidate}
+    status_changes, body_changes = [], []
+    for a in baseline:
+        b = candidate_by_index.get(a.index)
+        if b is None or a.error or b.error:
+            continue
+        if a.status != b.status:
+            status_changes.append({'index': a.index, 'path': a.path, 'baseline': a.status, 'candidate': b.status})
+        elif len(body_changes) < max_diffs:
+            paths = body_diff(a, b, ignore)
+            if paths:
+                body_changes.append({'index': a.index, 'path': a.path, 'fields': paths})
+
+    def delta(base: Optional[float], cand: Optional[float]) -> Optional[float]:
+        return round((cand - base) / base * 100, 1) if base and cand is not None else None
+
+    overall = {'baseline': summarize(baseline), 'candidate': summarize(candidate)}
+    overall['p99_delta_pct'] = delta(overall['baseline']['p99_ms'], overall['candidate']['p99_ms'])
+    routes = {}
+    for route, (a, b) in sorted(by_route.items()):
+        routes[route] = {'baseline': summarize(a), 'candidate': summarize(b)}
+        routes[route]['p99_delta_pct'] = delta(routes[route]['baseline']['p99_ms'], routes[route]['candidate']['p99_ms'])
+    return {
+        'overall': overall,
+        'routes': routes,
+        'status_changes': status_changes,
+        'body_changes': body_changes,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Tabla de texto del informe de ``compare``"""
+    def ms(value):
+        return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+    lines = [f"{'route':<36} {'run':<10} {'reqs':>6} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'Δp99':>7}"]
+    rows = [('TOTAL', report['overall'])] + list(report['routes'].items())
+    for route, stats in rows:
+        for run in ('baseline', 'candidate'):
+            s = stats[run]
+            d = stats['p99_delta_pct'] if run == 'candidate' and stats['p99_delta_pct'] is not None else None
+            lines.append(f"{route[:36]:<36} {run:<10} {s['requests']:>6} {s['error_rate'] * 100:>5.1f}% "
+                         f"{ms(s['p50_ms'])} {ms(s['p95_ms'])} {ms(s['p99_ms'])} "
+                         f"{(f'{d:+.1f}%' if d is not None else ''):>7}")
+    lines.append(f"status changes: {len(report['status_changes'])}   body changes: {len(report['body_changes'])}")
+    for change in report['status_changes'][:10]:
+        lines.append(f"  #{change['index']} {change['path']}: {change['baseline']} -> {change['candidate']}")
+    for change in report['body_changes'][:10]:
+        lines.append(f"  #{change['index']} {change['path']}: {', '.join(change['fields'])}")
+    return '\n'.join(lines)
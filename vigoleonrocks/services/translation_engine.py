@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+🔤 VIGOLEONROCKS - Motor de traducción por diccionario en una sola pasada
+Compila cada tabla de frases (por par de idiomas) una única vez en un trie de
+coincidencia más larga y reemplaza en un solo recorrido del texto:
+
+- Respeta límites de palabra ("hi" no toca "this")
+- Las traducciones insertadas nunca se vuelven a reemplazar
+- Conserva mayúsculas (HOLA -> HELLO, Hola -> Hello)
+- Tablas adicionales desde archivos TSV locales ``<origen>-<destino>.tsv``
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_TABLES_DIR = Path(__file__).resolve().parent.parent / 'data' / 'translation'
+
+# Tabla de frases por defecto: frase de origen -> {idioma destino: traducción}
+DEFAULT_PHRASES: Dict[str, Dict[str, str]] = {
+    'hello': {'es': 'hola', 'pt': 'olá'},
+    'hi': {'es': 'hola', 'pt': 'oi'},
+    'how are you': {'es': 'cómo estás', 'pt': 'como vai'},
+    'thank you': {'es': 'gracias', 'pt': 'obrigado'},
+    'thanks': {'es': 'gracias', 'pt': 'obrigado'},
+    'please': {'es': 'por favor', 'pt': 'por favor'},
+    'who are you': {'es': 'quién eres', 'pt': 'quem é você'},
+    'what can you do': {'es': 'qué puedes hacer', 'pt': 'o que você pode fazer'},
+    'good morning': {'es': 'buenos días', 'pt': 'bom dia'},
+    'good afternoon': {'es': 'buenas tardes', 'pt': 'boa tarde'},
+    'good evening': {'es': 'buenas noches', 'pt': 'boa noite'},
+    'goodbye': {'es': 'adiós', 'pt': 'tchau'},
+    'bye': {'es': 'adiós', 'pt': 'tchau'},
+    'see you': {'es': 'nos vemos', 'pt': 'até logo'},
+    'hola': {'en': 'hello', 'pt': 'olá'},
+    'gracias': {'en': 'thank you', 'pt': 'obrigado'},
+    'quién eres': {'en': 'who are you', 'pt': 'quem é você'},
+    'qué puedes hacer': {'en': 'what can you do', 'pt': 'o que você pode fazer'},
+    'buenos días': {'en': 'good morning', 'pt': 'bom dia'},
+    'buenas tardes': {'en': 'good afternoon', 'pt': 'boa tarde'},
+    'buenas noches': {'en': 'good evening', 'pt': 'boa noite'},
+    'adiós': {'en': 'goodbye', 'pt': 'tchau'},
+    'nos vemos': {'en': 'see you', 'pt': 'até logo'},
+    'olá': {'en': 'hello', 'es': 'hola'},
+    'obrigado': {'en': 'thank you', 'es': 'gracias'},
+    'quem é você': {'en': 'who are you', 'es': 'quién eres'},
+    'o que você pode fazer': {'en': 'what can you do', 'es': 'qué puedes hacer'},
+    'bom dia': {'en': 'good morning', 'es': 'buenos días'},
+    'boa tarde': {'en': 'good afternoon', 'es': 'buenas tardes'},
+    'boa noite': {'en': 'good evening', 'es': 'buenas noches'},
+    'tchau': {'en': 'goodbye', 'es': 'adiós'},
+    'até logo': {'en': 'see you', 'es': 'nos vemos'},
+}
+
+ANY_SOURCE = '*'
+
+_TERMINAL = ''
+
+
+def _match_case(source: str, replacement: str) -> str:
+    """Aplica el patrón de mayúsculas del texto original a la traducción"""
+    letters = [c for c in source if c.isalpha()]
+    if not letters:
+        return replacement
+    if len(letters) > 1 and all(c.isupper() for c in letters):
+        return replacement.upper()
+    if letters[0].isupper():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+def _normalize_phrase(phrase: str) -> str:
+    return ' '.join(phrase.lower().split())
+
+
+class PhraseAutomaton:
+    """
+    Trie de frases compilado a una única expresión regular
+
+    Cada nodo del trie se emite como ``c(?:hijos)?``: el cuantificador codicioso
+    prueba primero la continuación más larga y el motor de ``re`` (en C) hace
+    un único recorrido del texto. Los límites de palabra se imponen con
+    lookarounds, retrocediendo a la frase más corta si la larga corta una palabra.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, str]]):
+        self._targets: Dict[str, str] = {}
+        for source, target in phrases:
+            key = _normalize_phrase(source)
+            if key:
+                self._targets[key] = target
+        self.size = len(self._targets)
+        self._pattern = self._compile() if self._targets else None
+        self._pattern_ci: Optional['re.Pattern'] = None
+
+    def _compile(self, flags: int = 0) -> 're.Pattern':
+        trie: Dict[str, dict] = {}
+        for key in self._targets:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_TERMINAL] = {}
+        return re.compile(self._emit(trie, root=True) + r"(?![\w'])", flags)
+
+    def _emit(self, node: Dict[str, dict], root: bool = False) -> str:
+        branches = []
+        for ch in sorted(node):
+            if ch == _TERMINAL:
+                continue
+            atom = r'\s+' if ch == ' ' else re.escape(ch)
+            if root:
+                # El límite inicial se comprueba tras el primer carácter para que
+                # el patrón empiece por un literal y ``re`` pueda saltar posiciones
+                atom += r"(?<![\w'].)"
+            child = node[ch]
+            if set(child) == {_TERMINAL}:
+                branches.append(atom)
+            elif _TERMINAL in child:
+                branches.append(atom + '(?:' + self._emit(child) + ')?')
+            else:
+                branches.append(atom + self._emit(child))
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    def _lookup(self, matched_lower: str) -> Optional[str]:
+        target = self._targets.get(matched_lower)
+        if target is None:  # espacios múltiples o saltos de línea dentro de la frase
+            target = self._targets.get(' '.join(matched_lower.split()))
+        return target
+
+    def _substitute(self, match: 're.Match') -> str:
+        source = match.group(0)
+        target = self._lookup(source.lower())
+        return source if target is None else _match_case(source, target)
+
+    def replace(self, text: str) -> str:
+        """Reemplaza en una sola pasada; lo insertado no se vuelve a examinar"""
+        if self._pattern is None or not text:
+            return text
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Minúsculas que cambian la longitud (p. ej. 'İ'): las posiciones no
+            # se corresponden, se busca sin distinguir mayúsculas sobre el original
+            if self._pattern_ci is None:
+                self._pattern_ci = self._compile(re.IGNORECASE)
+            return self._pattern_ci.sub(self._substitute, text)
+
+        # Se busca sobre el texto en minúsculas (más rápido que IGNORECASE) y
+        # se copian los tramos sin coincidencia desde el original
+        out: List[str] = []
+        position = 0
+        for match in self._pattern.finditer(lowered):
+            start, end = match.span()
+            matched_lower = match.group(0)
+            target = self._lookup(matched_lower)
+            original = text[start:end]
+            out.append(text[position:start])
+            out.append(target if original == matched_lower else _match_case(original, target))
+            position = end
+        if not out:
+            return text
+        out.append(text[position:])
+        return ''.join(out)
+
+
+class TranslationEngine:
+    """Motor de traducción por diccionario con autómatas compilados por par de idiomas"""
+
+    def __init__(self, phrases: Optional[Dict[str, Dict[str, str]]] = None):
+        # (origen, destino) -> {frase: traducción}; ANY_SOURCE = origen sin especificar
+        self._tables: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._compiled: Dict[Tuple[str, str], PhraseAutomaton] = {}
+        self._lock = threading.Lock()
+        if phrases is None:
+            phrases = DEFAULT_PHRASES
+        for source_phrase, targets in phrases.items():
+            for target_lang, translation in targets.items():
+                self.add_phrase(ANY_SOURCE, target_lang, source_phrase, translation)
+
+    def add_phrase(self, source_lang: str, target_lang: str, source: str, target: str) -> None:
+        with self._lock:
+            self._tables.setdefault((source_lang, target_lang), {})[source] = target
+            # Invalida los autómatas afectados; se recompilan en el próximo uso
+            self._compiled.pop((source_lang, target_lang), None)
+            self._compiled.pop((ANY_SOURCE, target_lang), None)
+
+    def load_phrase_table(self, path: Union[str, Path], source_lang: Optional[str] = None,
+                          target_lang: Optional[str] = None) -> int:
+        """
+        Carga un TSV ``frase<TAB>traducción`` (líneas con # son comentarios)
+
+        Si no se indican idiomas se deducen del nombre ``<origen>-<destino>.tsv``.
+
+        Returns:
+            Número de frases cargadas
+        """
+        path = Path(path)
+        if source_lang is None or target_lang is None:
+            source_lang, target_lang = path.stem.split('-', 1)
+        loaded = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = []
+            for line in f:
+                line = line.rstrip('\n')
+                if not line.strip() or line.startswith('#') or '\t' not in line:
+                    continue
+                source, target = line.split('\t', 1)
+                entries.append((source.strip(), target.strip()))
+        with self._lock:
+            table = self._tables.setdefault((source_lang, target_lang), {})
+            for source, target in entries:
+                table[source] = target
+                loaded += 1
+            self._compiled.pop((source_lang, target_lang), None)
+            self._compiled.pop((ANY_SOURCE, target_lang), None)
+        return loaded
+
+    def load_directory(self, directory: Union[str, Path]) -> int:
+        """Carga todas las tablas ``*.tsv`` de un directorio"""
+        return sum(self.load_phrase_table(path) for path in sorted(Path(directory).glob('*-*.tsv')))
+
+    def _automaton(self, source_lang: str, target_lang: str) -> PhraseAutomaton:
+        key = (source_lang, target_lang)
+        automaton = self._compiled.get(key)
+        if automaton is not None:
+            return automaton
+        with self._lock:
+            automaton = self._compiled.get(key)
+            if automaton is None:
+                if source_lang == ANY_SOURCE:
+                    phrases = [item for (src, tgt), table in self._tables.items()
+                               if tgt == target_lang for item in table.items()]
+                else:
+                    phrases = list(self._tables.get((ANY_SOURCE, target_lang), {}).items())
+                    phrases += list(self._tables.get(key, {}).items())
+                automaton = PhraseAutomaton(phrases)
+                self._compiled[key] = automaton
+        return automaton
+
+    def translate(self, text: str, target_lang: str, source_lang: Optional[str] = None) -> str:
+        """Traduce ``text`` al idioma destino en una sola pasada"""
+        return self._automaton(source_lang or ANY_SOURCE, target_lang).replace(text)
+
+    def language_pairs(self) -> List[Tuple[str, str]]:
+        return sorted(self._tables)
+
+    def source_languages(self) -> List[str]:
+        return sorted({src for src, _ in self._tables if src != ANY_SOURCE})
+
+
+_engine: Optional[TranslationEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_translation_engine() -> TranslationEngine:
+    """
+    Obtiene instancia singleton del motor de traducción
+
+    Carga las tablas incluidas en ``vigoleonrocks/data/translation`` y, si está
+    definido, las de ``TRANSLATION_TABLES_DIR`` (que prevalecen).
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = TranslationEngine()
+                if DEFAULT_TABLES_DIR.is_dir():
+                    engine.load_directory(DEFAULT_TABLES_DIR)
+                extra_dir = os.getenv('TRANSLATION_TABLES_DIR')
+                if extra_dir:
+                    engine.load_directory(extra_dir)
+                _engine = engine
+    return _engine
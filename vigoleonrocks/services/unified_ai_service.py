@@ -8,7 +8,6 @@ Integración avanzada para VIGOLEONROCKS v4.0.0
 import os
 import time
 import json
-import hashlib
 import re
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
@@ -16,56 +15,10 @@ from pathlib import Path
 
 # Import base services
 from .ai_service import AIService
-
-
-class MetricsBasedRNG:
-    """Generador de números aleatorios basado en métricas del sistema (seguro)"""
-    
-    def __init__(self):
-        self.entropy_pool = []
-        self._collect_system_metrics()
-    
-    def _collect_system_metrics(self):
-        """Recolecta métricas del sistema para generar entropía"""
-        try:
-            # Métricas de tiempo con microsegundos
-            current_time = str(time.time_ns())
-            
-            # Métricas de proceso
-            pid_metrics = str(os.getpid())
-            
-            # Métricas de memoria (usando información del sistema)
-            memory_info = str(hash(str(time.process_time_ns())))
-            
-            # Combinar métricas para crear semilla
-            combined_metrics = f"{current_time}{pid_metrics}{memory_info}"
-            
-            # Hash de las métricas para crear entropía
-            entropy_hash = hashlib.sha256(combined_metrics.encode()).hexdigest()
-            
-            # Convertir hash a números
-            for i in range(0, len(entropy_hash), 8):
-                chunk = entropy_hash[i:i+8]
-                self.entropy_pool.append(int(chunk, 16) % 1000)
-                
-        except Exception as e:
-            # Fallback usando tiempo
-            self.entropy_pool = [int(str(time.time_ns())[-3:])]
-    
-    def get_random_choice(self, choices):
-        """Selecciona un elemento aleatorio usando métricas del sistema"""
-        if not self.entropy_pool:
-            self._collect_system_metrics()
-        
-        # Usar métricas del sistema para seleccionar
-        entropy_value = self.entropy_pool.pop(0) if self.entropy_pool else int(str(time.time_ns())[-3:])
-        index = entropy_value % len(choices)
-        
-        # Recoletar más métricas si se agota el pool
-        if len(self.entropy_pool) < 5:
-            self._collect_system_metrics()
-        
-        return choices[index]
+from .interaction_history import InteractionHistory
+from .entropy import get_entropy
+from .language_identifier import DEFAULT_MIN_CONFIDENCE, get_language_identifier
+from .tracing import current_span, span, traced
 
 
 class UnifiedAIService:
@@ -89,11 +42,14 @@ class UnifiedAIService:
         self.current_profile = 'human'
         self.quantum_states = 26
         self.context_capacity = 500000  # UNIFIED STANDARD - LÍDER INDUSTRIAL 2025
-        self.interaction_history = []
-        self.metrics_rng = MetricsBasedRNG()  # Usar métricas del sistema (seguro)
+        self.interaction_history = InteractionHistory(capacity=100)
+        self.entropy = get_entropy()  # Entropía compartida (reproducible con ENTROPY_SEED)
+        self.language_identifier = get_language_identifier()
         
         # Cargar respuestas humanas naturales
         self.human_responses = self._load_human_responses()
+        # Idiomas con alguna respuesta propia: la detección no devuelve otros
+        self.supported_languages = {lang for responses in self.human_responses.values() for lang in responses}
         
         print("🚀 UnifiedAIService inicializado: Motor Cuántico + Respuestas Humanas")
     
@@ -178,9 +134,10 @@ class UnifiedAIService:
             }
         }
     
+    @traced('UnifiedAIService.detect_language')
     def detect_language(self, text: str) -> str:
         """
-        Detecta el idioma usando el motor base mejorado con patrones avanzados
+        Detecta el idioma con el identificador de n-gramas de caracteres compartido
         
         Args:
             text: Texto a analizar
@@ -188,42 +145,10 @@ class UnifiedAIService:
         Returns:
             Código ISO del idioma detectado
         """
-        text_lower = text.lower().strip()
-
-        # Marcadores de idioma expandidos para 47 idiomas - LÍDER INDUSTRIAL
-        language_markers = {
-            'es': ['hola', 'gracias', 'por favor', 'qué', 'que', 'cómo', 'como', 'cuándo', 'cuando', 'cuánto', 'cuanto', 'dónde', 'donde', 'por qué', 'porque', 'quién', 'quien', 'eres', 'muy', 'bien', 'mal', 'ahora', 'después', 'buenos', 'buenas', 'es', 'está', 'esta', 'son', 'soy', 'somos'],
-            'en': ['hello', 'hi', 'thank', 'thanks', 'please', 'what', 'how', 'when', 'where', 'why', 'who', 'you', 'are', 'very', 'well', 'bad', 'now', 'after'],
-            'pt': ['olá', 'ola', 'oi', 'obrigado', 'obrigada', 'por favor', 'o que', 'como', 'quando', 'onde', 'por que', 'quem', 'você', 'muito', 'bem', 'mal', 'agora', 'depois'],
-            'fr': ['bonjour', 'salut', 'merci', 's\'il vous plaît', 'que', 'comment', 'quand', 'où', 'pourquoi', 'qui', 'vous', 'êtes', 'très', 'bien', 'mal', 'maintenant', 'après']
-        }
-
-        # Caracteres especiales por idioma para boost de puntuación
-        special_chars = {
-            'es': ['¿', '¡', 'ñ', 'á', 'é', 'í', 'ó', 'ú', 'ü'],
-            'pt': ['ã', 'õ', 'ç', 'á', 'é', 'í', 'ó', 'ú'],
-            'fr': ['à', 'â', 'ä', 'é', 'è', 'ê', 'ë', 'ï', 'î', 'ô', 'ö', 'ù', 'û', 'ü', 'ÿ', 'ç'],
-            'en': []  # English doesn't have special chars for this purpose
-        }
-
-        # Calcular puntuaciones
-        scores = {}
-        for lang, markers in language_markers.items():
-            scores[lang] = sum(1 for marker in markers if marker in text_lower)
-
-        # Boost por caracteres especiales
-        for lang, chars in special_chars.items():
-            if any(c in text for c in chars):
-                scores[lang] += 3  # Mayor boost para caracteres únicos
-
-        # Retornar idioma con mayor puntuación
-        if scores:
-            detected_lang = max(scores, key=scores.get)
-            max_score = scores[detected_lang]
-            return detected_lang if max_score > 0 else 'es'
-
-        return 'es'  # Default fallback
+        return self.language_identifier.detect(text, default='es', min_confidence=DEFAULT_MIN_CONFIDENCE,
+                                               allowed=self.supported_languages)
     
+    @traced('UnifiedAIService.generate_human_response')
     def generate_human_response(self, text: str, lang: str = 'es') -> str:
         """
         Genera respuestas humanas naturales con análisis cuántico avanzado
@@ -240,27 +165,27 @@ class UnifiedAIService:
         # Detectar tipo de consulta con análisis cuántico multilingüe
         greeting_words = ['hola', 'hello', 'hi', 'olá', 'ola', 'oi', 'bonjour', 'salut', 'hallo', 'ciao', '你好', 'こんにちは', '안녕하세요', 'привет', 'مرحبا', 'नमस्ते']
         if any(word in text_lower for word in greeting_words):
-            return self.metrics_rng.get_random_choice(self.human_responses['greetings'].get(lang, self.human_responses['greetings']['es']))
+            return self.entropy.choice(self.human_responses['greetings'].get(lang, self.human_responses['greetings']['es']))
 
         identity_phrases = [
             'quién eres', 'qué eres', 'who are you', 'what are you', 'quem é você', 'qui es-tu', 'was bist du', 'chi sei'
         ]
         if any(phrase in text_lower for phrase in identity_phrases):
-            return self.metrics_rng.get_random_choice(self.human_responses['identity'].get(lang, self.human_responses['identity']['es']))
+            return self.entropy.choice(self.human_responses['identity'].get(lang, self.human_responses['identity']['es']))
 
         capability_phrases = [
             'qué puedes', 'what can you', 'o que você pode', 'capacidades', 'capabilities', 'puedes hacer', 'can you do', 'funciones', 'functions', 'funcionalidades',
             'que peux-tu', 'was kannst du', 'cosa puoi fare'
         ]
         if any(phrase in text_lower for phrase in capability_phrases):
-            return self.metrics_rng.get_random_choice(self.human_responses['capabilities'].get(lang, self.human_responses['capabilities']['es']))
+            return self.entropy.choice(self.human_responses['capabilities'].get(lang, self.human_responses['capabilities']['es']))
         
         # Detección de preguntas matemáticas con procesamiento cuántico
         math_patterns = [
-            r'cu[aá]nto\\s+es\\s+(\\d+)\\s*[+\\-*/]\\s*(\\d+)',
-            r'(\\d+)\\s*[+\\-*/]\\s*(\\d+)\\s*=?\\s*\\??',
-            r'what\\s+is\\s+(\\d+)\\s*[+\\-*/]\\s*(\\d+)',
-            r'quanto\\s+[eé]\\s+(\\d+)\\s*[+\\-*/]\\s*(\\d+)'
+            r'cu[aá]nto\s+es\s+(\d+)\s*[+\-*/]\s*(\d+)',
+            r'(\d+)\s*[+\-*/]\s*(\d+)\s*=?\s*\??',
+            r'what\s+is\s+(\d+)\s*[+\-*/]\s*(\d+)',
+            r'quanto\s+[eé]\s+(\d+)\s*[+\-*/]\s*(\d+)'
         ]
         
         for pattern in math_patterns:
@@ -268,22 +193,22 @@ class UnifiedAIService:
             if match:
                 try:
                     if '+' in text:
-                        nums = re.findall(r'\\d+', text)
+                        nums = re.findall(r'\d+', text)
                         if len(nums) >= 2:
                             result = int(nums[0]) + int(nums[1])
                             return f"Mi procesador cuántico calcula: {nums[0]} + {nums[1]} = {result} ⚛️📊"
                     elif '-' in text:
-                        nums = re.findall(r'\\d+', text)
+                        nums = re.findall(r'\d+', text)
                         if len(nums) >= 2:
                             result = int(nums[0]) - int(nums[1])
                             return f"Análisis cuántico: {nums[0]} - {nums[1]} = {result} ⚛️📊"
                     elif '*' in text or 'x' in text_lower:
-                        nums = re.findall(r'\\d+', text)
+                        nums = re.findall(r'\d+', text)
                         if len(nums) >= 2:
                             result = int(nums[0]) * int(nums[1])
                             return f"Procesamiento híbrido: {nums[0]} × {nums[1]} = {result} ⚛️📊"
                     elif '/' in text:
-                        nums = re.findall(r'\\d+', text)
+                        nums = re.findall(r'\d+', text)
                         if len(nums) >= 2 and int(nums[1]) != 0:
                             result = int(nums[0]) / int(nums[1])
                             return f"Motor cuántico: {nums[0]} ÷ {nums[1]} = {result} ⚛️📊"
@@ -291,8 +216,9 @@ class UnifiedAIService:
                     return "Mi sistema híbrido detectó una complejidad matemática. ¿Podrías reformular? 🤔⚛️"
         
         # Default: respuesta de fallback con procesamiento cuántico
-        return self.metrics_rng.get_random_choice(self.human_responses['fallback'].get(lang, self.human_responses['fallback']['es']))
+        return self.entropy.choice(self.human_responses['fallback'].get(lang, self.human_responses['fallback']['es']))
     
+    @traced('UnifiedAIService.process_query')
     def process_query(self, text: str, profile: str = 'human', quantum_states: int = None) -> Dict[str, Any]:
         """
         Procesa consulta con motor híbrido: cuántico + humano
@@ -307,6 +233,7 @@ class UnifiedAIService:
         """
         start_time = time.time()
         self.request_count += 1
+        current_span().update(text_length=len(text), profile=profile)
         
         # Usar configuración de estados cuánticos
         if quantum_states:
@@ -321,7 +248,8 @@ class UnifiedAIService:
             response = self.generate_human_response(text, detected_lang)
         else:
             # Usar motor base para otros perfiles
-            ai_result = self.ai_service.process_query(text, profile)
+            with span('AIService.process_query', profile=profile):
+                ai_result = self.ai_service.process_query(text, profile)
             response = ai_result['response']
         
         # Calcular métricas de procesamiento
@@ -338,11 +266,11 @@ class UnifiedAIService:
             'timestamp': datetime.now().isoformat()
         }
         
-        self.interaction_history.append(interaction)
-        
-        # Mantener historial limitado (últimas 100 interacciones)
-        if len(self.interaction_history) > 100:
-            self.interaction_history = self.interaction_history[-100:]
+        # Buffer circular: conserva las últimas 100 interacciones sin copiar listas
+        with span('InteractionHistory.record'):
+            self.interaction_history.record(interaction)
+        current_span().update(language=detected_lang, quantum_states=self.quantum_states,
+                              response_length=len(response))
         
         return {
             'response': response,
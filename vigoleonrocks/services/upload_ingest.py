@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+📥 VIGOLEONROCKS - Ingesta de subidas en streaming
+Los manejadores de subida hacían ``file.read()`` de la petición entera antes
+de validar nada: la memoria crecía con el tamaño de las subidas concurrentes y
+un archivo enorme o mal etiquetado solo se rechazaba tras recibirlo completo.
+Este servicio se engancha al parser multipart de Werkzeug:
+
+- Cada archivo se vuelca en un ``SpooledTemporaryFile`` (memoria hasta
+  ``UPLOAD_SPOOL_MAX_MEMORY``, disco por encima) según llegan los chunks
+- Tipo real por bytes mágicos del primer bloque, no por la extensión: 415 en
+  cuanto se detecta un tipo no admitido por la ruta
+- Límite por tipo (``UPLOAD_LIMITS``) comprobado a mitad de la transmisión:
+  413 sin leer el resto
+- Rutas multiarchivo (``/api/process``): un archivo rechazado se descarta y
+  se informa en su propio resultado, sin tumbar el resto de la petición
+- SHA-256 incremental, disponible sin releer el archivo
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('image', 'audio', 'video', 'document', 'text', 'archive')
+DEFAULT_LIMITS = {
+    'image': 20 * 1024 ** 2,
+    'audio': 50 * 1024 ** 2,
+    'video': 200 * 1024 ** 2,
+    'document': 25 * 1024 ** 2,
+    'text': 10 * 1024 ** 2,
+    'archive': 200 * 1024 ** 2,
+}
+SPOOL_MAX_MEMORY = int(os.getenv('UPLOAD_SPOOL_MAX_MEMORY', 1024 * 1024))
+MAX_REQUEST_BYTES = int(os.getenv('UPLOAD_MAX_REQUEST_BYTES', 256 * 1024 ** 2))
+SNIFF_BYTES = 64  # suficiente para todas las firmas de la tabla
+_SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*$', re.IGNORECASE)
+_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+# Contenedores ZIP/OLE cuyo tipo depende de la extensión declarada
+_OFFICE_EXTENSIONS = {'docx', 'xlsx', 'pptx', 'odt', 'ods', 'odp', 'doc', 'xls', 'ppt'}
+# Texto en otra codificación (latin-1, cp1252...) se acepta si la extensión es de texto o código
+_TEXT_EXTENSIONS = {'txt', 'md', 'csv', 'tsv', 'log', 'ini', 'cfg', 'srt', 'vtt', 'json', 'xml', 'yaml', 'yml',
+                    'html', 'htm', 'css', 'js', 'ts', 'jsx', 'vue', 'py', 'c', 'h', 'cpp', 'java', 'php', 'rb',
+                    'go', 'rs', 'sql'}
+# BOM antes que las firmas de audio: FF FE (UTF-16 LE) pasa también el frame sync de MP3
+_BOMS = ((b'\xff\xfe\x00\x00', 'utf-32-le'), (b'\x00\x00\xfe\xff', 'utf-32-be'), (b'\xef\xbb\xbf', 'utf-8'),
+         (b'\xff\xfe', 'utf-16-le'), (b'\xfe\xff', 'utf-16-be'))
+
+
+class UploadRejected(Exception):
+    """Subida rechazada durante la transmisión (se responde con ``status``)"""
+    status = 400
+
+    def __init__(self, message: str, filename: Optional[str] = None, kind: Optional[str] = None):
+        super().__init__(message)
+        self.message = message
+        self.filename = filename
+        self.kind = kind
+
+
+class UnsupportedUploadType(UploadRejected):
+    status = 415
+
+
+class UploadTooLarge(UploadRejected):
+    status = 413
+
+
+def parse_size(text: str) -> int:
+    """``'20MB'`` -> bytes"""
+    match = _SIZE.match(text)
+    if not match:
+        raise ValueError(f"Tamaño inválido: {text!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """``'image=20MB,video=200MB'`` -> ``{'image': ..., 'video': ...}``"""
+    limits = {}
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        kind, _, size = part.partition('=')
+        kind = kind.strip().lower()
+        if kind not in KINDS:
+            raise ValueError(f"Tipo desconocido en UPLOAD_LIMITS: {kind!r}")
+        limits[kind] = parse_size(size)
+    return limits
+
+
+def _extension(filename: Optional[str]) -> str:
+    return filename.rsplit('.', 1)[-1].lower() if filename and '.' in filename else ''
+
+
+def sniff(head: bytes, filename: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """``(tipo, mime)`` por bytes mágicos; ``(None, None)`` si no se reconoce"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return 'text', f'text/plain; charset={encoding}'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image', 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image', 'image/png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image', 'image/gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image', 'image/webp'
+    if head.startswith(b'BM') and head[6:10] == b'\x00\x00\x00\x00':
+        return 'image', 'image/bmp'
+    if head[:4] in (b'II*\x00', b'MM\x00*'):
+        return 'image', 'image/tiff'
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'audio', 'audio/wav'
+    if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+        return 'video', 'video/x-msvideo'
+    if head.startswith(b'ID3') or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return 'audio', 'audio/mpeg'  # MP3 (ID3 o frame sync) / AAC ADTS
+    if head.startswith(b'fLaC'):
+        return 'audio', 'audio/flac'
+    if head.startswith(b'OggS'):
+        return 'audio', 'audio/ogg'
+    if head[4:8] == b'ftyp':
+        brand = head[8:12]
+        if brand in (b'M4A ', b'M4B '):
+            return 'audio', 'audio/mp4'
+        return 'video', 'video/quicktime' if brand == b'qt  ' else 'video/mp4'
+    if head.startswith(b'\x1a\x45\xdf\xa3'):
+        return 'video', 'video/webm'
+    if head.startswith(b'%PDF-'):
+        return 'document', 'application/pdf'
+    if head.startswith(b'{\\rtf'):
+        return 'document', 'application/rtf'
+    if head.startswith(b'PK\x03\x04') or head.startswith(b'PK\x05\x06'):
+        if _extension(filename) in _OFFICE_EXTENSIONS:
+            return 'document', 'application/zip'
+        return 'archive', 'application/zip'
+    if head.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+        return 'document', 'application/x-ole-storage'  # .doc/.xls antiguos
+    if head and b'\x00' not in head:
+        try:
+            head.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # un carácter multibyte cortado al final es válido
+            if e.start < len(head) - 3 and _extension(filename) not in _TEXT_EXTENSIONS:
+                return None, None
+        return 'text', 'text/plain'
+    return None, None
+
+
+class SpooledUpload:
+    """
+    Destino de un archivo multipart: spool + tipo + límite + hash incremental
+
+    Werkzeug escribe los chunks con ``write()`` y después hace ``seek(0)``; el
+    resto de operaciones de archivo se delegan al ``SpooledTemporaryFile``.
+    """
+
+    def __init__(self, filename: Optional[str], allowed: FrozenSet[str], limits: Mapping[str, int],
+                 max_memory: int = SPOOL_MAX_MEMORY, declared_length: Optional[int] = None,
+                 tolerant: bool = False):
+        self.filename = filename
+        self.allowed = allowed
+        self.limits = limits
+        self.tolerant = tolerant
+        self.error: Optional[UploadRejected] = None
+        self.kind: Optional[str] = None
+        self.mime: Optional[str] = None
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._head = b''
+        self._spool = tempfile.SpooledTemporaryFile(max_size=max_memory, mode='w+b')
+        self._limit = max(limits.get(kind, 0) for kind in allowed)
+        if declared_length is not None and declared_length > self._limit:
+            self._reject(UploadTooLarge, f"Archivo demasiado grande (máximo {self._limit // 1024 ** 2}MB)")
+
+    def _reject(self, error, message):
+        exc = error(message, self.filename, self.kind)
+        if self.tolerant:
+            # Solo se descarta esta parte: el resto de la transmisión se cuenta pero no se guarda
+            self.error = exc
+            self._spool.seek(0)
+            self._spool.truncate()
+            return
+        self._spool.close()
+        raise exc
+
+    def _identify(self) -> None:
+        self.kind, self.mime = sniff(self._head, self.filename)
+        self._head = b''
+        if self.kind not in self.allowed:
+            detected = self.kind or 'desconocido'
+            self._reject(UnsupportedUploadType, f"Tipo de archivo no soportado ({detected})")
+            return
+        self._limit = self.limits[self.kind]
+
+    def write(self, chunk: bytes) -> int:
+        self.size += len(chunk)
+        if self.error is not None:
+            return len(chunk)
+        if self.kind is None:
+            self._head += chunk[:SNIFF_BYTES]
+            if len(self._head) >= SNIFF_BYTES:
+                self._identify()
+        if self.error is None and self.size > self._limit:
+            self._reject(UploadTooLarge, f"Archivo demasiado grande (máximo {self._limit // 1024 ** 2}MB)")
+        if self.error is not None:
+            return len(chunk)
+        self._hash.update(chunk)
+        return self._spool.write(chunk)
+
+    def finish(self) -> None:
+        """Identifica archivos más cortos que el bloque de detección"""
+        if self.kind is None and self.error is None and self.size:
+            self._identify()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        self.finish()
+        return self._spool.seek(offset, whence)
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def on_disk(self) -> bool:
+        return bool(getattr(self._spool, '_rolled', False))
+
+    def info(self) -> Dict[str, Any]:
+        info = {'kind': self.kind, 'mime': self.mime, 'size': self.size,
+                'sha256': self.sha256, 'spooled_to_disk': self.on_disk}
+        if self.error is not None:
+            info.update(error=self.error.message, status=self.error.status)
+        return info
+
+    def __getattr__(self, name):
+        return getattr(self._spool, name)
+
+    def __iter__(self):
+        return iter(self._spool)
+
+
+class UploadIngest:
+    """
+    Política de ingesta: tipos admitidos por ruta y límites por tipo
+
+    Args:
+        route_kinds: ``{ruta: tipos}``; las rutas no listadas admiten todos
+        limits: Bytes máximos por tipo (``UPLOAD_LIMITS`` prevalece)
+        max_memory: Bytes en memoria antes de pasar el spool a disco
+        max_request_bytes: ``Content-Length`` máximo de la petición completa
+        multi_file_routes: Rutas donde un archivo rechazado no rechaza la petición:
+            la vista lo encuentra en ``upload_info(...)['error']``
+    """
+
+    def __init__(self, route_kinds: Optional[Mapping[str, Iterable[str]]] = None,
+                 limits: Optional[Mapping[str, int]] = None, max_memory: int = SPOOL_MAX_MEMORY,
+                 max_request_bytes: int = MAX_REQUEST_BYTES, multi_file_routes: Iterable[str] = ()):
+        self.route_kinds = {route: frozenset(kinds) for route, kinds in (route_kinds or {}).items()}
+        self.multi_file_routes = frozenset(multi_file_routes)
+        self.limits = {**DEFAULT_LIMITS, **(limits or {}), **parse_limits(os.getenv('UPLOAD_LIMITS', ''))}
+        self.max_memory = max_memory
+        self.max_request_bytes = max_request_bytes
+        self.counters = {'files': 0, 'bytes': 0, 'rejected_type': 0, 'rejected_size': 0, 'spooled_to_disk': 0}
+
+    def kinds_for(self, path: str) -> FrozenSet[str]:
+        return self.route_kinds.get(path, frozenset(KINDS))
+
+    def open(self, path: str, filename: Optional[str], content_length: Optional[int] = None) -> SpooledUpload:
+        """Destino para un archivo de la petición a ``path`` (fábrica de streams de Werkzeug)"""
+        self.counters['files'] += 1
+        return SpooledUpload(filename, self.kinds_for(path), self.limits, self.max_memory, content_length,
+                             tolerant=path in self.multi_file_routes)
+
+    def record(self, error: Optional[UploadRejected] = None, upload: Optional[SpooledUpload] = None) -> None:
+        if isinstance(error, UnsupportedUploadType):
+            self.counters['rejected_type'] += 1
+        elif isinstance(error, UploadTooLarge):
+            self.counters['rejected_size'] += 1
+        if upload is not None:
+            self.counters['bytes'] += upload.size
+            self.counters['spooled_to_disk'] += int(upload.on_disk)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'limits': dict(self.limits), 'max_memory': self.max_memory, **self.counters}
+
+
+def upload_info(file_storage) -> Optional[Dict[str, Any]]:
+    """Tipo detectado, tamaño y SHA-256 de un ``request.files[...]`` (``None`` sin ingesta)"""
+    stream = getattr(file_storage, 'stream', None)
+    return stream.info() if isinstance(stream, SpooledUpload) else None
+
+
+def install_upload_ingest(app, route_kinds: Optional[Mapping[str, Iterable[str]]] = None,
+                          ingest: Optional[UploadIngest] = None) -> UploadIngest:
+    """
+    Registra la ingesta en una app Flask
+
+    Las peticiones multipart se analizan en ``before_request`` (antes del
+    ``try/except`` de cada vista), así que un rechazo llega al cliente como
+    413/415 con JSON y no como un 500 genérico.
+    """
+    from flask import jsonify, request
+
+    ingest = ingest or UploadIngest(route_kinds)
+    base_request = app.request_class
+
+    class IngestRequest(base_request):
+        def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+            return ingest.open(self.path, filename, content_length)
+
+    app.request_class = IngestRequest
+
+    @app.before_request
+    def _ingest_uploads():
+        if request.method not in ('POST', 'PUT') or request.mimetype != 'multipart/form-data':
+            return None
+        if request.content_length is not None and request.content_length > ingest.max_request_bytes:
+            raise UploadTooLarge(f"Petición demasiado grande (máximo {ingest.max_request_bytes // 1024 ** 2}MB)")
+        request.files  # noqa: B018 - fuerza el parseo aquí
+        for _, storage in request.files.items(multi=True):
+            upload = storage.stream if isinstance(storage.stream, SpooledUpload) else None
+            ingest.record(upload.error if upload is not None else None, upload)
+        return None
+
+    @app.errorhandler(UploadRejected)
+    def _upload_rejected(error: UploadRejected):
+        ingest.record(error)
+        logger.warning(f"⛔ Subida rechazada ({error.status}): {error.filename or '-'} - {error.message}")
+        return jsonify({'error': error.message, 'filename': error.filename,
+                        'detected_type': error.kind, 'status': 'error'}), error.status
+
+    app.extensions['vigoleonrocks_upload_ingest'] = ingest
+    return ingest
@@ -20,6 +20,8 @@ import math
 from datetime import datetime, timedelta
 from functools import wraps
 
+from vigoleonrocks.services.entropy import get_entropy, install_entropy
+
 # Configurar encoding para Windows
 if sys.platform.startswith('win'):
     os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -38,6 +40,9 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
+# Entropía por petición (ENTROPY_SEED = respuestas reproducibles en pruebas de carga)
+install_entropy(app)
+
 # ===== IMPORTACIONES DE MOTORES CUÁNTICOS REALES =====
 try:
     from enhancements.quantum_cot_engine import QuantumChainOfThoughtEngine
@@ -48,78 +53,53 @@ except ImportError as e:
     COT_ENGINE_AVAILABLE = False
 
 try:
-    from enhancements.quantum_math_engine import QuantumMathEngine
-    logger.info("✓ QuantumMathEngine importado exitosamente")
+    from enhancements.quantum_math_engine import QuantumMathematicalReasoningEngine
+    logger.info("✓ QuantumMathematicalReasoningEngine importado exitosamente")
     MATH_ENGINE_AVAILABLE = True
 except ImportError as e:
-    logger.error(f"✗ Error importando QuantumMathEngine: {e}")
+    logger.error(f"✗ Error importando QuantumMathematicalReasoningEngine: {e}")
     MATH_ENGINE_AVAILABLE = False
 
 try:
-    from enhancements.quantum_few_shot_engine import QuantumFewShotEngine
-    logger.info("✓ QuantumFewShotEngine importado exitosamente")
+    from enhancements.quantum_few_shot_engine import QuantumFewShotLearningEngine
+    logger.info("✓ QuantumFewShotLearningEngine importado exitosamente")
     FEW_SHOT_ENGINE_AVAILABLE = True
 except ImportError as e:
-    logger.error(f"✗ Error importando QuantumFewShotEngine: {e}")
+    logger.error(f"✗ Error importando QuantumFewShotLearningEngine: {e}")
     FEW_SHOT_ENGINE_AVAILABLE = False
 
 try:
-    from enhancements.quantum_code_engine import QuantumCodeEngine
-    logger.info("✓ QuantumCodeEngine importado exitosamente")
+    from enhancements.quantum_code_engine import QuantumCodeGenerationEngine
+    logger.info("✓ QuantumCodeGenerationEngine importado exitosamente")
     CODE_ENGINE_AVAILABLE = True
 except ImportError as e:
-    logger.error(f"✗ Error importando QuantumCodeEngine: {e}")
+    logger.error(f"✗ Error importando QuantumCodeGenerationEngine: {e}")
     CODE_ENGINE_AVAILABLE = False
 
 try:
-    from enhancements.quantum_cache_system import QuantumCacheSystem
-    logger.info("✓ QuantumCacheSystem importado exitosamente")
+    from enhancements.quantum_cache_system import QuantumIntelligentCacheSystem
+    logger.info("✓ QuantumIntelligentCacheSystem importado exitosamente")
     CACHE_SYSTEM_AVAILABLE = True
 except ImportError as e:
-    logger.error(f"✗ Error importando QuantumCacheSystem: {e}")
+    logger.error(f"✗ Error importando QuantumIntelligentCacheSystem: {e}")
     CACHE_SYSTEM_AVAILABLE = False
 
+from enhancements.quantum_engine_router import EngineRouter, build_default_adapters
+from vigoleonrocks.services.system_sampler import current_snapshot, get_system_sampler
+
 # ===== SISTEMA DE MÉTRICAS SIN FUNCIONES ALEATORIAS =====
 
 def get_system_entropy():
-    """Genera entropía basada en métricas reales del sistema"""
-    try:
-        # CPU usage como base
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        
-        # Memoria como factor
-        memory = psutil.virtual_memory()
-        mem_factor = memory.percent
-        
-        # Timestamp actual
-        timestamp = time.time()
-        
-        # Procesos activos
-        process_count = len(psutil.pids())
-        
-        # Crear hash determinístico pero variable
-        entropy_string = f"{cpu_percent}-{mem_factor}-{timestamp}-{process_count}"
-        hash_value = hashlib.sha256(entropy_string.encode()).hexdigest()
-        
-        # Convertir a número flotante normalizado
-        entropy = int(hash_value[:8], 16) / 0xffffffff
-        return entropy
-        
-    except Exception as e:
-        logger.warning(f"Error obteniendo entropía del sistema: {e}")
-        # Fallback usando timestamp
-        return (time.time() % 1000) / 1000
+    """Entropía en [0, 1) (servicio compartido, reproducible con ENTROPY_SEED)"""
+    return get_entropy().uniform()
 
 def generate_quantum_volatility(base_volatility=0.02):
     """Genera volatilidad cuántica usando métricas del sistema"""
     entropy = get_system_entropy()
     
-    # Usar CPU load como factor de volatilidad
-    try:
-        cpu_load = psutil.cpu_percent(interval=0.01)
-        load_factor = (cpu_load / 100) * 0.5  # Normalizar
-    except:
-        load_factor = 0.1
+    # Usar CPU load como factor de volatilidad (última muestra, sin bloquear)
+    cpu_load = current_snapshot().system_cpu_percent
+    load_factor = (cpu_load / 100) * 0.5 if cpu_load else 0.1  # Normalizar
     
     # Combinar entropía con carga del sistema
     quantum_volatility = base_volatility * (1 + (entropy - 0.5) * load_factor)
@@ -161,65 +141,49 @@ class QuantumEngineManager:
         
         if MATH_ENGINE_AVAILABLE:
             try:
-                self.engines['math'] = QuantumMathEngine()
+                self.engines['math'] = QuantumMathematicalReasoningEngine()
                 logger.info("✓ Math Engine activado")
             except Exception as e:
                 logger.error(f"✗ Error inicializando Math Engine: {e}")
         
         if FEW_SHOT_ENGINE_AVAILABLE:
             try:
-                self.engines['few_shot'] = QuantumFewShotEngine()
+                self.engines['few_shot'] = QuantumFewShotLearningEngine()
                 logger.info("✓ Few Shot Engine activado")
             except Exception as e:
                 logger.error(f"✗ Error inicializando Few Shot Engine: {e}")
         
         if CODE_ENGINE_AVAILABLE:
             try:
-                self.engines['code'] = QuantumCodeEngine()
+                self.engines['code'] = QuantumCodeGenerationEngine()
                 logger.info("✓ Code Engine activado")
             except Exception as e:
                 logger.error(f"✗ Error inicializando Code Engine: {e}")
         
         if CACHE_SYSTEM_AVAILABLE:
             try:
-                self.engines['cache'] = QuantumCacheSystem()
+                self.engines['cache'] = QuantumIntelligentCacheSystem()
                 logger.info("✓ Cache System activado")
             except Exception as e:
                 logger.error(f"✗ Error inicializando Cache System: {e}")
         
         logger.info(f"🚀 {len(self.engines)} motores cuánticos activos!")
+        
+        # Router por puntuación de características; la ejecución especulativa
+        # (top-2 en paralelo con plazo) se activa por entorno
+        self.router = EngineRouter(
+            build_default_adapters(self.engines),
+            speculative=os.getenv('ENGINE_ROUTER_SPECULATIVE', 'false').lower() == 'true',
+            deadline_s=float(os.getenv('ENGINE_ROUTER_DEADLINE', '2.0')),
+        )
     
     def process_query(self, query, context=None):
-        """Procesa consulta usando el motor más apropiado"""
+        """Procesa consulta usando el motor con mejor puntuación (ver EngineRouter)"""
         if not query:
             return {"error": "Query vacía"}
         
-        # Determinar el tipo de consulta
-        query_lower = query.lower()
-        
-        # Consultas matemáticas
-        if any(word in query_lower for word in ['calcular', 'suma', 'resta', 'multiplicar', 'dividir', 'ecuación', 'matemática']):
-            if 'math' in self.engines:
-                return self.engines['math'].process(query, context)
-        
-        # Consultas de código
-        if any(word in query_lower for word in ['código', 'python', 'javascript', 'programar', 'función', 'class']):
-            if 'code' in self.engines:
-                return self.engines['code'].process(query, context)
-        
-        # Consultas que requieren razonamiento complejo
-        if any(word in query_lower for word in ['porque', 'explicar', 'analizar', 'razonamiento', 'lógica']):
-            if 'cot' in self.engines:
-                return self.engines['cot'].process(query, context)
-        
-        # Consultas few-shot (ejemplos)
-        if any(word in query_lower for word in ['ejemplo', 'como hacer', 'tutorial', 'paso a paso']):
-            if 'few_shot' in self.engines:
-                return self.engines['few_shot'].process(query, context)
-        
-        # Default: usar COT si está disponible
-        if 'cot' in self.engines:
-            return self.engines['cot'].process(query, context)
+        if self.router.adapters:
+            return self.router.process(query, context or {})
         
         # Fallback
         return {
@@ -239,38 +203,32 @@ class MetricsCollector:
         self.metrics = {
             'queries_processed': 0,
             'engines_active': len(quantum_manager.engines),
-            'system_entropy': 0.0,
             'uptime_seconds': 0,
             'start_time': time.time()
         }
-        self.running = True
-        self.thread = threading.Thread(target=self._collect_metrics, daemon=True)
-        self.thread.start()
+        self._last_log = 0.0
+        # Un único muestreador por proceso en lugar de un hilo con cpu_percent(interval=1) y psutil.pids()
+        get_system_sampler().subscribe(self._collect_metrics, every=1)
     
-    def _collect_metrics(self):
-        """Recolecta métricas del sistema en segundo plano"""
-        while self.running:
-            try:
-                self.metrics['system_entropy'] = get_system_entropy()
-                self.metrics['uptime_seconds'] = int(time.time() - self.metrics['start_time'])
-                self.metrics['cpu_percent'] = psutil.cpu_percent(interval=1)
-                self.metrics['memory_percent'] = psutil.virtual_memory().percent
-                self.metrics['active_processes'] = len(psutil.pids())
-                
-                # Log métricas cada 30 segundos
-                if self.metrics['uptime_seconds'] % 30 == 0:
-                    logger.info(f"📊 Métricas: CPU {self.metrics['cpu_percent']:.1f}%, "
-                              f"RAM {self.metrics['memory_percent']:.1f}%, "
-                              f"Entropía {self.metrics['system_entropy']:.4f}")
-                
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error recolectando métricas: {e}")
-                time.sleep(5)
+    def _collect_metrics(self, snapshot):
+        """Recolecta métricas del sistema solo desde la muestra compartida (corre en el hilo del muestreador)"""
+        self.metrics['uptime_seconds'] = int(time.time() - self.metrics['start_time'])
+        self.metrics['cpu_percent'] = snapshot.system_cpu_percent
+        self.metrics['memory_percent'] = snapshot.memory_percent
+        self.metrics['active_processes'] = snapshot.system_tasks  # tareas del kernel (/proc/loadavg)
+        
+        # Log métricas cada 30 segundos
+        if snapshot.timestamp - self._last_log >= 30:
+            self._last_log = snapshot.timestamp
+            logger.info(f"📊 Métricas: CPU {self.metrics['cpu_percent']:.1f}%, "
+                      f"RAM {self.metrics['memory_percent']:.1f}%, "
+                      f"load {snapshot.load_avg_1m:.2f}")
     
     def get_metrics(self):
-        return self.metrics.copy()
+        metrics = self.metrics.copy()
+        # Al leer, en el hilo de la petición: el subscriptor no depende de nada más que la muestra
+        metrics['system_entropy'] = get_system_entropy()
+        return metrics
     
     def increment_queries(self):
         self.metrics['queries_processed'] += 1
@@ -396,8 +354,8 @@ def home():
     uptime=metrics_collector.get_metrics()['uptime_seconds'],
     queries=metrics_collector.get_metrics()['queries_processed'],
     entropy=f"{get_system_entropy():.4f}",
-    cpu=psutil.cpu_percent(),
-    memory=psutil.virtual_memory().percent
+    cpu=current_snapshot().system_cpu_percent,
+    memory=current_snapshot().memory_percent
     )
 
 @app.route('/api/chat', methods=['POST'])
@@ -452,6 +410,7 @@ def get_engines():
     return jsonify({
         'engines': engines_info,
         'total_engines': len(quantum_manager.engines),
+        'routing': quantum_manager.router.stats_snapshot(),
         'system_entropy': get_system_entropy()
     })
 
@@ -519,7 +478,7 @@ if __name__ == '__main__':
         
     except KeyboardInterrupt:
         logger.info("🛑 Deteniendo servidor por interrupción del usuario")
-        metrics_collector.running = False
+        get_system_sampler().stop()
     except Exception as e:
         logger.error(f"❌ Error fatal del servidor: {e}")
-        metrics_collector.running = False
+        get_system_sampler().stop()